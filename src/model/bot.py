@@ -10,11 +10,10 @@ import time
 import warnings
 from abc import ABC, abstractmethod
 from enum import Enum
-from typing import List, Union
+from typing import Callable, List, Union
 
 import customtkinter
 import numpy as np
-import pyautogui as pag
 import pytweening
 from deprecated import deprecated
 
@@ -22,9 +21,14 @@ import utilities.color as clr
 import utilities.debug as debug
 import utilities.imagesearch as imsearch
 import utilities.ocr as ocr
+import utilities.metrics as metrics
 import utilities.random_util as rd
+import utilities.tracing as tracing
+from utilities.action_executor import ActionExecutor
 from utilities.geometry import Point, Rectangle
-from utilities.mouse import Mouse
+from utilities.input_backend import InputBackend
+from utilities.keyboard import Keyboard
+from utilities.mouse import Mouse, MoveControl
 from utilities.options_builder import OptionsBuilder
 from utilities.window import Window, WindowInitializationError
 
@@ -80,10 +84,14 @@ class BotStatus(Enum):
 
 class Bot(ABC):
     mouse = Mouse()
+    keyboard = Keyboard(mouse.backend)
     options_set: bool = False
     progress: float = 0
     status = BotStatus.STOPPED
     thread: BotThread = None
+    _actions: ActionExecutor = None
+    _iteration_start: int = 0
+    _rng: rd.Sampler = None
 
     @abstractmethod
     def __init__(self, game_title, bot_title, description, window: Window):
@@ -154,7 +162,7 @@ class Bot(ABC):
                 return
             self.reset_progress()
             self.set_status(BotStatus.RUNNING)
-            self.thread = BotThread(target=self.main_loop)
+            self.thread = BotThread(target=self.__run_main_loop)
             self.thread.setDaemon(True)
             self.thread.start()
         elif self.status == BotStatus.RUNNING:
@@ -162,6 +170,23 @@ class Bot(ABC):
         elif self.status == BotStatus.CONFIGURING:
             self.log_msg("Please finish configuring the bot before starting.")
 
+    @property
+    def metrics_label(self) -> str:
+        """
+        The `bot` label of the metrics recorded for this bot: its account name if it has one, else its title.
+        """
+        return getattr(self, "account_name", None) or self.bot_title
+
+    def __run_main_loop(self):
+        """
+        Runs the main loop with this bot's metrics label bound to the thread, and reports its actions per hour.
+        """
+        label = self.metrics_label
+        started_at = time.time()
+        metrics.ACTIONS_PER_HOUR.set_function(lambda: metrics.ACTIONS.value(bot=label) * 3600 / max(time.time() - started_at, 1), bot=label)
+        with metrics.bound(bot=label), rd.bound(self.rng):
+            tracing.traced("main_loop")(self.main_loop)()
+
     def __initialize_window(self):
         """
         Attempts to focus and initialize the game window by identifying core UI elements.
@@ -169,6 +194,7 @@ class Bot(ABC):
         self.win.focus()
         time.sleep(0.5)
         self.win.initialize()
+        self.win.watch_geometry()
 
     def stop(self):
         """
@@ -177,6 +203,8 @@ class Bot(ABC):
         self.log_msg("Stopping script.")
         if self.status != BotStatus.STOPPED:
             self.set_status(BotStatus.STOPPED)
+            self.__shutdown_actions()
+            self.win.stop_watching_geometry()
             self.thread.stop()
             self.thread.join()
         else:
@@ -186,20 +214,74 @@ class Bot(ABC):
     def set_controller(self, controller):
         self.controller = controller
 
+    def set_input_backend(self, backend: InputBackend):
+        """
+        Gives this bot its own Mouse and Keyboard driven by the given InputBackend (E.g., a RecordingBackend
+        for headless runs). By default, all bots share the process-wide default backend.
+        Args:
+            backend: The InputBackend to send mouse and keyboard events through.
+        """
+        self.mouse = Mouse(backend)
+        self.keyboard = Keyboard(backend)
+
+    @property
+    def rng(self) -> rd.Sampler:
+        """
+        This bot's own Sampler. It is bound to the main loop thread (and the bot's ActionExecutor threads), so the
+        `random_util` functions called by the bot's script, Mouse and Rectangles draw from it rather than from the
+        stream shared with every other bot. Blocks are drawn on demand, so it starts no thread.
+        """
+        if self._rng is None:
+            self._rng = rd.Sampler(background=False)
+        return self._rng
+
+    def seed(self, seed: int) -> None:
+        """
+        Replaces this bot's Sampler with a seeded one, so its random draws repeat from run to run.
+        """
+        self._rng = rd.Sampler(seed, background=False)
+
+    @property
+    def actions(self) -> ActionExecutor:
+        """
+        An ActionExecutor that runs this bot's mouse/keyboard actions on a separate input thread, so that computer
+        vision can continue while the cursor is moving.
+        """
+        if self._actions is None or self._actions.mouse is not self.mouse:
+            self.__shutdown_actions()
+            self._actions = ActionExecutor(self.mouse, self.keyboard)
+        return self._actions
+
+    def __shutdown_actions(self) -> None:
+        """
+        Stops the threads of the current ActionExecutor, if any. Queued actions are cancelled.
+        """
+        if self._actions is not None:
+            self._actions.shutdown(wait=False)
+            self._actions = None
+
     # ---- Functions that notify the controller of changes ----
     def reset_progress(self):
         """
         Resets the current progress property to 0 and notifies the controller to update UI.
         """
         self.progress = 0
+        self._iteration_start = tracing.now_ns()
         self.controller.update_progress()
 
     def update_progress(self, progress: float):
         """
         Updates the progress property and notifies the controller to update UI.
+        Scripts call this once per main loop iteration, so the time since the previous call is recorded as an
+        iteration (see utilities.tracing and utilities.metrics).
         Args:
             progress: float - number between 0 and 1 indicating percentage of progress.
         """
+        now = tracing.now_ns()
+        tracing.record("iteration", self._iteration_start, now, bot=self.bot_title)
+        metrics.ITERATIONS.inc(bot=self.metrics_label)
+        metrics.ITERATION_SECONDS.observe((now - self._iteration_start) / 1e9, bot=self.metrics_label)
+        self._iteration_start = now
         if progress < 0:
             progress = 0
         elif progress > 1:
@@ -243,7 +325,8 @@ class Bot(ABC):
         """
         img = imsearch.BOT_IMAGES.joinpath("items", f"{item}.png")
         print('searching for ', img)
-        for i, slot in enumerate(self.win.inventory_slots):
+        # One capture of the whole inventory instead of one per slot
+        for i, slot in enumerate(self.win.inventory_slots.screenshot()):
             if imsearch.search_img_in_rect(img, slot, confidence=conf):
                 print('found in slot ', i)
                 return i
@@ -260,7 +343,7 @@ class Bot(ABC):
         """
         count = 0
         img = imsearch.BOT_IMAGES.joinpath("items", f"{item}.png")
-        for slot in self.win.inventory_slots:
+        for slot in self.win.inventory_slots.screenshot():
             if imsearch.search_img_in_rect(img, slot, confidence=conf):
                 count += 1
         print(f"Found {count} {item} in inventory")
@@ -284,7 +367,7 @@ class Bot(ABC):
             row_skip = list(range(skip_rows * 4))
             skip_slots = np.unique(row_skip + skip_slots)
         # Start dropping
-        pag.keyDown("shift")
+        self.keyboard.key_down("shift")
         for i, slot in enumerate(self.win.inventory_slots):
             if i in skip_slots or imsearch.search_img_in_rect(empty_img, slot, confidence=0.1) and not imsearch.search_img_in_rect(burnt_img, slot, confidence=0.2):
                 continue
@@ -298,7 +381,7 @@ class Bot(ABC):
                 tween=pytweening.easeInOutQuad,
             )
             self.mouse.click()
-        pag.keyUp("shift")
+        self.keyboard.key_up("shift")
 
     def click_inventory_slot(self, slot: int, wait: float = 0.5):
         """
@@ -329,7 +412,7 @@ class Bot(ABC):
         """
         self.log_msg("Dropping items...")
         empty_img = imsearch.BOT_IMAGES.joinpath("ui_templates", "empty_slot.png")
-        pag.keyDown("shift")
+        self.keyboard.key_down("shift")
         for slot in self.win.inventory_slots:
             if imsearch.search_img_in_rect(empty_img, slot, confidence=0.1):
                 continue
@@ -343,7 +426,7 @@ class Bot(ABC):
                 tween=pytweening.easeInOutQuad,
             )
             self.mouse.click()
-        pag.keyUp("shift")
+        self.keyboard.key_up("shift")
 
     def logout(self, msg):
         self.log_msg(msg)
@@ -423,9 +506,9 @@ class Bot(ABC):
         """
         self.log_msg("Taking a break...")
         if fancy:
-            length = rd.fancy_normal_sample(min_seconds, max_seconds)
+            length = self.rng.fancy_normal(min_seconds, max_seconds)
         else:
-            length = rd.truncated_normal_sample(min_seconds, max_seconds)
+            length = self.rng.truncated_normal(min_seconds, max_seconds)
         length = round(length)
         for i in range(length):
             self.log_msg(f"Taking a break... {int(length) - i} seconds left.", overwrite=True)
@@ -524,6 +607,33 @@ class Bot(ABC):
             return ocr.extract_text(self.win.mouseover, ocr.BOLD_12, color)
         return bool(ocr.find_text(contains, self.win.mouseover, ocr.BOLD_12, color))
 
+    def move_and_check_mouseover(
+        self,
+        destination: tuple,
+        contains: Union[str, List[str]],
+        color: Union[clr.Color, List[clr.Color]] = None,
+        watch_rect: Rectangle = None,
+        on_checkpoint: Callable[[MoveControl], tuple] = None,
+        **kwargs,
+    ) -> bool:
+        """
+        Moves the mouse and checks the mouseover text. The mouseover text is read while the cursor is still
+        travelling (as soon as it enters `watch_rect`), rather than after the whole movement.
+        Args:
+            destination: x, y tuple of the destination point.
+            contains: The text to search for (see mouseover_text()).
+            color: The color(s) to isolate (see mouseover_text()).
+            watch_rect: The target's bounding box. If omitted, the text is read once the movement finishes.
+            on_checkpoint: A re-aiming callback for moving targets (see RuneLiteBot.reaim_on_tag()).
+        Kwargs:
+            Passed to Mouse.move_to() (E.g., mouseSpeed, knotsCount).
+        Returns:
+            True as soon as the mouseover text matched, which may have been while the cursor was still travelling
+            (the text is not read again once it arrives). False if it never matched or the move was cancelled.
+        """
+        verify = lambda: self.mouseover_text(contains=contains, color=color)  # noqa: E731
+        return bool(self.actions.move_then_verify(destination, verify, watch_rect, on_checkpoint, **kwargs).result())
+
     def info_panel_text(self, contains: Union[str, List[str]] = None, font: ocr = ocr.PLAIN_11, color: Union[clr.Color, List[clr.Color]] = None) -> Union[bool, str]:
         """
         Examines the info panel for text.
@@ -680,14 +790,9 @@ class Bot(ABC):
         direction_h = "right" if horizontal < 0 else "left"
         direction_v = "down" if vertical < 0 else "up"
 
-        def keypress(direction, duration):
-            pag.keyDown(direction)
-            time.sleep(duration)
-            pag.keyUp(direction)
-
-        thread_h = threading.Thread(target=keypress, args=(direction_h, sleep_h), daemon=True)
-        thread_v = threading.Thread(target=keypress, args=(direction_v, sleep_v), daemon=True)
-        delay = rd.fancy_normal_sample(0, max(sleep_h, sleep_v))
+        thread_h = threading.Thread(target=self.keyboard.hold, args=(direction_h, sleep_h), daemon=True)
+        thread_v = threading.Thread(target=self.keyboard.hold, args=(direction_v, sleep_v), daemon=True)
+        delay = self.rng.fancy_normal(0, max(sleep_h, sleep_v))
         if sleep_h > sleep_v:
             thread_h.start()
             time.sleep(delay)
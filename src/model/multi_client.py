@@ -0,0 +1,175 @@
+"""
+Runs one bot per RuneLite client from a single process.
+
+MultiClientRuntime discovers the open `RuneLite - <account>` windows and gives each client its own
+RuneLiteWindow and bot instance. Each bot runs its main loop on its own thread, so the computer vision of all
+clients runs concurrently, and screenshots are taken with a per-thread mss instance (see geometry.screen_grabber()).
+Mouse and keyboard input goes through a shared InputArbiter, which serializes it and focuses the right client
+before each burst of input (see input_arbiter.py).
+
+Screenshots read the screen, so client windows must not overlap each other.
+
+Example:
+    >>> runtime = MultiClientRuntime(OSRSWoodcutter, options={"running_time": 60, "log_action": "Drop"})
+    >>> runtime.start()
+    >>> runtime.join()
+"""
+import threading
+from typing import Callable, Dict, Iterable, List
+
+import pywinctl
+
+from model.bot import Bot, BotStatus
+from model.runelite_bot import RuneLiteWindow
+from utilities.input_arbiter import ArbitratedBackend, InputArbiter
+from utilities.input_backend import InputBackend, default_backend
+
+CLIENT_TITLE_PREFIX = "RuneLite - "
+
+
+def discover_clients(accounts: Iterable[str] = None, prefix: str = CLIENT_TITLE_PREFIX) -> Dict[str, str]:
+    """
+    Finds the open game client windows.
+    Args:
+        accounts: Only return clients of these account names (E.g., the lines of account_names.txt). All clients
+                  are returned if None.
+        prefix: The window title prefix that precedes the account name.
+    Returns:
+        A dict of {account name: window title}, in the order the windows were found.
+    """
+    accounts = None if accounts is None else set(accounts)
+    clients = {}
+    for title in pywinctl.getAllTitles():
+        if title.startswith(prefix):
+            account = title[len(prefix) :].strip()
+            if accounts is None or account in accounts:
+                clients.setdefault(account, title)
+    return clients
+
+
+class HeadlessController:
+    """
+    Stands in for the UI controller of a bot started by MultiClientRuntime. Log messages are printed with the
+    account name, and progress/status updates are ignored.
+    """
+
+    def __init__(self, account: str):
+        self.account = account
+
+    def update_log(self, msg: str, overwrite: bool = False) -> None:
+        print(f"[{self.account}] {msg}")
+
+    def clear_log(self) -> None:
+        pass
+
+    def update_progress(self) -> None:
+        pass
+
+    def update_status(self) -> None:
+        pass
+
+
+class ClientSession:
+    def __init__(self, account: str, window: RuneLiteWindow, bot: Bot):
+        """
+        One game client driven by the runtime.
+        Args:
+            account: The account name shown in the window title.
+            window: The client's window.
+            bot: The bot instance driving the client.
+        """
+        self.account = account
+        self.window = window
+        self.bot = bot
+
+    def __repr__(self) -> str:
+        return f"ClientSession({self.account!r}, {self.bot.bot_title!r}, {self.bot.status.name})"
+
+
+class MultiClientRuntime:
+    def __init__(
+        self,
+        bot_factory: Callable[[], Bot],
+        accounts: Iterable[str] = None,
+        options: dict = None,
+        arbiter: InputArbiter = None,
+        backend: InputBackend = None,
+    ):
+        """
+        Args:
+            bot_factory: Creates a bot instance (E.g., a bot class such as OSRSWoodcutter). Its window is replaced
+                         with the client's window.
+            accounts: The account names to run. All open clients are run if None.
+            options: The options to pass to each bot's save_options(). If None, bots must be configured by hand
+                     (see `sessions`) before start() is called.
+            arbiter: The InputArbiter shared by all clients. A new one is created if None.
+            backend: The InputBackend that sends the arbitrated events. Defaults to the process-wide backend.
+        """
+        self.bot_factory = bot_factory
+        self.accounts = accounts
+        self.options = options
+        self.arbiter = arbiter or InputArbiter()
+        self.backend = backend or default_backend()
+        self.sessions: Dict[str, ClientSession] = {}
+        self._lock = threading.Lock()
+
+    def discover(self) -> List[ClientSession]:
+        """
+        Creates a session (window and bot) for each open client that does not have one yet.
+        Returns:
+            The newly created sessions.
+        """
+        created = []
+        with self._lock:
+            for account, title in discover_clients(self.accounts).items():
+                if account in self.sessions:
+                    continue
+                window = RuneLiteWindow(title)
+                bot = self.bot_factory()
+                bot.win = window
+                bot.account_name = account
+                bot.set_controller(HeadlessController(account))
+                bot.set_input_backend(ArbitratedBackend(self.backend, self.arbiter, window))
+                if self.options is not None:
+                    bot.save_options(dict(self.options))
+                self.sessions[account] = ClientSession(account, window, bot)
+                created.append(self.sessions[account])
+        return created
+
+    def start(self) -> None:
+        """
+        Discovers new clients and starts every bot that is not running. Each client is focused and its window
+        initialized while holding the input lease, so the other clients do not steal focus in the meantime.
+        """
+        self.discover()
+        for session in list(self.sessions.values()):
+            if session.bot.status == BotStatus.RUNNING:
+                continue
+            with self.arbiter.session(session.window):
+                session.bot.play()
+
+    def stop(self) -> None:
+        """
+        Stops every running bot, and releases any keys or buttons it was holding down.
+        """
+        for session in list(self.sessions.values()):
+            if session.bot.thread is not None and session.bot.status != BotStatus.STOPPED:
+                session.bot.stop()
+            if isinstance(session.bot.mouse.backend, ArbitratedBackend):
+                session.bot.mouse.backend.release_all()
+
+    def join(self, timeout: float = None) -> None:
+        """
+        Blocks until every bot's main loop has ended.
+        Args:
+            timeout: The maximum number of seconds to wait for each bot.
+        """
+        for session in list(self.sessions.values()):
+            if session.bot.thread is not None:
+                session.bot.thread.join(timeout)
+
+    def status(self) -> Dict[str, BotStatus]:
+        """
+        Returns the status of each client's bot, by account name.
+        """
+        return {account: session.bot.status for account, session in self.sessions.items()}
@@ -123,8 +123,14 @@ class OSRSCombat(OSRSBot, launcher.Launchable):
                 failed_searches = 0
 
                 # Click target if mouse is actually hovering over it, else recalculate
-                self.mouse.move_to(target.random_point())
-                if not self.mouseover_text(contains="Attack", color=clr.OFF_WHITE):
+                destination = target.random_point()
+                if not self.move_and_check_mouseover(
+                    destination,
+                    contains="Attack",
+                    color=clr.OFF_WHITE,
+                    watch_rect=target.bounding_rect(),
+                    on_checkpoint=self.reaim_on_tag(target, clr.CYAN, destination),
+                ):
                     continue
                 self.mouse.click()
                 time.sleep(0.5)
@@ -5,7 +5,6 @@ import utilities.color as clr
 import utilities.random_util as rd
 import utilities.imagesearch as imsearch
 import random
-import pyautogui as pag
 from model.osrs.jagex_account_bot import OSRSJagexAccountBot
 from model.runelite_bot import BotStatus
 from utilities.api.morg_http_client import MorgHTTPSocket
@@ -104,7 +103,7 @@ class OSRSConstructor(OSRSJagexAccountBot):
 
         if self.get_item_count(f"{self.item_type}_plank") < self.min_planks:
             print(f"Not enough {self.item_type} planks, waiting for more...")
-            pag.press("1")
+            self.keyboard.press("1")
             if not self.__click_object([(clr.CYAN, "space"), (clr.YELLOW, "1")]):
                 print("Paying butler...")
                 time.sleep(2)
@@ -129,10 +128,10 @@ class OSRSConstructor(OSRSJagexAccountBot):
                 continue
             self.mouse.click()
             time.sleep(wait + random.betavariate(1, 3))  # Skewed towards 0
-            pag.press(key)
+            self.keyboard.press(key)
             time.sleep(1 + random.betavariate(1, 3))  # Skewed towards 0
             if key == "space":
-                pag.press("1")
+                self.keyboard.press("1")
                 time.sleep(1 + random.betavariate(1, 3))  # Skewed towards 0
             return True
         return False
@@ -3,7 +3,6 @@ import time
 import utilities.api.item_ids as ids
 import utilities.color as clr
 import utilities.random_util as rd
-import pyautogui as pag
 import utilities.ocr as ocr
 import utilities.imagesearch as imsearch
 from model.osrs.jagex_account_bot import OSRSJagexAccountBot
@@ -11,6 +10,7 @@ from model.runelite_bot import BotStatus
 from utilities.api.morg_http_client import MorgHTTPSocket
 from utilities.api.status_socket import StatusSocket
 from utilities.geometry import RuneLiteObject
+from utilities.mouse import MoveControl
 
 
 class OSRSFisher(OSRSJagexAccountBot):
@@ -133,7 +133,9 @@ class OSRSFisher(OSRSJagexAccountBot):
                         red_tag = self.get_nearest_tag(clr.RED)
                         if red_tag:
                             self.log_msg("Using red tag fallback to find fishing spot...")
-                            self.mouse.move_to(red_tag.random_point(), mouseSpeed="fast")
+                            # Fishing spots move, so follow the tag if it shifts while the cursor is travelling
+                            destination = red_tag.random_point()
+                            self.mouse.move_to(destination, MoveControl(on_checkpoint=self.reaim_on_tag(red_tag, clr.RED, destination)), mouseSpeed="fast")
                             time.sleep(0.5)
                             self.mouse.click()
                             time.sleep(1)
@@ -258,7 +260,7 @@ class OSRSFisher(OSRSJagexAccountBot):
                 return True
             time.sleep(1)
 
-        pag.press("space")
+        self.keyboard.press("space")
         time.sleep(3)
         if not self.active_message("Cooking"):
                 return True
@@ -299,10 +301,10 @@ class OSRSFisher(OSRSJagexAccountBot):
         # Drop all burnt items
         if burnt_slots:
             self.log_msg(f"Dropping {len(burnt_slots)} {burnt_item}(s)...")
-            pag.keyDown("shift")
+            self.keyboard.key_down("shift")
             for slot in burnt_slots:
                 self.click_inventory_slot(slot, wait=0.1)
-            pag.keyUp("shift")
+            self.keyboard.key_up("shift")
             time.sleep(0.5)
 
         # Deposit to bank (blue tag)
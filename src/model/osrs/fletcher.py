@@ -2,9 +2,10 @@ import time
 
 import utilities.color as clr
 import utilities.random_util as rd
-import pyautogui as pag
 from model.osrs.common_banking import withdraw_tagged_item_from_bank_precise
 from model.osrs.jagex_account_bot import OSRSJagexAccountBot
+from utilities.api.morg_http_client import MorgHTTPSocket
+from utilities.tick_clock import TickClock
 import random
 import pytweening
 
@@ -19,6 +20,8 @@ class OSRSFletcher(OSRSJagexAccountBot):
         self.running_time = 1
         self.take_breaks = False
         self.fletching_type = "arrows"
+        # Without the Morg HTTP Client plugin, the clock never syncs and waits whole ticks
+        self.ticks = TickClock(MorgHTTPSocket(ttl=0).get_game_tick)
 
     def create_options(self):
         self.options_builder.add_slider_option("running_time", "How long to run (minutes)?", 1, 500)
@@ -61,6 +64,7 @@ class OSRSFletcher(OSRSJagexAccountBot):
         self.mouse.move_to(self.win.cp_tabs[3].random_point())
         self.mouse.click()
 
+        self.ticks.start()
         self.logs = 0
         failed_searches = 0
         alternate = False  # Flag to alternate the order
@@ -97,13 +101,14 @@ class OSRSFletcher(OSRSJagexAccountBot):
 
     def __logout(self, msg):
         self.log_msg(msg)
+        self.ticks.stop()
         self.logout()
         self.stop()
 
     def __fletch_bows_cycle(self) -> bool:
         # If a previous cycle bailed while the bank was still open, make sure we don't start fletching.
         if self.is_bank_open():
-            pag.press("esc")
+            self.keyboard.press("esc")
             self.__wait_until_bank_closed(timeout_seconds=15)
             if self.is_bank_open():
                 self.log_msg("Bank did not close in time; aborting cycle.")
@@ -112,7 +117,7 @@ class OSRSFletcher(OSRSJagexAccountBot):
         self.__click_item(self.item_slot_1)
         self.__click_item(self.item_slot_2)
         time.sleep(random.uniform(0.6, 2.0))
-        pag.press("space")
+        self.keyboard.press("space")
 
         if not self.__wait_until_no_logs():
             self.log_msg("Timed out waiting for logs to be used. Restarting cycle.")
@@ -121,7 +126,7 @@ class OSRSFletcher(OSRSJagexAccountBot):
         if not self.__open_bank_yellow():
             self.log_msg("Could not open bank.")
             if self.is_bank_open():
-                pag.press("esc")
+                self.keyboard.press("esc")
                 self.__wait_until_bank_closed(timeout_seconds=15)
             return False
 
@@ -130,11 +135,11 @@ class OSRSFletcher(OSRSJagexAccountBot):
 
         if not withdraw_tagged_item_from_bank_precise(self, color=clr.RED, keep_open=True):
             self.log_msg("Could not withdraw red-tagged item from bank.")
-            pag.press("esc")
+            self.keyboard.press("esc")
             self.__wait_until_bank_closed(timeout_seconds=15)
             return False
 
-        pag.press("esc")
+        self.keyboard.press("esc")
         self.__wait_until_bank_closed(timeout_seconds=15)
         time.sleep(random.uniform(0.2, 0.5))
         return True
@@ -156,7 +161,7 @@ class OSRSFletcher(OSRSJagexAccountBot):
             has_logs = any(self.get_item_slot(item_name) != -1 for item_name in log_item_names)
             if not has_logs:
                 return True
-            time.sleep(0.6)
+            self.ticks.sleep_until_next_tick(offset=0.05)
         return False
 
     def __open_bank_yellow(self, timeout_seconds: int = 20) -> bool:
@@ -181,7 +186,7 @@ class OSRSFletcher(OSRSJagexAccountBot):
             time.sleep(0.2)
         # If it's still open after timeout, try one more close.
         if self.is_bank_open():
-            pag.press("esc")
+            self.keyboard.press("esc")
             time.sleep(0.5)
 
     def __click_item(self, item_slot):
@@ -5,7 +5,6 @@ import utilities.color as clr
 import utilities.random_util as rd
 import utilities.imagesearch as imsearch
 import random
-import pyautogui as pag
 from model.osrs.jagex_account_bot import OSRSJagexAccountBot
 from model.runelite_bot import BotStatus
 from utilities.api.morg_http_client import MorgHTTPSocket
@@ -70,7 +69,7 @@ class OSRSHerbalist(OSRSJagexAccountBot):
                 continue
 
             # Close bank
-            pag.press("escape")
+            self.keyboard.press("escape")
 
             # Craft potions
             if not self.__craft_potions():
@@ -95,7 +94,7 @@ class OSRSHerbalist(OSRSJagexAccountBot):
                 continue
 
             # Close bank
-            pag.press("escape")
+            self.keyboard.press("escape")
 
             self.update_progress((time.time() - start_time) / end_time)
 
@@ -118,7 +117,7 @@ class OSRSHerbalist(OSRSJagexAccountBot):
 
         time.sleep(0.3)
         # Press space to craft
-        pag.press("space")
+        self.keyboard.press("space")
         self.mouse.move_to(self.win.chat.random_point(), mouseSpeed="slow", knotsCount=2)
         return True
 
@@ -3,7 +3,6 @@ import time
 import utilities.api.item_ids as ids
 import utilities.color as clr
 import utilities.random_util as rd
-import pyautogui as pag
 from model.osrs.jagex_account_bot import OSRSJagexAccountBot
 from model.runelite_bot import BotStatus
 from utilities.api.morg_http_client import MorgHTTPSocket
@@ -63,7 +62,7 @@ class OSRSHunter(OSRSJagexAccountBot):
             if rd.random_chance(probability=0.01) and self.take_breaks:
                 self.take_break(max_seconds=30, fancy=True)
 
-            if not self.mouseover_text(contains="Catch") and not self.move_mouse_to_nearest_item(clr.CYAN, speed="fastest"):
+            if not self.mouseover_text(contains="Catch") and not self.move_mouse_to_nearest_item(clr.CYAN, speed="fastest", track=True):
                 failed_searches += 1
                 if failed_searches % 10 == 0:
                     self.log_msg("Searching for tagged items...")
@@ -107,10 +106,10 @@ class OSRSHunter(OSRSJagexAccountBot):
                 continue
             self.mouse.click()
             time.sleep(wait + random.betavariate(1, 3))  # Skewed towards 0
-            pag.press(key)
+            self.keyboard.press(key)
             time.sleep(1 + random.betavariate(1, 3))  # Skewed towards 0
             if key == "space":
-                pag.press("1")
+                self.keyboard.press("1")
                 time.sleep(1 + random.betavariate(1, 3))  # Skewed towards 0
             return True
         return False
@@ -7,7 +7,6 @@ Relies solely on computer vision and RuneLite plugin tags:
 import time
 from typing import TYPE_CHECKING
 
-import pyautogui as pag
 import utilities.color as clr
 import utilities.random_util as rd
 from model.osrs.intelligent_runner_agent import IntelligentRunnerAgent
@@ -263,7 +262,7 @@ class OSRSIntelligentRunner(OSRSJagexAccountBot):
                             # Check if bank is open and close it
                             if self.is_bank_open():
                                 self.log_msg("Bank interface detected, closing it...")
-                                pag.press("esc")
+                                self.keyboard.press("esc")
                                 time.sleep(0.5)
                                 game_state = self.agent.get_game_state()
                             # Reset movement tracking before clicking
@@ -349,7 +348,7 @@ class OSRSIntelligentRunner(OSRSJagexAccountBot):
             # Check if bank is open and close it if so
             if self.is_bank_open():
                 self.log_msg("Bank interface detected, closing it...")
-                pag.press("esc")
+                self.keyboard.press("esc")
                 time.sleep(0.5)  # Wait for bank to close
                 # Re-get game state after closing bank
                 game_state = self.agent.get_game_state()
@@ -398,7 +397,7 @@ class OSRSIntelligentRunner(OSRSJagexAccountBot):
                         # Check if bank is open and close it
                         if self.is_bank_open():
                             self.log_msg("Bank interface detected, closing it...")
-                            pag.press("esc")
+                            self.keyboard.press("esc")
                             time.sleep(0.5)
                             game_state = self.agent.get_game_state()
                         # Reset movement tracking before retry click
@@ -431,7 +430,7 @@ class OSRSIntelligentRunner(OSRSJagexAccountBot):
                                 # Check if bank is open and close it
                                 if self.is_bank_open():
                                     self.log_msg("Bank interface detected, closing it...")
-                                    pag.press("esc")
+                                    self.keyboard.press("esc")
                                     time.sleep(0.5)
                                     game_state = self.agent.get_game_state()
                                 # Reset movement tracking before clicking
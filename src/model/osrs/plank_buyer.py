@@ -1,8 +1,6 @@
 import random
 import time
 
-import pyautogui as pag
-
 import utilities.color as clr
 import utilities.ocr as ocr
 import utilities.random_util as rd
@@ -90,7 +88,7 @@ class OSRSPlankBuyer(OSRSJagexAccountBot):
             if not self.__wait_plank_menu_open():
                 continue
 
-            pag.press("space")
+            self.keyboard.press("space")
             # Wait for the dialogue to close and inventory to update; otherwise __has_logs() can still
             # see logs from before the trade and we wrongly click the trader again instead of banking.
             self.__wait_plank_menu_closed()
@@ -115,11 +113,11 @@ class OSRSPlankBuyer(OSRSJagexAccountBot):
                 retry_sleep=0.35,
             ):
                 self.log_msg("Could not withdraw red-tagged logs from bank.")
-                pag.press("esc")
+                self.keyboard.press("esc")
                 self.__wait_until_bank_closed()
                 continue
 
-            pag.press("esc")
+            self.keyboard.press("esc")
             self.__wait_until_bank_closed()
             time.sleep(random.uniform(0.2, 0.45))
 
@@ -201,5 +199,5 @@ class OSRSPlankBuyer(OSRSJagexAccountBot):
         while self.is_bank_open() and time.time() - t0 < timeout_seconds:
             time.sleep(0.2)
         if self.is_bank_open():
-            pag.press("esc")
+            self.keyboard.press("esc")
             time.sleep(0.5)
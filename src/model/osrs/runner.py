@@ -2,8 +2,6 @@ import math
 import time
 from typing import List, Optional
 
-import pyautogui as pag
-
 import utilities.color as clr
 import utilities.random_util as rd
 from model.osrs.jagex_account_bot import OSRSJagexAccountBot
@@ -284,9 +282,9 @@ class OSRSRunner(OSRSJagexAccountBot):
             return False
         self.mouse.click()
         time.sleep(5)
-        pag.press("space")
+        self.keyboard.press("space")
         time.sleep(0.3)
-        pag.press("1")
+        self.keyboard.press("1")
         time.sleep(rd.fancy_normal_sample(1.0, 1.5))
 
         # Climb down: red tagged rocks
@@ -5,7 +5,6 @@ import utilities.color as clr
 import utilities.random_util as rd
 import utilities.imagesearch as imsearch
 import random
-import pyautogui as pag
 from model.osrs.jagex_account_bot import OSRSJagexAccountBot
 from model.runelite_bot import BotStatus
 from utilities.api.morg_http_client import MorgHTTPSocket
@@ -99,7 +98,7 @@ class OSRSSmelter(OSRSJagexAccountBot):
                 time.sleep(0.5)  # Brief wait for item to appear in inventory
                 if self.get_item_slot(clr.BLUE) == -1:
                     self.log_msg("Coal not found in inventory after withdrawal, retrying...")
-                    pag.press("esc")
+                    self.keyboard.press("esc")
                     continue
                 print("clicking red tag")
                 self.withdraw_item(clr.RED)
@@ -184,7 +183,7 @@ class OSRSSmelter(OSRSJagexAccountBot):
                 # If we've been searching for 7 seconds...
                 return False
             time.sleep(1)
-        pag.press(key)
+        self.keyboard.press(key)
         return True
 
     def __craft_tiaras(self, bar: str = "Silver_bar") -> bool:
@@ -211,7 +210,7 @@ class OSRSSmelter(OSRSJagexAccountBot):
                 return False
             time.sleep(1)
 
-        pag.press("space")
+        self.keyboard.press("space")
         return True
 
     def __click_furnace(self):
@@ -4,7 +4,6 @@ import utilities.api.item_ids as ids
 import utilities.color as clr
 import utilities.imagesearch as imsearch
 import utilities.random_util as rd
-import pyautogui as pag
 from model.osrs.jagex_account_bot import OSRSJagexAccountBot
 from model.runelite_bot import BotStatus
 from utilities.api.morg_http_client import MorgHTTPSocket
@@ -152,10 +151,10 @@ class OSRSThief(OSRSJagexAccountBot):
                 continue
             self.mouse.click()
             time.sleep(wait + random.betavariate(1, 3))  # Skewed towards 0
-            pag.press(key)
+            self.keyboard.press(key)
             time.sleep(1 + random.betavariate(1, 3))  # Skewed towards 0
             if key == "space":
-                pag.press("1")
+                self.keyboard.press("1")
                 time.sleep(1 + random.betavariate(1, 3))  # Skewed towards 0
             return True
         return False
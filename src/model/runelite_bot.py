@@ -10,11 +10,11 @@ For converting RGB to HSV:
 Item ID Database:
     https://www.runelocus.com/tools/osrs-item-id-list/
 """
+import math
 import time
 from abc import ABCMeta
-from typing import List, Union
+from typing import Callable, List, Union
 
-import pyautogui as pag
 import pytweening
 from deprecated import deprecated
 
@@ -25,6 +25,7 @@ import utilities.ocr as ocr
 import utilities.runelite_cv as rcv
 from model.bot import Bot, BotStatus
 from utilities.geometry import Point, Rectangle, RuneLiteObject
+from utilities.mouse import MoveControl
 from utilities.window import Window
 
 
@@ -41,11 +42,11 @@ class RuneLiteWindow(Window):
         super().__init__(window_title, padding_top=26, padding_left=0)
 
     # Override
-    def initialize(self) -> bool:
+    def initialize(self, use_cache: bool = True) -> bool:
         """
         Overrirde of Window.initialize(). This function is called when the bot is started.
         """
-        if not super().initialize():
+        if not super().initialize(use_cache):
             return False
         self.__locate_hp_prayer_bars()
         self.current_action = Rectangle(
@@ -271,8 +272,8 @@ class RuneLiteBot(Bot, metaclass=ABCMeta):
         empty_img = imsearch.BOT_IMAGES.joinpath("ui_templates", "empty_slot.png")
         empty_slots = 0
 
-        # Check each inventory slot
-        for slot in self.win.inventory_slots:
+        # Check each inventory slot (from a single capture of the inventory)
+        for slot in self.win.inventory_slots.screenshot():
             if imsearch.search_img_in_rect(empty_img, slot, confidence=0.05):
                 empty_slots += 1
 
@@ -287,8 +288,8 @@ class RuneLiteBot(Bot, metaclass=ABCMeta):
         empty_img = imsearch.BOT_IMAGES.joinpath("ui_templates", "empty_slot.png")
         empty_slots = 0
 
-        # Check each inventory slot
-        for slot in self.win.inventory_slots:
+        # Check each inventory slot (from a single capture of the inventory)
+        for slot in self.win.inventory_slots.screenshot():
             if imsearch.search_img_in_rect(empty_img, slot, confidence=0.05):
                 empty_slots += 1
 
@@ -314,7 +315,7 @@ class RuneLiteBot(Bot, metaclass=ABCMeta):
             # Search by item name (image search) - call parent implementation
             return super().get_item_slot(item, conf)
 
-    def move_mouse_to_nearest_item(self, search_item: Union[str, clr.Color], next_nearest=False, speed="slow"):
+    def move_mouse_to_nearest_item(self, search_item: Union[str, clr.Color], next_nearest=False, speed="slow", track=False):
         """
         Locates the nearest tree and moves the mouse to it. This code is used multiple times in this script,
         so it's been abstracted into a function.
@@ -322,6 +323,8 @@ class RuneLiteBot(Bot, metaclass=ABCMeta):
             next_nearest: If True, will move the mouse to the second nearest tree. If False, will move the mouse to the
                           nearest tree.
             mouseSpeed: The speed at which the mouse will move to the tree. See mouse.py for options.
+            track: If True and `search_item` is a color, the tag is re-detected along the way and the mouse path is
+                   bent toward its new position if it has moved (see reaim_on_tag()).
         Returns:
             True if success, False otherwise.
         """
@@ -343,12 +346,67 @@ class RuneLiteBot(Bot, metaclass=ABCMeta):
         items = sorted(items, key=RuneLiteObject.distance_from_rect_center)
         item = items[1] if next_nearest else items[0]
 
+        destination = item.random_point()
+        control = None
+        if track and isinstance(search_item, clr.Color):
+            control = MoveControl(on_checkpoint=self.reaim_on_tag(item, search_item, destination))
         if next_nearest:
-            self.mouse.move_to(item.random_point(), mouseSpeed=speed, knotsCount=2)
+            self.mouse.move_to(destination, control, mouseSpeed=speed, knotsCount=2)
         else:
-            self.mouse.move_to(item.random_point(), mouseSpeed=speed)
+            self.mouse.move_to(destination, control, mouseSpeed=speed)
         return True
 
+    def reaim_on_tag(self, obj: RuneLiteObject, color: clr.Color, destination: Point, padding: int = 40) -> Callable[[MoveControl], Point]:
+        """
+        Creates a re-aiming callback for closed-loop mouse movements toward a tagged object that may move (E.g., an
+        NPC or fishing spot). At each checkpoint of the movement, the tag is re-detected in a small region around
+        its last known position, and the destination is shifted by however far the tag has moved.
+        Args:
+            obj: The tagged object being moved toward (must have a rectangle reference).
+            color: The clr.Color of the tag.
+            destination: The point within the object that the mouse is moving to.
+            padding: How many pixels around the object's last known bounds to search.
+        Returns:
+            A function suitable for MoveControl's `on_checkpoint` argument.
+        Example:
+            >>> target = self.get_nearest_tagged_NPC()
+            >>> p = target.random_point()
+            >>> self.mouse.move_to(p, MoveControl(on_checkpoint=self.reaim_on_tag(target, clr.CYAN, p)))
+        """
+        game_view = self.win.game_view
+        last_center = obj.center()
+        last_bounds = obj.bounding_rect()
+        aim = Point(destination[0], destination[1])
+
+        def reaim(control: MoveControl) -> Point:
+            nonlocal last_center, last_bounds, aim
+            # Search a small region around the last known position, clipped to the game view
+            half_width, half_height = last_bounds.width // 2, last_bounds.height // 2
+            left = max(last_center.x - half_width - padding, game_view.left)
+            top = max(last_center.y - half_height - padding, game_view.top)
+            right = min(last_center.x + half_width + padding, game_view.left + game_view.width)
+            bottom = min(last_center.y + half_height + padding, game_view.top + game_view.height)
+            if right <= left or bottom <= top:
+                return None
+            roi = Rectangle(int(left), int(top), int(right - left), int(bottom - top))
+            found = rcv.extract_objects(clr.isolate_colors(roi.screenshot(), color))
+            if not found:
+                return None
+            for candidate in found:
+                candidate.set_rectangle_reference(roi)
+            nearest = min(found, key=lambda candidate: math.dist(candidate.center(), last_center))
+            new_center = nearest.center()
+            dx, dy = new_center.x - last_center.x, new_center.y - last_center.y
+            last_center, last_bounds = new_center, nearest.bounding_rect()
+            if control.watch_rect is not None:
+                control.watch_rect = last_bounds
+            if abs(dx) < 3 and abs(dy) < 3:
+                return None  # not worth bending the path for
+            aim = Point(aim.x + dx, aim.y + dy)
+            return aim
+
+        return reaim
+
     def move_mouse_to_bank(self, color: clr.Color, use_camera_rotation: bool = True, use_minimap: bool = False, minimap_direction: str = None):
         """
         Locates the nearest bank and moves the mouse to it. This code is used multiple times in this script,
@@ -515,7 +573,7 @@ class RuneLiteBot(Bot, metaclass=ABCMeta):
         time.sleep(1)
 
         if not keep_open:
-            pag.press("esc")
+            self.keyboard.press("esc")
 
     def deposit_to_bank(self, color=clr.YELLOW, skip_slots: List[int] = None, keep_open: bool = False, use_camera_rotation: bool = True, use_minimap: bool = False, minimap_direction: str = None, bank_open_timeout: int = 20, use_empty_slot_template: bool = True, single_inventory_click: bool = False) -> bool:
         """
@@ -568,7 +626,7 @@ class RuneLiteBot(Bot, metaclass=ABCMeta):
         while not self.is_bank_open():
             print("waiting for bank to open")
             if time.time() - last_click_time >= bank_open_timeout:
-                pag.press("esc")
+                self.keyboard.press("esc")
                 print("bank not open yet; re-clicking tag")
                 if self.move_mouse_to_bank(color, use_camera_rotation, use_minimap, minimap_direction):
                     time.sleep(0.5)  # Give time for mouseover text to update
@@ -648,7 +706,7 @@ class RuneLiteBot(Bot, metaclass=ABCMeta):
 
         if not keep_open:
             time.sleep(1)
-            pag.press("esc")
+            self.keyboard.press("esc")
         return result
 
     # --- Client Settings ---
@@ -667,5 +725,5 @@ class RuneLiteBot(Bot, metaclass=ABCMeta):
             self.mouse.move_to(rl_login_icon.random_point())
             self.mouse.click()
             time.sleep(0.2)
-            pag.press("enter")
+            self.keyboard.press("enter")
             time.sleep(1)
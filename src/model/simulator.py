@@ -0,0 +1,841 @@
+"""
+Runs bot scripts against a simulated game, so their throughput (E.g., actions or logs per hour) can be measured and
+compared without a game client.
+
+- VirtualClock replaces time.sleep() and time.time() while a simulation runs. Sleeping advances the clock instead of
+  waiting, and every input event costs `input_delay` seconds (pyautogui's pause after each event). Real computation
+  time is added to the clock as well (unless `count_compute` is False), so a script's computer vision still costs
+  what it costs, but its waits are free: an hour of script time runs in the few minutes its OCR and image searches
+  take.
+- SimulatedWorld is a scripted game world. It renders client frames (see synthetic.py) as the screenshot frame
+  source: tagged objects, inventory sprites, mouseover text for the hovered object and the idle notifier's status
+  text. It reacts to the events of the bot's RecordingBackend: clicking an object interacts with it, and shift-clicking
+  an inventory item drops it. Subclasses script an activity: WoodcuttingWorld, FishingWorld and AgilityWorld.
+- Simulation runs a bot in a world for a stretch of simulated time, through the bot's usual play() path, and returns
+  a SimulationResult.
+
+Sleeps from every thread advance the same clock, so run one simulation per process at a time. Runs with the same seed
+draw the same random numbers (see seeded()). For exactly repeatable runs (E.g., to compare wait strategies), also use
+count_compute=False, since measured computation time varies.
+
+Example:
+    >>> result = Simulation(OSRSWoodcutter, WoodcuttingWorld).run(minutes=60)
+    >>> print(result.summary())
+
+From src/:
+    python -m model.simulator woodcutter --minutes 60
+"""
+import argparse
+import contextlib
+import heapq
+import itertools
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+from collections import defaultdict
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Tuple, Type, Union
+from unittest import mock
+
+import numpy as np
+
+import utilities.color as clr
+import utilities.curve_pool as curve_pool
+import utilities.geometry as geometry
+import utilities.layout_cache as lc
+import utilities.metrics as metrics
+import utilities.ocr as ocr
+import utilities.random_util as rd
+import utilities.synthetic as synthetic
+from model.bot import Bot, BotStatus
+from model.multi_client import HeadlessController
+from utilities.geometry import Rectangle
+from utilities.input_backend import InputEvent, RecordingBackend
+from utilities.window import ReplayWindow, Window
+
+SIMULATED_ACCOUNT = "Simulated"
+INPUT_DELAY = 0.1  # pyautogui.PAUSE, the pause after every mouse/keyboard event
+SIMULATED_START = time.mktime((2024, 1, 1, 9, 0, 0, 0, 0, -1))  # the local time simulations start at, so logs repeat too
+
+
+class VirtualClock:
+    def __init__(self, start: float = None, count_compute: bool = True):
+        """
+        A clock for simulated time.
+        Args:
+            start: The simulated time (as in time.time()) to start at. Defaults to now.
+            count_compute: Whether real time spent computing (outside of excluded() blocks) advances the clock.
+        """
+        self.start = time.time() if start is None else start
+        self.count_compute = count_compute
+        self._slept = 0.0
+        self._excluded = 0.0
+        self._real_start = time.perf_counter()
+        self._lock = threading.Lock()
+        self._real = None
+
+    def now(self) -> float:
+        """
+        Returns the simulated time, in seconds since the epoch.
+        """
+        return self.start + self.elapsed()
+
+    def elapsed(self) -> float:
+        """
+        Returns the simulated time since the clock started, in seconds.
+        """
+        return self._slept + (self.compute_seconds() if self.count_compute else 0)
+
+    def compute_seconds(self) -> float:
+        """
+        Returns the real time since the clock started, minus the time spent in excluded() blocks.
+        """
+        return time.perf_counter() - self._real_start - self._excluded
+
+    def advance(self, seconds: float) -> None:
+        """
+        Moves the clock forward.
+        """
+        with self._lock:
+            self._slept += max(0.0, seconds)
+
+    def sleep(self, seconds: float) -> None:
+        """
+        Stands in for time.sleep(): advances the clock instead of waiting.
+        """
+        self.advance(seconds)
+        self._real[0](0)  # let other threads run
+
+    @contextlib.contextmanager
+    def excluded(self):
+        """
+        Keeps the real time spent in a with-block (E.g., rendering simulated frames) off the clock.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            with self._lock:
+                self._excluded += time.perf_counter() - start
+
+    @contextlib.contextmanager
+    def installed(self):
+        """
+        Replaces time.sleep() and time.time() with this clock for the duration of a with-block.
+        """
+        self._real = (time.sleep, time.time)
+        time.sleep, time.time = self.sleep, self.now
+        try:
+            yield self
+        finally:
+            time.sleep, time.time = self._real
+
+
+class SimObject:
+    def __init__(self, name: str, action: str, box: synthetic.Box, tag: clr.Color = None, sprite: str = None, name_color: clr.Color = clr.CYAN):
+        """
+        Something in the simulated game view that can be hovered and clicked.
+        Args:
+            name: The object's name, shown in the mouseover text (E.g., "Tree").
+            action: The left-click action, shown in the mouseover text (E.g., "Chop down").
+            box: Its [left, top, width, height] in client coordinates.
+            tag: The color of its outline, if it is tagged.
+            sprite: An image (relative to images/bot) drawn at the box's top-left corner.
+            name_color: The color of its name in the mouseover text.
+        """
+        self.name = name
+        self.action = action
+        self.box = box
+        self.tag = tag
+        self.sprite = synthetic.load_sprite(sprite) if sprite else None
+        self.name_color = name_color
+        self.visible = True
+
+    def contains(self, x: int, y: int, margin: int = 2) -> bool:
+        left, top, width, height = self.box
+        return left - margin <= x <= left + width + margin and top - margin <= y <= top + height + margin
+
+    def __repr__(self) -> str:
+        return f"SimObject({self.action} {self.name}, {self.box})"
+
+
+class SimulatedWorld:
+    status_font = ocr.PLAIN_12
+    mouseover_font = ocr.BOLD_12
+
+    def __init__(self, clock: VirtualClock, size: Tuple[int, int] = (800, 600), seed: int = 0):
+        """
+        A scripted game world, rendered as a resizable-mode client at the top-left of the screen. Subclasses populate
+        it in setup() and react to clicks in on_click().
+        Args:
+            clock: The simulation's clock. Scheduled events fire once it passes their time.
+            size: The client size.
+            seed: Seeds the background and all of the world's randomness.
+        """
+        self.clock = clock
+        self.rng = random.Random(seed)
+        self.client = Rectangle(0, 0, size[0], size[1])
+        self.window: Window = None
+        self.objects: List[SimObject] = []
+        self.inventory: List[str] = [None] * 28
+        self.status: Tuple[str, clr.Color] = None
+        self.counters: Dict[str, int] = defaultdict(int)
+        self.keys_down = set()
+        self.cursor = (0, 0)
+        self._background, self.anchors = synthetic.client_frame(size[0], size[1], seed)
+        self._empty_slot = synthetic.load_sprite("ui_templates/empty_slot.png")
+        self._sprites: Dict[str, np.ndarray] = {}
+        self._events = []
+        self._sequence = itertools.count()
+        self._version = 0
+        self._frame = None
+        self._frame_key = None
+        self._lock = threading.RLock()
+
+    # --- Setup ---
+    def attach(self, window: Window) -> None:
+        """
+        Locates the UI in the world's frames with the bot's window, then populates the world.
+        """
+        window.initialize(use_cache=False)
+        self.window = window
+        self.setup()
+        self.changed()
+
+    def setup(self) -> None:
+        """
+        Populates the world (objects, starting inventory, status). Called once the window has been initialized.
+        """
+
+    def options(self, minutes: float) -> dict:
+        """
+        Returns the options to configure the simulated bot with (see Bot.save_options()).
+        """
+        return {"running_time": minutes}
+
+    @property
+    def playfield(self) -> Rectangle:
+        """
+        The part of the game view that objects are placed in, clear of the UI, mouseover text and status text.
+        """
+        minimap, chat = self.anchors["minimap_area"], self.anchors["chat"]
+        return Rectangle.from_points(geometry.Point(20, 60), geometry.Point(minimap[0] - 20, chat[1] - 20))
+
+    def place(self, width: int, height: int, margin: int = 10) -> synthetic.Box:
+        """
+        Picks a random box in the playfield that does not overlap any visible object.
+        """
+        field = self.playfield
+        box = None
+        for _ in range(50):
+            box = [self.rng.randint(field.left, field.left + field.width - width), self.rng.randint(field.top, field.top + field.height - height), width, height]
+            if not any(obj.visible and self.__overlaps(box, obj.box, margin) for obj in self.objects):
+                break
+        return box
+
+    @staticmethod
+    def __overlaps(a: synthetic.Box, b: synthetic.Box, margin: int) -> bool:
+        return a[0] < b[0] + b[2] + margin and b[0] < a[0] + a[2] + margin and a[1] < b[1] + b[3] + margin and b[1] < a[1] + a[3] + margin
+
+    # --- State ---
+    def changed(self) -> None:
+        """
+        Marks the world as changed, so the next frame is rendered again.
+        """
+        self._version += 1
+
+    def schedule(self, delay: float, event: Callable[[], None]) -> None:
+        """
+        Runs a function once `delay` seconds of simulated time have passed.
+        """
+        heapq.heappush(self._events, (self.clock.now() + delay, next(self._sequence), event))
+
+    def update(self) -> None:
+        """
+        Runs the scheduled events that are due.
+        """
+        with self._lock:
+            while self._events and self._events[0][0] <= self.clock.now():
+                heapq.heappop(self._events)[2]()
+
+    def set_status(self, text: str = None, color: clr.Color = clr.GREEN) -> None:
+        """
+        Sets the idle notifier text shown in the game view (E.g., "Woodcutting" in green or "NOT woodcutting" in red).
+        """
+        self.status = (text, color) if text else None
+        self.changed()
+
+    def add_item(self, item: str) -> bool:
+        """
+        Puts an item (an image name in images/bot/items) in the first empty inventory slot.
+        Returns:
+            False if the inventory is full.
+        """
+        if None not in self.inventory:
+            return False
+        self.inventory[self.inventory.index(None)] = item
+        self.changed()
+        return True
+
+    def is_inventory_full(self) -> bool:
+        return None not in self.inventory
+
+    def hovered(self) -> Union[SimObject, None]:
+        """
+        Returns the topmost visible object under the cursor.
+        """
+        for obj in reversed(self.objects):
+            if obj.visible and obj.contains(*self.cursor):
+                return obj
+        return None
+
+    # --- Input ---
+    def handle_input(self, event: InputEvent) -> None:
+        """
+        Reacts to an event from the bot's RecordingBackend (see RecordingBackend.add_listener()).
+        """
+        with self._lock:
+            self.update()
+            self.cursor = (event.x - self.client.left, event.y - self.client.top)
+            if event.kind == "key_down":
+                self.keys_down.add(event.detail)
+            elif event.kind == "key_up":
+                self.keys_down.discard(event.detail)
+            elif event.kind == "mouse_down" and event.detail == "left":
+                self.counters["clicks"] += 1
+                slot = self.__slot_at(event.x, event.y)
+                if slot is not None:
+                    self.on_inventory_click(slot)
+                else:
+                    self.on_click(self.hovered())
+
+    def __slot_at(self, x: int, y: int) -> Union[int, None]:
+        if self.window is None:
+            return None
+        for i, slot in enumerate(self.window.inventory_slots):
+            if slot.left <= x < slot.left + slot.width and slot.top <= y < slot.top + slot.height:
+                return i
+        return None
+
+    def on_inventory_click(self, slot: int) -> None:
+        """
+        Handles a left-click on an inventory slot. Shift-clicking an item drops it.
+        """
+        if self.inventory[slot] is not None and "shift" in self.keys_down:
+            self.inventory[slot] = None
+            self.counters["dropped"] += 1
+            self.changed()
+
+    def on_click(self, obj: Union[SimObject, None]) -> None:
+        """
+        Handles a left-click in the game view, on an object or on nothing.
+        """
+
+    # --- Rendering ---
+    def grab(self, monitor: dict) -> Union[np.ndarray, None]:
+        """
+        Frame source hook (see geometry.set_frame_source()): returns a screen region of the current frame, or None
+        if the region is not entirely within the client.
+        """
+        with self.clock.excluded(), self._lock:
+            self.update()
+            frame = self.render()
+        x, y = monitor["left"] - self.client.left, monitor["top"] - self.client.top
+        if x < 0 or y < 0 or x + monitor["width"] > self.client.width or y + monitor["height"] > self.client.height:
+            return None
+        return frame[y : y + monitor["height"], x : x + monitor["width"]]
+
+    def __sprite(self, item: str) -> np.ndarray:
+        if item not in self._sprites:
+            self._sprites[item] = synthetic.load_sprite(f"items/{item}.png")
+        return self._sprites[item]
+
+    def render(self) -> np.ndarray:
+        """
+        Renders the client frame. Frames are cached until the world changes or another object is hovered.
+        """
+        hovered = self.hovered()
+        key = (self._version, id(hovered))
+        if key == self._frame_key:
+            return self._frame
+        frame = self._background.copy()
+        for obj in self.objects:
+            if not obj.visible:
+                continue
+            if obj.sprite is not None:
+                synthetic.paste(frame, obj.sprite, obj.box[0], obj.box[1])
+            if obj.tag is not None:
+                synthetic.draw_tag(frame, obj.box, obj.tag)
+        if self.window is not None:
+            left, top = self.client.left, self.client.top
+            for item, slot in zip(self.inventory, self.window.inventory_slots):
+                x, y = slot.left - left, slot.top - top
+                synthetic.paste(frame, self._empty_slot, x, y)
+                if item is not None:
+                    sprite = self.__sprite(item)
+                    synthetic.paste(frame, sprite, x + (slot.width - sprite.shape[1]) // 2, y + (slot.height - sprite.shape[0]) // 2)
+            game_view = self.window.game_view
+            if self.status:
+                synthetic.draw_text(frame, self.status[0], self.status_font, game_view.left - left + 10, game_view.top - top + 28, self.status[1])
+            if hovered is not None:
+                x, y = self.window.mouseover.left - left + 4, self.window.mouseover.top - top + 5
+                x += synthetic.draw_text(frame, f"{hovered.action} ", self.mouseover_font, x, y, clr.WHITE)[2]
+                synthetic.draw_text(frame, hovered.name, self.mouseover_font, x, y, hovered.name_color)
+        self._frame, self._frame_key = frame, key
+        return frame
+
+
+class GatheringWorld(SimulatedWorld):
+    activity = "Gathering"  # the idle notifier's name for the activity
+    product = "Logs"  # the item gathered
+
+    def __init__(self, clock: VirtualClock, size: Tuple[int, int] = (800, 600), seed: int = 0, seconds_per_item: float = 4.0):
+        """
+        A world where clicking a resource starts gathering from it until it is depleted, it is clicked away from or
+        the inventory is full. The idle notifier shows "<Activity>" in green while gathering and "NOT <activity>" in
+        red otherwise.
+        Args:
+            seconds_per_item: The mean time to gather one item (exponentially distributed).
+        """
+        super().__init__(clock, size, seed)
+        self.seconds_per_item = seconds_per_item
+        self.gathering: SimObject = None
+        self._attempt = 0
+
+    def setup(self) -> None:
+        self.stop_gathering()
+
+    def stop_gathering(self) -> None:
+        self.gathering = None
+        self._attempt += 1
+        self.set_status(f"NOT {self.activity.lower()}", clr.RED)
+
+    def on_click(self, obj: Union[SimObject, None]) -> None:
+        if obj is None or not self.is_resource(obj):
+            if self.gathering is not None:
+                self.stop_gathering()
+            return
+        if self.is_inventory_full():
+            return
+        self.gathering = obj
+        self._attempt += 1
+        self.set_status(self.activity, clr.GREEN)
+        self.__schedule_item(self._attempt)
+
+    def is_resource(self, obj: SimObject) -> bool:
+        return True
+
+    def __schedule_item(self, attempt: int) -> None:
+        self.schedule(self.rng.expovariate(1 / self.seconds_per_item), lambda: self.__gather(attempt))
+
+    def __gather(self, attempt: int) -> None:
+        if attempt != self._attempt or self.gathering is None:
+            return  # the player stopped or started over since this was scheduled
+        self.add_item(self.product)
+        self.counters[self.product] += 1
+        if self.is_inventory_full() or self.on_gathered(self.gathering):
+            self.stop_gathering()
+        else:
+            self.__schedule_item(attempt)
+
+    def on_gathered(self, obj: SimObject) -> bool:
+        """
+        Called after each item is gathered from a resource.
+        Returns:
+            True if the resource was depleted (or moved away).
+        """
+        return False
+
+
+class WoodcuttingWorld(GatheringWorld):
+    activity = "Woodcutting"
+    product = "Logs"
+
+    def __init__(
+        self,
+        clock: VirtualClock,
+        size: Tuple[int, int] = (800, 600),
+        seed: int = 0,
+        seconds_per_item: float = 4.0,
+        trees: int = 3,
+        depletion_chance: float = 0.125,
+        respawn_seconds: float = 10.0,
+    ):
+        """
+        Pink-tagged trees to chop logs from, for OSRSWoodcutter ("Drop logs").
+        Args:
+            trees: The number of trees.
+            depletion_chance: The chance that a tree falls after each log.
+            respawn_seconds: How long a fallen tree takes to grow back.
+        """
+        super().__init__(clock, size, seed, seconds_per_item)
+        self.trees = trees
+        self.depletion_chance = depletion_chance
+        self.respawn_seconds = respawn_seconds
+
+    def setup(self) -> None:
+        for _ in range(self.trees):
+            self.objects.append(SimObject("Tree", "Chop down", self.place(self.rng.randint(40, 70), self.rng.randint(60, 90)), tag=clr.PINK))
+        super().setup()
+
+    def options(self, minutes: float) -> dict:
+        return {"running_time": minutes, "take_breaks": [], "log_action": "Drop logs", "bank_minimap_direction": "None"}
+
+    def on_gathered(self, obj: SimObject) -> bool:
+        if self.rng.random() >= self.depletion_chance:
+            return False
+        obj.visible = False
+        self.counters["trees_felled"] += 1
+        self.changed()
+
+        def regrow():
+            obj.box = self.place(obj.box[2], obj.box[3])
+            obj.visible = True
+            self.changed()
+
+        self.schedule(self.respawn_seconds, regrow)
+        return True
+
+
+class FishingWorld(GatheringWorld):
+    activity = "Fishing"
+    product = "Raw_lobster"
+
+    def __init__(self, clock: VirtualClock, size: Tuple[int, int] = (800, 600), seed: int = 0, seconds_per_item: float = 6.0, spot_move_seconds: float = 180.0):
+        """
+        A lobster fishing spot, found by its image, for OSRSFisher ("Raw_lobster", "Drop fish"). The player starts with
+        a lobster pot in the first inventory slot.
+        Args:
+            spot_move_seconds: The mean time before the fishing spot moves elsewhere (exponentially distributed).
+        """
+        super().__init__(clock, size, seed, seconds_per_item)
+        self.spot_move_seconds = spot_move_seconds
+        self.spot: SimObject = None
+
+    def setup(self) -> None:
+        self.inventory[0] = "Lobster_pot"
+        self.spot = SimObject("Fishing spot", "Cage", [0, 0, 0, 0], sprite="items/Raw_lobster.png")
+        self.spot.box = self.place(self.spot.sprite.shape[1], self.spot.sprite.shape[0])
+        self.objects.append(self.spot)
+        self.schedule(self.rng.expovariate(1 / self.spot_move_seconds), self.__move_spot)
+        super().setup()
+
+    def options(self, minutes: float) -> dict:
+        return {"running_time": minutes, "fish_type": "Raw_lobster", "take_breaks": [], "fish_action": "Drop fish", "bank_minimap_direction": "None"}
+
+    def __move_spot(self) -> None:
+        self.spot.visible = False
+        self.spot.box = self.place(self.spot.box[2], self.spot.box[3])
+        self.spot.visible = True
+        self.counters["spot_moves"] += 1
+        if self.gathering is self.spot:
+            self.stop_gathering()
+        self.changed()
+        self.schedule(self.rng.expovariate(1 / self.spot_move_seconds), self.__move_spot)
+
+
+class AgilityWorld(SimulatedWorld):
+    COURSE = [("Climb", "Rough wall"), ("Cross", "Tightrope"), ("Cross", "Tightrope"), ("Balance", "Narrow wall"), ("Jump-up", "Wall"), ("Jump", "Gap"), ("Climb-down", "Crate")]
+
+    def __init__(
+        self,
+        clock: VirtualClock,
+        size: Tuple[int, int] = (800, 600),
+        seed: int = 0,
+        obstacle_seconds: Tuple[float, float] = (4.0, 8.0),
+        mark_chance: float = 0.1,
+    ):
+        """
+        A rooftop agility course for OSRSIntelligentRunner. The next obstacle is tagged green and the one after it
+        yellow. Clicking the green obstacle hides the course while the player runs and crosses it, then shows the
+        following obstacle. Marks of grace (tagged green as well) sometimes appear after an obstacle.
+        Args:
+            obstacle_seconds: The range of time to reach and cross an obstacle (uniformly distributed).
+            mark_chance: The chance that a mark of grace appears after an obstacle.
+        """
+        super().__init__(clock, size, seed)
+        self.obstacle_seconds = obstacle_seconds
+        self.mark_chance = mark_chance
+        self.index = 0
+        self.busy = False
+        self.current: SimObject = None
+        self.upcoming: SimObject = None
+        self.mark: SimObject = None
+
+    def setup(self) -> None:
+        self.__show_obstacles()
+
+    def options(self, minutes: float) -> dict:
+        return {"running_time": minutes, "take_breaks": []}
+
+    def __obstacle(self, index: int, tag: clr.Color) -> SimObject:
+        action, name = self.COURSE[index % len(self.COURSE)]
+        obj = SimObject(name, action, self.place(self.rng.randint(50, 110), self.rng.randint(30, 70)), tag=tag)
+        self.objects.append(obj)
+        return obj
+
+    def __show_obstacles(self) -> None:
+        self.objects = [self.mark] if self.mark else []
+        self.current = self.__obstacle(self.index, clr.GREEN)
+        self.upcoming = self.__obstacle(self.index + 1, clr.YELLOW)
+        self.changed()
+
+    def on_click(self, obj: Union[SimObject, None]) -> None:
+        if self.busy or obj is None:
+            return
+        if obj is self.mark:
+            self.busy = True
+
+            def take():
+                self.mark, self.busy = None, False
+                self.objects.remove(obj)
+                self.counters["marks"] += 1
+                self.changed()
+
+            self.schedule(1.5, take)
+        elif obj is self.current:
+            self.busy = True
+            for visible in self.objects:
+                visible.visible = False
+            self.changed()
+            self.schedule(self.rng.uniform(*self.obstacle_seconds), self.__crossed)
+        else:
+            self.counters["wrong_obstacle"] += 1
+
+    def __crossed(self) -> None:
+        self.busy = False
+        self.counters["obstacles"] += 1
+        self.index = (self.index + 1) % len(self.COURSE)
+        if self.index == 0:
+            self.counters["laps"] += 1
+            self.mark = None
+        if self.mark is None and self.rng.random() < self.mark_chance:
+            self.mark = SimObject("Mark of grace", "Take", [0, 0, 0, 0], tag=clr.GREEN, name_color=clr.ORANGE)
+            self.mark.box = self.place(20, 20)
+        if self.mark is not None:
+            self.mark.visible = True
+        self.__show_obstacles()
+
+
+class SimulationController(HeadlessController):
+    """
+    Collects the log of a simulated bot, printing it only if asked to.
+    """
+
+    def __init__(self, verbose: bool = False):
+        super().__init__(SIMULATED_ACCOUNT)
+        self.verbose = verbose
+        self.log: List[str] = []
+
+    def update_log(self, msg: str, overwrite: bool = False) -> None:
+        self.log.append(msg)
+        if self.verbose:
+            super().update_log(msg, overwrite)
+
+
+class SimulationResult(NamedTuple):
+    bot: str
+    world: str
+    simulated_seconds: float
+    real_seconds: float
+    compute_seconds: float  # real time the bot spent computing (not rendering simulated frames)
+    actions: int  # clicks and key presses
+    iterations: int  # main loop iterations (update_progress() calls)
+    counters: Dict[str, int]  # the world's counters (E.g., items gathered, items dropped, laps)
+    errors: List[str]  # exceptions that ended the bot's thread
+    log: List[str]
+
+    def per_hour(self, count: float) -> float:
+        """
+        Converts a count over the simulated period to a rate per simulated hour.
+        """
+        return count * 3600 / self.simulated_seconds if self.simulated_seconds > 0 else 0.0
+
+    @property
+    def actions_per_hour(self) -> float:
+        return self.per_hour(self.actions)
+
+    def summary(self) -> str:
+        """
+        Formats the result as a table of totals and hourly rates.
+        """
+        lines = [
+            f"{self.bot} in {self.world}: {self.simulated_seconds / 60:.1f} simulated minutes in {self.real_seconds:.1f} s "
+            f"({self.simulated_seconds / max(self.real_seconds, 1e-9):.0f}x, {self.compute_seconds:.1f} s computing)",
+            f"{'':<20}{'total':>10}{'per hour':>12}",
+        ]
+        for name, count in [("actions", self.actions), ("iterations", self.iterations)] + sorted(self.counters.items()):
+            lines.append(f"{name:<20}{count:>10}{self.per_hour(count):>12.1f}")
+        lines.extend(f"error: {error}" for error in self.errors)
+        return "\n".join(lines)
+
+
+@contextlib.contextmanager
+def seeded(seed: int):
+    """
+    Seeds every source of randomness a bot draws from for the duration of a with-block: the global `random` and
+    `numpy.random` state, the default Sampler and the default CurvePool. The Sampler and CurvePool draw on demand on
+    the calling thread instead of on worker threads, whose timing would change the order of the draws. The previous
+    default Sampler and CurvePool are restored afterwards.
+    Args:
+        seed: The seed.
+    """
+    random.seed(seed)
+    np.random.seed(seed)
+    sampler = rd.Sampler(seed, background=False)
+    previous_sampler = rd.set_default_sampler(sampler)
+    previous_pool = curve_pool.set_default_pool(curve_pool.CurvePool(sampler=sampler, background=False))
+    try:
+        yield sampler
+    finally:
+        rd.set_default_sampler(previous_sampler)
+        curve_pool.set_default_pool(previous_pool)
+
+
+def create_bot(bot_class: Type[Bot]) -> Bot:
+    """
+    Instantiates a bot without a game client. Jagex account bots look for an account's client window while they are
+    constructed, so they are given a simulated account whose window always exists.
+    """
+    from model.osrs import jagex_account_bot
+
+    with mock.patch.object(jagex_account_bot, "read_accounts_file_lines", return_value=[SIMULATED_ACCOUNT]), mock.patch.object(
+        jagex_account_bot.pywinctl, "getWindowsWithTitle", return_value=[SIMULATED_ACCOUNT]
+    ):
+        return bot_class()
+
+
+class Simulation:
+    def __init__(
+        self,
+        bot_factory: Callable[[], Bot],
+        world_factory: Callable[..., SimulatedWorld],
+        seed: int = 0,
+        count_compute: bool = True,
+        input_delay: float = INPUT_DELAY,
+        options: dict = None,
+        verbose: bool = False,
+    ):
+        """
+        Args:
+            bot_factory: A bot class (E.g., OSRSWoodcutter), or a function creating a configured bot instance.
+            world_factory: A SimulatedWorld subclass, or a function taking (clock, seed=) and returning a world.
+            seed: Seeds the world and the bot's randomness (see seeded() and Bot.seed()).
+            count_compute: Whether real computation time advances the simulated clock (see VirtualClock).
+            input_delay: The simulated duration of each mouse/keyboard event.
+            options: Options to use instead of (or on top of) the world's defaults (see SimulatedWorld.options()).
+            verbose: Whether to print the bot's log.
+        """
+        self.bot_factory = bot_factory
+        self.world_factory = world_factory
+        self.seed = seed
+        self.count_compute = count_compute
+        self.input_delay = input_delay
+        self.options = options or {}
+        self.verbose = verbose
+
+    def run(self, minutes: float, timeout: float = None) -> SimulationResult:
+        """
+        Runs the bot until its main loop ends, which it does after `minutes` of simulated time.
+        Args:
+            minutes: The running time to configure the bot with.
+            timeout: The maximum number of real seconds to let the bot run before stopping it.
+        """
+        with seeded(self.seed):
+            clock = VirtualClock(SIMULATED_START, count_compute=self.count_compute)
+            world = self.world_factory(clock, seed=self.seed)
+            backend = RecordingBackend(screen_size=(world.client.width, world.client.height), clock=clock.now)
+            backend.add_listener(lambda event: clock.advance(self.input_delay))
+            backend.add_listener(world.handle_input)
+            controller = SimulationController(self.verbose)
+            bot = create_bot(self.bot_factory) if isinstance(self.bot_factory, type) else self.bot_factory()
+            bot.seed(self.seed)
+            bot.set_controller(controller)
+            bot.set_input_backend(backend)
+            label = bot.metrics_label
+            iterations_before = metrics.ITERATIONS.value(bot=label)
+            errors = []
+            previous_hook = threading.excepthook
+
+            def record_error(args):
+                if args.thread is bot.thread:
+                    errors.append(f"{args.exc_type.__name__}: {args.exc_value}")
+                previous_hook(args)
+
+            previous_source = geometry.frame_source()
+            previous_dir = os.getcwd()
+            real_start = time.perf_counter()
+            with tempfile.TemporaryDirectory(prefix="osbc-sim-") as workdir:
+                # Scripts write files relative to the working directory (E.g., the runner's learning data), and the
+                # simulated client's layout must not end up in the real layout cache
+                window = ReplayWindow(world.client, window_title=f"Simulation - {label}")
+                window.layout_cache = lc.LayoutCache(Path(workdir).joinpath("layout_cache.json"))
+                bot.win = window
+                os.chdir(workdir)
+                geometry.set_frame_source(world)
+                threading.excepthook = record_error
+                try:
+                    with clock.installed():
+                        bot.save_options({**world.options(minutes), **self.options})
+                        world.attach(window)
+                        bot.play()
+                        if bot.thread is not None:
+                            bot.thread.join(timeout)
+                            if bot.thread.is_alive():
+                                errors.append(f"Stopped after the {timeout} s timeout.")
+                                bot.stop()
+                finally:
+                    threading.excepthook = previous_hook
+                    geometry.set_frame_source(previous_source)
+                    window.stop_watching_geometry()
+                    os.chdir(previous_dir)
+            if bot.status == BotStatus.RUNNING and bot.thread is not None and not bot.thread.is_alive():
+                bot.set_status(BotStatus.STOPPED)  # the main loop raised instead of stopping
+            return SimulationResult(
+                bot.bot_title,
+                type(world).__name__,
+                clock.elapsed(),
+                time.perf_counter() - real_start,
+                clock.compute_seconds(),
+                backend.count("mouse_down") + backend.count("key_down"),
+                int(metrics.ITERATIONS.value(bot=label) - iterations_before),
+                dict(world.counters),
+                errors,
+                controller.log,
+            )
+
+
+# Scripts with a simulated world: name -> (bot module, bot class, world)
+SCENARIOS: Dict[str, Tuple[str, str, Type[SimulatedWorld]]] = {
+    "woodcutter": ("model.osrs.woodcutter", "OSRSWoodcutter", WoodcuttingWorld),
+    "fisher": ("model.osrs.fisher", "OSRSFisher", FishingWorld),
+    "runner": ("model.osrs.intelligent_runner", "OSRSIntelligentRunner", AgilityWorld),
+}
+
+
+def main(argv: List[str] = None) -> int:
+    import importlib
+
+    parser = argparse.ArgumentParser(prog="python -m model.simulator", description="Runs a bot script against a simulated game.")
+    parser.add_argument("scenario", choices=sorted(SCENARIOS))
+    parser.add_argument("--minutes", type=float, default=60, help="Simulated running time.")
+    parser.add_argument("--seed", type=int, default=0)
+    parser.add_argument("--no-compute", action="store_true", help="Do not count real computation time (repeatable runs).")
+    parser.add_argument("--input-delay", type=float, default=INPUT_DELAY, help="Simulated seconds per input event.")
+    parser.add_argument("--timeout", type=float, help="Real seconds after which the bot is stopped.")
+    parser.add_argument("--verbose", action="store_true", help="Print the bot's log.")
+    args = parser.parse_args(argv)
+
+    module, class_name, world = SCENARIOS[args.scenario]
+    bot_class = getattr(importlib.import_module(module), class_name)
+    simulation = Simulation(bot_class, world, seed=args.seed, count_compute=not args.no_compute, input_delay=args.input_delay, verbose=args.verbose)
+    result = simulation.run(args.minutes, args.timeout)
+    print(result.summary())
+    return 1 if result.errors else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
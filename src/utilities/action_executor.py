@@ -0,0 +1,210 @@
+"""
+Runs mouse and keyboard actions on a dedicated input thread so that the bot thread can keep doing computer
+vision while the cursor is travelling.
+
+Every action is queued in order and returns a `concurrent.futures.Future`. Movements return a MoveAction, which
+can additionally be cancelled or re-targeted mid-flight, and which reports when the cursor enters a watched
+Rectangle. This allows "move then verify" pipelines, where mouseover OCR starts as soon as the cursor is over
+the target instead of after the whole curve has been travelled.
+
+Example:
+    >>> executor = ActionExecutor(self.mouse, self.keyboard)
+    >>> verified = executor.move_then_verify(
+    >>>     target.random_point(),
+    >>>     lambda: self.mouseover_text(contains="Attack", color=clr.OFF_WHITE),
+    >>>     watch_rect=target.bounding_rect(),
+    >>> )
+    >>> if verified.result():
+    >>>     executor.click()
+"""
+import time
+from concurrent import futures
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import Callable, Set, TypeVar
+
+import utilities.metrics as metrics
+import utilities.random_util as rd
+from utilities.geometry import Rectangle
+from utilities.keyboard import Keyboard
+from utilities.mouse import Mouse, MoveControl
+
+T = TypeVar("T")
+
+
+class MoveAction:
+    def __init__(self, future: Future, control: MoveControl):
+        """
+        A handle to a queued or in-progress mouse movement.
+        Args:
+            future: Resolves to True when the cursor reaches its destination, or False if the move was cancelled.
+            control: The MoveControl steering the movement.
+        """
+        self.future = future
+        self.control = control
+
+    def cancel(self) -> None:
+        """
+        Cancels the movement, whether it has started or not.
+        """
+        self.future.cancel()
+        self.control.cancel()
+
+    def retarget(self, destination: tuple) -> None:
+        """
+        Redirects the movement to a new destination.
+        """
+        self.control.retarget(destination)
+
+    def wait_entered(self, timeout: float = None) -> bool:
+        """
+        Blocks until the cursor enters the watched Rectangle or the movement ends.
+        Args:
+            timeout: The maximum number of seconds to wait.
+        Returns:
+            True if the cursor entered the watched Rectangle, False otherwise.
+        """
+        stop_time = None if timeout is None else time.time() + timeout
+        while not self.control.entered.wait(0.005):
+            if self.control.finished.is_set() or self.future.done():
+                break
+            if stop_time is not None and time.time() > stop_time:
+                break
+        return self.control.entered.is_set()
+
+    def done(self) -> bool:
+        return self.future.done()
+
+    def wait(self, timeout: float = None) -> bool:
+        """
+        Blocks until the movement ends or `timeout` seconds have passed.
+        Returns:
+            True if the movement has ended.
+        """
+        return bool(futures.wait([self.future], timeout).done)
+
+    def result(self, timeout: float = None) -> bool:
+        """
+        Blocks until the movement ends. Returns False if it was cancelled.
+        """
+        if self.future.cancelled():
+            return False
+        return self.future.result(timeout)
+
+
+class ActionExecutor:
+    def __init__(self, mouse: Mouse, keyboard: Keyboard, verify_interval: float = 0.02):
+        """
+        Queues mouse and keyboard actions onto a single input thread.
+        Args:
+            mouse: The Mouse to move and click with.
+            keyboard: The Keyboard to press keys with.
+            verify_interval: The minimum number of seconds between verifications in move_then_verify().
+        """
+        self.mouse = mouse
+        self.keyboard = keyboard
+        self.verify_interval = verify_interval
+        self._input = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ActionExecutor-input")
+        self._verify = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ActionExecutor-verify")
+        self._pending: Set[Future] = set()
+
+    def submit(self, fn: Callable[..., T], *args, **kwargs) -> Future:
+        """
+        Queues an arbitrary function on the input thread. Metrics it records are labelled like the calling thread's,
+        and random draws it makes come from the calling thread's Sampler (see random_util.bind()).
+        Returns:
+            A Future resolving to the function's return value.
+        """
+        future = self._input.submit(ActionExecutor.__bound(metrics.context_labels(), rd.context_sampler(), fn), *args, **kwargs)
+        self._pending.add(future)
+        future.add_done_callback(self._pending.discard)
+        return future
+
+    @staticmethod
+    def __bound(labels: dict, sampler: rd.Sampler, fn: Callable[..., T]) -> Callable[..., T]:
+        def run(*args, **kwargs):
+            with metrics.bound(**labels), rd.bound(sampler):
+                return fn(*args, **kwargs)
+
+        return run
+
+    def move_to(self, destination: tuple, watch_rect: Rectangle = None, on_checkpoint: Callable[[MoveControl], tuple] = None, **kwargs) -> MoveAction:
+        """
+        Queues a human-like mouse movement. See Mouse.move_to() for kwargs.
+        Args:
+            destination: x, y tuple of the destination point.
+            watch_rect: A Rectangle whose entry should be reported through MoveAction.wait_entered().
+            on_checkpoint: A re-aiming callback (see MoveControl).
+        Returns:
+            A MoveAction.
+        """
+        control = MoveControl(watch_rect, on_checkpoint)
+        return MoveAction(self.submit(self.mouse.move_to, destination, control, **kwargs), control)
+
+    def click(self, button: str = "left", force_delay: bool = False, check_red_click: bool = False) -> Future:
+        """
+        Queues a click at wherever the cursor is when the action runs. See Mouse.click().
+        """
+        return self.submit(self.mouse.click, button, force_delay, check_red_click)
+
+    def press(self, key: str) -> Future:
+        """
+        Queues a key press.
+        """
+        return self.submit(self.keyboard.press, key)
+
+    def move_then_verify(
+        self,
+        destination: tuple,
+        verify: Callable[[], T],
+        watch_rect: Rectangle = None,
+        on_checkpoint: Callable[[MoveControl], tuple] = None,
+        **kwargs,
+    ) -> Future:
+        """
+        Moves the mouse and verifies the result (E.g., with mouseover OCR) while the cursor is still travelling.
+        Verification starts as soon as the cursor enters `watch_rect` (or when the movement ends if no Rectangle
+        is given) and is repeated until it succeeds or the movement is over, at most every `verify_interval`
+        seconds and only after the cursor has moved. The returned Future only resolves once the movement has
+        finished, so it is safe to click afterwards.
+        Args:
+            destination: x, y tuple of the destination point.
+            verify: A function returning a truthy value once the cursor is over the expected target.
+            watch_rect: The Rectangle (E.g., the target's bounding box) in which verification may begin.
+            on_checkpoint: A re-aiming callback (see MoveControl).
+        Returns:
+            A Future resolving to the first truthy value returned by `verify` (possibly read mid-flight), the value
+            of a final check on arrival if none was, or False if the move was cancelled.
+        """
+        move = self.move_to(destination, watch_rect, on_checkpoint, **kwargs)
+
+        def pipeline():
+            move.wait_entered()
+            result = None
+            verified_at = None
+            while not move.done():
+                # Verifying costs a capture and OCR, so only repeat it once the cursor is somewhere new
+                if move.control.position != verified_at:
+                    verified_at = move.control.position
+                    if result := verify():
+                        break
+                move.wait(self.verify_interval)
+            if not move.result():
+                return False
+            return result or verify()
+
+        return self._verify.submit(ActionExecutor.__bound(metrics.context_labels(), rd.context_sampler(), pipeline))
+
+    def cancel_pending(self) -> None:
+        """
+        Cancels every queued action that has not started yet.
+        """
+        for future in list(self._pending):
+            future.cancel()
+
+    def shutdown(self, wait: bool = True) -> None:
+        """
+        Cancels queued actions and stops the executor threads.
+        """
+        self.cancel_pending()
+        self._input.shutdown(wait=wait)
+        self._verify.shutdown(wait=wait)
@@ -0,0 +1,134 @@
+"""
+Animation catalog: classifies animation IDs into player activities.
+
+The constants in `animation_ids` are grouped by name into activities (idle, moving, skilling, combat, teleport,
+death) and, for skilling animations, into skills. The groups are precomputed frozensets, so classify() is a
+dictionary lookup. See game_state.IdleTracker for "has the player been idle for N ticks?".
+
+Example:
+    >>> classify(api.get_animation(), api.get_animation_id())
+    <Activity.SKILLING: 'skilling'>
+    >>> skill_of(ids.WOODCUTTING_RUNE)
+    'Woodcutting'
+"""
+from enum import Enum
+from typing import Dict, Union
+
+import utilities.api.animation_ids as animation_ids
+
+
+class Activity(Enum):
+    IDLE = "idle"
+    MOVING = "moving"
+    SKILLING = "skilling"
+    COMBAT = "combat"
+    TELEPORT = "teleport"
+    DEATH = "death"
+    OTHER = "other"
+    UNKNOWN = "unknown"
+
+
+# Pose animations (the Morg HTTP Client's "animation pose") of a player standing still, and of a player
+# walking, turning or running
+IDLE_POSES = frozenset({808, 813})
+MOVING_POSES = frozenset({819, 820, 821, 822, 824})
+
+# Constant name prefixes of skilling animations, and the skill (as named in the stats API) they belong to
+SKILL_PREFIXES = {
+    "BURYING_BONES": "Prayer",
+    "CONSTRUCTION": "Construction",
+    "COOKING": "Cooking",
+    "CRAFTING": "Crafting",
+    "DENSE_ESSENCE": "Runecraft",
+    "ECTOFUNTUS": "Prayer",
+    "FARMING": "Farming",
+    "FIREMAKING": "Firemaking",
+    "FISHING": "Fishing",
+    "FLETCHING": "Fletching",
+    "GEM_CUTTING": "Crafting",
+    "HERBLORE": "Herblore",
+    "HOME_MAKE_TABLET": "Magic",
+    "HUNTER": "Hunter",
+    "INCENSE_BURNER": "Firemaking",
+    "MAGIC": "Magic",
+    "MINING": "Mining",
+    "SMITHING": "Smithing",
+    "USING_GILDED_ALTAR": "Prayer",
+    "WOODCUTTING": "Woodcutting",
+}
+COMBAT_KEYWORDS = ("ATTACK", "DEFEND", "DEFENCE", "SPECIAL", "VENGEANCE")
+
+
+def __categorize(name: str) -> Activity:
+    if name == "IDLE":
+        return Activity.IDLE
+    if "TELEPORT" in name:
+        return Activity.TELEPORT
+    if name.endswith("DEATH"):
+        return Activity.DEATH
+    if any(name.startswith(prefix) for prefix in SKILL_PREFIXES):
+        return Activity.SKILLING
+    if any(keyword in name for keyword in COMBAT_KEYWORDS):
+        return Activity.COMBAT
+    return Activity.OTHER
+
+
+def __build_catalog():
+    activities: Dict[int, Activity] = {}
+    skills: Dict[int, str] = {}
+    activity_ids: Dict[Activity, set] = {activity: set() for activity in Activity}
+    skill_ids: Dict[str, set] = {skill: set() for skill in SKILL_PREFIXES.values()}
+    for name, animation_id in sorted(vars(animation_ids).items()):
+        if not name.isupper() or not isinstance(animation_id, int):
+            continue
+        activity = __categorize(name)
+        activity_ids[activity].add(animation_id)
+        # Some IDs are shared by several constants (E.g., DIG and FARMING_HARVEST_ALLOTMENT); skilling wins
+        if animation_id not in activities or activity == Activity.SKILLING:
+            activities[animation_id] = activity
+        if activity == Activity.SKILLING:
+            skill = next(skill for prefix, skill in SKILL_PREFIXES.items() if name.startswith(prefix))
+            skills.setdefault(animation_id, skill)
+            skill_ids[skill].add(animation_id)
+    # Moving is told apart by the pose animation, which has its own IDs
+    for pose in MOVING_POSES:
+        activities.setdefault(pose, Activity.MOVING)
+        activity_ids[Activity.MOVING].add(pose)
+    return (
+        activities,
+        skills,
+        {activity: frozenset(ids) for activity, ids in activity_ids.items()},
+        {skill: frozenset(ids) for skill, ids in skill_ids.items()},
+    )
+
+
+ACTIVITIES, SKILLS, ACTIVITY_IDS, SKILL_IDS = __build_catalog()
+
+
+def classify(animation_id: int, pose: int = None) -> Activity:
+    """
+    Classifies an animation ID.
+    Args:
+        animation_id: The player's current animation (-1 when no action is being performed).
+        pose: The player's pose animation, if known. Distinguishes standing still from walking or running.
+    Returns:
+        The Activity. Animation IDs missing from the catalog are Activity.UNKNOWN.
+    """
+    if animation_id == animation_ids.IDLE:
+        return Activity.MOVING if pose in MOVING_POSES else Activity.IDLE
+    return ACTIVITIES.get(animation_id, Activity.UNKNOWN)
+
+
+def skill_of(animation_id: int) -> Union[str, None]:
+    """
+    Returns the skill a skilling animation belongs to (E.g., "Woodcutting"), or None.
+    """
+    return SKILLS.get(animation_id)
+
+
+def is_idle(animation_id: int, pose: int) -> bool:
+    """
+    Checks whether an animation and pose mean the player is standing still doing nothing. An unknown pose (E.g.,
+    -1 or None) is not idle, since standing still cannot be confirmed.
+    """
+    return animation_id == animation_ids.IDLE and pose in IDLE_POSES
@@ -0,0 +1,261 @@
+"""
+asyncio-native clients for the RuneLite HTTP plugins.
+
+AsyncMorgClient fetches the Morg HTTP Client endpoints over a small pool of keep-alive connections, with a
+deadline on every request. AsyncStatusReceiver accepts the Status Socket plugin's POSTs. Both are plain asyncio
+streams, so no additional HTTP library is required.
+
+A single EventLoopThread (see default_loop()) can serve every bot instance in the process. Synchronous code
+can use the clients through it, E.g., `MorgHTTPSocket(client=AsyncMorgClient())` or
+`StatusSocket(receiver=AsyncStatusReceiver())` keep their existing getters while the I/O runs on the loop.
+
+Example:
+    >>> client = AsyncMorgClient()
+    >>> data = default_loop().run(client.fetch_all(), timeout=2)
+    >>> print(data["events"]["game tick"])
+"""
+import asyncio
+import threading
+from concurrent.futures import Future
+from typing import Awaitable, Callable, Dict, List, Tuple, TypeVar, Union
+
+import simplejson as JSON
+
+from utilities.api.morg_http_client import SocketError
+
+T = TypeVar("T")
+
+
+class EventLoopThread:
+    def __init__(self, name: str = "EventLoopThread"):
+        """
+        Runs an asyncio event loop on a daemon thread so that coroutines can be used from synchronous code.
+        Args:
+            name: The name of the thread.
+        """
+        self.loop = asyncio.new_event_loop()
+        self._thread = threading.Thread(target=self.loop.run_forever, name=name, daemon=True)
+        self._thread.start()
+
+    def submit(self, coro: Awaitable[T]) -> Future:
+        """
+        Schedules a coroutine on the loop.
+        Returns:
+            A concurrent.futures.Future resolving to the coroutine's result.
+        """
+        return asyncio.run_coroutine_threadsafe(coro, self.loop)
+
+    def run(self, coro: Awaitable[T], timeout: float = None) -> T:
+        """
+        Runs a coroutine on the loop and blocks until it finishes.
+        Args:
+            coro: The coroutine.
+            timeout: The maximum number of seconds to wait.
+        Returns:
+            The coroutine's result.
+        """
+        return self.submit(coro).result(timeout)
+
+    def stop(self) -> None:
+        self.loop.call_soon_threadsafe(self.loop.stop)
+
+
+__default_loop: EventLoopThread = None
+__default_loop_lock = threading.Lock()
+
+
+def default_loop() -> EventLoopThread:
+    """
+    Returns the process-wide EventLoopThread shared by all bot instances.
+    """
+    global __default_loop
+    with __default_loop_lock:
+        if __default_loop is None:
+            __default_loop = EventLoopThread()
+    return __default_loop
+
+
+async def read_http_message(reader: asyncio.StreamReader) -> Tuple[str, Dict[str, str], bytes]:
+    """
+    Reads one HTTP/1.1 message (request or response).
+    Returns:
+        A tuple of (start line, lowercase headers, body).
+    Raises:
+        asyncio.IncompleteReadError: If the connection closes mid-message.
+    """
+    start_line = (await reader.readuntil(b"\r\n")).decode("latin-1").strip()
+    headers = {}
+    while (line := await reader.readuntil(b"\r\n")) != b"\r\n":
+        name, _, value = line.decode("latin-1").partition(":")
+        headers[name.strip().lower()] = value.strip()
+    if headers.get("transfer-encoding", "").lower() == "chunked":
+        body = b""
+        while size := int((await reader.readuntil(b"\r\n")).split(b";")[0], 16):
+            body += await reader.readexactly(size)
+            await reader.readexactly(2)
+        await reader.readuntil(b"\r\n")
+    else:
+        body = await reader.readexactly(int(headers.get("content-length", 0)))
+    return start_line, headers, body
+
+
+class AsyncMorgClient:
+    def __init__(self, host: str = "localhost", port: int = 8081, timeout: float = 1, pool_size: int = 4):
+        """
+        Fetches the Morg HTTP Client endpoints ("inv", "stats", "equip", "events") with asyncio.
+        Args:
+            host: The plugin's host.
+            port: The plugin's port.
+            timeout: The default deadline for each request (seconds).
+            pool_size: The maximum number of idle keep-alive connections to keep open.
+        """
+        self.host = host
+        self.port = port
+        self.timeout = timeout
+        self.endpoints = ["inv", "stats", "equip", "events"]
+        self._idle: List[Tuple[asyncio.StreamReader, asyncio.StreamWriter]] = []
+        self._pool_size = pool_size
+
+    async def __connection(self) -> Tuple[asyncio.StreamReader, asyncio.StreamWriter]:
+        while self._idle:
+            reader, writer = self._idle.pop()
+            if not writer.is_closing() and not reader.at_eof():
+                return reader, writer
+        return await asyncio.open_connection(self.host, self.port)
+
+    def __release(self, connection: Tuple[asyncio.StreamReader, asyncio.StreamWriter], keep_alive: bool) -> None:
+        if keep_alive and len(self._idle) < self._pool_size:
+            self._idle.append(connection)
+        else:
+            connection[1].close()
+
+    async def __request(self, endpoint: str) -> Union[dict, list]:
+        reader, writer = await self.__connection()
+        try:
+            writer.write(f"GET /{endpoint} HTTP/1.1\r\nHost: {self.host}:{self.port}\r\nConnection: keep-alive\r\n\r\n".encode())
+            await writer.drain()
+            status_line, headers, body = await read_http_message(reader)
+        except BaseException:
+            writer.close()
+            raise
+        self.__release((reader, writer), headers.get("connection", "").lower() != "close")
+        status_code = int(status_line.split()[1])
+        if status_code == 204:
+            return {}
+        if status_code != 200:
+            raise SocketError(f"Unable to reach socket. Status code: {status_code}", endpoint)
+        return JSON.loads(body)
+
+    async def get(self, endpoint: str, timeout: float = None) -> Union[dict, list]:
+        """
+        Fetches a single endpoint.
+        Args:
+            endpoint: One of either "inv", "stats", "equip", "events".
+            timeout: The deadline for this request (default: the client's timeout).
+        Returns:
+            All JSON data from the endpoint.
+        Raises:
+            SocketError: If the server could not be reached, answered with an error, or missed the deadline.
+        """
+        try:
+            return await asyncio.wait_for(self.__request(endpoint), timeout or self.timeout)
+        except asyncio.TimeoutError as e:
+            raise SocketError("Request timed out", endpoint) from e
+        except (OSError, asyncio.IncompleteReadError, ValueError) as e:
+            raise SocketError("Unable to reach socket", endpoint) from e
+
+    async def fetch_all(self, endpoints: List[str] = None, timeout: float = None) -> Dict[str, Union[dict, list]]:
+        """
+        Fetches several endpoints concurrently under a shared deadline.
+        Args:
+            endpoints: The endpoints to fetch (default: all).
+            timeout: The deadline for the whole batch (default: the client's timeout).
+        Returns:
+            A dict mapping each endpoint to its JSON data.
+        Raises:
+            SocketError: If any endpoint fails.
+        """
+        endpoints = endpoints or self.endpoints
+        results = await asyncio.gather(*(self.get(endpoint, timeout) for endpoint in endpoints))
+        return dict(zip(endpoints, results))
+
+    async def close(self) -> None:
+        """
+        Closes all idle connections.
+        """
+        while self._idle:
+            _, writer = self._idle.pop()
+            writer.close()
+
+
+class AsyncStatusReceiver:
+    def __init__(self, host: str = "127.0.0.1", port: int = 5000):
+        """
+        Receives the Status Socket plugin's POSTs with an asyncio server.
+        Args:
+            host: The address to listen on.
+            port: The port the plugin posts to.
+        """
+        self.host = host
+        self.port = port
+        self.data: dict = {}
+        self._listeners: List[Callable[[dict], None]] = []
+        self._updated: asyncio.Event = None
+        self._server: asyncio.AbstractServer = None
+
+    def add_listener(self, callback: Callable[[dict], None]) -> None:
+        """
+        Registers a function that is called (on the event loop) with every received payload.
+        """
+        self._listeners.append(callback)
+
+    async def start(self) -> None:
+        """
+        Starts listening. Must be awaited on the loop that will serve the receiver.
+        Raises:
+            OSError: If the port is already in use.
+        """
+        self._updated = asyncio.Event()
+        self._server = await asyncio.start_server(self.__handle, self.host, self.port)
+
+    async def stop(self) -> None:
+        if self._server is not None:
+            self._server.close()
+            await self._server.wait_closed()
+
+    async def __handle(self, reader: asyncio.StreamReader, writer: asyncio.StreamWriter) -> None:
+        try:
+            while True:
+                _, headers, body = await read_http_message(reader)
+                writer.write(b"HTTP/1.1 200 OK\r\nContent-Length: 0\r\n\r\n")
+                await writer.drain()
+                if body:
+                    self.__receive(JSON.loads(body))
+                if headers.get("connection", "").lower() == "close":
+                    break
+        except (asyncio.IncompleteReadError, ConnectionError, ValueError):
+            pass
+        finally:
+            writer.close()
+
+    def __receive(self, data: dict) -> None:
+        self.data = data
+        for listener in self._listeners:
+            listener(data)
+        # Wake up everyone waiting for this payload, then re-arm for the next one
+        self._updated.set()
+        self._updated = asyncio.Event()
+
+    async def next_update(self, timeout: float = None) -> Union[dict, None]:
+        """
+        Waits for the next payload.
+        Args:
+            timeout: The maximum number of seconds to wait.
+        Returns:
+            The payload, or None if the timeout expired.
+        """
+        try:
+            await asyncio.wait_for(self._updated.wait(), timeout)
+        except asyncio.TimeoutError:
+            return None
+        return self.data
@@ -0,0 +1,403 @@
+"""
+Background game state service for the Morg HTTP Client and Status Socket plugins.
+
+A GameStateService polls the plugins on its own thread and merges their data into an immutable, versioned
+GameState snapshot. Each new snapshot is compared with the previous one to produce typed change events
+(E.g., XpGained, AnimationChanged). Bots can subscribe to these events, or block on them with wait_for(),
+instead of polling the plugins in a loop. IdleTracker counts how many ticks in a row the player has been idle.
+
+Example:
+    >>> state = GameStateService(MorgHTTPSocket())
+    >>> state.start()
+    >>> self.mouse.click()
+    >>> if state.wait_for(XpGained, lambda e: e.skill == "Woodcutting", timeout=10):
+    >>>     self.log_msg("Chopped a log!")
+"""
+import threading
+import time
+from collections import deque
+from types import MappingProxyType
+from typing import Callable, Dict, Iterable, List, Mapping, NamedTuple, Tuple, Type, TypeVar, Union
+
+from utilities.api.animations import is_idle
+from utilities.api.morg_http_client import MorgHTTPSocket, SocketError
+from utilities.api.status_socket import StatusSocket
+
+EMPTY_SLOT = (-1, 0)
+
+
+class GameState(NamedTuple):
+    """
+    An immutable snapshot of the game state. Values that are unknown are -1 (or empty).
+    """
+
+    version: int
+    timestamp: float
+    tick: int = -1
+    hitpoints: Tuple[int, int] = (-1, -1)  # (current, maximum)
+    run_energy: int = -1
+    animation: int = -1
+    animation_pose: int = -1
+    position: Tuple[int, int, int] = (-1, -1, -1)  # world point (x, y, plane)
+    in_combat: bool = False
+    latest_msg: str = ""
+    inventory: Tuple[Tuple[int, int], ...] = ()  # (item ID, quantity) for each slot, EMPTY_SLOT if empty
+    skills: Mapping[str, Tuple[int, int]] = MappingProxyType({})  # skill name -> (level, xp)
+
+
+class TickAdvanced(NamedTuple):
+    tick: int
+    previous: int
+    version: int
+
+
+class XpGained(NamedTuple):
+    skill: str
+    xp: int
+    gained: int
+    version: int
+
+
+class AnimationChanged(NamedTuple):
+    animation: int
+    previous: int
+    version: int
+
+
+class InventorySlotChanged(NamedTuple):
+    index: int
+    item_id: int
+    quantity: int
+    previous_id: int
+    previous_quantity: int
+    version: int
+
+
+class HitpointsChanged(NamedTuple):
+    current: int
+    maximum: int
+    previous: int
+    version: int
+
+
+class HitpointsBelow(NamedTuple):
+    """
+    Emitted when the player's hitpoints drop below one of the service's `hp_thresholds`.
+    """
+
+    current: int
+    maximum: int
+    threshold: int
+    version: int
+
+
+GameEvent = Union[TickAdvanced, XpGained, AnimationChanged, InventorySlotChanged, HitpointsChanged, HitpointsBelow]
+E = TypeVar("E")
+
+
+def __int(value, default: int = -1) -> int:
+    try:
+        return int(value)
+    except (TypeError, ValueError):
+        return default
+
+
+def parse_morg(state: Dict, events: dict = None, inv: list = None, stats: list = None) -> None:
+    """
+    Copies data from the Morg HTTP Client endpoints into a dict of GameState fields.
+    """
+    if events:
+        if health := events.get("health"):
+            current, maximum = health.split("/")
+            state["hitpoints"] = (__int(current), __int(maximum))
+        state["run_energy"] = __int(events.get("run energy"), state.get("run_energy", -1))
+        state["animation"] = __int(events.get("animation"), state.get("animation", -1))
+        state["animation_pose"] = __int(events.get("animation pose"), state.get("animation_pose", -1))
+        state["tick"] = __int(events.get("game tick"), state.get("tick", -1))
+        if point := events.get("worldPoint"):
+            state["position"] = (__int(point.get("x")), __int(point.get("y")), __int(point.get("plane")))
+        if "npc name" in events:
+            state["in_combat"] = events["npc name"] != "null"
+        state["latest_msg"] = events.get("latest msg", state.get("latest_msg", ""))
+    if inv is not None:
+        state["inventory"] = tuple((item["id"], item["quantity"]) if item["quantity"] else EMPTY_SLOT for item in inv)
+    if stats:
+        state["skills"] = MappingProxyType({i["stat"]: (__int(i["level"]), __int(i["xp"])) for i in stats[1:]})
+
+
+def parse_status(state: Dict, data: dict) -> None:
+    """
+    Copies data from the Status Socket plugin into a dict of GameState fields.
+    """
+    if not data:
+        return
+    state["tick"] = __int(data.get("tick"), state.get("tick", -1))
+    state["run_energy"] = __int(data.get("runEnergy"), state.get("run_energy", -1))
+    if attack := data.get("attack"):
+        state["animation"] = __int(attack.get("animationId"), state.get("animation", -1))
+    if (inventory := data.get("inventory")) is not None:
+        slots = [EMPTY_SLOT] * 28
+        for item in inventory:
+            slots[item["index"]] = (item["id"], item["amount"])
+        state["inventory"] = tuple(slots)
+    if skills := data.get("skills"):
+        state["skills"] = MappingProxyType(
+            {skill["skillName"].capitalize(): (__int(skill.get("realLevel")), __int(skill.get("experience"))) for skill in skills}
+        )
+
+
+def diff(old: GameState, new: GameState, hp_thresholds: Iterable[int] = ()) -> List[GameEvent]:
+    """
+    Lists the change events between two snapshots.
+    """
+    events = []
+    v = new.version
+    if new.tick > old.tick:
+        events.append(TickAdvanced(new.tick, old.tick, v))
+    for skill, (_, xp) in new.skills.items():
+        if skill in old.skills and xp > old.skills[skill][1]:
+            events.append(XpGained(skill, xp, xp - old.skills[skill][1], v))
+    if new.animation != old.animation:
+        events.append(AnimationChanged(new.animation, old.animation, v))
+    if old.inventory and new.inventory != old.inventory:
+        for i, (slot, old_slot) in enumerate(zip(new.inventory, old.inventory)):
+            if slot != old_slot:
+                events.append(InventorySlotChanged(i, slot[0], slot[1], old_slot[0], old_slot[1], v))
+    current, maximum = new.hitpoints
+    previous = old.hitpoints[0]
+    if current != previous and current != -1:
+        events.append(HitpointsChanged(current, maximum, previous, v))
+        events.extend(HitpointsBelow(current, maximum, t, v) for t in hp_thresholds if current < t <= previous or (current < t and previous == -1))
+    return events
+
+
+class GameStateService:
+    MAX_BACKOFF = 5.0  # seconds between Morg HTTP Client polls during an outage
+
+    def __init__(
+        self,
+        morg: MorgHTTPSocket = None,
+        status: StatusSocket = None,
+        interval: float = 0.2,
+        hp_thresholds: Iterable[int] = (),
+        history: int = 256,
+    ):
+        """
+        Ingests plugin data into versioned GameState snapshots and emits change events.
+        Args:
+            morg: The MorgHTTPSocket to poll (optional).
+            status: The StatusSocket whose received data should be ingested (optional).
+            interval: The number of seconds between polls.
+            hp_thresholds: Hitpoint values that emit HitpointsBelow events when crossed downwards.
+            history: The number of recent events kept for wait_for().
+        """
+        self.morg = morg
+        self.status = status
+        self.interval = interval
+        self.hp_thresholds = tuple(hp_thresholds)
+        self._state = GameState(version=0, timestamp=time.time())
+        self._events: deque = deque(maxlen=history)  # (sequence number, event)
+        self._seq = 0
+        self._cond = threading.Condition()
+        self._subscribers: Dict[type, List[Callable[[GameEvent], None]]] = {}
+        self._ingest_lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+
+    @property
+    def state(self) -> GameState:
+        """
+        The latest GameState snapshot.
+        """
+        return self._state
+
+    def start(self) -> None:
+        """
+        Starts polling the plugins on a daemon thread. While it runs, the MorgHTTPSocket's waiting getters
+        (E.g., wait_til_gained_xp()) block on this service's snapshots instead of polling.
+        """
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        if self.morg is not None:
+            self.morg.state_service = self
+        self._thread = threading.Thread(target=self.__poll, name="GameStateService", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        """
+        Stops polling. Snapshots and subscriptions are kept.
+        """
+        self._stop.set()
+        if self.morg is not None and self.morg.state_service is self:
+            self.morg.state_service = None
+
+    def __poll(self) -> None:
+        backoff, retry_at = 0, 0
+        while not self._stop.is_set():
+            started = time.time()
+            morg_data = {}
+            if self.morg is not None and started >= retry_at:
+                try:
+                    morg_data = self.morg.fetch_all([self.morg.events_endpoint, self.morg.inv_endpoint, self.morg.stats_endpoint])
+                    if backoff:
+                        print("GameStateService reconnected to the Morg HTTP Client.")
+                    backoff = 0
+                except SocketError as e:
+                    if not backoff:
+                        print(f"GameStateService failed to poll the Morg HTTP Client: {e}")
+                    # Retry less often while the plugin is unavailable; status data is still ingested every interval
+                    backoff = min(max(2 * backoff, self.interval), self.MAX_BACKOFF)
+                    retry_at = started + backoff
+            status_data = self.status.player_data if self.status is not None else None
+            self.ingest(morg_data.get("events"), morg_data.get("inv"), morg_data.get("stats"), status_data)
+            self._stop.wait(max(0, self.interval - (time.time() - started)))
+
+    def ingest(self, events: dict = None, inv: list = None, stats: list = None, status: dict = None) -> GameState:
+        """
+        Merges plugin data into a new snapshot and emits the resulting change events. Data that is not given is
+        carried over from the previous snapshot. This is called by the polling thread, but can also be fed
+        directly (E.g., from a recorded session).
+        Args:
+            events, inv, stats: JSON data from the Morg HTTP Client endpoints of the same names.
+            status: JSON data from the Status Socket plugin.
+        Returns:
+            The new GameState.
+        """
+        with self._ingest_lock:
+            old = self._state
+            fields = old._asdict()
+            parse_status(fields, status)
+            parse_morg(fields, events, inv, stats)
+            fields.update(version=old.version + 1, timestamp=time.time())
+            new = GameState(**fields)
+            changes = diff(old, new, self.hp_thresholds) if old.version else []
+            with self._cond:
+                self._state = new
+                for event in changes:
+                    self._seq += 1
+                    self._events.append((self._seq, event))
+                self._cond.notify_all()
+            for event in changes:
+                for callback in self._subscribers.get(type(event), []):
+                    try:
+                        callback(event)
+                    except Exception as e:
+                        print(f"GameStateService subscriber failed on {type(event).__name__}: {e}")
+        return new
+
+    def subscribe(self, event_type: Type[E], callback: Callable[[E], None]) -> Callable[[], None]:
+        """
+        Calls a function with every event of a given type. Callbacks run on the polling thread and should
+        return quickly.
+        Args:
+            event_type: The event class (E.g., XpGained).
+            callback: The function to call with each event.
+        Returns:
+            A function that removes the subscription.
+        """
+        self._subscribers.setdefault(event_type, []).append(callback)
+        return lambda: self._subscribers[event_type].remove(callback)
+
+    def wait_for(self, event_type: Type[E], predicate: Callable[[E], bool] = None, timeout: float = None) -> Union[E, None]:
+        """
+        Blocks until an event of the given type (optionally matching a predicate) is emitted. Only events
+        emitted after this call are considered.
+        Args:
+            event_type: The event class (E.g., AnimationChanged).
+            predicate: An optional function that the event must satisfy.
+            timeout: The maximum number of seconds to wait.
+        Returns:
+            The event, or None if the timeout expired.
+        Example:
+            >>> state.wait_for(HitpointsChanged, lambda e: e.current < 20, timeout=30)
+        """
+        stop_time = None if timeout is None else time.time() + timeout
+        with self._cond:
+            seen = self._seq
+            while True:
+                for seq, event in self._events:
+                    if seq > seen and isinstance(event, event_type) and (predicate is None or predicate(event)):
+                        return event
+                seen = self._seq
+                remaining = None if stop_time is None else stop_time - time.time()
+                if remaining is not None and remaining <= 0:
+                    return None
+                self._cond.wait(remaining)
+
+    def wait_until(self, predicate: Callable[[GameState], bool], timeout: float = None) -> Union[GameState, None]:
+        """
+        Blocks until a snapshot satisfies a predicate. The current snapshot is checked first.
+        Args:
+            predicate: A function of a GameState.
+            timeout: The maximum number of seconds to wait.
+        Returns:
+            The first matching GameState, or None if the timeout expired.
+        Example:
+            >>> state.wait_until(lambda s: s.inventory.count(EMPTY_SLOT) == 0, timeout=60)
+        """
+        with self._cond:
+            if self._cond.wait_for(lambda: predicate(self._state), timeout):
+                return self._state
+        return None
+
+
+class IdleTracker:
+    def __init__(self, state: GameStateService):
+        """
+        Counts how many consecutive game ticks the player has been idle, based on a GameStateService.
+        Args:
+            state: The (started) GameStateService to follow.
+        """
+        self.state = state
+        self._idle_since: int = None  # the first tick of the current idle streak
+        self._tick = -1
+        self._cond = threading.Condition()
+        self._unsubscribe = state.subscribe(TickAdvanced, lambda event: self.update(self.state.state))
+        self.update(state.state)
+
+    def update(self, snapshot: GameState) -> None:
+        """
+        Updates the idle streak from a snapshot. Called automatically on every tick.
+        """
+        with self._cond:
+            self._tick = snapshot.tick
+            if not is_idle(snapshot.animation, snapshot.animation_pose):
+                self._idle_since = None
+            elif self._idle_since is None:
+                self._idle_since = snapshot.tick
+            self._cond.notify_all()
+
+    @property
+    def idle_ticks(self) -> int:
+        """
+        The number of consecutive ticks the player has been idle for (0 if they are busy).
+        """
+        if self._idle_since is None:
+            return 0
+        return self._tick - self._idle_since + 1
+
+    def is_idle(self, ticks: int = 1) -> bool:
+        """
+        Checks whether the player has been idle for at least `ticks` consecutive ticks.
+        """
+        return self.idle_ticks >= ticks
+
+    def wait_until_idle(self, ticks: int = 2, timeout: float = None) -> bool:
+        """
+        Blocks until the player has been idle for `ticks` consecutive ticks.
+        Args:
+            ticks: The number of idle ticks required. A small debounce (2-3) skips the brief gaps between
+                   repeated actions (E.g., between two logs being chopped).
+            timeout: The maximum number of seconds to wait.
+        Returns:
+            True if the player became idle, False if the timeout expired.
+        """
+        with self._cond:
+            return self._cond.wait_for(lambda: self.idle_ticks >= ticks, timeout)
+
+    def close(self) -> None:
+        """
+        Stops following the GameStateService.
+        """
+        self._unsubscribe()
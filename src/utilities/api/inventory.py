@@ -0,0 +1,163 @@
+"""
+Indexed inventory and equipment models built from RuneLite plugin data.
+
+The plugins report the inventory and equipment as raw JSON lists. Inventory and Equipment parse such a list
+once and index it by item ID, so that queries (E.g., "which slots hold food?") are dictionary lookups instead of
+scans over the list. MorgHTTPSocket and StatusSocket build one model per snapshot and answer their inventory and
+equipment getters from it.
+
+Item IDs can be given as a single int or any collection of ints. The item groups in `item_ids` (E.g., `all_food`)
+are frozensets.
+"""
+from typing import Dict, FrozenSet, Iterable, List, Tuple, Union
+
+ItemIds = Union[int, Iterable[int]]
+
+INVENTORY_SIZE = 28
+EMPTY_ID = -1
+
+
+def id_set(item_id: ItemIds) -> FrozenSet[int]:
+    """
+    Converts a single item ID or a collection of item IDs to a frozenset.
+    """
+    if isinstance(item_id, int):
+        return frozenset((item_id,))
+    if isinstance(item_id, frozenset):
+        return item_id
+    return frozenset(item_id)
+
+
+class Inventory:
+    def __init__(self, slots: Iterable[Tuple[int, int]]):
+        """
+        An immutable, indexed inventory.
+        Args:
+            slots: (item ID, quantity) for each inventory slot in order. Empty slots have the ID -1.
+        """
+        self.slots: Tuple[Tuple[int, int], ...] = tuple(slots)
+        index: Dict[int, List[int]] = {}
+        totals: Dict[int, int] = {}
+        for i, (item_id, quantity) in enumerate(self.slots):
+            if item_id == EMPTY_ID or quantity == 0:
+                continue
+            index.setdefault(item_id, []).append(i)
+            totals[item_id] = totals.get(item_id, 0) + quantity
+        self.index: Dict[int, Tuple[int, ...]] = {item_id: tuple(indices) for item_id, indices in index.items()}
+        self.totals = totals
+        self.occupied = sum(len(indices) for indices in self.index.values())
+
+    @classmethod
+    def from_morg(cls, data: list) -> "Inventory":
+        """
+        Builds an Inventory from the Morg HTTP Client "inv" endpoint (a list of {id, quantity}, one per slot).
+        """
+        return cls((item["id"], item["quantity"]) for item in data)
+
+    @classmethod
+    def from_status(cls, data: Iterable) -> "Inventory":
+        """
+        Builds an Inventory from the Status Socket "inventory" field (a list of {index, id, amount} for occupied slots).
+        """
+        slots = [(EMPTY_ID, 0)] * INVENTORY_SIZE
+        for item in data:
+            slots[item["index"]] = (item["id"], item["amount"])
+        return cls(slots)
+
+    def __len__(self) -> int:
+        return self.occupied
+
+    def contains(self, item_id: ItemIds) -> bool:
+        """
+        Checks if any of the items are in the inventory.
+        """
+        if isinstance(item_id, int):
+            return item_id in self.index
+        return any(i in self.index for i in id_set(item_id))
+
+    def indices(self, item_id: ItemIds) -> List[int]:
+        """
+        Returns the slot indexes that the item(s) exist in, in slot order.
+        """
+        if isinstance(item_id, int):
+            return list(self.index.get(item_id, ()))
+        return sorted(i for item in id_set(item_id) for i in self.index.get(item, ()))
+
+    def first_occurrence(self, item_id: ItemIds) -> Union[int, List[int]]:
+        """
+        For a single item ID, returns the first slot index it exists in (or -1). For a collection of item IDs,
+        returns the first slot index of each ID that is present, in slot order.
+        """
+        if isinstance(item_id, int):
+            return self.index[item_id][0] if item_id in self.index else -1
+        return sorted(self.index[item][0] for item in id_set(item_id) if item in self.index)
+
+    def stack_amount(self, item_id: ItemIds) -> int:
+        """
+        Returns the quantity in the first slot holding any of the items, or 0. This is meant for items that stack
+        (E.g., coins, runes).
+        """
+        slots = self.indices(item_id)
+        return int(self.slots[slots[0]][1]) if slots else 0
+
+    def total(self, item_id: ItemIds) -> int:
+        """
+        Returns the total quantity of the item(s) across all slots.
+        """
+        if isinstance(item_id, int):
+            return self.totals.get(item_id, 0)
+        return sum(self.totals.get(item, 0) for item in id_set(item_id))
+
+    def is_full(self) -> bool:
+        return self.occupied >= INVENTORY_SIZE
+
+    def is_empty(self) -> bool:
+        return self.occupied == 0
+
+    def to_list(self) -> List[dict]:
+        """
+        Returns the occupied slots as dicts with the keys "index", "id" and "quantity".
+        """
+        return [{"index": i, "id": item_id, "quantity": quantity} for i, (item_id, quantity) in enumerate(self.slots) if item_id != EMPTY_ID and quantity]
+
+
+class Equipment:
+    def __init__(self, items: Iterable[Tuple[int, int]]):
+        """
+        An immutable, indexed set of equipped items.
+        Args:
+            items: (item ID, quantity) for each equipment slot. Empty slots have the ID -1.
+        """
+        self.quantities: Dict[int, int] = {}
+        for item_id, quantity in items:
+            if item_id != EMPTY_ID:
+                self.quantities[item_id] = self.quantities.get(item_id, 0) + int(quantity)
+        self.ids: FrozenSet[int] = frozenset(self.quantities)
+
+    @classmethod
+    def from_morg(cls, data: list) -> "Equipment":
+        """
+        Builds Equipment from the Morg HTTP Client "equip" endpoint (a list of {id, quantity}).
+        """
+        return cls((item["id"], item.get("quantity", 1)) for item in data)
+
+    @classmethod
+    def from_status(cls, data: Iterable) -> "Equipment":
+        """
+        Builds Equipment from the Status Socket "equipment" field (a list of {id, amount}).
+        """
+        return cls((item["id"], item.get("amount", 1)) for item in data)
+
+    def is_equipped(self, item_id: ItemIds) -> bool:
+        """
+        Checks if any of the items are equipped.
+        """
+        if isinstance(item_id, int):
+            return item_id in self.ids
+        return not self.ids.isdisjoint(id_set(item_id))
+
+    def quantity(self, item_id: int) -> int:
+        """
+        Returns the quantity of an equipped item, or 0 if it is not equipped.
+        """
+        return self.quantities.get(item_id, 0)
@@ -0,0 +1,177 @@
+"""
+Compact, lazily-loaded item database.
+
+Item names and IDs are stored in an SQLite file (item_ids.db) instead of a Python module with thousands of
+constants. Nothing is read until the first lookup, and lookups only load the rows they need. The `item_ids`
+module is a thin shim over this database, so `item_ids.LOGS` and `item_ids.all_food` keep working.
+
+Names follow the constant naming of RuneLite's ItemID class (E.g., "RAW_SHRIMPS", "DRAGON_PICKAXE_12797").
+Groups (E.g., "all_food") are named sets of item IDs.
+
+To rebuild the database from a Python module of constants (E.g., an older item_ids.py or a generated one):
+    python -m utilities.api.item_db path/to/item_ids.py
+"""
+import ast
+import difflib
+import sqlite3
+import threading
+from pathlib import Path
+from typing import Dict, FrozenSet, List, Tuple, Union
+
+DB_PATH = Path(__file__).with_name("item_ids.db")
+
+
+class ItemDatabase:
+    def __init__(self, path: Union[str, Path] = DB_PATH):
+        """
+        Args:
+            path: The SQLite database file. It is not opened until the first lookup.
+        """
+        self.path = Path(path)
+        self._conn: sqlite3.Connection = None
+        self._lock = threading.Lock()
+        self._names: List[str] = None
+        self._groups: Dict[str, FrozenSet[int]] = {}
+
+    def __query(self, sql: str, params: tuple = ()) -> List[tuple]:
+        with self._lock:
+            if self._conn is None:
+                if not self.path.exists():
+                    raise FileNotFoundError(f"Item database not found: {self.path}. Build it with `python -m utilities.api.item_db`.")
+                self._conn = sqlite3.connect(f"file:{self.path}?mode=ro", uri=True, check_same_thread=False)
+            return self._conn.execute(sql, params).fetchall()
+
+    def id(self, name: str) -> int:
+        """
+        Returns the ID of an item.
+        Args:
+            name: The item's constant name (E.g., "LOGS"). Case-insensitive.
+        Raises:
+            KeyError: If there is no item with that name.
+        """
+        rows = self.__query("SELECT id FROM items WHERE name = ?", (name.upper(),))
+        if not rows:
+            raise KeyError(name)
+        return rows[0][0]
+
+    def name(self, item_id: int) -> Union[str, None]:
+        """
+        Returns the name of an item ID, or None if it is unknown.
+        """
+        # The table is keyed by name to keep the file small; scanning it for an ID takes about a millisecond
+        rows = self.__query("SELECT name FROM items WHERE id = ?", (item_id,))
+        return rows[0][0] if rows else None
+
+    def search(self, prefix: str, limit: int = 25) -> List[Tuple[str, int]]:
+        """
+        Finds items whose name starts with a prefix.
+        Args:
+            prefix: The start of the name (E.g., "RAW_"). Case-insensitive.
+            limit: The maximum number of results.
+        Returns:
+            A list of (name, ID) tuples, sorted by name.
+        """
+        # Names only contain [A-Z0-9_], so escape the LIKE wildcard "_"
+        pattern = prefix.upper().replace("_", "\\_") + "%"
+        return self.__query("SELECT name, id FROM items WHERE name LIKE ? ESCAPE '\\' ORDER BY name LIMIT ?", (pattern, limit))
+
+    def fuzzy(self, query: str, limit: int = 5, cutoff: float = 0.6) -> List[Tuple[str, int]]:
+        """
+        Finds the items whose names are most similar to a query (E.g., "dragon pickax" -> DRAGON_PICKAXE).
+        Args:
+            query: The approximate name. Spaces are treated as underscores.
+            limit: The maximum number of results.
+            cutoff: The minimum similarity (0-1).
+        Returns:
+            A list of (name, ID) tuples, best match first.
+        """
+        if self._names is None:
+            self._names = [row[0] for row in self.__query("SELECT name FROM items")]
+        matches = difflib.get_close_matches(query.upper().replace(" ", "_"), self._names, limit, cutoff)
+        return [(name, self.id(name)) for name in matches]
+
+    def group(self, name: str) -> FrozenSet[int]:
+        """
+        Returns the item IDs of a group (E.g., "all_food").
+        Raises:
+            KeyError: If there is no group with that name.
+        """
+        if name not in self._groups:
+            rows = self.__query("SELECT id FROM groups WHERE name = ?", (name,))
+            if not rows:
+                raise KeyError(name)
+            self._groups[name] = frozenset(row[0] for row in rows)
+        return self._groups[name]
+
+    def group_names(self) -> List[str]:
+        return [row[0] for row in self.__query("SELECT DISTINCT name FROM groups ORDER BY name")]
+
+    def item_names(self) -> List[str]:
+        return [row[0] for row in self.__query("SELECT name FROM items")]
+
+
+__default_db: ItemDatabase = None
+
+
+def default_db() -> ItemDatabase:
+    """
+    Returns the process-wide ItemDatabase.
+    """
+    global __default_db
+    if __default_db is None:
+        __default_db = ItemDatabase()
+    return __default_db
+
+
+def parse_constants(source: str) -> Tuple[Dict[str, int], Dict[str, List[int]]]:
+    """
+    Reads item constants (`NAME = 123`) and groups (`name = [NAME, ...]`, or a set/frozenset of names) from
+    Python source without executing it.
+    Returns:
+        A tuple of ({name: ID}, {group name: [IDs]}).
+    """
+    items: Dict[str, int] = {}
+    groups: Dict[str, List[int]] = {}
+    for node in ast.parse(source).body:
+        if not (isinstance(node, ast.Assign) and len(node.targets) == 1 and isinstance(node.targets[0], ast.Name)):
+            continue
+        name, value = node.targets[0].id, node.value
+        if isinstance(value, ast.Constant) and isinstance(value.value, int):
+            items[name] = value.value
+            continue
+        if isinstance(value, ast.Call) and getattr(value.func, "id", None) == "frozenset" and value.args:
+            value = value.args[0]
+        if isinstance(value, (ast.List, ast.Set, ast.Tuple)):
+            groups[name] = [items[element.id] if isinstance(element, ast.Name) else element.value for element in value.elts]
+    return items, groups
+
+
+def build(source_path: Union[str, Path], db_path: Union[str, Path] = DB_PATH) -> None:
+    """
+    Compiles a Python module of item constants into an item database.
+    Args:
+        source_path: The Python file to read (see parse_constants()).
+        db_path: The database file to (over)write.
+    """
+    items, groups = parse_constants(Path(source_path).read_text())
+    db_path = Path(db_path)
+    db_path.unlink(missing_ok=True)
+    conn = sqlite3.connect(db_path)
+    with conn:
+        conn.execute("CREATE TABLE items (name TEXT PRIMARY KEY, id INTEGER NOT NULL) WITHOUT ROWID")
+        conn.execute("CREATE TABLE groups (name TEXT NOT NULL, id INTEGER NOT NULL)")
+        conn.execute("CREATE INDEX groups_name ON groups (name)")
+        conn.executemany("INSERT INTO items (name, id) VALUES (?, ?)", items.items())
+        conn.executemany("INSERT INTO groups (name, id) VALUES (?, ?)", [(group, item_id) for group, ids in groups.items() for item_id in dict.fromkeys(ids)])
+    conn.execute("VACUUM")
+    conn.close()
+    print(f"Wrote {len(items)} items and {len(groups)} groups to {db_path}")
+
+
+if __name__ == "__main__":
+    import sys
+
+    if len(sys.argv) < 2:
+        print("Usage: python -m utilities.api.item_db <constants.py> [output.db]")
+        sys.exit(1)
+    build(*sys.argv[1:3])
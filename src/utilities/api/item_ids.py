@@ -1,19082 +1,32 @@
 """
 Item IDs: https://www.runelocus.com/tools/osrs-item-id-list/
-"""
-DWARF_REMAINS = 0
-TOOLKIT = 1
-CANNONBALL = 2
-NULODIONS_NOTES = 3
-AMMO_MOULD = 4
-INSTRUCTION_MANUAL = 5
-CANNON_BASE = 6
-CANNON_BASE_NOTED = 7
-CANNON_STAND = 8
-CANNON_STAND_NOTED = 9
-CANNON_BARRELS = 10
-CANNON_BARRELS_NOTED = 11
-CANNON_FURNACE = 12
-CANNON_FURNACE_NOTED = 13
-RAILING = 14
-HOLY_TABLE_NAPKIN = 15
-MAGIC_WHISTLE = 16
-GRAIL_BELL = 17
-MAGIC_GOLD_FEATHER = 18
-HOLY_GRAIL = 19
-WHITE_COG = 20
-BLACK_COG = 21
-BLUE_COG = 22
-RED_COG = 23
-RAT_POISON = 24
-RED_VINE_WORM = 25
-FISHING_TROPHY = 26
-FISHING_PASS = 27
-INSECT_REPELLENT = 28
-INSECT_REPELLENT_NOTED = 29
-BUCKET_OF_WAX = 30
-BUCKET_OF_WAX_NOTED = 31
-LIT_BLACK_CANDLE = 32
-LIT_CANDLE = 33
-NULL = 34
-EXCALIBUR = 35
-CANDLE = 36
-CANDLE_NOTED = 37
-BLACK_CANDLE = 38
-BRONZE_ARROWTIPS = 39
-IRON_ARROWTIPS = 40
-STEEL_ARROWTIPS = 41
-MITHRIL_ARROWTIPS = 42
-ADAMANT_ARROWTIPS = 43
-RUNE_ARROWTIPS = 44
-OPAL_BOLT_TIPS = 45
-PEARL_BOLT_TIPS = 46
-BARB_BOLTTIPS = 47
-LONGBOW_U = 48
-LONGBOW_U_NOTED = 49
-SHORTBOW_U = 50
-SHORTBOW_U_NOTED = 51
-ARROW_SHAFT = 52
-HEADLESS_ARROW = 53
-OAK_SHORTBOW_U = 54
-OAK_SHORTBOW_U_NOTED = 55
-OAK_LONGBOW_U = 56
-OAK_LONGBOW_U_NOTED = 57
-WILLOW_LONGBOW_U = 58
-WILLOW_LONGBOW_U_NOTED = 59
-WILLOW_SHORTBOW_U = 60
-WILLOW_SHORTBOW_U_NOTED = 61
-MAPLE_LONGBOW_U = 62
-MAPLE_LONGBOW_U_NOTED = 63
-MAPLE_SHORTBOW_U = 64
-MAPLE_SHORTBOW_U_NOTED = 65
-YEW_LONGBOW_U = 66
-YEW_LONGBOW_U_NOTED = 67
-YEW_SHORTBOW_U = 68
-YEW_SHORTBOW_U_NOTED = 69
-MAGIC_LONGBOW_U = 70
-MAGIC_LONGBOW_U_NOTED = 71
-MAGIC_SHORTBOW_U = 72
-MAGIC_SHORTBOW_U_NOTED = 73
-KHAZARD_HELMET = 74
-KHAZARD_ARMOUR = 75
-KHAZARD_CELL_KEYS = 76
-KHALI_BREW = 77
-ICE_ARROWS = 78
-ICE_ARROWS_79 = 79
-ICE_ARROWS_80 = 80
-ICE_ARROWS_81 = 81
-ICE_ARROWS_82 = 82
-LEVER = 83
-STAFF_OF_ARMADYL = 84
-SHINY_KEY = 85
-PENDANT_OF_LUCIEN = 86
-ARMADYL_PENDANT = 87
-BOOTS_OF_LIGHTNESS = 88
-BOOTS_OF_LIGHTNESS_89 = 89
-CHILDS_BLANKET = 90
-GUAM_POTION_UNF = 91
-GUAM_POTION_UNF_NOTED = 92
-MARRENTILL_POTION_UNF = 93
-MARRENTILL_POTION_UNF_NOTED = 94
-TARROMIN_POTION_UNF = 95
-TARROMIN_POTION_UNF_NOTED = 96
-HARRALANDER_POTION_UNF = 97
-HARRALANDER_POTION_UNF_NOTED = 98
-RANARR_POTION_UNF = 99
-RANARR_POTION_UNF_NOTED = 100
-IRIT_POTION_UNF = 101
-IRIT_POTION_UNF_NOTED = 102
-AVANTOE_POTION_UNF = 103
-AVANTOE_POTION_UNF_NOTED = 104
-KWUARM_POTION_UNF = 105
-KWUARM_POTION_UNF_NOTED = 106
-CADANTINE_POTION_UNF = 107
-CADANTINE_POTION_UNF_NOTED = 108
-DWARF_WEED_POTION_UNF = 109
-DWARF_WEED_POTION_UNF_NOTED = 110
-TORSTOL_POTION_UNF = 111
-TORSTOL_POTION_UNF_NOTED = 112
-STRENGTH_POTION4 = 113
-STRENGTH_POTION4_NOTED = 114
-STRENGTH_POTION3 = 115
-STRENGTH_POTION3_NOTED = 116
-STRENGTH_POTION2 = 117
-STRENGTH_POTION2_NOTED = 118
-STRENGTH_POTION1 = 119
-STRENGTH_POTION1_NOTED = 120
-ATTACK_POTION3 = 121
-ATTACK_POTION3_NOTED = 122
-ATTACK_POTION2 = 123
-ATTACK_POTION2_NOTED = 124
-ATTACK_POTION1 = 125
-ATTACK_POTION1_NOTED = 126
-RESTORE_POTION3 = 127
-RESTORE_POTION3_NOTED = 128
-RESTORE_POTION2 = 129
-RESTORE_POTION2_NOTED = 130
-RESTORE_POTION1 = 131
-RESTORE_POTION1_NOTED = 132
-DEFENCE_POTION3 = 133
-DEFENCE_POTION3_NOTED = 134
-DEFENCE_POTION2 = 135
-DEFENCE_POTION2_NOTED = 136
-DEFENCE_POTION1 = 137
-DEFENCE_POTION1_NOTED = 138
-PRAYER_POTION3 = 139
-PRAYER_POTION3_NOTED = 140
-PRAYER_POTION2 = 141
-PRAYER_POTION2_NOTED = 142
-PRAYER_POTION1 = 143
-PRAYER_POTION1_NOTED = 144
-SUPER_ATTACK3 = 145
-SUPER_ATTACK3_NOTED = 146
-SUPER_ATTACK2 = 147
-SUPER_ATTACK2_NOTED = 148
-SUPER_ATTACK1 = 149
-SUPER_ATTACK1_NOTED = 150
-FISHING_POTION3 = 151
-FISHING_POTION3_NOTED = 152
-FISHING_POTION2 = 153
-FISHING_POTION2_NOTED = 154
-FISHING_POTION1 = 155
-FISHING_POTION1_NOTED = 156
-SUPER_STRENGTH3 = 157
-SUPER_STRENGTH3_NOTED = 158
-SUPER_STRENGTH2 = 159
-SUPER_STRENGTH2_NOTED = 160
-SUPER_STRENGTH1 = 161
-SUPER_STRENGTH1_NOTED = 162
-SUPER_DEFENCE3 = 163
-SUPER_DEFENCE3_NOTED = 164
-SUPER_DEFENCE2 = 165
-SUPER_DEFENCE2_NOTED = 166
-SUPER_DEFENCE1 = 167
-SUPER_DEFENCE1_NOTED = 168
-RANGING_POTION3 = 169
-RANGING_POTION3_NOTED = 170
-RANGING_POTION2 = 171
-RANGING_POTION2_NOTED = 172
-RANGING_POTION1 = 173
-RANGING_POTION1_NOTED = 174
-ANTIPOISON3 = 175
-ANTIPOISON3_NOTED = 176
-ANTIPOISON2 = 177
-ANTIPOISON2_NOTED = 178
-ANTIPOISON1 = 179
-ANTIPOISON1_NOTED = 180
-SUPERANTIPOISON3 = 181
-SUPERANTIPOISON3_NOTED = 182
-SUPERANTIPOISON2 = 183
-SUPERANTIPOISON2_NOTED = 184
-SUPERANTIPOISON1 = 185
-SUPERANTIPOISON1_NOTED = 186
-WEAPON_POISON = 187
-WEAPON_POISON_NOTED = 188
-ZAMORAK_BREW3 = 189
-ZAMORAK_BREW3_NOTED = 190
-ZAMORAK_BREW2 = 191
-ZAMORAK_BREW2_NOTED = 192
-ZAMORAK_BREW1 = 193
-ZAMORAK_BREW1_NOTED = 194
-POTION = 195
-POTION_NOTED = 196
-POISON_CHALICE = 197
-POISON_CHALICE_NOTED = 198
-GRIMY_GUAM_LEAF = 199
-GRIMY_GUAM_LEAF_NOTED = 200
-GRIMY_MARRENTILL = 201
-GRIMY_MARRENTILL_NOTED = 202
-GRIMY_TARROMIN = 203
-GRIMY_TARROMIN_NOTED = 204
-GRIMY_HARRALANDER = 205
-GRIMY_HARRALANDER_NOTED = 206
-GRIMY_RANARR_WEED = 207
-GRIMY_RANARR_WEED_NOTED = 208
-GRIMY_IRIT_LEAF = 209
-GRIMY_IRIT_LEAF_NOTED = 210
-GRIMY_AVANTOE = 211
-GRIMY_AVANTOE_NOTED = 212
-GRIMY_KWUARM = 213
-GRIMY_KWUARM_NOTED = 214
-GRIMY_CADANTINE = 215
-GRIMY_CADANTINE_NOTED = 216
-GRIMY_DWARF_WEED = 217
-GRIMY_DWARF_WEED_NOTED = 218
-GRIMY_TORSTOL = 219
-GRIMY_TORSTOL_NOTED = 220
-EYE_OF_NEWT = 221
-EYE_OF_NEWT_NOTED = 222
-RED_SPIDERS_EGGS = 223
-RED_SPIDERS_EGGS_NOTED = 224
-LIMPWURT_ROOT = 225
-LIMPWURT_ROOT_NOTED = 226
-VIAL_OF_WATER = 227
-VIAL_OF_WATER_NOTED = 228
-VIAL = 229
-VIAL_NOTED = 230
-SNAPE_GRASS = 231
-SNAPE_GRASS_NOTED = 232
-PESTLE_AND_MORTAR = 233
-PESTLE_AND_MORTAR_NOTED = 234
-UNICORN_HORN_DUST = 235
-UNICORN_HORN_DUST_NOTED = 236
-UNICORN_HORN = 237
-UNICORN_HORN_NOTED = 238
-WHITE_BERRIES = 239
-WHITE_BERRIES_NOTED = 240
-DRAGON_SCALE_DUST = 241
-DRAGON_SCALE_DUST_NOTED = 242
-BLUE_DRAGON_SCALE = 243
-BLUE_DRAGON_SCALE_NOTED = 244
-WINE_OF_ZAMORAK = 245
-WINE_OF_ZAMORAK_NOTED = 246
-JANGERBERRIES = 247
-JANGERBERRIES_NOTED = 248
-GUAM_LEAF = 249
-GUAM_LEAF_NOTED = 250
-MARRENTILL = 251
-MARRENTILL_NOTED = 252
-TARROMIN = 253
-TARROMIN_NOTED = 254
-HARRALANDER = 255
-HARRALANDER_NOTED = 256
-RANARR_WEED = 257
-RANARR_WEED_NOTED = 258
-IRIT_LEAF = 259
-IRIT_LEAF_NOTED = 260
-AVANTOE = 261
-AVANTOE_NOTED = 262
-KWUARM = 263
-KWUARM_NOTED = 264
-CADANTINE = 265
-CADANTINE_NOTED = 266
-DWARF_WEED = 267
-DWARF_WEED_NOTED = 268
-TORSTOL = 269
-TORSTOL_NOTED = 270
-PRESSURE_GAUGE = 271
-FISH_FOOD = 272
-POISON = 273
-POISONED_FISH_FOOD = 274
-KEY = 275
-RUBBER_TUBE = 276
-OIL_CAN = 277
-CATTLEPROD = 278
-SHEEP_FEED = 279
-SHEEP_BONES_1 = 280
-SHEEP_BONES_2 = 281
-SHEEP_BONES_3 = 282
-SHEEP_BONES_4 = 283
-PLAGUE_JACKET = 284
-PLAGUE_TROUSERS = 285
-ORANGE_GOBLIN_MAIL = 286
-BLUE_GOBLIN_MAIL = 287
-GOBLIN_MAIL = 288
-GOBLIN_MAIL_NOTED = 289
-RESEARCH_PACKAGE = 290
-RESEARCH_NOTES = 291
-BOOK_ON_BAXTORIAN = 292
-KEY_293 = 293
-GLARIALS_PEBBLE = 294
-GLARIALS_AMULET = 295
-GLARIALS_URN = 296
-GLARIALS_URN_EMPTY = 297
-KEY_298 = 298
-MITHRIL_SEEDS = 299
-RATS_TAIL = 300
-LOBSTER_POT = 301
-LOBSTER_POT_NOTED = 302
-SMALL_FISHING_NET = 303
-SMALL_FISHING_NET_NOTED = 304
-BIG_FISHING_NET = 305
-BIG_FISHING_NET_NOTED = 306
-FISHING_ROD = 307
-FISHING_ROD_NOTED = 308
-FLY_FISHING_ROD = 309
-FLY_FISHING_ROD_NOTED = 310
-HARPOON = 311
-HARPOON_NOTED = 312
-FISHING_BAIT = 313
-FEATHER = 314
-SHRIMPS = 315
-SHRIMPS_NOTED = 316
-RAW_SHRIMPS = 317
-RAW_SHRIMPS_NOTED = 318
-ANCHOVIES = 319
-ANCHOVIES_NOTED = 320
-RAW_ANCHOVIES = 321
-RAW_ANCHOVIES_NOTED = 322
-BURNT_FISH = 323
-BURNT_FISH_NOTED = 324
-SARDINE = 325
-SARDINE_NOTED = 326
-RAW_SARDINE = 327
-RAW_SARDINE_NOTED = 328
-SALMON = 329
-SALMON_NOTED = 330
-RAW_SALMON = 331
-RAW_SALMON_NOTED = 332
-TROUT = 333
-TROUT_NOTED = 334
-RAW_TROUT = 335
-RAW_TROUT_NOTED = 336
-GIANT_CARP = 337
-RAW_GIANT_CARP = 338
-COD = 339
-COD_NOTED = 340
-RAW_COD = 341
-RAW_COD_NOTED = 342
-BURNT_FISH_343 = 343
-BURNT_FISH_NOTED_344 = 344
-RAW_HERRING = 345
-RAW_HERRING_NOTED = 346
-HERRING = 347
-HERRING_NOTED = 348
-RAW_PIKE = 349
-RAW_PIKE_NOTED = 350
-PIKE = 351
-PIKE_NOTED = 352
-RAW_MACKEREL = 353
-RAW_MACKEREL_NOTED = 354
-MACKEREL = 355
-MACKEREL_NOTED = 356
-BURNT_FISH_357 = 357
-BURNT_FISH_NOTED_358 = 358
-RAW_TUNA = 359
-RAW_TUNA_NOTED = 360
-TUNA = 361
-TUNA_NOTED = 362
-RAW_BASS = 363
-RAW_BASS_NOTED = 364
-BASS = 365
-BASS_NOTED = 366
-BURNT_FISH_367 = 367
-BURNT_FISH_NOTED_368 = 368
-BURNT_FISH_369 = 369
-BURNT_FISH_NOTED_370 = 370
-RAW_SWORDFISH = 371
-RAW_SWORDFISH_NOTED = 372
-SWORDFISH = 373
-SWORDFISH_NOTED = 374
-BURNT_SWORDFISH = 375
-BURNT_SWORDFISH_NOTED = 376
-RAW_LOBSTER = 377
-RAW_LOBSTER_NOTED = 378
-LOBSTER = 379
-LOBSTER_NOTED = 380
-BURNT_LOBSTER = 381
-BURNT_LOBSTER_NOTED = 382
-RAW_SHARK = 383
-RAW_SHARK_NOTED = 384
-SHARK = 385
-SHARK_NOTED = 386
-BURNT_SHARK = 387
-BURNT_SHARK_NOTED = 388
-RAW_MANTA_RAY = 389
-RAW_MANTA_RAY_NOTED = 390
-MANTA_RAY = 391
-MANTA_RAY_NOTED = 392
-BURNT_MANTA_RAY = 393
-BURNT_MANTA_RAY_NOTED = 394
-RAW_SEA_TURTLE = 395
-RAW_SEA_TURTLE_NOTED = 396
-SEA_TURTLE = 397
-SEA_TURTLE_NOTED = 398
-BURNT_SEA_TURTLE = 399
-BURNT_SEA_TURTLE_NOTED = 400
-SEAWEED = 401
-SEAWEED_NOTED = 402
-EDIBLE_SEAWEED = 403
-EDIBLE_SEAWEED_NOTED = 404
-CASKET = 405
-CASKET_NOTED = 406
-OYSTER = 407
-OYSTER_NOTED = 408
-EMPTY_OYSTER = 409
-EMPTY_OYSTER_NOTED = 410
-OYSTER_PEARL = 411
-OYSTER_PEARL_NOTED = 412
-OYSTER_PEARLS = 413
-OYSTER_PEARLS_NOTED = 414
-ETHENEA = 415
-LIQUID_HONEY = 416
-SULPHURIC_BROLINE = 417
-PLAGUE_SAMPLE = 418
-TOUCH_PAPER = 419
-DISTILLATOR = 420
-LATHAS_AMULET = 421
-BIRD_FEED = 422
-KEY_423 = 423
-PIGEON_CAGE = 424
-PIGEON_CAGE_425 = 425
-PRIEST_GOWN = 426
-PRIEST_GOWN_NOTED = 427
-PRIEST_GOWN_428 = 428
-PRIEST_GOWN_NOTED_429 = 429
-MEDICAL_GOWN = 430
-KARAMJAN_RUM = 431
-CHEST_KEY = 432
-PIRATE_MESSAGE = 433
-CLAY = 434
-CLAY_NOTED = 435
-COPPER_ORE = 436
-COPPER_ORE_NOTED = 437
-TIN_ORE = 438
-TIN_ORE_NOTED = 439
-IRON_ORE = 440
-IRON_ORE_NOTED = 441
-SILVER_ORE = 442
-SILVER_ORE_NOTED = 443
-GOLD_ORE = 444
-GOLD_ORE_NOTED = 445
-PERFECT_GOLD_ORE = 446
-MITHRIL_ORE = 447
-MITHRIL_ORE_NOTED = 448
-ADAMANTITE_ORE = 449
-ADAMANTITE_ORE_NOTED = 450
-RUNITE_ORE = 451
-RUNITE_ORE_NOTED = 452
-COAL = 453
-COAL_NOTED = 454
-BARCRAWL_CARD = 455
-SCORPION_CAGE = 456
-SCORPION_CAGE_457 = 457
-SCORPION_CAGE_458 = 458
-SCORPION_CAGE_459 = 459
-SCORPION_CAGE_460 = 460
-SCORPION_CAGE_461 = 461
-SCORPION_CAGE_462 = 462
-SCORPION_CAGE_463 = 463
-STRANGE_FRUIT = 464
-STRANGE_FRUIT_NOTED = 465
-PICKAXE_HANDLE = 466
-PICKAXE_HANDLE_NOTED = 467
-BROKEN_PICKAXE = 468
-BROKEN_PICKAXE_NOTED = 469
-BROKEN_PICKAXE_470 = 470
-BROKEN_PICKAXE_NOTED_471 = 471
-BROKEN_PICKAXE_472 = 472
-BROKEN_PICKAXE_NOTED_473 = 473
-BROKEN_PICKAXE_474 = 474
-BROKEN_PICKAXE_NOTED_475 = 475
-BROKEN_PICKAXE_476 = 476
-BROKEN_PICKAXE_NOTED_477 = 477
-BROKEN_PICKAXE_478 = 478
-BROKEN_PICKAXE_NOTED_479 = 479
-BRONZE_PICK_HEAD = 480
-BRONZE_PICK_HEAD_NOTED = 481
-IRON_PICK_HEAD = 482
-IRON_PICK_HEAD_NOTED = 483
-STEEL_PICK_HEAD = 484
-STEEL_PICK_HEAD_NOTED = 485
-MITHRIL_PICK_HEAD = 486
-MITHRIL_PICK_HEAD_NOTED = 487
-ADAMANT_PICK_HEAD = 488
-ADAMANT_PICK_HEAD_NOTED = 489
-RUNE_PICK_HEAD = 490
-RUNE_PICK_HEAD_NOTED = 491
-AXE_HANDLE = 492
-AXE_HANDLE_NOTED = 493
-BROKEN_AXE = 494
-BROKEN_AXE_NOTED = 495
-BROKEN_AXE_496 = 496
-BROKEN_AXE_NOTED_497 = 497
-BROKEN_AXE_498 = 498
-BROKEN_AXE_NOTED_499 = 499
-BROKEN_AXE_500 = 500
-BROKEN_AXE_NOTED_501 = 501
-BROKEN_AXE_502 = 502
-BROKEN_AXE_NOTED_503 = 503
-BROKEN_AXE_504 = 504
-BROKEN_AXE_NOTED_505 = 505
-BROKEN_AXE_506 = 506
-BROKEN_AXE_NOTED_507 = 507
-BRONZE_AXE_HEAD = 508
-BRONZE_AXE_HEAD_NOTED = 509
-IRON_AXE_HEAD = 510
-IRON_AXE_HEAD_NOTED = 511
-STEEL_AXE_HEAD = 512
-STEEL_AXE_HEAD_NOTED = 513
-BLACK_AXE_HEAD = 514
-BLACK_AXE_HEAD_NOTED = 515
-MITHRIL_AXE_HEAD = 516
-MITHRIL_AXE_HEAD_NOTED = 517
-ADAMANT_AXE_HEAD = 518
-ADAMANT_AXE_HEAD_NOTED = 519
-RUNE_AXE_HEAD = 520
-RUNE_AXE_HEAD_NOTED = 521
-ENCHANTED_BEEF = 522
-ENCHANTED_RAT = 523
-ENCHANTED_BEAR = 524
-ENCHANTED_CHICKEN = 525
-BONES = 526
-BONES_NOTED = 527
-BURNT_BONES = 528
-BURNT_BONES_NOTED = 529
-BAT_BONES = 530
-BAT_BONES_NOTED = 531
-BIG_BONES = 532
-BIG_BONES_NOTED = 533
-BABYDRAGON_BONES = 534
-BABYDRAGON_BONES_NOTED = 535
-DRAGON_BONES = 536
-DRAGON_BONES_NOTED = 537
-DRUIDS_ROBE = 538
-DRUIDS_ROBE_NOTED = 539
-DRUIDS_ROBE_TOP = 540
-DRUIDS_ROBE_TOP_NOTED = 541
-MONKS_ROBE = 542
-MONKS_ROBE_NOTED = 543
-MONKS_ROBE_TOP = 544
-MONKS_ROBE_TOP_NOTED = 545
-SHADE_ROBE_TOP = 546
-SHADE_ROBE_TOP_NOTED = 547
-SHADE_ROBE = 548
-SHADE_ROBE_NOTED = 549
-NEWCOMER_MAP = 550
-NEWCOMER_MAP_NOTED = 551
-GHOSTSPEAK_AMULET = 552
-GHOSTS_SKULL = 553
-FIRE_RUNE = 554
-WATER_RUNE = 555
-AIR_RUNE = 556
-EARTH_RUNE = 557
-MIND_RUNE = 558
-BODY_RUNE = 559
-DEATH_RUNE = 560
-NATURE_RUNE = 561
-CHAOS_RUNE = 562
-LAW_RUNE = 563
-COSMIC_RUNE = 564
-BLOOD_RUNE = 565
-SOUL_RUNE = 566
-UNPOWERED_ORB = 567
-UNPOWERED_ORB_NOTED = 568
-FIRE_ORB = 569
-FIRE_ORB_NOTED = 570
-WATER_ORB = 571
-WATER_ORB_NOTED = 572
-AIR_ORB = 573
-AIR_ORB_NOTED = 574
-EARTH_ORB = 575
-EARTH_ORB_NOTED = 576
-BLUE_WIZARD_ROBE = 577
-BLUE_WIZARD_ROBE_NOTED = 578
-BLUE_WIZARD_HAT = 579
-BLUE_WIZARD_HAT_NOTED = 580
-BLACK_ROBE = 581
-BLACK_ROBE_NOTED = 582
-BAILING_BUCKET = 583
-BAILING_BUCKET_NOTED = 584
-BAILING_BUCKET_585 = 585
-BAILING_BUCKET_NOTED_586 = 586
-ORB_OF_PROTECTION = 587
-ORBS_OF_PROTECTION = 588
-GNOME_AMULET = 589
-TINDERBOX = 590
-TINDERBOX_NOTED = 591
-ASHES = 592
-ASHES_NOTED = 593
-LIT_TORCH = 594
-TORCH = 595
-UNLIT_TORCH = 596
-UNLIT_TORCH_NOTED = 597
-BRONZE_FIRE_ARROW = 598
-BUCHU_SEED = 599
-ASTRONOMY_BOOK = 600
-GOBLIN_KITCHEN_KEY = 601
-LENS_MOULD = 602
-OBSERVATORY_LENS = 603
-BONE_SHARD = 604
-BONE_KEY = 605
-STONEPLAQUE = 606
-TATTERED_SCROLL = 607
-CRUMPLED_SCROLL = 608
-RASHILIYIA_CORPSE = 609
-ZADIMUS_CORPSE = 610
-LOCATING_CRYSTAL = 611
-LOCATING_CRYSTAL_612 = 612
-LOCATING_CRYSTAL_613 = 613
-LOCATING_CRYSTAL_614 = 614
-LOCATING_CRYSTAL_615 = 615
-BEADS_OF_THE_DEAD = 616
-COINS = 617
-BONE_BEADS = 618
-PARAMAYA_TICKET = 619
-PARAMAYA_TICKET_620 = 620
-SHIP_TICKET = 621
-SHIP_TICKET_NOTED = 622
-SWORD_POMMEL = 623
-BERVIRIUS_NOTES = 624
-WAMPUM_BELT = 625
-PINK_BOOTS = 626
-PINK_BOOTS_NOTED = 627
-GREEN_BOOTS = 628
-GREEN_BOOTS_NOTED = 629
-BLUE_BOOTS = 630
-BLUE_BOOTS_NOTED = 631
-CREAM_BOOTS = 632
-CREAM_BOOTS_NOTED = 633
-TURQUOISE_BOOTS = 634
-TURQUOISE_BOOTS_NOTED = 635
-PINK_ROBE_TOP = 636
-PINK_ROBE_TOP_NOTED = 637
-GREEN_ROBE_TOP = 638
-GREEN_ROBE_TOP_NOTED = 639
-BLUE_ROBE_TOP = 640
-BLUE_ROBE_TOP_NOTED = 641
-CREAM_ROBE_TOP = 642
-CREAM_ROBE_TOP_NOTED = 643
-TURQUOISE_ROBE_TOP = 644
-TURQUOISE_ROBE_TOP_NOTED = 645
-PINK_ROBE_BOTTOMS = 646
-PINK_ROBE_BOTTOMS_NOTED = 647
-GREEN_ROBE_BOTTOMS = 648
-GREEN_ROBE_BOTTOMS_NOTED = 649
-BLUE_ROBE_BOTTOMS = 650
-BLUE_ROBE_BOTTOMS_NOTED = 651
-CREAM_ROBE_BOTTOMS = 652
-CREAM_ROBE_BOTTOMS_NOTED = 653
-TURQUOISE_ROBE_BOTTOMS = 654
-TURQUOISE_ROBE_BOTTOMS_NOTED = 655
-PINK_HAT = 656
-PINK_HAT_NOTED = 657
-GREEN_HAT = 658
-GREEN_HAT_NOTED = 659
-BLUE_HAT = 660
-BLUE_HAT_NOTED = 661
-CREAM_HAT = 662
-CREAM_HAT_NOTED = 663
-TURQUOISE_HAT = 664
-TURQUOISE_HAT_NOTED = 665
-PORTRAIT = 666
-BLURITE_SWORD = 667
-BLURITE_ORE = 668
-SPECIMEN_JAR = 669
-SPECIMEN_BRUSH = 670
-ANIMAL_SKULL = 671
-SPECIAL_CUP = 672
-TEDDY = 673
-CRACKED_SAMPLE = 674
-ROCK_PICK = 675
-TROWEL = 676
-PANNING_TRAY = 677
-PANNING_TRAY_678 = 678
-PANNING_TRAY_679 = 679
-NUGGETS = 680
-ANCIENT_TALISMAN = 681
-UNSTAMPED_LETTER = 682
-SEALED_LETTER = 683
-BELT_BUCKLE = 684
-OLD_BOOT = 685
-RUSTY_SWORD = 686
-BROKEN_ARROW = 687
-BUTTONS = 688
-BROKEN_STAFF = 689
-BROKEN_GLASS = 690
-LEVEL_1_CERTIFICATE = 691
-LEVEL_2_CERTIFICATE = 692
-LEVEL_3_CERTIFICATE = 693
-CERAMIC_REMAINS = 694
-OLD_TOOTH = 695
-INVITATION_LETTER = 696
-DAMAGED_ARMOUR = 697
-BROKEN_ARMOUR = 698
-STONE_TABLET = 699
-CHEMICAL_POWDER = 700
-AMMONIUM_NITRATE = 701
-UNIDENTIFIED_LIQUID = 702
-NITROGLYCERIN = 703
-GROUND_CHARCOAL = 704
-MIXED_CHEMICALS = 705
-MIXED_CHEMICALS_706 = 706
-CHEMICAL_COMPOUND = 707
-ARCENIA_ROOT = 708
-CHEST_KEY_709 = 709
-VASE = 710
-BOOK_ON_CHEMICALS = 711
-CUP_OF_TEA = 712
-CLUE_SCROLL = 713
-RADIMUS_NOTES = 714
-RADIMUS_NOTES_715 = 715
-BULLROARER = 716
-SCRAWLED_NOTE = 717
-A_SCRIBBLED_NOTE = 718
-SCRUMPLED_NOTE = 719
-SKETCH = 720
-GOLD_BOWL = 721
-BLESSED_GOLD_BOWL = 722
-GOLDEN_BOWL = 723
-GOLDEN_BOWL_724 = 724
-GOLDEN_BOWL_725 = 725
-GOLDEN_BOWL_726 = 726
-HOLLOW_REED = 727
-HOLLOW_REED_728 = 728
-SHAMANS_TOME = 729
-BINDING_BOOK = 730
-ENCHANTED_VIAL = 731
-HOLY_WATER = 732
-SMASHED_GLASS = 733
-SMASHED_GLASS_NOTED = 734
-YOMMI_TREE_SEEDS = 735
-YOMMI_TREE_SEEDS_736 = 736
-SNAKEWEED_MIXTURE = 737
-ARDRIGAL_MIXTURE = 738
-BRAVERY_POTION = 739
-BLUE_HAT_740 = 740
-CHUNK_OF_CRYSTAL = 741
-HUNK_OF_CRYSTAL = 742
-LUMP_OF_CRYSTAL = 743
-HEART_CRYSTAL = 744
-HEART_CRYSTAL_745 = 745
-DARK_DAGGER = 746
-GLOWING_DAGGER = 747
-HOLY_FORCE = 748
-YOMMI_TOTEM = 749
-GILDED_TOTEM = 750
-GNOMEBALL = 751
-GNOMEBALL_NOTED = 752
-CADAVA_BERRIES = 753
-CADAVA_BERRIES_NOTED = 754
-MESSAGE = 755
-CADAVA_POTION = 756
-BOOK = 757
-PHOENIX_HQ_KEY = 758
-WEAPON_STORE_KEY = 759
-WEAPON_STORE_KEY_NOTED = 760
-INTEL_REPORT = 761
-FALADOR_SHIELD = 762
-BROKEN_SHIELD = 763
-COAL_BAG = 764
-BROKEN_SHIELD_765 = 765
-GEM_BAG = 766
-PHOENIX_CROSSBOW = 767
-PHOENIX_CROSSBOW_NOTED = 768
-CERTIFICATE = 769
-ARDOUGNE_CLOAK = 770
-DRAMEN_BRANCH = 771
-DRAMEN_STAFF = 772
-PERFECT_RING = 773
-PERFECT_NECKLACE = 774
-COOKING_GAUNTLETS = 775
-GOLDSMITH_GAUNTLETS = 776
-CHAOS_GAUNTLETS = 777
-STEEL_GAUNTLETS = 778
-CREST_PART = 779
-CREST_PART_780 = 780
-CREST_PART_781 = 781
-FAMILY_CREST = 782
-BARK_SAMPLE = 783
-TRANSLATION_BOOK = 784
-GLOUGHS_JOURNAL = 785
-HAZELMERES_SCROLL = 786
-LUMBER_ORDER = 787
-GLOUGHS_KEY = 788
-TWIGS = 789
-TWIGS_790 = 790
-TWIGS_791 = 791
-TWIGS_792 = 792
-DACONIA_ROCK = 793
-INVASION_PLANS = 794
-WAR_SHIP = 795
-BRONZE_THROWNAXE = 800
-IRON_THROWNAXE = 801
-STEEL_THROWNAXE = 802
-MITHRIL_THROWNAXE = 803
-ADAMANT_THROWNAXE = 804
-RUNE_THROWNAXE = 805
-BRONZE_DART = 806
-IRON_DART = 807
-STEEL_DART = 808
-MITHRIL_DART = 809
-ADAMANT_DART = 810
-RUNE_DART = 811
-BRONZE_DARTP = 812
-IRON_DART_P = 813
-STEEL_DARTP = 814
-MITHRIL_DARTP = 815
-ADAMANT_DARTP = 816
-RUNE_DARTP = 817
-POISONED_DARTP = 818
-BRONZE_DART_TIP = 819
-IRON_DART_TIP = 820
-STEEL_DART_TIP = 821
-MITHRIL_DART_TIP = 822
-ADAMANT_DART_TIP = 823
-RUNE_DART_TIP = 824
-BRONZE_JAVELIN = 825
-IRON_JAVELIN = 826
-STEEL_JAVELIN = 827
-MITHRIL_JAVELIN = 828
-ADAMANT_JAVELIN = 829
-RUNE_JAVELIN = 830
-BRONZE_JAVELINP = 831
-IRON_JAVELINP = 832
-STEEL_JAVELINP = 833
-MITHRIL_JAVELINP = 834
-ADAMANT_JAVELINP = 835
-RUNE_JAVELINP = 836
-CROSSBOW = 837
-CROSSBOW_NOTED = 838
-LONGBOW = 839
-LONGBOW_NOTED = 840
-SHORTBOW = 841
-SHORTBOW_NOTED = 842
-OAK_SHORTBOW = 843
-OAK_SHORTBOW_NOTED = 844
-OAK_LONGBOW = 845
-OAK_LONGBOW_NOTED = 846
-WILLOW_LONGBOW = 847
-WILLOW_LONGBOW_NOTED = 848
-WILLOW_SHORTBOW = 849
-WILLOW_SHORTBOW_NOTED = 850
-MAPLE_LONGBOW = 851
-MAPLE_LONGBOW_NOTED = 852
-MAPLE_SHORTBOW = 853
-MAPLE_SHORTBOW_NOTED = 854
-YEW_LONGBOW = 855
-YEW_LONGBOW_NOTED = 856
-YEW_SHORTBOW = 857
-YEW_SHORTBOW_NOTED = 858
-MAGIC_LONGBOW = 859
-MAGIC_LONGBOW_NOTED = 860
-MAGIC_SHORTBOW = 861
-MAGIC_SHORTBOW_NOTED = 862
-IRON_KNIFE = 863
-BRONZE_KNIFE = 864
-STEEL_KNIFE = 865
-MITHRIL_KNIFE = 866
-ADAMANT_KNIFE = 867
-RUNE_KNIFE = 868
-BLACK_KNIFE = 869
-BRONZE_KNIFEP = 870
-IRON_KNIFEP = 871
-STEEL_KNIFEP = 872
-MITHRIL_KNIFEP = 873
-BLACK_KNIFEP = 874
-ADAMANT_KNIFEP = 875
-RUNE_KNIFEP = 876
-BRONZE_BOLTS = 877
-BRONZE_BOLTS_P = 878
-OPAL_BOLTS = 879
-PEARL_BOLTS = 880
-BARBED_BOLTS = 881
-BRONZE_ARROW = 882
-BRONZE_ARROWP = 883
-IRON_ARROW = 884
-IRON_ARROWP = 885
-STEEL_ARROW = 886
-STEEL_ARROWP = 887
-MITHRIL_ARROW = 888
-MITHRIL_ARROWP = 889
-ADAMANT_ARROW = 890
-ADAMANT_ARROWP = 891
-RUNE_ARROW = 892
-RUNE_ARROWP = 893
-BRONZE_ARROW_894 = 894
-BRONZE_ARROW_895 = 895
-BRONZE_ARROW_896 = 896
-BRONZE_ARROW_897 = 897
-BRONZE_ARROWP_898 = 898
-BRONZE_ARROWP_899 = 899
-BRONZE_ARROWP_900 = 900
-BRONZE_ARROWP_901 = 901
-IRON_ARROW_902 = 902
-IRON_ARROW_903 = 903
-IRON_ARROW_904 = 904
-IRON_ARROW_905 = 905
-IRON_ARROWP_906 = 906
-IRON_ARROWP_907 = 907
-IRON_ARROWP_908 = 908
-IRON_ARROWP_909 = 909
-STEEL_ARROW_910 = 910
-STEEL_ARROW_911 = 911
-STEEL_ARROW_912 = 912
-STEEL_ARROW_913 = 913
-STEEL_ARROWP_914 = 914
-STEEL_ARROWP_915 = 915
-STEEL_ARROWP_916 = 916
-STEEL_ARROWP_917 = 917
-MITHRIL_ARROW_918 = 918
-MITHRIL_ARROW_919 = 919
-MITHRIL_ARROW_920 = 920
-MITHRIL_ARROW_921 = 921
-MITHRIL_ARROWP_922 = 922
-MITHRIL_ARROWP_923 = 923
-MITHRIL_ARROWP_924 = 924
-MITHRIL_ARROWP_925 = 925
-ADAMANT_ARROW_926 = 926
-ADAMANT_ARROW_927 = 927
-ADAMANT_ARROW_928 = 928
-ADAMANT_ARROW_929 = 929
-ADAMANT_ARROWP_930 = 930
-ADAMANT_ARROWP_931 = 931
-ADAMANT_ARROWP_932 = 932
-ADAMANT_ARROWP_933 = 933
-RUNE_ARROW_934 = 934
-RUNE_ARROW_935 = 935
-RUNE_ARROW_936 = 936
-RUNE_ARROW_937 = 937
-RUNE_ARROWP_938 = 938
-RUNE_ARROWP_939 = 939
-RUNE_ARROWP_940 = 940
-RUNE_ARROWP_941 = 941
-BRONZE_FIRE_ARROW_LIT = 942
-WORM = 943
-WORM_NOTED = 944
-THROWING_ROPE = 945
-KNIFE = 946
-KNIFE_NOTED = 947
-BEAR_FUR = 948
-BEAR_FUR_NOTED = 949
-SILK = 950
-SILK_NOTED = 951
-SPADE = 952
-SPADE_NOTED = 953
-ROPE = 954
-ROPE_NOTED = 955
-FLYER = 956
-FLYER_NOTED = 957
-GREY_WOLF_FUR = 958
-GREY_WOLF_FUR_NOTED = 959
-PLANK = 960
-PLANK_NOTED = 961
-CHRISTMAS_CRACKER = 962
-CHRISTMAS_CRACKER_NOTED = 963
-SKULL = 964
-SKULL_965 = 965
-TILE = 966
-TILE_NOTED = 967
-ROCK = 968
-ROCK_NOTED = 969
-PAPYRUS = 970
-PAPYRUS_NOTED = 971
-PAPYRUS_972 = 972
-CHARCOAL = 973
-CHARCOAL_NOTED = 974
-MACHETE = 975
-MACHETE_NOTED = 976
-COOKING_POT = 977
-COOKING_POT_NOTED = 978
-DISK_OF_RETURNING = 981
-DISK_OF_RETURNING_NOTED = 982
-BRASS_KEY = 983
-BRASS_KEY_NOTED = 984
-TOOTH_HALF_OF_KEY = 985
-TOOTH_HALF_OF_KEY_NOTED = 986
-LOOP_HALF_OF_KEY = 987
-LOOP_HALF_OF_KEY_NOTED = 988
-CRYSTAL_KEY = 989
-CRYSTAL_KEY_NOTED = 990
-MUDDY_KEY = 991
-MUDDY_KEY_NOTED = 992
-SINISTER_KEY = 993
-SINISTER_KEY_NOTED = 994
-COINS_995 = 995
-COINS_996 = 996
-COINS_997 = 997
-COINS_998 = 998
-COINS_999 = 999
-COINS_1000 = 1000
-COINS_1001 = 1001
-COINS_1002 = 1002
-COINS_1003 = 1003
-COINS_1004 = 1004
-WHITE_APRON = 1005
-WHITE_APRON_NOTED = 1006
-RED_CAPE = 1007
-RED_CAPE_NOTED = 1008
-BRASS_NECKLACE = 1009
-BRASS_NECKLACE_NOTED = 1010
-BLUE_SKIRT = 1011
-BLUE_SKIRT_NOTED = 1012
-PINK_SKIRT = 1013
-PINK_SKIRT_NOTED = 1014
-BLACK_SKIRT = 1015
-BLACK_SKIRT_NOTED = 1016
-WIZARD_HAT = 1017
-WIZARD_HAT_NOTED = 1018
-BLACK_CAPE = 1019
-BLACK_CAPE_NOTED = 1020
-BLUE_CAPE = 1021
-BLUE_CAPE_NOTED = 1022
-YELLOW_CAPE = 1023
-YELLOW_CAPE_NOTED = 1024
-RIGHT_EYE_PATCH = 1025
-RIGHT_EYE_PATCH_NOTED = 1026
-GREEN_CAPE = 1027
-GREEN_CAPE_NOTED = 1028
-PURPLE_CAPE = 1029
-PURPLE_CAPE_NOTED = 1030
-ORANGE_CAPE = 1031
-ORANGE_CAPE_NOTED = 1032
-ZAMORAK_MONK_BOTTOM = 1033
-ZAMORAK_MONK_BOTTOM_NOTED = 1034
-ZAMORAK_MONK_TOP = 1035
-ZAMORAK_MONK_TOP_NOTED = 1036
-BUNNY_EARS = 1037
-RED_PARTYHAT = 1038
-RED_PARTYHAT_NOTED = 1039
-YELLOW_PARTYHAT = 1040
-YELLOW_PARTYHAT_NOTED = 1041
-BLUE_PARTYHAT = 1042
-BLUE_PARTYHAT_NOTED = 1043
-GREEN_PARTYHAT = 1044
-GREEN_PARTYHAT_NOTED = 1045
-PURPLE_PARTYHAT = 1046
-PURPLE_PARTYHAT_NOTED = 1047
-WHITE_PARTYHAT = 1048
-WHITE_PARTYHAT_NOTED = 1049
-SANTA_HAT = 1050
-SANTA_HAT_NOTED = 1051
-CAPE_OF_LEGENDS = 1052
-GREEN_HALLOWEEN_MASK = 1053
-GREEN_HALLOWEEN_MASK_NOTED = 1054
-BLUE_HALLOWEEN_MASK = 1055
-BLUE_HALLOWEEN_MASK_NOTED = 1056
-RED_HALLOWEEN_MASK = 1057
-RED_HALLOWEEN_MASK_NOTED = 1058
-LEATHER_GLOVES = 1059
-LEATHER_GLOVES_NOTED = 1060
-LEATHER_BOOTS = 1061
-LEATHER_BOOTS_NOTED = 1062
-LEATHER_VAMBRACES = 1063
-LEATHER_VAMBRACES_NOTED = 1064
-GREEN_DHIDE_VAMBRACES = 1065
-GREEN_DHIDE_VAMBRACES_NOTED = 1066
-IRON_PLATELEGS = 1067
-IRON_PLATELEGS_NOTED = 1068
-STEEL_PLATELEGS = 1069
-STEEL_PLATELEGS_NOTED = 1070
-MITHRIL_PLATELEGS = 1071
-MITHRIL_PLATELEGS_NOTED = 1072
-ADAMANT_PLATELEGS = 1073
-ADAMANT_PLATELEGS_NOTED = 1074
-BRONZE_PLATELEGS = 1075
-BRONZE_PLATELEGS_NOTED = 1076
-BLACK_PLATELEGS = 1077
-BLACK_PLATELEGS_NOTED = 1078
-RUNE_PLATELEGS = 1079
-RUNE_PLATELEGS_NOTED = 1080
-IRON_PLATESKIRT = 1081
-IRON_PLATESKIRT_NOTED = 1082
-STEEL_PLATESKIRT = 1083
-STEEL_PLATESKIRT_NOTED = 1084
-MITHRIL_PLATESKIRT = 1085
-MITHRIL_PLATESKIRT_NOTED = 1086
-BRONZE_PLATESKIRT = 1087
-BRONZE_PLATESKIRT_NOTED = 1088
-BLACK_PLATESKIRT = 1089
-BLACK_PLATESKIRT_NOTED = 1090
-ADAMANT_PLATESKIRT = 1091
-ADAMANT_PLATESKIRT_NOTED = 1092
-RUNE_PLATESKIRT = 1093
-RUNE_PLATESKIRT_NOTED = 1094
-LEATHER_CHAPS = 1095
-LEATHER_CHAPS_NOTED = 1096
-STUDDED_CHAPS = 1097
-STUDDED_CHAPS_NOTED = 1098
-GREEN_DHIDE_CHAPS = 1099
-GREEN_DHIDE_CHAPS_NOTED = 1100
-IRON_CHAINBODY = 1101
-IRON_CHAINBODY_NOTED = 1102
-BRONZE_CHAINBODY = 1103
-BRONZE_CHAINBODY_NOTED = 1104
-STEEL_CHAINBODY = 1105
-STEEL_CHAINBODY_NOTED = 1106
-BLACK_CHAINBODY = 1107
-BLACK_CHAINBODY_NOTED = 1108
-MITHRIL_CHAINBODY = 1109
-MITHRIL_CHAINBODY_NOTED = 1110
-ADAMANT_CHAINBODY = 1111
-ADAMANT_CHAINBODY_NOTED = 1112
-RUNE_CHAINBODY = 1113
-RUNE_CHAINBODY_NOTED = 1114
-IRON_PLATEBODY = 1115
-IRON_PLATEBODY_NOTED = 1116
-BRONZE_PLATEBODY = 1117
-BRONZE_PLATEBODY_NOTED = 1118
-STEEL_PLATEBODY = 1119
-STEEL_PLATEBODY_NOTED = 1120
-MITHRIL_PLATEBODY = 1121
-MITHRIL_PLATEBODY_NOTED = 1122
-ADAMANT_PLATEBODY = 1123
-ADAMANT_PLATEBODY_NOTED = 1124
-BLACK_PLATEBODY = 1125
-BLACK_PLATEBODY_NOTED = 1126
-RUNE_PLATEBODY = 1127
-RUNE_PLATEBODY_NOTED = 1128
-LEATHER_BODY = 1129
-LEATHER_BODY_NOTED = 1130
-HARDLEATHER_BODY = 1131
-HARDLEATHER_BODY_NOTED = 1132
-STUDDED_BODY = 1133
-STUDDED_BODY_NOTED = 1134
-GREEN_DHIDE_BODY = 1135
-GREEN_DHIDE_BODY_NOTED = 1136
-IRON_MED_HELM = 1137
-IRON_MED_HELM_NOTED = 1138
-BRONZE_MED_HELM = 1139
-BRONZE_MED_HELM_NOTED = 1140
-STEEL_MED_HELM = 1141
-STEEL_MED_HELM_NOTED = 1142
-MITHRIL_MED_HELM = 1143
-MITHRIL_MED_HELM_NOTED = 1144
-ADAMANT_MED_HELM = 1145
-ADAMANT_MED_HELM_NOTED = 1146
-RUNE_MED_HELM = 1147
-RUNE_MED_HELM_NOTED = 1148
-DRAGON_MED_HELM = 1149
-DRAGON_MED_HELM_NOTED = 1150
-BLACK_MED_HELM = 1151
-BLACK_MED_HELM_NOTED = 1152
-IRON_FULL_HELM = 1153
-IRON_FULL_HELM_NOTED = 1154
-BRONZE_FULL_HELM = 1155
-BRONZE_FULL_HELM_NOTED = 1156
-STEEL_FULL_HELM = 1157
-STEEL_FULL_HELM_NOTED = 1158
-MITHRIL_FULL_HELM = 1159
-MITHRIL_FULL_HELM_NOTED = 1160
-ADAMANT_FULL_HELM = 1161
-ADAMANT_FULL_HELM_NOTED = 1162
-RUNE_FULL_HELM = 1163
-RUNE_FULL_HELM_NOTED = 1164
-BLACK_FULL_HELM = 1165
-BLACK_FULL_HELM_NOTED = 1166
-LEATHER_COWL = 1167
-LEATHER_COWL_NOTED = 1168
-COIF = 1169
-COIF_NOTED = 1170
-WOODEN_SHIELD = 1171
-WOODEN_SHIELD_NOTED = 1172
-BRONZE_SQ_SHIELD = 1173
-BRONZE_SQ_SHIELD_NOTED = 1174
-IRON_SQ_SHIELD = 1175
-IRON_SQ_SHIELD_NOTED = 1176
-STEEL_SQ_SHIELD = 1177
-STEEL_SQ_SHIELD_NOTED = 1178
-BLACK_SQ_SHIELD = 1179
-BLACK_SQ_SHIELD_NOTED = 1180
-MITHRIL_SQ_SHIELD = 1181
-MITHRIL_SQ_SHIELD_NOTED = 1182
-ADAMANT_SQ_SHIELD = 1183
-ADAMANT_SQ_SHIELD_NOTED = 1184
-RUNE_SQ_SHIELD = 1185
-RUNE_SQ_SHIELD_NOTED = 1186
-DRAGON_SQ_SHIELD = 1187
-DRAGON_SQ_SHIELD_NOTED = 1188
-BRONZE_KITESHIELD = 1189
-BRONZE_KITESHIELD_NOTED = 1190
-IRON_KITESHIELD = 1191
-IRON_KITESHIELD_NOTED = 1192
-STEEL_KITESHIELD = 1193
-STEEL_KITESHIELD_NOTED = 1194
-BLACK_KITESHIELD = 1195
-BLACK_KITESHIELD_NOTED = 1196
-MITHRIL_KITESHIELD = 1197
-MITHRIL_KITESHIELD_NOTED = 1198
-ADAMANT_KITESHIELD = 1199
-ADAMANT_KITESHIELD_NOTED = 1200
-RUNE_KITESHIELD = 1201
-RUNE_KITESHIELD_NOTED = 1202
-IRON_DAGGER = 1203
-IRON_DAGGER_NOTED = 1204
-BRONZE_DAGGER = 1205
-BRONZE_DAGGER_NOTED = 1206
-STEEL_DAGGER = 1207
-STEEL_DAGGER_NOTED = 1208
-MITHRIL_DAGGER = 1209
-MITHRIL_DAGGER_NOTED = 1210
-ADAMANT_DAGGER = 1211
-ADAMANT_DAGGER_NOTED = 1212
-RUNE_DAGGER = 1213
-RUNE_DAGGER_NOTED = 1214
-DRAGON_DAGGER = 1215
-DRAGON_DAGGER_NOTED = 1216
-BLACK_DAGGER = 1217
-BLACK_DAGGER_NOTED = 1218
-IRON_DAGGERP = 1219
-IRON_DAGGERP_NOTED = 1220
-BRONZE_DAGGERP = 1221
-BRONZE_DAGGERP_NOTED = 1222
-STEEL_DAGGERP = 1223
-STEEL_DAGGERP_NOTED = 1224
-MITHRIL_DAGGERP = 1225
-MITHRIL_DAGGERP_NOTED = 1226
-ADAMANT_DAGGERP = 1227
-ADAMANT_DAGGERP_NOTED = 1228
-RUNE_DAGGERP = 1229
-RUNE_DAGGERP_NOTED = 1230
-DRAGON_DAGGERP = 1231
-DRAGON_DAGGERP_NOTED = 1232
-BLACK_DAGGERP = 1233
-BLACK_DAGGERP_NOTED = 1234
-POISONED_DAGGERP = 1235
-POISONED_DAGGERP_NOTED = 1236
-BRONZE_SPEAR = 1237
-BRONZE_SPEAR_NOTED = 1238
-IRON_SPEAR = 1239
-IRON_SPEAR_NOTED = 1240
-STEEL_SPEAR = 1241
-STEEL_SPEAR_NOTED = 1242
-MITHRIL_SPEAR = 1243
-MITHRIL_SPEAR_NOTED = 1244
-ADAMANT_SPEAR = 1245
-ADAMANT_SPEAR_NOTED = 1246
-RUNE_SPEAR = 1247
-RUNE_SPEAR_NOTED = 1248
-DRAGON_SPEAR = 1249
-DRAGON_SPEAR_NOTED = 1250
-BRONZE_SPEARP = 1251
-BRONZE_SPEARP_NOTED = 1252
-IRON_SPEARP = 1253
-IRON_SPEARP_NOTED = 1254
-STEEL_SPEARP = 1255
-STEEL_SPEARP_NOTED = 1256
-MITHRIL_SPEARP = 1257
-MITHRIL_SPEARP_NOTED = 1258
-ADAMANT_SPEARP = 1259
-ADAMANT_SPEARP_NOTED = 1260
-RUNE_SPEARP = 1261
-RUNE_SPEARP_NOTED = 1262
-DRAGON_SPEARP = 1263
-DRAGON_SPEARP_NOTED = 1264
-BRONZE_PICKAXE = 1265
-BRONZE_PICKAXE_NOTED = 1266
-IRON_PICKAXE = 1267
-IRON_PICKAXE_NOTED = 1268
-STEEL_PICKAXE = 1269
-STEEL_PICKAXE_NOTED = 1270
-ADAMANT_PICKAXE = 1271
-ADAMANT_PICKAXE_NOTED = 1272
-MITHRIL_PICKAXE = 1273
-MITHRIL_PICKAXE_NOTED = 1274
-RUNE_PICKAXE = 1275
-RUNE_PICKAXE_NOTED = 1276
-BRONZE_SWORD = 1277
-BRONZE_SWORD_NOTED = 1278
-IRON_SWORD = 1279
-IRON_SWORD_NOTED = 1280
-STEEL_SWORD = 1281
-STEEL_SWORD_NOTED = 1282
-BLACK_SWORD = 1283
-BLACK_SWORD_NOTED = 1284
-MITHRIL_SWORD = 1285
-MITHRIL_SWORD_NOTED = 1286
-ADAMANT_SWORD = 1287
-ADAMANT_SWORD_NOTED = 1288
-RUNE_SWORD = 1289
-RUNE_SWORD_NOTED = 1290
-BRONZE_LONGSWORD = 1291
-BRONZE_LONGSWORD_NOTED = 1292
-IRON_LONGSWORD = 1293
-IRON_LONGSWORD_NOTED = 1294
-STEEL_LONGSWORD = 1295
-STEEL_LONGSWORD_NOTED = 1296
-BLACK_LONGSWORD = 1297
-BLACK_LONGSWORD_NOTED = 1298
-MITHRIL_LONGSWORD = 1299
-MITHRIL_LONGSWORD_NOTED = 1300
-ADAMANT_LONGSWORD = 1301
-ADAMANT_LONGSWORD_NOTED = 1302
-RUNE_LONGSWORD = 1303
-RUNE_LONGSWORD_NOTED = 1304
-DRAGON_LONGSWORD = 1305
-DRAGON_LONGSWORD_NOTED = 1306
-BRONZE_2H_SWORD = 1307
-BRONZE_2H_SWORD_NOTED = 1308
-IRON_2H_SWORD = 1309
-IRON_2H_SWORD_NOTED = 1310
-STEEL_2H_SWORD = 1311
-STEEL_2H_SWORD_NOTED = 1312
-BLACK_2H_SWORD = 1313
-BLACK_2H_SWORD_NOTED = 1314
-MITHRIL_2H_SWORD = 1315
-MITHRIL_2H_SWORD_NOTED = 1316
-ADAMANT_2H_SWORD = 1317
-ADAMANT_2H_SWORD_NOTED = 1318
-RUNE_2H_SWORD = 1319
-RUNE_2H_SWORD_NOTED = 1320
-BRONZE_SCIMITAR = 1321
-BRONZE_SCIMITAR_NOTED = 1322
-IRON_SCIMITAR = 1323
-IRON_SCIMITAR_NOTED = 1324
-STEEL_SCIMITAR = 1325
-STEEL_SCIMITAR_NOTED = 1326
-BLACK_SCIMITAR = 1327
-BLACK_SCIMITAR_NOTED = 1328
-MITHRIL_SCIMITAR = 1329
-MITHRIL_SCIMITAR_NOTED = 1330
-ADAMANT_SCIMITAR = 1331
-ADAMANT_SCIMITAR_NOTED = 1332
-RUNE_SCIMITAR = 1333
-RUNE_SCIMITAR_NOTED = 1334
-IRON_WARHAMMER = 1335
-IRON_WARHAMMER_NOTED = 1336
-BRONZE_WARHAMMER = 1337
-BRONZE_WARHAMMER_NOTED = 1338
-STEEL_WARHAMMER = 1339
-STEEL_WARHAMMER_NOTED = 1340
-BLACK_WARHAMMER = 1341
-BLACK_WARHAMMER_NOTED = 1342
-MITHRIL_WARHAMMER = 1343
-MITHRIL_WARHAMMER_NOTED = 1344
-ADAMANT_WARHAMMER = 1345
-ADAMANT_WARHAMMER_NOTED = 1346
-RUNE_WARHAMMER = 1347
-RUNE_WARHAMMER_NOTED = 1348
-IRON_AXE = 1349
-IRON_AXE_NOTED = 1350
-BRONZE_AXE = 1351
-BRONZE_AXE_NOTED = 1352
-STEEL_AXE = 1353
-STEEL_AXE_NOTED = 1354
-MITHRIL_AXE = 1355
-MITHRIL_AXE_NOTED = 1356
-ADAMANT_AXE = 1357
-ADAMANT_AXE_NOTED = 1358
-RUNE_AXE = 1359
-RUNE_AXE_NOTED = 1360
-BLACK_AXE = 1361
-BLACK_AXE_NOTED = 1362
-IRON_BATTLEAXE = 1363
-IRON_BATTLEAXE_NOTED = 1364
-STEEL_BATTLEAXE = 1365
-STEEL_BATTLEAXE_NOTED = 1366
-BLACK_BATTLEAXE = 1367
-BLACK_BATTLEAXE_NOTED = 1368
-MITHRIL_BATTLEAXE = 1369
-MITHRIL_BATTLEAXE_NOTED = 1370
-ADAMANT_BATTLEAXE = 1371
-ADAMANT_BATTLEAXE_NOTED = 1372
-RUNE_BATTLEAXE = 1373
-RUNE_BATTLEAXE_NOTED = 1374
-BRONZE_BATTLEAXE = 1375
-BRONZE_BATTLEAXE_NOTED = 1376
-DRAGON_BATTLEAXE = 1377
-DRAGON_BATTLEAXE_NOTED = 1378
-STAFF = 1379
-STAFF_NOTED = 1380
-STAFF_OF_AIR = 1381
-STAFF_OF_AIR_NOTED = 1382
-STAFF_OF_WATER = 1383
-STAFF_OF_WATER_NOTED = 1384
-STAFF_OF_EARTH = 1385
-STAFF_OF_EARTH_NOTED = 1386
-STAFF_OF_FIRE = 1387
-STAFF_OF_FIRE_NOTED = 1388
-MAGIC_STAFF = 1389
-MAGIC_STAFF_NOTED = 1390
-BATTLESTAFF = 1391
-BATTLESTAFF_NOTED = 1392
-FIRE_BATTLESTAFF = 1393
-FIRE_BATTLESTAFF_NOTED = 1394
-WATER_BATTLESTAFF = 1395
-WATER_BATTLESTAFF_NOTED = 1396
-AIR_BATTLESTAFF = 1397
-AIR_BATTLESTAFF_NOTED = 1398
-EARTH_BATTLESTAFF = 1399
-EARTH_BATTLESTAFF_NOTED = 1400
-MYSTIC_FIRE_STAFF = 1401
-MYSTIC_FIRE_STAFF_NOTED = 1402
-MYSTIC_WATER_STAFF = 1403
-MYSTIC_WATER_STAFF_NOTED = 1404
-MYSTIC_AIR_STAFF = 1405
-MYSTIC_AIR_STAFF_NOTED = 1406
-MYSTIC_EARTH_STAFF = 1407
-MYSTIC_EARTH_STAFF_NOTED = 1408
-IBANS_STAFF = 1409
-IBANS_STAFF_1410 = 1410
-FARMERS_FORK = 1411
-FARMERS_FORK_NOTED = 1412
-HALBERD = 1413
-HALBERD_NOTED = 1414
-WARHAMMER = 1415
-WARHAMMER_NOTED = 1416
-JAVELIN = 1417
-JAVELIN_NOTED = 1418
-SCYTHE = 1419
-IRON_MACE = 1420
-IRON_MACE_NOTED = 1421
-BRONZE_MACE = 1422
-BRONZE_MACE_NOTED = 1423
-STEEL_MACE = 1424
-STEEL_MACE_NOTED = 1425
-BLACK_MACE = 1426
-BLACK_MACE_NOTED = 1427
-MITHRIL_MACE = 1428
-MITHRIL_MACE_NOTED = 1429
-ADAMANT_MACE = 1430
-ADAMANT_MACE_NOTED = 1431
-RUNE_MACE = 1432
-RUNE_MACE_NOTED = 1433
-DRAGON_MACE = 1434
-DRAGON_MACE_NOTED = 1435
-RUNE_ESSENCE = 1436
-RUNE_ESSENCE_NOTED = 1437
-AIR_TALISMAN = 1438
-AIR_TALISMAN_NOTED = 1439
-EARTH_TALISMAN = 1440
-EARTH_TALISMAN_NOTED = 1441
-FIRE_TALISMAN = 1442
-FIRE_TALISMAN_NOTED = 1443
-WATER_TALISMAN = 1444
-WATER_TALISMAN_NOTED = 1445
-BODY_TALISMAN = 1446
-BODY_TALISMAN_NOTED = 1447
-MIND_TALISMAN = 1448
-MIND_TALISMAN_NOTED = 1449
-BLOOD_TALISMAN = 1450
-BLOOD_TALISMAN_NOTED = 1451
-CHAOS_TALISMAN = 1452
-CHAOS_TALISMAN_NOTED = 1453
-COSMIC_TALISMAN = 1454
-COSMIC_TALISMAN_NOTED = 1455
-DEATH_TALISMAN = 1456
-DEATH_TALISMAN_NOTED = 1457
-LAW_TALISMAN = 1458
-NULL_1459 = 1459
-NULL_1460 = 1460
-NATURE_TALISMAN = 1462
-NATURE_TALISMAN_NOTED = 1463
-ARCHERY_TICKET = 1464
-WEAPON_POISON_1465 = 1465
-SEA_SLUG = 1466
-DAMP_STICKS = 1467
-DRY_STICKS = 1468
-BROKEN_GLASS_1469 = 1469
-RED_BEAD = 1470
-RED_BEAD_NOTED = 1471
-YELLOW_BEAD = 1472
-YELLOW_BEAD_NOTED = 1473
-BLACK_BEAD = 1474
-BLACK_BEAD_NOTED = 1475
-WHITE_BEAD = 1476
-WHITE_BEAD_NOTED = 1477
-AMULET_OF_ACCURACY = 1478
-AMULET_OF_ACCURACY_NOTED = 1479
-ROCK_1480 = 1480
-ORB_OF_LIGHT = 1481
-ORB_OF_LIGHT_1482 = 1482
-ORB_OF_LIGHT_1483 = 1483
-ORB_OF_LIGHT_1484 = 1484
-OILY_CLOTH = 1485
-PIECE_OF_RAILING = 1486
-UNICORN_HORN_1487 = 1487
-PALADINS_BADGE = 1488
-PALADINS_BADGE_1489 = 1489
-PALADINS_BADGE_1490 = 1490
-WITCHS_CAT = 1491
-DOLL_OF_IBAN = 1492
-OLD_JOURNAL = 1493
-HISTORY_OF_IBAN = 1494
-KLANKS_GAUNTLETS = 1495
-IBANS_DOVE = 1496
-AMULET_OF_OTHANIAN = 1497
-AMULET_OF_DOOMION = 1498
-AMULET_OF_HOLTHION = 1499
-IBANS_SHADOW = 1500
-DWARF_BREW = 1501
-IBANS_ASHES = 1502
-WARRANT = 1503
-HANGOVER_CURE = 1504
-ARDOUGNE_TELEPORT_SCROLL = 1505
-GAS_MASK = 1506
-A_SMALL_KEY = 1507
-A_SCRUFFY_NOTE = 1508
-BOOK_1509 = 1509
-PICTURE = 1510
-LOGS = 1511
-LOGS_NOTED = 1512
-MAGIC_LOGS = 1513
-MAGIC_LOGS_NOTED = 1514
-YEW_LOGS = 1515
-YEW_LOGS_NOTED = 1516
-MAPLE_LOGS = 1517
-MAPLE_LOGS_NOTED = 1518
-WILLOW_LOGS = 1519
-WILLOW_LOGS_NOTED = 1520
-OAK_LOGS = 1521
-OAK_LOGS_NOTED = 1522
-LOCKPICK = 1523
-LOCKPICK_NOTED = 1524
-GRIMY_SNAKE_WEED = 1525
-SNAKE_WEED = 1526
-GRIMY_ARDRIGAL = 1527
-ARDRIGAL = 1528
-GRIMY_SITO_FOIL = 1529
-SITO_FOIL = 1530
-GRIMY_VOLENCIA_MOSS = 1531
-VOLENCIA_MOSS = 1532
-GRIMY_ROGUES_PURSE = 1533
-ROGUES_PURSE = 1534
-MAP_PART = 1535
-MAP_PART_1536 = 1536
-MAP_PART_1537 = 1537
-CRANDOR_MAP = 1538
-STEEL_NAILS = 1539
-ANTIDRAGON_SHIELD = 1540
-ANTIDRAGON_SHIELD_NOTED = 1541
-MAZE_KEY = 1542
-KEY_1543 = 1543
-KEY_1544 = 1544
-KEY_1545 = 1545
-KEY_1546 = 1546
-KEY_1547 = 1547
-KEY_1548 = 1548
-STAKE = 1549
-GARLIC = 1550
-GARLIC_NOTED = 1551
-SEASONED_SARDINE = 1552
-SEASONED_SARDINE_NOTED = 1553
-FLUFFS_KITTEN = 1554
-PET_KITTEN = 1555
-PET_KITTEN_1556 = 1556
-PET_KITTEN_1557 = 1557
-PET_KITTEN_1558 = 1558
-PET_KITTEN_1559 = 1559
-PET_KITTEN_1560 = 1560
-PET_CAT = 1561
-PET_CAT_1562 = 1562
-PET_CAT_1563 = 1563
-PET_CAT_1564 = 1564
-PET_CAT_1565 = 1565
-PET_CAT_1566 = 1566
-PET_CAT_1567 = 1567
-PET_CAT_1568 = 1568
-PET_CAT_1569 = 1569
-PET_CAT_1570 = 1570
-PET_CAT_1571 = 1571
-PET_CAT_1572 = 1572
-DOOGLE_LEAVES = 1573
-DOOGLE_LEAVES_NOTED = 1574
-CAT_TRAINING_MEDAL = 1575
-CAT_TRAINING_MEDAL_NOTED = 1576
-PETES_CANDLESTICK = 1577
-PETES_CANDLESTICK_NOTED = 1578
-THIEVES_ARMBAND = 1579
-ICE_GLOVES = 1580
-BLAMISH_SNAIL_SLIME = 1581
-BLAMISH_OIL = 1582
-FIRE_FEATHER = 1583
-ID_PAPERS = 1584
-OILY_FISHING_ROD = 1585
-MISCELLANEOUS_KEY = 1586
-MISCELLANEOUS_KEY_NOTED = 1587
-GRIPS_KEYRING = 1588
-BUCHU_SEED_1589 = 1589
-DUSTY_KEY = 1590
-JAIL_KEY = 1591
-RING_MOULD = 1592
-RING_MOULD_NOTED = 1593
-UNHOLY_MOULD = 1594
-AMULET_MOULD = 1595
-AMULET_MOULD_NOTED = 1596
-NECKLACE_MOULD = 1597
-NECKLACE_MOULD_NOTED = 1598
-HOLY_MOULD = 1599
-HOLY_MOULD_NOTED = 1600
-DIAMOND = 1601
-DIAMOND_NOTED = 1602
-RUBY = 1603
-RUBY_NOTED = 1604
-EMERALD = 1605
-EMERALD_NOTED = 1606
-SAPPHIRE = 1607
-SAPPHIRE_NOTED = 1608
-OPAL = 1609
-OPAL_NOTED = 1610
-JADE = 1611
-JADE_NOTED = 1612
-RED_TOPAZ = 1613
-RED_TOPAZ_NOTED = 1614
-DRAGONSTONE = 1615
-DRAGONSTONE_NOTED = 1616
-UNCUT_DIAMOND = 1617
-UNCUT_DIAMOND_NOTED = 1618
-UNCUT_RUBY = 1619
-UNCUT_RUBY_NOTED = 1620
-UNCUT_EMERALD = 1621
-UNCUT_EMERALD_NOTED = 1622
-UNCUT_SAPPHIRE = 1623
-UNCUT_SAPPHIRE_NOTED = 1624
-UNCUT_OPAL = 1625
-UNCUT_OPAL_NOTED = 1626
-UNCUT_JADE = 1627
-UNCUT_JADE_NOTED = 1628
-UNCUT_RED_TOPAZ = 1629
-UNCUT_RED_TOPAZ_NOTED = 1630
-UNCUT_DRAGONSTONE = 1631
-UNCUT_DRAGONSTONE_NOTED = 1632
-CRUSHED_GEM = 1633
-CRUSHED_GEM_NOTED = 1634
-GOLD_RING = 1635
-GOLD_RING_NOTED = 1636
-SAPPHIRE_RING = 1637
-SAPPHIRE_RING_NOTED = 1638
-EMERALD_RING = 1639
-EMERALD_RING_NOTED = 1640
-RUBY_RING = 1641
-RUBY_RING_NOTED = 1642
-DIAMOND_RING = 1643
-DIAMOND_RING_NOTED = 1644
-DRAGONSTONE_RING = 1645
-DRAGONSTONE_RING_NOTED = 1646
-BULLET_ARROW = 1649
-BULLET_ARROW_1650 = 1650
-BULLET_ARROW_1651 = 1651
-GLISTENING_TEAR = 1652
-GLISTENING_TEAR_1653 = 1653
-GOLD_NECKLACE = 1654
-GOLD_NECKLACE_NOTED = 1655
-SAPPHIRE_NECKLACE = 1656
-SAPPHIRE_NECKLACE_NOTED = 1657
-EMERALD_NECKLACE = 1658
-EMERALD_NECKLACE_NOTED = 1659
-RUBY_NECKLACE = 1660
-RUBY_NECKLACE_NOTED = 1661
-DIAMOND_NECKLACE = 1662
-DIAMOND_NECKLACE_NOTED = 1663
-DRAGON_NECKLACE = 1664
-DRAGON_NECKLACE_NOTED = 1665
-DRAGONSTONE_DRAGON_BOLTS_E = 1668
-ONYX_DRAGON_BOLTS_E = 1669
-ONYX_DRAGON_BOLTS_E_1670 = 1670
-ONYX_DRAGON_BOLTS_E_1671 = 1671
-ONYX_DRAGON_BOLTS_E_1672 = 1672
-GOLD_AMULET_U = 1673
-GOLD_AMULET_U_NOTED = 1674
-SAPPHIRE_AMULET_U = 1675
-SAPPHIRE_AMULET_U_NOTED = 1676
-EMERALD_AMULET_U = 1677
-EMERALD_AMULET_U_NOTED = 1678
-RUBY_AMULET_U = 1679
-RUBY_AMULET_U_NOTED = 1680
-DIAMOND_AMULET_U = 1681
-DIAMOND_AMULET_U_NOTED = 1682
-DRAGONSTONE_AMULET_U = 1683
-DRAGONSTONE_AMULET_U_NOTED = 1684
-KARAMJA_GLOVES = 1686
-DIAMOND_DRAGON_BOLTS_E = 1687
-DIAMOND_DRAGON_BOLTS_E_1688 = 1688
-DIAMOND_DRAGON_BOLTS_E_1689 = 1689
-DIAMOND_DRAGON_BOLTS_E_1690 = 1690
-DRAGONSTONE_DRAGON_BOLTS_E_1691 = 1691
-GOLD_AMULET = 1692
-GOLD_AMULET_NOTED = 1693
-SAPPHIRE_AMULET = 1694
-SAPPHIRE_AMULET_NOTED = 1695
-EMERALD_AMULET = 1696
-EMERALD_AMULET_NOTED = 1697
-RUBY_AMULET = 1698
-RUBY_AMULET_NOTED = 1699
-DIAMOND_AMULET = 1700
-DIAMOND_AMULET_NOTED = 1701
-DRAGONSTONE_AMULET = 1702
-DRAGONSTONE_AMULET_NOTED = 1703
-AMULET_OF_GLORY = 1704
-AMULET_OF_GLORY_NOTED = 1705
-AMULET_OF_GLORY1 = 1706
-AMULET_OF_GLORY1_NOTED = 1707
-AMULET_OF_GLORY2 = 1708
-AMULET_OF_GLORY2_NOTED = 1709
-AMULET_OF_GLORY3 = 1710
-AMULET_OF_GLORY3_NOTED = 1711
-AMULET_OF_GLORY4 = 1712
-AMULET_OF_GLORY4_NOTED = 1713
-UNSTRUNG_SYMBOL = 1714
-UNSTRUNG_SYMBOL_NOTED = 1715
-UNBLESSED_SYMBOL = 1716
-UNBLESSED_SYMBOL_NOTED = 1717
-HOLY_SYMBOL = 1718
-HOLY_SYMBOL_NOTED = 1719
-UNSTRUNG_EMBLEM = 1720
-UNSTRUNG_EMBLEM_NOTED = 1721
-UNPOWERED_SYMBOL = 1722
-UNPOWERED_SYMBOL_NOTED = 1723
-UNHOLY_SYMBOL = 1724
-AMULET_OF_STRENGTH = 1725
-AMULET_OF_STRENGTH_NOTED = 1726
-AMULET_OF_MAGIC = 1727
-AMULET_OF_MAGIC_NOTED = 1728
-AMULET_OF_DEFENCE = 1729
-AMULET_OF_DEFENCE_NOTED = 1730
-AMULET_OF_POWER = 1731
-AMULET_OF_POWER_NOTED = 1732
-NEEDLE = 1733
-THREAD = 1734
-SHEARS = 1735
-SHEARS_NOTED = 1736
-WOOL = 1737
-WOOL_NOTED = 1738
-COWHIDE = 1739
-COWHIDE_NOTED = 1740
-LEATHER = 1741
-LEATHER_NOTED = 1742
-HARD_LEATHER = 1743
-HARD_LEATHER_NOTED = 1744
-GREEN_DRAGON_LEATHER = 1745
-GREEN_DRAGON_LEATHER_NOTED = 1746
-BLACK_DRAGONHIDE = 1747
-BLACK_DRAGONHIDE_NOTED = 1748
-RED_DRAGONHIDE = 1749
-RED_DRAGONHIDE_NOTED = 1750
-BLUE_DRAGONHIDE = 1751
-BLUE_DRAGONHIDE_NOTED = 1752
-GREEN_DRAGONHIDE = 1753
-GREEN_DRAGONHIDE_NOTED = 1754
-CHISEL = 1755
-CHISEL_NOTED = 1756
-BROWN_APRON = 1757
-BROWN_APRON_NOTED = 1758
-BALL_OF_WOOL = 1759
-BALL_OF_WOOL_NOTED = 1760
-SOFT_CLAY = 1761
-SOFT_CLAY_NOTED = 1762
-RED_DYE = 1763
-RED_DYE_NOTED = 1764
-YELLOW_DYE = 1765
-YELLOW_DYE_NOTED = 1766
-BLUE_DYE = 1767
-BLUE_DYE_NOTED = 1768
-ORANGE_DYE = 1769
-ORANGE_DYE_NOTED = 1770
-GREEN_DYE = 1771
-GREEN_DYE_NOTED = 1772
-PURPLE_DYE = 1773
-PURPLE_DYE_NOTED = 1774
-MOLTEN_GLASS = 1775
-MOLTEN_GLASS_NOTED = 1776
-BOW_STRING = 1777
-BOW_STRING_NOTED = 1778
-FLAX = 1779
-FLAX_NOTED = 1780
-SODA_ASH = 1781
-SODA_ASH_NOTED = 1782
-BUCKET_OF_SAND = 1783
-BUCKET_OF_SAND_NOTED = 1784
-GLASSBLOWING_PIPE = 1785
-GLASSBLOWING_PIPE_NOTED = 1786
-UNFIRED_POT = 1787
-UNFIRED_POT_NOTED = 1788
-UNFIRED_PIE_DISH = 1789
-UNFIRED_PIE_DISH_NOTED = 1790
-UNFIRED_BOWL = 1791
-UNFIRED_BOWL_NOTED = 1792
-WOAD_LEAF = 1793
-BRONZE_WIRE = 1794
-BRONZE_WIRE_NOTED = 1795
-SILVER_NECKLACE = 1796
-SILVER_NECKLACE_1797 = 1797
-SILVER_CUP = 1798
-SILVER_CUP_1799 = 1799
-SILVER_BOTTLE = 1800
-SILVER_BOTTLE_1801 = 1801
-SILVER_BOOK = 1802
-SILVER_BOOK_1803 = 1803
-SILVER_NEEDLE = 1804
-SILVER_NEEDLE_1805 = 1805
-SILVER_POT = 1806
-SILVER_POT_1807 = 1807
-CRIMINALS_THREAD = 1808
-CRIMINALS_THREAD_1809 = 1809
-CRIMINALS_THREAD_1810 = 1810
-FLYPAPER = 1811
-PUNGENT_POT = 1812
-CRIMINALS_DAGGER = 1813
-CRIMINALS_DAGGER_1814 = 1814
-KILLERS_PRINT = 1815
-ANNAS_PRINT = 1816
-BOBS_PRINT = 1817
-CAROLS_PRINT = 1818
-DAVIDS_PRINT = 1819
-ELIZABETHS_PRINT = 1820
-FRANKS_PRINT = 1821
-UNKNOWN_PRINT = 1822
-WATERSKIN4 = 1823
-WATERSKIN4_NOTED = 1824
-WATERSKIN3 = 1825
-WATERSKIN3_NOTED = 1826
-WATERSKIN2 = 1827
-WATERSKIN2_NOTED = 1828
-WATERSKIN1 = 1829
-WATERSKIN1_NOTED = 1830
-WATERSKIN0 = 1831
-WATERSKIN0_NOTED = 1832
-DESERT_SHIRT = 1833
-DESERT_SHIRT_NOTED = 1834
-DESERT_ROBE = 1835
-DESERT_ROBE_NOTED = 1836
-DESERT_BOOTS = 1837
-DESERT_BOOTS_NOTED = 1838
-METAL_KEY = 1839
-CELL_DOOR_KEY = 1840
-BARREL = 1841
-ANA_IN_A_BARREL = 1842
-WROUGHT_IRON_KEY = 1843
-SLAVE_SHIRT = 1844
-SLAVE_ROBE = 1845
-SLAVE_BOOTS = 1846
-SCRUMPLED_PAPER = 1847
-SHANTAY_DISCLAIMER = 1848
-PROTOTYPE_DART = 1849
-TECHNICAL_PLANS = 1850
-TENTI_PINEAPPLE = 1851
-BEDABIN_KEY = 1852
-PROTOTYPE_DART_TIP = 1853
-SHANTAY_PASS = 1854
-ROCK_1855 = 1855
-GUIDE_BOOK = 1856
-TOTEM = 1857
-ADDRESS_LABEL = 1858
-RAW_UGTHANKI_MEAT = 1859
-RAW_UGTHANKI_MEAT_NOTED = 1860
-UGTHANKI_MEAT = 1861
-UGTHANKI_MEAT_NOTED = 1862
-PITTA_DOUGH = 1863
-PITTA_DOUGH_NOTED = 1864
-PITTA_BREAD = 1865
-PITTA_BREAD_NOTED = 1866
-BURNT_PITTA_BREAD = 1867
-BURNT_PITTA_BREAD_NOTED = 1868
-CHOPPED_TOMATO = 1869
-CHOPPED_TOMATO_NOTED = 1870
-CHOPPED_ONION = 1871
-CHOPPED_ONION_NOTED = 1872
-CHOPPED_UGTHANKI = 1873
-CHOPPED_UGTHANKI_NOTED = 1874
-ONION__TOMATO = 1875
-ONION__TOMATO_NOTED = 1876
-UGTHANKI__ONION = 1877
-UGTHANKI__ONION_NOTED = 1878
-UGTHANKI__TOMATO = 1879
-UGTHANKI__TOMATO_NOTED = 1880
-KEBAB_MIX = 1881
-KEBAB_MIX_NOTED = 1882
-UGTHANKI_KEBAB = 1883
-UGTHANKI_KEBAB_NOTED = 1884
-UGTHANKI_KEBAB_1885 = 1885
-UGTHANKI_KEBAB_NOTED_1886 = 1886
-CAKE_TIN = 1887
-CAKE_TIN_NOTED = 1888
-UNCOOKED_CAKE = 1889
-UNCOOKED_CAKE_NOTED = 1890
-CAKE = 1891
-CAKE_NOTED = 1892
-_23_CAKE = 1893
-_23_CAKE_NOTED = 1894
-SLICE_OF_CAKE = 1895
-SLICE_OF_CAKE_NOTED = 1896
-CHOCOLATE_CAKE = 1897
-CHOCOLATE_CAKE_NOTED = 1898
-_23_CHOCOLATE_CAKE = 1899
-_23_CHOCOLATE_CAKE_NOTED = 1900
-CHOCOLATE_SLICE = 1901
-CHOCOLATE_SLICE_NOTED = 1902
-BURNT_CAKE = 1903
-BURNT_CAKE_NOTED = 1904
-ASGARNIAN_ALE = 1905
-ASGARNIAN_ALE_NOTED = 1906
-WIZARDS_MIND_BOMB = 1907
-WIZARDS_MIND_BOMB_NOTED = 1908
-GREENMANS_ALE = 1909
-GREENMANS_ALE_NOTED = 1910
-DRAGON_BITTER = 1911
-DRAGON_BITTER_NOTED = 1912
-DWARVEN_STOUT = 1913
-DWARVEN_STOUT_NOTED = 1914
-GROG = 1915
-GROG_NOTED = 1916
-BEER = 1917
-BEER_NOTED = 1918
-BEER_GLASS = 1919
-BEER_GLASS_NOTED = 1920
-BOWL_OF_WATER = 1921
-BOWL_OF_WATER_NOTED = 1922
-BOWL = 1923
-BOWL_NOTED = 1924
-BUCKET = 1925
-BUCKET_NOTED = 1926
-BUCKET_OF_MILK = 1927
-BUCKET_OF_MILK_NOTED = 1928
-BUCKET_OF_WATER = 1929
-BUCKET_OF_WATER_NOTED = 1930
-POT = 1931
-POT_NOTED = 1932
-POT_OF_FLOUR = 1933
-POT_OF_FLOUR_NOTED = 1934
-JUG = 1935
-JUG_NOTED = 1936
-JUG_OF_WATER = 1937
-JUG_OF_WATER_NOTED = 1938
-SWAMP_TAR = 1939
-RAW_SWAMP_PASTE = 1940
-SWAMP_PASTE = 1941
-POTATO = 1942
-POTATO_NOTED = 1943
-EGG = 1944
-EGG_NOTED = 1945
-FLOUR = 1946
-GRAIN = 1947
-GRAIN_NOTED = 1948
-CHEFS_HAT = 1949
-CHEFS_HAT_NOTED = 1950
-REDBERRIES = 1951
-REDBERRIES_NOTED = 1952
-PASTRY_DOUGH = 1953
-PASTRY_DOUGH_NOTED = 1954
-COOKING_APPLE = 1955
-COOKING_APPLE_NOTED = 1956
-ONION = 1957
-ONION_NOTED = 1958
-PUMPKIN = 1959
-PUMPKIN_NOTED = 1960
-EASTER_EGG = 1961
-EASTER_EGG_NOTED = 1962
-BANANA = 1963
-BANANA_NOTED = 1964
-CABBAGE = 1965
-CABBAGE_NOTED = 1966
-CABBAGE_1967 = 1967
-CABBAGE_NOTED_1968 = 1968
-SPINACH_ROLL = 1969
-SPINACH_ROLL_NOTED = 1970
-KEBAB = 1971
-KEBAB_NOTED = 1972
-CHOCOLATE_BAR = 1973
-CHOCOLATE_BAR_NOTED = 1974
-CHOCOLATE_DUST = 1975
-CHOCOLATE_DUST_NOTED = 1976
-CHOCOLATEY_MILK = 1977
-CUP_OF_TEA_1978 = 1978
-CUP_OF_TEA_NOTED = 1979
-EMPTY_CUP = 1980
-EMPTY_CUP_NOTED = 1981
-TOMATO = 1982
-TOMATO_NOTED = 1983
-ROTTEN_APPLE = 1984
-CHEESE = 1985
-CHEESE_NOTED = 1986
-GRAPES = 1987
-GRAPES_NOTED = 1988
-HALF_FULL_WINE_JUG = 1989
-HALF_FULL_WINE_JUG_NOTED = 1990
-JUG_OF_BAD_WINE = 1991
-JUG_OF_BAD_WINE_1992 = 1992
-JUG_OF_WINE = 1993
-JUG_OF_WINE_NOTED = 1994
-UNFERMENTED_WINE = 1995
-UNFERMENTED_WINE_1996 = 1996
-INCOMPLETE_STEW = 1997
-INCOMPLETE_STEW_NOTED = 1998
-INCOMPLETE_STEW_1999 = 1999
-INCOMPLETE_STEW_NOTED_2000 = 2000
-UNCOOKED_STEW = 2001
-UNCOOKED_STEW_NOTED = 2002
-STEW = 2003
-STEW_NOTED = 2004
-BURNT_STEW = 2005
-BURNT_STEW_NOTED = 2006
-SPICE = 2007
-SPICE_NOTED = 2008
-UNCOOKED_CURRY = 2009
-UNCOOKED_CURRY_NOTED = 2010
-CURRY = 2011
-CURRY_NOTED = 2012
-BURNT_CURRY = 2013
-BURNT_CURRY_NOTED = 2014
-VODKA = 2015
-VODKA_NOTED = 2016
-WHISKY = 2017
-WHISKY_NOTED = 2018
-GIN = 2019
-GIN_NOTED = 2020
-BRANDY = 2021
-BRANDY_NOTED = 2022
-COCKTAIL_GUIDE = 2023
-COCKTAIL_GUIDE_NOTED = 2024
-COCKTAIL_SHAKER = 2025
-COCKTAIL_GLASS = 2026
-COCKTAIL_GLASS_NOTED = 2027
-PREMADE_BLURB_SP = 2028
-PREMADE_BLURB_SP_NOTED = 2029
-PREMADE_CHOC_SDY = 2030
-PREMADE_CHOC_SDY_NOTED = 2031
-PREMADE_DR_DRAGON = 2032
-PREMADE_DR_DRAGON_NOTED = 2033
-PREMADE_FR_BLAST = 2034
-PREMADE_FR_BLAST_NOTED = 2035
-PREMADE_P_PUNCH = 2036
-PREMADE_P_PUNCH_NOTED = 2037
-PREMADE_SGG = 2038
-PREMADE_SGG_NOTED = 2039
-PREMADE_WIZ_BLZD = 2040
-PREMADE_WIZ_BLZD_NOTED = 2041
-UNFINISHED_COCKTAIL = 2042
-UNFINISHED_COCKTAIL_NOTED = 2043
-UNFINISHED_COCKTAIL_2044 = 2044
-UNFINISHED_COCKTAIL_NOTED_2045 = 2045
-UNFINISHED_COCKTAIL_2046 = 2046
-UNFINISHED_COCKTAIL_NOTED_2047 = 2047
-PINEAPPLE_PUNCH = 2048
-PINEAPPLE_PUNCH_NOTED = 2049
-UNFINISHED_COCKTAIL_2050 = 2050
-UNFINISHED_COCKTAIL_NOTED_2051 = 2051
-UNFINISHED_COCKTAIL_2052 = 2052
-UNFINISHED_COCKTAIL_NOTED_2053 = 2053
-WIZARD_BLIZZARD = 2054
-WIZARD_BLIZZARD_NOTED = 2055
-UNFINISHED_COCKTAIL_2056 = 2056
-UNFINISHED_COCKTAIL_NOTED_2057 = 2057
-UNFINISHED_COCKTAIL_2058 = 2058
-UNFINISHED_COCKTAIL_NOTED_2059 = 2059
-UNFINISHED_COCKTAIL_2060 = 2060
-UNFINISHED_COCKTAIL_NOTED_2061 = 2061
-UNFINISHED_COCKTAIL_2062 = 2062
-UNFINISHED_COCKTAIL_NOTED_2063 = 2063
-BLURBERRY_SPECIAL = 2064
-BLURBERRY_SPECIAL_NOTED = 2065
-UNFINISHED_COCKTAIL_2066 = 2066
-UNFINISHED_COCKTAIL_NOTED_2067 = 2067
-UNFINISHED_COCKTAIL_2068 = 2068
-UNFINISHED_COCKTAIL_NOTED_2069 = 2069
-UNFINISHED_COCKTAIL_2070 = 2070
-UNFINISHED_COCKTAIL_NOTED_2071 = 2071
-UNFINISHED_COCKTAIL_2072 = 2072
-UNFINISHED_COCKTAIL_NOTED_2073 = 2073
-CHOC_SATURDAY = 2074
-CHOC_SATURDAY_NOTED = 2075
-UNFINISHED_COCKTAIL_2076 = 2076
-UNFINISHED_COCKTAIL_NOTED_2077 = 2077
-UNFINISHED_COCKTAIL_2078 = 2078
-UNFINISHED_COCKTAIL_NOTED_2079 = 2079
-SHORT_GREEN_GUY = 2080
-SHORT_GREEN_GUY_NOTED = 2081
-UNFINISHED_COCKTAIL_2082 = 2082
-UNFINISHED_COCKTAIL_NOTED_2083 = 2083
-FRUIT_BLAST = 2084
-FRUIT_BLAST_NOTED = 2085
-UNFINISHED_COCKTAIL_2086 = 2086
-UNFINISHED_COCKTAIL_NOTED_2087 = 2087
-UNFINISHED_COCKTAIL_2088 = 2088
-UNFINISHED_COCKTAIL_NOTED_2089 = 2089
-UNFINISHED_COCKTAIL_2090 = 2090
-UNFINISHED_COCKTAIL_NOTED_2091 = 2091
-DRUNK_DRAGON = 2092
-DRUNK_DRAGON_NOTED = 2093
-ODD_COCKTAIL = 2094
-ODD_COCKTAIL_NOTED = 2095
-ODD_COCKTAIL_2096 = 2096
-ODD_COCKTAIL_NOTED_2097 = 2097
-ODD_COCKTAIL_2098 = 2098
-ODD_COCKTAIL_NOTED_2099 = 2099
-ODD_COCKTAIL_2100 = 2100
-ODD_COCKTAIL_NOTED_2101 = 2101
-LEMON = 2102
-LEMON_NOTED = 2103
-LEMON_CHUNKS = 2104
-LEMON_CHUNKS_NOTED = 2105
-LEMON_SLICES = 2106
-LEMON_SLICES_NOTED = 2107
-ORANGE = 2108
-ORANGE_NOTED = 2109
-ORANGE_CHUNKS = 2110
-ORANGE_CHUNKS_NOTED = 2111
-ORANGE_SLICES = 2112
-ORANGE_SLICES_NOTED = 2113
-PINEAPPLE = 2114
-PINEAPPLE_NOTED = 2115
-PINEAPPLE_CHUNKS = 2116
-PINEAPPLE_CHUNKS_NOTED = 2117
-PINEAPPLE_RING = 2118
-PINEAPPLE_RING_NOTED = 2119
-LIME = 2120
-LIME_NOTED = 2121
-LIME_CHUNKS = 2122
-LIME_CHUNKS_NOTED = 2123
-LIME_SLICES = 2124
-LIME_SLICES_NOTED = 2125
-DWELLBERRIES = 2126
-DWELLBERRIES_NOTED = 2127
-EQUA_LEAVES = 2128
-EQUA_LEAVES_NOTED = 2129
-POT_OF_CREAM = 2130
-POT_OF_CREAM_NOTED = 2131
-RAW_BEEF = 2132
-RAW_BEEF_NOTED = 2133
-RAW_RAT_MEAT = 2134
-RAW_RAT_MEAT_NOTED = 2135
-RAW_BEAR_MEAT = 2136
-RAW_BEAR_MEAT_NOTED = 2137
-RAW_CHICKEN = 2138
-RAW_CHICKEN_NOTED = 2139
-COOKED_CHICKEN = 2140
-COOKED_CHICKEN_NOTED = 2141
-COOKED_MEAT = 2142
-COOKED_MEAT_NOTED = 2143
-BURNT_CHICKEN = 2144
-BURNT_CHICKEN_NOTED = 2145
-BURNT_MEAT = 2146
-BURNT_MEAT_NOTED = 2147
-RAW_LAVA_EEL = 2148
-LAVA_EEL = 2149
-SWAMP_TOAD = 2150
-SWAMP_TOAD_NOTED = 2151
-TOADS_LEGS = 2152
-TOADS_LEGS_NOTED = 2153
-EQUA_TOADS_LEGS = 2154
-EQUA_TOADS_LEGS_NOTED = 2155
-SPICY_TOADS_LEGS = 2156
-SPICY_TOADS_LEGS_NOTED = 2157
-SEASONED_LEGS = 2158
-SEASONED_LEGS_NOTED = 2159
-SPICY_WORM = 2160
-SPICY_WORM_NOTED = 2161
-KING_WORM = 2162
-KING_WORM_NOTED = 2163
-BATTA_TIN = 2164
-CRUNCHY_TRAY = 2165
-GNOMEBOWL_MOULD = 2166
-GIANNES_COOK_BOOK = 2167
-GIANNES_COOK_BOOK_NOTED = 2168
-GNOME_SPICE = 2169
-GNOME_SPICE_NOTED = 2170
-GIANNE_DOUGH = 2171
-GIANNE_DOUGH_NOTED = 2172
-ODD_GNOMEBOWL = 2173
-ODD_GNOMEBOWL_NOTED = 2174
-BURNT_GNOMEBOWL = 2175
-BURNT_GNOMEBOWL_NOTED = 2176
-HALF_BAKED_BOWL = 2177
-RAW_GNOMEBOWL = 2178
-UNFINISHED_BOWL = 2179
-UNFINISHED_BOWL_NOTED = 2180
-UNFINISHED_BOWL_2181 = 2181
-UNFINISHED_BOWL_NOTED_2182 = 2182
-UNFINISHED_BOWL_2183 = 2183
-UNFINISHED_BOWL_NOTED_2184 = 2184
-CHOCOLATE_BOMB = 2185
-CHOCOLATE_BOMB_NOTED = 2186
-TANGLED_TOADS_LEGS = 2187
-TANGLED_TOADS_LEGS_NOTED = 2188
-UNFINISHED_BOWL_2189 = 2189
-UNFINISHED_BOWL_NOTED_2190 = 2190
-WORM_HOLE = 2191
-WORM_HOLE_NOTED = 2192
-UNFINISHED_BOWL_2193 = 2193
-UNFINISHED_BOWL_NOTED_2194 = 2194
-VEG_BALL = 2195
-VEG_BALL_NOTED = 2196
-ODD_CRUNCHIES = 2197
-ODD_CRUNCHIES_NOTED = 2198
-BURNT_CRUNCHIES = 2199
-BURNT_CRUNCHIES_NOTED = 2200
-HALF_BAKED_CRUNCHY = 2201
-RAW_CRUNCHIES = 2202
-ROCKCLIMBING_BOOTS = 2203
-ROCKCLIMBING_BOOTS_NOTED = 2204
-WORM_CRUNCHIES = 2205
-WORM_CRUNCHIES_NOTED = 2206
-UNFINISHED_CRUNCHY = 2207
-UNFINISHED_CRUNCHY_NOTED = 2208
-CHOCCHIP_CRUNCHIES = 2209
-CHOCCHIP_CRUNCHIES_NOTED = 2210
-UNFINISHED_CRUNCHY_2211 = 2211
-UNFINISHED_CRUNCHY_NOTED_2212 = 2212
-SPICY_CRUNCHIES = 2213
-SPICY_CRUNCHIES_NOTED = 2214
-UNFINISHED_CRUNCHY_2215 = 2215
-UNFINISHED_CRUNCHY_NOTED_2216 = 2216
-TOAD_CRUNCHIES = 2217
-TOAD_CRUNCHIES_NOTED = 2218
-PREMADE_WM_BATTA = 2219
-PREMADE_WM_BATTA_NOTED = 2220
-PREMADE_TD_BATTA = 2221
-PREMADE_TD_BATTA_NOTED = 2222
-PREMADE_CT_BATTA = 2223
-PREMADE_CT_BATTA_NOTED = 2224
-PREMADE_FRT_BATTA = 2225
-PREMADE_FRT_BATTA_NOTED = 2226
-PREMADE_VEG_BATTA = 2227
-PREMADE_VEG_BATTA_NOTED = 2228
-PREMADE_CHOC_BOMB = 2229
-PREMADE_CHOC_BOMB_NOTED = 2230
-PREMADE_TTL = 2231
-PREMADE_TTL_NOTED = 2232
-PREMADE_WORM_HOLE = 2233
-PREMADE_WORM_HOLE_NOTED = 2234
-PREMADE_VEG_BALL = 2235
-PREMADE_VEG_BALL_NOTED = 2236
-PREMADE_WM_CRUN = 2237
-PREMADE_WM_CRUN_NOTED = 2238
-PREMADE_CH_CRUNCH = 2239
-PREMADE_CH_CRUNCH_NOTED = 2240
-PREMADE_SY_CRUNCH = 2241
-PREMADE_SY_CRUNCH_NOTED = 2242
-PREMADE_TD_CRUNCH = 2243
-PREMADE_TD_CRUNCH_NOTED = 2244
-ODD_BATTA = 2245
-ODD_BATTA_NOTED = 2246
-BURNT_BATTA = 2247
-BURNT_BATTA_NOTED = 2248
-HALF_BAKED_BATTA = 2249
-RAW_BATTA = 2250
-UNFINISHED_BATTA = 2251
-UNFINISHED_BATTA_NOTED = 2252
-WORM_BATTA = 2253
-WORM_BATTA_NOTED = 2254
-TOAD_BATTA = 2255
-TOAD_BATTA_NOTED = 2256
-UNFINISHED_BATTA_2257 = 2257
-UNFINISHED_BATTA_NOTED_2258 = 2258
-CHEESETOM_BATTA = 2259
-CHEESETOM_BATTA_NOTED = 2260
-UNFINISHED_BATTA_2261 = 2261
-UNFINISHED_BATTA_NOTED_2262 = 2262
-UNFINISHED_BATTA_2263 = 2263
-UNFINISHED_BATTA_NOTED_2264 = 2264
-UNFINISHED_BATTA_2265 = 2265
-UNFINISHED_BATTA_NOTED_2266 = 2266
-UNFINISHED_BATTA_2267 = 2267
-UNFINISHED_BATTA_NOTED_2268 = 2268
-UNFINISHED_BATTA_2269 = 2269
-UNFINISHED_BATTA_NOTED_2270 = 2270
-UNFINISHED_BATTA_2271 = 2271
-UNFINISHED_BATTA_NOTED_2272 = 2272
-UNFINISHED_BATTA_2273 = 2273
-UNFINISHED_BATTA_NOTED_2274 = 2274
-UNFINISHED_BATTA_2275 = 2275
-UNFINISHED_BATTA_NOTED_2276 = 2276
-FRUIT_BATTA = 2277
-FRUIT_BATTA_NOTED = 2278
-UNFINISHED_BATTA_2279 = 2279
-UNFINISHED_BATTA_NOTED_2280 = 2280
-VEGETABLE_BATTA = 2281
-VEGETABLE_BATTA_NOTED = 2282
-PIZZA_BASE = 2283
-PIZZA_BASE_NOTED = 2284
-INCOMPLETE_PIZZA = 2285
-INCOMPLETE_PIZZA_NOTED = 2286
-UNCOOKED_PIZZA = 2287
-UNCOOKED_PIZZA_NOTED = 2288
-PLAIN_PIZZA = 2289
-PLAIN_PIZZA_NOTED = 2290
-_12_PLAIN_PIZZA = 2291
-_12_PLAIN_PIZZA_NOTED = 2292
-MEAT_PIZZA = 2293
-MEAT_PIZZA_NOTED = 2294
-_12_MEAT_PIZZA = 2295
-_12_MEAT_PIZZA_NOTED = 2296
-ANCHOVY_PIZZA = 2297
-ANCHOVY_PIZZA_NOTED = 2298
-_12_ANCHOVY_PIZZA = 2299
-_12_ANCHOVY_PIZZA_NOTED = 2300
-PINEAPPLE_PIZZA = 2301
-PINEAPPLE_PIZZA_NOTED = 2302
-_12_PINEAPPLE_PIZZA = 2303
-_12_PINEAPPLE_PIZZA_NOTED = 2304
-BURNT_PIZZA = 2305
-BURNT_PIZZA_NOTED = 2306
-BREAD_DOUGH = 2307
-BREAD_DOUGH_NOTED = 2308
-BREAD = 2309
-BREAD_NOTED = 2310
-BURNT_BREAD = 2311
-BURNT_BREAD_NOTED = 2312
-PIE_DISH = 2313
-PIE_DISH_NOTED = 2314
-PIE_SHELL = 2315
-PIE_SHELL_NOTED = 2316
-UNCOOKED_APPLE_PIE = 2317
-UNCOOKED_APPLE_PIE_NOTED = 2318
-UNCOOKED_MEAT_PIE = 2319
-UNCOOKED_MEAT_PIE_NOTED = 2320
-UNCOOKED_BERRY_PIE = 2321
-UNCOOKED_BERRY_PIE_NOTED = 2322
-APPLE_PIE = 2323
-APPLE_PIE_NOTED = 2324
-REDBERRY_PIE = 2325
-REDBERRY_PIE_NOTED = 2326
-MEAT_PIE = 2327
-MEAT_PIE_NOTED = 2328
-BURNT_PIE = 2329
-BURNT_PIE_NOTED = 2330
-HALF_A_MEAT_PIE = 2331
-HALF_A_MEAT_PIE_NOTED = 2332
-HALF_A_REDBERRY_PIE = 2333
-HALF_A_REDBERRY_PIE_NOTED = 2334
-HALF_AN_APPLE_PIE = 2335
-HALF_AN_APPLE_PIE_NOTED = 2336
-RAW_OOMLIE = 2337
-RAW_OOMLIE_NOTED = 2338
-PALM_LEAF = 2339
-PALM_LEAF_2340 = 2340
-WRAPPED_OOMLIE = 2341
-WRAPPED_OOMLIE_NOTED = 2342
-COOKED_OOMLIE_WRAP = 2343
-COOKED_OOMLIE_WRAP_NOTED = 2344
-BURNT_OOMLIE_WRAP = 2345
-BURNT_OOMLIE_WRAP_NOTED = 2346
-HAMMER = 2347
-HAMMER_NOTED = 2348
-BRONZE_BAR = 2349
-BRONZE_BAR_NOTED = 2350
-IRON_BAR = 2351
-IRON_BAR_NOTED = 2352
-STEEL_BAR = 2353
-STEEL_BAR_NOTED = 2354
-SILVER_BAR = 2355
-SILVER_BAR_NOTED = 2356
-GOLD_BAR = 2357
-GOLD_BAR_NOTED = 2358
-MITHRIL_BAR = 2359
-MITHRIL_BAR_NOTED = 2360
-ADAMANTITE_BAR = 2361
-ADAMANTITE_BAR_NOTED = 2362
-RUNITE_BAR = 2363
-RUNITE_BAR_NOTED = 2364
-PERFECT_GOLD_BAR = 2365
-SHIELD_LEFT_HALF = 2366
-SHIELD_LEFT_HALF_NOTED = 2367
-SHIELD_RIGHT_HALF = 2368
-SHIELD_RIGHT_HALF_NOTED = 2369
-STEEL_STUDS = 2370
-STEEL_STUDS_NOTED = 2371
-OGRE_RELIC = 2372
-RELIC_PART_1 = 2373
-RELIC_PART_2 = 2374
-RELIC_PART_3 = 2375
-SKAVID_MAP = 2376
-OGRE_TOOTH = 2377
-TOBANS_KEY = 2378
-ROCK_CAKE = 2379
-CRYSTAL = 2380
-CRYSTAL_2381 = 2381
-CRYSTAL_2382 = 2382
-CRYSTAL_2383 = 2383
-FINGERNAILS = 2384
-OLD_ROBE = 2385
-UNUSUAL_ARMOUR = 2386
-DAMAGED_DAGGER = 2387
-TATTERED_EYE_PATCH = 2388
-VIAL_2389 = 2389
-VIAL_2390 = 2390
-GROUND_BAT_BONES = 2391
-GROUND_BAT_BONES_NOTED = 2392
-TOBANS_GOLD = 2393
-POTION_2394 = 2394
-MAGIC_OGRE_POTION = 2395
-SPELL_SCROLL = 2396
-SHAMAN_ROBE = 2397
-CAVE_NIGHTSHADE = 2398
-SILVERLIGHT_KEY = 2399
-SILVERLIGHT_KEY_2400 = 2400
-SILVERLIGHT_KEY_2401 = 2401
-SILVERLIGHT = 2402
-HAZEEL_SCROLL = 2403
-CHEST_KEY_2404 = 2404
-CARNILLEAN_ARMOUR = 2405
-HAZEELS_MARK = 2406
-BALL = 2407
-DIARY = 2408
-DOOR_KEY = 2409
-MAGNET = 2410
-KEY_2411 = 2411
-SARADOMIN_CAPE = 2412
-GUTHIX_CAPE = 2413
-ZAMORAK_CAPE = 2414
-SARADOMIN_STAFF = 2415
-GUTHIX_STAFF = 2416
-ZAMORAK_STAFF = 2417
-BRONZE_KEY = 2418
-WIG = 2419
-BUCHU_SEED_2420 = 2420
-WIG_2421 = 2421
-BLUE_PARTYHAT_2422 = 2422
-KEY_PRINT = 2423
-PASTE = 2424
-VORKATHS_HEAD = 2425
-BURNT_OOMLIE = 2426
-BURNT_OOMLIE_NOTED = 2427
-ATTACK_POTION4 = 2428
-ATTACK_POTION4_NOTED = 2429
-RESTORE_POTION4 = 2430
-RESTORE_POTION4_NOTED = 2431
-DEFENCE_POTION4 = 2432
-DEFENCE_POTION4_NOTED = 2433
-PRAYER_POTION4 = 2434
-PRAYER_POTION4_NOTED = 2435
-SUPER_ATTACK4 = 2436
-SUPER_ATTACK4_NOTED = 2437
-FISHING_POTION4 = 2438
-FISHING_POTION4_NOTED = 2439
-SUPER_STRENGTH4 = 2440
-SUPER_STRENGTH4_NOTED = 2441
-SUPER_DEFENCE4 = 2442
-SUPER_DEFENCE4_NOTED = 2443
-RANGING_POTION4 = 2444
-RANGING_POTION4_NOTED = 2445
-ANTIPOISON4 = 2446
-ANTIPOISON4_NOTED = 2447
-SUPERANTIPOISON4 = 2448
-SUPERANTIPOISON4_NOTED = 2449
-ZAMORAK_BREW4 = 2450
-ZAMORAK_BREW4_NOTED = 2451
-ANTIFIRE_POTION4 = 2452
-ANTIFIRE_POTION4_NOTED = 2453
-ANTIFIRE_POTION3 = 2454
-ANTIFIRE_POTION3_NOTED = 2455
-ANTIFIRE_POTION2 = 2456
-ANTIFIRE_POTION2_NOTED = 2457
-ANTIFIRE_POTION1 = 2458
-ANTIFIRE_POTION1_NOTED = 2459
-ASSORTED_FLOWERS = 2460
-ASSORTED_FLOWERS_NOTED = 2461
-RED_FLOWERS = 2462
-RED_FLOWERS_NOTED = 2463
-BLUE_FLOWERS = 2464
-BLUE_FLOWERS_NOTED = 2465
-YELLOW_FLOWERS = 2466
-YELLOW_FLOWERS_NOTED = 2467
-PURPLE_FLOWERS = 2468
-PURPLE_FLOWERS_NOTED = 2469
-ORANGE_FLOWERS = 2470
-ORANGE_FLOWERS_NOTED = 2471
-MIXED_FLOWERS = 2472
-MIXED_FLOWERS_NOTED = 2473
-WHITE_FLOWERS = 2474
-WHITE_FLOWERS_NOTED = 2475
-BLACK_FLOWERS = 2476
-BLACK_FLOWERS_NOTED = 2477
-FISH_FOOD_NOTED = 2478
-POISON_NOTED = 2479
-LANTADYME = 2481
-LANTADYME_NOTED = 2482
-LANTADYME_POTION_UNF = 2483
-LANTADYME_POTION_UNF_NOTED = 2484
-GRIMY_LANTADYME = 2485
-GRIMY_LANTADYME_NOTED = 2486
-BLUE_DHIDE_VAMBRACES = 2487
-BLUE_DHIDE_VAMBRACES_NOTED = 2488
-RED_DHIDE_VAMBRACES = 2489
-RED_DHIDE_VAMBRACES_NOTED = 2490
-BLACK_DHIDE_VAMBRACES = 2491
-BLACK_DHIDE_VAMBRACES_NOTED = 2492
-BLUE_DHIDE_CHAPS = 2493
-BLUE_DHIDE_CHAPS_NOTED = 2494
-RED_DHIDE_CHAPS = 2495
-RED_DHIDE_CHAPS_NOTED = 2496
-BLACK_DHIDE_CHAPS = 2497
-BLACK_DHIDE_CHAPS_NOTED = 2498
-BLUE_DHIDE_BODY = 2499
-BLUE_DHIDE_BODY_NOTED = 2500
-RED_DHIDE_BODY = 2501
-RED_DHIDE_BODY_NOTED = 2502
-BLACK_DHIDE_BODY = 2503
-BLACK_DHIDE_BODY_NOTED = 2504
-BLUE_DRAGON_LEATHER = 2505
-BLUE_DRAGON_LEATHER_NOTED = 2506
-RED_DRAGON_LEATHER = 2507
-RED_DRAGON_LEATHER_NOTED = 2508
-BLACK_DRAGON_LEATHER = 2509
-BLACK_DRAGON_LEATHER_NOTED = 2510
-LOGS_2511 = 2511
-BUCHU_SEED_2512 = 2512
-DRAGON_CHAINBODY = 2513
-RAW_SHRIMPS_2514 = 2514
-RAW_SHRIMPS_NOTED_2515 = 2515
-POT_OF_FLOUR_2516 = 2516
-POT_OF_FLOUR_NOTED_2517 = 2517
-ROTTEN_TOMATO = 2518
-ROTTEN_TOMATO_NOTED = 2519
-BROWN_TOY_HORSEY = 2520
-BROWN_TOY_HORSEY_NOTED = 2521
-WHITE_TOY_HORSEY = 2522
-WHITE_TOY_HORSEY_NOTED = 2523
-BLACK_TOY_HORSEY = 2524
-BLACK_TOY_HORSEY_NOTED = 2525
-GREY_TOY_HORSEY = 2526
-GREY_TOY_HORSEY_NOTED = 2527
-LAMP = 2528
-DEAD_ORB = 2529
-BONES_2530 = 2530
-BONES_NOTED_2531 = 2531
-IRON_FIRE_ARROW = 2532
-IRON_FIRE_ARROW_LIT = 2533
-STEEL_FIRE_ARROW = 2534
-STEEL_FIRE_ARROW_LIT = 2535
-MITHRIL_FIRE_ARROW = 2536
-MITHRIL_FIRE_ARROW_LIT = 2537
-ADAMANT_FIRE_ARROW = 2538
-ADAMANT_FIRE_ARROW_LIT = 2539
-RUNE_FIRE_ARROW = 2540
-RUNE_FIRE_ARROW_LIT = 2541
-BRONZE_FIRE_ARROW_2542 = 2542
-BRONZE_FIRE_ARROW_2543 = 2543
-BRONZE_FIRE_ARROW_2544 = 2544
-BRONZE_FIRE_ARROW_2545 = 2545
-BRONZE_FIRE_ARROW_LIT_2546 = 2546
-BRONZE_FIRE_ARROW_LIT_2547 = 2547
-BRONZE_FIRE_ARROW_LIT_2548 = 2548
-BRONZE_FIRE_ARROW_LIT_2549 = 2549
-RING_OF_RECOIL = 2550
-RING_OF_RECOIL_NOTED = 2551
-RING_OF_DUELING8 = 2552
-RING_OF_DUELING8_NOTED = 2553
-RING_OF_DUELING7 = 2554
-RING_OF_DUELING7_NOTED = 2555
-RING_OF_DUELING6 = 2556
-RING_OF_DUELING6_NOTED = 2557
-RING_OF_DUELING5 = 2558
-RING_OF_DUELING5_NOTED = 2559
-RING_OF_DUELING4 = 2560
-RING_OF_DUELING4_NOTED = 2561
-RING_OF_DUELING3 = 2562
-RING_OF_DUELING3_NOTED = 2563
-RING_OF_DUELING2 = 2564
-RING_OF_DUELING2_NOTED = 2565
-RING_OF_DUELING1 = 2566
-RING_OF_DUELING1_NOTED = 2567
-RING_OF_FORGING = 2568
-RING_OF_FORGING_NOTED = 2569
-RING_OF_LIFE = 2570
-RING_OF_LIFE_NOTED = 2571
-RING_OF_WEALTH = 2572
-RING_OF_WEALTH_NOTED = 2573
-SEXTANT = 2574
-WATCH = 2575
-CHART = 2576
-RANGER_BOOTS = 2577
-RANGER_BOOTS_NOTED = 2578
-WIZARD_BOOTS = 2579
-WIZARD_BOOTS_NOTED = 2580
-ROBIN_HOOD_HAT = 2581
-ROBIN_HOOD_HAT_NOTED = 2582
-BLACK_PLATEBODY_T = 2583
-BLACK_PLATEBODY_T_NOTED = 2584
-BLACK_PLATELEGS_T = 2585
-BLACK_PLATELEGS_T_NOTED = 2586
-BLACK_FULL_HELM_T = 2587
-BLACK_FULL_HELM_T_NOTED = 2588
-BLACK_KITESHIELD_T = 2589
-BLACK_KITESHIELD_T_NOTED = 2590
-BLACK_PLATEBODY_G = 2591
-BLACK_PLATEBODY_G_NOTED = 2592
-BLACK_PLATELEGS_G = 2593
-BLACK_PLATELEGS_G_NOTED = 2594
-BLACK_FULL_HELM_G = 2595
-BLACK_FULL_HELM_G_NOTED = 2596
-BLACK_KITESHIELD_G = 2597
-BLACK_KITESHIELD_G_NOTED = 2598
-ADAMANT_PLATEBODY_T = 2599
-ADAMANT_PLATEBODY_T_NOTED = 2600
-ADAMANT_PLATELEGS_T = 2601
-ADAMANT_PLATELEGS_T_NOTED = 2602
-ADAMANT_KITESHIELD_T = 2603
-ADAMANT_KITESHIELD_T_NOTED = 2604
-ADAMANT_FULL_HELM_T = 2605
-ADAMANT_FULL_HELM_T_NOTED = 2606
-ADAMANT_PLATEBODY_G = 2607
-ADAMANT_PLATEBODY_G_NOTED = 2608
-ADAMANT_PLATELEGS_G = 2609
-ADAMANT_PLATELEGS_G_NOTED = 2610
-ADAMANT_KITESHIELD_G = 2611
-ADAMANT_KITESHIELD_G_NOTED = 2612
-ADAMANT_FULL_HELM_G = 2613
-ADAMANT_FULL_HELM_G_NOTED = 2614
-RUNE_PLATEBODY_G = 2615
-RUNE_PLATEBODY_G_NOTED = 2616
-RUNE_PLATELEGS_G = 2617
-RUNE_PLATELEGS_G_NOTED = 2618
-RUNE_FULL_HELM_G = 2619
-RUNE_FULL_HELM_G_NOTED = 2620
-RUNE_KITESHIELD_G = 2621
-RUNE_KITESHIELD_G_NOTED = 2622
-RUNE_PLATEBODY_T = 2623
-RUNE_PLATEBODY_T_NOTED = 2624
-RUNE_PLATELEGS_T = 2625
-RUNE_PLATELEGS_T_NOTED = 2626
-RUNE_FULL_HELM_T = 2627
-RUNE_FULL_HELM_T_NOTED = 2628
-RUNE_KITESHIELD_T = 2629
-RUNE_KITESHIELD_T_NOTED = 2630
-HIGHWAYMAN_MASK = 2631
-HIGHWAYMAN_MASK_NOTED = 2632
-BLUE_BERET = 2633
-BLUE_BERET_NOTED = 2634
-BLACK_BERET = 2635
-BLACK_BERET_NOTED = 2636
-WHITE_BERET = 2637
-WHITE_BERET_NOTED = 2638
-TAN_CAVALIER = 2639
-TAN_CAVALIER_NOTED = 2640
-DARK_CAVALIER = 2641
-DARK_CAVALIER_NOTED = 2642
-BLACK_CAVALIER = 2643
-BLACK_CAVALIER_NOTED = 2644
-RED_HEADBAND = 2645
-RED_HEADBAND_NOTED = 2646
-BLACK_HEADBAND = 2647
-BLACK_HEADBAND_NOTED = 2648
-BROWN_HEADBAND = 2649
-BROWN_HEADBAND_NOTED = 2650
-PIRATES_HAT = 2651
-PIRATES_HAT_NOTED = 2652
-ZAMORAK_PLATEBODY = 2653
-ZAMORAK_PLATEBODY_NOTED = 2654
-ZAMORAK_PLATELEGS = 2655
-ZAMORAK_PLATELEGS_NOTED = 2656
-ZAMORAK_FULL_HELM = 2657
-ZAMORAK_FULL_HELM_NOTED = 2658
-ZAMORAK_KITESHIELD = 2659
-ZAMORAK_KITESHIELD_NOTED = 2660
-SARADOMIN_PLATEBODY = 2661
-SARADOMIN_PLATEBODY_NOTED = 2662
-SARADOMIN_PLATELEGS = 2663
-SARADOMIN_PLATELEGS_NOTED = 2664
-SARADOMIN_FULL_HELM = 2665
-SARADOMIN_FULL_HELM_NOTED = 2666
-SARADOMIN_KITESHIELD = 2667
-SARADOMIN_KITESHIELD_NOTED = 2668
-GUTHIX_PLATEBODY = 2669
-GUTHIX_PLATEBODY_NOTED = 2670
-GUTHIX_PLATELEGS = 2671
-GUTHIX_PLATELEGS_NOTED = 2672
-GUTHIX_FULL_HELM = 2673
-GUTHIX_FULL_HELM_NOTED = 2674
-GUTHIX_KITESHIELD = 2675
-GUTHIX_KITESHIELD_NOTED = 2676
-CLUE_SCROLL_EASY = 2677
-CLUE_SCROLL_EASY_2678 = 2678
-CLUE_SCROLL_EASY_2679 = 2679
-CLUE_SCROLL_EASY_2680 = 2680
-CLUE_SCROLL_EASY_2681 = 2681
-CLUE_SCROLL_EASY_2682 = 2682
-CLUE_SCROLL_EASY_2683 = 2683
-CLUE_SCROLL_EASY_2684 = 2684
-CLUE_SCROLL_EASY_2685 = 2685
-CLUE_SCROLL_EASY_2686 = 2686
-CLUE_SCROLL_EASY_2687 = 2687
-CLUE_SCROLL_EASY_2688 = 2688
-CLUE_SCROLL_EASY_2689 = 2689
-CLUE_SCROLL_EASY_2690 = 2690
-CLUE_SCROLL_EASY_2691 = 2691
-CLUE_SCROLL_EASY_2692 = 2692
-CLUE_SCROLL_EASY_2693 = 2693
-CLUE_SCROLL_EASY_2694 = 2694
-CLUE_SCROLL_EASY_2695 = 2695
-CLUE_SCROLL_EASY_2696 = 2696
-CLUE_SCROLL_EASY_2697 = 2697
-CLUE_SCROLL_EASY_2698 = 2698
-CLUE_SCROLL_EASY_2699 = 2699
-CLUE_SCROLL_EASY_2700 = 2700
-CLUE_SCROLL_EASY_2701 = 2701
-CLUE_SCROLL_EASY_2702 = 2702
-CLUE_SCROLL_EASY_2703 = 2703
-CLUE_SCROLL_EASY_2704 = 2704
-CLUE_SCROLL_EASY_2705 = 2705
-CLUE_SCROLL_EASY_2706 = 2706
-CLUE_SCROLL_EASY_2707 = 2707
-CLUE_SCROLL_EASY_2708 = 2708
-CLUE_SCROLL_EASY_2709 = 2709
-CLUE_SCROLL_EASY_2710 = 2710
-CLUE_SCROLL_EASY_2711 = 2711
-CLUE_SCROLL_EASY_2712 = 2712
-CLUE_SCROLL_EASY_2713 = 2713
-CASKET_EASY = 2714
-CASKET_EASY_2715 = 2715
-CLUE_SCROLL_EASY_2716 = 2716
-CASKET_EASY_2717 = 2717
-CASKET_EASY_2718 = 2718
-CLUE_SCROLL_EASY_2719 = 2719
-CASKET_EASY_2720 = 2720
-CASKET_EASY_2721 = 2721
-CLUE_SCROLL_HARD = 2722
-CLUE_SCROLL_HARD_2723 = 2723
-CASKET_HARD = 2724
-CLUE_SCROLL_HARD_2725 = 2725
-CASKET_HARD_2726 = 2726
-CLUE_SCROLL_HARD_2727 = 2727
-CASKET_HARD_2728 = 2728
-CLUE_SCROLL_HARD_2729 = 2729
-CASKET_HARD_2730 = 2730
-CLUE_SCROLL_HARD_2731 = 2731
-CASKET_HARD_2732 = 2732
-CLUE_SCROLL_HARD_2733 = 2733
-CASKET_HARD_2734 = 2734
-CLUE_SCROLL_HARD_2735 = 2735
-CASKET_HARD_2736 = 2736
-CLUE_SCROLL_HARD_2737 = 2737
-CASKET_HARD_2738 = 2738
-CLUE_SCROLL_HARD_2739 = 2739
-CASKET_HARD_2740 = 2740
-CLUE_SCROLL_HARD_2741 = 2741
-CASKET_HARD_2742 = 2742
-CLUE_SCROLL_HARD_2743 = 2743
-CASKET_HARD_2744 = 2744
-CLUE_SCROLL_HARD_2745 = 2745
-CASKET_HARD_2746 = 2746
-CLUE_SCROLL_HARD_2747 = 2747
-CASKET_HARD_2748 = 2748
-CLUE_SCROLL_HARD_2773 = 2773
-CLUE_SCROLL_HARD_2774 = 2774
-CASKET_HARD_2775 = 2775
-CLUE_SCROLL_HARD_2776 = 2776
-CASKET_HARD_2777 = 2777
-CLUE_SCROLL_HARD_2778 = 2778
-CASKET_HARD_2779 = 2779
-CLUE_SCROLL_HARD_2780 = 2780
-CASKET_HARD_2781 = 2781
-CLUE_SCROLL_HARD_2782 = 2782
-CLUE_SCROLL_HARD_2783 = 2783
-CASKET_HARD_2784 = 2784
-CLUE_SCROLL_HARD_2785 = 2785
-CLUE_SCROLL_HARD_2786 = 2786
-CASKET_HARD_2787 = 2787
-CLUE_SCROLL_HARD_2788 = 2788
-CASKET_HARD_2789 = 2789
-CLUE_SCROLL_HARD_2790 = 2790
-CASKET_HARD_2791 = 2791
-CLUE_SCROLL_HARD_2792 = 2792
-CLUE_SCROLL_HARD_2793 = 2793
-CLUE_SCROLL_HARD_2794 = 2794
-PUZZLE_BOX_HARD = 2795
-CLUE_SCROLL_HARD_2796 = 2796
-CLUE_SCROLL_HARD_2797 = 2797
-PUZZLE_BOX_HARD_2798 = 2798
-CLUE_SCROLL_HARD_2799 = 2799
-PUZZLE_BOX_HARD_2800 = 2800
-CLUE_SCROLL_MEDIUM = 2801
-CASKET_MEDIUM = 2802
-CLUE_SCROLL_MEDIUM_2803 = 2803
-CASKET_MEDIUM_2804 = 2804
-CLUE_SCROLL_MEDIUM_2805 = 2805
-CASKET_MEDIUM_2806 = 2806
-CLUE_SCROLL_MEDIUM_2807 = 2807
-CASKET_MEDIUM_2808 = 2808
-CLUE_SCROLL_MEDIUM_2809 = 2809
-CASKET_MEDIUM_2810 = 2810
-CLUE_SCROLL_MEDIUM_2811 = 2811
-CASKET_MEDIUM_2812 = 2812
-CLUE_SCROLL_MEDIUM_2813 = 2813
-CASKET_MEDIUM_2814 = 2814
-CLUE_SCROLL_MEDIUM_2815 = 2815
-CASKET_MEDIUM_2816 = 2816
-CLUE_SCROLL_MEDIUM_2817 = 2817
-CASKET_MEDIUM_2818 = 2818
-CLUE_SCROLL_MEDIUM_2819 = 2819
-CASKET_MEDIUM_2820 = 2820
-CLUE_SCROLL_MEDIUM_2821 = 2821
-CASKET_MEDIUM_2822 = 2822
-CLUE_SCROLL_MEDIUM_2823 = 2823
-CASKET_MEDIUM_2824 = 2824
-CLUE_SCROLL_MEDIUM_2825 = 2825
-CASKET_MEDIUM_2826 = 2826
-CLUE_SCROLL_MEDIUM_2827 = 2827
-CASKET_MEDIUM_2828 = 2828
-CLUE_SCROLL_MEDIUM_2829 = 2829
-CASKET_MEDIUM_2830 = 2830
-CLUE_SCROLL_MEDIUM_2831 = 2831
-KEY_MEDIUM = 2832
-CLUE_SCROLL_MEDIUM_2833 = 2833
-KEY_MEDIUM_2834 = 2834
-CLUE_SCROLL_MEDIUM_2835 = 2835
-KEY_MEDIUM_2836 = 2836
-CLUE_SCROLL_MEDIUM_2837 = 2837
-KEY_MEDIUM_2838 = 2838
-CLUE_SCROLL_MEDIUM_2839 = 2839
-KEY_MEDIUM_2840 = 2840
-CLUE_SCROLL_MEDIUM_2841 = 2841
-CHALLENGE_SCROLL_MEDIUM = 2842
-CLUE_SCROLL_MEDIUM_2843 = 2843
-CHALLENGE_SCROLL_MEDIUM_2844 = 2844
-CLUE_SCROLL_MEDIUM_2845 = 2845
-CHALLENGE_SCROLL_MEDIUM_2846 = 2846
-CLUE_SCROLL_MEDIUM_2847 = 2847
-CLUE_SCROLL_MEDIUM_2848 = 2848
-CLUE_SCROLL_MEDIUM_2849 = 2849
-CHALLENGE_SCROLL_MEDIUM_2850 = 2850
-CLUE_SCROLL_MEDIUM_2851 = 2851
-CHALLENGE_SCROLL_MEDIUM_2852 = 2852
-CLUE_SCROLL_MEDIUM_2853 = 2853
-CHALLENGE_SCROLL_MEDIUM_2854 = 2854
-CLUE_SCROLL_MEDIUM_2855 = 2855
-CLUE_SCROLL_MEDIUM_2856 = 2856
-CLUE_SCROLL_MEDIUM_2857 = 2857
-CLUE_SCROLL_MEDIUM_2858 = 2858
-WOLF_BONES = 2859
-WOLF_BONES_NOTED = 2860
-WOLFBONE_ARROWTIPS = 2861
-ACHEY_TREE_LOGS = 2862
-ACHEY_TREE_LOGS_NOTED = 2863
-OGRE_ARROW_SHAFT = 2864
-FLIGHTED_OGRE_ARROW = 2865
-OGRE_ARROW = 2866
-OGRE_ARROW_2867 = 2867
-OGRE_ARROW_2868 = 2868
-OGRE_ARROW_2869 = 2869
-OGRE_ARROW_2870 = 2870
-OGRE_BELLOWS = 2871
-OGRE_BELLOWS_3 = 2872
-OGRE_BELLOWS_2 = 2873
-OGRE_BELLOWS_1 = 2874
-BLOATED_TOAD = 2875
-RAW_CHOMPY = 2876
-RAW_CHOMPY_NOTED = 2877
-COOKED_CHOMPY = 2878
-COOKED_CHOMPY_NOTED = 2879
-RUINED_CHOMPY = 2880
-RUINED_CHOMPY_NOTED = 2881
-SEASONED_CHOMPY = 2882
-OGRE_BOW = 2883
-NULL_2885 = 2885
-BATTERED_BOOK = 2886
-BATTERED_KEY = 2887
-A_STONE_BOWL = 2888
-A_STONE_BOWL_2889 = 2889
-ELEMENTAL_SHIELD = 2890
-ELEMENTAL_SHIELD_NOTED = 2891
-ELEMENTAL_ORE = 2892
-ELEMENTAL_METAL = 2893
-GREY_BOOTS = 2894
-GREY_BOOTS_NOTED = 2895
-GREY_ROBE_TOP = 2896
-GREY_ROBE_TOP_NOTED = 2897
-GREY_ROBE_BOTTOMS = 2898
-GREY_ROBE_BOTTOMS_NOTED = 2899
-GREY_HAT = 2900
-GREY_HAT_NOTED = 2901
-GREY_GLOVES = 2902
-GREY_GLOVES_NOTED = 2903
-RED_BOOTS = 2904
-RED_BOOTS_NOTED = 2905
-RED_ROBE_TOP = 2906
-RED_ROBE_TOP_NOTED = 2907
-RED_ROBE_BOTTOMS = 2908
-RED_ROBE_BOTTOMS_NOTED = 2909
-RED_HAT = 2910
-RED_HAT_NOTED = 2911
-RED_GLOVES = 2912
-RED_GLOVES_NOTED = 2913
-YELLOW_BOOTS = 2914
-YELLOW_BOOTS_NOTED = 2915
-YELLOW_ROBE_TOP = 2916
-YELLOW_ROBE_TOP_NOTED = 2917
-YELLOW_ROBE_BOTTOMS = 2918
-YELLOW_ROBE_BOTTOMS_NOTED = 2919
-YELLOW_HAT = 2920
-YELLOW_HAT_NOTED = 2921
-YELLOW_GLOVES = 2922
-YELLOW_GLOVES_NOTED = 2923
-TEAL_BOOTS = 2924
-TEAL_BOOTS_NOTED = 2925
-TEAL_ROBE_TOP = 2926
-TEAL_ROBE_TOP_NOTED = 2927
-TEAL_ROBE_BOTTOMS = 2928
-TEAL_ROBE_BOTTOMS_NOTED = 2929
-TEAL_HAT = 2930
-TEAL_HAT_NOTED = 2931
-TEAL_GLOVES = 2932
-TEAL_GLOVES_NOTED = 2933
-PURPLE_BOOTS = 2934
-PURPLE_BOOTS_NOTED = 2935
-PURPLE_ROBE_TOP = 2936
-PURPLE_ROBE_TOP_NOTED = 2937
-PURPLE_ROBE_BOTTOMS = 2938
-PURPLE_ROBE_BOTTOMS_NOTED = 2939
-PURPLE_HAT = 2940
-PURPLE_HAT_NOTED = 2941
-PURPLE_GLOVES = 2942
-PURPLE_GLOVES_NOTED = 2943
-GOLDEN_KEY = 2944
-IRON_KEY = 2945
-GOLDEN_TINDERBOX = 2946
-GOLDEN_CANDLE = 2947
-GOLDEN_POT = 2948
-GOLDEN_HAMMER = 2949
-GOLDEN_FEATHER = 2950
-GOLDEN_NEEDLE = 2951
-WOLFBANE = 2952
-MURKY_WATER = 2953
-BLESSED_WATER = 2954
-MOONLIGHT_MEAD = 2955
-MOONLIGHT_MEAD_NOTED = 2956
-DRUID_POUCH = 2957
-DRUID_POUCH_2958 = 2958
-ROTTEN_FOOD = 2959
-ROTTEN_FOOD_NOTED = 2960
-SILVER_SICKLE = 2961
-SILVER_SICKLE_NOTED = 2962
-SILVER_SICKLE_B = 2963
-WASHING_BOWL = 2964
-WASHING_BOWL_NOTED = 2965
-MIRROR = 2966
-JOURNAL = 2967
-DRUIDIC_SPELL = 2968
-A_USED_SPELL = 2969
-MORT_MYRE_FUNGUS = 2970
-MORT_MYRE_FUNGUS_NOTED = 2971
-MORT_MYRE_STEM = 2972
-MORT_MYRE_STEM_NOTED = 2973
-MORT_MYRE_PEAR = 2974
-MORT_MYRE_PEAR_NOTED = 2975
-SICKLE_MOULD = 2976
-SICKLE_MOULD_NOTED = 2977
-CHOMPY_BIRD_HAT = 2978
-CHOMPY_BIRD_HAT_2979 = 2979
-CHOMPY_BIRD_HAT_2980 = 2980
-CHOMPY_BIRD_HAT_2981 = 2981
-CHOMPY_BIRD_HAT_2982 = 2982
-CHOMPY_BIRD_HAT_2983 = 2983
-CHOMPY_BIRD_HAT_2984 = 2984
-CHOMPY_BIRD_HAT_2985 = 2985
-CHOMPY_BIRD_HAT_2986 = 2986
-CHOMPY_BIRD_HAT_2987 = 2987
-CHOMPY_BIRD_HAT_2988 = 2988
-CHOMPY_BIRD_HAT_2989 = 2989
-CHOMPY_BIRD_HAT_2990 = 2990
-CHOMPY_BIRD_HAT_2991 = 2991
-CHOMPY_BIRD_HAT_2992 = 2992
-CHOMPY_BIRD_HAT_2993 = 2993
-CHOMPY_BIRD_HAT_2994 = 2994
-CHOMPY_BIRD_HAT_2995 = 2995
-AGILITY_ARENA_TICKET = 2996
-PIRATES_HOOK = 2997
-TOADFLAX = 2998
-TOADFLAX_NOTED = 2999
-SNAPDRAGON = 3000
-SNAPDRAGON_NOTED = 3001
-TOADFLAX_POTION_UNF = 3002
-TOADFLAX_POTION_UNF_NOTED = 3003
-SNAPDRAGON_POTION_UNF = 3004
-SNAPDRAGON_POTION_UNF_NOTED = 3005
-FIREWORK = 3006
-FIREWORK_NOTED = 3007
-ENERGY_POTION4 = 3008
-ENERGY_POTION4_NOTED = 3009
-ENERGY_POTION3 = 3010
-ENERGY_POTION3_NOTED = 3011
-ENERGY_POTION2 = 3012
-ENERGY_POTION2_NOTED = 3013
-ENERGY_POTION1 = 3014
-ENERGY_POTION1_NOTED = 3015
-SUPER_ENERGY4 = 3016
-SUPER_ENERGY4_NOTED = 3017
-SUPER_ENERGY3 = 3018
-SUPER_ENERGY3_NOTED = 3019
-SUPER_ENERGY2 = 3020
-SUPER_ENERGY2_NOTED = 3021
-SUPER_ENERGY1 = 3022
-SUPER_ENERGY1_NOTED = 3023
-SUPER_RESTORE4 = 3024
-SUPER_RESTORE4_NOTED = 3025
-SUPER_RESTORE3 = 3026
-SUPER_RESTORE3_NOTED = 3027
-SUPER_RESTORE2 = 3028
-SUPER_RESTORE2_NOTED = 3029
-SUPER_RESTORE1 = 3030
-SUPER_RESTORE1_NOTED = 3031
-AGILITY_POTION4 = 3032
-AGILITY_POTION4_NOTED = 3033
-AGILITY_POTION3 = 3034
-AGILITY_POTION3_NOTED = 3035
-AGILITY_POTION2 = 3036
-AGILITY_POTION2_NOTED = 3037
-AGILITY_POTION1 = 3038
-AGILITY_POTION1_NOTED = 3039
-MAGIC_POTION4 = 3040
-MAGIC_POTION4_NOTED = 3041
-MAGIC_POTION3 = 3042
-MAGIC_POTION3_NOTED = 3043
-MAGIC_POTION2 = 3044
-MAGIC_POTION2_NOTED = 3045
-MAGIC_POTION1 = 3046
-MAGIC_POTION1_NOTED = 3047
-PIRATES_HOOK_NOTED = 3048
-GRIMY_TOADFLAX = 3049
-GRIMY_TOADFLAX_NOTED = 3050
-GRIMY_SNAPDRAGON = 3051
-GRIMY_SNAPDRAGON_NOTED = 3052
-LAVA_BATTLESTAFF = 3053
-MYSTIC_LAVA_STAFF = 3054
-LAVA_BATTLESTAFF_NOTED = 3055
-MYSTIC_LAVA_STAFF_NOTED = 3056
-MIME_MASK = 3057
-MIME_TOP = 3058
-MIME_LEGS = 3059
-MIME_GLOVES = 3060
-MIME_BOOTS = 3061
-STRANGE_BOX = 3062
-BRONZE_JAVELIN_HEADS = 3066
-BRONZE_JAVELIN_HEADS_3068 = 3068
-BRONZE_JAVELIN_HEADS_3070 = 3070
-BRONZE_JAVELIN_HEADS_3072 = 3072
-IRON_JAVELIN_HEADS = 3074
-IRON_JAVELIN_HEADS_3076 = 3076
-IRON_JAVELIN_HEADS_3078 = 3078
-IRON_JAVELIN_HEADS_3082 = 3082
-STEEL_JAVELIN_HEADS = 3084
-STEEL_JAVELIN_HEADS_3086 = 3086
-STEEL_JAVELIN_HEADS_3088 = 3088
-STEEL_JAVELIN_HEADS_3090 = 3090
-MITHRIL_JAVELIN_HEADS = 3092
-BLACK_DART = 3093
-BLACK_DARTP = 3094
-BRONZE_CLAWS = 3095
-IRON_CLAWS = 3096
-STEEL_CLAWS = 3097
-BLACK_CLAWS = 3098
-MITHRIL_CLAWS = 3099
-ADAMANT_CLAWS = 3100
-RUNE_CLAWS = 3101
-COMBINATION = 3102
-IOU = 3103
-SECRET_WAY_MAP = 3104
-CLIMBING_BOOTS = 3105
-CLIMBING_BOOTS_NOTED = 3106
-SPIKED_BOOTS = 3107
-SPIKED_BOOTS_NOTED = 3108
-STONE_BALL = 3109
-STONE_BALL_3110 = 3110
-STONE_BALL_3111 = 3111
-STONE_BALL_3112 = 3112
-STONE_BALL_3113 = 3113
-CERTIFICATE_3114 = 3114
-BRONZE_CLAWS_NOTED = 3115
-IRON_CLAWS_NOTED = 3116
-STEEL_CLAWS_NOTED = 3117
-BLACK_CLAWS_NOTED = 3118
-MITHRIL_CLAWS_NOTED = 3119
-ADAMANT_CLAWS_NOTED = 3120
-RUNE_CLAWS_NOTED = 3121
-GRANITE_SHIELD = 3122
-SHAIKAHAN_BONES = 3123
-SHAIKAHAN_BONES_NOTED = 3124
-JOGRE_BONES = 3125
-JOGRE_BONES_NOTED = 3126
-BURNT_JOGRE_BONES = 3127
-PASTY_JOGRE_BONES = 3128
-PASTY_JOGRE_BONES_3129 = 3129
-MARINATED_J_BONES = 3130
-PASTY_JOGRE_BONES_3131 = 3131
-PASTY_JOGRE_BONES_3132 = 3132
-MARINATED_J_BONES_3133 = 3133
-GRANITE_SHIELD_NOTED = 3134
-PRISON_KEY = 3135
-CELL_KEY_1 = 3136
-CELL_KEY_2 = 3137
-POTATO_CACTUS = 3138
-POTATO_CACTUS_NOTED = 3139
-DRAGON_CHAINBODY_3140 = 3140
-DRAGON_CHAINBODY_NOTED = 3141
-RAW_KARAMBWAN = 3142
-RAW_KARAMBWAN_NOTED = 3143
-COOKED_KARAMBWAN = 3144
-COOKED_KARAMBWAN_NOTED = 3145
-POISON_KARAMBWAN = 3146
-COOKED_KARAMBWAN_3147 = 3147
-BURNT_KARAMBWAN = 3148
-BURNT_KARAMBWAN_NOTED = 3149
-RAW_KARAMBWANJI = 3150
-NULL_3151 = 3151
-KARAMBWAN_PASTE = 3152
-KARAMBWAN_PASTE_3153 = 3153
-KARAMBWAN_PASTE_3154 = 3154
-KARAMBWANJI_PASTE = 3155
-KARAMBWANJI_PASTE_3156 = 3156
-KARAMBWAN_VESSEL = 3157
-KARAMBWAN_VESSEL_NOTED = 3158
-KARAMBWAN_VESSEL_3159 = 3159
-KARAMBWAN_VESSEL_NOTED_3160 = 3160
-CRAFTING_MANUAL = 3161
-SLICED_BANANA = 3162
-SLICED_BANANA_NOTED = 3163
-KARAMJAN_RUM_3164 = 3164
-KARAMJAN_RUM_3165 = 3165
-MONKEY_CORPSE = 3166
-MONKEY_SKIN = 3167
-SEAWEED_SANDWICH = 3168
-STUFFED_MONKEY = 3169
-BRONZE_SPEARKP = 3170
-IRON_SPEARKP = 3171
-STEEL_SPEARKP = 3172
-MITHRIL_SPEARKP = 3173
-ADAMANT_SPEARKP = 3174
-RUNE_SPEARKP = 3175
-DRAGON_SPEARKP = 3176
-LEFTHANDED_BANANA = 3177
-LEFTHANDED_BANANA_NOTED = 3178
-SMALL_NINJA_MONKEY_BONES = 3179
-MEDIUM_NINJA_MONKEY_BONES = 3180
-GORILLA_BONES = 3181
-BEARDED_GORILLA_BONES = 3182
-MONKEY_BONES = 3183
-MONKEY_BONES_NOTED = 3184
-SMALL_ZOMBIE_MONKEY_BONES = 3185
-LARGE_ZOMBIE_MONKEY_BONES = 3186
-BONES_3187 = 3187
-CLEANING_CLOTH = 3188
-CLEANING_CLOTH_NOTED = 3189
-BRONZE_HALBERD = 3190
-BRONZE_HALBERD_NOTED = 3191
-IRON_HALBERD = 3192
-IRON_HALBERD_NOTED = 3193
-STEEL_HALBERD = 3194
-STEEL_HALBERD_NOTED = 3195
-BLACK_HALBERD = 3196
-BLACK_HALBERD_NOTED = 3197
-MITHRIL_HALBERD = 3198
-MITHRIL_HALBERD_NOTED = 3199
-ADAMANT_HALBERD = 3200
-ADAMANT_HALBERD_NOTED = 3201
-RUNE_HALBERD = 3202
-RUNE_HALBERD_NOTED = 3203
-DRAGON_HALBERD = 3204
-DRAGON_HALBERD_NOTED = 3205
-KINGS_MESSAGE = 3206
-IORWERTHS_MESSAGE = 3207
-CRYSTAL_PENDANT = 3208
-SULPHUR = 3209
-SULPHUR_NOTED = 3210
-LIMESTONE = 3211
-LIMESTONE_NOTED = 3212
-QUICKLIME = 3213
-POT_OF_QUICKLIME = 3214
-GROUND_SULPHUR = 3215
-BARREL_3216 = 3216
-BARREL_NOTED = 3217
-BARREL_BOMB = 3218
-BARREL_BOMB_3219 = 3219
-BARREL_OF_COAL_TAR = 3220
-BARREL_OF_NAPHTHA = 3221
-NAPHTHA_MIX = 3222
-NAPHTHA_MIX_3223 = 3223
-STRIP_OF_CLOTH = 3224
-STRIP_OF_CLOTH_NOTED = 3225
-RAW_RABBIT = 3226
-RAW_RABBIT_NOTED = 3227
-COOKED_RABBIT = 3228
-COOKED_RABBIT_NOTED = 3229
-BIG_BOOK_OF_BANGS = 3230
-SYMBOL = 3231
-SYMBOL_NOTED = 3232
-SYMBOL_3233 = 3233
-SYMBOL_NOTED_3234 = 3234
-SYMBOL_3235 = 3235
-SYMBOL_NOTED_3236 = 3236
-SYMBOL_3237 = 3237
-SYMBOL_NOTED_3238 = 3238
-BARK = 3239
-BARK_NOTED = 3240
-MAN = 3241
-MITHRIL_JAVELIN_HEADS_3242 = 3242
-FARMER = 3243
-MITHRIL_JAVELIN_HEADS_3244 = 3244
-WARRIOR_WOMAN = 3245
-MITHRIL_JAVELIN_HEADS_3246 = 3246
-ROGUE = 3247
-ADAMANT_JAVELIN_HEADS = 3248
-GUARD = 3249
-LAVA_SCALE_SHARD = 3250
-KNIGHT_OF_ARDOUGNE = 3251
-LAVA_SCALE_SHARD_3252 = 3252
-WATCHMAN = 3253
-LAVA_SCALE_SHARD_3254 = 3254
-PALADIN = 3255
-LAVA_SCALE_SHARD_3256 = 3256
-GNOME = 3257
-HERO = 3259
-GOUTWEED = 3261
-TROLL_THISTLE = 3262
-DRIED_THISTLE = 3263
-GROUND_THISTLE = 3264
-TROLL_POTION = 3265
-DRUNK_PARROT = 3266
-DIRTY_ROBE = 3267
-FAKE_MAN = 3268
-STOREROOM_KEY = 3269
-ALCOCHUNKS = 3270
-COMPOST_BIN = 3271
-CAVE_KRAKEN = 3272
-VAMPYRE_DUST = 3325
-VAMPYRE_DUST_NOTED = 3326
-MYRE_SNELM = 3327
-MYRE_SNELM_NOTED = 3328
-BLOODNTAR_SNELM = 3329
-BLOODNTAR_SNELM_NOTED = 3330
-OCHRE_SNELM = 3331
-OCHRE_SNELM_NOTED = 3332
-BRUISE_BLUE_SNELM = 3333
-BRUISE_BLUE_SNELM_NOTED = 3334
-BROKEN_BARK_SNELM = 3335
-BROKEN_BARK_SNELM_NOTED = 3336
-MYRE_SNELM_3337 = 3337
-MYRE_SNELM_NOTED_3338 = 3338
-BLOODNTAR_SNELM_3339 = 3339
-BLOODNTAR_SNELM_NOTED_3340 = 3340
-OCHRE_SNELM_3341 = 3341
-OCHRE_SNELM_NOTED_3342 = 3342
-BRUISE_BLUE_SNELM_3343 = 3343
-BRUISE_BLUE_SNELM_NOTED_3344 = 3344
-BLAMISH_MYRE_SHELL = 3345
-BLAMISH_MYRE_SHELL_NOTED = 3346
-BLAMISH_RED_SHELL = 3347
-BLAMISH_RED_SHELL_NOTED = 3348
-BLAMISH_OCHRE_SHELL = 3349
-BLAMISH_OCHRE_SHELL_NOTED = 3350
-BLAMISH_BLUE_SHELL = 3351
-BLAMISH_BLUE_SHELL_NOTED = 3352
-BLAMISH_BARK_SHELL = 3353
-BLAMISH_BARK_SHELL_NOTED = 3354
-BLAMISH_MYRE_SHELL_3355 = 3355
-BLAMISH_MYRE_SHELL_NOTED_3356 = 3356
-BLAMISH_RED_SHELL_3357 = 3357
-BLAMISH_RED_SHELL_NOTED_3358 = 3358
-BLAMISH_OCHRE_SHELL_3359 = 3359
-BLAMISH_OCHRE_SHELL_NOTED_3360 = 3360
-BLAMISH_BLUE_SHELL_3361 = 3361
-BLAMISH_BLUE_SHELL_NOTED_3362 = 3362
-THIN_SNAIL = 3363
-THIN_SNAIL_NOTED = 3364
-LEAN_SNAIL = 3365
-LEAN_SNAIL_NOTED = 3366
-FAT_SNAIL = 3367
-FAT_SNAIL_NOTED = 3368
-THIN_SNAIL_MEAT = 3369
-THIN_SNAIL_MEAT_NOTED = 3370
-LEAN_SNAIL_MEAT = 3371
-LEAN_SNAIL_MEAT_NOTED = 3372
-FAT_SNAIL_MEAT = 3373
-FAT_SNAIL_MEAT_NOTED = 3374
-BURNT_SNAIL = 3375
-BURNT_SNAIL_NOTED = 3376
-SAMPLE_BOTTLE = 3377
-SAMPLE_BOTTLE_NOTED = 3378
-RAW_SLIMY_EEL = 3379
-RAW_SLIMY_EEL_NOTED = 3380
-COOKED_SLIMY_EEL = 3381
-COOKED_SLIMY_EEL_NOTED = 3382
-BURNT_EEL = 3383
-BURNT_EEL_NOTED = 3384
-SPLITBARK_HELM = 3385
-SPLITBARK_HELM_NOTED = 3386
-SPLITBARK_BODY = 3387
-SPLITBARK_BODY_NOTED = 3388
-SPLITBARK_LEGS = 3389
-SPLITBARK_LEGS_NOTED = 3390
-SPLITBARK_GAUNTLETS = 3391
-SPLITBARK_GAUNTLETS_NOTED = 3392
-SPLITBARK_BOOTS = 3393
-SPLITBARK_BOOTS_NOTED = 3394
-DIARY_3395 = 3395
-LOAR_REMAINS = 3396
-LOAR_REMAINS_NOTED = 3397
-PHRIN_REMAINS = 3398
-PHRIN_REMAINS_NOTED = 3399
-RIYL_REMAINS = 3400
-RIYL_REMAINS_NOTED = 3401
-ASYN_REMAINS = 3402
-ASYN_REMAINS_NOTED = 3403
-FIYR_REMAINS = 3404
-FIYR_REMAINS_NOTED = 3405
-UNFINISHED_POTION = 3406
-UNFINISHED_POTION_NOTED = 3407
-SERUM_207_4 = 3408
-SERUM_207_4_NOTED = 3409
-SERUM_207_3 = 3410
-SERUM_207_3_NOTED = 3411
-SERUM_207_2 = 3412
-SERUM_207_2_NOTED = 3413
-SERUM_207_1 = 3414
-SERUM_207_1_NOTED = 3415
-SERUM_208_4 = 3416
-SERUM_208_3 = 3417
-SERUM_208_2 = 3418
-SERUM_208_1 = 3419
-LIMESTONE_BRICK = 3420
-LIMESTONE_BRICK_NOTED = 3421
-OLIVE_OIL4 = 3422
-OLIVE_OIL4_NOTED = 3423
-OLIVE_OIL3 = 3424
-OLIVE_OIL3_NOTED = 3425
-OLIVE_OIL2 = 3426
-OLIVE_OIL2_NOTED = 3427
-OLIVE_OIL1 = 3428
-OLIVE_OIL1_NOTED = 3429
-SACRED_OIL4 = 3430
-SACRED_OIL4_NOTED = 3431
-SACRED_OIL3 = 3432
-SACRED_OIL3_NOTED = 3433
-SACRED_OIL2 = 3434
-SACRED_OIL2_NOTED = 3435
-SACRED_OIL1 = 3436
-SACRED_OIL1_NOTED = 3437
-PYRE_LOGS = 3438
-PYRE_LOGS_NOTED = 3439
-OAK_PYRE_LOGS = 3440
-OAK_PYRE_LOGS_NOTED = 3441
-WILLOW_PYRE_LOGS = 3442
-WILLOW_PYRE_LOGS_NOTED = 3443
-MAPLE_PYRE_LOGS = 3444
-MAPLE_PYRE_LOGS_NOTED = 3445
-YEW_PYRE_LOGS = 3446
-YEW_PYRE_LOGS_NOTED = 3447
-MAGIC_PYRE_LOGS = 3448
-MAGIC_PYRE_LOGS_NOTED = 3449
-BRONZE_KEY_RED = 3450
-BRONZE_KEY_BROWN = 3451
-BRONZE_KEY_CRIMSON = 3452
-BRONZE_KEY_BLACK = 3453
-BRONZE_KEY_PURPLE = 3454
-STEEL_KEY_RED = 3455
-STEEL_KEY_BROWN = 3456
-STEEL_KEY_CRIMSON = 3457
-STEEL_KEY_BLACK = 3458
-STEEL_KEY_PURPLE = 3459
-BLACK_KEY_RED = 3460
-BLACK_KEY_BROWN = 3461
-BLACK_KEY_CRIMSON = 3462
-BLACK_KEY_BLACK = 3463
-BLACK_KEY_PURPLE = 3464
-SILVER_KEY_RED = 3465
-SILVER_KEY_BROWN = 3466
-SILVER_KEY_CRIMSON = 3467
-SILVER_KEY_BLACK = 3468
-SILVER_KEY_PURPLE = 3469
-FINE_CLOTH = 3470
-FINE_CLOTH_NOTED = 3471
-BLACK_PLATESKIRT_T = 3472
-BLACK_PLATESKIRT_G = 3473
-ADAMANT_PLATESKIRT_T = 3474
-ADAMANT_PLATESKIRT_G = 3475
-RUNE_PLATESKIRT_G = 3476
-RUNE_PLATESKIRT_T = 3477
-ZAMORAK_PLATESKIRT = 3478
-SARADOMIN_PLATESKIRT = 3479
-GUTHIX_PLATESKIRT = 3480
-GILDED_PLATEBODY = 3481
-GILDED_PLATEBODY_NOTED = 3482
-GILDED_PLATELEGS = 3483
-GILDED_PLATELEGS_NOTED = 3484
-GILDED_PLATESKIRT = 3485
-GILDED_FULL_HELM = 3486
-GILDED_FULL_HELM_NOTED = 3487
-GILDED_KITESHIELD = 3488
-GILDED_KITESHIELD_NOTED = 3489
-CLUE_SCROLL_EASY_3490 = 3490
-CLUE_SCROLL_EASY_3491 = 3491
-CLUE_SCROLL_EASY_3492 = 3492
-CLUE_SCROLL_EASY_3493 = 3493
-CLUE_SCROLL_EASY_3494 = 3494
-CLUE_SCROLL_EASY_3495 = 3495
-CLUE_SCROLL_EASY_3496 = 3496
-CLUE_SCROLL_EASY_3497 = 3497
-CLUE_SCROLL_EASY_3498 = 3498
-CLUE_SCROLL_EASY_3499 = 3499
-CLUE_SCROLL_EASY_3500 = 3500
-CLUE_SCROLL_EASY_3501 = 3501
-CLUE_SCROLL_EASY_3502 = 3502
-CLUE_SCROLL_EASY_3503 = 3503
-CLUE_SCROLL_EASY_3504 = 3504
-CLUE_SCROLL_EASY_3505 = 3505
-CLUE_SCROLL_EASY_3506 = 3506
-CLUE_SCROLL_EASY_3507 = 3507
-CLUE_SCROLL_EASY_3508 = 3508
-CLUE_SCROLL_EASY_3509 = 3509
-CLUE_SCROLL_EASY_3510 = 3510
-CASKET_EASY_3511 = 3511
-CLUE_SCROLL_EASY_3512 = 3512
-CLUE_SCROLL_EASY_3513 = 3513
-CLUE_SCROLL_EASY_3514 = 3514
-CLUE_SCROLL_EASY_3515 = 3515
-CLUE_SCROLL_EASY_3516 = 3516
-CASKET_EASY_3517 = 3517
-CLUE_SCROLL_EASY_3518 = 3518
-CASKET_EASY_3519 = 3519
-CLUE_SCROLL_HARD_3520 = 3520
-CASKET_HARD_3521 = 3521
-CLUE_SCROLL_HARD_3522 = 3522
-CASKET_HARD_3523 = 3523
-CLUE_SCROLL_HARD_3524 = 3524
-CLUE_SCROLL_HARD_3525 = 3525
-CLUE_SCROLL_HARD_3526 = 3526
-CASKET_HARD_3527 = 3527
-CLUE_SCROLL_HARD_3528 = 3528
-CASKET_HARD_3529 = 3529
-CLUE_SCROLL_HARD_3530 = 3530
-CASKET_HARD_3531 = 3531
-CLUE_SCROLL_HARD_3532 = 3532
-CASKET_HARD_3533 = 3533
-CLUE_SCROLL_HARD_3534 = 3534
-CASKET_HARD_3535 = 3535
-CLUE_SCROLL_HARD_3536 = 3536
-CASKET_HARD_3537 = 3537
-CLUE_SCROLL_HARD_3538 = 3538
-CASKET_HARD_3539 = 3539
-CLUE_SCROLL_HARD_3540 = 3540
-CASKET_HARD_3541 = 3541
-CLUE_SCROLL_HARD_3542 = 3542
-CASKET_HARD_3543 = 3543
-CLUE_SCROLL_HARD_3544 = 3544
-CASKET_HARD_3545 = 3545
-CLUE_SCROLL_HARD_3546 = 3546
-CASKET_HARD_3547 = 3547
-CLUE_SCROLL_HARD_3548 = 3548
-CASKET_HARD_3549 = 3549
-CLUE_SCROLL_HARD_3550 = 3550
-CASKET_HARD_3551 = 3551
-CLUE_SCROLL_HARD_3552 = 3552
-CASKET_HARD_3553 = 3553
-CLUE_SCROLL_HARD_3554 = 3554
-CASKET_HARD_3555 = 3555
-CLUE_SCROLL_HARD_3556 = 3556
-CASKET_HARD_3557 = 3557
-CLUE_SCROLL_HARD_3558 = 3558
-CASKET_HARD_3559 = 3559
-CLUE_SCROLL_HARD_3560 = 3560
-CASKET_HARD_3561 = 3561
-CLUE_SCROLL_HARD_3562 = 3562
-CASKET_HARD_3563 = 3563
-CLUE_SCROLL_HARD_3564 = 3564
-PUZZLE_BOX_HARD_3565 = 3565
-CLUE_SCROLL_HARD_3566 = 3566
-PUZZLE_BOX_HARD_3567 = 3567
-CLUE_SCROLL_HARD_3568 = 3568
-PUZZLE_BOX_HARD_3569 = 3569
-CLUE_SCROLL_HARD_3570 = 3570
-PUZZLE_BOX_HARD_3571 = 3571
-CLUE_SCROLL_HARD_3572 = 3572
-CLUE_SCROLL_HARD_3573 = 3573
-CLUE_SCROLL_HARD_3574 = 3574
-CLUE_SCROLL_HARD_3575 = 3575
-PUZZLE_BOX_HARD_3576 = 3576
-CLUE_SCROLL_HARD_3577 = 3577
-PUZZLE_BOX_HARD_3578 = 3578
-CLUE_SCROLL_HARD_3579 = 3579
-CLUE_SCROLL_HARD_3580 = 3580
-CASKET_HARD_3581 = 3581
-CLUE_SCROLL_MEDIUM_3582 = 3582
-CASKET_MEDIUM_3583 = 3583
-CLUE_SCROLL_MEDIUM_3584 = 3584
-CASKET_MEDIUM_3585 = 3585
-CLUE_SCROLL_MEDIUM_3586 = 3586
-CASKET_MEDIUM_3587 = 3587
-CLUE_SCROLL_MEDIUM_3588 = 3588
-CASKET_MEDIUM_3589 = 3589
-CLUE_SCROLL_MEDIUM_3590 = 3590
-CASKET_MEDIUM_3591 = 3591
-CLUE_SCROLL_MEDIUM_3592 = 3592
-CASKET_MEDIUM_3593 = 3593
-CLUE_SCROLL_MEDIUM_3594 = 3594
-CASKET_MEDIUM_3595 = 3595
-CLUE_SCROLL_MEDIUM_3596 = 3596
-CASKET_MEDIUM_3597 = 3597
-CLUE_SCROLL_MEDIUM_3598 = 3598
-CLUE_SCROLL_MEDIUM_3599 = 3599
-CASKET_MEDIUM_3600 = 3600
-CLUE_SCROLL_MEDIUM_3601 = 3601
-CLUE_SCROLL_MEDIUM_3602 = 3602
-CASKET_MEDIUM_3603 = 3603
-CLUE_SCROLL_MEDIUM_3604 = 3604
-CLUE_SCROLL_MEDIUM_3605 = 3605
-KEY_MEDIUM_3606 = 3606
-CLUE_SCROLL_MEDIUM_3607 = 3607
-KEY_MEDIUM_3608 = 3608
-CLUE_SCROLL_MEDIUM_3609 = 3609
-CLUE_SCROLL_MEDIUM_3610 = 3610
-CLUE_SCROLL_MEDIUM_3611 = 3611
-CLUE_SCROLL_MEDIUM_3612 = 3612
-CLUE_SCROLL_MEDIUM_3613 = 3613
-CLUE_SCROLL_MEDIUM_3614 = 3614
-CLUE_SCROLL_MEDIUM_3615 = 3615
-CLUE_SCROLL_MEDIUM_3616 = 3616
-CLUE_SCROLL_MEDIUM_3617 = 3617
-CLUE_SCROLL_MEDIUM_3618 = 3618
-BOSS_HELPER_TOOL = 3667
-BLACK_PLATESKIRT_T_NOTED = 3668
-BLACK_PLATESKIRT_G_NOTED = 3669
-ADAMANT_PLATESKIRT_T_NOTED = 3670
-ADAMANT_PLATESKIRT_G_NOTED = 3671
-RUNE_PLATESKIRT_G_NOTED = 3672
-RUNE_PLATESKIRT_T_NOTED = 3673
-ZAMORAK_PLATESKIRT_NOTED = 3674
-SARADOMIN_PLATESKIRT_NOTED = 3675
-GUTHIX_PLATESKIRT_NOTED = 3676
-GILDED_PLATESKIRT_NOTED = 3677
-FLAMTAER_HAMMER = 3678
-FLAMTAER_HAMMER_NOTED = 3679
-SHOE = 3680
-SHOE_3681 = 3681
-SHOE_3682 = 3682
-SHOE_3683 = 3683
-SHOE_3684 = 3684
-SHOE_3685 = 3685
-FREMENNIK = 3686
-UNSTRUNG_LYRE = 3688
-LYRE = 3689
-ENCHANTED_LYRE = 3690
-ENCHANTED_LYRE1 = 3691
-BRANCH = 3692
-GOLDEN_FLEECE = 3693
-GOLDEN_WOOL = 3694
-PET_ROCK = 3695
-HUNTERS_TALISMAN = 3696
-HUNTERS_TALISMAN_3697 = 3697
-EXOTIC_FLOWER = 3698
-FREMENNIK_BALLAD = 3699
-STURDY_BOOTS = 3700
-TRACKING_MAP = 3701
-CUSTOM_BOW_STRING = 3702
-UNUSUAL_FISH = 3703
-SEA_FISHING_MAP = 3704
-WEATHER_FORECAST = 3705
-CHAMPIONS_TOKEN = 3706
-LEGENDARY_COCKTAIL = 3707
-FISCAL_STATEMENT = 3708
-PROMISSORY_NOTE = 3709
-WARRIORS_CONTRACT = 3710
-KEG_OF_BEER = 3711
-LOW_ALCOHOL_KEG = 3712
-STRANGE_OBJECT = 3713
-LIT_STRANGE_OBJECT = 3714
-RED_DISK = 3715
-RED_DISK_3716 = 3716
-MAGNET_3718 = 3718
-BLUE_THREAD = 3719
-SMALL_PICK = 3720
-TOY_SHIP = 3721
-FULL_BUCKET = 3722
-_45THS_FULL_BUCKET = 3723
-_35THS_FULL_BUCKET = 3724
-_25THS_FULL_BUCKET = 3725
-_15THS_FULL_BUCKET = 3726
-EMPTY_BUCKET = 3727
-FROZEN_BUCKET = 3728
-FULL_JUG = 3729
-_23RDS_FULL_JUG = 3730
-_13RDS_FULL_JUG = 3731
-EMPTY_JUG = 3732
-FROZEN_JUG = 3733
-VASE_3734 = 3734
-VASE_OF_WATER = 3735
-FROZEN_VASE = 3736
-VASE_LID = 3737
-SEALED_VASE = 3738
-SEALED_VASE_3739 = 3739
-SEALED_VASE_3740 = 3740
-FROZEN_KEY = 3741
-RED_HERRING = 3742
-RED_DISK_3743 = 3743
-WOODEN_DISK = 3744
-SEERS_KEY = 3745
-STICKY_RED_GOOP = 3746
-STICKY_RED_GOOP_NOTED = 3747
-FREMENNIK_HELM = 3748
-ARCHER_HELM = 3749
-ARCHER_HELM_NOTED = 3750
-BERSERKER_HELM = 3751
-BERSERKER_HELM_NOTED = 3752
-WARRIOR_HELM = 3753
-WARRIOR_HELM_NOTED = 3754
-FARSEER_HELM = 3755
-FARSEER_HELM_NOTED = 3756
-FREMENNIK_BLADE = 3757
-FREMENNIK_SHIELD = 3758
-FREMENNIK_CYAN_CLOAK = 3759
-FREMENNIK_CYAN_CLOAK_NOTED = 3760
-FREMENNIK_BROWN_CLOAK = 3761
-FREMENNIK_BROWN_CLOAK_NOTED = 3762
-FREMENNIK_BLUE_CLOAK = 3763
-FREMENNIK_BLUE_CLOAK_NOTED = 3764
-FREMENNIK_GREEN_CLOAK = 3765
-FREMENNIK_GREEN_CLOAK_NOTED = 3766
-FREMENNIK_BROWN_SHIRT = 3767
-FREMENNIK_BROWN_SHIRT_NOTED = 3768
-FREMENNIK_GREY_SHIRT = 3769
-FREMENNIK_GREY_SHIRT_NOTED = 3770
-FREMENNIK_BEIGE_SHIRT = 3771
-FREMENNIK_BEIGE_SHIRT_NOTED = 3772
-FREMENNIK_RED_SHIRT = 3773
-FREMENNIK_RED_SHIRT_NOTED = 3774
-FREMENNIK_BLUE_SHIRT = 3775
-FREMENNIK_BLUE_SHIRT_NOTED = 3776
-FREMENNIK_RED_CLOAK = 3777
-FREMENNIK_RED_CLOAK_NOTED = 3778
-FREMENNIK_GREY_CLOAK = 3779
-FREMENNIK_GREY_CLOAK_NOTED = 3780
-FREMENNIK_YELLOW_CLOAK = 3781
-FREMENNIK_YELLOW_CLOAK_NOTED = 3782
-FREMENNIK_TEAL_CLOAK = 3783
-FREMENNIK_TEAL_CLOAK_NOTED = 3784
-FREMENNIK_PURPLE_CLOAK = 3785
-FREMENNIK_PURPLE_CLOAK_NOTED = 3786
-FREMENNIK_PINK_CLOAK = 3787
-FREMENNIK_PINK_CLOAK_NOTED = 3788
-FREMENNIK_BLACK_CLOAK = 3789
-FREMENNIK_BLACK_CLOAK_NOTED = 3790
-FREMENNIK_BOOTS = 3791
-FREMENNIK_BOOTS_NOTED = 3792
-FREMENNIK_ROBE = 3793
-FREMENNIK_ROBE_NOTED = 3794
-FREMENNIK_SKIRT = 3795
-FREMENNIK_SKIRT_NOTED = 3796
-FREMENNIK_HAT = 3797
-FREMENNIK_HAT_NOTED = 3798
-FREMENNIK_GLOVES = 3799
-FREMENNIK_GLOVES_NOTED = 3800
-KEG_OF_BEER_3801 = 3801
-KEG_OF_BEER_NOTED = 3802
-BEER_TANKARD = 3803
-BEER_TANKARD_NOTED = 3804
-TANKARD = 3805
-TANKARD_NOTED = 3806
-BRONZE_BOLTS_3807 = 3807
-BRONZE_BOLTS_3808 = 3808
-BRONZE_BOLTS_3809 = 3809
-BRONZE_BOLTS_3810 = 3810
-BRONZE_BOLTS_P_3811 = 3811
-BRONZE_BOLTS_P_3812 = 3812
-BRONZE_BOLTS_P_3813 = 3813
-BRONZE_BOLTS_P_3814 = 3814
-OPAL_BOLTS_3815 = 3815
-OPAL_BOLTS_3816 = 3816
-OPAL_BOLTS_3817 = 3817
-OPAL_BOLTS_3818 = 3818
-PEARL_BOLTS_3819 = 3819
-PEARL_BOLTS_3820 = 3820
-PEARL_BOLTS_3821 = 3821
-PEARL_BOLTS_3822 = 3822
-BARBED_BOLTS_3823 = 3823
-BARBED_BOLTS_3824 = 3824
-BARBED_BOLTS_3825 = 3825
-BARBED_BOLTS_3826 = 3826
-SARADOMIN_PAGE_1 = 3827
-SARADOMIN_PAGE_2 = 3828
-SARADOMIN_PAGE_3 = 3829
-SARADOMIN_PAGE_4 = 3830
-ZAMORAK_PAGE_1 = 3831
-ZAMORAK_PAGE_2 = 3832
-ZAMORAK_PAGE_3 = 3833
-ZAMORAK_PAGE_4 = 3834
-GUTHIX_PAGE_1 = 3835
-GUTHIX_PAGE_2 = 3836
-GUTHIX_PAGE_3 = 3837
-GUTHIX_PAGE_4 = 3838
-DAMAGED_BOOK = 3839
-HOLY_BOOK = 3840
-DAMAGED_BOOK_3841 = 3841
-UNHOLY_BOOK = 3842
-DAMAGED_BOOK_3843 = 3843
-BOOK_OF_BALANCE = 3844
-JOURNAL_3845 = 3845
-DIARY_3846 = 3846
-MANUAL = 3847
-LIGHTHOUSE_KEY = 3848
-RUSTY_CASKET = 3849
-UNHOLY_SYMBOL_NOTED = 3852
-GAMES_NECKLACE8 = 3853
-GAMES_NECKLACE8_NOTED = 3854
-GAMES_NECKLACE7 = 3855
-GAMES_NECKLACE7_NOTED = 3856
-GAMES_NECKLACE6 = 3857
-GAMES_NECKLACE6_NOTED = 3858
-GAMES_NECKLACE5 = 3859
-GAMES_NECKLACE5_NOTED = 3860
-GAMES_NECKLACE4 = 3861
-GAMES_NECKLACE4_NOTED = 3862
-GAMES_NECKLACE3 = 3863
-GAMES_NECKLACE3_NOTED = 3864
-GAMES_NECKLACE2 = 3865
-GAMES_NECKLACE2_NOTED = 3866
-GAMES_NECKLACE1 = 3867
-GAMES_NECKLACE1_NOTED = 3868
-BOARD_GAME_PIECE = 3869
-BOARD_GAME_PIECE_3870 = 3870
-BOARD_GAME_PIECE_3871 = 3871
-BOARD_GAME_PIECE_3872 = 3872
-BOARD_GAME_PIECE_3873 = 3873
-BOARD_GAME_PIECE_3874 = 3874
-BOARD_GAME_PIECE_3875 = 3875
-BOARD_GAME_PIECE_3876 = 3876
-BOARD_GAME_PIECE_3877 = 3877
-BOARD_GAME_PIECE_3878 = 3878
-BOARD_GAME_PIECE_3879 = 3879
-BOARD_GAME_PIECE_3880 = 3880
-BOARD_GAME_PIECE_3881 = 3881
-BOARD_GAME_PIECE_3882 = 3882
-BOARD_GAME_PIECE_3883 = 3883
-BOARD_GAME_PIECE_3884 = 3884
-BOARD_GAME_PIECE_3885 = 3885
-BOARD_GAME_PIECE_3886 = 3886
-BOARD_GAME_PIECE_3887 = 3887
-BOARD_GAME_PIECE_3888 = 3888
-BOARD_GAME_PIECE_3889 = 3889
-BOARD_GAME_PIECE_3890 = 3890
-BOARD_GAME_PIECE_3891 = 3891
-BOARD_GAME_PIECE_3892 = 3892
-STOOL = 3893
-AWFUL_ANTHEM = 3894
-GOOD_ANTHEM = 3895
-TREATY = 3896
-GIANT_NIB = 3897
-GIANT_PEN = 3898
-IRON_SICKLE = 3899
-IRON_SICKLE_NOTED = 3900
-GHRIMS_BOOK = 3901
-AMETHYST_BROAD_BOLTS = 3902
-ADAMANT_JAVELIN_HEADS_3905 = 3905
-ADAMANT_JAVELIN_HEADS_3907 = 3907
-ADAMANT_JAVELIN_HEADS_3909 = 3909
-RUNE_JAVELIN_HEADS = 3911
-RUNE_JAVELIN_HEADS_3913 = 3913
-RUNE_JAVELIN_HEADS_3915 = 3915
-RUNE_JAVELIN_HEADS_3917 = 3917
-DRAGON_JAVELIN_HEADS = 3919
-DRAGON_JAVELIN_HEADS_3921 = 3921
-DRAGON_JAVELIN_HEADS_3923 = 3923
-DRAGON_JAVELIN_HEADS_3925 = 3925
-JAVELIN_SHAFT = 3927
-JAVELIN_SHAFT_3929 = 3929
-JAVELIN_SHAFT_3931 = 3931
-JAVELIN_SHAFT_3933 = 3933
-AMETHYST_BOLT_TIPS = 3951
-AMYLASE_CRYSTAL = 3955
-AMYLASE_CRYSTAL_3957 = 3957
-AMYLASE_CRYSTAL_3959 = 3959
-AMYLASE_CRYSTAL_3961 = 3961
-AMETHYST_JAVELIN_HEADS = 3963
-AMETHYST_JAVELIN_HEADS_3965 = 3965
-AMETHYST_JAVELIN_HEADS_3967 = 3967
-GRAPE_SEED = 3973
-GRAPE_SEED_3975 = 3975
-GRAPE_SEED_3977 = 3977
-GRAPE_SEED_3979 = 3979
-WILDERNESS_SWORD = 3981
-WESTERN_BANNER = 3983
-PLATINUM_TOKEN = 3985
-PLATINUM_TOKEN_3987 = 3987
-PLATINUM_TOKEN_3989 = 3989
-PLATINUM_TOKEN_3991 = 3991
-ZULRAHS_SCALES = 3993
-ZULRAHS_SCALES_3995 = 3995
-ZULRAHS_SCALES_3997 = 3997
-ZULRAHS_SCALES_3999 = 3999
-AMETHYST_BROAD_BOLTS_4000 = 4000
-HARDY_GOUT_TUBER = 4001
-SPARE_CONTROLS = 4002
-SPARE_CONTROLS_NOTED = 4003
-GNOME_ROYAL_SEAL = 4004
-NARNODES_ORDERS = 4005
-MONKEY_DENTURES = 4006
-ENCHANTED_BAR = 4007
-EYE_OF_GNOME = 4008
-EYE_OF_GNOME_4009 = 4009
-MONKEY_MAGIC = 4010
-MONKEY_MAGIC_NOTED = 4011
-MONKEY_NUTS = 4012
-MONKEY_NUTS_NOTED = 4013
-MONKEY_BAR = 4014
-MONKEY_BAR_NOTED = 4015
-BANANA_STEW = 4016
-BANANA_STEW_NOTED = 4017
-MONKEY_WRENCH = 4018
-MONKEY_WRENCH_NOTED = 4019
-MAMULET_MOULD = 4020
-MSPEAK_AMULET = 4021
-MSPEAK_AMULET_4022 = 4022
-MONKEY_TALISMAN = 4023
-NINJA_MONKEY_GREEGREE = 4024
-NINJA_MONKEY_GREEGREE_4025 = 4025
-GORILLA_GREEGREE = 4026
-BEARDED_GORILLA_GREEGREE = 4027
-ANCIENT_GORILLA_GREEGREE = 4028
-ZOMBIE_MONKEY_GREEGREE = 4029
-ZOMBIE_MONKEY_GREEGREE_4030 = 4030
-KARAMJAN_MONKEY_GREEGREE = 4031
-MONKEY = 4033
-MONKEY_SKULL = 4034
-_10TH_SQUAD_SIGIL = 4035
-BROAD_BOLTS = 4036
-SARADOMIN_BANNER = 4037
-SARADOMIN_BANNER_NOTED = 4038
-ZAMORAK_BANNER = 4039
-ZAMORAK_BANNER_NOTED = 4040
-HOODED_CLOAK = 4041
-HOODED_CLOAK_4042 = 4042
-ROCK_4043 = 4043
-ROCK_NOTED_4044 = 4044
-EXPLOSIVE_POTION = 4045
-EXPLOSIVE_POTION_NOTED = 4046
-CLIMBING_ROPE = 4047
-CLIMBING_ROPE_NOTED = 4048
-BANDAGES = 4049
-BANDAGES_NOTED = 4050
-TOOLKIT_4051 = 4051
-TOOLKIT_NOTED = 4052
-BARRICADE = 4053
-BARRICADE_NOTED = 4054
-CASTLEWARS_MANUAL = 4055
-CASTLE_WARS_TICKET = 4067
-DECORATIVE_SWORD = 4068
-DECORATIVE_ARMOUR = 4069
-DECORATIVE_ARMOUR_4070 = 4070
-DECORATIVE_HELM = 4071
-DECORATIVE_SHIELD = 4072
-DAMP_TINDERBOX = 4073
-DAMP_TINDERBOX_NOTED = 4074
-GLOWING_FUNGUS = 4075
-AMETHYST_BROAD_BOLTS_4076 = 4076
-CRYSTALMINE_KEY = 4077
-ZEALOTS_KEY = 4078
-YOYO = 4079
-SALVE_AMULET = 4081
-SALVE_SHARD = 4082
-SLED = 4083
-SLED_4084 = 4084
-WAX = 4085
-TROLLWEISS = 4086
-DRAGON_PLATELEGS = 4087
-DRAGON_PLATELEGS_NOTED = 4088
-MYSTIC_HAT = 4089
-MYSTIC_HAT_NOTED = 4090
-MYSTIC_ROBE_TOP = 4091
-MYSTIC_ROBE_TOP_NOTED = 4092
-MYSTIC_ROBE_BOTTOM = 4093
-MYSTIC_ROBE_BOTTOM_NOTED = 4094
-MYSTIC_GLOVES = 4095
-MYSTIC_GLOVES_NOTED = 4096
-MYSTIC_BOOTS = 4097
-MYSTIC_BOOTS_NOTED = 4098
-MYSTIC_HAT_DARK = 4099
-MYSTIC_HAT_DARK_NOTED = 4100
-MYSTIC_ROBE_TOP_DARK = 4101
-MYSTIC_ROBE_TOP_DARK_NOTED = 4102
-MYSTIC_ROBE_BOTTOM_DARK = 4103
-MYSTIC_ROBE_BOTTOM_DARK_NOTED = 4104
-MYSTIC_GLOVES_DARK = 4105
-MYSTIC_GLOVES_DARK_NOTED = 4106
-MYSTIC_BOOTS_DARK = 4107
-MYSTIC_BOOTS_DARK_NOTED = 4108
-MYSTIC_HAT_LIGHT = 4109
-MYSTIC_HAT_LIGHT_NOTED = 4110
-MYSTIC_ROBE_TOP_LIGHT = 4111
-MYSTIC_ROBE_TOP_LIGHT_NOTED = 4112
-MYSTIC_ROBE_BOTTOM_LIGHT = 4113
-MYSTIC_ROBE_BOTTOM_LIGHT_NOTED = 4114
-MYSTIC_GLOVES_LIGHT = 4115
-MYSTIC_GLOVES_LIGHT_NOTED = 4116
-MYSTIC_BOOTS_LIGHT = 4117
-MYSTIC_BOOTS_LIGHT_NOTED = 4118
-BRONZE_BOOTS = 4119
-BRONZE_BOOTS_NOTED = 4120
-IRON_BOOTS = 4121
-IRON_BOOTS_NOTED = 4122
-STEEL_BOOTS = 4123
-STEEL_BOOTS_NOTED = 4124
-BLACK_BOOTS = 4125
-BLACK_BOOTS_NOTED = 4126
-MITHRIL_BOOTS = 4127
-MITHRIL_BOOTS_NOTED = 4128
-ADAMANT_BOOTS = 4129
-ADAMANT_BOOTS_NOTED = 4130
-RUNE_BOOTS = 4131
-RUNE_BOOTS_NOTED = 4132
-CRAWLING_HAND = 4133
-CAVE_CRAWLER = 4134
-BANSHEE = 4135
-ROCKSLUG = 4136
-COCKATRICE = 4137
-PYREFIEND = 4138
-BASILISK = 4139
-INFERNAL_MAGE = 4140
-BLOODVELD = 4141
-JELLY = 4142
-TUROTH = 4143
-ABERRANT_SPECTRE = 4144
-DUST_DEVIL = 4145
-KURASK = 4146
-GARGOYLE = 4147
-NECHRYAEL = 4148
-ABYSSAL_DEMON = 4149
-BROAD_ARROWS = 4150
-ABYSSAL_WHIP = 4151
-ABYSSAL_WHIP_NOTED = 4152
-GRANITE_MAUL = 4153
-GRANITE_MAUL_NOTED = 4154
-ENCHANTED_GEM = 4155
-MIRROR_SHIELD = 4156
-MIRROR_SHIELD_NOTED = 4157
-LEAFBLADED_SPEAR = 4158
-LEAFBLADED_SPEAR_4159 = 4159
-BROAD_ARROWS_4160 = 4160
-BAG_OF_SALT = 4161
-ROCK_HAMMER = 4162
-ROCK_HAMMER_NOTED = 4163
-FACEMASK = 4164
-FACEMASK_NOTED = 4165
-EARMUFFS = 4166
-EARMUFFS_NOTED = 4167
-NOSE_PEG = 4168
-NOSE_PEG_NOTED = 4169
-SLAYERS_STAFF = 4170
-SLAYERS_STAFF_NOTED = 4171
-BROAD_ARROWS_4172 = 4172
-BROAD_ARROWS_4173 = 4173
-BROAD_ARROWS_4174 = 4174
-BROAD_ARROWS_4175 = 4175
-AMETHYST_BROAD_BOLTS_4177 = 4177
-ABYSSAL_WHIP_4178 = 4178
-STICK = 4179
-DRAGON_PLATELEGS_4180 = 4180
-MOUTH_GRIP = 4181
-GOUTWEED_4182 = 4182
-STAR_AMULET = 4183
-CAVERN_KEY = 4184
-TOWER_KEY = 4185
-SHED_KEY = 4186
-MARBLE_AMULET = 4187
-OBSIDIAN_AMULET = 4188
-GARDEN_CANE = 4189
-GARDEN_BRUSH = 4190
-EXTENDED_BRUSH = 4191
-EXTENDED_BRUSH_4192 = 4192
-EXTENDED_BRUSH_4193 = 4193
-TORSO = 4194
-ARMS = 4195
-LEGS = 4196
-DECAPITATED_HEAD = 4197
-DECAPITATED_HEAD_4198 = 4198
-PICKLED_BRAIN = 4199
-CONDUCTOR_MOULD = 4200
-CONDUCTOR = 4201
-RING_OF_CHAROS = 4202
-JOURNAL_4203 = 4203
-LETTER = 4204
-CONSECRATION_SEED = 4205
-CONSECRATION_SEED_4206 = 4206
-CRYSTAL_WEAPON_SEED = 4207
-CRYSTAL_WEAPON_SEED_NOTED = 4208
-CADARN_LINEAGE = 4209
-CADARN_LINEAGE_NOTED = 4210
-ELF_CRYSTAL = 4211
-NEW_CRYSTAL_BOW = 4212
-NEW_CRYSTAL_BOW_4213 = 4213
-CRYSTAL_BOW_FULL = 4214
-CRYSTAL_BOW_910 = 4215
-CRYSTAL_BOW_810 = 4216
-CRYSTAL_BOW_710 = 4217
-CRYSTAL_BOW_610 = 4218
-CRYSTAL_BOW_510 = 4219
-CRYSTAL_BOW_410 = 4220
-CRYSTAL_BOW_310 = 4221
-CRYSTAL_BOW_210 = 4222
-CRYSTAL_BOW_110 = 4223
-NEW_CRYSTAL_SHIELD = 4224
-CRYSTAL_SHIELD_FULL = 4225
-CRYSTAL_SHIELD_910 = 4226
-CRYSTAL_SHIELD_810 = 4227
-CRYSTAL_SHIELD_710 = 4228
-CRYSTAL_SHIELD_610 = 4229
-CRYSTAL_SHIELD_510 = 4230
-CRYSTAL_SHIELD_410 = 4231
-CRYSTAL_SHIELD_310 = 4232
-CRYSTAL_SHIELD_210 = 4233
-CRYSTAL_SHIELD_110 = 4234
-NEW_CRYSTAL_SHIELD_4235 = 4235
-SIGNED_OAK_BOW = 4236
-NETTLEWATER = 4237
-PUDDLE_OF_SLIME = 4238
-NETTLE_TEA = 4239
-NETTLE_TEA_4240 = 4240
-NETTLES = 4241
-CUP_OF_TEA_4242 = 4242
-CUP_OF_TEA_4243 = 4243
-PORCELAIN_CUP = 4244
-CUP_OF_TEA_4245 = 4245
-CUP_OF_TEA_4246 = 4246
-MYSTICAL_ROBES = 4247
-BOOK_OF_HARICANTO = 4248
-TRANSLATION_MANUAL = 4249
-GHOSTSPEAK_AMULET_4250 = 4250
-ECTOPHIAL = 4251
-ECTOPHIAL_4252 = 4252
-MODEL_SHIP = 4253
-MODEL_SHIP_4254 = 4254
-BONEMEAL = 4255
-BAT_BONEMEAL = 4256
-BIG_BONEMEAL = 4257
-BURNT_BONEMEAL = 4258
-BURNT_JOGRE_BONEMEAL = 4259
-BABY_DRAGON_BONEMEAL = 4260
-DRAGON_BONEMEAL = 4261
-WOLF_BONEMEAL = 4262
-SMALL_NINJA_BONEMEAL = 4263
-MEDIUM_NINJA_BONEMEAL = 4264
-GORILLA_BONEMEAL = 4265
-BEARDED_GORILLA_BONEMEAL = 4266
-MONKEY_BONEMEAL = 4267
-SMALL_ZOMBIE_MONKEY_BONEMEAL = 4268
-LARGE_ZOMBIE_MONKEY_BONEMEAL = 4269
-SKELETON_BONEMEAL = 4270
-JOGRE_BONEMEAL = 4271
-BONE_KEY_4272 = 4272
-CHEST_KEY_4273 = 4273
-MAP_SCRAP = 4274
-MAP_SCRAP_4275 = 4275
-MAP_SCRAP_4276 = 4276
-TREASURE_MAP = 4277
-ECTOTOKEN = 4278
-ECTOTOKEN_4279 = 4279
-BROAD_BOLTS_4280 = 4280
-ECTOTOKEN_4281 = 4281
-BROAD_BOLTS_4282 = 4282
-PETITION_FORM = 4283
-BEDSHEET = 4284
-BEDSHEET_4285 = 4285
-BUCKET_OF_SLIME = 4286
-RAW_BEEF_4287 = 4287
-RAW_BEEF_NOTED_4288 = 4288
-RAW_CHICKEN_4289 = 4289
-RAW_CHICKEN_NOTED_4290 = 4290
-COOKED_CHICKEN_4291 = 4291
-COOKED_CHICKEN_NOTED_4292 = 4292
-COOKED_MEAT_4293 = 4293
-COOKED_MEAT_NOTED_4294 = 4294
-FEMALE_HAM = 4295
-BROAD_BOLTS_4296 = 4296
-MALE_HAM = 4297
-HAM_SHIRT = 4298
-HAM_SHIRT_NOTED = 4299
-HAM_ROBE = 4300
-HAM_ROBE_NOTED = 4301
-HAM_HOOD = 4302
-HAM_HOOD_NOTED = 4303
-HAM_CLOAK = 4304
-HAM_CLOAK_NOTED = 4305
-HAM_LOGO = 4306
-HAM_LOGO_NOTED = 4307
-HAM_GLOVES = 4308
-HAM_GLOVES_NOTED = 4309
-HAM_BOOTS = 4310
-HAM_BOOTS_NOTED = 4311
-UNFINISHED_BROAD_BOLTS = 4312
-CRYSTAL_SINGING_FOR_BEGINNERS = 4313
-CRYSTAL_SINGING_FOR_BEGINNERS_NOTED = 4314
-TEAM1_CAPE = 4315
-TEAM1_CAPE_NOTED = 4316
-TEAM2_CAPE = 4317
-TEAM2_CAPE_NOTED = 4318
-TEAM3_CAPE = 4319
-TEAM3_CAPE_NOTED = 4320
-TEAM4_CAPE = 4321
-TEAM4_CAPE_NOTED = 4322
-TEAM5_CAPE = 4323
-TEAM5_CAPE_NOTED = 4324
-TEAM6_CAPE = 4325
-TEAM6_CAPE_NOTED = 4326
-TEAM7_CAPE = 4327
-TEAM7_CAPE_NOTED = 4328
-TEAM8_CAPE = 4329
-TEAM8_CAPE_NOTED = 4330
-TEAM9_CAPE = 4331
-TEAM9_CAPE_NOTED = 4332
-TEAM10_CAPE = 4333
-TEAM10_CAPE_NOTED = 4334
-TEAM11_CAPE = 4335
-TEAM11_CAPE_NOTED = 4336
-TEAM12_CAPE = 4337
-TEAM12_CAPE_NOTED = 4338
-TEAM13_CAPE = 4339
-TEAM13_CAPE_NOTED = 4340
-TEAM14_CAPE = 4341
-TEAM14_CAPE_NOTED = 4342
-TEAM15_CAPE = 4343
-TEAM15_CAPE_NOTED = 4344
-TEAM16_CAPE = 4345
-TEAM16_CAPE_NOTED = 4346
-TEAM17_CAPE = 4347
-TEAM17_CAPE_NOTED = 4348
-TEAM18_CAPE = 4349
-TEAM18_CAPE_NOTED = 4350
-TEAM19_CAPE = 4351
-TEAM19_CAPE_NOTED = 4352
-TEAM20_CAPE = 4353
-TEAM20_CAPE_NOTED = 4354
-TEAM21_CAPE = 4355
-TEAM21_CAPE_NOTED = 4356
-TEAM22_CAPE = 4357
-TEAM22_CAPE_NOTED = 4358
-TEAM23_CAPE = 4359
-TEAM23_CAPE_NOTED = 4360
-TEAM24_CAPE = 4361
-TEAM24_CAPE_NOTED = 4362
-TEAM25_CAPE = 4363
-TEAM25_CAPE_NOTED = 4364
-TEAM26_CAPE = 4365
-TEAM26_CAPE_NOTED = 4366
-TEAM27_CAPE = 4367
-TEAM27_CAPE_NOTED = 4368
-TEAM28_CAPE = 4369
-TEAM28_CAPE_NOTED = 4370
-TEAM29_CAPE = 4371
-TEAM29_CAPE_NOTED = 4372
-TEAM30_CAPE = 4373
-TEAM30_CAPE_NOTED = 4374
-TEAM31_CAPE = 4375
-TEAM31_CAPE_NOTED = 4376
-TEAM32_CAPE = 4377
-TEAM32_CAPE_NOTED = 4378
-TEAM33_CAPE = 4379
-TEAM33_CAPE_NOTED = 4380
-TEAM34_CAPE = 4381
-TEAM34_CAPE_NOTED = 4382
-TEAM35_CAPE = 4383
-TEAM35_CAPE_NOTED = 4384
-TEAM36_CAPE = 4385
-TEAM36_CAPE_NOTED = 4386
-TEAM37_CAPE = 4387
-TEAM37_CAPE_NOTED = 4388
-TEAM38_CAPE = 4389
-TEAM38_CAPE_NOTED = 4390
-TEAM39_CAPE = 4391
-TEAM39_CAPE_NOTED = 4392
-TEAM40_CAPE = 4393
-TEAM40_CAPE_NOTED = 4394
-TEAM41_CAPE = 4395
-TEAM41_CAPE_NOTED = 4396
-TEAM42_CAPE = 4397
-TEAM42_CAPE_NOTED = 4398
-TEAM43_CAPE = 4399
-TEAM43_CAPE_NOTED = 4400
-TEAM44_CAPE = 4401
-TEAM44_CAPE_NOTED = 4402
-TEAM45_CAPE = 4403
-TEAM45_CAPE_NOTED = 4404
-TEAM46_CAPE = 4405
-TEAM46_CAPE_NOTED = 4406
-TEAM47_CAPE = 4407
-TEAM47_CAPE_NOTED = 4408
-TEAM48_CAPE = 4409
-TEAM48_CAPE_NOTED = 4410
-TEAM49_CAPE = 4411
-TEAM49_CAPE_NOTED = 4412
-TEAM50_CAPE = 4413
-TEAM50_CAPE_NOTED = 4414
-BLUNT_AXE = 4415
-HERBAL_TINCTURE = 4416
-GUTHIX_REST4 = 4417
-GUTHIX_REST4_NOTED = 4418
-GUTHIX_REST3 = 4419
-GUTHIX_REST3_NOTED = 4420
-GUTHIX_REST2 = 4421
-GUTHIX_REST2_NOTED = 4422
-GUTHIX_REST1 = 4423
-GUTHIX_REST1_NOTED = 4424
-STODGY_MATTRESS = 4425
-COMFY_MATTRESS = 4426
-IRON_OXIDE = 4427
-ANIMATE_ROCK_SCROLL = 4428
-BROKEN_VANE_PART = 4429
-DIRECTIONALS = 4430
-BROKEN_VANE_PART_4431 = 4431
-ORNAMENT = 4432
-BROKEN_VANE_PART_4433 = 4433
-WEATHERVANE_PILLAR = 4434
-WEATHER_REPORT = 4435
-AIRTIGHT_POT = 4436
-AIRTIGHT_POT_NOTED = 4437
-UNFIRED_POT_LID = 4438
-UNFIRED_POT_LID_NOTED = 4439
-POT_LID = 4440
-POT_LID_NOTED = 4441
-BREATHING_SALTS = 4442
-CHICKEN_CAGE = 4443
-SHARPENED_AXE = 4444
-RED_MAHOGANY_LOG = 4445
-STEEL_KEY_RING = 4446
-ANTIQUE_LAMP = 4447
-BROAD_ARROWHEADS = 4449
-BROAD_ARROWHEADS_4451 = 4451
-BROAD_ARROWHEADS_4453 = 4453
-BROAD_ARROWHEADS_4455 = 4455
-BOWL_OF_HOT_WATER = 4456
-BOWL_OF_HOT_WATER_NOTED = 4457
-CUP_OF_WATER = 4458
-CUP_OF_WATER_NOTED = 4459
-CUP_OF_HOT_WATER = 4460
-CUP_OF_HOT_WATER_NOTED = 4461
-RUINED_HERB_TEA = 4462
-RUINED_HERB_TEA_NOTED = 4463
-HERB_TEA_MIX = 4464
-HERB_TEA_MIX_NOTED = 4465
-HERB_TEA_MIX_4466 = 4466
-HERB_TEA_MIX_NOTED_4467 = 4467
-HERB_TEA_MIX_4468 = 4468
-HERB_TEA_MIX_NOTED_4469 = 4469
-HERB_TEA_MIX_4470 = 4470
-HERB_TEA_MIX_NOTED_4471 = 4471
-HERB_TEA_MIX_4472 = 4472
-HERB_TEA_MIX_NOTED_4473 = 4473
-HERB_TEA_MIX_4474 = 4474
-HERB_TEA_MIX_NOTED_4475 = 4475
-HERB_TEA_MIX_4476 = 4476
-HERB_TEA_MIX_NOTED_4477 = 4477
-HERB_TEA_MIX_4478 = 4478
-HERB_TEA_MIX_NOTED_4479 = 4479
-HERB_TEA_MIX_4480 = 4480
-HERB_TEA_MIX_NOTED_4481 = 4481
-HERB_TEA_MIX_4482 = 4482
-HERB_TEA_MIX_NOTED_4483 = 4483
-SAFETY_GUARANTEE = 4484
-WHITE_PEARL = 4485
-WHITE_PEARL_SEED = 4486
-HALF_A_ROCK = 4487
-CORPSE_OF_WOMAN = 4488
-ASLEIFS_NECKLACE = 4489
-MUD = 4490
-MUD_NOTED = 4491
-MUDDY_ROCK = 4492
-MUDDY_ROCK_NOTED = 4493
-POLE = 4494
-NULL_4495 = 4495
-BROKEN_POLE = 4496
-BROKEN_POLE_NOTED = 4497
-ROPE_4498 = 4498
-ROPE_NOTED_4499 = 4499
-POLE_4500 = 4500
-NULL_4501 = 4501
-BEARHEAD = 4502
-DECORATIVE_SWORD_4503 = 4503
-DECORATIVE_ARMOUR_4504 = 4504
-DECORATIVE_ARMOUR_4505 = 4505
-DECORATIVE_HELM_4506 = 4506
-DECORATIVE_SHIELD_4507 = 4507
-DECORATIVE_SWORD_4508 = 4508
-DECORATIVE_ARMOUR_4509 = 4509
-DECORATIVE_ARMOUR_4510 = 4510
-DECORATIVE_HELM_4511 = 4511
-DECORATIVE_SHIELD_4512 = 4512
-CASTLEWARS_HOOD = 4513
-CASTLEWARS_CLOAK = 4514
-CASTLEWARS_HOOD_4515 = 4515
-CASTLEWARS_CLOAK_4516 = 4516
-GIANT_FROG_LEGS = 4517
-GIANT_FROG_LEGS_NOTED = 4518
-SWAMP_WALLBEAST = 4519
-SWAMP_CAVE_SLIME = 4520
-SWAMP_CAVE_BUG = 4521
-OIL_LAMP = 4522
-OIL_LAMP_NOTED = 4523
-OIL_LAMP_4524 = 4524
-EMPTY_OIL_LAMP = 4525
-EMPTY_OIL_LAMP_NOTED = 4526
-EMPTY_CANDLE_LANTERN = 4527
-EMPTY_CANDLE_LANTERN_NOTED = 4528
-CANDLE_LANTERN = 4529
-CANDLE_LANTERN_NOTED = 4530
-CANDLE_LANTERN_4531 = 4531
-CANDLE_LANTERN_4532 = 4532
-CANDLE_LANTERN_NOTED_4533 = 4533
-CANDLE_LANTERN_4534 = 4534
-EMPTY_OIL_LANTERN = 4535
-EMPTY_OIL_LANTERN_NOTED = 4536
-OIL_LANTERN = 4537
-OIL_LANTERN_NOTED = 4538
-OIL_LANTERN_4539 = 4539
-OIL_LANTERN_FRAME = 4540
-OIL_LANTERN_FRAME_NOTED = 4541
-LANTERN_LENS = 4542
-LANTERN_LENS_NOTED = 4543
-BULLSEYE_LANTERN_UNF = 4544
-BULLSEYE_LANTERN_UNF_NOTED = 4545
-BULLSEYE_LANTERN_EMPTY = 4546
-BULLSEYE_LANTERN_EMPTY_NOTED = 4547
-BULLSEYE_LANTERN = 4548
-BULLSEYE_LANTERN_NOTED = 4549
-BULLSEYE_LANTERN_4550 = 4550
-SPINY_HELMET = 4551
-SPINY_HELMET_NOTED = 4552
-BLUE_SWEETS = 4558
-DEEP_BLUE_SWEETS = 4559
-WHITE_SWEETS = 4560
-PURPLE_SWEETS = 4561
-RED_SWEETS = 4562
-GREEN_SWEETS = 4563
-PINK_SWEETS = 4564
-EASTER_BASKET = 4565
-RUBBER_CHICKEN = 4566
-GOLD_HELMET = 4567
-DWARVEN_LORE = 4568
-BOOK_PAGE_1 = 4569
-BOOK_PAGE_2 = 4570
-BOOK_PAGE_3 = 4571
-PAGES = 4572
-PAGES_4573 = 4573
-BASE_SCHEMATICS = 4574
-SCHEMATIC = 4575
-SCHEMATICS = 4576
-SCHEMATICS_4577 = 4577
-SCHEMATIC_4578 = 4578
-CANNON_BALL = 4579
-BLACK_SPEAR = 4580
-BLACK_SPEAR_NOTED = 4581
-BLACK_SPEARP = 4582
-BLACK_SPEARP_NOTED = 4583
-BLACK_SPEARKP = 4584
-DRAGON_PLATESKIRT = 4585
-DRAGON_PLATESKIRT_NOTED = 4586
-DRAGON_SCIMITAR = 4587
-DRAGON_SCIMITAR_NOTED = 4588
-KEYS = 4589
-JEWELS = 4590
-KHARIDIAN_HEADPIECE = 4591
-KHARIDIAN_HEADPIECE_NOTED = 4592
-FAKE_BEARD = 4593
-FAKE_BEARD_NOTED = 4594
-KARIDIAN_DISGUISE = 4595
-KARIDIAN_DISGUISE_NOTED = 4596
-NOTE = 4597
-NOTE_4598 = 4598
-OAK_BLACKJACK = 4599
-WILLOW_BLACKJACK = 4600
-UGTHANKI_DUNG = 4601
-UGTHANKI_DUNG_4602 = 4602
-RECEIPT = 4603
-HAGS_POISON = 4604
-SNAKE_CHARM = 4605
-SNAKE_BASKET = 4606
-SNAKE_BASKET_FULL = 4607
-SUPER_KEBAB = 4608
-SUPER_KEBAB_NOTED = 4609
-RED_HOT_SAUCE = 4610
-DESERT_DISGUISE = 4611
-WILLOW_BLACKJACK_NOTED = 4612
-SPINNING_PLATE = 4613
-BROKEN_PLATE = 4614
-LETTER_4615 = 4615
-VARMENS_NOTES = 4616
-DISPLAY_CABINET_KEY = 4617
-STATUETTE = 4618
-STRANGE_IMPLEMENT = 4619
-BLACK_MUSHROOM = 4620
-PHOENIX_FEATHER = 4621
-BLACK_DYE = 4622
-PHOENIX_QUILL_PEN = 4623
-GOLEM_PROGRAM = 4624
-BANDIT = 4625
-UNFINISHED_BROAD_BOLTS_4626 = 4626
-BANDITS_BREW = 4627
-BANDITS_BREW_NOTED = 4628
-FIRE = 4653
-ETCHINGS = 4654
-TRANSLATION = 4655
-WARM_KEY = 4656
-RING_OF_VISIBILITY = 4657
-SILVER_POT_4658 = 4658
-BLESSED_POT = 4659
-SILVER_POT_4660 = 4660
-BLESSED_POT_4661 = 4661
-SILVER_POT_4662 = 4662
-BLESSED_POT_4663 = 4663
-SILVER_POT_4664 = 4664
-BLESSED_POT_4665 = 4665
-SILVER_POT_4666 = 4666
-BLESSED_POT_4667 = 4667
-GARLIC_POWDER = 4668
-GARLIC_POWDER_NOTED = 4669
-BLOOD_DIAMOND = 4670
-ICE_DIAMOND = 4671
-SMOKE_DIAMOND = 4672
-SHADOW_DIAMOND = 4673
-GILDED_CROSS = 4674
-ANCIENT_STAFF = 4675
-ANCIENT_STAFF_NOTED = 4676
-CATSPEAK_AMULET = 4677
-CANOPIC_JAR = 4678
-CANOPIC_JAR_4679 = 4679
-CANOPIC_JAR_4680 = 4680
-CANOPIC_JAR_4681 = 4681
-HOLY_SYMBOL_4682 = 4682
-UNHOLY_SYMBOL_4683 = 4683
-LINEN = 4684
-LINEN_NOTED = 4685
-EMBALMING_MANUAL = 4686
-BUCKET_OF_SAP = 4687
-BUCKET_OF_SAP_NOTED = 4688
-PILE_OF_SALT = 4689
-PILE_OF_SALT_NOTED = 4690
-SPHINXS_TOKEN = 4691
-GOLD_LEAF = 4692
-BUCKET_OF_SALTWATER = 4693
-STEAM_RUNE = 4694
-MIST_RUNE = 4695
-DUST_RUNE = 4696
-SMOKE_RUNE = 4697
-MUD_RUNE = 4698
-LAVA_RUNE = 4699
-SAPPHIRE_LANTERN = 4700
-SAPPHIRE_LANTERN_4701 = 4701
-SAPPHIRE_LANTERN_4702 = 4702
-MAGIC_STONE = 4703
-STONE_BOWL = 4704
-UNFINISHED_BROAD_BOLTS_4706 = 4706
-CRUMBLING_TOME = 4707
-AHRIMS_HOOD = 4708
-AHRIMS_HOOD_NOTED = 4709
-AHRIMS_STAFF = 4710
-AHRIMS_STAFF_NOTED = 4711
-AHRIMS_ROBETOP = 4712
-AHRIMS_ROBETOP_NOTED = 4713
-AHRIMS_ROBESKIRT = 4714
-AHRIMS_ROBESKIRT_NOTED = 4715
-DHAROKS_HELM = 4716
-DHAROKS_HELM_NOTED = 4717
-DHAROKS_GREATAXE = 4718
-DHAROKS_GREATAXE_NOTED = 4719
-DHAROKS_PLATEBODY = 4720
-DHAROKS_PLATEBODY_NOTED = 4721
-DHAROKS_PLATELEGS = 4722
-DHAROKS_PLATELEGS_NOTED = 4723
-GUTHANS_HELM = 4724
-GUTHANS_HELM_NOTED = 4725
-GUTHANS_WARSPEAR = 4726
-GUTHANS_WARSPEAR_NOTED = 4727
-GUTHANS_PLATEBODY = 4728
-GUTHANS_PLATEBODY_NOTED = 4729
-GUTHANS_CHAINSKIRT = 4730
-GUTHANS_CHAINSKIRT_NOTED = 4731
-KARILS_COIF = 4732
-KARILS_COIF_NOTED = 4733
-KARILS_CROSSBOW = 4734
-KARILS_CROSSBOW_NOTED = 4735
-KARILS_LEATHERTOP = 4736
-KARILS_LEATHERTOP_NOTED = 4737
-KARILS_LEATHERSKIRT = 4738
-KARILS_LEATHERSKIRT_NOTED = 4739
-BOLT_RACK = 4740
-BOLT_RACK_4741 = 4741
-BOLT_RACK_4742 = 4742
-BOLT_RACK_4743 = 4743
-BOLT_RACK_4744 = 4744
-TORAGS_HELM = 4745
-TORAGS_HELM_NOTED = 4746
-TORAGS_HAMMERS = 4747
-TORAGS_HAMMERS_NOTED = 4748
-TORAGS_PLATEBODY = 4749
-TORAGS_PLATEBODY_NOTED = 4750
-TORAGS_PLATELEGS = 4751
-TORAGS_PLATELEGS_NOTED = 4752
-VERACS_HELM = 4753
-VERACS_HELM_NOTED = 4754
-VERACS_FLAIL = 4755
-VERACS_FLAIL_NOTED = 4756
-VERACS_BRASSARD = 4757
-VERACS_BRASSARD_NOTED = 4758
-VERACS_PLATESKIRT = 4759
-VERACS_PLATESKIRT_NOTED = 4760
-AMETHYST_BOLT_TIPS_4762 = 4762
-AMETHYST_ARROWP = 4763
-AMETHYST_ARROWP_4764 = 4764
-AMETHYST_ARROWP_4765 = 4765
-AMETHYST_ARROWP_4766 = 4766
-AMETHYST_BOLT_TIPS_4767 = 4767
-AMETHYST_BOLT_TIPS_4768 = 4768
-AMETHYST_ARROW = 4769
-AMETHYST_ARROW_4770 = 4770
-AMETHYST_ARROW_4771 = 4771
-AMETHYST_ARROW_4772 = 4772
-BRONZE_BRUTAL = 4773
-BRONZE_BRUTAL_4774 = 4774
-BRONZE_BRUTAL_4775 = 4775
-BRONZE_BRUTAL_4776 = 4776
-BRONZE_BRUTAL_4777 = 4777
-IRON_BRUTAL = 4778
-IRON_BRUTAL_4779 = 4779
-IRON_BRUTAL_4780 = 4780
-IRON_BRUTAL_4781 = 4781
-IRON_BRUTAL_4782 = 4782
-STEEL_BRUTAL = 4783
-STEEL_BRUTAL_4784 = 4784
-STEEL_BRUTAL_4785 = 4785
-STEEL_BRUTAL_4786 = 4786
-STEEL_BRUTAL_4787 = 4787
-BLACK_BRUTAL = 4788
-BLACK_BRUTAL_4789 = 4789
-BLACK_BRUTAL_4790 = 4790
-BLACK_BRUTAL_4791 = 4791
-BLACK_BRUTAL_4792 = 4792
-MITHRIL_BRUTAL = 4793
-MITHRIL_BRUTAL_4794 = 4794
-MITHRIL_BRUTAL_4795 = 4795
-MITHRIL_BRUTAL_4796 = 4796
-MITHRIL_BRUTAL_4797 = 4797
-ADAMANT_BRUTAL = 4798
-ADAMANT_BRUTAL_4799 = 4799
-ADAMANT_BRUTAL_4800 = 4800
-ADAMANT_BRUTAL_4801 = 4801
-ADAMANT_BRUTAL_4802 = 4802
-RUNE_BRUTAL = 4803
-RUNE_BRUTAL_4804 = 4804
-RUNE_BRUTAL_4805 = 4805
-RUNE_BRUTAL_4806 = 4806
-RUNE_BRUTAL_4807 = 4807
-BLACK_PRISM = 4808
-TORN_PAGE = 4809
-RUINED_BACKPACK = 4810
-DRAGON_INN_TANKARD = 4811
-ZOGRE_BONES = 4812
-ZOGRE_BONES_NOTED = 4813
-SITHIK_PORTRAIT = 4814
-SITHIK_PORTRAIT_4815 = 4815
-SIGNED_PORTRAIT = 4816
-BOOK_OF_PORTRAITURE = 4817
-OGRE_ARTEFACT = 4818
-BRONZE_NAILS = 4819
-IRON_NAILS = 4820
-BLACK_NAILS = 4821
-MITHRIL_NAILS = 4822
-ADAMANTITE_NAILS = 4823
-RUNE_NAILS = 4824
-UNSTRUNG_COMP_BOW = 4825
-UNSTRUNG_COMP_BOW_NOTED = 4826
-COMP_OGRE_BOW = 4827
-COMP_OGRE_BOW_NOTED = 4828
-BOOK_OF_HAM = 4829
-FAYRG_BONES = 4830
-FAYRG_BONES_NOTED = 4831
-RAURG_BONES = 4832
-RAURG_BONES_NOTED = 4833
-OURG_BONES = 4834
-OURG_BONES_NOTED = 4835
-STRANGE_POTION = 4836
-NECROMANCY_BOOK = 4837
-CUP_OF_TEA_4838 = 4838
-OGRE_GATE_KEY = 4839
-UNFINISHED_POTION_4840 = 4840
-UNFINISHED_POTION_NOTED_4841 = 4841
-RELICYMS_BALM4 = 4842
-RELICYMS_BALM4_NOTED = 4843
-RELICYMS_BALM3 = 4844
-RELICYMS_BALM3_NOTED = 4845
-RELICYMS_BALM2 = 4846
-RELICYMS_BALM2_NOTED = 4847
-RELICYMS_BALM1 = 4848
-RELICYMS_BALM1_NOTED = 4849
-OGRE_COFFIN_KEY = 4850
-OGRE_COFFIN_KEY_NOTED = 4851
-ZOGRE_BONEMEAL = 4852
-FAYRG_BONEMEAL = 4853
-RAURG_BONEMEAL = 4854
-OURG_BONEMEAL = 4855
-AHRIMS_HOOD_100 = 4856
-AHRIMS_HOOD_75 = 4857
-AHRIMS_HOOD_50 = 4858
-AHRIMS_HOOD_25 = 4859
-AHRIMS_HOOD_0 = 4860
-AHRIMS_HOOD_0_NOTED = 4861
-AHRIMS_STAFF_100 = 4862
-AHRIMS_STAFF_75 = 4863
-AHRIMS_STAFF_50 = 4864
-AHRIMS_STAFF_25 = 4865
-AHRIMS_STAFF_0 = 4866
-AHRIMS_STAFF_0_NOTED = 4867
-AHRIMS_ROBETOP_100 = 4868
-AHRIMS_ROBETOP_75 = 4869
-AHRIMS_ROBETOP_50 = 4870
-AHRIMS_ROBETOP_25 = 4871
-AHRIMS_ROBETOP_0 = 4872
-AHRIMS_ROBETOP_0_NOTED = 4873
-AHRIMS_ROBESKIRT_100 = 4874
-AHRIMS_ROBESKIRT_75 = 4875
-AHRIMS_ROBESKIRT_50 = 4876
-AHRIMS_ROBESKIRT_25 = 4877
-AHRIMS_ROBESKIRT_0 = 4878
-AHRIMS_ROBESKIRT_0_NOTED = 4879
-DHAROKS_HELM_100 = 4880
-DHAROKS_HELM_75 = 4881
-DHAROKS_HELM_50 = 4882
-DHAROKS_HELM_25 = 4883
-DHAROKS_HELM_0 = 4884
-DHAROKS_HELM_0_NOTED = 4885
-DHAROKS_GREATAXE_100 = 4886
-DHAROKS_GREATAXE_75 = 4887
-DHAROKS_GREATAXE_50 = 4888
-DHAROKS_GREATAXE_25 = 4889
-DHAROKS_GREATAXE_0 = 4890
-DHAROKS_GREATAXE_0_NOTED = 4891
-DHAROKS_PLATEBODY_100 = 4892
-DHAROKS_PLATEBODY_75 = 4893
-DHAROKS_PLATEBODY_50 = 4894
-DHAROKS_PLATEBODY_25 = 4895
-DHAROKS_PLATEBODY_0 = 4896
-DHAROKS_PLATEBODY_0_NOTED = 4897
-DHAROKS_PLATELEGS_100 = 4898
-DHAROKS_PLATELEGS_75 = 4899
-DHAROKS_PLATELEGS_50 = 4900
-DHAROKS_PLATELEGS_25 = 4901
-DHAROKS_PLATELEGS_0 = 4902
-DHAROKS_PLATELEGS_0_NOTED = 4903
-GUTHANS_HELM_100 = 4904
-GUTHANS_HELM_75 = 4905
-GUTHANS_HELM_50 = 4906
-GUTHANS_HELM_25 = 4907
-GUTHANS_HELM_0 = 4908
-GUTHANS_HELM_0_NOTED = 4909
-GUTHANS_WARSPEAR_100 = 4910
-GUTHANS_WARSPEAR_75 = 4911
-GUTHANS_WARSPEAR_50 = 4912
-GUTHANS_WARSPEAR_25 = 4913
-GUTHANS_WARSPEAR_0 = 4914
-GUTHANS_WARSPEAR_0_NOTED = 4915
-GUTHANS_PLATEBODY_100 = 4916
-GUTHANS_PLATEBODY_75 = 4917
-GUTHANS_PLATEBODY_50 = 4918
-GUTHANS_PLATEBODY_25 = 4919
-GUTHANS_PLATEBODY_0 = 4920
-GUTHANS_PLATEBODY_0_NOTED = 4921
-GUTHANS_CHAINSKIRT_100 = 4922
-GUTHANS_CHAINSKIRT_75 = 4923
-GUTHANS_CHAINSKIRT_50 = 4924
-GUTHANS_CHAINSKIRT_25 = 4925
-GUTHANS_CHAINSKIRT_0 = 4926
-GUTHANS_CHAINSKIRT_0_NOTED = 4927
-KARILS_COIF_100 = 4928
-KARILS_COIF_75 = 4929
-KARILS_COIF_50 = 4930
-KARILS_COIF_25 = 4931
-KARILS_COIF_0 = 4932
-KARILS_COIF_0_NOTED = 4933
-KARILS_CROSSBOW_100 = 4934
-KARILS_CROSSBOW_75 = 4935
-KARILS_CROSSBOW_50 = 4936
-KARILS_CROSSBOW_25 = 4937
-KARILS_CROSSBOW_0 = 4938
-KARILS_CROSSBOW_0_NOTED = 4939
-KARILS_LEATHERTOP_100 = 4940
-KARILS_LEATHERTOP_75 = 4941
-KARILS_LEATHERTOP_50 = 4942
-KARILS_LEATHERTOP_25 = 4943
-KARILS_LEATHERTOP_0 = 4944
-KARILS_LEATHERTOP_0_NOTED = 4945
-KARILS_LEATHERSKIRT_100 = 4946
-KARILS_LEATHERSKIRT_75 = 4947
-KARILS_LEATHERSKIRT_50 = 4948
-KARILS_LEATHERSKIRT_25 = 4949
-KARILS_LEATHERSKIRT_0 = 4950
-KARILS_LEATHERSKIRT_0_NOTED = 4951
-TORAGS_HELM_100 = 4952
-TORAGS_HELM_75 = 4953
-TORAGS_HELM_50 = 4954
-TORAGS_HELM_25 = 4955
-TORAGS_HELM_0 = 4956
-TORAGS_HELM_0_NOTED = 4957
-TORAGS_HAMMERS_100 = 4958
-TORAGS_HAMMERS_75 = 4959
-TORAGS_HAMMERS_50 = 4960
-TORAGS_HAMMERS_25 = 4961
-TORAGS_HAMMERS_0 = 4962
-TORAGS_HAMMERS_0_NOTED = 4963
-TORAGS_PLATEBODY_100 = 4964
-TORAGS_PLATEBODY_75 = 4965
-TORAGS_PLATEBODY_50 = 4966
-TORAGS_PLATEBODY_25 = 4967
-TORAGS_PLATEBODY_0 = 4968
-TORAGS_PLATEBODY_0_NOTED = 4969
-TORAGS_PLATELEGS_100 = 4970
-TORAGS_PLATELEGS_75 = 4971
-TORAGS_PLATELEGS_50 = 4972
-TORAGS_PLATELEGS_25 = 4973
-TORAGS_PLATELEGS_0 = 4974
-TORAGS_PLATELEGS_0_NOTED = 4975
-VERACS_HELM_100 = 4976
-VERACS_HELM_75 = 4977
-VERACS_HELM_50 = 4978
-VERACS_HELM_25 = 4979
-VERACS_HELM_0 = 4980
-VERACS_HELM_0_NOTED = 4981
-VERACS_FLAIL_100 = 4982
-VERACS_FLAIL_75 = 4983
-VERACS_FLAIL_50 = 4984
-VERACS_FLAIL_25 = 4985
-VERACS_FLAIL_0 = 4986
-VERACS_FLAIL_0_NOTED = 4987
-VERACS_BRASSARD_100 = 4988
-VERACS_BRASSARD_75 = 4989
-VERACS_BRASSARD_50 = 4990
-VERACS_BRASSARD_25 = 4991
-VERACS_BRASSARD_0 = 4992
-VERACS_BRASSARD_0_NOTED = 4993
-VERACS_PLATESKIRT_100 = 4994
-VERACS_PLATESKIRT_75 = 4995
-VERACS_PLATESKIRT_50 = 4996
-VERACS_PLATESKIRT_25 = 4997
-VERACS_PLATESKIRT_0 = 4998
-VERACS_PLATESKIRT_0_NOTED = 4999
-RAW_CAVE_EEL = 5001
-BURNT_CAVE_EEL = 5002
-CAVE_EEL = 5003
-FROG_SPAWN = 5004
-RAW_CAVE_EEL_NOTED = 5005
-BURNT_CAVE_EEL_NOTED = 5006
-CAVE_EEL_NOTED = 5007
-BROOCH = 5008
-GOBLIN_SYMBOL_BOOK = 5009
-KEY_5010 = 5010
-SILVERWARE = 5011
-PEACE_TREATY = 5012
-MINING_HELMET = 5013
-MINING_HELMET_5014 = 5014
-MINING_HELMET_NOTED = 5015
-BONE_SPEAR = 5016
-BONE_SPEAR_NOTED = 5017
-BONE_CLUB = 5018
-BONE_CLUB_NOTED = 5019
-MINECART_TICKET = 5020
-MINECART_TICKET_5021 = 5021
-MINECART_TICKET_5022 = 5022
-MINECART_TICKET_5023 = 5023
-WOVEN_TOP = 5024
-WOVEN_TOP_NOTED = 5025
-WOVEN_TOP_5026 = 5026
-WOVEN_TOP_NOTED_5027 = 5027
-WOVEN_TOP_5028 = 5028
-WOVEN_TOP_NOTED_5029 = 5029
-SHIRT = 5030
-SHIRT_NOTED = 5031
-SHIRT_5032 = 5032
-SHIRT_NOTED_5033 = 5033
-SHIRT_5034 = 5034
-SHIRT_NOTED_5035 = 5035
-TROUSERS = 5036
-TROUSERS_NOTED = 5037
-TROUSERS_5038 = 5038
-TROUSERS_NOTED_5039 = 5039
-TROUSERS_5040 = 5040
-TROUSERS_NOTED_5041 = 5041
-SHORTS = 5042
-SHORTS_NOTED = 5043
-SHORTS_5044 = 5044
-SHORTS_NOTED_5045 = 5045
-SHORTS_5046 = 5046
-SHORTS_NOTED_5047 = 5047
-SKIRT = 5048
-SKIRT_NOTED = 5049
-SKIRT_5050 = 5050
-SKIRT_NOTED_5051 = 5051
-SKIRT_5052 = 5052
-SKIRT_NOTED_5053 = 5053
-DWARF = 5054
-DWARF_NOTED = 5055
-DWARVEN_BATTLEAXE = 5056
-DWARVEN_BATTLEAXE_5057 = 5057
-DWARVEN_BATTLEAXE_5058 = 5058
-DWARVEN_BATTLEAXE_5059 = 5059
-DWARVEN_BATTLEAXE_5060 = 5060
-DWARVEN_BATTLEAXE_5061 = 5061
-LEFT_BOOT = 5062
-RIGHT_BOOT = 5063
-EXQUISITE_BOOTS = 5064
-BOOK_ON_COSTUMES = 5065
-MEETING_NOTES = 5066
-EXQUISITE_CLOTHES = 5067
-MASTER_FARMER = 5068
-UNFINISHED_BROAD_BOLTS_5069 = 5069
-BIRD_NEST = 5070
-BIRD_NEST_5071 = 5071
-BIRD_NEST_5072 = 5072
-BIRD_NEST_5073 = 5073
-BIRD_NEST_5074 = 5074
-BIRD_NEST_5075 = 5075
-BIRDS_EGG = 5076
-BIRDS_EGG_5077 = 5077
-BIRDS_EGG_5078 = 5078
-VARROCK_ARMOUR = 5087
-SEA_SNAKE = 5089
-MORYTANIA_LEGS = 5093
-EXPLORERS_RING = 5095
-MARIGOLD_SEED = 5096
-ROSEMARY_SEED = 5097
-NASTURTIUM_SEED = 5098
-WOAD_SEED = 5099
-LIMPWURT_SEED = 5100
-REDBERRY_SEED = 5101
-CADAVABERRY_SEED = 5102
-DWELLBERRY_SEED = 5103
-JANGERBERRY_SEED = 5104
-WHITEBERRY_SEED = 5105
-POISON_IVY_SEED = 5106
-YEW_SEED = 5107
-YEW_SEED_5108 = 5108
-YEW_SEED_5109 = 5109
-YEW_SEED_5110 = 5110
-ACORN = 5111
-ACORN_5112 = 5112
-ACORN_5113 = 5113
-ACORN_5114 = 5114
-WILLOW_SEED = 5115
-WILLOW_SEED_5116 = 5116
-WILLOW_SEED_5117 = 5117
-WILLOW_SEED_5118 = 5118
-MAPLE_SEED = 5119
-MAPLE_SEED_5120 = 5120
-MAPLE_SEED_5121 = 5121
-MAPLE_SEED_5122 = 5122
-MAGIC_SEED = 5123
-MAGIC_SEED_5124 = 5124
-MAGIC_SEED_5125 = 5125
-MAGIC_SEED_5126 = 5126
-SPIRIT_SEED = 5127
-SPIRIT_SEED_5128 = 5128
-SPIRIT_SEED_5129 = 5129
-SPIRIT_SEED_5130 = 5130
-MARIGOLD_SEED_5131 = 5131
-MARIGOLD_SEED_5132 = 5132
-MARIGOLD_SEED_5133 = 5133
-MARIGOLD_SEED_5134 = 5134
-ROSEMARY_SEED_5135 = 5135
-ROSEMARY_SEED_5136 = 5136
-ROSEMARY_SEED_5137 = 5137
-ROSEMARY_SEED_5138 = 5138
-SWEETCORN_SEED = 5139
-SWEETCORN_SEED_5140 = 5140
-SWEETCORN_SEED_5141 = 5141
-SWEETCORN_SEED_5142 = 5142
-WATERMELON_SEED = 5143
-WATERMELON_SEED_5144 = 5144
-WATERMELON_SEED_5145 = 5145
-WATERMELON_SEED_5146 = 5146
-STRAWBERRY_SEED = 5147
-STRAWBERRY_SEED_5148 = 5148
-STRAWBERRY_SEED_5149 = 5149
-STRAWBERRY_SEED_5150 = 5150
-TOMATO_SEED = 5151
-TOMATO_SEED_5152 = 5152
-TOMATO_SEED_5153 = 5153
-TOMATO_SEED_5154 = 5154
-CABBAGE_SEED = 5155
-CABBAGE_SEED_5156 = 5156
-CABBAGE_SEED_5157 = 5157
-CABBAGE_SEED_5158 = 5158
-ONION_SEED = 5159
-ONION_SEED_5160 = 5160
-ONION_SEED_5161 = 5161
-ONION_SEED_5162 = 5162
-POTATO_SEED = 5163
-POTATO_SEED_5164 = 5164
-POTATO_SEED_5165 = 5165
-POTATO_SEED_5166 = 5166
-BARLEY_SEED = 5167
-BARLEY_SEED_5168 = 5168
-BARLEY_SEED_5169 = 5169
-BARLEY_SEED_5170 = 5170
-SEEDS = 5171
-JUTE_SEED = 5172
-JUTE_SEED_5173 = 5173
-JUTE_SEED_5174 = 5174
-JUTE_SEED_5175 = 5175
-HAMMERSTONE_SEED = 5176
-HAMMERSTONE_SEED_5177 = 5177
-HAMMERSTONE_SEED_5178 = 5178
-HAMMERSTONE_SEED_5179 = 5179
-ASGARNIAN_SEED = 5180
-ASGARNIAN_SEED_5181 = 5181
-ASGARNIAN_SEED_5182 = 5182
-ASGARNIAN_SEED_5183 = 5183
-YANILLIAN_SEED = 5184
-YANILLIAN_SEED_5185 = 5185
-YANILLIAN_SEED_5186 = 5186
-YANILLIAN_SEED_5187 = 5187
-KRANDORIAN_SEED = 5188
-KRANDORIAN_SEED_5189 = 5189
-KRANDORIAN_SEED_5190 = 5190
-KRANDORIAN_SEED_5191 = 5191
-WILDBLOOD_SEED = 5192
-WILDBLOOD_SEED_5193 = 5193
-WILDBLOOD_SEED_5194 = 5194
-WILDBLOOD_SEED_5195 = 5195
-NASTURTIUM_SEED_5196 = 5196
-NASTURTIUM_SEED_5197 = 5197
-NASTURTIUM_SEED_5198 = 5198
-NASTURTIUM_SEED_5199 = 5199
-WOAD_SEED_5200 = 5200
-WOAD_SEED_5201 = 5201
-WOAD_SEED_5202 = 5202
-WOAD_SEED_5203 = 5203
-REDBERRY_SEED_5204 = 5204
-REDBERRY_SEED_5205 = 5205
-REDBERRY_SEED_5206 = 5206
-REDBERRY_SEED_5207 = 5207
-CADAVABERRY_SEED_5208 = 5208
-CADAVABERRY_SEED_5209 = 5209
-CADAVABERRY_SEED_5210 = 5210
-CADAVABERRY_SEED_5211 = 5211
-DWELLBERRY_SEED_5212 = 5212
-DWELLBERRY_SEED_5213 = 5213
-DWELLBERRY_SEED_5214 = 5214
-DWELLBERRY_SEED_5215 = 5215
-JANGERBERRY_SEED_5216 = 5216
-JANGERBERRY_SEED_5217 = 5217
-JANGERBERRY_SEED_5218 = 5218
-JANGERBERRY_SEED_5219 = 5219
-WHITEBERRY_SEED_5220 = 5220
-WHITEBERRY_SEED_5221 = 5221
-WHITEBERRY_SEED_5222 = 5222
-WHITEBERRY_SEED_5223 = 5223
-GUAM_SEED = 5224
-GUAM_SEED_5225 = 5225
-GUAM_SEED_5226 = 5226
-GUAM_SEED_5227 = 5227
-APPLE_TREE_SEED = 5228
-APPLE_TREE_SEED_5229 = 5229
-APPLE_TREE_SEED_5230 = 5230
-APPLE_TREE_SEED_5231 = 5231
-BANANA_TREE_SEED = 5232
-BANANA_TREE_SEED_5233 = 5233
-BANANA_TREE_SEED_5234 = 5234
-BANANA_TREE_SEED_5235 = 5235
-ORANGE_TREE_SEED = 5236
-ORANGE_TREE_SEED_5237 = 5237
-ORANGE_TREE_SEED_5238 = 5238
-ORANGE_TREE_SEED_5239 = 5239
-CURRY_TREE_SEED = 5240
-CURRY_TREE_SEED_5241 = 5241
-CURRY_TREE_SEED_5242 = 5242
-CURRY_TREE_SEED_5243 = 5243
-PINEAPPLE_SEED = 5244
-PINEAPPLE_SEED_5245 = 5245
-PINEAPPLE_SEED_5246 = 5246
-PINEAPPLE_SEED_5247 = 5247
-PAPAYA_TREE_SEED = 5248
-PAPAYA_TREE_SEED_5249 = 5249
-PAPAYA_TREE_SEED_5250 = 5250
-PAPAYA_TREE_SEED_5251 = 5251
-PALM_TREE_SEED = 5252
-PALM_TREE_SEED_5253 = 5253
-PALM_TREE_SEED_5254 = 5254
-PALM_TREE_SEED_5255 = 5255
-CALQUAT_TREE_SEED = 5256
-CALQUAT_TREE_SEED_5257 = 5257
-CALQUAT_TREE_SEED_5258 = 5258
-CALQUAT_TREE_SEED_5259 = 5259
-MUSHROOM_SPORE = 5260
-MUSHROOM_SPORE_5261 = 5261
-MUSHROOM_SPORE_5262 = 5262
-MUSHROOM_SPORE_5263 = 5263
-CACTUS_SEED = 5264
-CACTUS_SEED_5265 = 5265
-CACTUS_SEED_5266 = 5266
-CACTUS_SEED_5267 = 5267
-LIMPWURT_SEED_5268 = 5268
-LIMPWURT_SEED_5269 = 5269
-LIMPWURT_SEED_5270 = 5270
-LIMPWURT_SEED_5271 = 5271
-BELLADONNA_SEED = 5272
-BELLADONNA_SEED_5273 = 5273
-BELLADONNA_SEED_5274 = 5274
-BELLADONNA_SEED_5275 = 5275
-WOAD_LEAF_5276 = 5276
-WOAD_LEAF_5277 = 5277
-WOAD_LEAF_5278 = 5278
-WOAD_LEAF_5279 = 5279
-CACTUS_SEED_5280 = 5280
-BELLADONNA_SEED_5281 = 5281
-MUSHROOM_SPORE_5282 = 5282
-APPLE_TREE_SEED_5283 = 5283
-BANANA_TREE_SEED_5284 = 5284
-ORANGE_TREE_SEED_5285 = 5285
-CURRY_TREE_SEED_5286 = 5286
-PINEAPPLE_SEED_5287 = 5287
-PAPAYA_TREE_SEED_5288 = 5288
-PALM_TREE_SEED_5289 = 5289
-CALQUAT_TREE_SEED_5290 = 5290
-GUAM_SEED_5291 = 5291
-MARRENTILL_SEED = 5292
-TARROMIN_SEED = 5293
-HARRALANDER_SEED = 5294
-RANARR_SEED = 5295
-TOADFLAX_SEED = 5296
-IRIT_SEED = 5297
-AVANTOE_SEED = 5298
-KWUARM_SEED = 5299
-SNAPDRAGON_SEED = 5300
-CADANTINE_SEED = 5301
-LANTADYME_SEED = 5302
-DWARF_WEED_SEED = 5303
-TORSTOL_SEED = 5304
-BARLEY_SEED_5305 = 5305
-JUTE_SEED_5306 = 5306
-HAMMERSTONE_SEED_5307 = 5307
-ASGARNIAN_SEED_5308 = 5308
-YANILLIAN_SEED_5309 = 5309
-KRANDORIAN_SEED_5310 = 5310
-WILDBLOOD_SEED_5311 = 5311
-ACORN_5312 = 5312
-WILLOW_SEED_5313 = 5313
-MAPLE_SEED_5314 = 5314
-YEW_SEED_5315 = 5315
-MAGIC_SEED_5316 = 5316
-SPIRIT_SEED_5317 = 5317
-POTATO_SEED_5318 = 5318
-ONION_SEED_5319 = 5319
-SWEETCORN_SEED_5320 = 5320
-WATERMELON_SEED_5321 = 5321
-TOMATO_SEED_5322 = 5322
-STRAWBERRY_SEED_5323 = 5323
-CABBAGE_SEED_5324 = 5324
-GARDENING_TROWEL = 5325
-GARDENING_TROWEL_NOTED = 5326
-SPADE_HANDLE = 5327
-SPADE_HEAD = 5328
-SECATEURS = 5329
-SECATEURS_NOTED = 5330
-WATERING_CAN = 5331
-WATERING_CAN_NOTED = 5332
-WATERING_CAN1 = 5333
-WATERING_CAN2 = 5334
-WATERING_CAN3 = 5335
-WATERING_CAN4 = 5336
-WATERING_CAN5 = 5337
-WATERING_CAN6 = 5338
-WATERING_CAN7 = 5339
-WATERING_CAN8 = 5340
-RAKE = 5341
-RAKE_NOTED = 5342
-SEED_DIBBER = 5343
-SEED_DIBBER_NOTED = 5344
-GARDENING_BOOTS = 5345
-GARDENING_BOOTS_NOTED = 5346
-RAKE_HANDLE = 5347
-RAKE_HEAD = 5348
-SMOKE_DEVIL = 5349
-EMPTY_PLANT_POT = 5350
-EMPTY_PLANT_POT_NOTED = 5351
-UNFIRED_PLANT_POT = 5352
-UNFIRED_PLANT_POT_NOTED = 5353
-FILLED_PLANT_POT = 5354
-FILLED_PLANT_POT_NOTED = 5355
-PLANT_POT = 5356
-PLANT_POT_NOTED = 5357
-OAK_SEEDLING = 5358
-WILLOW_SEEDLING = 5359
-MAPLE_SEEDLING = 5360
-YEW_SEEDLING = 5361
-MAGIC_SEEDLING = 5362
-SPIRIT_SEEDLING = 5363
-OAK_SEEDLING_W = 5364
-WILLOW_SEEDLING_W = 5365
-MAPLE_SEEDLING_W = 5366
-YEW_SEEDLING_W = 5367
-MAGIC_SEEDLING_W = 5368
-SPIRIT_SEEDLING_W = 5369
-OAK_SAPLING = 5370
-WILLOW_SAPLING = 5371
-MAPLE_SAPLING = 5372
-YEW_SAPLING = 5373
-MAGIC_SAPLING = 5374
-SPIRIT_SAPLING = 5375
-BASKET = 5376
-BASKET_NOTED = 5377
-APPLES1 = 5378
-APPLES1_NOTED = 5379
-APPLES2 = 5380
-APPLES2_NOTED = 5381
-APPLES3 = 5382
-APPLES3_NOTED = 5383
-APPLES4 = 5384
-APPLES4_NOTED = 5385
-APPLES5 = 5386
-APPLES5_NOTED = 5387
-ORANGES1 = 5388
-ORANGES1_NOTED = 5389
-ORANGES2 = 5390
-ORANGES2_NOTED = 5391
-ORANGES3 = 5392
-ORANGES3_NOTED = 5393
-ORANGES4 = 5394
-ORANGES4_NOTED = 5395
-ORANGES5 = 5396
-ORANGES5_NOTED = 5397
-STRAWBERRIES1 = 5398
-STRAWBERRIES1_NOTED = 5399
-STRAWBERRIES2 = 5400
-STRAWBERRIES2_NOTED = 5401
-STRAWBERRIES3 = 5402
-STRAWBERRIES3_NOTED = 5403
-STRAWBERRIES4 = 5404
-STRAWBERRIES4_NOTED = 5405
-STRAWBERRIES5 = 5406
-STRAWBERRIES5_NOTED = 5407
-BANANAS1 = 5408
-BANANAS1_NOTED = 5409
-BANANAS2 = 5410
-BANANAS2_NOTED = 5411
-BANANAS3 = 5412
-BANANAS3_NOTED = 5413
-BANANAS4 = 5414
-BANANAS4_NOTED = 5415
-BANANAS5 = 5416
-BANANAS5_NOTED = 5417
-EMPTY_SACK = 5418
-EMPTY_SACK_NOTED = 5419
-POTATOES1 = 5420
-POTATOES1_NOTED = 5421
-POTATOES2 = 5422
-POTATOES2_NOTED = 5423
-POTATOES3 = 5424
-POTATOES3_NOTED = 5425
-POTATOES4 = 5426
-POTATOES4_NOTED = 5427
-POTATOES5 = 5428
-POTATOES5_NOTED = 5429
-POTATOES6 = 5430
-POTATOES6_NOTED = 5431
-POTATOES7 = 5432
-POTATOES7_NOTED = 5433
-POTATOES8 = 5434
-POTATOES8_NOTED = 5435
-POTATOES9 = 5436
-POTATOES9_NOTED = 5437
-POTATOES10 = 5438
-POTATOES10_NOTED = 5439
-ONIONS1 = 5440
-ONIONS1_NOTED = 5441
-ONIONS2 = 5442
-ONIONS2_NOTED = 5443
-ONIONS3 = 5444
-ONIONS3_NOTED = 5445
-ONIONS4 = 5446
-ONIONS4_NOTED = 5447
-ONIONS5 = 5448
-ONIONS5_NOTED = 5449
-ONIONS6 = 5450
-ONIONS6_NOTED = 5451
-ONIONS7 = 5452
-ONIONS7_NOTED = 5453
-ONIONS8 = 5454
-ONIONS8_NOTED = 5455
-ONIONS9 = 5456
-ONIONS9_NOTED = 5457
-ONIONS10 = 5458
-ONIONS10_NOTED = 5459
-CABBAGES1 = 5460
-CABBAGES1_NOTED = 5461
-CABBAGES2 = 5462
-CABBAGES2_NOTED = 5463
-CABBAGES3 = 5464
-CABBAGES3_NOTED = 5465
-CABBAGES4 = 5466
-CABBAGES4_NOTED = 5467
-CABBAGES5 = 5468
-CABBAGES5_NOTED = 5469
-CABBAGES6 = 5470
-CABBAGES6_NOTED = 5471
-CABBAGES7 = 5472
-CABBAGES7_NOTED = 5473
-CABBAGES8 = 5474
-CABBAGES8_NOTED = 5475
-CABBAGES9 = 5476
-CABBAGES9_NOTED = 5477
-CABBAGES10 = 5478
-CABBAGES10_NOTED = 5479
-APPLE_SEEDLING = 5480
-BANANA_SEEDLING = 5481
-ORANGE_SEEDLING = 5482
-CURRY_SEEDLING = 5483
-PINEAPPLE_SEEDLING = 5484
-PAPAYA_SEEDLING = 5485
-PALM_SEEDLING = 5486
-CALQUAT_SEEDLING = 5487
-APPLE_SEEDLING_W = 5488
-BANANA_SEEDLING_W = 5489
-ORANGE_SEEDLING_W = 5490
-CURRY_SEEDLING_W = 5491
-PINEAPPLE_SEEDLING_W = 5492
-PAPAYA_SEEDLING_W = 5493
-PALM_SEEDLING_W = 5494
-CALQUAT_SEEDLING_W = 5495
-APPLE_SAPLING = 5496
-BANANA_SAPLING = 5497
-ORANGE_SAPLING = 5498
-CURRY_SAPLING = 5499
-PINEAPPLE_SAPLING = 5500
-PAPAYA_SAPLING = 5501
-PALM_SAPLING = 5502
-CALQUAT_SAPLING = 5503
-STRAWBERRY = 5504
-STRAWBERRY_NOTED = 5505
-OLD_MANS_MESSAGE = 5506
-STRANGE_BOOK = 5507
-BOOK_OF_FOLKLORE = 5508
-SMALL_POUCH = 5509
-MEDIUM_POUCH = 5510
-MEDIUM_POUCH_5511 = 5511
-LARGE_POUCH = 5512
-LARGE_POUCH_5513 = 5513
-GIANT_POUCH = 5514
-GIANT_POUCH_5515 = 5515
-ELEMENTAL_TALISMAN = 5516
-ELEMENTAL_TALISMAN_NOTED = 5517
-SCRYING_ORB = 5518
-SCRYING_ORB_5519 = 5519
-ABYSSAL_BOOK = 5520
-BINDING_NECKLACE = 5521
-BINDING_NECKLACE_NOTED = 5522
-TIARA_MOULD = 5523
-TIARA_MOULD_NOTED = 5524
-TIARA = 5525
-TIARA_NOTED = 5526
-AIR_TIARA = 5527
-AIR_TIARA_NOTED = 5528
-MIND_TIARA = 5529
-MIND_TIARA_NOTED = 5530
-WATER_TIARA = 5531
-WATER_TIARA_NOTED = 5532
-BODY_TIARA = 5533
-BODY_TIARA_NOTED = 5534
-EARTH_TIARA = 5535
-EARTH_TIARA_NOTED = 5536
-FIRE_TIARA = 5537
-FIRE_TIARA_NOTED = 5538
-COSMIC_TIARA = 5539
-COSMIC_TIARA_NOTED = 5540
-NATURE_TIARA = 5541
-NATURE_TIARA_NOTED = 5542
-CHAOS_TIARA = 5543
-CHAOS_TIARA_NOTED = 5544
-LAW_TIARA = 5545
-NULL_5546 = 5546
-DEATH_TIARA = 5547
-DEATH_TIARA_NOTED = 5548
-BLOOD_TIARA = 5549
-BLOOD_TIARA_NOTED = 5550
-NULL_5551 = 5551
-NULL_5552 = 5552
-ROGUE_TOP = 5553
-ROGUE_MASK = 5554
-ROGUE_TROUSERS = 5555
-ROGUE_GLOVES = 5556
-ROGUE_BOOTS = 5557
-ROGUE_KIT = 5558
-FLASH_POWDER = 5559
-STETHOSCOPE = 5560
-MYSTIC_JEWEL = 5561
-GEAR = 5562
-GEAR_5563 = 5563
-GEAR_5564 = 5564
-GEAR_5565 = 5565
-GEAR_5566 = 5566
-GEAR_5567 = 5567
-TILE_5568 = 5568
-TILES = 5569
-TILES_5570 = 5570
-TILES_5571 = 5571
-NULL_5572 = 5572
-DESERT_AMULET = 5573
-INITIATE_SALLET = 5574
-INITIATE_HAUBERK = 5575
-INITIATE_CUISSE = 5576
-CUPRIC_SULFATE = 5577
-ACETIC_ACID = 5578
-GYPSUM = 5579
-SODIUM_CHLORIDE = 5580
-NITROUS_OXIDE = 5581
-VIAL_OF_LIQUID = 5582
-TIN_ORE_POWDER = 5583
-CUPRIC_ORE_POWDER = 5584
-BRONZE_KEY_5585 = 5585
-METAL_SPADE = 5586
-METAL_SPADE_5587 = 5587
-ALCHEMICAL_NOTES = 5588
-_MIXTURE = 5589
-_MIXTURE_5590 = 5590
-_MIXTURE_5591 = 5591
-TIN = 5592
-TIN_5593 = 5593
-TIN_5594 = 5594
-TIN_5595 = 5595
-TIN_5596 = 5596
-TIN_5597 = 5597
-TIN_5598 = 5598
-TIN_5599 = 5599
-TIN_5600 = 5600
-CHISEL_5601 = 5601
-BRONZE_WIRE_5602 = 5602
-SHEARS_5603 = 5603
-MAGNET_5604 = 5604
-KNIFE_5605 = 5605
-NULL_5606 = 5606
-GRAIN_5607 = 5607
-FOX = 5608
-CHICKEN = 5609
-HOURGLASS = 5610
-INITIATE_SALLET_NOTED = 5611
-INITIATE_HAUBERK_NOTED = 5612
-INITIATE_CUISSE_NOTED = 5613
-MAGIC_CARPET = 5614
-SHAIKAHAN_BONEMEAL = 5615
-BRONZE_ARROWP_5616 = 5616
-IRON_ARROWP_5617 = 5617
-STEEL_ARROWP_5618 = 5618
-MITHRIL_ARROWP_5619 = 5619
-ADAMANT_ARROWP_5620 = 5620
-RUNE_ARROWP_5621 = 5621
-BRONZE_ARROWP_5622 = 5622
-IRON_ARROWP_5623 = 5623
-STEEL_ARROWP_5624 = 5624
-MITHRIL_ARROWP_5625 = 5625
-ADAMANT_ARROWP_5626 = 5626
-RUNE_ARROWP_5627 = 5627
-BRONZE_DARTP_5628 = 5628
-IRON_DARTP = 5629
-STEEL_DARTP_5630 = 5630
-BLACK_DARTP_5631 = 5631
-MITHRIL_DARTP_5632 = 5632
-ADAMANT_DARTP_5633 = 5633
-RUNE_DARTP_5634 = 5634
-BRONZE_DARTP_5635 = 5635
-IRON_DARTP_5636 = 5636
-STEEL_DARTP_5637 = 5637
-BLACK_DARTP_5638 = 5638
-MITHRIL_DARTP_5639 = 5639
-ADAMANT_DARTP_5640 = 5640
-RUNE_DARTP_5641 = 5641
-BRONZE_JAVELINP_5642 = 5642
-IRON_JAVELINP_5643 = 5643
-STEEL_JAVELINP_5644 = 5644
-MITHRIL_JAVELINP_5645 = 5645
-ADAMANT_JAVELINP_5646 = 5646
-RUNE_JAVELINP_5647 = 5647
-BRONZE_JAVELINP_5648 = 5648
-IRON_JAVELINP_5649 = 5649
-STEEL_JAVELINP_5650 = 5650
-MITHRIL_JAVELINP_5651 = 5651
-ADAMANT_JAVELINP_5652 = 5652
-RUNE_JAVELINP_5653 = 5653
-BRONZE_KNIFEP_5654 = 5654
-IRON_KNIFEP_5655 = 5655
-STEEL_KNIFEP_5656 = 5656
-MITHRIL_KNIFEP_5657 = 5657
-BLACK_KNIFEP_5658 = 5658
-ADAMANT_KNIFEP_5659 = 5659
-RUNE_KNIFEP_5660 = 5660
-BRONZE_KNIFEP_5661 = 5661
-IRON_KNIFEP_5662 = 5662
-STEEL_KNIFEP_5663 = 5663
-MITHRIL_KNIFEP_5664 = 5664
-BLACK_KNIFEP_5665 = 5665
-ADAMANT_KNIFEP_5666 = 5666
-RUNE_KNIFEP_5667 = 5667
-IRON_DAGGERP_5668 = 5668
-IRON_DAGGERP_NOTED_5669 = 5669
-BRONZE_DAGGERP_5670 = 5670
-BRONZE_DAGGERP_NOTED_5671 = 5671
-STEEL_DAGGERP_5672 = 5672
-STEEL_DAGGERP_NOTED_5673 = 5673
-MITHRIL_DAGGERP_5674 = 5674
-MITHRIL_DAGGERP_NOTED_5675 = 5675
-ADAMANT_DAGGERP_5676 = 5676
-ADAMANT_DAGGERP_NOTED_5677 = 5677
-RUNE_DAGGERP_5678 = 5678
-RUNE_DAGGERP_NOTED_5679 = 5679
-DRAGON_DAGGERP_5680 = 5680
-DRAGON_DAGGERP_NOTED_5681 = 5681
-BLACK_DAGGERP_5682 = 5682
-BLACK_DAGGERP_NOTED_5683 = 5683
-POISON_DAGGERP = 5684
-POISON_DAGGERP_NOTED = 5685
-IRON_DAGGERP_5686 = 5686
-IRON_DAGGERP_NOTED_5687 = 5687
-BRONZE_DAGGERP_5688 = 5688
-BRONZE_DAGGERP_NOTED_5689 = 5689
-STEEL_DAGGERP_5690 = 5690
-STEEL_DAGGERP_NOTED_5691 = 5691
-MITHRIL_DAGGERP_5692 = 5692
-MITHRIL_DAGGERP_NOTED_5693 = 5693
-ADAMANT_DAGGERP_5694 = 5694
-ADAMANT_DAGGERP_NOTED_5695 = 5695
-RUNE_DAGGERP_5696 = 5696
-RUNE_DAGGERP_NOTED_5697 = 5697
-DRAGON_DAGGERP_5698 = 5698
-DRAGON_DAGGERP_NOTED_5699 = 5699
-BLACK_DAGGERP_5700 = 5700
-BLACK_DAGGERP_NOTED_5701 = 5701
-POISON_DAGGERP_5702 = 5702
-POISON_DAGGERP_NOTED_5703 = 5703
-BRONZE_SPEARP_5704 = 5704
-BRONZE_SPEARP_NOTED_5705 = 5705
-IRON_SPEARP_5706 = 5706
-IRON_SPEARP_NOTED_5707 = 5707
-STEEL_SPEARP_5708 = 5708
-STEEL_SPEARP_NOTED_5709 = 5709
-MITHRIL_SPEARP_5710 = 5710
-MITHRIL_SPEARP_NOTED_5711 = 5711
-ADAMANT_SPEARP_5712 = 5712
-ADAMANT_SPEARP_NOTED_5713 = 5713
-RUNE_SPEARP_5714 = 5714
-RUNE_SPEARP_NOTED_5715 = 5715
-DRAGON_SPEARP_5716 = 5716
-DRAGON_SPEARP_NOTED_5717 = 5717
-BRONZE_SPEARP_5718 = 5718
-BRONZE_SPEARP_NOTED_5719 = 5719
-IRON_SPEARP_5720 = 5720
-IRON_SPEARP_NOTED_5721 = 5721
-STEEL_SPEARP_5722 = 5722
-STEEL_SPEARP_NOTED_5723 = 5723
-MITHRIL_SPEARP_5724 = 5724
-MITHRIL_SPEARP_NOTED_5725 = 5725
-ADAMANT_SPEARP_5726 = 5726
-ADAMANT_SPEARP_NOTED_5727 = 5727
-RUNE_SPEARP_5728 = 5728
-RUNE_SPEARP_NOTED_5729 = 5729
-DRAGON_SPEARP_5730 = 5730
-DRAGON_SPEARP_NOTED_5731 = 5731
-STOOL_5732 = 5732
-ROTTEN_POTATO = 5733
-BLACK_SPEARP_5734 = 5734
-BLACK_SPEARP_NOTED_5735 = 5735
-BLACK_SPEARP_5736 = 5736
-BLACK_SPEARP_NOTED_5737 = 5737
-WOAD_LEAF_5738 = 5738
-ASGARNIAN_ALEM = 5739
-ASGARNIAN_ALEM_NOTED = 5740
-MATURE_WMB = 5741
-MATURE_WMB_NOTED = 5742
-GREENMANS_ALEM = 5743
-GREENMANS_ALEM_NOTED = 5744
-DRAGON_BITTERM = 5745
-DRAGON_BITTERM_NOTED = 5746
-DWARVEN_STOUTM = 5747
-DWARVEN_STOUTM_NOTED = 5748
-MOONLIGHT_MEADM = 5749
-MOONLIGHT_MEADM_NOTED = 5750
-AXEMANS_FOLLY = 5751
-AXEMANS_FOLLY_NOTED = 5752
-AXEMANS_FOLLYM = 5753
-AXEMANS_FOLLYM_NOTED = 5754
-CHEFS_DELIGHT = 5755
-CHEFS_DELIGHT_NOTED = 5756
-CHEFS_DELIGHTM = 5757
-CHEFS_DELIGHTM_NOTED = 5758
-SLAYERS_RESPITE = 5759
-SLAYERS_RESPITE_NOTED = 5760
-SLAYERS_RESPITEM = 5761
-SLAYERS_RESPITEM_NOTED = 5762
-CIDER = 5763
-CIDER_NOTED = 5764
-MATURE_CIDER = 5765
-MATURE_CIDER_NOTED = 5766
-ALE_YEAST = 5767
-ALE_YEAST_NOTED = 5768
-CALQUAT_KEG = 5769
-CALQUAT_KEG_NOTED = 5770
-DWARVEN_STOUT1 = 5771
-DWARVEN_STOUT1_NOTED = 5772
-DWARVEN_STOUT2 = 5773
-DWARVEN_STOUT2_NOTED = 5774
-DWARVEN_STOUT3 = 5775
-DWARVEN_STOUT3_NOTED = 5776
-DWARVEN_STOUT4 = 5777
-DWARVEN_STOUT4_NOTED = 5778
-ASGARNIAN_ALE1 = 5779
-ASGARNIAN_ALE1_NOTED = 5780
-ASGARNIAN_ALE2 = 5781
-ASGARNIAN_ALE2_NOTED = 5782
-ASGARNIAN_ALE3 = 5783
-ASGARNIAN_ALE3_NOTED = 5784
-ASGARNIAN_ALE4 = 5785
-ASGARNIAN_ALE4_NOTED = 5786
-GREENMANS_ALE1 = 5787
-GREENMANS_ALE1_NOTED = 5788
-GREENMANS_ALE2 = 5789
-GREENMANS_ALE2_NOTED = 5790
-GREENMANS_ALE3 = 5791
-GREENMANS_ALE3_NOTED = 5792
-GREENMANS_ALE4 = 5793
-GREENMANS_ALE4_NOTED = 5794
-MIND_BOMB1 = 5795
-MIND_BOMB1_NOTED = 5796
-MIND_BOMB2 = 5797
-MIND_BOMB2_NOTED = 5798
-MIND_BOMB3 = 5799
-MIND_BOMB3_NOTED = 5800
-MIND_BOMB4 = 5801
-MIND_BOMB4_NOTED = 5802
-DRAGON_BITTER1 = 5803
-DRAGON_BITTER1_NOTED = 5804
-DRAGON_BITTER2 = 5805
-DRAGON_BITTER2_NOTED = 5806
-DRAGON_BITTER3 = 5807
-DRAGON_BITTER3_NOTED = 5808
-DRAGON_BITTER4 = 5809
-DRAGON_BITTER4_NOTED = 5810
-MOONLIGHT_MEAD1 = 5811
-MOONLIGHT_MEAD1_NOTED = 5812
-MOONLIGHT_MEAD2 = 5813
-MOONLIGHT_MEAD2_NOTED = 5814
-MOONLIGHT_MEAD3 = 5815
-MOONLIGHT_MEAD3_NOTED = 5816
-MOONLIGHT_MEAD4 = 5817
-MOONLIGHT_MEAD4_NOTED = 5818
-AXEMANS_FOLLY1 = 5819
-AXEMANS_FOLLY1_NOTED = 5820
-AXEMANS_FOLLY2 = 5821
-AXEMANS_FOLLY2_NOTED = 5822
-AXEMANS_FOLLY3 = 5823
-AXEMANS_FOLLY3_NOTED = 5824
-AXEMANS_FOLLY4 = 5825
-AXEMANS_FOLLY4_NOTED = 5826
-CHEFS_DELIGHT1 = 5827
-CHEFS_DELIGHT1_NOTED = 5828
-CHEFS_DELIGHT2 = 5829
-CHEFS_DELIGHT2_NOTED = 5830
-CHEFS_DELIGHT3 = 5831
-CHEFS_DELIGHT3_NOTED = 5832
-CHEFS_DELIGHT4 = 5833
-CHEFS_DELIGHT4_NOTED = 5834
-SLAYERS_RESPITE1 = 5835
-SLAYERS_RESPITE1_NOTED = 5836
-SLAYERS_RESPITE2 = 5837
-SLAYERS_RESPITE2_NOTED = 5838
-SLAYERS_RESPITE3 = 5839
-SLAYERS_RESPITE3_NOTED = 5840
-SLAYERS_RESPITE4 = 5841
-SLAYERS_RESPITE4_NOTED = 5842
-CIDER1 = 5843
-CIDER1_NOTED = 5844
-CIDER2 = 5845
-CIDER2_NOTED = 5846
-CIDER3 = 5847
-CIDER3_NOTED = 5848
-CIDER4 = 5849
-CIDER4_NOTED = 5850
-DWARVEN_STOUTM1 = 5851
-DWARVEN_STOUTM1_NOTED = 5852
-DWARVEN_STOUTM2 = 5853
-DWARVEN_STOUTM2_NOTED = 5854
-DWARVEN_STOUTM3 = 5855
-DWARVEN_STOUTM3_NOTED = 5856
-DWARVEN_STOUTM4 = 5857
-DWARVEN_STOUTM4_NOTED = 5858
-ASGARNIAN_ALEM1 = 5859
-ASGARNIAN_ALEM1_NOTED = 5860
-ASGARNIAN_ALEM2 = 5861
-ASGARNIAN_ALEM2_NOTED = 5862
-ASGARNIAN_ALEM3 = 5863
-ASGARNIAN_ALEM3_NOTED = 5864
-ASGARNIAN_ALEM4 = 5865
-ASGARNIAN_ALEM4_NOTED = 5866
-GREENMANS_ALEM1 = 5867
-GREENMANS_ALEM1_NOTED = 5868
-GREENMANS_ALEM2 = 5869
-GREENMANS_ALEM2_NOTED = 5870
-GREENMANS_ALEM3 = 5871
-GREENMANS_ALEM3_NOTED = 5872
-GREENMANS_ALEM4 = 5873
-GREENMANS_ALEM4_NOTED = 5874
-MIND_BOMBM1 = 5875
-MIND_BOMBM1_NOTED = 5876
-MIND_BOMBM2 = 5877
-MIND_BOMBM2_NOTED = 5878
-MIND_BOMBM3 = 5879
-MIND_BOMBM3_NOTED = 5880
-MIND_BOMBM4 = 5881
-MIND_BOMBM4_NOTED = 5882
-DRAGON_BITTERM1 = 5883
-DRAGON_BITTERM1_NOTED = 5884
-DRAGON_BITTERM2 = 5885
-DRAGON_BITTERM2_NOTED = 5886
-DRAGON_BITTERM3 = 5887
-DRAGON_BITTERM3_NOTED = 5888
-DRAGON_BITTERM4 = 5889
-DRAGON_BITTERM4_NOTED = 5890
-MOONLIGHT_MEADM1 = 5891
-MOONLIGHT_MEADM1_NOTED = 5892
-MOONLIGHT_MEADM2 = 5893
-MOONLIGHT_MEADM2_NOTED = 5894
-MOONLIGHT_MEADM3 = 5895
-MOONLIGHT_MEADM3_NOTED = 5896
-MOONLIGHT_MEADM4 = 5897
-MOONLIGHT_MEADM4_NOTED = 5898
-AXEMANS_FOLLYM1 = 5899
-AXEMANS_FOLLYM1_NOTED = 5900
-AXEMANS_FOLLYM2 = 5901
-AXEMANS_FOLLYM2_NOTED = 5902
-AXEMANS_FOLLYM3 = 5903
-AXEMANS_FOLLYM3_NOTED = 5904
-AXEMANS_FOLLYM4 = 5905
-AXEMANS_FOLLYM4_NOTED = 5906
-CHEFS_DELIGHTM1 = 5907
-CHEFS_DELIGHTM1_NOTED = 5908
-CHEFS_DELIGHTM2 = 5909
-CHEFS_DELIGHTM2_NOTED = 5910
-CHEFS_DELIGHTM3 = 5911
-CHEFS_DELIGHTM3_NOTED = 5912
-CHEFS_DELIGHTM4 = 5913
-CHEFS_DELIGHTM4_NOTED = 5914
-SLAYERS_RESPITEM1 = 5915
-SLAYERS_RESPITEM1_NOTED = 5916
-SLAYERS_RESPITEM2 = 5917
-SLAYERS_RESPITEM2_NOTED = 5918
-SLAYERS_RESPITEM3 = 5919
-SLAYERS_RESPITEM3_NOTED = 5920
-SLAYERS_RESPITEM4 = 5921
-SLAYERS_RESPITEM4_NOTED = 5922
-CIDERM1 = 5923
-CIDERM1_NOTED = 5924
-CIDERM2 = 5925
-CIDERM2_NOTED = 5926
-CIDERM3 = 5927
-CIDERM3_NOTED = 5928
-CIDERM4 = 5929
-CIDERM4_NOTED = 5930
-JUTE_FIBRE = 5931
-JUTE_FIBRE_NOTED = 5932
-WILLOW_BRANCH = 5933
-WILLOW_BRANCH_NOTED = 5934
-COCONUT_MILK = 5935
-WEAPON_POISON_UNF = 5936
-WEAPON_POISON_5937 = 5937
-WEAPON_POISON_NOTED_5938 = 5938
-WEAPON_POISON_UNF_5939 = 5939
-WEAPON_POISON_5940 = 5940
-WEAPON_POISON_NOTED_5941 = 5941
-ANTIDOTE_UNF = 5942
-ANTIDOTE4 = 5943
-ANTIDOTE4_NOTED = 5944
-ANTIDOTE3 = 5945
-ANTIDOTE3_NOTED = 5946
-ANTIDOTE2 = 5947
-ANTIDOTE2_NOTED = 5948
-ANTIDOTE1 = 5949
-ANTIDOTE1_NOTED = 5950
-ANTIDOTE_UNF_5951 = 5951
-ANTIDOTE4_5952 = 5952
-ANTIDOTE4_NOTED_5953 = 5953
-ANTIDOTE3_5954 = 5954
-ANTIDOTE3_NOTED_5955 = 5955
-ANTIDOTE2_5956 = 5956
-ANTIDOTE2_NOTED_5957 = 5957
-ANTIDOTE1_5958 = 5958
-ANTIDOTE1_NOTED_5959 = 5959
-TOMATOES1 = 5960
-TOMATOES1_NOTED = 5961
-TOMATOES2 = 5962
-TOMATOES2_NOTED = 5963
-TOMATOES3 = 5964
-TOMATOES3_NOTED = 5965
-TOMATOES4 = 5966
-TOMATOES4_NOTED = 5967
-TOMATOES5 = 5968
-TOMATOES5_NOTED = 5969
-CURRY_LEAF = 5970
-CURRY_LEAF_NOTED = 5971
-PAPAYA_FRUIT = 5972
-PAPAYA_FRUIT_NOTED = 5973
-COCONUT = 5974
-COCONUT_NOTED = 5975
-HALF_COCONUT = 5976
-HALF_COCONUT_NOTED = 5977
-COCONUT_SHELL = 5978
-COCONUT_SHELL_NOTED = 5979
-CALQUAT_FRUIT = 5980
-CALQUAT_FRUIT_NOTED = 5981
-WATERMELON = 5982
-WATERMELON_NOTED = 5983
-WATERMELON_SLICE = 5984
-WATERMELON_SLICE_NOTED = 5985
-SWEETCORN = 5986
-SWEETCORN_NOTED = 5987
-COOKED_SWEETCORN = 5988
-COOKED_SWEETCORN_NOTED = 5989
-BURNT_SWEETCORN = 5990
-BURNT_SWEETCORN_NOTED = 5991
-APPLE_MUSH = 5992
-APPLE_MUSH_NOTED = 5993
-HAMMERSTONE_HOPS = 5994
-HAMMERSTONE_HOPS_NOTED = 5995
-ASGARNIAN_HOPS = 5996
-ASGARNIAN_HOPS_NOTED = 5997
-YANILLIAN_HOPS = 5998
-YANILLIAN_HOPS_NOTED = 5999
-KRANDORIAN_HOPS = 6000
-KRANDORIAN_HOPS_NOTED = 6001
-WILDBLOOD_HOPS = 6002
-WILDBLOOD_HOPS_NOTED = 6003
-MUSHROOM = 6004
-MUSHROOM_NOTED = 6005
-BARLEY = 6006
-BARLEY_NOTED = 6007
-BARLEY_MALT = 6008
-BARLEY_MALT_NOTED = 6009
-MARIGOLDS = 6010
-MARIGOLDS_NOTED = 6011
-NASTURTIUMS = 6012
-NASTURTIUMS_NOTED = 6013
-ROSEMARY = 6014
-ROSEMARY_NOTED = 6015
-CACTUS_SPINE = 6016
-CACTUS_SPINE_NOTED = 6017
-POISON_IVY_BERRIES = 6018
-POISON_IVY_BERRIES_NOTED = 6019
-LEAVES = 6020
-LEAVES_NOTED = 6021
-OAK_LEAVES = 6022
-OAK_LEAVES_NOTED = 6023
-WILLOW_LEAVES = 6024
-WILLOW_LEAVES_NOTED = 6025
-YEW_LEAVES = 6026
-YEW_LEAVES_NOTED = 6027
-MAPLE_LEAVES = 6028
-MAPLE_LEAVES_NOTED = 6029
-MAGIC_LEAVES = 6030
-MAGIC_LEAVES_NOTED = 6031
-COMPOST = 6032
-COMPOST_NOTED = 6033
-SUPERCOMPOST = 6034
-SUPERCOMPOST_NOTED = 6035
-PLANT_CURE = 6036
-PLANT_CURE_NOTED = 6037
-MAGIC_STRING = 6038
-MAGIC_STRING_NOTED = 6039
-AMULET_OF_NATURE = 6040
-PRENATURE_AMULET = 6041
-PRENATURE_AMULET_NOTED = 6042
-OAK_ROOTS = 6043
-OAK_ROOTS_NOTED = 6044
-WILLOW_ROOTS = 6045
-WILLOW_ROOTS_NOTED = 6046
-MAPLE_ROOTS = 6047
-MAPLE_ROOTS_NOTED = 6048
-YEW_ROOTS = 6049
-YEW_ROOTS_NOTED = 6050
-MAGIC_ROOTS = 6051
-MAGIC_ROOTS_NOTED = 6052
-SPIRIT_ROOTS = 6053
-SPIRIT_ROOTS_NOTED = 6054
-WEEDS = 6055
-WEEDS_NOTED = 6056
-HAY_SACK = 6057
-HAY_SACK_6058 = 6058
-SCARECROW = 6059
-STOOL_NOTED = 6060
-BRONZE_BOLTS_P_6061 = 6061
-BRONZE_BOLTS_P_6062 = 6062
-SPIRIT_TREE = 6063
-BLOODY_MOURNER_TOP = 6064
-MOURNER_TOP = 6065
-RIPPED_MOURNER_TROUSERS = 6066
-MOURNER_TROUSERS = 6067
-MOURNER_GLOVES = 6068
-MOURNER_BOOTS = 6069
-MOURNER_CLOAK = 6070
-MOURNER_LETTER = 6071
-TEGIDS_SOAP = 6072
-PRIFDDINAS_HISTORY = 6073
-PRIFDDINAS_HISTORY_NOTED = 6074
-EASTERN_DISCOVERY = 6075
-EASTERN_DISCOVERY_NOTED = 6076
-EASTERN_SETTLEMENT = 6077
-EASTERN_SETTLEMENT_NOTED = 6078
-THE_GREAT_DIVIDE = 6079
-THE_GREAT_DIVIDE_NOTED = 6080
-BROKEN_DEVICE = 6081
-FIXED_DEVICE = 6082
-TARNISHED_KEY = 6083
-WORN_KEY = 6084
-RED_DYE_BELLOWS = 6085
-BLUE_DYE_BELLOWS = 6086
-YELLOW_DYE_BELLOWS = 6087
-GREEN_DYE_BELLOWS = 6088
-BLUE_TOAD = 6089
-RED_TOAD = 6090
-YELLOW_TOAD = 6091
-GREEN_TOAD = 6092
-ROTTEN_APPLES = 6093
-APPLE_BARREL = 6094
-NAPHTHA_APPLE_MIX = 6095
-TOXIC_NAPHTHA = 6096
-SIEVE = 6097
-TOXIC_POWDER = 6098
-TELEPORT_CRYSTAL_4 = 6099
-TELEPORT_CRYSTAL_3 = 6100
-TELEPORT_CRYSTAL_2 = 6101
-TELEPORT_CRYSTAL_1 = 6102
-CRYSTAL_TELEPORT_SEED = 6103
-NEW_KEY = 6104
-ELF = 6105
-GHOSTLY_BOOTS = 6106
-GHOSTLY_ROBE = 6107
-GHOSTLY_ROBE_6108 = 6108
-GHOSTLY_HOOD = 6109
-GHOSTLY_GLOVES = 6110
-GHOSTLY_CLOAK = 6111
-KELDA_SEED = 6112
-KELDA_HOPS = 6113
-KELDA_SEED_6114 = 6114
-KELDA_SEED_6115 = 6115
-KELDA_SEED_6116 = 6116
-KELDA_SEED_6117 = 6117
-KELDA_STOUT = 6118
-SQUARE_STONE = 6119
-SQUARE_STONE_6120 = 6120
-LETTER_6121 = 6121
-A_CHAIR = 6122
-BEER_GLASS_6123 = 6123
-COCONUT_MILK_NOTED = 6124
-ENCHANTED_LYRE2 = 6125
-ENCHANTED_LYRE3 = 6126
-ENCHANTED_LYRE4 = 6127
-ROCKSHELL_HELM = 6128
-ROCKSHELL_PLATE = 6129
-ROCKSHELL_LEGS = 6130
-SPINED_HELM = 6131
-SPINED_HELM_NOTED = 6132
-SPINED_BODY = 6133
-SPINED_BODY_NOTED = 6134
-SPINED_CHAPS = 6135
-SPINED_CHAPS_NOTED = 6136
-SKELETAL_HELM = 6137
-SKELETAL_HELM_NOTED = 6138
-SKELETAL_TOP = 6139
-SKELETAL_TOP_NOTED = 6140
-SKELETAL_BOTTOMS = 6141
-SKELETAL_BOTTOMS_NOTED = 6142
-SPINED_BOOTS = 6143
-SPINED_BOOTS_NOTED = 6144
-ROCKSHELL_BOOTS = 6145
-ROCKSHELL_BOOTS_NOTED = 6146
-SKELETAL_BOOTS = 6147
-SKELETAL_BOOTS_NOTED = 6148
-SPINED_GLOVES = 6149
-SPINED_GLOVES_NOTED = 6150
-ROCKSHELL_GLOVES = 6151
-ROCKSHELL_GLOVES_NOTED = 6152
-SKELETAL_GLOVES = 6153
-SKELETAL_GLOVES_NOTED = 6154
-DAGANNOTH_HIDE = 6155
-DAGANNOTH_HIDE_NOTED = 6156
-ROCKSHELL_CHUNK = 6157
-ROCKSHELL_CHUNK_NOTED = 6158
-ROCKSHELL_SHARD = 6159
-ROCKSHELL_SHARD_NOTED = 6160
-ROCKSHELL_SPLINTER = 6161
-ROCKSHELL_SPLINTER_NOTED = 6162
-SKULL_PIECE = 6163
-SKULL_PIECE_NOTED = 6164
-RIBCAGE_PIECE = 6165
-RIBCAGE_PIECE_NOTED = 6166
-FIBULA_PIECE = 6167
-FIBULA_PIECE_NOTED = 6168
-CIRCULAR_HIDE = 6169
-CIRCULAR_HIDE_NOTED = 6170
-FLATTENED_HIDE = 6171
-FLATTENED_HIDE_NOTED = 6172
-STRETCHED_HIDE = 6173
-STRETCHED_HIDE_NOTED = 6174
-ROCKSHELL_HELM_NOTED = 6175
-ROCKSHELL_PLATE_NOTED = 6176
-ROCKSHELL_LEGS_NOTED = 6177
-RAW_PHEASANT = 6178
-RAW_PHEASANT_6179 = 6179
-LEDERHOSEN_TOP = 6180
-LEDERHOSEN_SHORTS = 6181
-LEDERHOSEN_HAT = 6182
-FROG_TOKEN = 6183
-PRINCE_TUNIC = 6184
-PRINCE_LEGGINGS = 6185
-PRINCESS_BLOUSE = 6186
-PRINCESS_SKIRT = 6187
-FROG_MASK = 6188
-MYSTERY_BOX = 6199
-RAW_FISHLIKE_THING = 6200
-BLUNT_ARROW = 6201
-FISHLIKE_THING = 6202
-BLUNT_ARROW_6203 = 6203
-RAW_FISHLIKE_THING_6204 = 6204
-BARBED_ARROW = 6205
-FISHLIKE_THING_6206 = 6206
-BARBED_ARROW_6207 = 6207
-NULL_6208 = 6208
-SMALL_FISHING_NET_6209 = 6209
-BARBED_ARROW_6210 = 6210
-TEAK_PYRE_LOGS = 6211
-TEAK_PYRE_LOGS_NOTED = 6212
-MAHOGANY_PYRE_LOGS = 6213
-MAHOGANY_PYRE_LOGS_NOTED = 6214
-BROODOO_SHIELD_10 = 6215
-BROODOO_SHIELD_10_NOTED = 6216
-BROODOO_SHIELD_9 = 6217
-BROODOO_SHIELD_9_NOTED = 6218
-BROODOO_SHIELD_8 = 6219
-BROODOO_SHIELD_8_NOTED = 6220
-BROODOO_SHIELD_7 = 6221
-BROODOO_SHIELD_7_NOTED = 6222
-BROODOO_SHIELD_6 = 6223
-BROODOO_SHIELD_6_NOTED = 6224
-BROODOO_SHIELD_5 = 6225
-BROODOO_SHIELD_5_NOTED = 6226
-BROODOO_SHIELD_4 = 6227
-BROODOO_SHIELD_4_NOTED = 6228
-BROODOO_SHIELD_3 = 6229
-BROODOO_SHIELD_3_NOTED = 6230
-BROODOO_SHIELD_2 = 6231
-BROODOO_SHIELD_2_NOTED = 6232
-BROODOO_SHIELD_1 = 6233
-BROODOO_SHIELD_1_NOTED = 6234
-BROODOO_SHIELD = 6235
-BROODOO_SHIELD_NOTED = 6236
-BROODOO_SHIELD_10_6237 = 6237
-BROODOO_SHIELD_10_NOTED_6238 = 6238
-BROODOO_SHIELD_9_6239 = 6239
-BROODOO_SHIELD_9_NOTED_6240 = 6240
-BROODOO_SHIELD_8_6241 = 6241
-BROODOO_SHIELD_8_NOTED_6242 = 6242
-BROODOO_SHIELD_7_6243 = 6243
-BROODOO_SHIELD_7_NOTED_6244 = 6244
-BROODOO_SHIELD_6_6245 = 6245
-BROODOO_SHIELD_6_NOTED_6246 = 6246
-BROODOO_SHIELD_5_6247 = 6247
-BROODOO_SHIELD_5_NOTED_6248 = 6248
-BROODOO_SHIELD_4_6249 = 6249
-BROODOO_SHIELD_4_NOTED_6250 = 6250
-BROODOO_SHIELD_3_6251 = 6251
-BROODOO_SHIELD_3_NOTED_6252 = 6252
-BROODOO_SHIELD_2_6253 = 6253
-BROODOO_SHIELD_2_NOTED_6254 = 6254
-BROODOO_SHIELD_1_6255 = 6255
-BROODOO_SHIELD_1_NOTED_6256 = 6256
-BROODOO_SHIELD_6257 = 6257
-BROODOO_SHIELD_NOTED_6258 = 6258
-BROODOO_SHIELD_10_6259 = 6259
-BROODOO_SHIELD_10_NOTED_6260 = 6260
-BROODOO_SHIELD_9_6261 = 6261
-BROODOO_SHIELD_9_NOTED_6262 = 6262
-BROODOO_SHIELD_8_6263 = 6263
-BROODOO_SHIELD_8_NOTED_6264 = 6264
-BROODOO_SHIELD_7_6265 = 6265
-BROODOO_SHIELD_7_NOTED_6266 = 6266
-BROODOO_SHIELD_6_6267 = 6267
-BROODOO_SHIELD_6_NOTED_6268 = 6268
-BROODOO_SHIELD_5_6269 = 6269
-BROODOO_SHIELD_5_NOTED_6270 = 6270
-BROODOO_SHIELD_4_6271 = 6271
-BROODOO_SHIELD_4_NOTED_6272 = 6272
-BROODOO_SHIELD_3_6273 = 6273
-BROODOO_SHIELD_3_NOTED_6274 = 6274
-BROODOO_SHIELD_2_6275 = 6275
-BROODOO_SHIELD_2_NOTED_6276 = 6276
-BROODOO_SHIELD_1_6277 = 6277
-BROODOO_SHIELD_1_NOTED_6278 = 6278
-BROODOO_SHIELD_6279 = 6279
-BROODOO_SHIELD_NOTED_6280 = 6280
-THATCH_SPAR_LIGHT = 6281
-THATCH_SPAR_LIGHT_NOTED = 6282
-THATCH_SPAR_MED = 6283
-THATCH_SPAR_MED_NOTED = 6284
-THATCH_SPAR_DENSE = 6285
-THATCH_SPAR_DENSE_NOTED = 6286
-SNAKE_HIDE = 6287
-SNAKE_HIDE_NOTED = 6288
-SNAKESKIN = 6289
-SNAKESKIN_NOTED = 6290
-SPIDER_CARCASS = 6291
-SPIDER_CARCASS_NOTED = 6292
-SPIDER_ON_STICK = 6293
-SPIDER_ON_STICK_NOTED = 6294
-SPIDER_ON_SHAFT = 6295
-SPIDER_ON_SHAFT_NOTED = 6296
-SPIDER_ON_STICK_6297 = 6297
-SPIDER_ON_STICK_NOTED_6298 = 6298
-SPIDER_ON_SHAFT_6299 = 6299
-SPIDER_ON_SHAFT_NOTED_6300 = 6300
-BURNT_SPIDER = 6301
-BURNT_SPIDER_NOTED = 6302
-SPIDER_ON_SHAFT_6303 = 6303
-SPIDER_ON_SHAFT_NOTED_6304 = 6304
-SKEWER_STICK = 6305
-TRADING_STICKS = 6306
-TRADING_STICKS_6307 = 6307
-TRADING_STICKS_6308 = 6308
-TRADING_STICKS_6309 = 6309
-TRADING_STICKS_6310 = 6310
-GOUT_TUBER = 6311
-GOUT_TUBER_NOTED = 6312
-OPAL_MACHETE = 6313
-OPAL_MACHETE_NOTED = 6314
-JADE_MACHETE = 6315
-JADE_MACHETE_NOTED = 6316
-RED_TOPAZ_MACHETE = 6317
-RED_TOPAZ_MACHETE_NOTED = 6318
-PROBOSCIS = 6319
-PROBOSCIS_6320 = 6320
-PROBOSCIS_6321 = 6321
-SNAKESKIN_BODY = 6322
-SNAKESKIN_BODY_NOTED = 6323
-SNAKESKIN_CHAPS = 6324
-SNAKESKIN_CHAPS_NOTED = 6325
-SNAKESKIN_BANDANA = 6326
-SNAKESKIN_BANDANA_NOTED = 6327
-SNAKESKIN_BOOTS = 6328
-SNAKESKIN_BOOTS_NOTED = 6329
-SNAKESKIN_VAMBRACES = 6330
-SNAKESKIN_VAMBRACES_NOTED = 6331
-MAHOGANY_LOGS = 6332
-TEAK_LOGS = 6333
-TEAK_LOGS_NOTED = 6334
-TRIBAL_MASK = 6335
-TRIBAL_MASK_NOTED = 6336
-TRIBAL_MASK_6337 = 6337
-TRIBAL_MASK_NOTED_6338 = 6338
-TRIBAL_MASK_6339 = 6339
-TRIBAL_MASK_NOTED_6340 = 6340
-TRIBAL_TOP = 6341
-TRIBAL_TOP_NOTED = 6342
-VILLAGER_ROBE = 6343
-VILLAGER_ROBE_NOTED = 6344
-VILLAGER_HAT = 6345
-VILLAGER_HAT_NOTED = 6346
-VILLAGER_ARMBAND = 6347
-VILLAGER_ARMBAND_NOTED = 6348
-VILLAGER_SANDALS = 6349
-VILLAGER_SANDALS_NOTED = 6350
-TRIBAL_TOP_6351 = 6351
-TRIBAL_TOP_NOTED_6352 = 6352
-VILLAGER_ROBE_6353 = 6353
-VILLAGER_ROBE_NOTED_6354 = 6354
-VILLAGER_HAT_6355 = 6355
-VILLAGER_HAT_NOTED_6356 = 6356
-VILLAGER_SANDALS_6357 = 6357
-VILLAGER_SANDALS_NOTED_6358 = 6358
-VILLAGER_ARMBAND_6359 = 6359
-VILLAGER_ARMBAND_NOTED_6360 = 6360
-TRIBAL_TOP_6361 = 6361
-TRIBAL_TOP_NOTED_6362 = 6362
-VILLAGER_ROBE_6363 = 6363
-VILLAGER_ROBE_NOTED_6364 = 6364
-VILLAGER_HAT_6365 = 6365
-VILLAGER_HAT_NOTED_6366 = 6366
-VILLAGER_SANDALS_6367 = 6367
-VILLAGER_SANDALS_NOTED_6368 = 6368
-VILLAGER_ARMBAND_6369 = 6369
-VILLAGER_ARMBAND_NOTED_6370 = 6370
-TRIBAL_TOP_6371 = 6371
-TRIBAL_TOP_NOTED_6372 = 6372
-VILLAGER_ROBE_6373 = 6373
-VILLAGER_ROBE_NOTED_6374 = 6374
-VILLAGER_HAT_6375 = 6375
-VILLAGER_HAT_NOTED_6376 = 6376
-VILLAGER_SANDALS_6377 = 6377
-VILLAGER_SANDALS_NOTED_6378 = 6378
-VILLAGER_ARMBAND_6379 = 6379
-VILLAGER_ARMBAND_NOTED_6380 = 6380
-BARBED_ARROW_6381 = 6381
-FEZ = 6382
-FEZ_NOTED = 6383
-DESERT_TOP = 6384
-DESERT_TOP_NOTED = 6385
-DESERT_ROBES = 6386
-DESERT_ROBES_NOTED = 6387
-DESERT_TOP_6388 = 6388
-DESERT_TOP_NOTED_6389 = 6389
-DESERT_LEGS = 6390
-DESERT_LEGS_NOTED = 6391
-MENAPHITE_PURPLE_HAT = 6392
-MENAPHITE_PURPLE_HAT_NOTED = 6393
-MENAPHITE_PURPLE_TOP = 6394
-MENAPHITE_PURPLE_TOP_NOTED = 6395
-MENAPHITE_PURPLE_ROBE = 6396
-MENAPHITE_PURPLE_ROBE_NOTED = 6397
-MENAPHITE_PURPLE_KILT = 6398
-MENAPHITE_PURPLE_KILT_NOTED = 6399
-MENAPHITE_RED_HAT = 6400
-MENAPHITE_RED_HAT_NOTED = 6401
-MENAPHITE_RED_TOP = 6402
-MENAPHITE_RED_TOP_NOTED = 6403
-MENAPHITE_RED_ROBE = 6404
-MENAPHITE_RED_ROBE_NOTED = 6405
-MENAPHITE_RED_KILT = 6406
-MENAPHITE_RED_KILT_NOTED = 6407
-OAK_BLACKJACKO = 6408
-OAK_BLACKJACKO_NOTED = 6409
-OAK_BLACKJACKD = 6410
-OAK_BLACKJACKD_NOTED = 6411
-WILLOW_BLACKJACKO = 6412
-WILLOW_BLACKJACKO_NOTED = 6413
-WILLOW_BLACKJACKD = 6414
-WILLOW_BLACKJACKD_NOTED = 6415
-MAPLE_BLACKJACK = 6416
-MAPLE_BLACKJACK_NOTED = 6417
-MAPLE_BLACKJACKO = 6418
-MAPLE_BLACKJACKO_NOTED = 6419
-MAPLE_BLACKJACKD = 6420
-MAPLE_BLACKJACKD_NOTED = 6421
-AIR_RUNE_6422 = 6422
-AIR_RUNE_NOTED = 6423
-WATER_RUNE_6424 = 6424
-WATER_RUNE_NOTED = 6425
-EARTH_RUNE_6426 = 6426
-EARTH_RUNE_NOTED = 6427
-FIRE_RUNE_6428 = 6428
-FIRE_RUNE_NOTED = 6429
-CHAOS_RUNE_6430 = 6430
-CHAOS_RUNE_NOTED = 6431
-DEATH_RUNE_6432 = 6432
-DEATH_RUNE_NOTED = 6433
-LAW_RUNE_6434 = 6434
-LAW_RUNE_NOTED = 6435
-MIND_RUNE_6436 = 6436
-MIND_RUNE_NOTED = 6437
-BODY_RUNE_6438 = 6438
-BODY_RUNE_NOTED = 6439
-ARROW_SHAFT_6440 = 6440
-ARROW_SHAFT_6441 = 6441
-ARROW_SHAFT_6442 = 6442
-ARROW_SHAFT_6443 = 6443
-HEADLESS_ARROW_6444 = 6444
-HEADLESS_ARROW_6445 = 6445
-HEADLESS_ARROW_6446 = 6446
-HEADLESS_ARROW_6447 = 6447
-SPADEFUL_OF_COKE = 6448
-KANDARIN_HEADGEAR = 6450
-MAGE_ARENA_CAPE = 6452
-WHITE_ROSE_SEED = 6453
-RED_ROSE_SEED = 6454
-PINK_ROSE_SEED = 6455
-VINE_SEED = 6456
-DELPHINIUM_SEED = 6457
-ORCHID_SEED = 6458
-ORCHID_SEED_6459 = 6459
-SNOWDROP_SEED = 6460
-WHITE_TREE_SHOOT = 6461
-WHITE_TREE_SHOOT_6462 = 6462
-WHITE_TREE_SHOOT_W = 6463
-WHITE_TREE_SAPLING = 6464
-RING_OF_CHAROSA = 6465
-RUNE_SHARDS = 6466
-RUNE_DUST = 6467
-PLANT_CURE_6468 = 6468
-WHITE_TREE_FRUIT = 6469
-COMPOST_POTION4 = 6470
-COMPOST_POTION4_NOTED = 6471
-COMPOST_POTION3 = 6472
-COMPOST_POTION3_NOTED = 6473
-COMPOST_POTION2 = 6474
-COMPOST_POTION2_NOTED = 6475
-COMPOST_POTION1 = 6476
-COMPOST_POTION1_NOTED = 6477
-TROLLEY = 6478
-LIST = 6479
-WHITE_ROSE_SEED_6480 = 6480
-WHITE_ROSE_SEED_6481 = 6481
-WHITE_ROSE_SEED_6482 = 6482
-WHITE_ROSE_SEED_6483 = 6483
-RED_ROSE_SEED_6484 = 6484
-RED_ROSE_SEED_6485 = 6485
-RED_ROSE_SEED_6486 = 6486
-RED_ROSE_SEED_6487 = 6487
-PINK_ROSE_SEED_6488 = 6488
-PINK_ROSE_SEED_6489 = 6489
-PINK_ROSE_SEED_6490 = 6490
-PINK_ROSE_SEED_6491 = 6491
-VINE_SEED_6492 = 6492
-VINE_SEED_6493 = 6493
-VINE_SEED_6494 = 6494
-VINE_SEED_6495 = 6495
-DELPHINIUM_SEED_6496 = 6496
-DELPHINIUM_SEED_6497 = 6497
-DELPHINIUM_SEED_6498 = 6498
-DELPHINIUM_SEED_6499 = 6499
-ORCHID_SEED_6500 = 6500
-ORCHID_SEED_6501 = 6501
-ORCHID_SEED_6502 = 6502
-ORCHID_SEED_6503 = 6503
-ORCHID_SEED_6504 = 6504
-ORCHID_SEED_6505 = 6505
-ORCHID_SEED_6506 = 6506
-ORCHID_SEED_6507 = 6507
-SNOWDROP_SEED_6508 = 6508
-SNOWDROP_SEED_6509 = 6509
-SNOWDROP_SEED_6510 = 6510
-SNOWDROP_SEED_6511 = 6511
-AGILITY_JUMP = 6514
-AGILITY_BALANCE = 6515
-AGILITY_CONTORTION = 6516
-AGILITY_CLIMB = 6517
-AGILITY_JUMP_6518 = 6518
-AGILITY_BALANCE_6519 = 6519
-AGILITY_CONTORTION_6520 = 6520
-AGILITY_CLIMB_6521 = 6521
-TOKTZXILUL = 6522
-TOKTZXILAK = 6523
-TOKTZKETXIL = 6524
-TOKTZXILEK = 6525
-TOKTZMEJTAL = 6526
-TZHAARKETEM = 6527
-TZHAARKETOM = 6528
-TOKKUL = 6529
-TOKKUL_6530 = 6530
-TOKKUL_6531 = 6531
-TOKKUL_6532 = 6532
-TOKKUL_6533 = 6533
-TOKKUL_6534 = 6534
-TOKTZXILAK_NOTED = 6535
-TOKTZKETXIL_NOTED = 6536
-TOKTZXILEK_NOTED = 6537
-TOKTZMEJTAL_NOTED = 6538
-TZHAARKETEM_NOTED = 6539
-TZHAARKETOM_NOTED = 6540
-MOUSE_TOY = 6541
-PRESENT = 6542
-ANTIQUE_LAMP_6543 = 6543
-CATSPEAK_AMULETE = 6544
-CHORES = 6545
-RECIPE = 6546
-DOCTORS_HAT = 6547
-NURSE_HAT = 6548
-LAZY_CAT = 6549
-LAZY_CAT_6550 = 6550
-LAZY_CAT_6551 = 6551
-LAZY_CAT_6552 = 6552
-LAZY_CAT_6553 = 6553
-LAZY_CAT_6554 = 6554
-WILY_CAT = 6555
-WILY_CAT_6556 = 6556
-WILY_CAT_6557 = 6557
-WILY_CAT_6558 = 6558
-WILY_CAT_6559 = 6559
-WILY_CAT_6560 = 6560
-AHABS_BEER = 6561
-MUD_BATTLESTAFF = 6562
-MYSTIC_MUD_STAFF = 6563
-GLISTENING_TEAR_6564 = 6564
-DRAGONSTONE_DRAGON_BOLTS_E_6566 = 6566
-OBSIDIAN_CAPE = 6568
-OBSIDIAN_CAPE_NOTED = 6569
-FIRE_CAPE = 6570
-UNCUT_ONYX = 6571
-UNCUT_ONYX_NOTED = 6572
-ONYX = 6573
-ONYX_NOTED = 6574
-ONYX_RING = 6575
-ONYX_RING_NOTED = 6576
-ONYX_NECKLACE = 6577
-ONYX_NECKLACE_NOTED = 6578
-ONYX_AMULET_U = 6579
-ONYX_AMULET_U_NOTED = 6580
-ONYX_AMULET = 6581
-ONYX_AMULET_NOTED = 6582
-RING_OF_STONE = 6583
-RING_OF_STONE_NOTED = 6584
-AMULET_OF_FURY = 6585
-AMULET_OF_FURY_NOTED = 6586
-WHITE_CLAWS = 6587
-WHITE_CLAWS_NOTED = 6588
-WHITE_BATTLEAXE = 6589
-WHITE_BATTLEAXE_NOTED = 6590
-WHITE_DAGGER = 6591
-WHITE_DAGGER_NOTED = 6592
-WHITE_DAGGERP = 6593
-WHITE_DAGGERP_NOTED = 6594
-WHITE_DAGGERP_6595 = 6595
-WHITE_DAGGERP_NOTED_6596 = 6596
-WHITE_DAGGERP_6597 = 6597
-WHITE_DAGGERP_NOTED_6598 = 6598
-WHITE_HALBERD = 6599
-WHITE_HALBERD_NOTED = 6600
-WHITE_MACE = 6601
-WHITE_MACE_NOTED = 6602
-WHITE_MAGIC_STAFF = 6603
-WHITE_MAGIC_STAFF_NOTED = 6604
-WHITE_SWORD = 6605
-WHITE_SWORD_NOTED = 6606
-WHITE_LONGSWORD = 6607
-WHITE_LONGSWORD_NOTED = 6608
-WHITE_2H_SWORD = 6609
-WHITE_2H_SWORD_NOTED = 6610
-WHITE_SCIMITAR = 6611
-WHITE_SCIMITAR_NOTED = 6612
-WHITE_WARHAMMER = 6613
-WHITE_WARHAMMER_NOTED = 6614
-WHITE_CHAINBODY = 6615
-WHITE_CHAINBODY_NOTED = 6616
-WHITE_PLATEBODY = 6617
-WHITE_PLATEBODY_NOTED = 6618
-WHITE_BOOTS = 6619
-WHITE_BOOTS_NOTED = 6620
-WHITE_MED_HELM = 6621
-WHITE_MED_HELM_NOTED = 6622
-WHITE_FULL_HELM = 6623
-WHITE_FULL_HELM_NOTED = 6624
-WHITE_PLATELEGS = 6625
-WHITE_PLATELEGS_NOTED = 6626
-WHITE_PLATESKIRT = 6627
-WHITE_PLATESKIRT_NOTED = 6628
-WHITE_GLOVES = 6629
-WHITE_GLOVES_NOTED = 6630
-WHITE_SQ_SHIELD = 6631
-WHITE_SQ_SHIELD_NOTED = 6632
-WHITE_KITESHIELD = 6633
-WHITE_KITESHIELD_NOTED = 6634
-COMMORB = 6635
-SOLUSS_HAT = 6636
-DARK_BEAST = 6637
-COLOUR_WHEEL = 6638
-HAND_MIRROR = 6639
-RED_CRYSTAL = 6640
-YELLOW_CRYSTAL = 6641
-GREEN_CRYSTAL = 6642
-CYAN_CRYSTAL = 6643
-BLUE_CRYSTAL = 6644
-MAGENTA_CRYSTAL = 6645
-FRACTURED_CRYSTAL = 6646
-FRACTURED_CRYSTAL_6647 = 6647
-ITEM_LIST = 6648
-EDERNS_JOURNAL = 6649
-BLACKENED_CRYSTAL = 6650
-NEWLY_MADE_CRYSTAL = 6651
-NEWLY_MADE_CRYSTAL_6652 = 6652
-CRYSTAL_TRINKET = 6653
-CAMO_TOP = 6654
-CAMO_BOTTOMS = 6655
-CAMO_HELMET = 6656
-CAMO_TOP_6657 = 6657
-CAMO_BOTTOMS_6658 = 6658
-CAMO_HELMET_6659 = 6659
-FISHING_EXPLOSIVE = 6660
-MOGRE = 6661
-BROKEN_FISHING_ROD = 6662
-FORLORN_BOOT = 6663
-FISHING_EXPLOSIVE_6664 = 6664
-MUDSKIPPER_HAT = 6665
-FLIPPERS = 6666
-EMPTY_FISHBOWL = 6667
-FISHBOWL = 6668
-FISHBOWL_6669 = 6669
-FISHBOWL_6670 = 6670
-FISHBOWL_6671 = 6671
-FISHBOWL_6672 = 6672
-FISHBOWL_AND_NET = 6673
-TINY_NET = 6674
-AN_EMPTY_BOX = 6675
-AN_EMPTY_BOX_NOTED = 6676
-GUAM_IN_A_BOX = 6677
-GUAM_IN_A_BOX_6678 = 6678
-SEAWEED_IN_A_BOX = 6679
-SEAWEED_IN_A_BOX_6680 = 6680
-GROUND_GUAM = 6681
-GROUND_GUAM_NOTED = 6682
-GROUND_SEAWEED = 6683
-GROUND_SEAWEED_NOTED = 6684
-SARADOMIN_BREW4 = 6685
-SARADOMIN_BREW4_NOTED = 6686
-SARADOMIN_BREW3 = 6687
-SARADOMIN_BREW3_NOTED = 6688
-SARADOMIN_BREW2 = 6689
-SARADOMIN_BREW2_NOTED = 6690
-SARADOMIN_BREW1 = 6691
-SARADOMIN_BREW1_NOTED = 6692
-CRUSHED_NEST = 6693
-CRUSHED_NEST_NOTED = 6694
-DESERT_LIZARD = 6695
-ICE_COOLER = 6696
-PAT_OF_BUTTER = 6697
-PAT_OF_BUTTER_NOTED = 6698
-BURNT_POTATO = 6699
-BURNT_POTATO_NOTED = 6700
-BAKED_POTATO = 6701
-BAKED_POTATO_NOTED = 6702
-POTATO_WITH_BUTTER = 6703
-POTATO_WITH_BUTTER_NOTED = 6704
-POTATO_WITH_CHEESE = 6705
-POTATO_WITH_CHEESE_NOTED = 6706
-CAMULET = 6707
-SLAYER_GLOVES = 6708
-FEVER_SPIDER = 6709
-BLINDWEED_SEED = 6710
-BLINDWEED = 6711
-BUCKET_OF_WATER_6712 = 6712
-WRENCH = 6713
-HOLY_WRENCH = 6714
-SLUGLINGS = 6715
-KARAMTHULHU = 6716
-KARAMTHULHU_6717 = 6717
-FEVER_SPIDER_BODY = 6718
-UNSANITARY_SWILL = 6719
-SLAYER_GLOVES_6720 = 6720
-RUSTY_SCIMITAR = 6721
-ZOMBIE_HEAD = 6722
-EMPTY_FISHBOWL_NOTED = 6723
-SEERCULL = 6724
-SEERCULL_NOTED = 6725
-MUD_BATTLESTAFF_NOTED = 6726
-MYSTIC_MUD_STAFF_NOTED = 6727
-DAGANNOTHKING_BONEMEAL = 6728
-DAGANNOTH_BONES = 6729
-DAGANNOTH_BONES_NOTED = 6730
-SEERS_RING = 6731
-SEERS_RING_NOTED = 6732
-ARCHERS_RING = 6733
-ARCHERS_RING_NOTED = 6734
-WARRIOR_RING = 6735
-WARRIOR_RING_NOTED = 6736
-BERSERKER_RING = 6737
-BERSERKER_RING_NOTED = 6738
-DRAGON_AXE = 6739
-DRAGON_AXE_NOTED = 6740
-BROKEN_AXE_6741 = 6741
-BROKEN_AXE_NOTED_6742 = 6742
-DRAGON_AXE_HEAD = 6743
-DRAGON_AXE_HEAD_NOTED = 6744
-SILVERLIGHT_6745 = 6745
-DARKLIGHT = 6746
-DEMONIC_SIGIL_MOULD = 6747
-DEMONIC_SIGIL = 6748
-DEMONIC_TOME = 6749
-BLACK_DESERT_SHIRT = 6750
-BLACK_DESERT_SHIRT_NOTED = 6751
-BLACK_DESERT_ROBE = 6752
-BLACK_DESERT_ROBE_NOTED = 6753
-ENCHANTED_KEY = 6754
-JOURNAL_6755 = 6755
-LETTER_6756 = 6756
-LETTER_6757 = 6757
-SCROLL = 6758
-CHEST = 6759
-GUTHIX_MJOLNIR = 6760
-GUTHIX_MJOLNIR_NOTED = 6761
-SARADOMIN_MJOLNIR = 6762
-SARADOMIN_MJOLNIR_NOTED = 6763
-ZAMORAK_MJOLNIR = 6764
-ZAMORAK_MJOLNIR_NOTED = 6765
-CAT_ANTIPOISON = 6766
-BOOK_6767 = 6767
-POISONED_CHEESE = 6768
-MUSIC_SCROLL = 6769
-DIRECTIONS = 6770
-POT_OF_WEEDS = 6771
-SMOULDERING_POT = 6772
-RAT_POLE = 6773
-RAT_POLE_6774 = 6774
-RAT_POLE_6775 = 6775
-RAT_POLE_6776 = 6776
-RAT_POLE_6777 = 6777
-RAT_POLE_6778 = 6778
-RAT_POLE_6779 = 6779
-MENAPHITE_THUG = 6780
-BANDIT_6781 = 6781
-BANDIT_6782 = 6782
-STATUETTE_6785 = 6785
-ROBE_OF_ELIDINIS = 6786
-ROBE_OF_ELIDINIS_6787 = 6787
-TORN_ROBE = 6788
-TORN_ROBE_6789 = 6789
-SHOES = 6790
-SOLE = 6791
-ANCESTRAL_KEY = 6792
-BALLAD = 6793
-CHOCICE = 6794
-CHOCICE_NOTED = 6795
-LAMP_6796 = 6796
-WATERING_CAN_6797 = 6797
-EARTH_WARRIOR_CHAMPION_SCROLL = 6798
-GHOUL_CHAMPION_SCROLL = 6799
-GIANT_CHAMPION_SCROLL = 6800
-GOBLIN_CHAMPION_SCROLL = 6801
-HOBGOBLIN_CHAMPION_SCROLL = 6802
-IMP_CHAMPION_SCROLL = 6803
-JOGRE_CHAMPION_SCROLL = 6804
-LESSER_DEMON_CHAMPION_SCROLL = 6805
-SKELETON_CHAMPION_SCROLL = 6806
-ZOMBIE_CHAMPION_SCROLL = 6807
-LEONS_CHAMPION_SCROLL = 6808
-GRANITE_LEGS = 6809
-WYVERN_BONEMEAL = 6810
-SKELETAL_WYVERN = 6811
-WYVERN_BONES = 6812
-GRANITE_LEGS_NOTED = 6813
-FUR = 6814
-FUR_NOTED = 6815
-WYVERN_BONES_NOTED = 6816
-SLENDER_BLADE = 6817
-BOWSWORD = 6818
-LARGE_POUCH_6819 = 6819
-RELIC = 6820
-ORB = 6821
-STAR_BAUBLE = 6822
-STAR_BAUBLE_6823 = 6823
-STAR_BAUBLE_6824 = 6824
-STAR_BAUBLE_6825 = 6825
-STAR_BAUBLE_6826 = 6826
-STAR_BAUBLE_6827 = 6827
-BOX_BAUBLE = 6828
-BOX_BAUBLE_6829 = 6829
-BOX_BAUBLE_6830 = 6830
-BOX_BAUBLE_6831 = 6831
-BOX_BAUBLE_6832 = 6832
-BOX_BAUBLE_6833 = 6833
-DIAMOND_BAUBLE = 6834
-DIAMOND_BAUBLE_6835 = 6835
-DIAMOND_BAUBLE_6836 = 6836
-DIAMOND_BAUBLE_6837 = 6837
-DIAMOND_BAUBLE_6838 = 6838
-DIAMOND_BAUBLE_6839 = 6839
-TREE_BAUBLE = 6840
-TREE_BAUBLE_6841 = 6841
-TREE_BAUBLE_6842 = 6842
-TREE_BAUBLE_6843 = 6843
-TREE_BAUBLE_6844 = 6844
-TREE_BAUBLE_6845 = 6845
-BELL_BAUBLE = 6846
-BELL_BAUBLE_6847 = 6847
-BELL_BAUBLE_6848 = 6848
-BELL_BAUBLE_6849 = 6849
-BELL_BAUBLE_6850 = 6850
-BELL_BAUBLE_6851 = 6851
-PUPPET_BOX = 6852
-BAUBLE_BOX = 6853
-PUPPET_BOX_6854 = 6854
-BAUBLE_BOX_6855 = 6855
-BOBBLE_HAT = 6856
-BOBBLE_SCARF = 6857
-JESTER_HAT = 6858
-JESTER_SCARF = 6859
-TRIJESTER_HAT = 6860
-TRIJESTER_SCARF = 6861
-WOOLLY_HAT = 6862
-WOOLLY_SCARF = 6863
-MARIONETTE_HANDLE = 6864
-BLUE_MARIONETTE = 6865
-GREEN_MARIONETTE = 6866
-RED_MARIONETTE = 6867
-BLUE_MARIONETTE_6868 = 6868
-GREEN_MARIONETTE_6869 = 6869
-RED_MARIONETTE_6870 = 6870
-RED_MARIONETTE_6871 = 6871
-RED_MARIONETTE_6872 = 6872
-RED_MARIONETTE_6873 = 6873
-RED_MARIONETTE_6874 = 6874
-BLUE_MARIONETTE_6875 = 6875
-BLUE_MARIONETTE_6876 = 6876
-BLUE_MARIONETTE_6877 = 6877
-BLUE_MARIONETTE_6878 = 6878
-GREEN_MARIONETTE_6879 = 6879
-GREEN_MARIONETTE_6880 = 6880
-GREEN_MARIONETTE_6881 = 6881
-GREEN_MARIONETTE_6882 = 6882
-PEACH = 6883
-PROGRESS_HAT = 6885
-PROGRESS_HAT_6886 = 6886
-PROGRESS_HAT_6887 = 6887
-NULL_6888 = 6888
-MAGES_BOOK = 6889
-MAGES_BOOK_NOTED = 6890
-ARENA_BOOK = 6891
-ARENA_BOOK_NOTED = 6892
-LEATHER_BOOTS_6893 = 6893
-ADAMANT_KITESHIELD_6894 = 6894
-ADAMANT_MED_HELM_6895 = 6895
-EMERALD_6896 = 6896
-RUNE_LONGSWORD_6897 = 6897
-CYLINDER = 6898
-CUBE = 6899
-ICOSAHEDRON = 6900
-PENTAMID = 6901
-ORB_6902 = 6902
-DRAGONSTONE_6903 = 6903
-ANIMALS_BONES = 6904
-ANIMALS_BONES_6905 = 6905
-ANIMALS_BONES_6906 = 6906
-ANIMALS_BONES_6907 = 6907
-BEGINNER_WAND = 6908
-BEGINNER_WAND_NOTED = 6909
-APPRENTICE_WAND = 6910
-APPRENTICE_WAND_NOTED = 6911
-TEACHER_WAND = 6912
-TEACHER_WAND_NOTED = 6913
-MASTER_WAND = 6914
-MASTER_WAND_NOTED = 6915
-INFINITY_TOP = 6916
-INFINITY_TOP_NOTED = 6917
-INFINITY_HAT = 6918
-INFINITY_HAT_NOTED = 6919
-INFINITY_BOOTS = 6920
-INFINITY_BOOTS_NOTED = 6921
-INFINITY_GLOVES = 6922
-INFINITY_GLOVES_NOTED = 6923
-INFINITY_BOTTOMS = 6924
-INFINITY_BOTTOMS_NOTED = 6925
-BONES_TO_PEACHES = 6926
-SANDY_HAND = 6945
-BEER_SOAKED_HAND = 6946
-BERTS_ROTA = 6947
-SANDYS_ROTA = 6948
-A_MAGIC_SCROLL = 6949
-MAGICAL_ORB = 6950
-MAGICAL_ORB_A = 6951
-TRUTH_SERUM = 6952
-BOTTLED_WATER = 6953
-REDBERRY_JUICE = 6954
-PINK_DYE = 6955
-ROSE_TINTED_LENS = 6956
-WIZARDS_HEAD = 6957
-SAND = 6958
-PINK_CAPE = 6959
-PINK_CAPE_NOTED = 6960
-BAGUETTE = 6961
-TRIANGLE_SANDWICH = 6962
-ROLL = 6963
-COINS_6964 = 6964
-SQUARE_SANDWICH = 6965
-PRISON_KEY_6966 = 6966
-DRAGON_MED_HELM_6967 = 6967
-TRIANGLE_SANDWICH_NOTED = 6968
-SHARK_6969 = 6969
-PYRAMID_TOP = 6970
-SANDSTONE_1KG = 6971
-SANDSTONE_1KG_NOTED = 6972
-SANDSTONE_2KG = 6973
-SANDSTONE_2KG_NOTED = 6974
-SANDSTONE_5KG = 6975
-SANDSTONE_5KG_NOTED = 6976
-SANDSTONE_10KG = 6977
-SANDSTONE_10KG_NOTED = 6978
-GRANITE_500G = 6979
-GRANITE_500G_NOTED = 6980
-GRANITE_2KG = 6981
-GRANITE_2KG_NOTED = 6982
-GRANITE_5KG = 6983
-GRANITE_5KG_NOTED = 6984
-SANDSTONE_20KG = 6985
-SANDSTONE_32KG = 6986
-SANDSTONE_BODY = 6987
-SANDSTONE_BASE = 6988
-STONE_HEAD = 6989
-STONE_HEAD_6990 = 6990
-STONE_HEAD_6991 = 6991
-STONE_HEAD_6992 = 6992
-Z_SIGIL = 6993
-M_SIGIL = 6994
-R_SIGIL = 6995
-K_SIGIL = 6996
-STONE_LEFT_ARM = 6997
-STONE_RIGHT_ARM = 6998
-STONE_LEFT_LEG = 6999
-STONE_RIGHT_LEG = 7000
-CAMEL_MOULD_P = 7001
-STONE_HEAD_7002 = 7002
-CAMEL_MASK = 7003
-SWARM = 7050
-UNLIT_BUG_LANTERN = 7051
-UNLIT_BUG_LANTERN_NOTED = 7052
-LIT_BUG_LANTERN = 7053
-CHILLI_POTATO = 7054
-CHILLI_POTATO_NOTED = 7055
-EGG_POTATO = 7056
-EGG_POTATO_NOTED = 7057
-MUSHROOM_POTATO = 7058
-MUSHROOM_POTATO_NOTED = 7059
-TUNA_POTATO = 7060
-TUNA_POTATO_NOTED = 7061
-CHILLI_CON_CARNE = 7062
-CHILLI_CON_CARNE_NOTED = 7063
-EGG_AND_TOMATO = 7064
-EGG_AND_TOMATO_NOTED = 7065
-MUSHROOM__ONION = 7066
-MUSHROOM__ONION_NOTED = 7067
-TUNA_AND_CORN = 7068
-TUNA_AND_CORN_NOTED = 7069
-MINCED_MEAT = 7070
-MINCED_MEAT_NOTED = 7071
-SPICY_SAUCE = 7072
-SPICY_SAUCE_NOTED = 7073
-CHOPPED_GARLIC = 7074
-CHOPPED_GARLIC_NOTED = 7075
-UNCOOKED_EGG = 7076
-UNCOOKED_EGG_NOTED = 7077
-SCRAMBLED_EGG = 7078
-SCRAMBLED_EGG_NOTED = 7079
-SLICED_MUSHROOMS = 7080
-SLICED_MUSHROOMS_NOTED = 7081
-FRIED_MUSHROOMS = 7082
-FRIED_MUSHROOMS_NOTED = 7083
-FRIED_ONIONS = 7084
-FRIED_ONIONS_NOTED = 7085
-CHOPPED_TUNA = 7086
-CHOPPED_TUNA_NOTED = 7087
-SWEETCORN_7088 = 7088
-SWEETCORN_NOTED_7089 = 7089
-BURNT_EGG = 7090
-BURNT_EGG_NOTED = 7091
-BURNT_ONION = 7092
-BURNT_ONION_NOTED = 7093
-BURNT_MUSHROOM = 7094
-BURNT_MUSHROOM_NOTED = 7095
-BOARD_GAME_PIECE_7096 = 7096
-BOARD_GAME_PIECE_7097 = 7097
-BOARD_GAME_PIECE_7098 = 7098
-BOARD_GAME_PIECE_7099 = 7099
-BOARD_GAME_PIECE_7100 = 7100
-BOARD_GAME_PIECE_7101 = 7101
-BOARD_GAME_PIECE_7102 = 7102
-BOARD_GAME_PIECE_7103 = 7103
-BOARD_GAME_PIECE_7104 = 7104
-BOARD_GAME_PIECE_7105 = 7105
-BOARD_GAME_PIECE_7106 = 7106
-BOARD_GAME_PIECE_7107 = 7107
-GUNPOWDER = 7108
-FUSE = 7109
-STRIPY_PIRATE_SHIRT = 7110
-STRIPY_PIRATE_SHIRT_NOTED = 7111
-PIRATE_BANDANA = 7112
-PIRATE_BANDANA_NOTED = 7113
-PIRATE_BOOTS = 7114
-PIRATE_BOOTS_NOTED = 7115
-PIRATE_LEGGINGS = 7116
-PIRATE_LEGGINGS_NOTED = 7117
-CANISTER = 7118
-CANNON_BALL_7119 = 7119
-RAMROD = 7120
-REPAIR_PLANK = 7121
-STRIPY_PIRATE_SHIRT_7122 = 7122
-STRIPY_PIRATE_SHIRT_NOTED_7123 = 7123
-PIRATE_BANDANA_7124 = 7124
-PIRATE_BANDANA_NOTED_7125 = 7125
-PIRATE_LEGGINGS_7126 = 7126
-PIRATE_LEGGINGS_NOTED_7127 = 7127
-STRIPY_PIRATE_SHIRT_7128 = 7128
-STRIPY_PIRATE_SHIRT_NOTED_7129 = 7129
-PIRATE_BANDANA_7130 = 7130
-PIRATE_BANDANA_NOTED_7131 = 7131
-PIRATE_LEGGINGS_7132 = 7132
-PIRATE_LEGGINGS_NOTED_7133 = 7133
-STRIPY_PIRATE_SHIRT_7134 = 7134
-STRIPY_PIRATE_SHIRT_NOTED_7135 = 7135
-PIRATE_BANDANA_7136 = 7136
-PIRATE_BANDANA_NOTED_7137 = 7137
-PIRATE_LEGGINGS_7138 = 7138
-PIRATE_LEGGINGS_NOTED_7139 = 7139
-LUCKY_CUTLASS = 7140
-HARRYS_CUTLASS = 7141
-RAPIER = 7142
-PLUNDER = 7143
-BOOK_O_PIRACY = 7144
-CANNON_BARREL = 7145
-BROKEN_CANNON = 7146
-CANNON_BALLS = 7147
-REPAIR_PLANK_7148 = 7148
-CANISTER_7149 = 7149
-TACKS = 7150
-TACKS_7151 = 7151
-TACKS_7152 = 7152
-TACKS_7153 = 7153
-TACKS_7154 = 7154
-ROPE_7155 = 7155
-TINDERBOX_7156 = 7156
-BRAINDEATH_RUM = 7157
-DRAGON_2H_SWORD = 7158
-INSULATED_BOOTS = 7159
-KILLERWATT = 7160
-INSULATED_BOOTS_NOTED = 7161
-PIE_RECIPE_BOOK = 7162
-PIE_RECIPE_BOOK_NOTED = 7163
-PART_MUD_PIE = 7164
-PART_MUD_PIE_NOTED = 7165
-PART_MUD_PIE_7166 = 7166
-PART_MUD_PIE_NOTED_7167 = 7167
-RAW_MUD_PIE = 7168
-RAW_MUD_PIE_NOTED = 7169
-MUD_PIE = 7170
-MUD_PIE_NOTED = 7171
-PART_GARDEN_PIE = 7172
-PART_GARDEN_PIE_NOTED = 7173
-PART_GARDEN_PIE_7174 = 7174
-PART_GARDEN_PIE_NOTED_7175 = 7175
-RAW_GARDEN_PIE = 7176
-RAW_GARDEN_PIE_NOTED = 7177
-GARDEN_PIE = 7178
-GARDEN_PIE_NOTED = 7179
-HALF_A_GARDEN_PIE = 7180
-HALF_A_GARDEN_PIE_NOTED = 7181
-PART_FISH_PIE = 7182
-PART_FISH_PIE_NOTED = 7183
-PART_FISH_PIE_7184 = 7184
-PART_FISH_PIE_NOTED_7185 = 7185
-RAW_FISH_PIE = 7186
-RAW_FISH_PIE_NOTED = 7187
-FISH_PIE = 7188
-FISH_PIE_NOTED = 7189
-HALF_A_FISH_PIE = 7190
-HALF_A_FISH_PIE_NOTED = 7191
-PART_ADMIRAL_PIE = 7192
-PART_ADMIRAL_PIE_NOTED = 7193
-PART_ADMIRAL_PIE_7194 = 7194
-PART_ADMIRAL_PIE_NOTED_7195 = 7195
-RAW_ADMIRAL_PIE = 7196
-RAW_ADMIRAL_PIE_NOTED = 7197
-ADMIRAL_PIE = 7198
-ADMIRAL_PIE_NOTED = 7199
-HALF_AN_ADMIRAL_PIE = 7200
-HALF_AN_ADMIRAL_PIE_NOTED = 7201
-PART_WILD_PIE = 7202
-PART_WILD_PIE_NOTED = 7203
-PART_WILD_PIE_7204 = 7204
-PART_WILD_PIE_NOTED_7205 = 7205
-RAW_WILD_PIE = 7206
-RAW_WILD_PIE_NOTED = 7207
-WILD_PIE = 7208
-WILD_PIE_NOTED = 7209
-HALF_A_WILD_PIE = 7210
-HALF_A_WILD_PIE_NOTED = 7211
-PART_SUMMER_PIE = 7212
-PART_SUMMER_PIE_NOTED = 7213
-PART_SUMMER_PIE_7214 = 7214
-PART_SUMMER_PIE_NOTED_7215 = 7215
-RAW_SUMMER_PIE = 7216
-RAW_SUMMER_PIE_NOTED = 7217
-SUMMER_PIE = 7218
-SUMMER_PIE_NOTED = 7219
-HALF_A_SUMMER_PIE = 7220
-HALF_A_SUMMER_PIE_NOTED = 7221
-BURNT_RABBIT = 7222
-ROAST_RABBIT = 7223
-SKEWERED_RABBIT = 7224
-IRON_SPIT = 7225
-BURNT_CHOMPY = 7226
-BURNT_CHOMPY_NOTED = 7227
-COOKED_CHOMPY_7228 = 7228
-COOKED_CHOMPY_NOTED_7229 = 7229
-SKEWERED_CHOMPY = 7230
-BURNT_RABBIT_NOTED = 7231
-ROAST_RABBIT_NOTED = 7232
-SKEWERED_RABBIT_NOTED = 7233
-IRON_SPIT_NOTED = 7234
-SKEWERED_CHOMPY_NOTED = 7235
-CLUE_SCROLL_EASY_7236 = 7236
-CASKET_EASY_7237 = 7237
-CLUE_SCROLL_EASY_7238 = 7238
-CLUE_SCROLL_HARD_7239 = 7239
-CASKET_HARD_7240 = 7240
-CLUE_SCROLL_HARD_7241 = 7241
-CASKET_HARD_7242 = 7242
-CLUE_SCROLL_HARD_7243 = 7243
-CASKET_HARD_7244 = 7244
-CLUE_SCROLL_HARD_7245 = 7245
-CASKET_HARD_7246 = 7246
-CLUE_SCROLL_HARD_7247 = 7247
-CLUE_SCROLL_HARD_7248 = 7248
-CLUE_SCROLL_HARD_7249 = 7249
-CLUE_SCROLL_HARD_7250 = 7250
-CLUE_SCROLL_HARD_7251 = 7251
-CLUE_SCROLL_HARD_7252 = 7252
-CLUE_SCROLL_HARD_7253 = 7253
-CLUE_SCROLL_HARD_7254 = 7254
-CLUE_SCROLL_HARD_7255 = 7255
-CLUE_SCROLL_HARD_7256 = 7256
-CASKET_HARD_7257 = 7257
-CLUE_SCROLL_HARD_7258 = 7258
-CASKET_HARD_7259 = 7259
-CLUE_SCROLL_HARD_7260 = 7260
-CASKET_HARD_7261 = 7261
-CLUE_SCROLL_HARD_7262 = 7262
-CASKET_HARD_7263 = 7263
-CLUE_SCROLL_HARD_7264 = 7264
-CASKET_HARD_7265 = 7265
-CLUE_SCROLL_HARD_7266 = 7266
-CASKET_HARD_7267 = 7267
-CLUE_SCROLL_HARD_7268 = 7268
-CHALLENGE_SCROLL_HARD = 7269
-CLUE_SCROLL_HARD_7270 = 7270
-CHALLENGE_SCROLL_HARD_7271 = 7271
-CLUE_SCROLL_HARD_7272 = 7272
-CHALLENGE_SCROLL_HARD_7273 = 7273
-CLUE_SCROLL_MEDIUM_7274 = 7274
-CHALLENGE_SCROLL_MEDIUM_7275 = 7275
-CLUE_SCROLL_MEDIUM_7276 = 7276
-CHALLENGE_SCROLL_MEDIUM_7277 = 7277
-CLUE_SCROLL_MEDIUM_7278 = 7278
-CHALLENGE_SCROLL_MEDIUM_7279 = 7279
-CLUE_SCROLL_MEDIUM_7280 = 7280
-CHALLENGE_SCROLL_MEDIUM_7281 = 7281
-CLUE_SCROLL_MEDIUM_7282 = 7282
-CHALLENGE_SCROLL_MEDIUM_7283 = 7283
-CLUE_SCROLL_MEDIUM_7284 = 7284
-CHALLENGE_SCROLL_MEDIUM_7285 = 7285
-CLUE_SCROLL_MEDIUM_7286 = 7286
-CASKET_MEDIUM_7287 = 7287
-CLUE_SCROLL_MEDIUM_7288 = 7288
-CASKET_MEDIUM_7289 = 7289
-CLUE_SCROLL_MEDIUM_7290 = 7290
-CASKET_MEDIUM_7291 = 7291
-CLUE_SCROLL_MEDIUM_7292 = 7292
-CASKET_MEDIUM_7293 = 7293
-CLUE_SCROLL_MEDIUM_7294 = 7294
-CASKET_MEDIUM_7295 = 7295
-CLUE_SCROLL_MEDIUM_7296 = 7296
-KEY_MEDIUM_7297 = 7297
-CLUE_SCROLL_MEDIUM_7298 = 7298
-KEY_MEDIUM_7299 = 7299
-CLUE_SCROLL_MEDIUM_7300 = 7300
-CLUE_SCROLL_MEDIUM_7301 = 7301
-KEY_MEDIUM_7302 = 7302
-CLUE_SCROLL_MEDIUM_7303 = 7303
-CLUE_SCROLL_MEDIUM_7304 = 7304
-CLUE_SCROLL_MEDIUM_7305 = 7305
-CASKET_MEDIUM_7306 = 7306
-CLUE_SCROLL_MEDIUM_7307 = 7307
-CASKET_MEDIUM_7308 = 7308
-CLUE_SCROLL_MEDIUM_7309 = 7309
-CASKET_MEDIUM_7310 = 7310
-CLUE_SCROLL_MEDIUM_7311 = 7311
-CASKET_MEDIUM_7312 = 7312
-CLUE_SCROLL_MEDIUM_7313 = 7313
-CASKET_MEDIUM_7314 = 7314
-CLUE_SCROLL_MEDIUM_7315 = 7315
-CASKET_MEDIUM_7316 = 7316
-CLUE_SCROLL_MEDIUM_7317 = 7317
-CASKET_MEDIUM_7318 = 7318
-RED_BOATER = 7319
-RED_BOATER_NOTED = 7320
-ORANGE_BOATER = 7321
-ORANGE_BOATER_NOTED = 7322
-GREEN_BOATER = 7323
-GREEN_BOATER_NOTED = 7324
-BLUE_BOATER = 7325
-BLUE_BOATER_NOTED = 7326
-BLACK_BOATER = 7327
-BLACK_BOATER_NOTED = 7328
-RED_FIRELIGHTER = 7329
-GREEN_FIRELIGHTER = 7330
-BLUE_FIRELIGHTER = 7331
-BLACK_SHIELD_H1 = 7332
-BLACK_SHIELD_H1_NOTED = 7333
-ADAMANT_SHIELD_H1 = 7334
-ADAMANT_SHIELD_H1_NOTED = 7335
-RUNE_SHIELD_H1 = 7336
-RUNE_SHIELD_H1_NOTED = 7337
-BLACK_SHIELD_H2 = 7338
-BLACK_SHIELD_H2_NOTED = 7339
-ADAMANT_SHIELD_H2 = 7340
-ADAMANT_SHIELD_H2_NOTED = 7341
-RUNE_SHIELD_H2 = 7342
-RUNE_SHIELD_H2_NOTED = 7343
-BLACK_SHIELD_H3 = 7344
-BLACK_SHIELD_H3_NOTED = 7345
-ADAMANT_SHIELD_H3 = 7346
-ADAMANT_SHIELD_H3_NOTED = 7347
-RUNE_SHIELD_H3 = 7348
-RUNE_SHIELD_H3_NOTED = 7349
-BLACK_SHIELD_H4 = 7350
-BLACK_SHIELD_H4_NOTED = 7351
-ADAMANT_SHIELD_H4 = 7352
-ADAMANT_SHIELD_H4_NOTED = 7353
-RUNE_SHIELD_H4 = 7354
-RUNE_SHIELD_H4_NOTED = 7355
-BLACK_SHIELD_H5 = 7356
-BLACK_SHIELD_H5_NOTED = 7357
-ADAMANT_SHIELD_H5 = 7358
-ADAMANT_SHIELD_H5_NOTED = 7359
-RUNE_SHIELD_H5 = 7360
-RUNE_SHIELD_H5_NOTED = 7361
-STUDDED_BODY_G = 7362
-STUDDED_BODY_G_NOTED = 7363
-STUDDED_BODY_T = 7364
-STUDDED_BODY_T_NOTED = 7365
-STUDDED_CHAPS_G = 7366
-STUDDED_CHAPS_G_NOTED = 7367
-STUDDED_CHAPS_T = 7368
-STUDDED_CHAPS_T_NOTED = 7369
-GREEN_DHIDE_BODY_G = 7370
-GREEN_DHIDE_BODY_G_NOTED = 7371
-GREEN_DHIDE_BODY_T = 7372
-GREEN_DHIDE_BODY_T_NOTED = 7373
-BLUE_DHIDE_BODY_G = 7374
-BLUE_DHIDE_BODY_G_NOTED = 7375
-BLUE_DHIDE_BODY_T = 7376
-BLUE_DHIDE_BODY_T_NOTED = 7377
-GREEN_DHIDE_CHAPS_G = 7378
-GREEN_DHIDE_CHAPS_G_NOTED = 7379
-GREEN_DHIDE_CHAPS_T = 7380
-GREEN_DHIDE_CHAPS_T_NOTED = 7381
-BLUE_DHIDE_CHAPS_G = 7382
-BLUE_DHIDE_CHAPS_G_NOTED = 7383
-BLUE_DHIDE_CHAPS_T = 7384
-BLUE_DHIDE_CHAPS_T_NOTED = 7385
-BLUE_SKIRT_G = 7386
-BLUE_SKIRT_G_NOTED = 7387
-BLUE_SKIRT_T = 7388
-BLUE_SKIRT_T_NOTED = 7389
-BLUE_WIZARD_ROBE_G = 7390
-BLUE_WIZARD_ROBE_G_NOTED = 7391
-BLUE_WIZARD_ROBE_T = 7392
-BLUE_WIZARD_ROBE_T_NOTED = 7393
-BLUE_WIZARD_HAT_G = 7394
-BLUE_WIZARD_HAT_G_NOTED = 7395
-BLUE_WIZARD_HAT_T = 7396
-BLUE_WIZARD_HAT_T_NOTED = 7397
-ENCHANTED_ROBE = 7398
-ENCHANTED_TOP = 7399
-ENCHANTED_HAT = 7400
-ENCHANTED_ROBE_NOTED = 7401
-ENCHANTED_TOP_NOTED = 7402
-ENCHANTED_HAT_NOTED = 7403
-RED_LOGS = 7404
-GREEN_LOGS = 7405
-BLUE_LOGS = 7406
-DRAGON_2H_SWORD_NOTED = 7407
-DRAYNOR_SKULL = 7408
-MAGIC_SECATEURS = 7409
-QUEENS_SECATEURS = 7410
-SYMPTOMS_LIST = 7411
-BIRD_NEST_7413 = 7413
-PADDLE = 7414
-PADDLE_NOTED = 7415
-MOLE_CLAW = 7416
-MOLE_CLAW_NOTED = 7417
-MOLE_SKIN = 7418
-MOLE_SKIN_NOTED = 7419
-MUTATED_ZYGOMITE = 7420
-FUNGICIDE_SPRAY_10 = 7421
-FUNGICIDE_SPRAY_9 = 7422
-FUNGICIDE_SPRAY_8 = 7423
-FUNGICIDE_SPRAY_7 = 7424
-FUNGICIDE_SPRAY_6 = 7425
-FUNGICIDE_SPRAY_5 = 7426
-FUNGICIDE_SPRAY_4 = 7427
-FUNGICIDE_SPRAY_3 = 7428
-FUNGICIDE_SPRAY_2 = 7429
-FUNGICIDE_SPRAY_1 = 7430
-FUNGICIDE_SPRAY_0 = 7431
-FUNGICIDE = 7432
-WOODEN_SPOON = 7433
-WOODEN_SPOON_NOTED = 7434
-EGG_WHISK = 7435
-EGG_WHISK_NOTED = 7436
-SPORK = 7437
-SPORK_NOTED = 7438
-SPATULA = 7439
-SPATULA_NOTED = 7440
-FRYING_PAN = 7441
-FRYING_PAN_NOTED = 7442
-SKEWER = 7443
-SKEWER_NOTED = 7444
-ROLLING_PIN = 7445
-ROLLING_PIN_NOTED = 7446
-KITCHEN_KNIFE = 7447
-KITCHEN_KNIFE_NOTED = 7448
-MEAT_TENDERISER = 7449
-MEAT_TENDERISER_NOTED = 7450
-CLEAVER = 7451
-CLEAVER_NOTED = 7452
-HARDLEATHER_GLOVES = 7453
-BRONZE_GLOVES = 7454
-IRON_GLOVES = 7455
-STEEL_GLOVES = 7456
-BLACK_GLOVES = 7457
-MITHRIL_GLOVES = 7458
-ADAMANT_GLOVES = 7459
-RUNE_GLOVES = 7460
-DRAGON_GLOVES = 7461
-BARROWS_GLOVES = 7462
-CORNFLOUR = 7463
-BOOK_ON_CHICKENS = 7464
-VANILLA_POD = 7465
-CORNFLOUR_7466 = 7466
-CORNFLOUR_NOTED = 7467
-POT_OF_CORNFLOUR = 7468
-POT_OF_CORNFLOUR_NOTED = 7469
-CORNFLOUR_MIXTURE = 7470
-MILKY_MIXTURE = 7471
-CINNAMON = 7472
-BRULEE = 7473
-BRULEE_7474 = 7474
-BRULEE_7475 = 7475
-BRULEE_SUPREME = 7476
-EVIL_CHICKENS_EGG = 7477
-DRAGON_TOKEN = 7478
-SPICY_STEW = 7479
-RED_SPICE_4 = 7480
-RED_SPICE_3 = 7481
-RED_SPICE_2 = 7482
-RED_SPICE_1 = 7483
-ORANGE_SPICE_4 = 7484
-ORANGE_SPICE_3 = 7485
-ORANGE_SPICE_2 = 7486
-ORANGE_SPICE_1 = 7487
-BROWN_SPICE_4 = 7488
-BROWN_SPICE_3 = 7489
-BROWN_SPICE_2 = 7490
-BROWN_SPICE_1 = 7491
-YELLOW_SPICE_4 = 7492
-YELLOW_SPICE_3 = 7493
-YELLOW_SPICE_2 = 7494
-YELLOW_SPICE_1 = 7495
-EMPTY_SPICE_SHAKER = 7496
-DIRTY_BLAST = 7497
-ANTIQUE_LAMP_7498 = 7498
-ASGOLDIAN_ALE = 7508
-DWARVEN_ROCK_CAKE = 7509
-DWARVEN_ROCK_CAKE_7510 = 7510
-SLOP_OF_COMPROMISE = 7511
-SOGGY_BREAD = 7512
-SPICY_MAGGOTS = 7513
-DYED_ORANGE = 7514
-BREADCRUMBS = 7515
-KELP = 7516
-GROUND_KELP = 7517
-CRAB_MEAT = 7518
-CRAB_MEAT_7519 = 7519
-BURNT_CRAB_MEAT = 7520
-COOKED_CRAB_MEAT = 7521
-COOKED_CRAB_MEAT_NOTED = 7522
-COOKED_CRAB_MEAT_7523 = 7523
-COOKED_CRAB_MEAT_7524 = 7524
-COOKED_CRAB_MEAT_7525 = 7525
-COOKED_CRAB_MEAT_7526 = 7526
-GROUND_CRAB_MEAT = 7527
-GROUND_COD = 7528
-RAW_FISHCAKE = 7529
-COOKED_FISHCAKE = 7530
-BURNT_FISHCAKE = 7531
-MUDSKIPPER_HIDE = 7532
-ROCK_7533 = 7533
-FISHBOWL_HELMET = 7534
-DIVING_APPARATUS = 7535
-FRESH_CRAB_CLAW = 7536
-CRAB_CLAW = 7537
-FRESH_CRAB_SHELL = 7538
-CRAB_HELMET = 7539
-BROKEN_CRAB_CLAW = 7540
-BROKEN_CRAB_SHELL = 7541
-CAKE_OF_GUIDANCE = 7542
-RAW_GUIDE_CAKE = 7543
-ENCHANTED_EGG = 7544
-ENCHANTED_MILK = 7545
-ENCHANTED_FLOUR = 7546
-DRUID_POUCH_7547 = 7547
-POTATO_SEED_7548 = 7548
-POTATO_SEED_NOTED = 7549
-ONION_SEED_7550 = 7550
-ONION_SEED_NOTED = 7551
-MITHRIL_ARROW_7552 = 7552
-MITHRIL_ARROW_NOTED = 7553
-FIRE_RUNE_7554 = 7554
-FIRE_RUNE_NOTED_7555 = 7555
-WATER_RUNE_7556 = 7556
-WATER_RUNE_NOTED_7557 = 7557
-AIR_RUNE_7558 = 7558
-AIR_RUNE_NOTED_7559 = 7559
-CHAOS_RUNE_7560 = 7560
-CHAOS_RUNE_NOTED_7561 = 7561
-TOMATO_SEED_7562 = 7562
-TOMATO_SEED_NOTED = 7563
-BALLOON_TOAD = 7564
-BALLOON_TOAD_7565 = 7565
-RAW_JUBBLY = 7566
-RAW_JUBBLY_NOTED = 7567
-COOKED_JUBBLY = 7568
-COOKED_JUBBLY_NOTED = 7569
-BURNT_JUBBLY = 7570
-BURNT_JUBBLY_NOTED = 7571
-RED_BANANA = 7572
-TCHIKI_MONKEY_NUTS = 7573
-SLICED_RED_BANANA = 7574
-TCHIKI_NUT_PASTE = 7575
-SNAKE_CORPSE = 7576
-RAW_STUFFED_SNAKE = 7577
-ODD_STUFFED_SNAKE = 7578
-STUFFED_SNAKE = 7579
-SNAKE_OVERCOOKED = 7580
-OVERGROWN_HELLCAT = 7581
-HELL_CAT = 7582
-HELLKITTEN = 7583
-LAZY_HELL_CAT = 7584
-WILY_HELLCAT = 7585
-DUMMY = 7586
-COFFIN = 7587
-COFFIN_7588 = 7588
-COFFIN_7589 = 7589
-COFFIN_7590 = 7590
-COFFIN_7591 = 7591
-ZOMBIE_SHIRT = 7592
-ZOMBIE_TROUSERS = 7593
-ZOMBIE_MASK = 7594
-ZOMBIE_GLOVES = 7595
-ZOMBIE_BOOTS = 7596
-ITEM = 7597
-ITEM_7598 = 7598
-ITEM_7599 = 7599
-ITEM_7600 = 7600
-ITEM_7601 = 7601
-ITEM_7602 = 7602
-ITEM_7603 = 7603
-ITEM_7604 = 7604
-ITEM_7605 = 7605
-ITEM_7606 = 7606
-ITEM_7607 = 7607
-ITEM_7608 = 7608
-ITEM_7609 = 7609
-ITEM_7610 = 7610
-ITEM_7611 = 7611
-ITEM_7612 = 7612
-ITEM_7613 = 7613
-ITEM_7614 = 7614
-ITEM_7615 = 7615
-ITEM_7616 = 7616
-ITEM_7617 = 7617
-ITEM_7618 = 7618
-BUCKET_OF_RUBBLE = 7622
-BUCKET_OF_RUBBLE_NOTED = 7623
-BUCKET_OF_RUBBLE_7624 = 7624
-BUCKET_OF_RUBBLE_NOTED_7625 = 7625
-BUCKET_OF_RUBBLE_7626 = 7626
-BUCKET_OF_RUBBLE_NOTED_7627 = 7627
-PLASTER_FRAGMENT = 7628
-DUSTY_SCROLL = 7629
-CRATE = 7630
-CRATE_NOTED = 7631
-TEMPLE_LIBRARY_KEY = 7632
-THE_SLEEPING_SEVEN = 7633
-HISTORIES_OF_THE_HALLOWLAND = 7634
-MODERN_DAY_MORYTANIA = 7635
-ROD_DUST = 7636
-SILVTHRILL_ROD = 7637
-SILVTHRILL_ROD_7638 = 7638
-ROD_OF_IVANDIS_10 = 7639
-ROD_OF_IVANDIS_9 = 7640
-ROD_OF_IVANDIS_8 = 7641
-ROD_OF_IVANDIS_7 = 7642
-ROD_OF_IVANDIS_6 = 7643
-ROD_OF_IVANDIS_5 = 7644
-ROD_OF_IVANDIS_4 = 7645
-ROD_OF_IVANDIS_3 = 7646
-ROD_OF_IVANDIS_2 = 7647
-ROD_OF_IVANDIS_1 = 7648
-ROD_MOULD = 7649
-SILVER_DUST = 7650
-SILVER_DUST_NOTED = 7651
-GUTHIX_BALANCE_UNF = 7652
-GUTHIX_BALANCE_UNF_NOTED = 7653
-GUTHIX_BALANCE_UNF_7654 = 7654
-GUTHIX_BALANCE_UNF_NOTED_7655 = 7655
-GUTHIX_BALANCE_UNF_7656 = 7656
-GUTHIX_BALANCE_UNF_NOTED_7657 = 7657
-GUTHIX_BALANCE_UNF_7658 = 7658
-GUTHIX_BALANCE_UNF_NOTED_7659 = 7659
-GUTHIX_BALANCE4 = 7660
-GUTHIX_BALANCE4_NOTED = 7661
-GUTHIX_BALANCE3 = 7662
-GUTHIX_BALANCE3_NOTED = 7663
-GUTHIX_BALANCE2 = 7664
-GUTHIX_BALANCE2_NOTED = 7665
-GUTHIX_BALANCE1 = 7666
-GUTHIX_BALANCE1_NOTED = 7667
-GADDERHAMMER = 7668
-GADDERHAMMER_NOTED = 7669
-BOXING_GLOVES = 7671
-BOXING_GLOVES_7673 = 7673
-WOODEN_SWORD = 7675
-WOODEN_SHIELD_7676 = 7676
-TREASURE_STONE = 7677
-PRIZE_KEY = 7678
-PUGEL = 7679
-PUGEL_NOTED = 7680
-GAME_BOOK = 7681
-HOOP = 7682
-HOOP_NOTED = 7683
-DART = 7684
-DART_NOTED = 7685
-BOW_AND_ARROW = 7686
-BOW_AND_ARROW_NOTED = 7687
-KETTLE = 7688
-KETTLE_NOTED = 7689
-FULL_KETTLE = 7690
-HOT_KETTLE = 7691
-POT_OF_TEA_4 = 7692
-POT_OF_TEA_4_NOTED = 7693
-POT_OF_TEA_3 = 7694
-POT_OF_TEA_3_NOTED = 7695
-POT_OF_TEA_2 = 7696
-POT_OF_TEA_2_NOTED = 7697
-POT_OF_TEA_1 = 7698
-POT_OF_TEA_1_NOTED = 7699
-TEAPOT_WITH_LEAVES = 7700
-TEAPOT_WITH_LEAVES_NOTED = 7701
-TEAPOT = 7702
-TEAPOT_NOTED = 7703
-POT_OF_TEA_4_7704 = 7704
-POT_OF_TEA_4_NOTED_7705 = 7705
-POT_OF_TEA_3_7706 = 7706
-POT_OF_TEA_3_NOTED_7707 = 7707
-POT_OF_TEA_2_7708 = 7708
-POT_OF_TEA_2_NOTED_7709 = 7709
-POT_OF_TEA_1_7710 = 7710
-POT_OF_TEA_1_NOTED_7711 = 7711
-TEAPOT_WITH_LEAVES_7712 = 7712
-TEAPOT_WITH_LEAVES_NOTED_7713 = 7713
-TEAPOT_7714 = 7714
-TEAPOT_NOTED_7715 = 7715
-POT_OF_TEA_4_7716 = 7716
-POT_OF_TEA_4_NOTED_7717 = 7717
-POT_OF_TEA_3_7718 = 7718
-POT_OF_TEA_3_NOTED_7719 = 7719
-POT_OF_TEA_2_7720 = 7720
-POT_OF_TEA_2_NOTED_7721 = 7721
-POT_OF_TEA_1_7722 = 7722
-POT_OF_TEA_1_NOTED_7723 = 7723
-TEAPOT_WITH_LEAVES_7724 = 7724
-TEAPOT_WITH_LEAVES_NOTED_7725 = 7725
-TEAPOT_7726 = 7726
-TEAPOT_NOTED_7727 = 7727
-EMPTY_CUP_7728 = 7728
-EMPTY_CUP_NOTED_7729 = 7729
-CUP_OF_TEA_7730 = 7730
-CUP_OF_TEA_7731 = 7731
-PORCELAIN_CUP_7732 = 7732
-CUP_OF_TEA_7733 = 7733
-CUP_OF_TEA_7734 = 7734
-PORCELAIN_CUP_7735 = 7735
-CUP_OF_TEA_7736 = 7736
-CUP_OF_TEA_7737 = 7737
-TEA_LEAVES = 7738
-TEA_LEAVES_NOTED = 7739
-BEER_7740 = 7740
-BEER_NOTED_7741 = 7741
-BEER_GLASS_7742 = 7742
-BEER_GLASS_NOTED_7743 = 7743
-ASGARNIAN_ALE_7744 = 7744
-ASGARNIAN_ALE_NOTED_7745 = 7745
-GREENMANS_ALE_7746 = 7746
-GREENMANS_ALE_NOTED_7747 = 7747
-DRAGON_BITTER_7748 = 7748
-DRAGON_BITTER_NOTED_7749 = 7749
-MOONLIGHT_MEAD_7750 = 7750
-MOONLIGHT_MEAD_NOTED_7751 = 7751
-CIDER_7752 = 7752
-CIDER_NOTED_7753 = 7753
-CHEFS_DELIGHT_7754 = 7754
-CHEFS_DELIGHT_NOTED_7755 = 7755
-PAINTBRUSH = 7756
-PAINTBRUSH_NOTED = 7757
-TOY_SOLDIER = 7759
-TOY_SOLDIER_NOTED = 7760
-TOY_SOLDIER_WOUND = 7761
-TOY_SOLDIER_WOUND_NOTED = 7762
-TOY_DOLL = 7763
-TOY_DOLL_NOTED = 7764
-TOY_DOLL_WOUND = 7765
-TOY_DOLL_WOUND_NOTED = 7766
-TOY_MOUSE = 7767
-TOY_MOUSE_NOTED = 7768
-TOY_MOUSE_WOUND = 7769
-TOY_MOUSE_WOUND_NOTED = 7770
-TOY_CAT = 7771
-TOY_CAT_NOTED = 7772
-BRANCH_7773 = 7773
-REWARD_TOKEN = 7774
-REWARD_TOKEN_7775 = 7775
-REWARD_TOKEN_7776 = 7776
-LONG_VINE = 7777
-SHORT_VINE = 7778
-FISHING_TOME = 7779
-FISHING_TOME_7780 = 7780
-FISHING_TOME_7781 = 7781
-AGILITY_TOME = 7782
-AGILITY_TOME_7783 = 7783
-AGILITY_TOME_7784 = 7784
-THIEVING_TOME = 7785
-THIEVING_TOME_7786 = 7786
-THIEVING_TOME_7787 = 7787
-SLAYER_TOME = 7788
-SLAYER_TOME_7789 = 7789
-SLAYER_TOME_7790 = 7790
-MINING_TOME = 7791
-MINING_TOME_7792 = 7792
-MINING_TOME_7793 = 7793
-FIREMAKING_TOME = 7794
-FIREMAKING_TOME_7795 = 7795
-FIREMAKING_TOME_7796 = 7796
-WOODCUTTING_TOME = 7797
-WOODCUTTING_TOME_7798 = 7798
-WOODCUTTING_TOME_7799 = 7799
-SNAIL_SHELL = 7800
-SNAKE_HIDE_7801 = 7801
-SNAKE_HIDE_NOTED_7802 = 7802
-YIN_YANG_AMULET = 7803
-ANCIENT_MJOLNIR = 7804
-ANCIENT_MJOLNIR_NOTED = 7805
-ANGER_SWORD = 7806
-ANGER_BATTLEAXE = 7807
-ANGER_MACE = 7808
-ANGER_SPEAR = 7809
-JUG_OF_VINEGAR = 7810
-POT_OF_VINEGAR = 7811
-GOBLIN_SKULL = 7812
-BONE_IN_VINEGAR = 7813
-GOBLIN_SKULL_7814 = 7814
-BEAR_RIBS = 7815
-BONE_IN_VINEGAR_7816 = 7816
-BEAR_RIBS_7817 = 7817
-RAM_SKULL = 7818
-BONE_IN_VINEGAR_7819 = 7819
-RAM_SKULL_7820 = 7820
-UNICORN_BONE = 7821
-BONE_IN_VINEGAR_7822 = 7822
-UNICORN_BONE_7823 = 7823
-GIANT_RAT_BONE = 7824
-BONE_IN_VINEGAR_7825 = 7825
-GIANT_RAT_BONE_7826 = 7826
-GIANT_BAT_WING = 7827
-BONE_IN_VINEGAR_7828 = 7828
-GIANT_BAT_WING_7829 = 7829
-WOLF_BONE = 7830
-BONE_IN_VINEGAR_7831 = 7831
-WOLF_BONE_7832 = 7832
-BAT_WING = 7833
-BONE_IN_VINEGAR_7834 = 7834
-BAT_WING_7835 = 7835
-RAT_BONE = 7836
-BONE_IN_VINEGAR_7837 = 7837
-RAT_BONE_7838 = 7838
-BABY_DRAGON_BONE = 7839
-BONE_IN_VINEGAR_7840 = 7840
-BABY_DRAGON_BONE_7841 = 7841
-OGRE_RIBS = 7842
-BONE_IN_VINEGAR_7843 = 7843
-OGRE_RIBS_7844 = 7844
-JOGRE_BONE = 7845
-BONE_IN_VINEGAR_7846 = 7846
-JOGRE_BONE_7847 = 7847
-ZOGRE_BONE = 7848
-BONE_IN_VINEGAR_7849 = 7849
-ZOGRE_BONE_7850 = 7850
-MOGRE_BONE = 7851
-BONE_IN_VINEGAR_7852 = 7852
-MOGRE_BONE_7853 = 7853
-MONKEY_PAW = 7854
-BONE_IN_VINEGAR_7855 = 7855
-MONKEY_PAW_7856 = 7856
-DAGANNOTH_RIBS = 7857
-BONE_IN_VINEGAR_7858 = 7858
-DAGANNOTH_RIBS_7859 = 7859
-SNAKE_SPINE = 7860
-BONE_IN_VINEGAR_7861 = 7861
-SNAKE_SPINE_7862 = 7862
-ZOMBIE_BONE = 7863
-BONE_IN_VINEGAR_7864 = 7864
-ZOMBIE_BONE_7865 = 7865
-WEREWOLF_BONE = 7866
-BONE_IN_VINEGAR_7867 = 7867
-WEREWOLF_BONE_7868 = 7868
-MOSS_GIANT_BONE = 7869
-BONE_IN_VINEGAR_7870 = 7870
-MOSS_GIANT_BONE_7871 = 7871
-FIRE_GIANT_BONE = 7872
-BONE_IN_VINEGAR_7873 = 7873
-FIRE_GIANT_BONE_7874 = 7874
-ICE_GIANT_RIBS = 7875
-BONE_IN_VINEGAR_7876 = 7876
-ICE_GIANT_RIBS_7877 = 7877
-TERRORBIRD_WING = 7878
-BONE_IN_VINEGAR_7879 = 7879
-TERRORBIRD_WING_7880 = 7880
-GHOUL_BONE = 7881
-BONE_IN_VINEGAR_7882 = 7882
-GHOUL_BONE_7883 = 7883
-TROLL_BONE = 7884
-BONE_IN_VINEGAR_7885 = 7885
-TROLL_BONE_7886 = 7886
-SEAGULL_WING = 7887
-BONE_IN_VINEGAR_7888 = 7888
-SEAGULL_WING_7889 = 7889
-UNDEAD_COW_RIBS = 7890
-BONE_IN_VINEGAR_7891 = 7891
-UNDEAD_COW_RIBS_7892 = 7892
-EXPERIMENT_BONE = 7893
-BONE_IN_VINEGAR_7894 = 7894
-EXPERIMENT_BONE_7895 = 7895
-RABBIT_BONE = 7896
-BONE_IN_VINEGAR_7897 = 7897
-RABBIT_BONE_7898 = 7898
-BASILISK_BONE = 7899
-BONE_IN_VINEGAR_7900 = 7900
-BASILISK_BONE_7901 = 7901
-DESERT_LIZARD_BONE = 7902
-BONE_IN_VINEGAR_7903 = 7903
-DESERT_LIZARD_BONE_7904 = 7904
-CAVE_GOBLIN_SKULL = 7905
-BONE_IN_VINEGAR_7906 = 7906
-CAVE_GOBLIN_SKULL_7907 = 7907
-BIG_FROG_LEG = 7908
-BONE_IN_VINEGAR_7909 = 7909
-BIG_FROG_LEG_7910 = 7910
-VULTURE_WING = 7911
-BONE_IN_VINEGAR_7912 = 7912
-VULTURE_WING_7913 = 7913
-JACKAL_BONE = 7914
-BONE_IN_VINEGAR_7915 = 7915
-JACKAL_BONE_7916 = 7916
-RAM_SKULL_HELM = 7917
-BONESACK = 7918
-BOTTLE_OF_WINE = 7919
-BOTTLE_OF_WINE_NOTED = 7920
-EMPTY_WINE_BOTTLE = 7921
-AL_KHARID_FLYER = 7922
-OGRE_ARROW_SHAFT_7923 = 7923
-OGRE_ARROW_SHAFT_7924 = 7924
-OGRE_ARROW_SHAFT_7925 = 7925
-OGRE_ARROW_SHAFT_7926 = 7926
-EASTER_RING = 7927
-EASTER_EGG_7928 = 7928
-EASTER_EGG_7929 = 7929
-EASTER_EGG_7930 = 7930
-EASTER_EGG_7931 = 7931
-EASTER_EGG_7932 = 7932
-EASTER_EGG_7933 = 7933
-FIELD_RATION = 7934
-FIELD_RATION_NOTED = 7935
-PURE_ESSENCE = 7936
-PURE_ESSENCE_NOTED = 7937
-DARK_ESSENCE_FRAGMENTS = 7938
-TORTOISE_SHELL = 7939
-TORTOISE_SHELL_NOTED = 7940
-IRON_SHEET = 7941
-FRESH_MONKFISH = 7942
-FRESH_MONKFISH_7943 = 7943
-RAW_MONKFISH = 7944
-RAW_MONKFISH_NOTED = 7945
-MONKFISH = 7946
-MONKFISH_NOTED = 7947
-BURNT_MONKFISH = 7948
-BURNT_MONKFISH_NOTED = 7949
-BONE_SEEDS = 7950
-HERMANS_BOOK = 7951
-AXE_HANDLE_7952 = 7952
-AXE_HANDLE_NOTED_7953 = 7953
-BURNT_SHRIMP = 7954
-BURNT_SHRIMP_NOTED = 7955
-CASKET_7956 = 7956
-WHITE_APRON_7957 = 7957
-MINING_PROP = 7958
-HEAVY_BOX = 7959
-EMPTY_BOX = 7960
-BURNT_DIARY = 7961
-BURNT_DIARY_7962 = 7962
-BURNT_DIARY_7963 = 7963
-BURNT_DIARY_7964 = 7964
-BURNT_DIARY_7965 = 7965
-LETTER_7966 = 7966
-ENGINE = 7967
-SCROLL_7968 = 7968
-PULLEY_BEAM = 7969
-LONG_PULLEY_BEAM = 7970
-LONGER_PULLEY_BEAM = 7971
-LIFT_MANUAL = 7972
-BEAM = 7973
-SERVANT_BELL = 7974
-CRAWLING_HAND_7975 = 7975
-COCKATRICE_HEAD = 7976
-BASILISK_HEAD = 7977
-KURASK_HEAD = 7978
-ABYSSAL_HEAD = 7979
-KBD_HEADS = 7980
-KQ_HEAD = 7981
-STUFFED_CRAWLING_HAND = 7982
-STUFFED_COCKATRICE_HEAD = 7983
-STUFFED_BASILISK_HEAD = 7984
-STUFFED_KURASK_HEAD = 7985
-STUFFED_ABYSSAL_HEAD = 7986
-STUFFED_KBD_HEADS = 7987
-STUFFED_KQ_HEAD = 7988
-BIG_BASS = 7989
-STUFFED_BIG_BASS = 7990
-BIG_SWORDFISH = 7991
-STUFFED_BIG_SWORDFISH = 7992
-BIG_SHARK = 7993
-STUFFED_BIG_SHARK = 7994
-ARTHUR_PORTRAIT = 7995
-ELENA_PORTRAIT = 7996
-KELDAGRIM_PORTRAIT = 7997
-MISC_PORTRAIT = 7998
-DESERT_PAINTING = 7999
-ISAFDAR_PAINTING = 8000
-KARAMJA_PAINTING = 8001
-LUMBRIDGE_PAINTING = 8002
-MORYTANIA_PAINTING = 8003
-SMALL_MAP = 8004
-MEDIUM_MAP = 8005
-LARGE_MAP = 8006
-VARROCK_TELEPORT = 8007
-LUMBRIDGE_TELEPORT = 8008
-FALADOR_TELEPORT = 8009
-CAMELOT_TELEPORT = 8010
-ARDOUGNE_TELEPORT = 8011
-WATCHTOWER_TELEPORT = 8012
-TELEPORT_TO_HOUSE = 8013
-BONES_TO_BANANAS = 8014
-BONES_TO_PEACHES_8015 = 8015
-ENCHANT_SAPPHIRE_OR_OPAL = 8016
-ENCHANT_EMERALD_OR_JADE = 8017
-ENCHANT_RUBY_OR_TOPAZ = 8018
-ENCHANT_DIAMOND = 8019
-ENCHANT_DRAGONSTONE = 8020
-ENCHANT_ONYX = 8021
-TELEKINETIC_GRAB = 8022
-BOXING_RING = 8023
-FENCING_RING = 8024
-COMBAT_RING = 8025
-RANGING_PEDESTALS = 8026
-BALANCE_BEAM = 8027
-GLOVE_RACK = 8028
-WEAPONS_RACK = 8029
-EXTRA_WEAPONS_RACK = 8030
-WOODEN_BED = 8031
-OAK_BED = 8032
-LARGE_OAK_BED = 8033
-TEAK_BED = 8034
-LARGE_TEAK_BED = 8035
-_4POSTER = 8036
-GILDED_4POSTER = 8037
-SHOE_BOX = 8038
-OAK_DRAWERS = 8039
-OAK_WARDROBE = 8040
-TEAK_DRAWERS = 8041
-TEAK_WARDROBE = 8042
-MAHOGANY_WARDROBE = 8043
-GILDED_WARDROBE = 8044
-SHAVING_STAND = 8045
-OAK_SHAVING_STAND = 8046
-OAK_DRESSER = 8047
-TEAK_DRESSER = 8048
-FANCY_TEAK_DRESSER = 8049
-MAHOGANY_DRESSER = 8050
-GILDED_DRESSER = 8051
-OAK_CLOCK = 8052
-TEAK_CLOCK = 8053
-GILDED_CLOCK = 8054
-SARADOMIN_SYMBOL = 8055
-ZAMORAK_SYMBOL = 8056
-GUTHIX_SYMBOL = 8057
-SARADOMIN_ICON = 8058
-ZAMORAK_ICON = 8059
-GUTHIX_ICON = 8060
-BOB_ICON = 8061
-OAK_ALTAR = 8062
-TEAK_ALTAR = 8063
-CLOTHCOVERED_ALTAR = 8064
-MAHOGANY_ALTAR = 8065
-LIMESTONE_ALTAR = 8066
-MARBLE_ALTAR = 8067
-GILDED_ALTAR = 8068
-WOODEN_TORCHES = 8069
-STEEL_TORCHES = 8070
-STEEL_CANDLESTICKS = 8071
-GOLD_CANDLESTICKS = 8072
-INCENSE_BURNERS = 8073
-MAHOGANY_BURNERS = 8074
-MARBLE_BURNERS = 8075
-SHUTTERED_WINDOW = 8076
-DECORATIVE_WINDOW = 8077
-STAINED_GLASS = 8078
-WINDCHIMES = 8079
-BELLS = 8080
-ORGAN = 8081
-SMALL_STATUES = 8082
-MEDIUM_STATUES = 8083
-LARGE_STATUES = 8084
-SUIT_OF_ARMOUR = 8085
-SMALL_PORTRAIT = 8086
-MINOR_HEAD = 8087
-MEDIUM_HEAD = 8088
-MAJOR_HEAD = 8089
-MOUNTED_SWORD = 8090
-SMALL_LANDSCAPE = 8091
-LARGE_PORTRAIT = 8093
-LARGE_LANDSCAPE = 8094
-RUNE_DISPLAY_CASE = 8095
-LOWLEVEL_PLANTS = 8096
-MIDLEVEL_PLANTS = 8097
-HIGHLEVEL_PLANTS = 8098
-ROPE_BELLPULL = 8099
-BELLPULL = 8100
-POSH_BELLPULL = 8101
-OAK_DECORATION = 8102
-TEAK_DECORATION = 8103
-GILDED_DECORATION = 8104
-ROUND_SHIELD = 8105
-SQUARE_SHIELD = 8106
-KITE_SHIELD = 8107
-WOODEN_BENCH = 8108
-OAK_BENCH = 8109
-CARVED_OAK_BENCH = 8110
-TEAK_DINING_BENCH = 8111
-CARVED_TEAK_BENCH = 8112
-MAHOGANY_BENCH = 8113
-GILDED_BENCH = 8114
-WOOD_DINING_TABLE = 8115
-OAK_DINING_TABLE = 8116
-CARVED_OAK_TABLE = 8117
-TEAK_TABLE = 8118
-CARVED_TEAK_TABLE = 8119
-MAHOGANY_TABLE = 8120
-OPULENT_TABLE = 8121
-OAK_DOOR = 8122
-STEELPLATED_DOOR = 8123
-MARBLE_DOOR = 8124
-DECORATIVE_BLOOD = 8125
-DECORATIVE_PIPE = 8126
-HANGING_SKELETON = 8127
-CANDLES = 8128
-TORCHES = 8129
-SKULL_TORCHES = 8130
-SKELETON_GUARD = 8131
-GUARD_DOG = 8132
-HOBGOBLIN_GUARD = 8133
-BABY_RED_DRAGON = 8134
-HUGE_SPIDER = 8135
-TROLL_GUARD = 8136
-HELLHOUND = 8137
-DEMON = 8138
-KALPHITE_SOLDIER = 8139
-TOKXIL = 8140
-DAGANNOTH = 8141
-STEEL_DRAGON = 8142
-SPIKE_TRAP = 8143
-MAN_TRAP = 8144
-TANGLE_VINE = 8145
-MARBLE_TRAP = 8146
-TELEPORT_TRAP = 8147
-WOODEN_CRATE = 8148
-OAK_CHEST = 8149
-TEAK_CHEST = 8150
-MAHOGANY_CHEST = 8151
-MAGIC_CHEST = 8152
-CLAY_ATTACK_STONE = 8153
-ATTACK_STONE = 8154
-MARBLE_ATT_STONE = 8155
-MAGICAL_BALANCE_1 = 8156
-MAGICAL_BALANCE_2 = 8157
-MAGICAL_BALANCE_3 = 8158
-JESTER = 8159
-TREASURE_HUNT = 8160
-HANGMAN_GAME = 8161
-HOOP_AND_STICK = 8162
-DARTBOARD = 8163
-ARCHERY_TARGET = 8164
-OAK_PRIZE_CHEST = 8165
-TEAK_PRIZE_CHEST = 8166
-MAHOGANY_CHEST_8167 = 8167
-EXIT_PORTAL = 8168
-DECORATIVE_ROCK = 8169
-POND = 8170
-IMP_STATUE = 8171
-DUNGEON_ENTRANCE = 8172
-TREE = 8173
-NICE_TREE = 8174
-OAK_TREE = 8175
-WILLOW_TREE = 8176
-MAPLE_TREE = 8177
-YEW_TREE = 8178
-MAGIC_TREE = 8179
-PLANT = 8180
-SMALL_FERN = 8181
-FERN = 8182
-DOCK_LEAF = 8183
-THISTLE = 8184
-REEDS = 8185
-FERN_8186 = 8186
-BUSH = 8187
-TALL_PLANT = 8188
-SHORT_PLANT = 8189
-LARGELEAF_PLANT = 8190
-HUGE_PLANT = 8191
-GAZEBO = 8192
-SMALL_FOUNTAIN = 8193
-LARGE_FOUNTAIN = 8194
-POSH_FOUNTAIN = 8195
-BOUNDARY_STONES = 8196
-WOODEN_FENCE = 8197
-STONE_WALL = 8198
-IRON_RAILINGS = 8199
-PICKET_FENCE = 8200
-GARDEN_FENCE = 8201
-MARBLE_WALL = 8202
-THORNY_HEDGE = 8203
-NICE_HEDGE = 8204
-SMALL_BOX_HEDGE = 8205
-TOPIARY_HEDGE = 8206
-FANCY_HEDGE = 8207
-TALL_FANCY_HEDGE = 8208
-TALL_BOX_HEDGE = 8209
-ROSEMARY_8210 = 8210
-DAFFODILS = 8211
-BLUEBELLS = 8212
-SUNFLOWER = 8213
-MARIGOLDS_8214 = 8214
-ROSES = 8215
-FIREPIT = 8216
-FIREPIT_WITH_HOOK = 8217
-FIREPIT_WITH_POT = 8218
-SMALL_OVEN = 8219
-LARGE_OVEN = 8220
-STEEL_RANGE = 8221
-FANCY_RANGE = 8222
-WOODEN_SHELVES_1 = 8223
-WOODEN_SHELVES_2 = 8224
-WOODEN_SHELVES_3 = 8225
-OAK_SHELVES_1 = 8226
-OAK_SHELVES_2 = 8227
-TEAK_SHELVES_1 = 8228
-TEAK_SHELVES_2 = 8229
-PUMP_AND_DRAIN = 8230
-PUMP_AND_TUB = 8231
-SINK = 8232
-WOODEN_LARDER = 8233
-OAK_LARDER = 8234
-TEAK_LARDER = 8235
-CAT_BLANKET = 8236
-CAT_BASKET = 8237
-CUSHIONED_BASKET = 8238
-BEER_BARREL = 8239
-CIDER_BARREL = 8240
-ASGARNIAN_ALE_8241 = 8241
-GREENMANS_ALE_8242 = 8242
-DRAGON_BITTER_8243 = 8243
-CHEFS_DELIGHT_8244 = 8244
-NULL_8245 = 8245
-WOOD_KITCHEN_TABLE = 8246
-OAK_KITCHEN_TABLE = 8247
-TEAK_KITCHEN_TABLE = 8248
-OAK_STAIRCASE = 8249
-OAK_STAIRCASE_8250 = 8250
-OAK_STAIRCASE_8251 = 8251
-TEAK_STAIRCASE = 8252
-TEAK_STAIRCASE_8253 = 8253
-TEAK_STAIRCASE_8254 = 8254
-MARBLE_STAIRCASE = 8255
-MARBLE_STAIRCASE_8256 = 8256
-MARBLE_STAIRCASE_8257 = 8257
-SPIRAL_STAIRCASE = 8258
-MARBLE_SPIRAL = 8259
-CRAWLING_HAND_8260 = 8260
-COCKATRICE_HEAD_8261 = 8261
-BASILISK_HEAD_8262 = 8262
-KURASK_HEAD_8263 = 8263
-ABYSSAL_HEAD_8264 = 8264
-KBD_HEADS_8265 = 8265
-KQ_HEAD_8266 = 8266
-MOUNTED_BASS = 8267
-MOUNTED_SWORDFISH = 8268
-MOUNTED_SHARK = 8269
-MITHRIL_ARMOUR = 8270
-ADAMANTITE_ARMOUR = 8271
-RUNITE_ARMOUR = 8272
-CW_ARMOUR_1 = 8273
-CW_ARMOUR_2 = 8274
-CW_ARMOUR_3 = 8275
-RUNE_CASE_1 = 8276
-RUNE_CASE_2 = 8277
-RUNE_CASE_3 = 8278
-SILVERLIGHT_8279 = 8279
-EXCALIBUR_8280 = 8280
-DARKLIGHT_8281 = 8281
-ANTIDRAGON_SHIELD_8282 = 8282
-AMULET_OF_GLORY_8283 = 8283
-CAPE_OF_LEGENDS_8284 = 8284
-KING_ARTHUR = 8285
-ELENA = 8286
-GIANT_DWARF = 8287
-MISCELLANIANS = 8288
-LUMBRIDGE = 8289
-THE_DESERT = 8290
-MORYTANIA = 8291
-KARAMJA = 8292
-ISAFDAR = 8293
-SMALL_MAP_8294 = 8294
-MEDIUM_MAP_8295 = 8295
-LARGE_MAP_8296 = 8296
-OAK_CAGE = 8297
-OAK_AND_STEEL_CAGE = 8298
-STEEL_CAGE = 8299
-SPIKED_CAGE = 8300
-BONE_CAGE = 8301
-SPIKES = 8302
-TENTACLE_POOL = 8303
-FLAME_PIT = 8304
-ROCNAR = 8305
-OAK_LADDER = 8306
-TEAK_LADDER = 8307
-MAHOGANY_LADDER = 8308
-CRUDE_WOODEN_CHAIR = 8309
-WOODEN_CHAIR = 8310
-ROCKING_CHAIR = 8311
-OAK_CHAIR = 8312
-OAK_ARMCHAIR = 8313
-TEAK_ARMCHAIR = 8314
-MAHOGANY_ARMCHAIR = 8315
-BROWN_RUG = 8316
-RUG = 8317
-OPULENT_RUG = 8318
-WOODEN_BOOKCASE = 8319
-OAK_BOOKCASE = 8320
-MAHOGANY_BOOKCASE = 8321
-TORN_CURTAINS = 8322
-CURTAINS = 8323
-OPULENT_CURTAINS = 8324
-CLAY_FIREPLACE = 8325
-STONE_FIREPLACE = 8326
-MARBLE_FIREPLACE = 8327
-TEAK_PORTAL = 8328
-MAHOGANY_PORTAL = 8329
-MARBLE_PORTAL = 8330
-TELEPORT_FOCUS = 8331
-GREATER_FOCUS = 8332
-SCRYING_POOL = 8333
-OAK_LECTERN = 8334
-EAGLE_LECTERN = 8335
-DEMON_LECTERN = 8336
-TEAK_EAGLE_LECTERN = 8337
-TEAK_DEMON_LECTERN = 8338
-MAHOGANY_EAGLE = 8339
-MAHOGANY_DEMON = 8340
-GLOBE = 8341
-ORNAMENTAL_GLOBE = 8342
-LUNAR_GLOBE = 8343
-CELESTIAL_GLOBE = 8344
-ARMILLARY_SPHERE = 8345
-SMALL_ORRERY = 8346
-LARGE_ORRERY = 8347
-OAK_TELESCOPE = 8348
-TEAK_TELESCOPE = 8349
-MAHOGANY_TELESCOPE = 8350
-CRYSTAL_BALL = 8351
-ELEMENTAL_SPHERE = 8352
-CRYSTAL_OF_POWER = 8353
-ALCHEMICAL_CHART = 8354
-ASTRONOMICAL_CHART = 8355
-INFERNAL_CHART = 8356
-OAK_THRONE = 8357
-TEAK_THRONE = 8358
-MAHOGANY_THRONE = 8359
-GILDED_THRONE = 8360
-SKELETON_THRONE = 8361
-CRYSTAL_THRONE = 8362
-DEMONIC_THRONE = 8363
-OAK_LEVER = 8364
-TEAK_LEVER = 8365
-MAHOGANY_LEVER = 8366
-TRAPDOOR = 8367
-TRAPDOOR_8368 = 8368
-TRAPDOOR_8369 = 8369
-FLOOR_DECORATION = 8370
-STEEL_CAGE_8371 = 8371
-TRAPDOOR_8372 = 8372
-LESSER_MAGIC_CAGE = 8373
-GREATER_MAGIC_CAGE = 8374
-WOODEN_WORKBENCH = 8375
-OAK_WORKBENCH = 8376
-STEEL_FRAMED_BENCH = 8377
-BENCH_WITH_VICE = 8378
-BENCH_WITH_LATHE = 8379
-CRAFTING_TABLE_1 = 8380
-CRAFTING_TABLE_2 = 8381
-CRAFTING_TABLE_3 = 8382
-CRAFTING_TABLE_4 = 8383
-TOOL_STORE_1 = 8384
-TOOL_STORE_2 = 8385
-TOOL_STORE_3 = 8386
-TOOL_STORE_4 = 8387
-TOOL_STORE_5 = 8388
-REPAIR_BENCH = 8389
-WHETSTONE = 8390
-ARMOUR_STAND = 8391
-PLUMING_STAND = 8392
-SHIELD_EASEL = 8393
-BANNER_EASEL = 8394
-PARLOUR = 8395
-KITCHEN = 8396
-DINING_ROOM = 8397
-BEDROOM = 8398
-GAMES_ROOM = 8399
-COMBAT_ROOM = 8400
-HALL = 8401
-HALL_8402 = 8402
-HALL_8403 = 8403
-HALL_8404 = 8404
-CHAPEL = 8405
-WORKSHOP = 8406
-STUDY = 8407
-PORTAL_CHAMBER = 8408
-THRONE_ROOM = 8409
-OUBLIETTE = 8410
-DUNGEON_CORRIDOR = 8411
-DUNGEON_CROSS = 8412
-DUNGEON_STAIRS = 8413
-TREASURE_ROOM = 8414
-GARDEN = 8415
-FORMAL_GARDEN = 8416
-BAGGED_DEAD_TREE = 8417
-BAGGED_DEAD_TREE_NOTED = 8418
-BAGGED_NICE_TREE = 8419
-BAGGED_NICE_TREE_NOTED = 8420
-BAGGED_OAK_TREE = 8421
-BAGGED_OAK_TREE_NOTED = 8422
-BAGGED_WILLOW_TREE = 8423
-BAGGED_WILLOW_TREE_NOTED = 8424
-BAGGED_MAPLE_TREE = 8425
-BAGGED_MAPLE_TREE_NOTED = 8426
-BAGGED_YEW_TREE = 8427
-BAGGED_YEW_TREE_NOTED = 8428
-BAGGED_MAGIC_TREE = 8429
-BAGGED_MAGIC_TREE_NOTED = 8430
-BAGGED_PLANT_1 = 8431
-BAGGED_PLANT_1_NOTED = 8432
-BAGGED_PLANT_2 = 8433
-BAGGED_PLANT_2_NOTED = 8434
-BAGGED_PLANT_3 = 8435
-BAGGED_PLANT_3_NOTED = 8436
-THORNY_HEDGE_8437 = 8437
-THORNY_HEDGE_NOTED = 8438
-NICE_HEDGE_8439 = 8439
-NICE_HEDGE_NOTED = 8440
-SMALL_BOX_HEDGE_8441 = 8441
-SMALL_BOX_HEDGE_NOTED = 8442
-TOPIARY_HEDGE_8443 = 8443
-TOPIARY_HEDGE_NOTED = 8444
-FANCY_HEDGE_8445 = 8445
-FANCY_HEDGE_NOTED = 8446
-TALL_FANCY_HEDGE_8447 = 8447
-TALL_FANCY_HEDGE_NOTED = 8448
-TALL_BOX_HEDGE_8449 = 8449
-TALL_BOX_HEDGE_NOTED = 8450
-BAGGED_FLOWER = 8451
-BAGGED_FLOWER_NOTED = 8452
-BAGGED_DAFFODILS = 8453
-BAGGED_DAFFODILS_NOTED = 8454
-BAGGED_BLUEBELLS = 8455
-BAGGED_BLUEBELLS_NOTED = 8456
-BAGGED_SUNFLOWER = 8457
-BAGGED_SUNFLOWER_NOTED = 8458
-BAGGED_MARIGOLDS = 8459
-BAGGED_MARIGOLDS_NOTED = 8460
-BAGGED_ROSES = 8461
-BAGGED_ROSES_NOTED = 8462
-CONSTRUCTION_GUIDE = 8463
-RUNE_HERALDIC_HELM = 8464
-DRAGON_BOLTS_UNF = 8465
-RUNE_HERALDIC_HELM_8466 = 8466
-DRAGON_BOLTS_UNF_8467 = 8467
-RUNE_HERALDIC_HELM_8468 = 8468
-DRAGON_BOLTS_UNF_8469 = 8469
-RUNE_HERALDIC_HELM_8470 = 8470
-DRAGON_BOLTS_UNF_8471 = 8471
-RUNE_HERALDIC_HELM_8472 = 8472
-DRAGON_BOLTS = 8473
-RUNE_HERALDIC_HELM_8474 = 8474
-DRAGON_BOLTS_8475 = 8475
-RUNE_HERALDIC_HELM_8476 = 8476
-DRAGON_BOLTS_8477 = 8477
-RUNE_HERALDIC_HELM_8478 = 8478
-DRAGON_BOLTS_8479 = 8479
-RUNE_HERALDIC_HELM_8480 = 8480
-DRAGON_BOLTS_P = 8481
-RUNE_HERALDIC_HELM_8482 = 8482
-DRAGON_BOLTS_P_8483 = 8483
-RUNE_HERALDIC_HELM_8484 = 8484
-DRAGON_BOLTS_P_8485 = 8485
-RUNE_HERALDIC_HELM_8486 = 8486
-DRAGON_BOLTS_P_8487 = 8487
-RUNE_HERALDIC_HELM_8488 = 8488
-OPAL_DRAGON_BOLTS = 8489
-RUNE_HERALDIC_HELM_8490 = 8490
-OPAL_DRAGON_BOLTS_8491 = 8491
-RUNE_HERALDIC_HELM_8492 = 8492
-OPAL_DRAGON_BOLTS_8493 = 8493
-RUNE_HERALDIC_HELM_8494 = 8494
-OPAL_DRAGON_BOLTS_8495 = 8495
-CRUDE_CHAIR = 8496
-CRUDE_CHAIR_NOTED = 8497
-WOODEN_CHAIR_8498 = 8498
-WOODEN_CHAIR_NOTED = 8499
-ROCKING_CHAIR_8500 = 8500
-ROCKING_CHAIR_NOTED = 8501
-OAK_CHAIR_8502 = 8502
-OAK_CHAIR_NOTED = 8503
-OAK_ARMCHAIR_8504 = 8504
-OAK_ARMCHAIR_NOTED = 8505
-TEAK_ARMCHAIR_8506 = 8506
-TEAK_ARMCHAIR_NOTED = 8507
-MAHOGANY_ARMCHAIR_8508 = 8508
-MAHOGANY_ARMCHAIR_NOTED = 8509
-BOOKCASE = 8510
-BOOKCASE_NOTED = 8511
-OAK_BOOKCASE_8512 = 8512
-OAK_BOOKCASE_NOTED = 8513
-MAHOGANY_BOOKCASE_8514 = 8514
-MAHOGANY_BOOKCASE_NOTED = 8515
-BEER_BARREL_8516 = 8516
-BEER_BARREL_NOTED = 8517
-CIDER_BARREL_8518 = 8518
-CIDER_BARREL_NOTED = 8519
-ASGARNIAN_ALE_8520 = 8520
-ASGARNIAN_ALE_NOTED_8521 = 8521
-GREENMANS_ALE_8522 = 8522
-GREENMANS_ALE_NOTED_8523 = 8523
-DRAGON_BITTER_8524 = 8524
-DRAGON_BITTER_NOTED_8525 = 8525
-CHEFS_DELIGHT_8526 = 8526
-CHEFS_DELIGHT_NOTED_8527 = 8527
-KITCHEN_TABLE = 8528
-KITCHEN_TABLE_NOTED = 8529
-OAK_KITCHEN_TABLE_8530 = 8530
-OAK_KITCHEN_TABLE_NOTED = 8531
-TEAK_KITCHEN_TABLE_8532 = 8532
-TEAK_KITCHEN_TABLE_NOTED = 8533
-OAK_LECTERN_8534 = 8534
-OAK_LECTERN_NOTED = 8535
-EAGLE_LECTERN_8536 = 8536
-EAGLE_LECTERN_NOTED = 8537
-DEMON_LECTERN_8538 = 8538
-DEMON_LECTERN_NOTED = 8539
-TEAK_EAGLE_LECTERN_8540 = 8540
-TEAK_EAGLE_LECTERN_NOTED = 8541
-TEAK_DEMON_LECTERN_8542 = 8542
-TEAK_DEMON_LECTERN_NOTED = 8543
-MAHOGANY_EAGLE_8544 = 8544
-MAHOGANY_EAGLE_NOTED = 8545
-MAHOGANY_DEMON_8546 = 8546
-MAHOGANY_DEMON_NOTED = 8547
-WOOD_DINING_TABLE_8548 = 8548
-WOOD_DINING_TABLE_NOTED = 8549
-OAK_DINING_TABLE_8550 = 8550
-OAK_DINING_TABLE_NOTED = 8551
-CARVED_OAK_TABLE_8552 = 8552
-CARVED_OAK_TABLE_NOTED = 8553
-TEAK_TABLE_8554 = 8554
-TEAK_TABLE_NOTED = 8555
-CARVED_TEAK_TABLE_8556 = 8556
-CARVED_TEAK_TABLE_NOTED = 8557
-MAHOGANY_TABLE_8558 = 8558
-MAHOGANY_TABLE_NOTED = 8559
-OPULENT_TABLE_8560 = 8560
-OPULENT_TABLE_NOTED = 8561
-WOODEN_BENCH_8562 = 8562
-WOODEN_BENCH_NOTED = 8563
-OAK_BENCH_8564 = 8564
-OAK_BENCH_NOTED = 8565
-CARVED_OAK_BENCH_8566 = 8566
-CARVED_OAK_BENCH_NOTED = 8567
-TEAK_DINING_BENCH_8568 = 8568
-TEAK_DINING_BENCH_NOTED = 8569
-CARVED_TEAK_BENCH_8570 = 8570
-CARVED_TEAK_BENCH_NOTED = 8571
-MAHOGANY_BENCH_8572 = 8572
-MAHOGANY_BENCH_NOTED = 8573
-GILDED_BENCH_8574 = 8574
-GILDED_BENCH_NOTED = 8575
-WOODEN_BED_8576 = 8576
-WOODEN_BED_NOTED = 8577
-OAK_BED_8578 = 8578
-OAK_BED_NOTED = 8579
-LARGE_OAK_BED_8580 = 8580
-LARGE_OAK_BED_NOTED = 8581
-TEAK_BED_8582 = 8582
-TEAK_BED_NOTED = 8583
-LARGE_TEAK_BED_8584 = 8584
-LARGE_TEAK_BED_NOTED = 8585
-FOURPOSTER_BED = 8586
-FOURPOSTER_BED_NOTED = 8587
-GILDED_FOURPOSTER = 8588
-GILDED_FOURPOSTER_NOTED = 8589
-OAK_CLOCK_8590 = 8590
-OAK_CLOCK_NOTED = 8591
-TEAK_CLOCK_8592 = 8592
-TEAK_CLOCK_NOTED = 8593
-GILDED_CLOCK_8594 = 8594
-GILDED_CLOCK_NOTED = 8595
-SHAVING_STAND_8596 = 8596
-SHAVING_STAND_NOTED = 8597
-OAK_SHAVING_STAND_8598 = 8598
-OAK_SHAVING_STAND_NOTED = 8599
-OAK_DRESSER_8600 = 8600
-OAK_DRESSER_NOTED = 8601
-TEAK_DRESSER_8602 = 8602
-TEAK_DRESSER_NOTED = 8603
-FANCY_TEAK_DRESSER_8604 = 8604
-FANCY_TEAK_DRESSER_NOTED = 8605
-MAHOGANY_DRESSER_8606 = 8606
-MAHOGANY_DRESSER_NOTED = 8607
-GILDED_DRESSER_8608 = 8608
-GILDED_DRESSER_NOTED = 8609
-SHOE_BOX_8610 = 8610
-SHOE_BOX_NOTED = 8611
-OAK_DRAWERS_8612 = 8612
-OAK_DRAWERS_NOTED = 8613
-OAK_WARDROBE_8614 = 8614
-OAK_WARDROBE_NOTED = 8615
-TEAK_DRAWERS_8616 = 8616
-TEAK_DRAWERS_NOTED = 8617
-TEAK_WARDROBE_8618 = 8618
-TEAK_WARDROBE_NOTED = 8619
-MAHOGANY_WARDROBE_8620 = 8620
-MAHOGANY_WARDROBE_NOTED = 8621
-GILDED_WARDROBE_8622 = 8622
-GILDED_WARDROBE_NOTED = 8623
-CRYSTAL_BALL_8624 = 8624
-CRYSTAL_BALL_NOTED = 8625
-ELEMENTAL_SPHERE_8626 = 8626
-ELEMENTAL_SPHERE_NOTED = 8627
-CRYSTAL_OF_POWER_8628 = 8628
-CRYSTAL_OF_POWER_NOTED = 8629
-GLOBE_8630 = 8630
-GLOBE_NOTED = 8631
-ORNAMENTAL_GLOBE_8632 = 8632
-ORNAMENTAL_GLOBE_NOTED = 8633
-LUNAR_GLOBE_8634 = 8634
-LUNAR_GLOBE_NOTED = 8635
-CELESTIAL_GLOBE_8636 = 8636
-CELESTIAL_GLOBE_NOTED = 8637
-ARMILLARY_SPHERE_8638 = 8638
-ARMILLARY_SPHERE_NOTED = 8639
-SMALL_ORRERY_8640 = 8640
-SMALL_ORRERY_NOTED = 8641
-LARGE_ORRERY_8642 = 8642
-LARGE_ORRERY_NOTED = 8643
-OAK_TELESCOPE_8644 = 8644
-OAK_TELESCOPE_NOTED = 8645
-TEAK_TELESCOPE_8646 = 8646
-TEAK_TELESCOPE_NOTED = 8647
-MAHOGANY_TELESCOPE_8648 = 8648
-MAHOGANY_TELESCOPE_NOTED = 8649
-BANNER = 8650
-JADE_DRAGON_BOLTS = 8651
-BANNER_8652 = 8652
-JADE_DRAGON_BOLTS_8653 = 8653
-BANNER_8654 = 8654
-JADE_DRAGON_BOLTS_8655 = 8655
-BANNER_8656 = 8656
-JADE_DRAGON_BOLTS_8657 = 8657
-BANNER_8658 = 8658
-PEARL_DRAGON_BOLTS = 8659
-BANNER_8660 = 8660
-PEARL_DRAGON_BOLTS_8661 = 8661
-BANNER_8662 = 8662
-PEARL_DRAGON_BOLTS_8663 = 8663
-BANNER_8664 = 8664
-PEARL_DRAGON_BOLTS_8665 = 8665
-BANNER_8666 = 8666
-TOPAZ_DRAGON_BOLTS = 8667
-BANNER_8668 = 8668
-TOPAZ_DRAGON_BOLTS_8669 = 8669
-BANNER_8670 = 8670
-TOPAZ_DRAGON_BOLTS_8671 = 8671
-BANNER_8672 = 8672
-TOPAZ_DRAGON_BOLTS_8673 = 8673
-BANNER_8674 = 8674
-SAPPHIRE_DRAGON_BOLTS = 8675
-BANNER_8676 = 8676
-SAPPHIRE_DRAGON_BOLTS_8677 = 8677
-BANNER_8678 = 8678
-SAPPHIRE_DRAGON_BOLTS_8679 = 8679
-BANNER_8680 = 8680
-SAPPHIRE_DRAGON_BOLTS_8681 = 8681
-STEEL_HERALDIC_HELM = 8682
-EMERALD_DRAGON_BOLTS = 8683
-STEEL_HERALDIC_HELM_8684 = 8684
-EMERALD_DRAGON_BOLTS_8685 = 8685
-STEEL_HERALDIC_HELM_8686 = 8686
-EMERALD_DRAGON_BOLTS_8687 = 8687
-STEEL_HERALDIC_HELM_8688 = 8688
-EMERALD_DRAGON_BOLTS_8689 = 8689
-STEEL_HERALDIC_HELM_8690 = 8690
-RUBY_DRAGON_BOLTS = 8691
-STEEL_HERALDIC_HELM_8692 = 8692
-RUBY_DRAGON_BOLTS_8693 = 8693
-STEEL_HERALDIC_HELM_8694 = 8694
-RUBY_DRAGON_BOLTS_8695 = 8695
-STEEL_HERALDIC_HELM_8696 = 8696
-RUBY_DRAGON_BOLTS_8697 = 8697
-STEEL_HERALDIC_HELM_8698 = 8698
-DIAMOND_DRAGON_BOLTS = 8699
-STEEL_HERALDIC_HELM_8700 = 8700
-DIAMOND_DRAGON_BOLTS_8701 = 8701
-STEEL_HERALDIC_HELM_8702 = 8702
-DIAMOND_DRAGON_BOLTS_8703 = 8703
-STEEL_HERALDIC_HELM_8704 = 8704
-DIAMOND_DRAGON_BOLTS_8705 = 8705
-STEEL_HERALDIC_HELM_8706 = 8706
-DRAGONSTONE_DRAGON_BOLTS = 8707
-STEEL_HERALDIC_HELM_8708 = 8708
-DRAGONSTONE_DRAGON_BOLTS_8709 = 8709
-STEEL_HERALDIC_HELM_8710 = 8710
-DRAGONSTONE_DRAGON_BOLTS_8711 = 8711
-STEEL_HERALDIC_HELM_8712 = 8712
-DRAGONSTONE_DRAGON_BOLTS_8713 = 8713
-RUNE_KITESHIELD_8714 = 8714
-ONYX_DRAGON_BOLTS = 8715
-RUNE_KITESHIELD_8716 = 8716
-ONYX_DRAGON_BOLTS_8717 = 8717
-RUNE_KITESHIELD_8718 = 8718
-ONYX_DRAGON_BOLTS_8719 = 8719
-RUNE_KITESHIELD_8720 = 8720
-ONYX_DRAGON_BOLTS_8721 = 8721
-RUNE_KITESHIELD_8722 = 8722
-OPAL_DRAGON_BOLTS_E = 8723
-RUNE_KITESHIELD_8724 = 8724
-OPAL_DRAGON_BOLTS_E_8725 = 8725
-RUNE_KITESHIELD_8726 = 8726
-OPAL_DRAGON_BOLTS_E_8727 = 8727
-RUNE_KITESHIELD_8728 = 8728
-OPAL_DRAGON_BOLTS_E_8729 = 8729
-RUNE_KITESHIELD_8730 = 8730
-JADE_DRAGON_BOLTS_E = 8731
-RUNE_KITESHIELD_8732 = 8732
-JADE_DRAGON_BOLTS_E_8733 = 8733
-RUNE_KITESHIELD_8734 = 8734
-JADE_DRAGON_BOLTS_E_8735 = 8735
-RUNE_KITESHIELD_8736 = 8736
-JADE_DRAGON_BOLTS_E_8737 = 8737
-RUNE_KITESHIELD_8738 = 8738
-PEARL_DRAGON_BOLTS_E = 8739
-RUNE_KITESHIELD_8740 = 8740
-PEARL_DRAGON_BOLTS_E_8741 = 8741
-RUNE_KITESHIELD_8742 = 8742
-PEARL_DRAGON_BOLTS_E_8743 = 8743
-RUNE_KITESHIELD_8744 = 8744
-PEARL_DRAGON_BOLTS_E_8745 = 8745
-STEEL_KITESHIELD_8746 = 8746
-TOPAZ_DRAGON_BOLTS_E = 8747
-STEEL_KITESHIELD_8748 = 8748
-TOPAZ_DRAGON_BOLTS_E_8749 = 8749
-STEEL_KITESHIELD_8750 = 8750
-TOPAZ_DRAGON_BOLTS_E_8751 = 8751
-STEEL_KITESHIELD_8752 = 8752
-TOPAZ_DRAGON_BOLTS_E_8753 = 8753
-STEEL_KITESHIELD_8754 = 8754
-SAPPHIRE_DRAGON_BOLTS_E = 8755
-STEEL_KITESHIELD_8756 = 8756
-SAPPHIRE_DRAGON_BOLTS_E_8757 = 8757
-STEEL_KITESHIELD_8758 = 8758
-SAPPHIRE_DRAGON_BOLTS_E_8759 = 8759
-STEEL_KITESHIELD_8760 = 8760
-SAPPHIRE_DRAGON_BOLTS_E_8761 = 8761
-STEEL_KITESHIELD_8762 = 8762
-EMERALD_DRAGON_BOLTS_E = 8763
-STEEL_KITESHIELD_8764 = 8764
-EMERALD_DRAGON_BOLTS_E_8765 = 8765
-STEEL_KITESHIELD_8766 = 8766
-EMERALD_DRAGON_BOLTS_E_8767 = 8767
-STEEL_KITESHIELD_8768 = 8768
-EMERALD_DRAGON_BOLTS_E_8769 = 8769
-STEEL_KITESHIELD_8770 = 8770
-RUBY_DRAGON_BOLTS_E = 8771
-STEEL_KITESHIELD_8772 = 8772
-RUBY_DRAGON_BOLTS_E_8773 = 8773
-STEEL_KITESHIELD_8774 = 8774
-RUBY_DRAGON_BOLTS_E_8775 = 8775
-STEEL_KITESHIELD_8776 = 8776
-RUBY_DRAGON_BOLTS_E_8777 = 8777
-OAK_PLANK = 8778
-OAK_PLANK_NOTED = 8779
-TEAK_PLANK = 8780
-TEAK_PLANK_NOTED = 8781
-MAHOGANY_PLANK = 8782
-MAHOGANY_PLANK_NOTED = 8783
-GOLD_LEAF_8784 = 8784
-GOLD_LEAF_NOTED = 8785
-MARBLE_BLOCK = 8786
-MARBLE_BLOCK_NOTED = 8787
-MAGIC_STONE_8788 = 8788
-MAGIC_STONE_NOTED = 8789
-BOLT_OF_CLOTH = 8790
-BOLT_OF_CLOTH_NOTED = 8791
-CLOCKWORK = 8792
-CLOCKWORK_NOTED = 8793
-SAW = 8794
-SAW_NOTED = 8795
-NULL_8796 = 8796
-MAHOGANY_LOGS_NOTED = 8836
-TIMBER_BEAM = 8837
-TIMBER_BEAM_NOTED = 8838
-VOID_KNIGHT_TOP = 8839
-VOID_KNIGHT_ROBE = 8840
-VOID_KNIGHT_MACE = 8841
-VOID_KNIGHT_GLOVES = 8842
-BRONZE_DEFENDER = 8844
-IRON_DEFENDER = 8845
-STEEL_DEFENDER = 8846
-BLACK_DEFENDER = 8847
-MITHRIL_DEFENDER = 8848
-ADAMANT_DEFENDER = 8849
-RUNE_DEFENDER = 8850
-WARRIOR_GUILD_TOKEN = 8851
-WARRIOR_GUILD_TOKEN_8852 = 8852
-WARRIOR_GUILD_TOKEN_8853 = 8853
-WARRIOR_GUILD_TOKEN_8854 = 8854
-WARRIOR_GUILD_TOKEN_8855 = 8855
-DEFENSIVE_SHIELD = 8856
-SHOT = 8857
-_18LB_SHOT = 8858
-_22LB_SHOT = 8859
-ONE_BARREL = 8860
-TWO_BARRELS = 8861
-THREE_BARRELS = 8862
-FOUR_BARRELS = 8863
-FIVE_BARRELS = 8864
-GROUND_ASHES = 8865
-STEEL_KEY = 8866
-BRONZE_KEY_8867 = 8867
-SILVER_KEY = 8868
-IRON_KEY_8869 = 8869
-ZANIK = 8870
-CRATE_WITH_ZANIK = 8871
-BONE_DAGGER = 8872
-BONE_DAGGER_NOTED = 8873
-BONE_DAGGER_P = 8874
-BONE_DAGGER_P_NOTED = 8875
-BONE_DAGGER_P_8876 = 8876
-BONE_DAGGER_P_NOTED_8877 = 8877
-BONE_DAGGER_P_8878 = 8878
-BONE_DAGGER_P_NOTED_8879 = 8879
-DORGESHUUN_CROSSBOW = 8880
-DORGESHUUN_CROSSBOW_NOTED = 8881
-BONE_BOLTS = 8882
-BONE_BOLTS_8883 = 8883
-BONE_BOLTS_8884 = 8884
-BONE_BOLTS_8885 = 8885
-BONE_BOLTS_8886 = 8886
-ZANIK_8887 = 8887
-ZANIK_HAM = 8888
-ZANIK_SHOWDOWN = 8889
-COINS_8890 = 8890
-COINS_8891 = 8891
-COINS_8892 = 8892
-COINS_8893 = 8893
-COINS_8894 = 8894
-COINS_8895 = 8895
-COINS_8896 = 8896
-COINS_8897 = 8897
-COINS_8898 = 8898
-COINS_8899 = 8899
-CAVE_HORROR = 8900
-BLACK_MASK_10 = 8901
-BLACK_MASK_10_NOTED = 8902
-BLACK_MASK_9 = 8903
-BLACK_MASK_9_NOTED = 8904
-BLACK_MASK_8 = 8905
-BLACK_MASK_8_NOTED = 8906
-BLACK_MASK_7 = 8907
-BLACK_MASK_7_NOTED = 8908
-BLACK_MASK_6 = 8909
-BLACK_MASK_6_NOTED = 8910
-BLACK_MASK_5 = 8911
-BLACK_MASK_5_NOTED = 8912
-BLACK_MASK_4 = 8913
-BLACK_MASK_4_NOTED = 8914
-BLACK_MASK_3 = 8915
-BLACK_MASK_3_NOTED = 8916
-BLACK_MASK_2 = 8917
-BLACK_MASK_2_NOTED = 8918
-BLACK_MASK_1 = 8919
-BLACK_MASK_1_NOTED = 8920
-BLACK_MASK = 8921
-BLACK_MASK_NOTED = 8922
-WITCHWOOD_ICON = 8923
-BANDANA_EYEPATCH = 8924
-BANDANA_EYEPATCH_8925 = 8925
-BANDANA_EYEPATCH_8926 = 8926
-BANDANA_EYEPATCH_8927 = 8927
-HAT_EYEPATCH = 8928
-CRABCLAW_HOOK = 8929
-PIPE_SECTION = 8930
-PIPE_SECTION_NOTED = 8931
-LUMBER_PATCH = 8932
-LUMBER_PATCH_NOTED = 8933
-SCRAPEY_TREE_LOGS = 8934
-SCRAPEY_TREE_LOGS_NOTED = 8935
-BLUE_FLOWERS_8936 = 8936
-BLUE_FLOWERS_NOTED_8937 = 8937
-RED_FLOWERS_8938 = 8938
-RED_FLOWERS_NOTED_8939 = 8939
-RUM = 8940
-RUM_8941 = 8941
-MONKEY_8942 = 8942
-BLUE_MONKEY = 8943
-BLUE_MONKEY_8944 = 8944
-BLUE_MONKEY_8945 = 8945
-RED_MONKEY = 8946
-RED_MONKEY_8947 = 8947
-RED_MONKEY_8948 = 8948
-PIRATE_BANDANA_8949 = 8949
-PIRATE_HAT = 8950
-PIECES_OF_EIGHT = 8951
-BLUE_NAVAL_SHIRT = 8952
-GREEN_NAVAL_SHIRT = 8953
-RED_NAVAL_SHIRT = 8954
-BROWN_NAVAL_SHIRT = 8955
-BLACK_NAVAL_SHIRT = 8956
-PURPLE_NAVAL_SHIRT = 8957
-GREY_NAVAL_SHIRT = 8958
-BLUE_TRICORN_HAT = 8959
-GREEN_TRICORN_HAT = 8960
-RED_TRICORN_HAT = 8961
-BROWN_TRICORN_HAT = 8962
-BLACK_TRICORN_HAT = 8963
-PURPLE_TRICORN_HAT = 8964
-GREY_TRICORN_HAT = 8965
-CUTTHROAT_FLAG = 8966
-GILDED_SMILE_FLAG = 8967
-BRONZE_FIST_FLAG = 8968
-LUCKY_SHOT_FLAG = 8969
-TREASURE_FLAG = 8970
-PHASMATYS_FLAG = 8971
-BOWL_OF_RED_WATER = 8972
-BOWL_OF_RED_WATER_NOTED = 8973
-BOWL_OF_BLUE_WATER = 8974
-BOWL_OF_BLUE_WATER_NOTED = 8975
-BITTERNUT = 8976
-SCRAPEY_BARK = 8977
-SCRAPEY_BARK_NOTED = 8978
-BRIDGE_SECTION = 8979
-BRIDGE_SECTION_NOTED = 8980
-SWEETGRUBS = 8981
-SWEETGRUBS_NOTED = 8982
-PIECES_OF_EIGHT_8984 = 8984
-PIECES_OF_EIGHT_8985 = 8985
-BUCKET_8986 = 8986
-TORCH_8987 = 8987
-THE_STUFF = 8988
-BREWIN_GUIDE = 8989
-BREWIN_GUIDE_8990 = 8990
-BLUE_NAVY_SLACKS = 8991
-GREEN_NAVY_SLACKS = 8992
-RED_NAVY_SLACKS = 8993
-BROWN_NAVY_SLACKS = 8994
-BLACK_NAVY_SLACKS = 8995
-PURPLE_NAVY_SLACKS = 8996
-GREY_NAVY_SLACKS = 8997
-BANDANA_EYEPATCH_NOTED = 8998
-BANDANA_EYEPATCH_NOTED_8999 = 8999
-BANDANA_EYEPATCH_NOTED_9000 = 9000
-BANDANA_EYEPATCH_NOTED_9001 = 9001
-HAT_EYEPATCH_NOTED = 9002
-SECURITY_BOOK = 9003
-STRONGHOLD_NOTES = 9004
-FANCY_BOOTS = 9005
-FIGHTING_BOOTS = 9006
-RIGHT_SKULL_HALF = 9007
-LEFT_SKULL_HALF = 9008
-STRANGE_SKULL = 9009
-TOP_OF_SCEPTRE = 9010
-BOTTOM_OF_SCEPTRE = 9011
-RUNED_SCEPTRE = 9012
-SKULL_SCEPTRE = 9013
-SECURITY_BOOK_NOTED = 9014
-STRONGHOLD_NOTES_NOTED = 9015
-GORAK_CLAWS = 9016
-STAR_FLOWER = 9017
-GORAK_CLAW_POWDER = 9018
-MAGIC_ESSENCE_UNF = 9019
-QUEENS_SECATEURS_9020 = 9020
-MAGIC_ESSENCE4 = 9021
-MAGIC_ESSENCE3 = 9022
-MAGIC_ESSENCE2 = 9023
-MAGIC_ESSENCE1 = 9024
-NUFFS_CERTIFICATE = 9025
-IVORY_COMB = 9026
-IVORY_COMB_NOTED = 9027
-GOLDEN_SCARAB = 9028
-GOLDEN_SCARAB_NOTED = 9029
-STONE_SCARAB = 9030
-STONE_SCARAB_NOTED = 9031
-POTTERY_SCARAB = 9032
-POTTERY_SCARAB_NOTED = 9033
-GOLDEN_STATUETTE = 9034
-GOLDEN_STATUETTE_NOTED = 9035
-POTTERY_STATUETTE = 9036
-POTTERY_STATUETTE_NOTED = 9037
-STONE_STATUETTE = 9038
-STONE_STATUETTE_NOTED = 9039
-GOLD_SEAL = 9040
-GOLD_SEAL_NOTED = 9041
-STONE_SEAL = 9042
-STONE_SEAL_NOTED = 9043
-PHARAOHS_SCEPTRE = 9044
-PHARAOHS_SCEPTRE_9045 = 9045
-PHARAOHS_SCEPTRE_9046 = 9046
-PHARAOHS_SCEPTRE_9047 = 9047
-PHARAOHS_SCEPTRE_9048 = 9048
-PHARAOHS_SCEPTRE_9049 = 9049
-PHARAOHS_SCEPTRE_9050 = 9050
-PHARAOHS_SCEPTRE_9051 = 9051
-LOCUST_MEAT = 9052
-LOCUST_MEAT_NOTED = 9053
-RED_GOBLIN_MAIL = 9054
-BLACK_GOBLIN_MAIL = 9055
-YELLOW_GOBLIN_MAIL = 9056
-GREEN_GOBLIN_MAIL = 9057
-PURPLE_GOBLIN_MAIL = 9058
-PINK_GOBLIN_MAIL = 9059
-EMERALD_LANTERN = 9064
-EMERALD_LANTERN_9065 = 9065
-EMERALD_LENS = 9066
-DREAM_LOG = 9067
-MOONCLAN_HELM = 9068
-MOONCLAN_HAT = 9069
-MOONCLAN_ARMOUR = 9070
-MOONCLAN_SKIRT = 9071
-MOONCLAN_GLOVES = 9072
-MOONCLAN_BOOTS = 9073
-MOONCLAN_CAPE = 9074
-ASTRAL_RUNE = 9075
-LUNAR_ORE = 9076
-LUNAR_BAR = 9077
-MOONCLAN_MANUAL = 9078
-SUQAH_TOOTH = 9079
-SUQAH_HIDE = 9080
-SUQAH_LEATHER = 9081
-GROUND_TOOTH = 9082
-SEAL_OF_PASSAGE = 9083
-LUNAR_STAFF = 9084
-EMPTY_VIAL = 9085
-VIAL_OF_WATER_9086 = 9086
-WAKING_SLEEP_VIAL = 9087
-GUAM_VIAL = 9088
-MARR_VIAL = 9089
-GUAMMARR_VIAL = 9090
-LUNAR_STAFF__PT1 = 9091
-LUNAR_STAFF__PT2 = 9092
-LUNAR_STAFF__PT3 = 9093
-KINDLING = 9094
-SOAKED_KINDLING = 9095
-LUNAR_HELM = 9096
-LUNAR_TORSO = 9097
-LUNAR_LEGS = 9098
-LUNAR_GLOVES = 9099
-LUNAR_BOOTS = 9100
-LUNAR_CAPE = 9101
-LUNAR_AMULET = 9102
-A_SPECIAL_TIARA = 9103
-LUNAR_RING = 9104
-SUQAH_MONSTER = 9105
-ASTRAL_TIARA = 9106
-BLURITE_BOLTS = 9139
-IRON_BOLTS = 9140
-STEEL_BOLTS = 9141
-MITHRIL_BOLTS = 9142
-ADAMANT_BOLTS = 9143
-RUNITE_BOLTS = 9144
-SILVER_BOLTS = 9145
-BLURITE_BOLTS_9146 = 9146
-BLURITE_BOLTS_9147 = 9147
-BLURITE_BOLTS_9148 = 9148
-BLURITE_BOLTS_9149 = 9149
-IRON_BOLTS_9150 = 9150
-IRON_BOLTS_9151 = 9151
-IRON_BOLTS_9152 = 9152
-IRON_BOLTS_9153 = 9153
-STEEL_BOLTS_9154 = 9154
-STEEL_BOLTS_9155 = 9155
-STEEL_BOLTS_9156 = 9156
-STEEL_BOLTS_9157 = 9157
-MITHRIL_BOLTS_9158 = 9158
-MITHRIL_BOLTS_9159 = 9159
-MITHRIL_BOLTS_9160 = 9160
-MITHRIL_BOLTS_9161 = 9161
-ADAMANT_BOLTS_9162 = 9162
-ADAMANT_BOLTS_9163 = 9163
-ADAMANT_BOLTS_9164 = 9164
-ADAMANT_BOLTS_9165 = 9165
-RUNITE_BOLTS_9166 = 9166
-RUNITE_BOLTS_9167 = 9167
-RUNITE_BOLTS_9168 = 9168
-RUNITE_BOLTS_9169 = 9169
-SILVER_BOLTS_9170 = 9170
-SILVER_BOLTS_9171 = 9171
-SILVER_BOLTS_9172 = 9172
-SILVER_BOLTS_9173 = 9173
-BRONZE_CROSSBOW = 9174
-BRONZE_CROSSBOW_NOTED = 9175
-BLURITE_CROSSBOW = 9176
-IRON_CROSSBOW = 9177
-IRON_CROSSBOW_NOTED = 9178
-STEEL_CROSSBOW = 9179
-STEEL_CROSSBOW_NOTED = 9180
-MITHRIL_CROSSBOW = 9181
-MITHRIL_CROSSBOW_NOTED = 9182
-ADAMANT_CROSSBOW = 9183
-ADAMANT_CROSSBOW_NOTED = 9184
-RUNE_CROSSBOW = 9185
-RUNE_CROSSBOW_NOTED = 9186
-JADE_BOLT_TIPS = 9187
-TOPAZ_BOLT_TIPS = 9188
-SAPPHIRE_BOLT_TIPS = 9189
-EMERALD_BOLT_TIPS = 9190
-RUBY_BOLT_TIPS = 9191
-DIAMOND_BOLT_TIPS = 9192
-DRAGONSTONE_BOLT_TIPS = 9193
-ONYX_BOLT_TIPS = 9194
-JADE_BOLT_TIPS_9195 = 9195
-JADE_BOLT_TIPS_9196 = 9196
-JADE_BOLT_TIPS_9197 = 9197
-JADE_BOLT_TIPS_9198 = 9198
-OPAL_BOLT_TIPS_9199 = 9199
-OPAL_BOLT_TIPS_9200 = 9200
-OPAL_BOLT_TIPS_9201 = 9201
-OPAL_BOLT_TIPS_9202 = 9202
-TOPAZ_BOLT_TIPS_9207 = 9207
-TOPAZ_BOLT_TIPS_9208 = 9208
-TOPAZ_BOLT_TIPS_9209 = 9209
-TOPAZ_BOLT_TIPS_9210 = 9210
-SAPPHIRE_BOLT_TIPS_9211 = 9211
-SAPPHIRE_BOLT_TIPS_9212 = 9212
-SAPPHIRE_BOLT_TIPS_9213 = 9213
-SAPPHIRE_BOLT_TIPS_9214 = 9214
-EMERALD_BOLT_TIPS_9215 = 9215
-EMERALD_BOLT_TIPS_9216 = 9216
-EMERALD_BOLT_TIPS_9217 = 9217
-EMERALD_BOLT_TIPS_9218 = 9218
-RUBY_BOLT_TIPS_9219 = 9219
-RUBY_BOLT_TIPS_9220 = 9220
-RUBY_BOLT_TIPS_9221 = 9221
-RUBY_BOLT_TIPS_9222 = 9222
-DIAMOND_BOLT_TIPS_9223 = 9223
-DIAMOND_BOLT_TIPS_9224 = 9224
-DIAMOND_BOLT_TIPS_9225 = 9225
-DIAMOND_BOLT_TIPS_9226 = 9226
-DRAGONSTONE_BOLT_TIPS_9227 = 9227
-DRAGONSTONE_BOLT_TIPS_9228 = 9228
-DRAGONSTONE_BOLT_TIPS_9229 = 9229
-DRAGONSTONE_BOLT_TIPS_9230 = 9230
-ONYX_BOLT_TIPS_9231 = 9231
-ONYX_BOLT_TIPS_9232 = 9232
-ONYX_BOLT_TIPS_9233 = 9233
-ONYX_BOLT_TIPS_9234 = 9234
-OPAL_BOLTS_E = 9236
-JADE_BOLTS_E = 9237
-PEARL_BOLTS_E = 9238
-TOPAZ_BOLTS_E = 9239
-SAPPHIRE_BOLTS_E = 9240
-EMERALD_BOLTS_E = 9241
-RUBY_BOLTS_E = 9242
-DIAMOND_BOLTS_E = 9243
-DRAGONSTONE_BOLTS_E = 9244
-ONYX_BOLTS_E = 9245
-OPAL_BOLTS_E_9246 = 9246
-OPAL_BOLTS_E_9247 = 9247
-OPAL_BOLTS_E_9248 = 9248
-OPAL_BOLTS_E_9249 = 9249
-PEARL_BOLTS_E_9250 = 9250
-PEARL_BOLTS_E_9251 = 9251
-PEARL_BOLTS_E_9252 = 9252
-PEARL_BOLTS_E_9253 = 9253
-JADE_BOLTS_E_9254 = 9254
-JADE_BOLTS_E_9255 = 9255
-JADE_BOLTS_E_9256 = 9256
-JADE_BOLTS_E_9257 = 9257
-TOPAZ_BOLTS_E_9258 = 9258
-TOPAZ_BOLTS_E_9259 = 9259
-TOPAZ_BOLTS_E_9260 = 9260
-TOPAZ_BOLTS_E_9261 = 9261
-SAPPHIRE_BOLTS_E_9262 = 9262
-SAPPHIRE_BOLTS_E_9263 = 9263
-SAPPHIRE_BOLTS_E_9264 = 9264
-SAPPHIRE_BOLTS_E_9265 = 9265
-EMERALD_BOLTS_E_9266 = 9266
-EMERALD_BOLTS_E_9267 = 9267
-EMERALD_BOLTS_E_9268 = 9268
-EMERALD_BOLTS_E_9269 = 9269
-RUBY_BOLTS_E_9270 = 9270
-RUBY_BOLTS_E_9271 = 9271
-RUBY_BOLTS_E_9272 = 9272
-RUBY_BOLTS_E_9273 = 9273
-DIAMOND_BOLTS_E_9274 = 9274
-DIAMOND_BOLTS_E_9275 = 9275
-DIAMOND_BOLTS_E_9276 = 9276
-DIAMOND_BOLTS_E_9277 = 9277
-DRAGONSTONE_BOLTS_E_9278 = 9278
-DRAGONSTONE_BOLTS_E_9279 = 9279
-DRAGONSTONE_BOLTS_E_9280 = 9280
-DRAGONSTONE_BOLTS_E_9281 = 9281
-ONYX_BOLTS_E_9282 = 9282
-ONYX_BOLTS_E_9283 = 9283
-ONYX_BOLTS_E_9284 = 9284
-ONYX_BOLTS_E_9285 = 9285
-BLURITE_BOLTS_P = 9286
-IRON_BOLTS_P = 9287
-STEEL_BOLTS_P = 9288
-MITHRIL_BOLTS_P = 9289
-ADAMANT_BOLTS_P = 9290
-RUNITE_BOLTS_P = 9291
-SILVER_BOLTS_P = 9292
-BLURITE_BOLTS_P_9293 = 9293
-IRON_BOLTS_P_9294 = 9294
-STEEL_BOLTS_P_9295 = 9295
-MITHRIL_BOLTS_P_9296 = 9296
-ADAMANT_BOLTS_P_9297 = 9297
-RUNITE_BOLTS_P_9298 = 9298
-SILVER_BOLTS_P_9299 = 9299
-BLURITE_BOLTS_P_9300 = 9300
-IRON_BOLTS_P_9301 = 9301
-STEEL_BOLTS_P_9302 = 9302
-MITHRIL_BOLTS_P_9303 = 9303
-ADAMANT_BOLTS_P_9304 = 9304
-RUNITE_BOLTS_P_9305 = 9305
-SILVER_BOLTS_P_9306 = 9306
-BLURITE_BOLTS_P_9307 = 9307
-BLURITE_BOLTS_P_9308 = 9308
-BLURITE_BOLTS_P_9309 = 9309
-BLURITE_BOLTS_P_9310 = 9310
-IRON_BOLTS_P_9311 = 9311
-IRON_BOLTS_P_9312 = 9312
-IRON_BOLTS_P_9313 = 9313
-IRON_BOLTS_P_9314 = 9314
-STEEL_BOLTS_P_9315 = 9315
-STEEL_BOLTS_P_9316 = 9316
-STEEL_BOLTS_P_9317 = 9317
-STEEL_BOLTS_P_9318 = 9318
-MITHRIL_BOLTS_P_9319 = 9319
-MITHRIL_BOLTS_P_9320 = 9320
-MITHRIL_BOLTS_P_9321 = 9321
-MITHRIL_BOLTS_P_9322 = 9322
-ADAMANT_BOLTS_P_9323 = 9323
-ADAMANT_BOLTS_P_9324 = 9324
-ADAMANT_BOLTS_P_9325 = 9325
-ADAMANT_BOLTS_P_9326 = 9326
-RUNITE_BOLTS_P_9327 = 9327
-RUNITE_BOLTS_P_9328 = 9328
-RUNITE_BOLTS_P_9329 = 9329
-RUNITE_BOLTS_P_9330 = 9330
-SILVER_BOLTS_P_9331 = 9331
-SILVER_BOLTS_P_9332 = 9332
-SILVER_BOLTS_P_9333 = 9333
-SILVER_BOLTS_P_9334 = 9334
-JADE_BOLTS = 9335
-TOPAZ_BOLTS = 9336
-SAPPHIRE_BOLTS = 9337
-EMERALD_BOLTS = 9338
-RUBY_BOLTS = 9339
-DIAMOND_BOLTS = 9340
-DRAGONSTONE_BOLTS = 9341
-ONYX_BOLTS = 9342
-JADE_BOLTS_9343 = 9343
-JADE_BOLTS_9344 = 9344
-JADE_BOLTS_9345 = 9345
-JADE_BOLTS_9346 = 9346
-TOPAZ_BOLTS_9347 = 9347
-TOPAZ_BOLTS_9348 = 9348
-TOPAZ_BOLTS_9349 = 9349
-TOPAZ_BOLTS_9350 = 9350
-SAPPHIRE_BOLTS_9351 = 9351
-SAPPHIRE_BOLTS_9352 = 9352
-SAPPHIRE_BOLTS_9353 = 9353
-SAPPHIRE_BOLTS_9354 = 9354
-EMERALD_BOLTS_9355 = 9355
-EMERALD_BOLTS_9356 = 9356
-EMERALD_BOLTS_9357 = 9357
-EMERALD_BOLTS_9358 = 9358
-RUBY_BOLTS_9359 = 9359
-RUBY_BOLTS_9360 = 9360
-RUBY_BOLTS_9361 = 9361
-RUBY_BOLTS_9362 = 9362
-DIAMOND_BOLTS_9363 = 9363
-DIAMOND_BOLTS_9364 = 9364
-DIAMOND_BOLTS_9365 = 9365
-DIAMOND_BOLTS_9366 = 9366
-DRAGONSTONE_BOLTS_9367 = 9367
-DRAGONSTONE_BOLTS_9368 = 9368
-DRAGONSTONE_BOLTS_9369 = 9369
-DRAGONSTONE_BOLTS_9370 = 9370
-ONYX_BOLTS_9371 = 9371
-ONYX_BOLTS_9372 = 9372
-ONYX_BOLTS_9373 = 9373
-ONYX_BOLTS_9374 = 9374
-BRONZE_BOLTS_UNF = 9375
-BLURITE_BOLTS_UNF = 9376
-IRON_BOLTS_UNF = 9377
-STEEL_BOLTS_UNF = 9378
-MITHRIL_BOLTS_UNF = 9379
-ADAMANT_BOLTSUNF = 9380
-RUNITE_BOLTS_UNF = 9381
-SILVER_BOLTS_UNF = 9382
-BRONZE_BOLTS_UNF_9383 = 9383
-BRONZE_BOLTS_UNF_9384 = 9384
-BRONZE_BOLTS_UNF_9385 = 9385
-BRONZE_BOLTS_UNF_9386 = 9386
-BLURITE_BOLTS_UNF_9387 = 9387
-BLURITE_BOLTS_UNF_9388 = 9388
-BLURITE_BOLTS_UNF_9389 = 9389
-BLURITE_BOLTS_UNF_9390 = 9390
-IRON_BOLTS_UNF_9391 = 9391
-IRON_BOLTS_UNF_9392 = 9392
-IRON_BOLTS_UNF_9393 = 9393
-IRON_BOLTS_UNF_9394 = 9394
-STEEL_BOLTS_UNF_9395 = 9395
-STEEL_BOLTS_UNF_9396 = 9396
-STEEL_BOLTS_UNF_9397 = 9397
-STEEL_BOLTS_UNF_9398 = 9398
-MITHRIL_BOLTS_UNF_9399 = 9399
-MITHRIL_BOLTS_UNF_9400 = 9400
-MITHRIL_BOLTS_UNF_9401 = 9401
-MITHRIL_BOLTS_UNF_9402 = 9402
-ADAMANT_BOLTSUNF_9403 = 9403
-ADAMANT_BOLTSUNF_9404 = 9404
-ADAMANT_BOLTSUNF_9405 = 9405
-ADAMANT_BOLTSUNF_9406 = 9406
-RUNITE_BOLTS_UNF_9407 = 9407
-RUNITE_BOLTS_UNF_9408 = 9408
-RUNITE_BOLTS_UNF_9409 = 9409
-RUNITE_BOLTS_UNF_9410 = 9410
-SILVER_BOLTS_UNF_9411 = 9411
-SILVER_BOLTS_UNF_9412 = 9412
-SILVER_BOLTS_UNF_9413 = 9413
-SILVER_BOLTS_UNF_9414 = 9414
-GRAPPLE = 9415
-MITH_GRAPPLE_TIP = 9416
-MITH_GRAPPLE_TIP_NOTED = 9417
-MITH_GRAPPLE = 9418
-MITH_GRAPPLE_9419 = 9419
-BRONZE_LIMBS = 9420
-BRONZE_LIMBS_NOTED = 9421
-BLURITE_LIMBS = 9422
-IRON_LIMBS = 9423
-IRON_LIMBS_NOTED = 9424
-STEEL_LIMBS = 9425
-STEEL_LIMBS_NOTED = 9426
-MITHRIL_LIMBS = 9427
-MITHRIL_LIMBS_NOTED = 9428
-ADAMANTITE_LIMBS = 9429
-ADAMANTITE_LIMBS_NOTED = 9430
-RUNITE_LIMBS = 9431
-RUNITE_LIMBS_NOTED = 9432
-BOLT_POUCH = 9433
-BOLT_MOULD = 9434
-BOLT_MOULD_NOTED = 9435
-SINEW = 9436
-SINEW_NOTED = 9437
-CROSSBOW_STRING = 9438
-CROSSBOW_STRING_NOTED = 9439
-WOODEN_STOCK = 9440
-WOODEN_STOCK_NOTED = 9441
-OAK_STOCK = 9442
-OAK_STOCK_NOTED = 9443
-WILLOW_STOCK = 9444
-WILLOW_STOCK_NOTED = 9445
-TEAK_STOCK = 9446
-TEAK_STOCK_NOTED = 9447
-MAPLE_STOCK = 9448
-MAPLE_STOCK_NOTED = 9449
-MAHOGANY_STOCK = 9450
-MAHOGANY_STOCK_NOTED = 9451
-YEW_STOCK = 9452
-YEW_STOCK_NOTED = 9453
-BRONZE_CROSSBOW_U = 9454
-BRONZE_CROSSBOW_U_NOTED = 9455
-BLURITE_CROSSBOW_U = 9456
-IRON_CROSSBOW_U = 9457
-IRON_CROSSBOW_U_NOTED = 9458
-STEEL_CROSSBOW_U = 9459
-STEEL_CROSSBOW_U_NOTED = 9460
-MITHRIL_CROSSBOW_U = 9461
-MITHRIL_CROSSBOW_U_NOTED = 9462
-ADAMANT_CROSSBOW_U = 9463
-ADAMANT_CROSSBOW_U_NOTED = 9464
-RUNITE_CROSSBOW_U = 9465
-RUNITE_CROSSBOW_U_NOTED = 9466
-BLURITE_BAR = 9467
-SAWDUST = 9468
-GRAND_SEED_POD = 9469
-GNOME_SCARF = 9470
-GNOME_SCARF_NOTED = 9471
-GNOME_GOGGLES = 9472
-GNOME_GOGGLES_NOTED = 9473
-REWARD_TOKEN_9474 = 9474
-MINT_CAKE = 9475
-MINT_CAKE_NOTED = 9476
-ALUFT_ALOFT_BOX = 9477
-HALF_MADE_BATTA = 9478
-UNFINISHED_BATTA_9479 = 9479
-HALF_MADE_BATTA_9480 = 9480
-UNFINISHED_BATTA_9481 = 9481
-HALF_MADE_BATTA_9482 = 9482
-HALF_MADE_BATTA_9483 = 9483
-UNFINISHED_BATTA_9484 = 9484
-HALF_MADE_BATTA_9485 = 9485
-UNFINISHED_BATTA_9486 = 9486
-WIZARD_BLIZZARD_9487 = 9487
-WIZARD_BLIZZARD_NOTED_9488 = 9488
-WIZARD_BLIZZARD_9489 = 9489
-WIZARD_BLIZZARD_NOTED_9490 = 9490
-WIZARD_BLIZZARD_9508 = 9508
-WIZARD_BLIZZARD_NOTED_9509 = 9509
-SHORT_GREEN_GUY_9510 = 9510
-SHORT_GREEN_GUY_NOTED_9511 = 9511
-PINEAPPLE_PUNCH_9512 = 9512
-PINEAPPLE_PUNCH_NOTED_9513 = 9513
-FRUIT_BLAST_9514 = 9514
-FRUIT_BLAST_NOTED_9515 = 9515
-DRUNK_DRAGON_9516 = 9516
-DRUNK_DRAGON_NOTED_9517 = 9517
-CHOC_SATURDAY_9518 = 9518
-CHOC_SATURDAY_NOTED_9519 = 9519
-BLURBERRY_SPECIAL_9520 = 9520
-BLURBERRY_SPECIAL_NOTED_9521 = 9521
-BATTA_TIN_9522 = 9522
-BATTA_TIN_NOTED = 9523
-BATTA_TIN_9524 = 9524
-BATTA_TIN_NOTED_9525 = 9525
-FRUIT_BATTA_9527 = 9527
-FRUIT_BATTA_NOTED_9528 = 9528
-TOAD_BATTA_9529 = 9529
-TOAD_BATTA_NOTED_9530 = 9530
-WORM_BATTA_9531 = 9531
-WORM_BATTA_NOTED_9532 = 9532
-VEGETABLE_BATTA_9533 = 9533
-VEGETABLE_BATTA_NOTED_9534 = 9534
-CHEESETOM_BATTA_9535 = 9535
-CHEESETOM_BATTA_NOTED_9536 = 9536
-TOAD_CRUNCHIES_9538 = 9538
-TOAD_CRUNCHIES_NOTED_9539 = 9539
-SPICY_CRUNCHIES_9540 = 9540
-SPICY_CRUNCHIES_NOTED_9541 = 9541
-WORM_CRUNCHIES_9542 = 9542
-WORM_CRUNCHIES_NOTED_9543 = 9543
-CHOCCHIP_CRUNCHIES_9544 = 9544
-CHOCCHIP_CRUNCHIES_NOTED_9545 = 9545
-WORM_HOLE_9547 = 9547
-WORM_HOLE_NOTED_9548 = 9548
-VEG_BALL_9549 = 9549
-VEG_BALL_NOTED_9550 = 9550
-TANGLED_TOADS_LEGS_9551 = 9551
-TANGLED_TOADS_LEGS_NOTED_9552 = 9552
-CHOCOLATE_BOMB_9553 = 9553
-CHOCOLATE_BOMB_NOTED_9554 = 9554
-HALF_MADE_BOWL = 9558
-HALF_MADE_BOWL_9559 = 9559
-UNFINISHED_BOWL_9560 = 9560
-HALF_MADE_BOWL_9561 = 9561
-UNFINISHED_BOWL_9562 = 9562
-HALF_MADE_BOWL_9563 = 9563
-UNFINISHED_BOWL_9564 = 9564
-COCKTAIL_SHAKER_NOTED = 9565
-MIXED_BLIZZARD = 9566
-MIXED_SGG = 9567
-MIXED_BLAST = 9568
-MIXED_PUNCH = 9569
-MIXED_SPECIAL = 9570
-MIXED_SATURDAY = 9571
-MIXED_SATURDAY_9572 = 9572
-MIXED_SATURDAY_9573 = 9573
-MIXED_DRAGON = 9574
-MIXED_DRAGON_9575 = 9575
-MIXED_DRAGON_9576 = 9576
-HALF_MADE_CRUNCHY = 9577
-UNFINISHED_CRUNCHY_9578 = 9578
-HALF_MADE_CRUNCHY_9579 = 9579
-UNFINISHED_CRUNCHY_9580 = 9580
-HALF_MADE_CRUNCHY_9581 = 9581
-UNFINISHED_CRUNCHY_9582 = 9582
-HALF_MADE_CRUNCHY_9583 = 9583
-UNFINISHED_CRUNCHY_9584 = 9584
-BATTA_TIN_NOTED_9585 = 9585
-CRUNCHY_TRAY_NOTED = 9586
-GNOMEBOWL_MOULD_NOTED = 9587
-RAW_CRUNCHIES_NOTED = 9588
-DOSSIER = 9589
-DOSSIER_9590 = 9590
-BROKEN_CAULDRON = 9591
-MAGIC_GLUE = 9592
-WEIRD_GLOOP = 9593
-GROUND_MUD_RUNES = 9594
-HAZELMERES_BOOK = 9595
-NULL_9596 = 9596
-A_RED_CIRCLE = 9597
-A_RED_TRIANGLE = 9598
-A_RED_SQUARE = 9599
-A_RED_PENTAGON = 9600
-AN_ORANGE_CIRCLE = 9601
-AN_ORANGE_TRIANGLE = 9602
-AN_ORANGE_SQUARE = 9603
-ORANGE_PENTAGON = 9604
-A_YELLOW_CIRCLE = 9605
-A_YELLOW_TRIANGLE = 9606
-A_YELLOW_SQUARE = 9607
-A_YELLOW_PENTAGON = 9608
-A_GREEN_CIRCLE = 9609
-A_GREEN_TRIANGLE = 9610
-A_GREEN_SQUARE = 9611
-A_GREEN_PENTAGON = 9612
-A_BLUE_CIRCLE = 9613
-A_BLUE_TRIANGLE = 9614
-A_BLUE_SQUARE = 9615
-A_BLUE_PENTAGON = 9616
-AN_INDIGO_CIRCLE = 9617
-AN_INDIGO_TRIANGLE = 9618
-AN_INDIGO_SQUARE = 9619
-AN_INDIGO_PENTAGON = 9620
-A_VIOLET_CIRCLE = 9621
-A_VIOLET_TRIANGLE = 9622
-A_VIOLET_SQUARE = 9623
-A_VIOLET_PENTAGON = 9624
-CRYSTAL_SAW = 9625
-CRYSTAL_SAW_SEED = 9626
-A_HANDWRITTEN_BOOK = 9627
-TYRAS_HELM = 9629
-TYRAS_HELM_NOTED = 9630
-DAEYALT_ORE = 9632
-MESSAGE_9633 = 9633
-VYREWATCH_TOP = 9634
-VYREWATCH_TOP_NOTED = 9635
-VYREWATCH_LEGS = 9636
-VYREWATCH_LEGS_NOTED = 9637
-VYREWATCH_SHOES = 9638
-VYREWATCH_SHOES_NOTED = 9639
-CITIZEN_TOP = 9640
-CITIZEN_TOP_NOTED = 9641
-CITIZEN_TROUSERS = 9642
-CITIZEN_TROUSERS_NOTED = 9643
-CITIZEN_SHOES = 9644
-CITIZEN_SHOES_NOTED = 9645
-CASTLE_SKETCH_1 = 9646
-CASTLE_SKETCH_2 = 9647
-CASTLE_SKETCH_3 = 9648
-MESSAGE_9649 = 9649
-BLOOD_TITHE_POUCH = 9650
-LARGE_ORNATE_KEY = 9651
-HAEMALCHEMY_VOLUME_1 = 9652
-SEALED_MESSAGE = 9653
-DOOR_KEY_9654 = 9654
-LADDER_TOP = 9655
-TOME_OF_EXPERIENCE_3 = 9656
-TOME_OF_EXPERIENCE_2 = 9657
-TOME_OF_EXPERIENCE_1 = 9658
-BUCKET_OF_WATER_9659 = 9659
-BUCKET_9660 = 9660
-USELESS_KEY = 9662
-TORCH_9665 = 9665
-PROSELYTE_HARNESS_M = 9666
-PROSELYTE_HARNESS_M_NOTED = 9667
-INITIATE_HARNESS_M = 9668
-INITIATE_HARNESS_M_NOTED = 9669
-PROSELYTE_HARNESS_F = 9670
-PROSELYTE_HARNESS_F_NOTED = 9671
-PROSELYTE_SALLET = 9672
-PROSELYTE_SALLET_NOTED = 9673
-PROSELYTE_HAUBERK = 9674
-PROSELYTE_HAUBERK_NOTED = 9675
-PROSELYTE_CUISSE = 9676
-PROSELYTE_CUISSE_NOTED = 9677
-PROSELYTE_TASSET = 9678
-PROSELYTE_TASSET_NOTED = 9679
-SEA_SLUG_GLUE = 9680
-COMMORB_V2 = 9681
-DOOR_TRANSCRIPTION = 9682
-DEAD_SEA_SLUG = 9683
-PAGE_1 = 9684
-PAGE_2 = 9685
-PAGE_3 = 9686
-FRAGMENT_1 = 9687
-FRAGMENT_2 = 9688
-FRAGMENT_3 = 9689
-BLANK_WATER_RUNE = 9690
-WATER_RUNE_9691 = 9691
-BLANK_AIR_RUNE = 9692
-AIR_RUNE_9693 = 9693
-BLANK_EARTH_RUNE = 9694
-EARTH_RUNE_9695 = 9695
-BLANK_MIND_RUNE = 9696
-MIND_RUNE_9697 = 9697
-BLANK_FIRE_RUNE = 9698
-FIRE_RUNE_9699 = 9699
-TORCH_NOTED = 9701
-STICK_9702 = 9702
-TRAINING_SWORD = 9703
-TRAINING_SHIELD = 9704
-TRAINING_BOW = 9705
-TRAINING_ARROWS = 9706
-TRAINING_ARROWS_9707 = 9707
-TRAINING_ARROWS_9708 = 9708
-TRAINING_ARROWS_9709 = 9709
-TRAINING_ARROWS_9710 = 9710
-SLASHED_BOOK = 9715
-ROCK_9716 = 9716
-BEATEN_BOOK = 9717
-CRANE_SCHEMATIC = 9718
-LEVER_SCHEMATIC = 9719
-CRANE_CLAW = 9720
-SCROLL_9721 = 9721
-KEY_9722 = 9722
-PIPE = 9723
-LARGE_COG = 9724
-MEDIUM_COG = 9725
-SMALL_COG = 9726
-PRIMED_BAR = 9727
-PRIMED_MIND_BAR = 9728
-ELEMENTAL_HELMET = 9729
-ELEMENTAL_HELMET_NOTED = 9730
-MIND_SHIELD = 9731
-MIND_SHIELD_NOTED = 9732
-MIND_HELMET = 9733
-MIND_HELMET_NOTED = 9734
-DESERT_GOAT_HORN = 9735
-GOAT_HORN_DUST = 9736
-GOAT_HORN_DUST_NOTED = 9737
-DESERT_GOAT_HORN_NOTED = 9738
-COMBAT_POTION4 = 9739
-COMBAT_POTION4_NOTED = 9740
-COMBAT_POTION3 = 9741
-COMBAT_POTION3_NOTED = 9742
-COMBAT_POTION2 = 9743
-COMBAT_POTION2_NOTED = 9744
-COMBAT_POTION1 = 9745
-COMBAT_POTION1_NOTED = 9746
-ATTACK_CAPE = 9747
-ATTACK_CAPET = 9748
-ATTACK_HOOD = 9749
-STRENGTH_CAPE = 9750
-STRENGTH_CAPET = 9751
-STRENGTH_HOOD = 9752
-DEFENCE_CAPE = 9753
-DEFENCE_CAPET = 9754
-DEFENCE_HOOD = 9755
-RANGING_CAPE = 9756
-RANGING_CAPET = 9757
-RANGING_HOOD = 9758
-PRAYER_CAPE = 9759
-PRAYER_CAPET = 9760
-PRAYER_HOOD = 9761
-MAGIC_CAPE = 9762
-MAGIC_CAPET = 9763
-MAGIC_HOOD = 9764
-RUNECRAFT_CAPE = 9765
-RUNECRAFT_CAPET = 9766
-RUNECRAFT_HOOD = 9767
-HITPOINTS_CAPE = 9768
-HITPOINTS_CAPET = 9769
-HITPOINTS_HOOD = 9770
-AGILITY_CAPE = 9771
-AGILITY_CAPET = 9772
-AGILITY_HOOD = 9773
-HERBLORE_CAPE = 9774
-HERBLORE_CAPET = 9775
-HERBLORE_HOOD = 9776
-THIEVING_CAPE = 9777
-THIEVING_CAPET = 9778
-THIEVING_HOOD = 9779
-CRAFTING_CAPE = 9780
-CRAFTING_CAPET = 9781
-CRAFTING_HOOD = 9782
-FLETCHING_CAPE = 9783
-FLETCHING_CAPET = 9784
-FLETCHING_HOOD = 9785
-SLAYER_CAPE = 9786
-SLAYER_CAPET = 9787
-SLAYER_HOOD = 9788
-CONSTRUCT_CAPE = 9789
-CONSTRUCT_CAPET = 9790
-CONSTRUCT_HOOD = 9791
-MINING_CAPE = 9792
-MINING_CAPET = 9793
-MINING_HOOD = 9794
-SMITHING_CAPE = 9795
-SMITHING_CAPET = 9796
-SMITHING_HOOD = 9797
-FISHING_CAPE = 9798
-FISHING_CAPET = 9799
-FISHING_HOOD = 9800
-COOKING_CAPE = 9801
-COOKING_CAPET = 9802
-COOKING_HOOD = 9803
-FIREMAKING_CAPE = 9804
-FIREMAKING_CAPET = 9805
-FIREMAKING_HOOD = 9806
-WOODCUTTING_CAPE = 9807
-WOODCUT_CAPET = 9808
-WOODCUTTING_HOOD = 9809
-FARMING_CAPE = 9810
-FARMING_CAPET = 9811
-FARMING_HOOD = 9812
-QUEST_POINT_CAPE = 9813
-QUEST_POINT_HOOD = 9814
-SPIRIT_FLAKES = 9815
-SPIRIT_FLAKES_9816 = 9816
-OAK_CAPE_RACK = 9817
-TEAK_CAPE_RACK = 9818
-MAHOGANY_CAPE_RACK = 9819
-GILDED_CAPE_RACK = 9820
-MARBLE_CAPE_RACK = 9821
-MAGICAL_CAPE_RACK = 9822
-OAK_COSTUME_BOX = 9823
-TEAK_COSTUME_BOX = 9824
-MAHOGANY_COSTUME_BOX = 9825
-OAK_ARMOUR_CASE = 9826
-TEAK_ARMOUR_CASE = 9827
-MAHOGANY_ARMOUR_CASE = 9828
-OAK_WARDROBE_9829 = 9829
-CARVED_OAK_WARDROBE = 9830
-TEAK_WARDROBE_9831 = 9831
-CARVED_TEAK_WARDROBE = 9832
-MAHOGANY_WARDROBE_9833 = 9833
-GILDED_WARDROBE_9834 = 9834
-MARBLE_WARDROBE = 9835
-OAK_TOY_BOX = 9836
-TEAK_TOY_BOX = 9837
-MAHOGANY_TOY_BOX = 9838
-OAK_TREASURE_CHEST = 9839
-TEAK_TREASURE_CHEST = 9840
-MAHOGANY_TREASURE_CHEST = 9841
-COSTUME_ROOM = 9842
-OAK_CAPE_RACK_9843 = 9843
-TEAK_CAPE_RACK_9844 = 9844
-MAHOGANY_CAPE_RACK_9845 = 9845
-GILDED_CAPE_RACK_9846 = 9846
-MARBLE_CAPE_RACK_9847 = 9847
-MAGIC_CAPE_RACK = 9848
-OAK_TOY_BOX_9849 = 9849
-TEAK_TOY_BOX_9850 = 9850
-MAHOGANY_TOY_BOX_9851 = 9851
-OAK_MAGIC_WARDROBE = 9852
-CARVED_OAK_MAGIC_WARDROBE = 9853
-TEAK_MAGIC_WARDROBE = 9854
-CARVED_TEAK_MAGIC_WARDROBE = 9855
-MAHOGANY_MAGIC_WARDROBE = 9856
-GILDED_MAGIC_WARDROBE = 9857
-MARBLE_MAGIC_WARDROBE = 9858
-OAK_ARMOUR_CASE_9859 = 9859
-TEAK_ARMOUR_CASE_9860 = 9860
-MAHOGANY_ARMOUR_CASE_9861 = 9861
-OAK_TREASURE_CHEST_9862 = 9862
-TEAK_TREASURE_CHEST_9863 = 9863
-M_TREASURE_CHEST = 9864
-OAK_FANCY_DRESS_BOX = 9865
-TEAK_FANCY_DRESS_BOX = 9866
-MAHOGANY_FANCY_DRESS_BOX = 9867
-OAK_CAPE_RACK_NOTED = 9868
-TEAK_CAPE_RACK_NOTED = 9869
-MAHOGANY_CAPE_RACK_NOTED = 9870
-GILDED_CAPE_RACK_NOTED = 9871
-MARBLE_CAPE_RACK_NOTED = 9872
-MAGIC_CAPE_RACK_NOTED = 9873
-OAK_TOY_BOX_NOTED = 9874
-TEAK_TOY_BOX_NOTED = 9875
-MAHOGANY_TOY_BOX_NOTED = 9876
-OAK_MAGIC_WARDROBE_NOTED = 9877
-CARVED_OAK_MAGIC_WARDROBE_NOTED = 9878
-TEAK_MAGIC_WARDROBE_NOTED = 9879
-CARVED_TEAK_MAGIC_WARDROBE_NOTED = 9880
-MAHOGANY_MAGIC_WARDROBE_NOTED = 9881
-GILDED_MAGIC_WARDROBE_NOTED = 9882
-MARBLE_MAGIC_WARDROBE_NOTED = 9883
-OAK_ARMOUR_CASE_NOTED = 9884
-TEAK_ARMOUR_CASE_NOTED = 9885
-MAHOGANY_ARMOUR_CASE_NOTED = 9886
-OAK_TREASURE_CHEST_NOTED = 9887
-TEAK_TREASURE_CHEST_NOTED = 9888
-M_TREASURE_CHEST_NOTED = 9889
-OAK_FANCY_DRESS_BOX_NOTED = 9890
-TEAK_FANCY_DRESS_BOX_NOTED = 9891
-MAHOGANY_FANCY_DRESS_BOX_NOTED = 9892
-GOUTWEEDY_LUMP = 9901
-HARDY_GOUT_TUBERS = 9902
-FARMING_MANUAL = 9903
-SAILING_BOOK = 9904
-GHOST_BUSTER_500 = 9906
-GHOST_BUSTER_500_9907 = 9907
-GHOST_BUSTER_500_9908 = 9908
-GHOST_BUSTER_500_9909 = 9909
-GHOST_BUSTER_500_9910 = 9910
-GHOST_BUSTER_500_9911 = 9911
-GHOST_BUSTER_500_9912 = 9912
-WHITE_DESTABILISER = 9913
-RED_DESTABILISER = 9914
-BLUE_DESTABILISER = 9915
-GREEN_DESTABILISER = 9916
-YELLOW_DESTABILISER = 9917
-BLACK_DESTABILISER = 9918
-EVIL_ROOT = 9919
-JACK_LANTERN_MASK = 9920
-SKELETON_BOOTS = 9921
-SKELETON_GLOVES = 9922
-SKELETON_LEGGINGS = 9923
-SKELETON_SHIRT = 9924
-SKELETON_MASK = 9925
-AUGUSTES_SAPLING = 9932
-BALLOON_STRUCTURE = 9933
-ORIGAMI_BALLOON = 9934
-YELLOW_BALLOON = 9935
-BLUE_BALLOON = 9936
-RED_BALLOON = 9937
-ORANGE_BALLOON = 9938
-GREEN_BALLOON = 9939
-PURPLE_BALLOON = 9940
-PINK_BALLOON = 9941
-BLACK_BALLOON = 9942
-SANDBAG = 9943
-BOMBER_JACKET = 9944
-BOMBER_CAP = 9945
-CAP_AND_GOGGLES = 9946
-OLD_RED_DISK = 9947
-HUNTER_CAPE = 9948
-HUNTER_CAPET = 9949
-HUNTER_HOOD = 9950
-FOOTPRINT = 9951
-IMP = 9952
-KEBBIT = 9953
-KEBBIT_9954 = 9954
-KEBBIT_9955 = 9955
-KEBBIT_9956 = 9956
-KEBBIT_9957 = 9957
-KEBBIT_9958 = 9958
-KEBBIT_9959 = 9959
-KEBBIT_9960 = 9960
-KEBBIT_9961 = 9961
-KEBBIT_9962 = 9962
-KEBBIT_9963 = 9963
-KEBBIT_9964 = 9964
-CRIMSON_SWIFT = 9965
-COPPER_LONGTAIL = 9966
-CERULEAN_TWITCH = 9967
-GOLDEN_WARBLER = 9968
-TROPICAL_WAGTAIL = 9969
-BUTTERFLY = 9970
-BUTTERFLY_9971 = 9971
-BUTTERFLY_9972 = 9972
-BUTTERFLY_9973 = 9973
-GIANT_EAGLE = 9974
-RABBIT = 9975
-CHINCHOMPA = 9976
-RED_CHINCHOMPA = 9977
-RAW_BIRD_MEAT = 9978
-RAW_BIRD_MEAT_NOTED = 9979
-ROAST_BIRD_MEAT = 9980
-ROAST_BIRD_MEAT_NOTED = 9981
-BURNT_BIRD_MEAT = 9982
-BURNT_BIRD_MEAT_NOTED = 9983
-SKEWERED_BIRD_MEAT = 9984
-SKEWERED_BIRD_MEAT_NOTED = 9985
-RAW_BEAST_MEAT = 9986
-RAW_BEAST_MEAT_NOTED = 9987
-ROAST_BEAST_MEAT = 9988
-ROAST_BEAST_MEAT_NOTED = 9989
-BURNT_BEAST_MEAT = 9990
-BURNT_BEAST_MEAT_NOTED = 9991
-SKEWERED_BEAST = 9992
-SKEWERED_BEAST_NOTED = 9993
-SPICY_TOMATO = 9994
-SPICY_TOMATO_NOTED = 9995
-SPICY_MINCED_MEAT = 9996
-SPICY_MINCED_MEAT_NOTED = 9997
-HUNTER_POTION4 = 9998
-HUNTER_POTION4_NOTED = 9999
-HUNTER_POTION3 = 10000
-HUNTER_POTION3_NOTED = 10001
-HUNTER_POTION2 = 10002
-HUNTER_POTION2_NOTED = 10003
-HUNTER_POTION1 = 10004
-HUNTER_POTION1_NOTED = 10005
-BIRD_SNARE = 10006
-BIRD_SNARE_NOTED = 10007
-BOX_TRAP = 10008
-BOX_TRAP_NOTED = 10009
-BUTTERFLY_NET = 10010
-BUTTERFLY_NET_NOTED = 10011
-BUTTERFLY_JAR = 10012
-BUTTERFLY_JAR_NOTED = 10013
-BLACK_WARLOCK = 10014
-BLACK_WARLOCK_NOTED = 10015
-SNOWY_KNIGHT = 10016
-SNOWY_KNIGHT_NOTED = 10017
-SAPPHIRE_GLACIALIS = 10018
-SAPPHIRE_GLACIALIS_NOTED = 10019
-RUBY_HARVEST = 10020
-RUBY_HARVEST_NOTED = 10021
-FALCONERS_GLOVE = 10023
-FALCONERS_GLOVE_10024 = 10024
-MAGIC_BOX = 10025
-MAGIC_BOX_NOTED = 10026
-IMPINABOX2 = 10027
-IMPINABOX1 = 10028
-TEASING_STICK = 10029
-TEASING_STICK_NOTED = 10030
-RABBIT_SNARE = 10031
-RABBIT_SNARE_NOTED = 10032
-CHINCHOMPA_10033 = 10033
-RED_CHINCHOMPA_10034 = 10034
-KYATT_LEGS = 10035
-KYATT_LEGS_NOTED = 10036
-KYATT_TOP = 10037
-KYATT_TOP_NOTED = 10038
-KYATT_HAT = 10039
-KYATT_HAT_NOTED = 10040
-LARUPIA_LEGS = 10041
-LARUPIA_LEGS_NOTED = 10042
-LARUPIA_TOP = 10043
-LARUPIA_TOP_NOTED = 10044
-LARUPIA_HAT = 10045
-LARUPIA_HAT_NOTED = 10046
-GRAAHK_LEGS = 10047
-GRAAHK_LEGS_NOTED = 10048
-GRAAHK_TOP = 10049
-GRAAHK_TOP_NOTED = 10050
-GRAAHK_HEADDRESS = 10051
-GRAAHK_HEADDRESS_NOTED = 10052
-WOOD_CAMO_TOP = 10053
-WOOD_CAMO_TOP_NOTED = 10054
-WOOD_CAMO_LEGS = 10055
-WOOD_CAMO_LEGS_NOTED = 10056
-JUNGLE_CAMO_TOP = 10057
-JUNGLE_CAMO_TOP_NOTED = 10058
-JUNGLE_CAMO_LEGS = 10059
-JUNGLE_CAMO_LEGS_NOTED = 10060
-DESERT_CAMO_TOP = 10061
-DESERT_CAMO_TOP_NOTED = 10062
-DESERT_CAMO_LEGS = 10063
-DESERT_CAMO_LEGS_NOTED = 10064
-POLAR_CAMO_TOP = 10065
-POLAR_CAMO_TOP_NOTED = 10066
-POLAR_CAMO_LEGS = 10067
-POLAR_CAMO_LEGS_NOTED = 10068
-SPOTTED_CAPE = 10069
-SPOTTED_CAPE_NOTED = 10070
-SPOTTIER_CAPE = 10071
-SPOTTIER_CAPE_NOTED = 10072
-SPOTTED_CAPE_10073 = 10073
-SPOTTIER_CAPE_10074 = 10074
-GLOVES_OF_SILENCE = 10075
-GLOVES_OF_SILENCE_NOTED = 10076
-SPIKY_VAMBRACES = 10077
-SPIKY_VAMBRACES_NOTED = 10078
-GREEN_SPIKY_VAMBRACES = 10079
-GREEN_SPIKY_VAMBRACES_NOTED = 10080
-BLUE_SPIKY_VAMBRACES = 10081
-BLUE_SPIKY_VAMBRACES_NOTED = 10082
-RED_SPIKY_VAMBRACES = 10083
-RED_SPIKY_VAMBRACES_NOTED = 10084
-BLACK_SPIKY_VAMBRACES = 10085
-BLACK_SPIKY_VAMBRACES_NOTED = 10086
-STRIPY_FEATHER = 10087
-RED_FEATHER = 10088
-BLUE_FEATHER = 10089
-YELLOW_FEATHER = 10090
-ORANGE_FEATHER = 10091
-FERRET = 10092
-TATTY_LARUPIA_FUR = 10093
-TATTY_LARUPIA_FUR_NOTED = 10094
-LARUPIA_FUR = 10095
-LARUPIA_FUR_NOTED = 10096
-TATTY_GRAAHK_FUR = 10097
-TATTY_GRAAHK_FUR_NOTED = 10098
-GRAAHK_FUR = 10099
-GRAAHK_FUR_NOTED = 10100
-TATTY_KYATT_FUR = 10101
-TATTY_KYATT_FUR_NOTED = 10102
-KYATT_FUR = 10103
-KYATT_FUR_NOTED = 10104
-KEBBIT_SPIKE = 10105
-KEBBIT_SPIKE_NOTED = 10106
-LONG_KEBBIT_SPIKE = 10107
-LONG_KEBBIT_SPIKE_NOTED = 10108
-KEBBIT_TEETH = 10109
-KEBBIT_TEETH_NOTED = 10110
-KEBBIT_TEETH_DUST = 10111
-KEBBIT_TEETH_DUST_NOTED = 10112
-KEBBIT_CLAWS = 10113
-KEBBIT_CLAWS_NOTED = 10114
-DARK_KEBBIT_FUR = 10115
-DARK_KEBBIT_FUR_NOTED = 10116
-POLAR_KEBBIT_FUR = 10117
-POLAR_KEBBIT_FUR_NOTED = 10118
-FELDIP_WEASEL_FUR = 10119
-FELDIP_WEASEL_FUR_NOTED = 10120
-COMMON_KEBBIT_FUR = 10121
-COMMON_KEBBIT_FUR_NOTED = 10122
-DESERT_DEVIL_FUR = 10123
-DESERT_DEVIL_FUR_NOTED = 10124
-SPOTTED_KEBBIT_FUR = 10125
-SPOTTED_KEBBIT_FUR_NOTED = 10126
-DASHING_KEBBIT_FUR = 10127
-DASHING_KEBBIT_FUR_NOTED = 10128
-BARBTAIL_HARPOON = 10129
-BARBTAIL_HARPOON_NOTED = 10130
-STRUNG_RABBIT_FOOT = 10132
-STRUNG_RABBIT_FOOT_NOTED = 10133
-RABBIT_FOOT = 10134
-RABBIT_FOOT_NOTED = 10135
-RAINBOW_FISH = 10136
-RAINBOW_FISH_NOTED = 10137
-RAW_RAINBOW_FISH = 10138
-RAW_RAINBOW_FISH_NOTED = 10139
-BURNT_RAINBOW_FISH = 10140
-BURNT_RAINBOW_FISH_NOTED = 10141
-GUAM_TAR = 10142
-MARRENTILL_TAR = 10143
-TARROMIN_TAR = 10144
-HARRALANDER_TAR = 10145
-ORANGE_SALAMANDER = 10146
-RED_SALAMANDER = 10147
-BLACK_SALAMANDER = 10148
-SWAMP_LIZARD = 10149
-NOOSE_WAND = 10150
-NOOSE_WAND_NOTED = 10151
-HUNTERS_CROSSBOW = 10156
-HUNTERS_CROSSBOW_NOTED = 10157
-KEBBIT_BOLTS = 10158
-LONG_KEBBIT_BOLTS = 10159
-ORANGE_SALAMANDER_NOTED = 10160
-RED_SALAMANDER_NOTED = 10161
-BLACK_SALAMANDER_NOTED = 10162
-SWAMP_LIZARD_NOTED = 10163
-SPIRIT_FLAKES_10165 = 10165
-SPIRIT_FLAKES_10166 = 10166
-EAGLE_FEATHER = 10167
-EAGLE_FEATHER_10168 = 10168
-EAGLE_FEATHER_10169 = 10169
-EAGLE_FEATHER_10170 = 10170
-EAGLE_CAPE = 10171
-FAKE_BEAK = 10172
-BIRD_BOOK = 10173
-METAL_FEATHER = 10174
-GOLDEN_FEATHER_10175 = 10175
-SILVER_FEATHER = 10176
-BRONZE_FEATHER = 10177
-ODD_BIRD_SEED = 10178
-FEATHERED_JOURNAL = 10179
-CLUE_SCROLL_EASY_10180 = 10180
-CASKET_EASY_10181 = 10181
-CLUE_SCROLL_EASY_10182 = 10182
-CASKET_EASY_10183 = 10183
-CLUE_SCROLL_EASY_10184 = 10184
-CASKET_EASY_10185 = 10185
-CLUE_SCROLL_EASY_10186 = 10186
-CASKET_EASY_10187 = 10187
-CLUE_SCROLL_EASY_10188 = 10188
-CASKET_EASY_10189 = 10189
-CLUE_SCROLL_EASY_10190 = 10190
-CASKET_EASY_10191 = 10191
-CLUE_SCROLL_EASY_10192 = 10192
-CASKET_EASY_10193 = 10193
-CLUE_SCROLL_EASY_10194 = 10194
-CASKET_EASY_10195 = 10195
-CLUE_SCROLL_EASY_10196 = 10196
-CASKET_EASY_10197 = 10197
-CLUE_SCROLL_EASY_10198 = 10198
-CASKET_EASY_10199 = 10199
-CLUE_SCROLL_EASY_10200 = 10200
-CASKET_EASY_10201 = 10201
-CLUE_SCROLL_EASY_10202 = 10202
-CASKET_EASY_10203 = 10203
-CLUE_SCROLL_EASY_10204 = 10204
-CASKET_EASY_10205 = 10205
-CLUE_SCROLL_EASY_10206 = 10206
-CASKET_EASY_10207 = 10207
-CLUE_SCROLL_EASY_10208 = 10208
-CASKET_EASY_10209 = 10209
-CLUE_SCROLL_EASY_10210 = 10210
-CASKET_EASY_10211 = 10211
-CLUE_SCROLL_EASY_10212 = 10212
-CASKET_EASY_10213 = 10213
-CLUE_SCROLL_EASY_10214 = 10214
-CASKET_EASY_10215 = 10215
-CLUE_SCROLL_EASY_10216 = 10216
-CASKET_EASY_10217 = 10217
-CLUE_SCROLL_EASY_10218 = 10218
-CASKET_EASY_10219 = 10219
-CLUE_SCROLL_EASY_10220 = 10220
-CASKET_EASY_10221 = 10221
-CLUE_SCROLL_EASY_10222 = 10222
-CASKET_EASY_10223 = 10223
-CLUE_SCROLL_EASY_10224 = 10224
-CASKET_EASY_10225 = 10225
-CLUE_SCROLL_EASY_10226 = 10226
-CASKET_EASY_10227 = 10227
-CLUE_SCROLL_EASY_10228 = 10228
-CASKET_EASY_10229 = 10229
-CLUE_SCROLL_EASY_10230 = 10230
-CASKET_EASY_10231 = 10231
-CLUE_SCROLL_EASY_10232 = 10232
-CASKET_EASY_10233 = 10233
-CLUE_SCROLL_HARD_10234 = 10234
-CASKET_HARD_10235 = 10235
-CLUE_SCROLL_HARD_10236 = 10236
-CASKET_HARD_10237 = 10237
-CLUE_SCROLL_HARD_10238 = 10238
-CASKET_HARD_10239 = 10239
-CLUE_SCROLL_HARD_10240 = 10240
-CASKET_HARD_10241 = 10241
-CLUE_SCROLL_HARD_10242 = 10242
-CASKET_HARD_10243 = 10243
-CLUE_SCROLL_HARD_10244 = 10244
-CASKET_HARD_10245 = 10245
-CLUE_SCROLL_HARD_10246 = 10246
-CASKET_HARD_10247 = 10247
-CLUE_SCROLL_HARD_10248 = 10248
-CASKET_HARD_10249 = 10249
-CLUE_SCROLL_HARD_10250 = 10250
-CASKET_HARD_10251 = 10251
-CLUE_SCROLL_HARD_10252 = 10252
-CASKET_HARD_10253 = 10253
-CLUE_SCROLL_MEDIUM_10254 = 10254
-CASKET_MEDIUM_10255 = 10255
-CLUE_SCROLL_MEDIUM_10256 = 10256
-CASKET_MEDIUM_10257 = 10257
-CLUE_SCROLL_MEDIUM_10258 = 10258
-CASKET_MEDIUM_10259 = 10259
-CLUE_SCROLL_MEDIUM_10260 = 10260
-CASKET_MEDIUM_10261 = 10261
-CLUE_SCROLL_MEDIUM_10262 = 10262
-CASKET_MEDIUM_10263 = 10263
-CLUE_SCROLL_MEDIUM_10264 = 10264
-CASKET_MEDIUM_10265 = 10265
-CLUE_SCROLL_MEDIUM_10266 = 10266
-CASKET_MEDIUM_10267 = 10267
-CLUE_SCROLL_MEDIUM_10268 = 10268
-CASKET_MEDIUM_10269 = 10269
-CLUE_SCROLL_MEDIUM_10270 = 10270
-CASKET_MEDIUM_10271 = 10271
-CLUE_SCROLL_MEDIUM_10272 = 10272
-CASKET_MEDIUM_10273 = 10273
-CLUE_SCROLL_MEDIUM_10274 = 10274
-CASKET_MEDIUM_10275 = 10275
-CLUE_SCROLL_MEDIUM_10276 = 10276
-CASKET_MEDIUM_10277 = 10277
-CLUE_SCROLL_MEDIUM_10278 = 10278
-CASKET_MEDIUM_10279 = 10279
-WILLOW_COMP_BOW = 10280
-WILLOW_COMP_BOW_NOTED = 10281
-YEW_COMP_BOW = 10282
-YEW_COMP_BOW_NOTED = 10283
-MAGIC_COMP_BOW = 10284
-MAGIC_COMP_BOW_NOTED = 10285
-RUNE_HELM_H1 = 10286
-RUNE_HELM_H1_NOTED = 10287
-RUNE_HELM_H2 = 10288
-RUNE_HELM_H2_NOTED = 10289
-RUNE_HELM_H3 = 10290
-RUNE_HELM_H3_NOTED = 10291
-RUNE_HELM_H4 = 10292
-RUNE_HELM_H4_NOTED = 10293
-RUNE_HELM_H5 = 10294
-RUNE_HELM_H5_NOTED = 10295
-ADAMANT_HELM_H1 = 10296
-ADAMANT_HELM_H1_NOTED = 10297
-ADAMANT_HELM_H2 = 10298
-ADAMANT_HELM_H2_NOTED = 10299
-ADAMANT_HELM_H3 = 10300
-ADAMANT_HELM_H3_NOTED = 10301
-ADAMANT_HELM_H4 = 10302
-ADAMANT_HELM_H4_NOTED = 10303
-ADAMANT_HELM_H5 = 10304
-ADAMANT_HELM_H5_NOTED = 10305
-BLACK_HELM_H1 = 10306
-BLACK_HELM_H1_NOTED = 10307
-BLACK_HELM_H2 = 10308
-BLACK_HELM_H2_NOTED = 10309
-BLACK_HELM_H3 = 10310
-BLACK_HELM_H3_NOTED = 10311
-BLACK_HELM_H4 = 10312
-BLACK_HELM_H4_NOTED = 10313
-BLACK_HELM_H5 = 10314
-BLACK_HELM_H5_NOTED = 10315
-BOBS_RED_SHIRT = 10316
-BOBS_RED_SHIRT_NOTED = 10317
-BOBS_BLUE_SHIRT = 10318
-BOBS_BLUE_SHIRT_NOTED = 10319
-BOBS_GREEN_SHIRT = 10320
-BOBS_GREEN_SHIRT_NOTED = 10321
-BOBS_BLACK_SHIRT = 10322
-BOBS_BLACK_SHIRT_NOTED = 10323
-BOBS_PURPLE_SHIRT = 10324
-BOBS_PURPLE_SHIRT_NOTED = 10325
-PURPLE_FIRELIGHTER = 10326
-WHITE_FIRELIGHTER = 10327
-WHITE_LOGS = 10328
-PURPLE_LOGS = 10329
-_3RD_AGE_RANGE_TOP = 10330
-_3RD_AGE_RANGE_TOP_NOTED = 10331
-_3RD_AGE_RANGE_LEGS = 10332
-_3RD_AGE_RANGE_LEGS_NOTED = 10333
-_3RD_AGE_RANGE_COIF = 10334
-_3RD_AGE_RANGE_COIF_NOTED = 10335
-_3RD_AGE_VAMBRACES = 10336
-_3RD_AGE_VAMBRACES_NOTED = 10337
-_3RD_AGE_ROBE_TOP = 10338
-_3RD_AGE_ROBE_TOP_NOTED = 10339
-_3RD_AGE_ROBE = 10340
-_3RD_AGE_ROBE_NOTED = 10341
-_3RD_AGE_MAGE_HAT = 10342
-_3RD_AGE_MAGE_HAT_NOTED = 10343
-_3RD_AGE_AMULET = 10344
-_3RD_AGE_AMULET_NOTED = 10345
-_3RD_AGE_PLATELEGS = 10346
-_3RD_AGE_PLATELEGS_NOTED = 10347
-_3RD_AGE_PLATEBODY = 10348
-_3RD_AGE_PLATEBODY_NOTED = 10349
-_3RD_AGE_FULL_HELMET = 10350
-_3RD_AGE_FULL_HELMET_NOTED = 10351
-_3RD_AGE_KITESHIELD = 10352
-_3RD_AGE_KITESHIELD_NOTED = 10353
-AMULET_OF_GLORY_T4 = 10354
-AMULET_OF_GLORY_T4_NOTED = 10355
-AMULET_OF_GLORY_T3 = 10356
-AMULET_OF_GLORY_T3_NOTED = 10357
-AMULET_OF_GLORY_T2 = 10358
-AMULET_OF_GLORY_T2_NOTED = 10359
-AMULET_OF_GLORY_T1 = 10360
-AMULET_OF_GLORY_T1_NOTED = 10361
-AMULET_OF_GLORY_T = 10362
-AMULET_OF_GLORY_T_NOTED = 10363
-STRENGTH_AMULET_T = 10364
-STRENGTH_AMULET_T_NOTED = 10365
-AMULET_OF_MAGIC_T = 10366
-AMULET_OF_MAGIC_T_NOTED = 10367
-ZAMORAK_BRACERS = 10368
-ZAMORAK_BRACERS_NOTED = 10369
-ZAMORAK_DHIDE_BODY = 10370
-ZAMORAK_DHIDE_BODY_NOTED = 10371
-ZAMORAK_CHAPS = 10372
-ZAMORAK_CHAPS_NOTED = 10373
-ZAMORAK_COIF = 10374
-ZAMORAK_COIF_NOTED = 10375
-GUTHIX_BRACERS = 10376
-GUTHIX_BRACERS_NOTED = 10377
-GUTHIX_DHIDE_BODY = 10378
-GUTHIX_DHIDE_BODY_NOTED = 10379
-GUTHIX_CHAPS = 10380
-GUTHIX_CHAPS_NOTED = 10381
-GUTHIX_COIF = 10382
-GUTHIX_COIF_NOTED = 10383
-SARADOMIN_BRACERS = 10384
-SARADOMIN_BRACERS_NOTED = 10385
-SARADOMIN_DHIDE_BODY = 10386
-SARADOMIN_DHIDE_BODY_NOTED = 10387
-SARADOMIN_CHAPS = 10388
-SARADOMIN_CHAPS_NOTED = 10389
-SARADOMIN_COIF = 10390
-SARADOMIN_COIF_NOTED = 10391
-A_POWDERED_WIG = 10392
-A_POWDERED_WIG_NOTED = 10393
-FLARED_TROUSERS = 10394
-FLARED_TROUSERS_NOTED = 10395
-PANTALOONS = 10396
-PANTALOONS_NOTED = 10397
-SLEEPING_CAP = 10398
-SLEEPING_CAP_NOTED = 10399
-BLACK_ELEGANT_SHIRT = 10400
-BLACK_ELEGANT_SHIRT_NOTED = 10401
-BLACK_ELEGANT_LEGS = 10402
-BLACK_ELEGANT_LEGS_NOTED = 10403
-RED_ELEGANT_SHIRT = 10404
-RED_ELEGANT_SHIRT_NOTED = 10405
-RED_ELEGANT_LEGS = 10406
-RED_ELEGANT_LEGS_NOTED = 10407
-BLUE_ELEGANT_SHIRT = 10408
-BLUE_ELEGANT_SHIRT_NOTED = 10409
-BLUE_ELEGANT_LEGS = 10410
-BLUE_ELEGANT_LEGS_NOTED = 10411
-GREEN_ELEGANT_SHIRT = 10412
-GREEN_ELEGANT_SHIRT_NOTED = 10413
-GREEN_ELEGANT_LEGS = 10414
-GREEN_ELEGANT_LEGS_NOTED = 10415
-PURPLE_ELEGANT_SHIRT = 10416
-PURPLE_ELEGANT_SHIRT_NOTED = 10417
-PURPLE_ELEGANT_LEGS = 10418
-PURPLE_ELEGANT_LEGS_NOTED = 10419
-WHITE_ELEGANT_BLOUSE = 10420
-WHITE_ELEGANT_BLOUSE_NOTED = 10421
-WHITE_ELEGANT_SKIRT = 10422
-WHITE_ELEGANT_SKIRT_NOTED = 10423
-RED_ELEGANT_BLOUSE = 10424
-RED_ELEGANT_BLOUSE_NOTED = 10425
-RED_ELEGANT_SKIRT = 10426
-RED_ELEGANT_SKIRT_NOTED = 10427
-BLUE_ELEGANT_BLOUSE = 10428
-BLUE_ELEGANT_BLOUSE_NOTED = 10429
-BLUE_ELEGANT_SKIRT = 10430
-BLUE_ELEGANT_SKIRT_NOTED = 10431
-GREEN_ELEGANT_BLOUSE = 10432
-GREEN_ELEGANT_BLOUSE_NOTED = 10433
-GREEN_ELEGANT_SKIRT = 10434
-GREEN_ELEGANT_SKIRT_NOTED = 10435
-PURPLE_ELEGANT_BLOUSE = 10436
-PURPLE_ELEGANT_BLOUSE_NOTED = 10437
-PURPLE_ELEGANT_SKIRT = 10438
-PURPLE_ELEGANT_SKIRT_NOTED = 10439
-SARADOMIN_CROZIER = 10440
-SARADOMIN_CROZIER_NOTED = 10441
-GUTHIX_CROZIER = 10442
-GUTHIX_CROZIER_NOTED = 10443
-ZAMORAK_CROZIER = 10444
-ZAMORAK_CROZIER_NOTED = 10445
-SARADOMIN_CLOAK = 10446
-SARADOMIN_CLOAK_NOTED = 10447
-GUTHIX_CLOAK = 10448
-GUTHIX_CLOAK_NOTED = 10449
-ZAMORAK_CLOAK = 10450
-ZAMORAK_CLOAK_NOTED = 10451
-SARADOMIN_MITRE = 10452
-SARADOMIN_MITRE_NOTED = 10453
-GUTHIX_MITRE = 10454
-GUTHIX_MITRE_NOTED = 10455
-ZAMORAK_MITRE = 10456
-ZAMORAK_MITRE_NOTED = 10457
-SARADOMIN_ROBE_TOP = 10458
-SARADOMIN_ROBE_TOP_NOTED = 10459
-ZAMORAK_ROBE_TOP = 10460
-ZAMORAK_ROBE_TOP_NOTED = 10461
-GUTHIX_ROBE_TOP = 10462
-GUTHIX_ROBE_TOP_NOTED = 10463
-SARADOMIN_ROBE_LEGS = 10464
-SARADOMIN_ROBE_LEGS_NOTED = 10465
-GUTHIX_ROBE_LEGS = 10466
-GUTHIX_ROBE_LEGS_NOTED = 10467
-ZAMORAK_ROBE_LEGS = 10468
-ZAMORAK_ROBE_LEGS_NOTED = 10469
-SARADOMIN_STOLE = 10470
-SARADOMIN_STOLE_NOTED = 10471
-GUTHIX_STOLE = 10472
-GUTHIX_STOLE_NOTED = 10473
-ZAMORAK_STOLE = 10474
-ZAMORAK_STOLE_NOTED = 10475
-PURPLE_SWEETS_10476 = 10476
-PURPLE_SWEETS_10477 = 10477
-PURPLE_SWEETS_10478 = 10478
-PURPLE_SWEETS_10479 = 10479
-PURPLE_SWEETS_10480 = 10480
-PURPLE_SWEETS_10481 = 10481
-PURPLE_SWEETS_10482 = 10482
-PURPLE_SWEETS_10483 = 10483
-SCROLL_10485 = 10485
-EMPTY_SACK_10486 = 10486
-UNDEAD_CHICKEN = 10487
-SELECTED_IRON = 10488
-BAR_MAGNET = 10489
-UNDEAD_TWIGS = 10490
-BLESSED_AXE = 10491
-RESEARCH_NOTES_10492 = 10492
-TRANSLATED_NOTES = 10493
-A_PATTERN = 10494
-A_CONTAINER = 10495
-POLISHED_BUTTONS = 10496
-POLISHED_BUTTONS_NOTED = 10497
-AVAS_ATTRACTOR = 10498
-AVAS_ACCUMULATOR = 10499
-CRONEMADE_AMULET = 10500
-SNOWBALL = 10501
-SNOWBALL_10502 = 10502
-SNOWBALL_10503 = 10503
-SNOWBALL_10504 = 10504
-SNOWBALL_10505 = 10505
-GUBLINCH_SHARDS = 10506
-REINDEER_HAT = 10507
-WINTUMBER_TREE = 10508
-FREMENNIK_SEA_BOOTS = 10510
-NULL_10511 = 10511
-SCROLL_10512 = 10512
-CRACKERS = 10513
-TOFU = 10514
-WORMS = 10515
-ATTACKER_HORN = 10516
-ATTACKER_HORN_10517 = 10517
-ATTACKER_HORN_10518 = 10518
-ATTACKER_HORN_10519 = 10519
-ATTACKER_HORN_10520 = 10520
-COLLECTION_BAG = 10521
-COLLECTION_BAG_10522 = 10522
-COLLECTION_BAG_10523 = 10523
-COLLECTION_BAG_10524 = 10524
-COLLECTION_BAG_10525 = 10525
-HEALER_HORN = 10526
-HEALER_HORN_10527 = 10527
-HEALER_HORN_10528 = 10528
-HEALER_HORN_10529 = 10529
-HEALER_HORN_10530 = 10530
-GREEN_EGG = 10531
-RED_EGG = 10532
-BLUE_EGG = 10533
-YELLOW_EGG = 10534
-POISONED_EGG = 10535
-SPIKEDPOIS_EGG = 10536
-OMEGA_EGG = 10537
-DEFENDER_HORN = 10538
-POISONED_TOFU = 10539
-POISONED_WORMS = 10540
-POISONED_MEAT = 10541
-HEALING_VIAL4 = 10542
-HEALING_VIAL3 = 10543
-HEALING_VIAL2 = 10544
-HEALING_VIAL1 = 10545
-HEALING_VIAL = 10546
-HEALER_HAT = 10547
-FIGHTER_HAT = 10548
-RUNNER_HAT = 10549
-RANGER_HAT = 10550
-FIGHTER_TORSO = 10551
-RUNNER_BOOTS = 10552
-PENANCE_GLOVES = 10553
-PENANCE_GLOVES_10554 = 10554
-PENANCE_SKIRT = 10555
-ATTACKER_ICON = 10556
-COLLECTOR_ICON = 10557
-DEFENDER_ICON = 10558
-HEALER_ICON = 10559
-COLLECTOR_HORN = 10560
-SPIKES_10561 = 10561
-QUEEN_HELP_BOOK = 10562
-NO_EGGS = 10563
-GRANITE_BODY = 10564
-GRANITE_BODY_NOTED = 10565
-FIRE_CAPE_10566 = 10566
-HEALER_ICON_10567 = 10567
-MINNOW = 10569
-MINNOW_10570 = 10570
-MINNOW_10571 = 10571
-MINNOW_10572 = 10572
-NOXIFER_SEED = 10573
-GOLPAR_SEED = 10574
-NOXIFER_SEED_10575 = 10575
-GOLPAR_SEED_10576 = 10576
-NOXIFER_SEED_10577 = 10577
-GOLPAR_SEED_10578 = 10578
-NOXIFER_SEED_10579 = 10579
-GOLPAR_SEED_10580 = 10580
-KERIS = 10581
-KERISP = 10582
-KERISP_10583 = 10583
-KERISP_10584 = 10584
-PARCHMENT = 10585
-COMBAT_LAMP = 10586
-TARNS_DIARY = 10587
-SALVE_AMULET_E = 10588
-GRANITE_HELM = 10589
-GRANITE_HELM_NOTED = 10590
-TERROR_DOG = 10591
-PENGUIN_BONGOS = 10592
-COWBELLS = 10593
-CLOCKWORK_BOOK = 10594
-CLOCKWORK_SUIT = 10595
-CLOCKWORK_SUIT_10596 = 10596
-MISSION_REPORT = 10597
-MISSION_REPORT_10598 = 10598
-MISSION_REPORT_10599 = 10599
-KGP_ID_CARD = 10600
-SPIRIT_FLAKES_10601 = 10601
-SPIRIT_FLAKES_10602 = 10602
-NULL_10603 = 10603
-NULL_10604 = 10604
-NULL_10605 = 10605
-NULL_10606 = 10606
-NULL_10607 = 10607
-NULL_10608 = 10608
-NULL_10609 = 10609
-NULL_10610 = 10610
-NULL_10611 = 10611
-NULL_10612 = 10612
-NULL_10613 = 10613
-NULL_10614 = 10614
-NULL_10615 = 10615
-NULL_10616 = 10616
-NULL_10617 = 10617
-NULL_10618 = 10618
-NULL_10619 = 10619
-NULL_10620 = 10620
-NULL_10621 = 10621
-NULL_10622 = 10622
-NULL_10623 = 10623
-NULL_10624 = 10624
-NULL_10625 = 10625
-NULL_10626 = 10626
-NULL_10627 = 10627
-NULL_10628 = 10628
-NULL_10629 = 10629
-NULL_10630 = 10630
-NULL_10631 = 10631
-NULL_10632 = 10632
-NULL_10633 = 10633
-NULL_10634 = 10634
-NULL_10635 = 10635
-NULL_10636 = 10636
-NULL_10637 = 10637
-NULL_10638 = 10638
-NULL_10639 = 10639
-NULL_10640 = 10640
-NULL_10641 = 10641
-NULL_10642 = 10642
-NULL_10643 = 10643
-NULL_10644 = 10644
-NULL_10645 = 10645
-NULL_10646 = 10646
-NULL_10647 = 10647
-NULL_10648 = 10648
-NULL_10649 = 10649
-NULL_10650 = 10650
-NULL_10651 = 10651
-NULL_10652 = 10652
-NULL_10653 = 10653
-NULL_10654 = 10654
-NULL_10655 = 10655
-NULL_10656 = 10656
-NULL_10657 = 10657
-NULL_10658 = 10658
-NULL_10659 = 10659
-NULL_10660 = 10660
-NULL_10661 = 10661
-NULL_10662 = 10662
-NULL_10663 = 10663
-NULL_10664 = 10664
-NULL_10665 = 10665
-SPIRIT_FLAKES_10666 = 10666
-NULL_10667 = 10667
-SPIRIT_FLAKES_10669 = 10669
-NULL_10670 = 10670
-NULL_10671 = 10671
-NULL_10672 = 10672
-NULL_10673 = 10673
-NULL_10674 = 10674
-NULL_10675 = 10675
-NULL_10676 = 10676
-NULL_10677 = 10677
-NULL_10678 = 10678
-NULL_10679 = 10679
-NULL_10680 = 10680
-NULL_10681 = 10681
-NULL_10682 = 10682
-NULL_10683 = 10683
-NULL_10684 = 10684
-NULL_10685 = 10685
-NULL_10686 = 10686
-NULL_10687 = 10687
-NULL_10688 = 10688
-NULL_10689 = 10689
-NULL_10690 = 10690
-NULL_10691 = 10691
-NULL_10692 = 10692
-NULL_10693 = 10693
-NULL_10694 = 10694
-NULL_10695 = 10695
-NULL_10696 = 10696
-NULL_10697 = 10697
-NULL_10698 = 10698
-NULL_10699 = 10699
-NULL_10700 = 10700
-NULL_10701 = 10701
-NULL_10702 = 10702
-NULL_10703 = 10703
-NULL_10704 = 10704
-NULL_10705 = 10705
-NULL_10706 = 10706
-NULL_10707 = 10707
-NULL_10708 = 10708
-NULL_10709 = 10709
-NULL_10710 = 10710
-NULL_10711 = 10711
-NULL_10712 = 10712
-NULL_10713 = 10713
-NULL_10714 = 10714
-NULL_10715 = 10715
-NULL_10716 = 10716
-NULL_10717 = 10717
-NULL_10718 = 10718
-NULL_10719 = 10719
-NULL_10720 = 10720
-NULL_10721 = 10721
-NULL_10722 = 10722
-NULL_10723 = 10723
-NULL_10724 = 10724
-NULL_10725 = 10725
-NULL_10726 = 10726
-NULL_10727 = 10727
-NULL_10728 = 10728
-NULL_10729 = 10729
-NULL_10730 = 10730
-NULL_10731 = 10731
-NULL_10732 = 10732
-NULL_10733 = 10733
-NULL_10734 = 10734
-NULL_10735 = 10735
-NULL_10736 = 10736
-NULL_10737 = 10737
-NULL_10738 = 10738
-NULL_10739 = 10739
-NULL_10740 = 10740
-NULL_10741 = 10741
-NULL_10742 = 10742
-NULL_10743 = 10743
-NULL_10744 = 10744
-NULL_10745 = 10745
-NULL_10746 = 10746
-NULL_10747 = 10747
-NULL_10748 = 10748
-NULL_10749 = 10749
-NULL_10750 = 10750
-NULL_10751 = 10751
-NULL_10752 = 10752
-NULL_10753 = 10753
-NULL_10754 = 10754
-NULL_10755 = 10755
-NULL_10756 = 10756
-NULL_10757 = 10757
-NULL_10758 = 10758
-NULL_10759 = 10759
-NULL_10760 = 10760
-NULL_10761 = 10761
-NULL_10762 = 10762
-NULL_10763 = 10763
-NULL_10764 = 10764
-NULL_10765 = 10765
-NULL_10766 = 10766
-NULL_10767 = 10767
-NULL_10768 = 10768
-NULL_10769 = 10769
-NULL_10770 = 10770
-NULL_10771 = 10771
-NULL_10772 = 10772
-NULL_10773 = 10773
-NULL_10774 = 10774
-NULL_10775 = 10775
-NULL_10776 = 10776
-NULL_10777 = 10777
-NULL_10778 = 10778
-NULL_10779 = 10779
-NULL_10780 = 10780
-NULL_10781 = 10781
-NULL_10782 = 10782
-NULL_10783 = 10783
-NULL_10784 = 10784
-NULL_10785 = 10785
-NULL_10786 = 10786
-NULL_10787 = 10787
-NULL_10788 = 10788
-NULL_10789 = 10789
-NULL_10790 = 10790
-NULL_10791 = 10791
-NULL_10792 = 10792
-NULL_10793 = 10793
-NULL_10794 = 10794
-NULL_10795 = 10795
-NULL_10796 = 10796
-NULL_10797 = 10797
-NULL_10798 = 10798
-NULL_10799 = 10799
-NULL_10800 = 10800
-NULL_10801 = 10801
-NULL_10802 = 10802
-NULL_10803 = 10803
-NULL_10804 = 10804
-NULL_10805 = 10805
-NULL_10806 = 10806
-NULL_10807 = 10807
-ARCTIC_PYRE_LOGS = 10808
-ARCTIC_PYRE_LOGS_NOTED = 10809
-ARCTIC_PINE_LOGS = 10810
-ARCTIC_PINE_LOGS_NOTED = 10811
-SPLIT_LOG = 10812
-SPLIT_LOG_NOTED = 10813
-HAIR = 10814
-HAIR_NOTED = 10815
-RAW_YAK_MEAT = 10816
-RAW_YAK_MEAT_NOTED = 10817
-YAKHIDE = 10818
-YAKHIDE_NOTED = 10819
-CURED_YAKHIDE = 10820
-CURED_YAKHIDE_NOTED = 10821
-YAKHIDE_ARMOUR = 10822
-YAKHIDE_ARMOUR_NOTED = 10823
-YAKHIDE_ARMOUR_10824 = 10824
-YAKHIDE_ARMOUR_NOTED_10825 = 10825
-NEITIZNOT_SHIELD = 10826
-NEITIZNOT_SHIELD_NOTED = 10827
-HELM_OF_NEITIZNOT = 10828
-DOCUMENTS = 10829
-ROYAL_DECREE = 10830
-EMPTY_TAX_BAG = 10831
-LIGHT_TAX_BAG = 10832
-NORMAL_TAX_BAG = 10833
-HEFTY_TAX_BAG = 10834
-BULGING_TAXBAG = 10835
-SILLY_JESTER_HAT = 10836
-SILLY_JESTER_TOP = 10837
-SILLY_JESTER_TIGHTS = 10838
-SILLY_JESTER_BOOTS = 10839
-A_JESTER_STICK = 10840
-APRICOT_CREAM_PIE = 10841
-DECAPITATED_HEAD_10842 = 10842
-HELM_OF_NEITIZNOT_NOTED = 10843
-SPRING_SQIRK = 10844
-SUMMER_SQIRK = 10845
-AUTUMN_SQIRK = 10846
-WINTER_SQIRK = 10847
-SPRING_SQIRKJUICE = 10848
-SUMMER_SQIRKJUICE = 10849
-AUTUMN_SQIRKJUICE = 10850
-WINTER_SQIRKJUICE = 10851
-SUMMER_GARDEN = 10852
-SPRING_GARDEN = 10853
-AUTUMN_GARDEN = 10854
-WINTER_GARDEN = 10855
-SIN_SEERS_NOTE = 10856
-SEVERED_LEG = 10857
-SHADOW_SWORD = 10858
-TEA_FLASK = 10859
-HARD_HAT = 10862
-BUILDERS_SHIRT = 10863
-BUILDERS_TROUSERS = 10864
-BUILDERS_BOOTS = 10865
-RIVETS = 10866
-RIVETS_10867 = 10867
-RIVETS_10868 = 10868
-RIVETS_10869 = 10869
-BINDING_FLUID = 10870
-PIPE_10871 = 10871
-PIPE_RING = 10872
-METAL_SHEET = 10873
-COLOURED_BALL = 10874
-VALVE_WHEEL = 10875
-METAL_BAR = 10876
-PLAIN_SATCHEL = 10877
-GREEN_SATCHEL = 10878
-RED_SATCHEL = 10879
-BLACK_SATCHEL = 10880
-GOLD_SATCHEL = 10881
-RUNE_SATCHEL = 10882
-NULL_10883 = 10883
-FUSE_10884 = 10884
-KEG = 10885
-PRAYER_BOOK = 10886
-BARRELCHEST_ANCHOR = 10887
-BARRELCHEST_ANCHOR_10888 = 10888
-BLESSED_LAMP = 10889
-PRAYER_BOOK_10890 = 10890
-WOODEN_CAT = 10891
-WOODEN_CAT_NOTED = 10892
-CRANIAL_CLAMP = 10893
-BRAIN_TONGS = 10894
-BELL_JAR = 10895
-WOLF_WHISTLE = 10896
-SHIPPING_ORDER = 10897
-KEG_10898 = 10898
-CRATE_PART = 10899
-CRATE_PART_10900 = 10900
-CRATE_PART_10901 = 10901
-CRATE_PART_10902 = 10902
-CRATE_PART_10903 = 10903
-SKULL_STAPLE = 10904
-SKULL_STAPLE_10905 = 10905
-SKULL_STAPLE_10906 = 10906
-SKULL_STAPLE_10907 = 10907
-SKULL_STAPLE_10908 = 10908
-MIXTURE__STEP_14 = 10909
-MIXTURE__STEP_14_NOTED = 10910
-MIXTURE__STEP_13 = 10911
-MIXTURE__STEP_13_NOTED = 10912
-MIXTURE__STEP_12 = 10913
-MIXTURE__STEP_12_NOTED = 10914
-MIXTURE__STEP_11 = 10915
-MIXTURE__STEP_11_NOTED = 10916
-MIXTURE__STEP_24 = 10917
-MIXTURE__STEP_24_NOTED = 10918
-MIXTURE__STEP_23 = 10919
-MIXTURE__STEP_23_NOTED = 10920
-MIXTURE__STEP_22 = 10921
-MIXTURE__STEP_22_NOTED = 10922
-MIXTURE__STEP_21 = 10923
-MIXTURE__STEP_21_NOTED = 10924
-SANFEW_SERUM4 = 10925
-SANFEW_SERUM4_NOTED = 10926
-SANFEW_SERUM3 = 10927
-SANFEW_SERUM3_NOTED = 10928
-SANFEW_SERUM2 = 10929
-SANFEW_SERUM2_NOTED = 10930
-SANFEW_SERUM1 = 10931
-SANFEW_SERUM1_NOTED = 10932
-LUMBERJACK_BOOTS = 10933
-REWARD_TOKEN_10934 = 10934
-REWARD_TOKEN_10935 = 10935
-REWARD_TOKEN_10936 = 10936
-NAIL_BEAST_NAILS = 10937
-NAIL_BEAST_NAILS_NOTED = 10938
-LUMBERJACK_TOP = 10939
-LUMBERJACK_LEGS = 10940
-LUMBERJACK_HAT = 10941
-REWARD_TOKEN_10942 = 10942
-REWARD_TOKEN_10943 = 10943
-REWARD_TOKEN_10944 = 10944
-NULL_10945 = 10945
-PUSHUP = 10946
-RUN = 10947
-SITUP = 10948
-STARJUMP = 10949
-SKULL_STAPLES = 10950
-SKULL_STAPLES_10951 = 10951
-SLAYER_BELL = 10952
-SLAYER_BELL_NOTED = 10953
-FROGLEATHER_BODY = 10954
-FROGLEATHER_BODY_NOTED = 10955
-FROGLEATHER_CHAPS = 10956
-FROGLEATHER_CHAPS_NOTED = 10957
-FROGLEATHER_BOOTS = 10958
-FROGLEATHER_BOOTS_NOTED = 10959
-GREEN_GLOOP_SOUP = 10960
-FROGSPAWN_GUMBO = 10961
-FROGBURGER = 10962
-COATED_FROGS_LEGS = 10963
-BAT_SHISH = 10964
-FINGERS = 10965
-GRUBS__LA_MODE = 10966
-ROAST_FROG = 10967
-MUSHROOMS = 10968
-FILLETS = 10969
-LOACH = 10970
-EEL_SUSHI = 10971
-DORGESHKAAN_SPHERE = 10972
-LIGHT_ORB = 10973
-LIGHT_ORB_NOTED = 10974
-SPANNER = 10975
-LONG_BONE = 10976
-CURVED_BONE = 10977
-SWAMP_WEED = 10978
-SWAMP_WEED_NOTED = 10979
-EMPTY_LIGHT_ORB = 10980
-CAVE_GOBLIN_WIRE = 10981
-CAVE_GOBLIN_WIRE_NOTED = 10982
-COG = 10983
-COG_10984 = 10984
-FUSE_10985 = 10985
-FUSE_10986 = 10986
-METER = 10987
-METER_10988 = 10988
-CAPACITOR = 10989
-CAPACITOR_10990 = 10990
-LEVER_10991 = 10991
-LEVER_10992 = 10992
-POWERBOX = 10993
-POWERBOX_10994 = 10994
-PERFECT_SHELL = 10995
-PERFECT_SNAIL_SHELL = 10996
-MOLANISK = 10997
-CAVE_GOBLIN = 10998
-GOBLIN_BOOK = 10999
-GOBLIN_BOOK_NOTED = 11000
-DAGONHAI_HISTORY = 11001
-SINKETHS_DIARY = 11002
-AN_EMPTY_FOLDER = 11003
-AN_EMPTY_FOLDER_11004 = 11004
-AN_EMPTY_FOLDER_11005 = 11005
-USED_FOLDER = 11006
-FULL_FOLDER = 11007
-RATS_PAPER = 11008
-LETTER_TO_SUROK = 11009
-SUROKS_LETTER = 11010
-ZAFFS_INSTRUCTIONS = 11011
-WAND = 11012
-INFUSED_WAND = 11013
-BEACON_RING = 11014
-NULL_11015 = 11015
-NULL_11016 = 11016
-NULL_11017 = 11017
-NULL_11018 = 11018
-CHICKEN_FEET = 11019
-CHICKEN_WINGS = 11020
-CHICKEN_HEAD = 11021
-CHICKEN_LEGS = 11022
-MAGIC_EGG = 11023
-RABBIT_MOULD = 11024
-CHOCOLATE_CHUNKS = 11025
-CHOCOLATE_KEBBIT = 11026
-EASTER_EGG_11027 = 11027
-EASTER_EGG_11028 = 11028
-EASTER_EGG_11029 = 11029
-EASTER_EGG_11030 = 11030
-DAMP_PLANKS = 11031
-CRUDE_CARVING = 11032
-CRUDER_CARVING = 11033
-SVENS_LAST_MAP = 11034
-WINDSWEPT_LOGS = 11035
-PARCHMENT_11036 = 11036
-BRINE_SABRE = 11037
-BRINE_SABRE_NOTED = 11038
-KEY_11039 = 11039
-KEY_11040 = 11040
-KEY_11041 = 11041
-KEY_11042 = 11042
-KEY_11043 = 11043
-ROTTEN_BARREL = 11044
-ROTTEN_BARREL_11045 = 11045
-ROPE_11046 = 11046
-BRINE_RAT = 11047
-ARMOUR_SHARD = 11048
-ARTEFACT = 11049
-AXE_HEAD = 11050
-ARTEFACT_11051 = 11051
-HELMET_FRAGMENT = 11052
-ARTEFACT_11053 = 11053
-SHIELD_FRAGMENT = 11054
-ARTEFACT_11055 = 11055
-SWORD_FRAGMENT = 11056
-ARTEFACT_11057 = 11057
-MACE = 11058
-ARTEFACT_11059 = 11059
-GOBLIN_VILLAGE_SPHERE = 11060
-ANCIENT_MACE = 11061
-ZANIK_SLICE = 11062
-ANCIENT_MACE_NOTED = 11064
-BRACELET_MOULD = 11065
-BRACELET_MOULD_NOTED = 11066
-GOLD_BRACELET = 11068
-GOLD_BRACELET_11069 = 11069
-GOLD_BRACELET_NOTED = 11070
-SAPPHIRE_BRACELET = 11071
-SAPPHIRE_BRACELET_11072 = 11072
-SAPPHIRE_BRACELET_NOTED = 11073
-BRACELET_OF_CLAY = 11074
-BRACELET_OF_CLAY_NOTED = 11075
-EMERALD_BRACELET = 11076
-EMERALD_BRACELET_NOTED = 11077
-EMERALD_BRACELET_11078 = 11078
-CASTLE_WARS_BRACELET3 = 11079
-CASTLE_WARS_BRACELET3_NOTED = 11080
-CASTLE_WARS_BRACELET2 = 11081
-CASTLE_WARS_BRACELET2_NOTED = 11082
-CASTLE_WARS_BRACELET1 = 11083
-CASTLE_WARS_BRACELET1_NOTED = 11084
-RUBY_BRACELET = 11085
-RUBY_BRACELET_NOTED = 11086
-RUBY_BRACELET_11087 = 11087
-INOCULATION_BRACELET = 11088
-INOCULATION_BRACELET_NOTED = 11089
-PHOENIX_NECKLACE = 11090
-PHOENIX_NECKLACE_NOTED = 11091
-DIAMOND_BRACELET = 11092
-DIAMOND_BRACELET_NOTED = 11093
-DIAMOND_BRACELET_11094 = 11094
-ABYSSAL_BRACELET5 = 11095
-ABYSSAL_BRACELET5_NOTED = 11096
-ABYSSAL_BRACELET4 = 11097
-ABYSSAL_BRACELET4_NOTED = 11098
-ABYSSAL_BRACELET3 = 11099
-ABYSSAL_BRACELET3_NOTED = 11100
-ABYSSAL_BRACELET2 = 11101
-ABYSSAL_BRACELET2_NOTED = 11102
-ABYSSAL_BRACELET1 = 11103
-ABYSSAL_BRACELET1_NOTED = 11104
-SKILLS_NECKLACE4 = 11105
-SKILLS_NECKLACE4_NOTED = 11106
-SKILLS_NECKLACE3 = 11107
-SKILLS_NECKLACE3_NOTED = 11108
-SKILLS_NECKLACE2 = 11109
-SKILLS_NECKLACE2_NOTED = 11110
-SKILLS_NECKLACE1 = 11111
-SKILLS_NECKLACE1_NOTED = 11112
-SKILLS_NECKLACE = 11113
-SKILLS_NECKLACE_NOTED = 11114
-DRAGONSTONE_BRACELET = 11115
-DRAGONSTONE_BRACELET_NOTED = 11116
-DRAGON_BRACELET = 11117
-COMBAT_BRACELET4 = 11118
-COMBAT_BRACELET4_NOTED = 11119
-COMBAT_BRACELET3 = 11120
-COMBAT_BRACELET3_NOTED = 11121
-COMBAT_BRACELET2 = 11122
-COMBAT_BRACELET2_NOTED = 11123
-COMBAT_BRACELET1 = 11124
-COMBAT_BRACELET1_NOTED = 11125
-COMBAT_BRACELET = 11126
-COMBAT_BRACELET_NOTED = 11127
-BERSERKER_NECKLACE = 11128
-BERSERKER_NECKLACE_NOTED = 11129
-ONYX_BRACELET = 11130
-ONYX_BRACELET_NOTED = 11131
-ONYX_BRACELET_11132 = 11132
-REGEN_BRACELET = 11133
-REGEN_BRACELET_NOTED = 11134
-NULL_11135 = 11135
-KARAMJA_GLOVES_1 = 11136
-ANTIQUE_LAMP_11137 = 11137
-KARAMJA_GLOVES_2 = 11138
-ANTIQUE_LAMP_11139 = 11139
-KARAMJA_GLOVES_3 = 11140
-ANTIQUE_LAMP_11141 = 11141
-DREAM_VIAL_EMPTY = 11151
-DREAM_VIAL_WATER = 11152
-DREAM_VIAL_HERB = 11153
-DREAM_POTION = 11154
-GROUND_ASTRAL_RUNE = 11155
-ASTRAL_RUNE_SHARDS = 11156
-DREAMY_LAMP = 11157
-CYRISUSS_CHEST = 11158
-HUNTER_KIT = 11159
-FLIGHTED_OGRE_ARROW_11160 = 11160
-FLIGHTED_OGRE_ARROW_11161 = 11161
-FLIGHTED_OGRE_ARROW_11162 = 11162
-FLIGHTED_OGRE_ARROW_11163 = 11163
-RESTORED_SHIELD = 11164
-PHOENIX_CROSSBOW_11165 = 11165
-PHOENIX_CROSSBOW_NOTED_11166 = 11166
-PHOENIX_CROSSBOW_11167 = 11167
-PHOENIX_CROSSBOW_NOTED_11168 = 11168
-NEWSPAPER = 11169
-NEWSPAPER_NOTED = 11170
-NEWSPAPER_11171 = 11171
-NEWSPAPER_NOTED_11172 = 11172
-HALF_CERTIFICATE = 11173
-HALF_CERTIFICATE_11174 = 11174
-UNCLEANED_FIND = 11175
-ARROWHEADS = 11176
-JEWELLERY = 11177
-POTTERY = 11178
-OLD_COIN = 11179
-ANCIENT_COIN = 11180
-ANCIENT_SYMBOL = 11181
-OLD_SYMBOL = 11182
-OLD_CHIPPED_VASE = 11183
-MUSEUM_MAP = 11184
-ANTIQUE_LAMP_11185 = 11185
-ANTIQUE_LAMP_11186 = 11186
-ANTIQUE_LAMP_11187 = 11187
-ANTIQUE_LAMP_11188 = 11188
-ANTIQUE_LAMP_11189 = 11189
-DIGSITE_PENDANT_1 = 11190
-DIGSITE_PENDANT_2 = 11191
-DIGSITE_PENDANT_3 = 11192
-DIGSITE_PENDANT_4 = 11193
-DIGSITE_PENDANT_5 = 11194
-CLEAN_NECKLACE = 11195
-GRIFFIN_FEATHER = 11196
-MIAZRQAS_PENDANT = 11197
-MUSIC_SHEET = 11198
-RUPERTS_HELMET = 11199
-DWARVEN_HELMET = 11200
-DWARVEN_HELMET_NOTED = 11201
-SHRINKING_RECIPE = 11202
-TODO_LIST = 11203
-SHRINKMEQUICK = 11204
-SHRUNK_OGLEROOT = 11205
-SHRUNK_OGLEROOT_11206 = 11206
-SHRUNK_OGLEROOT_11207 = 11207
-SHRUNK_OGLEROOT_11208 = 11208
-SHRUNK_OGLEROOT_11209 = 11209
-GOLDEN_GOBLIN = 11210
-MAGIC_BEANS = 11211
-DRAGON_ARROW = 11212
-DRAGON_ARROW_11213 = 11213
-DRAGON_ARROW_11214 = 11214
-DRAGON_ARROW_11215 = 11215
-DRAGON_ARROW_11216 = 11216
-DRAGON_FIRE_ARROW = 11217
-DRAGON_FIRE_ARROW_11218 = 11218
-DRAGON_FIRE_ARROW_11219 = 11219
-DRAGON_FIRE_ARROW_11220 = 11220
-DRAGON_FIRE_ARROW_11221 = 11221
-DRAGON_FIRE_ARROW_LIT = 11222
-DRAGON_FIRE_ARROW_LIT_11223 = 11223
-DRAGON_FIRE_ARROW_LIT_11224 = 11224
-DRAGON_FIRE_ARROW_LIT_11225 = 11225
-DRAGON_FIRE_ARROW_LIT_11226 = 11226
-DRAGON_ARROWP = 11227
-DRAGON_ARROWP_11228 = 11228
-DRAGON_ARROWP_11229 = 11229
-DRAGON_DART = 11230
-DRAGON_DARTP = 11231
-DRAGON_DART_TIP = 11232
-DRAGON_DARTP_11233 = 11233
-DRAGON_DARTP_11234 = 11234
-DARK_BOW = 11235
-DARK_BOW_NOTED = 11236
-DRAGON_ARROWTIPS = 11237
-BABY_IMPLING_JAR = 11238
-BABY_IMPLING_JAR_NOTED = 11239
-YOUNG_IMPLING_JAR = 11240
-YOUNG_IMPLING_JAR_NOTED = 11241
-GOURMET_IMPLING_JAR = 11242
-GOURMET_IMPLING_JAR_NOTED = 11243
-EARTH_IMPLING_JAR = 11244
-EARTH_IMPLING_JAR_NOTED = 11245
-ESSENCE_IMPLING_JAR = 11246
-ESSENCE_IMPLING_JAR_NOTED = 11247
-ECLECTIC_IMPLING_JAR = 11248
-ECLECTIC_IMPLING_JAR_NOTED = 11249
-NATURE_IMPLING_JAR = 11250
-NATURE_IMPLING_JAR_NOTED = 11251
-MAGPIE_IMPLING_JAR = 11252
-MAGPIE_IMPLING_JAR_NOTED = 11253
-NINJA_IMPLING_JAR = 11254
-NINJA_IMPLING_JAR_NOTED = 11255
-DRAGON_IMPLING_JAR = 11256
-DRAGON_IMPLING_JAR_NOTED = 11257
-JAR_GENERATOR = 11258
-MAGIC_BUTTERFLY_NET = 11259
-IMPLING_JAR = 11260
-IMPLING_JAR_NOTED = 11261
-IMP_REPELLENT = 11262
-IMP_REPELLENT_NOTED = 11263
-ANCHOVY_OIL = 11264
-ANCHOVY_OIL_NOTED = 11265
-ANCHOVY_PASTE = 11266
-DUMMY_11267 = 11267
-DUMMY_11268 = 11268
-DUMMY_11269 = 11269
-DUMMY_NOTED = 11270
-DUMMY_11271 = 11271
-DUMMY_NOTED_11272 = 11272
-IMPLING_SCROLL = 11273
-NULL_11274 = 11274
-MITH_GRAPPLE_NOTED = 11275
-MITH_GRAPPLE_NOTED_11276 = 11276
-NULL_11277 = 11277
-NULL_11278 = 11278
-ELVARGS_HEAD = 11279
-CAVALIER_MASK = 11280
-CAVALIER_MASK_NOTED = 11281
-BERET_MASK = 11282
-DRAGONFIRE_SHIELD = 11283
-DRAGONFIRE_SHIELD_11284 = 11284
-DRAGONFIRE_SHIELD_NOTED = 11285
-DRACONIC_VISAGE = 11286
-DRACONIC_VISAGE_NOTED = 11287
-BARBARIAN_ROD = 11323
-ROE = 11324
-ROE_NOTED = 11325
-CAVIAR = 11326
-CAVIAR_NOTED = 11327
-LEAPING_TROUT = 11328
-LEAPING_TROUT_NOTED = 11329
-LEAPING_SALMON = 11330
-LEAPING_SALMON_NOTED = 11331
-LEAPING_STURGEON = 11332
-LEAPING_STURGEON_NOTED = 11333
-FISH_OFFCUTS = 11334
-DRAGON_FULL_HELM = 11335
-DRAGON_FULL_HELM_NOTED = 11336
-MANGLED_BONES = 11337
-CHEWED_BONES = 11338
-MY_NOTES = 11339
-BARBARIAN_SKILLS = 11340
-ANCIENT_PAGE = 11341
-ANCIENT_PAGE_11342 = 11342
-ANCIENT_PAGE_11343 = 11343
-ANCIENT_PAGE_11344 = 11344
-ANCIENT_PAGE_11345 = 11345
-ANCIENT_PAGE_11346 = 11346
-ANCIENT_PAGE_11347 = 11347
-ANCIENT_PAGE_11348 = 11348
-ANCIENT_PAGE_11349 = 11349
-ANCIENT_PAGE_11350 = 11350
-ANCIENT_PAGE_11351 = 11351
-ANCIENT_PAGE_11352 = 11352
-ANCIENT_PAGE_11353 = 11353
-ANCIENT_PAGE_11354 = 11354
-ANCIENT_PAGE_11355 = 11355
-ANCIENT_PAGE_11356 = 11356
-ANCIENT_PAGE_11357 = 11357
-ANCIENT_PAGE_11358 = 11358
-ANCIENT_PAGE_11359 = 11359
-ANCIENT_PAGE_11360 = 11360
-ANCIENT_PAGE_11361 = 11361
-ANCIENT_PAGE_11362 = 11362
-ANCIENT_PAGE_11363 = 11363
-ANCIENT_PAGE_11364 = 11364
-ANCIENT_PAGE_11365 = 11365
-ANCIENT_PAGE_11366 = 11366
-BRONZE_HASTA = 11367
-BRONZE_HASTA_NOTED = 11368
-IRON_HASTA = 11369
-IRON_HASTA_NOTED = 11370
-STEEL_HASTA = 11371
-STEEL_HASTA_NOTED = 11372
-MITHRIL_HASTA = 11373
-MITHRIL_HASTA_NOTED = 11374
-ADAMANT_HASTA = 11375
-ADAMANT_HASTA_NOTED = 11376
-RUNE_HASTA = 11377
-RUNE_HASTA_NOTED = 11378
-BRONZE_HASTAP = 11379
-BRONZE_HASTAP_NOTED = 11380
-BRONZE_HASTAKP = 11381
-BRONZE_HASTAP_11382 = 11382
-BRONZE_HASTAP_NOTED_11383 = 11383
-BRONZE_HASTAP_11384 = 11384
-BRONZE_HASTAP_NOTED_11385 = 11385
-IRON_HASTAP = 11386
-IRON_HASTAP_NOTED = 11387
-IRON_HASTAKP = 11388
-IRON_HASTAP_11389 = 11389
-IRON_HASTAP_NOTED_11390 = 11390
-IRON_HASTAP_11391 = 11391
-IRON_HASTAP_NOTED_11392 = 11392
-STEEL_HASTAP = 11393
-STEEL_HASTAP_NOTED = 11394
-STEEL_HASTAKP = 11395
-STEEL_HASTAP_11396 = 11396
-STEEL_HASTAP_NOTED_11397 = 11397
-STEEL_HASTAP_11398 = 11398
-STEEL_HASTAP_NOTED_11399 = 11399
-MITHRIL_HASTAP = 11400
-MITHRIL_HASTAP_NOTED = 11401
-MITHRIL_HASTAKP = 11402
-MITHRIL_HASTAP_11403 = 11403
-MITHRIL_HASTAP_NOTED_11404 = 11404
-MITHRIL_HASTAP_11405 = 11405
-MITHRIL_HASTAP_NOTED_11406 = 11406
-ADAMANT_HASTAP = 11407
-ADAMANT_HASTAP_NOTED = 11408
-ADAMANT_HASTAKP = 11409
-ADAMANT_HASTAP_11410 = 11410
-ADAMANT_HASTAP_NOTED_11411 = 11411
-ADAMANT_HASTAP_11412 = 11412
-ADAMANT_HASTAP_NOTED_11413 = 11413
-RUNE_HASTAP = 11414
-RUNE_HASTAP_NOTED = 11415
-RUNE_HASTAKP = 11416
-RUNE_HASTAP_11417 = 11417
-RUNE_HASTAP_NOTED_11418 = 11418
-RUNE_HASTAP_11419 = 11419
-RUNE_HASTAP_NOTED_11420 = 11420
-FISH_VIAL = 11427
-FISH_VIAL_11428 = 11428
-ATTACK_MIX2 = 11429
-ATTACK_MIX2_NOTED = 11430
-ATTACK_MIX1 = 11431
-ATTACK_MIX1_NOTED = 11432
-ANTIPOISON_MIX2 = 11433
-ANTIPOISON_MIX2_NOTED = 11434
-ANTIPOISON_MIX1 = 11435
-ANTIPOISON_MIX1_NOTED = 11436
-RELICYMS_MIX2 = 11437
-RELICYMS_MIX2_NOTED = 11438
-RELICYMS_MIX1 = 11439
-RELICYMS_MIX1_NOTED = 11440
-STRENGTH_MIX1 = 11441
-STRENGTH_MIX1_NOTED = 11442
-STRENGTH_MIX2 = 11443
-STRENGTH_MIX2_NOTED = 11444
-COMBAT_MIX2 = 11445
-COMBAT_MIX2_NOTED = 11446
-COMBAT_MIX1 = 11447
-COMBAT_MIX1_NOTED = 11448
-RESTORE_MIX2 = 11449
-RESTORE_MIX2_NOTED = 11450
-RESTORE_MIX1 = 11451
-RESTORE_MIX1_NOTED = 11452
-ENERGY_MIX2 = 11453
-ENERGY_MIX2_NOTED = 11454
-ENERGY_MIX1 = 11455
-ENERGY_MIX1_NOTED = 11456
-DEFENCE_MIX2 = 11457
-DEFENCE_MIX2_NOTED = 11458
-DEFENCE_MIX1 = 11459
-DEFENCE_MIX1_NOTED = 11460
-AGILITY_MIX2 = 11461
-AGILITY_MIX2_NOTED = 11462
-AGILITY_MIX1 = 11463
-AGILITY_MIX1_NOTED = 11464
-PRAYER_MIX2 = 11465
-PRAYER_MIX2_NOTED = 11466
-PRAYER_MIX1 = 11467
-PRAYER_MIX1_NOTED = 11468
-SUPERATTACK_MIX2 = 11469
-SUPERATTACK_MIX2_NOTED = 11470
-SUPERATTACK_MIX1 = 11471
-SUPERATTACK_MIX1_NOTED = 11472
-ANTIPOISON_SUPERMIX2 = 11473
-ANTIPOISON_SUPERMIX2_NOTED = 11474
-ANTIPOISON_SUPERMIX1 = 11475
-ANTIPOISON_SUPERMIX1_NOTED = 11476
-FISHING_MIX2 = 11477
-FISHING_MIX2_NOTED = 11478
-FISHING_MIX1 = 11479
-FISHING_MIX1_NOTED = 11480
-SUPER_ENERGY_MIX2 = 11481
-SUPER_ENERGY_MIX2_NOTED = 11482
-SUPER_ENERGY_MIX1 = 11483
-SUPER_ENERGY_MIX1_NOTED = 11484
-SUPER_STR_MIX2 = 11485
-SUPER_STR_MIX2_NOTED = 11486
-SUPER_STR_MIX1 = 11487
-SUPER_STR_MIX1_NOTED = 11488
-MAGIC_ESSENCE_MIX2 = 11489
-MAGIC_ESSENCE_MIX2_NOTED = 11490
-MAGIC_ESSENCE_MIX1 = 11491
-MAGIC_ESSENCE_MIX1_NOTED = 11492
-SUPER_RESTORE_MIX2 = 11493
-SUPER_RESTORE_MIX2_NOTED = 11494
-SUPER_RESTORE_MIX1 = 11495
-SUPER_RESTORE_MIX1_NOTED = 11496
-SUPER_DEF_MIX2 = 11497
-SUPER_DEF_MIX2_NOTED = 11498
-SUPER_DEF_MIX1 = 11499
-SUPER_DEF_MIX1_NOTED = 11500
-ANTIDOTE_MIX2 = 11501
-ANTIDOTE_MIX2_NOTED = 11502
-ANTIDOTE_MIX1 = 11503
-ANTIDOTE_MIX1_NOTED = 11504
-ANTIFIRE_MIX2 = 11505
-ANTIFIRE_MIX2_NOTED = 11506
-ANTIFIRE_MIX1 = 11507
-ANTIFIRE_MIX1_NOTED = 11508
-RANGING_MIX2 = 11509
-RANGING_MIX2_NOTED = 11510
-RANGING_MIX1 = 11511
-RANGING_MIX1_NOTED = 11512
-MAGIC_MIX2 = 11513
-MAGIC_MIX2_NOTED = 11514
-MAGIC_MIX1 = 11515
-MAGIC_MIX1_NOTED = 11516
-HUNTING_MIX2 = 11517
-HUNTING_MIX2_NOTED = 11518
-HUNTING_MIX1 = 11519
-HUNTING_MIX1_NOTED = 11520
-ZAMORAK_MIX2 = 11521
-ZAMORAK_MIX2_NOTED = 11522
-ZAMORAK_MIX1 = 11523
-ZAMORAK_MIX1_NOTED = 11524
-FEATHER_11525 = 11525
-BOOK_OF_KNOWLEDGE = 11640
-ASTRONOMY_BOOK_NOTED = 11655
-GLASSBLOWING_BOOK = 11656
-GLASSBLOWING_BOOK_NOTED = 11657
-VOID_MAGE_HELM = 11663
-VOID_RANGER_HELM = 11664
-VOID_MELEE_HELM = 11665
-VOID_SEAL8 = 11666
-VOID_SEAL7 = 11667
-VOID_SEAL6 = 11668
-VOID_SEAL5 = 11669
-VOID_SEAL4 = 11670
-VOID_SEAL3 = 11671
-VOID_SEAL2 = 11672
-VOID_SEAL1 = 11673
-NULL_11674 = 11674
-NULL_11675 = 11675
-NULL_11676 = 11676
-EXPLORERS_NOTES = 11677
-BLACK_KNIGHT_HELM = 11678
-ANTIQUE_LAMP_11679 = 11679
-ADDRESS_FORM = 11680
-SCRAP_PAPER = 11681
-HAIR_CLIP = 11682
-FIRE_RUNE_11686 = 11686
-WATER_RUNE_11687 = 11687
-AIR_RUNE_11688 = 11688
-EARTH_RUNE_11689 = 11689
-MIND_RUNE_11690 = 11690
-BODY_RUNE_11691 = 11691
-DEATH_RUNE_11692 = 11692
-NATURE_RUNE_11693 = 11693
-CHAOS_RUNE_11694 = 11694
-LAW_RUNE_11695 = 11695
-COSMIC_RUNE_11696 = 11696
-BLOOD_RUNE_11697 = 11697
-SOUL_RUNE_11698 = 11698
-ASTRAL_RUNE_11699 = 11699
-BRONZE_ARROW_11700 = 11700
-IRON_ARROW_11701 = 11701
-STEEL_ARROW_11702 = 11702
-MITHRIL_ARROW_11703 = 11703
-RAW_PHEASANT_11704 = 11704
-BEACH_BOXING_GLOVES = 11705
-BEACH_BOXING_GLOVES_11706 = 11706
-CURSED_GOBLIN_HAMMER = 11707
-CURSED_GOBLIN_BOW = 11708
-CURSED_GOBLIN_STAFF = 11709
-ANTIDRAGON_SHIELD_NZ = 11710
-MAGIC_SECATEURS_NZ = 11711
-CHAOS_RUNE_NZ = 11712
-DEATH_RUNE_NZ = 11713
-BLOOD_RUNE_NZ = 11714
-AIR_RUNE_NZ = 11715
-WATER_RUNE_NZ = 11716
-EARTH_RUNE_NZ = 11717
-FIRE_RUNE_NZ = 11718
-RUNE_PICKAXE_NZ = 11719
-MITHRIL_PICKAXE_NZ = 11720
-IRON_PICKAXE_NZ = 11721
-SUPER_RANGING_4 = 11722
-SUPER_RANGING_3 = 11723
-SUPER_RANGING_2 = 11724
-SUPER_RANGING_1 = 11725
-SUPER_MAGIC_POTION_4 = 11726
-SUPER_MAGIC_POTION_3 = 11727
-SUPER_MAGIC_POTION_2 = 11728
-SUPER_MAGIC_POTION_1 = 11729
-OVERLOAD_4 = 11730
-OVERLOAD_3 = 11731
-OVERLOAD_2 = 11732
-OVERLOAD_1 = 11733
-ABSORPTION_4 = 11734
-ABSORPTION_3 = 11735
-ABSORPTION_2 = 11736
-ABSORPTION_1 = 11737
-HERB_BOX = 11738
-OPEN_HERB_BOX = 11739
-SCROLL_OF_REDIRECTION = 11740
-RIMMINGTON_TELEPORT = 11741
-TAVERLEY_TELEPORT = 11742
-POLLNIVNEACH_TELEPORT = 11743
-RELLEKKA_TELEPORT = 11744
-BRIMHAVEN_TELEPORT = 11745
-YANILLE_TELEPORT = 11746
-TROLLHEIM_TELEPORT = 11747
-NEW_CRYSTAL_BOW_I = 11748
-CRYSTAL_BOW_FULL_I = 11749
-CRYSTAL_BOW_910_I = 11750
-CRYSTAL_BOW_810_I = 11751
-CRYSTAL_BOW_710_I = 11752
-CRYSTAL_BOW_610_I = 11753
-CRYSTAL_BOW_510_I = 11754
-CRYSTAL_BOW_410_I = 11755
-CRYSTAL_BOW_310_I = 11756
-CRYSTAL_BOW_210_I = 11757
-CRYSTAL_BOW_110_I = 11758
-NEW_CRYSTAL_SHIELD_I = 11759
-CRYSTAL_SHIELD_FULL_I = 11760
-CRYSTAL_SHIELD_910_I = 11761
-CRYSTAL_SHIELD_810_I = 11762
-CRYSTAL_SHIELD_710_I = 11763
-CRYSTAL_SHIELD_610_I = 11764
-CRYSTAL_SHIELD_510_I = 11765
-CRYSTAL_SHIELD_410_I = 11766
-CRYSTAL_SHIELD_310_I = 11767
-CRYSTAL_SHIELD_210_I = 11768
-CRYSTAL_SHIELD_110_I = 11769
-SEERS_RING_I = 11770
-ARCHERS_RING_I = 11771
-WARRIOR_RING_I = 11772
-BERSERKER_RING_I = 11773
-BLACK_MASK_10_I = 11774
-BLACK_MASK_9_I = 11775
-BLACK_MASK_8_I = 11776
-BLACK_MASK_7_I = 11777
-BLACK_MASK_6_I = 11778
-BLACK_MASK_5_I = 11779
-BLACK_MASK_4_I = 11780
-BLACK_MASK_3_I = 11781
-BLACK_MASK_2_I = 11782
-BLACK_MASK_1_I = 11783
-BLACK_MASK_I = 11784
-ARMADYL_CROSSBOW = 11785
-ARMADYL_CROSSBOW_NOTED = 11786
-STEAM_BATTLESTAFF = 11787
-STEAM_BATTLESTAFF_NOTED = 11788
-MYSTIC_STEAM_STAFF = 11789
-MYSTIC_STEAM_STAFF_NOTED = 11790
-STAFF_OF_THE_DEAD = 11791
-STAFF_OF_THE_DEAD_NOTED = 11792
-AGILITY_JUMP_11793 = 11793
-GODSWORD_SHARDS_1__2 = 11794
-GODSWORD_SHARDS_1__2_NOTED = 11795
-GODSWORD_SHARDS_1__3 = 11796
-GODSWORD_SHARDS_1__3_NOTED = 11797
-GODSWORD_BLADE = 11798
-GODSWORD_BLADE_NOTED = 11799
-GODSWORD_SHARDS_2__3 = 11800
-GODSWORD_SHARDS_2__3_NOTED = 11801
-ARMADYL_GODSWORD = 11802
-ARMADYL_GODSWORD_NOTED = 11803
-BANDOS_GODSWORD = 11804
-BANDOS_GODSWORD_NOTED = 11805
-SARADOMIN_GODSWORD = 11806
-SARADOMIN_GODSWORD_NOTED = 11807
-ZAMORAK_GODSWORD = 11808
-ZAMORAK_GODSWORD_NOTED = 11809
-ARMADYL_HILT = 11810
-ARMADYL_HILT_NOTED = 11811
-BANDOS_HILT = 11812
-BANDOS_HILT_NOTED = 11813
-SARADOMIN_HILT = 11814
-SARADOMIN_HILT_NOTED = 11815
-ZAMORAK_HILT = 11816
-ZAMORAK_HILT_NOTED = 11817
-GODSWORD_SHARD_1 = 11818
-GODSWORD_SHARD_1_NOTED = 11819
-GODSWORD_SHARD_2 = 11820
-GODSWORD_SHARD_2_NOTED = 11821
-GODSWORD_SHARD_3 = 11822
-GODSWORD_SHARD_3_NOTED = 11823
-ZAMORAKIAN_SPEAR = 11824
-ZAMORAKIAN_SPEAR_NOTED = 11825
-ARMADYL_HELMET = 11826
-ARMADYL_HELMET_NOTED = 11827
-ARMADYL_CHESTPLATE = 11828
-ARMADYL_CHESTPLATE_NOTED = 11829
-ARMADYL_CHAINSKIRT = 11830
-ARMADYL_CHAINSKIRT_NOTED = 11831
-BANDOS_CHESTPLATE = 11832
-BANDOS_CHESTPLATE_NOTED = 11833
-BANDOS_TASSETS = 11834
-BANDOS_TASSETS_NOTED = 11835
-BANDOS_BOOTS = 11836
-BANDOS_BOOTS_NOTED = 11837
-SARADOMIN_SWORD = 11838
-SARADOMIN_SWORD_NOTED = 11839
-DRAGON_BOOTS = 11840
-DRAGON_BOOTS_NOTED = 11841
-KNIGHTS_NOTES = 11842
-KNIGHTS_NOTES_11843 = 11843
-BLACK_HWEEN_MASK = 11847
-RANCID_TURKEY = 11848
-MARK_OF_GRACE = 11849
-GRACEFUL_HOOD = 11850
-GRACEFUL_HOOD_11851 = 11851
-GRACEFUL_CAPE = 11852
-GRACEFUL_CAPE_11853 = 11853
-GRACEFUL_TOP = 11854
-GRACEFUL_TOP_11855 = 11855
-GRACEFUL_LEGS = 11856
-GRACEFUL_LEGS_11857 = 11857
-GRACEFUL_GLOVES = 11858
-GRACEFUL_GLOVES_11859 = 11859
-GRACEFUL_BOOTS = 11860
-GRACEFUL_BOOTS_11861 = 11861
-BLACK_PARTYHAT = 11862
-RAINBOW_PARTYHAT = 11863
-SLAYER_HELMET = 11864
-SLAYER_HELMET_I = 11865
-SLAYER_RING_8 = 11866
-SLAYER_RING_7 = 11867
-SLAYER_RING_6 = 11868
-SLAYER_RING_5 = 11869
-SLAYER_RING_4 = 11870
-SLAYER_RING_3 = 11871
-SLAYER_RING_2 = 11872
-SLAYER_RING_1 = 11873
-BROAD_ARROWHEADS_11874 = 11874
-BROAD_BOLTS_11875 = 11875
-UNFINISHED_BROAD_BOLTS_11876 = 11876
-EMPTY_VIAL_PACK = 11877
-EMPTY_VIAL_PACK_NOTED = 11878
-WATERFILLED_VIAL_PACK = 11879
-WATERFILLED_VIAL_PACK_NOTED = 11880
-FEATHER_PACK = 11881
-FEATHER_PACK_NOTED = 11882
-BAIT_PACK = 11883
-BAIT_PACK_NOTED = 11884
-BROAD_ARROWHEAD_PACK = 11885
-BROAD_ARROWHEAD_PACK_NOTED = 11886
-UNFINISHED_BROAD_BOLT_PACK = 11887
-UNFINISHED_BROAD_BOLT_PACK_NOTED = 11888
-ZAMORAKIAN_HASTA = 11889
-ZAMORAKIAN_HASTA_NOTED = 11890
-SARADOMIN_BANNER_11891 = 11891
-ZAMORAK_BANNER_11892 = 11892
-DECORATIVE_ARMOUR_11893 = 11893
-DECORATIVE_ARMOUR_11894 = 11894
-DECORATIVE_ARMOUR_11895 = 11895
-DECORATIVE_ARMOUR_11896 = 11896
-DECORATIVE_ARMOUR_11897 = 11897
-DECORATIVE_ARMOUR_11898 = 11898
-DECORATIVE_ARMOUR_11899 = 11899
-DECORATIVE_ARMOUR_11900 = 11900
-DECORATIVE_ARMOUR_11901 = 11901
-LEAFBLADED_SWORD = 11902
-LEAFBLADED_SWORD_NOTED = 11903
-ENTOMOLOGISTS_DIARY = 11904
-TRIDENT_OF_THE_SEAS_FULL = 11905
-TRIDENT_OF_THE_SEAS_FULL_NOTED = 11906
-TRIDENT_OF_THE_SEAS = 11907
-UNCHARGED_TRIDENT = 11908
-UNCHARGED_TRIDENT_NOTED = 11909
-CHOCOLATE_STRAWBERRY = 11910
-CHOCOLATE_STRAWBERRY_NOTED = 11911
-BOX_OF_CHOCOLATE_STRAWBERRIES = 11912
-BOX_OF_CHOCOLATE_STRAWBERRIES_NOTED = 11913
-BOX_OF_CHOCOLATE_STRAWBERRIES_11914 = 11914
-BOX_OF_CHOCOLATE_STRAWBERRIES_NOTED_11915 = 11915
-SLICE_OF_BIRTHDAY_CAKE = 11916
-SLICE_OF_BIRTHDAY_CAKE_11917 = 11917
-BIRTHDAY_PRESENT = 11918
-COW_MASK = 11919
-DRAGON_PICKAXE = 11920
-DRAGON_PICKAXE_NOTED = 11921
-LAVA_DRAGON_BONEMEAL = 11922
-BROKEN_PICKAXE_11923 = 11923
-MALEDICTION_WARD = 11924
-MALEDICTION_WARD_NOTED = 11925
-ODIUM_WARD = 11926
-ODIUM_WARD_NOTED = 11927
-ODIUM_SHARD_1 = 11928
-ODIUM_SHARD_2 = 11929
-ODIUM_SHARD_3 = 11930
-MALEDICTION_SHARD_1 = 11931
-MALEDICTION_SHARD_2 = 11932
-MALEDICTION_SHARD_3 = 11933
-RAW_DARK_CRAB = 11934
-RAW_DARK_CRAB_NOTED = 11935
-DARK_CRAB = 11936
-DARK_CRAB_NOTED = 11937
-BURNT_DARK_CRAB = 11938
-BURNT_DARK_CRAB_NOTED = 11939
-DARK_FISHING_BAIT = 11940
-LOOTING_BAG = 11941
-ECUMENICAL_KEY = 11942
-LAVA_DRAGON_BONES = 11943
-LAVA_DRAGON_BONES_NOTED = 11944
-ODIUM_SHARD_1_NOTED = 11945
-ODIUM_SHARD_2_NOTED = 11946
-ODIUM_SHARD_3_NOTED = 11947
-MALEDICTION_SHARD_1_NOTED = 11948
-MALEDICTION_SHARD_2_NOTED = 11949
-MALEDICTION_SHARD_3_NOTED = 11950
-EXTENDED_ANTIFIRE4 = 11951
-EXTENDED_ANTIFIRE4_NOTED = 11952
-EXTENDED_ANTIFIRE3 = 11953
-EXTENDED_ANTIFIRE3_NOTED = 11954
-EXTENDED_ANTIFIRE2 = 11955
-EXTENDED_ANTIFIRE2_NOTED = 11956
-EXTENDED_ANTIFIRE1 = 11957
-EXTENDED_ANTIFIRE1_NOTED = 11958
-BLACK_CHINCHOMPA = 11959
-EXTENDED_ANTIFIRE_MIX2 = 11960
-EXTENDED_ANTIFIRE_MIX2_NOTED = 11961
-EXTENDED_ANTIFIRE_MIX1 = 11962
-EXTENDED_ANTIFIRE_MIX1_NOTED = 11963
-AMULET_OF_GLORY_T6 = 11964
-AMULET_OF_GLORY_T6_NOTED = 11965
-AMULET_OF_GLORY_T5 = 11966
-AMULET_OF_GLORY_T5_NOTED = 11967
-SKILLS_NECKLACE6 = 11968
-SKILLS_NECKLACE6_NOTED = 11969
-SKILLS_NECKLACE5 = 11970
-SKILLS_NECKLACE5_NOTED = 11971
-COMBAT_BRACELET6 = 11972
-COMBAT_BRACELET6_NOTED = 11973
-COMBAT_BRACELET5 = 11974
-COMBAT_BRACELET5_NOTED = 11975
-AMULET_OF_GLORY5 = 11976
-AMULET_OF_GLORY5_NOTED = 11977
-AMULET_OF_GLORY6 = 11978
-AMULET_OF_GLORY6_NOTED = 11979
-RING_OF_WEALTH_5 = 11980
-RING_OF_WEALTH_5_NOTED = 11981
-RING_OF_WEALTH_4 = 11982
-RING_OF_WEALTH_4_NOTED = 11983
-RING_OF_WEALTH_3 = 11984
-RING_OF_WEALTH_3_NOTED = 11985
-RING_OF_WEALTH_2 = 11986
-RING_OF_WEALTH_2_NOTED = 11987
-RING_OF_WEALTH_1 = 11988
-RING_OF_WEALTH_1_NOTED = 11989
-FEDORA = 11990
-FEDORA_NOTED = 11991
-LAVA_SCALE = 11992
-LAVA_SCALE_NOTED = 11993
-LAVA_SCALE_SHARD_11994 = 11994
-PET_CHAOS_ELEMENTAL = 11995
-HOLIDAY_TOOL = 11996
-EASTER = 11997
-SMOKE_BATTLESTAFF = 11998
-SMOKE_BATTLESTAFF_NOTED = 11999
-MYSTIC_SMOKE_STAFF = 12000
-MYSTIC_SMOKE_STAFF_NOTED = 12001
-OCCULT_NECKLACE = 12002
-OCCULT_NECKLACE_NOTED = 12003
-KRAKEN_TENTACLE = 12004
-KRAKEN_TENTACLE_NOTED = 12005
-ABYSSAL_TENTACLE = 12006
-JAR_OF_DIRT = 12007
-JAR_OF_DIRT_NOTED = 12008
-SOFT_CLAY_PACK = 12009
-SOFT_CLAY_PACK_12010 = 12010
-PAYDIRT = 12011
-GOLDEN_NUGGET = 12012
-PROSPECTOR_HELMET = 12013
-PROSPECTOR_JACKET = 12014
-PROSPECTOR_LEGS = 12015
-PROSPECTOR_BOOTS = 12016
-SALVE_AMULETI = 12017
-SALVE_AMULETEI = 12018
-COAL_BAG_12019 = 12019
-GEM_BAG_12020 = 12020
-CLUE_SCROLL_MEDIUM_12021 = 12021
-CASKET_MEDIUM_12022 = 12022
-CLUE_SCROLL_MEDIUM_12023 = 12023
-CASKET_MEDIUM_12024 = 12024
-CLUE_SCROLL_MEDIUM_12025 = 12025
-CASKET_MEDIUM_12026 = 12026
-CLUE_SCROLL_MEDIUM_12027 = 12027
-CASKET_MEDIUM_12028 = 12028
-CLUE_SCROLL_MEDIUM_12029 = 12029
-CASKET_MEDIUM_12030 = 12030
-CLUE_SCROLL_MEDIUM_12031 = 12031
-CASKET_MEDIUM_12032 = 12032
-CLUE_SCROLL_MEDIUM_12033 = 12033
-CASKET_MEDIUM_12034 = 12034
-CLUE_SCROLL_MEDIUM_12035 = 12035
-CASKET_MEDIUM_12036 = 12036
-CLUE_SCROLL_MEDIUM_12037 = 12037
-CASKET_MEDIUM_12038 = 12038
-CLUE_SCROLL_MEDIUM_12039 = 12039
-CASKET_MEDIUM_12040 = 12040
-CLUE_SCROLL_MEDIUM_12041 = 12041
-CASKET_MEDIUM_12042 = 12042
-CLUE_SCROLL_MEDIUM_12043 = 12043
-CASKET_MEDIUM_12044 = 12044
-CLUE_SCROLL_MEDIUM_12045 = 12045
-CASKET_MEDIUM_12046 = 12046
-CLUE_SCROLL_MEDIUM_12047 = 12047
-CASKET_MEDIUM_12048 = 12048
-CLUE_SCROLL_MEDIUM_12049 = 12049
-CASKET_MEDIUM_12050 = 12050
-CLUE_SCROLL_MEDIUM_12051 = 12051
-CASKET_MEDIUM_12052 = 12052
-CLUE_SCROLL_MEDIUM_12053 = 12053
-CASKET_MEDIUM_12054 = 12054
-CLUE_SCROLL_MEDIUM_12055 = 12055
-CHALLENGE_SCROLL_MEDIUM_12056 = 12056
-CLUE_SCROLL_MEDIUM_12057 = 12057
-CHALLENGE_SCROLL_MEDIUM_12058 = 12058
-CLUE_SCROLL_MEDIUM_12059 = 12059
-CHALLENGE_SCROLL_MEDIUM_12060 = 12060
-CLUE_SCROLL_MEDIUM_12061 = 12061
-CHALLENGE_SCROLL_MEDIUM_12062 = 12062
-CLUE_SCROLL_MEDIUM_12063 = 12063
-CHALLENGE_SCROLL_MEDIUM_12064 = 12064
-CLUE_SCROLL_MEDIUM_12065 = 12065
-CHALLENGE_SCROLL_MEDIUM_12066 = 12066
-CLUE_SCROLL_MEDIUM_12067 = 12067
-CHALLENGE_SCROLL_MEDIUM_12068 = 12068
-CLUE_SCROLL_MEDIUM_12069 = 12069
-CHALLENGE_SCROLL_MEDIUM_12070 = 12070
-CLUE_SCROLL_MEDIUM_12071 = 12071
-CHALLENGE_SCROLL_MEDIUM_12072 = 12072
-CLUE_SCROLL_ELITE = 12073
-CLUE_SCROLL_ELITE_12074 = 12074
-CLUE_SCROLL_ELITE_12075 = 12075
-CLUE_SCROLL_ELITE_12076 = 12076
-CLUE_SCROLL_ELITE_12077 = 12077
-CLUE_SCROLL_ELITE_12078 = 12078
-CLUE_SCROLL_ELITE_12079 = 12079
-CLUE_SCROLL_ELITE_12080 = 12080
-CLUE_SCROLL_ELITE_12081 = 12081
-CLUE_SCROLL_ELITE_12082 = 12082
-CLUE_SCROLL_ELITE_12083 = 12083
-CASKET_ELITE = 12084
-CLUE_SCROLL_ELITE_12085 = 12085
-CLUE_SCROLL_ELITE_12086 = 12086
-CLUE_SCROLL_ELITE_12087 = 12087
-CLUE_SCROLL_ELITE_12088 = 12088
-CLUE_SCROLL_ELITE_12089 = 12089
-CLUE_SCROLL_ELITE_12090 = 12090
-CLUE_SCROLL_ELITE_12091 = 12091
-CLUE_SCROLL_ELITE_12092 = 12092
-CLUE_SCROLL_ELITE_12093 = 12093
-CLUE_SCROLL_ELITE_12094 = 12094
-CLUE_SCROLL_ELITE_12095 = 12095
-CLUE_SCROLL_ELITE_12096 = 12096
-CLUE_SCROLL_ELITE_12097 = 12097
-CLUE_SCROLL_ELITE_12098 = 12098
-CLUE_SCROLL_ELITE_12099 = 12099
-CLUE_SCROLL_ELITE_12100 = 12100
-CLUE_SCROLL_ELITE_12101 = 12101
-CLUE_SCROLL_ELITE_12102 = 12102
-CLUE_SCROLL_ELITE_12103 = 12103
-CLUE_SCROLL_ELITE_12104 = 12104
-CLUE_SCROLL_ELITE_12105 = 12105
-CLUE_SCROLL_ELITE_12106 = 12106
-CLUE_SCROLL_ELITE_12107 = 12107
-CLUE_SCROLL_ELITE_12108 = 12108
-CLUE_SCROLL_ELITE_12109 = 12109
-CLUE_SCROLL_ELITE_12110 = 12110
-CLUE_SCROLL_ELITE_12111 = 12111
-CASKET_ELITE_12112 = 12112
-CLUE_SCROLL_ELITE_12113 = 12113
-CLUE_SCROLL_ELITE_12114 = 12114
-CLUE_SCROLL_ELITE_12115 = 12115
-CLUE_SCROLL_ELITE_12116 = 12116
-CLUE_SCROLL_ELITE_12117 = 12117
-CLUE_SCROLL_ELITE_12118 = 12118
-CLUE_SCROLL_ELITE_12119 = 12119
-CLUE_SCROLL_ELITE_12120 = 12120
-CLUE_SCROLL_ELITE_12121 = 12121
-CLUE_SCROLL_ELITE_12122 = 12122
-CLUE_SCROLL_ELITE_12123 = 12123
-CLUE_SCROLL_ELITE_12124 = 12124
-CLUE_SCROLL_ELITE_12125 = 12125
-CLUE_SCROLL_ELITE_12126 = 12126
-CLUE_SCROLL_ELITE_12127 = 12127
-CHALLENGE_SCROLL_ELITE = 12128
-CASKET_ELITE_12129 = 12129
-CLUE_SCROLL_ELITE_12130 = 12130
-CASKET_ELITE_12131 = 12131
-CLUE_SCROLL_ELITE_12132 = 12132
-CLUE_SCROLL_ELITE_12133 = 12133
-CLUE_SCROLL_ELITE_12134 = 12134
-CLUE_SCROLL_ELITE_12135 = 12135
-CLUE_SCROLL_ELITE_12136 = 12136
-CLUE_SCROLL_ELITE_12137 = 12137
-CLUE_SCROLL_ELITE_12138 = 12138
-CHALLENGE_SCROLL_ELITE_12139 = 12139
-CLUE_SCROLL_ELITE_12140 = 12140
-CLUE_SCROLL_ELITE_12141 = 12141
-CLUE_SCROLL_ELITE_12142 = 12142
-CLUE_SCROLL_ELITE_12143 = 12143
-CLUE_SCROLL_ELITE_12144 = 12144
-CLUE_SCROLL_ELITE_12145 = 12145
-CLUE_SCROLL_ELITE_12146 = 12146
-CLUE_SCROLL_ELITE_12147 = 12147
-CLUE_SCROLL_ELITE_12148 = 12148
-CLUE_SCROLL_ELITE_12149 = 12149
-CLUE_SCROLL_ELITE_12150 = 12150
-CLUE_SCROLL_ELITE_12151 = 12151
-CLUE_SCROLL_ELITE_12152 = 12152
-CLUE_SCROLL_ELITE_12153 = 12153
-CLUE_SCROLL_ELITE_12154 = 12154
-CLUE_SCROLL_ELITE_12155 = 12155
-CLUE_SCROLL_ELITE_12156 = 12156
-CLUE_SCROLL_ELITE_12157 = 12157
-CLUE_SCROLL_ELITE_12158 = 12158
-CLUE_SCROLL_ELITE_12159 = 12159
-CASKET_ELITE_12160 = 12160
-PUZZLE_BOX_ELITE = 12161
-CLUE_SCROLL_EASY_12162 = 12162
-CASKET_EASY_12163 = 12163
-CLUE_SCROLL_EASY_12164 = 12164
-CASKET_EASY_12165 = 12165
-CLUE_SCROLL_EASY_12166 = 12166
-CLUE_SCROLL_EASY_12167 = 12167
-CLUE_SCROLL_EASY_12168 = 12168
-CLUE_SCROLL_EASY_12169 = 12169
-CLUE_SCROLL_EASY_12170 = 12170
-CASKET_EASY_12171 = 12171
-CLUE_SCROLL_EASY_12172 = 12172
-CLUE_SCROLL_EASY_12173 = 12173
-CLUE_SCROLL_EASY_12174 = 12174
-CLUE_SCROLL_EASY_12175 = 12175
-CLUE_SCROLL_EASY_12176 = 12176
-CLUE_SCROLL_EASY_12177 = 12177
-CLUE_SCROLL_EASY_12178 = 12178
-CLUE_SCROLL_EASY_12179 = 12179
-CASKET_EASY_12180 = 12180
-CLUE_SCROLL_EASY_12181 = 12181
-CLUE_SCROLL_EASY_12182 = 12182
-CLUE_SCROLL_EASY_12183 = 12183
-CLUE_SCROLL_EASY_12184 = 12184
-CLUE_SCROLL_EASY_12185 = 12185
-CLUE_SCROLL_EASY_12186 = 12186
-CLUE_SCROLL_EASY_12187 = 12187
-CLUE_SCROLL_EASY_12188 = 12188
-CLUE_SCROLL_EASY_12189 = 12189
-CLUE_SCROLL_EASY_12190 = 12190
-CLUE_SCROLL_EASY_12191 = 12191
-CLUE_SCROLL_EASY_12192 = 12192
-ANCIENT_ROBE_TOP = 12193
-ANCIENT_ROBE_TOP_NOTED = 12194
-ANCIENT_ROBE_LEGS = 12195
-ANCIENT_ROBE_LEGS_NOTED = 12196
-ANCIENT_CLOAK = 12197
-ANCIENT_CLOAK_NOTED = 12198
-ANCIENT_CROZIER = 12199
-ANCIENT_CROZIER_NOTED = 12200
-ANCIENT_STOLE = 12201
-ANCIENT_STOLE_NOTED = 12202
-ANCIENT_MITRE = 12203
-ANCIENT_MITRE_NOTED = 12204
-BRONZE_PLATEBODY_G = 12205
-BRONZE_PLATEBODY_G_NOTED = 12206
-BRONZE_PLATELEGS_G = 12207
-BRONZE_PLATELEGS_G_NOTED = 12208
-BRONZE_PLATESKIRT_G = 12209
-BRONZE_PLATESKIRT_G_NOTED = 12210
-BRONZE_FULL_HELM_G = 12211
-BRONZE_FULL_HELM_G_NOTED = 12212
-BRONZE_KITESHIELD_G = 12213
-BRONZE_KITESHIELD_G_NOTED = 12214
-BRONZE_PLATEBODY_T = 12215
-BRONZE_PLATEBODY_T_NOTED = 12216
-BRONZE_PLATELEGS_T = 12217
-BRONZE_PLATELEGS_T_NOTED = 12218
-BRONZE_PLATESKIRT_T = 12219
-BRONZE_PLATESKIRT_T_NOTED = 12220
-BRONZE_FULL_HELM_T = 12221
-BRONZE_FULL_HELM_T_NOTED = 12222
-BRONZE_KITESHIELD_T = 12223
-BRONZE_KITESHIELD_T_NOTED = 12224
-IRON_PLATEBODY_T = 12225
-IRON_PLATEBODY_T_NOTED = 12226
-IRON_PLATELEGS_T = 12227
-IRON_PLATELEGS_T_NOTED = 12228
-IRON_PLATESKIRT_T = 12229
-IRON_PLATESKIRT_T_NOTED = 12230
-IRON_FULL_HELM_T = 12231
-IRON_FULL_HELM_T_NOTED = 12232
-IRON_KITESHIELD_T = 12233
-IRON_KITESHIELD_T_NOTED = 12234
-IRON_PLATEBODY_G = 12235
-IRON_PLATEBODY_G_NOTED = 12236
-IRON_PLATELEGS_G = 12237
-IRON_PLATELEGS_G_NOTED = 12238
-IRON_PLATESKIRT_G = 12239
-IRON_PLATESKIRT_G_NOTED = 12240
-IRON_FULL_HELM_G = 12241
-IRON_FULL_HELM_G_NOTED = 12242
-IRON_KITESHIELD_G = 12243
-IRON_KITESHIELD_G_NOTED = 12244
-BEANIE = 12245
-BEANIE_NOTED = 12246
-RED_BERET = 12247
-RED_BERET_NOTED = 12248
-IMP_MASK = 12249
-IMP_MASK_NOTED = 12250
-GOBLIN_MASK = 12251
-GOBLIN_MASK_NOTED = 12252
-ARMADYL_ROBE_TOP = 12253
-ARMADYL_ROBE_TOP_NOTED = 12254
-ARMADYL_ROBE_LEGS = 12255
-ARMADYL_ROBE_LEGS_NOTED = 12256
-ARMADYL_STOLE = 12257
-ARMADYL_STOLE_NOTED = 12258
-ARMADYL_MITRE = 12259
-ARMADYL_MITRE_NOTED = 12260
-ARMADYL_CLOAK = 12261
-ARMADYL_CLOAK_NOTED = 12262
-ARMADYL_CROZIER = 12263
-ARMADYL_CROZIER_NOTED = 12264
-BANDOS_ROBE_TOP = 12265
-BANDOS_ROBE_TOP_NOTED = 12266
-BANDOS_ROBE_LEGS = 12267
-BANDOS_ROBE_LEGS_NOTED = 12268
-BANDOS_STOLE = 12269
-BANDOS_STOLE_NOTED = 12270
-BANDOS_MITRE = 12271
-BANDOS_MITRE_NOTED = 12272
-BANDOS_CLOAK = 12273
-BANDOS_CLOAK_NOTED = 12274
-BANDOS_CROZIER = 12275
-BANDOS_CROZIER_NOTED = 12276
-MITHRIL_PLATEBODY_G = 12277
-MITHRIL_PLATEBODY_G_NOTED = 12278
-MITHRIL_PLATELEGS_G = 12279
-MITHRIL_PLATELEGS_G_NOTED = 12280
-MITHRIL_KITESHIELD_G = 12281
-MITHRIL_KITESHIELD_G_NOTED = 12282
-MITHRIL_FULL_HELM_G = 12283
-MITHRIL_FULL_HELM_G_NOTED = 12284
-MITHRIL_PLATESKIRT_G = 12285
-MITHRIL_PLATESKIRT_G_NOTED = 12286
-MITHRIL_PLATEBODY_T = 12287
-MITHRIL_PLATEBODY_T_NOTED = 12288
-MITHRIL_PLATELEGS_T = 12289
-MITHRIL_PLATELEGS_T_NOTED = 12290
-MITHRIL_KITESHIELD_T = 12291
-MITHRIL_KITESHIELD_T_NOTED = 12292
-MITHRIL_FULL_HELM_T = 12293
-MITHRIL_FULL_HELM_T_NOTED = 12294
-MITHRIL_PLATESKIRT_T = 12295
-MITHRIL_PLATESKIRT_T_NOTED = 12296
-BLACK_PICKAXE = 12297
-BLACK_PICKAXE_NOTED = 12298
-WHITE_HEADBAND = 12299
-WHITE_HEADBAND_NOTED = 12300
-BLUE_HEADBAND = 12301
-BLUE_HEADBAND_NOTED = 12302
-GOLD_HEADBAND = 12303
-GOLD_HEADBAND_NOTED = 12304
-PINK_HEADBAND = 12305
-PINK_HEADBAND_NOTED = 12306
-GREEN_HEADBAND = 12307
-GREEN_HEADBAND_NOTED = 12308
-PINK_BOATER = 12309
-PINK_BOATER_NOTED = 12310
-PURPLE_BOATER = 12311
-PURPLE_BOATER_NOTED = 12312
-WHITE_BOATER = 12313
-WHITE_BOATER_NOTED = 12314
-PINK_ELEGANT_SHIRT = 12315
-PINK_ELEGANT_SHIRT_NOTED = 12316
-PINK_ELEGANT_LEGS = 12317
-PINK_ELEGANT_LEGS_NOTED = 12318
-CRIER_HAT = 12319
-CRIER_HAT_NOTED = 12320
-WHITE_CAVALIER = 12321
-WHITE_CAVALIER_NOTED = 12322
-RED_CAVALIER = 12323
-RED_CAVALIER_NOTED = 12324
-NAVY_CAVALIER = 12325
-NAVY_CAVALIER_NOTED = 12326
-RED_DHIDE_BODY_G = 12327
-RED_DHIDE_BODY_G_NOTED = 12328
-RED_DHIDE_CHAPS_G = 12329
-RED_DHIDE_CHAPS_G_NOTED = 12330
-RED_DHIDE_BODY_T = 12331
-RED_DHIDE_BODY_T_NOTED = 12332
-RED_DHIDE_CHAPS_T = 12333
-RED_DHIDE_CHAPS_T_NOTED = 12334
-BRIEFCASE = 12335
-BRIEFCASE_NOTED = 12336
-SAGACIOUS_SPECTACLES = 12337
-SAGACIOUS_SPECTACLES_NOTED = 12338
-PINK_ELEGANT_BLOUSE = 12339
-PINK_ELEGANT_BLOUSE_NOTED = 12340
-PINK_ELEGANT_SKIRT = 12341
-PINK_ELEGANT_SKIRT_NOTED = 12342
-GOLD_ELEGANT_BLOUSE = 12343
-GOLD_ELEGANT_BLOUSE_NOTED = 12344
-GOLD_ELEGANT_SKIRT = 12345
-GOLD_ELEGANT_SKIRT_NOTED = 12346
-GOLD_ELEGANT_SHIRT = 12347
-GOLD_ELEGANT_SHIRT_NOTED = 12348
-GOLD_ELEGANT_LEGS = 12349
-GOLD_ELEGANT_LEGS_NOTED = 12350
-MUSKETEER_HAT = 12351
-MUSKETEER_HAT_NOTED = 12352
-MONOCLE = 12353
-MONOCLE_NOTED = 12354
-BIG_PIRATE_HAT = 12355
-BIG_PIRATE_HAT_NOTED = 12356
-KATANA = 12357
-KATANA_NOTED = 12358
-LEPRECHAUN_HAT = 12359
-LEPRECHAUN_HAT_NOTED = 12360
-CAT_MASK = 12361
-CAT_MASK_NOTED = 12362
-BRONZE_DRAGON_MASK = 12363
-BRONZE_DRAGON_MASK_NOTED = 12364
-IRON_DRAGON_MASK = 12365
-IRON_DRAGON_MASK_NOTED = 12366
-STEEL_DRAGON_MASK = 12367
-STEEL_DRAGON_MASK_NOTED = 12368
-MITHRIL_DRAGON_MASK = 12369
-MITHRIL_DRAGON_MASK_NOTED = 12370
-LAVA_DRAGON_MASK = 12371
-LAVA_DRAGON_MASK_NOTED = 12372
-DRAGON_CANE = 12373
-DRAGON_CANE_NOTED = 12374
-BLACK_CANE = 12375
-BLACK_CANE_NOTED = 12376
-ADAMANT_CANE = 12377
-ADAMANT_CANE_NOTED = 12378
-RUNE_CANE = 12379
-RUNE_CANE_NOTED = 12380
-BLACK_DHIDE_BODY_G = 12381
-BLACK_DHIDE_BODY_G_NOTED = 12382
-BLACK_DHIDE_CHAPS_G = 12383
-BLACK_DHIDE_CHAPS_G_NOTED = 12384
-BLACK_DHIDE_BODY_T = 12385
-BLACK_DHIDE_BODY_T_NOTED = 12386
-BLACK_DHIDE_CHAPS_T = 12387
-BLACK_DHIDE_CHAPS_T_NOTED = 12388
-GILDED_SCIMITAR = 12389
-GILDED_SCIMITAR_NOTED = 12390
-GILDED_BOOTS = 12391
-GILDED_BOOTS_NOTED = 12392
-ROYAL_GOWN_TOP = 12393
-ROYAL_GOWN_TOP_NOTED = 12394
-ROYAL_GOWN_BOTTOM = 12395
-ROYAL_GOWN_BOTTOM_NOTED = 12396
-ROYAL_CROWN = 12397
-ROYAL_CROWN_NOTED = 12398
-PARTYHAT__SPECS = 12399
-PARTYHAT__SPECS_NOTED = 12400
-NARDAH_TELEPORT = 12402
-DIGSITE_TELEPORT = 12403
-FELDIP_HILLS_TELEPORT = 12404
-LUNAR_ISLE_TELEPORT = 12405
-MORTTON_TELEPORT = 12406
-PEST_CONTROL_TELEPORT = 12407
-PISCATORIS_TELEPORT = 12408
-TAI_BWO_WANNAI_TELEPORT = 12409
-IORWERTH_CAMP_TELEPORT = 12410
-MOS_LEHARMLESS_TELEPORT = 12411
-PIRATE_HAT__PATCH = 12412
-PIRATE_HAT__PATCH_NOTED = 12413
-DRAGON_CHAINBODY_G = 12414
-DRAGON_PLATELEGS_G = 12415
-DRAGON_PLATESKIRT_G = 12416
-DRAGON_FULL_HELM_G = 12417
-DRAGON_SQ_SHIELD_G = 12418
-LIGHT_INFINITY_HAT = 12419
-LIGHT_INFINITY_TOP = 12420
-LIGHT_INFINITY_BOTTOMS = 12421
-_3RD_AGE_WAND = 12422
-_3RD_AGE_WAND_NOTED = 12423
-_3RD_AGE_BOW = 12424
-_3RD_AGE_BOW_NOTED = 12425
-_3RD_AGE_LONGSWORD = 12426
-_3RD_AGE_LONGSWORD_NOTED = 12427
-PENGUIN_MASK = 12428
-PENGUIN_MASK_NOTED = 12429
-AFRO = 12430
-AFRO_NOTED = 12431
-TOP_HAT = 12432
-TOP_HAT_NOTED = 12433
-TOP_HAT__MONOCLE = 12434
-TOP_HAT__MONOCLE_NOTED = 12435
-AMULET_OF_FURY_OR = 12436
-_3RD_AGE_CLOAK = 12437
-_3RD_AGE_CLOAK_NOTED = 12438
-ROYAL_SCEPTRE = 12439
-ROYAL_SCEPTRE_NOTED = 12440
-MUSKETEER_TABARD = 12441
-MUSKETEER_TABARD_NOTED = 12442
-MUSKETEER_PANTS = 12443
-MUSKETEER_PANTS_NOTED = 12444
-BLACK_SKIRT_G = 12445
-BLACK_SKIRT_G_NOTED = 12446
-BLACK_SKIRT_T = 12447
-BLACK_SKIRT_T_NOTED = 12448
-BLACK_WIZARD_ROBE_G = 12449
-BLACK_WIZARD_ROBE_G_NOTED = 12450
-BLACK_WIZARD_ROBE_T = 12451
-BLACK_WIZARD_ROBE_T_NOTED = 12452
-BLACK_WIZARD_HAT_G = 12453
-BLACK_WIZARD_HAT_G_NOTED = 12454
-BLACK_WIZARD_HAT_T = 12455
-BLACK_WIZARD_HAT_T_NOTED = 12456
-DARK_INFINITY_HAT = 12457
-DARK_INFINITY_TOP = 12458
-DARK_INFINITY_BOTTOMS = 12459
-ANCIENT_PLATEBODY = 12460
-ANCIENT_PLATEBODY_NOTED = 12461
-ANCIENT_PLATELEGS = 12462
-ANCIENT_PLATELEGS_NOTED = 12463
-ANCIENT_PLATESKIRT = 12464
-ANCIENT_PLATESKIRT_NOTED = 12465
-ANCIENT_FULL_HELM = 12466
-ANCIENT_FULL_HELM_NOTED = 12467
-ANCIENT_KITESHIELD = 12468
-ANCIENT_KITESHIELD_NOTED = 12469
-ARMADYL_PLATEBODY = 12470
-ARMADYL_PLATEBODY_NOTED = 12471
-ARMADYL_PLATELEGS = 12472
-ARMADYL_PLATELEGS_NOTED = 12473
-ARMADYL_PLATESKIRT = 12474
-ARMADYL_PLATESKIRT_NOTED = 12475
-ARMADYL_FULL_HELM = 12476
-ARMADYL_FULL_HELM_NOTED = 12477
-ARMADYL_KITESHIELD = 12478
-ARMADYL_KITESHIELD_NOTED = 12479
-BANDOS_PLATEBODY = 12480
-BANDOS_PLATEBODY_NOTED = 12481
-BANDOS_PLATELEGS = 12482
-BANDOS_PLATELEGS_NOTED = 12483
-BANDOS_PLATESKIRT = 12484
-BANDOS_PLATESKIRT_NOTED = 12485
-BANDOS_FULL_HELM = 12486
-BANDOS_FULL_HELM_NOTED = 12487
-BANDOS_KITESHIELD = 12488
-BANDOS_KITESHIELD_NOTED = 12489
-ANCIENT_BRACERS = 12490
-ANCIENT_BRACERS_NOTED = 12491
-ANCIENT_DHIDE_BODY = 12492
-ANCIENT_DHIDE_BODY_NOTED = 12493
-ANCIENT_CHAPS = 12494
-ANCIENT_CHAPS_NOTED = 12495
-ANCIENT_COIF = 12496
-ANCIENT_COIF_NOTED = 12497
-BANDOS_BRACERS = 12498
-BANDOS_BRACERS_NOTED = 12499
-BANDOS_DHIDE_BODY = 12500
-BANDOS_DHIDE_BODY_NOTED = 12501
-BANDOS_CHAPS = 12502
-BANDOS_CHAPS_NOTED = 12503
-BANDOS_COIF = 12504
-BANDOS_COIF_NOTED = 12505
-ARMADYL_BRACERS = 12506
-ARMADYL_BRACERS_NOTED = 12507
-ARMADYL_DHIDE_BODY = 12508
-ARMADYL_DHIDE_BODY_NOTED = 12509
-ARMADYL_CHAPS = 12510
-ARMADYL_CHAPS_NOTED = 12511
-ARMADYL_COIF = 12512
-ARMADYL_COIF_NOTED = 12513
-EXPLORER_BACKPACK = 12514
-EXPLORER_BACKPACK_NOTED = 12515
-PITH_HELMET = 12516
-PITH_HELMET_NOTED = 12517
-GREEN_DRAGON_MASK = 12518
-GREEN_DRAGON_MASK_NOTED = 12519
-BLUE_DRAGON_MASK = 12520
-BLUE_DRAGON_MASK_NOTED = 12521
-RED_DRAGON_MASK = 12522
-RED_DRAGON_MASK_NOTED = 12523
-BLACK_DRAGON_MASK = 12524
-BLACK_DRAGON_MASK_NOTED = 12525
-FURY_ORNAMENT_KIT = 12526
-FURY_ORNAMENT_KIT_NOTED = 12527
-DARK_INFINITY_COLOUR_KIT = 12528
-DARK_INFINITY_COLOUR_KIT_NOTED = 12529
-LIGHT_INFINITY_COLOUR_KIT = 12530
-LIGHT_INFINITY_COLOUR_KIT_NOTED = 12531
-DRAGON_SQ_SHIELD_ORNAMENT_KIT = 12532
-DRAGON_SQ_SHIELD_ORNAMENT_KIT_NOTED = 12533
-DRAGON_CHAINBODY_ORNAMENT_KIT = 12534
-DRAGON_CHAINBODY_ORNAMENT_KIT_NOTED = 12535
-DRAGON_LEGSSKIRT_ORNAMENT_KIT = 12536
-DRAGON_LEGSSKIRT_ORNAMENT_KIT_NOTED = 12537
-DRAGON_FULL_HELM_ORNAMENT_KIT = 12538
-DRAGON_FULL_HELM_ORNAMENT_KIT_NOTED = 12539
-DEERSTALKER = 12540
-DEERSTALKER_NOTED = 12541
-CLUE_SCROLL_HARD_12542 = 12542
-CASKET_HARD_12543 = 12543
-CLUE_SCROLL_HARD_12544 = 12544
-CASKET_HARD_12545 = 12545
-CLUE_SCROLL_HARD_12546 = 12546
-CASKET_HARD_12547 = 12547
-CLUE_SCROLL_HARD_12548 = 12548
-CASKET_HARD_12549 = 12549
-CLUE_SCROLL_HARD_12550 = 12550
-CASKET_HARD_12551 = 12551
-CLUE_SCROLL_HARD_12552 = 12552
-CASKET_HARD_12553 = 12553
-CLUE_SCROLL_HARD_12554 = 12554
-CASKET_HARD_12555 = 12555
-CLUE_SCROLL_HARD_12556 = 12556
-CASKET_HARD_12557 = 12557
-CLUE_SCROLL_HARD_12558 = 12558
-CASKET_HARD_12559 = 12559
-CLUE_SCROLL_HARD_12560 = 12560
-CASKET_HARD_12561 = 12561
-CLUE_SCROLL_HARD_12562 = 12562
-CASKET_HARD_12563 = 12563
-CLUE_SCROLL_HARD_12564 = 12564
-CASKET_HARD_12565 = 12565
-CLUE_SCROLL_HARD_12566 = 12566
-CHALLENGE_SCROLL_HARD_12567 = 12567
-CLUE_SCROLL_HARD_12568 = 12568
-CHALLENGE_SCROLL_HARD_12569 = 12569
-CLUE_SCROLL_HARD_12570 = 12570
-CHALLENGE_SCROLL_HARD_12571 = 12571
-CLUE_SCROLL_HARD_12572 = 12572
-CHALLENGE_SCROLL_HARD_12573 = 12573
-CLUE_SCROLL_HARD_12574 = 12574
-CHALLENGE_SCROLL_HARD_12575 = 12575
-CLUE_SCROLL_HARD_12576 = 12576
-CHALLENGE_SCROLL_HARD_12577 = 12577
-CLUE_SCROLL_HARD_12578 = 12578
-PUZZLE_BOX_HARD_12579 = 12579
-CASKET_HARD_12580 = 12580
-CLUE_SCROLL_HARD_12581 = 12581
-PUZZLE_BOX_HARD_12582 = 12582
-CASKET_HARD_12583 = 12583
-CLUE_SCROLL_HARD_12584 = 12584
-PUZZLE_BOX_HARD_12585 = 12585
-CASKET_HARD_12586 = 12586
-CLUE_SCROLL_HARD_12587 = 12587
-PUZZLE_BOX_HARD_12588 = 12588
-CASKET_HARD_12589 = 12589
-CLUE_SCROLL_HARD_12590 = 12590
-CASKET_HARD_12591 = 12591
-BLACK_PICK_HEAD = 12592
-BLACK_PICK_HEAD_NOTED = 12593
-BROKEN_PICKAXE_12594 = 12594
-BROKEN_PICKAXE_NOTED_12595 = 12595
-RANGERS_TUNIC = 12596
-RANGERS_TUNIC_NOTED = 12597
-HOLY_SANDALS = 12598
-HOLY_SANDALS_NOTED = 12599
-DRUIDIC_WREATH = 12600
-RING_OF_THE_GODS = 12601
-RING_OF_THE_GODS_NOTED = 12602
-TYRANNICAL_RING = 12603
-TYRANNICAL_RING_NOTED = 12604
-TREASONOUS_RING = 12605
-TREASONOUS_RING_NOTED = 12606
-DAMAGED_BOOK_12607 = 12607
-BOOK_OF_WAR = 12608
-DAMAGED_BOOK_12609 = 12609
-BOOK_OF_LAW = 12610
-DAMAGED_BOOK_12611 = 12611
-BOOK_OF_DARKNESS = 12612
-BANDOS_PAGE_1 = 12613
-BANDOS_PAGE_2 = 12614
-BANDOS_PAGE_3 = 12615
-BANDOS_PAGE_4 = 12616
-ARMADYL_PAGE_1 = 12617
-ARMADYL_PAGE_2 = 12618
-ARMADYL_PAGE_3 = 12619
-ARMADYL_PAGE_4 = 12620
-ANCIENT_PAGE_1 = 12621
-ANCIENT_PAGE_2 = 12622
-ANCIENT_PAGE_3 = 12623
-ANCIENT_PAGE_4 = 12624
-STAMINA_POTION4 = 12625
-STAMINA_POTION4_NOTED = 12626
-STAMINA_POTION3 = 12627
-STAMINA_POTION3_NOTED = 12628
-STAMINA_POTION2 = 12629
-STAMINA_POTION2_NOTED = 12630
-STAMINA_POTION1 = 12631
-STAMINA_POTION1_NOTED = 12632
-STAMINA_MIX2 = 12633
-STAMINA_MIX2_NOTED = 12634
-STAMINA_MIX1 = 12635
-STAMINA_MIX1_NOTED = 12636
-SARADOMIN_HALO = 12637
-ZAMORAK_HALO = 12638
-GUTHIX_HALO = 12639
-AMYLASE_CRYSTAL_12640 = 12640
-AMYLASE_PACK = 12641
-LUMBERYARD_TELEPORT = 12642
-PET_DAGANNOTH_SUPREME = 12643
-PET_DAGANNOTH_PRIME = 12644
-PET_DAGANNOTH_REX = 12645
-BABY_MOLE = 12646
-KALPHITE_PRINCESS = 12647
-PET_SMOKE_DEVIL = 12648
-PET_KREEARRA = 12649
-PET_GENERAL_GRAARDOR = 12650
-PET_ZILYANA = 12651
-PET_KRIL_TSUTSAROTH = 12652
-PRINCE_BLACK_DRAGON = 12653
-KALPHITE_PRINCESS_12654 = 12654
-PET_KRAKEN = 12655
-JUNK = 12656
-JUNK_12657 = 12657
-IBANS_STAFF_U = 12658
-CLAN_WARS_CAPE = 12659
-CLAN_WARS_CAPE_12660 = 12660
-CLAN_WARS_CAPE_12661 = 12661
-CLAN_WARS_CAPE_12662 = 12662
-CLAN_WARS_CAPE_12663 = 12663
-CLAN_WARS_CAPE_12664 = 12664
-CLAN_WARS_CAPE_12665 = 12665
-CLAN_WARS_CAPE_12666 = 12666
-CLAN_WARS_CAPE_12667 = 12667
-CLAN_WARS_CAPE_12668 = 12668
-CLAN_WARS_CAPE_12669 = 12669
-CLAN_WARS_CAPE_12670 = 12670
-CLAN_WARS_CAPE_12671 = 12671
-CLAN_WARS_CAPE_12672 = 12672
-CLAN_WARS_CAPE_12673 = 12673
-CLAN_WARS_CAPE_12674 = 12674
-CLAN_WARS_CAPE_12675 = 12675
-CLAN_WARS_CAPE_12676 = 12676
-CLAN_WARS_CAPE_12677 = 12677
-CLAN_WARS_CAPE_12678 = 12678
-CLAN_WARS_CAPE_12679 = 12679
-CLAN_WARS_CAPE_12680 = 12680
-CLAN_WARS_CAPE_12681 = 12681
-CLAN_WARS_CAPE_12682 = 12682
-CLAN_WARS_CAPE_12683 = 12683
-CLAN_WARS_CAPE_12684 = 12684
-CLAN_WARS_CAPE_12685 = 12685
-CLAN_WARS_CAPE_12686 = 12686
-CLAN_WARS_CAPE_12687 = 12687
-CLAN_WARS_CAPE_12688 = 12688
-CLAN_WARS_CAPE_12689 = 12689
-CLAN_WARS_CAPE_12690 = 12690
-TYRANNICAL_RING_I = 12691
-TREASONOUS_RING_I = 12692
-KREEARRA = 12693
-CHAOS_ELEMENTAL = 12694
-SUPER_COMBAT_POTION4 = 12695
-SUPER_COMBAT_POTION4_NOTED = 12696
-SUPER_COMBAT_POTION3 = 12697
-SUPER_COMBAT_POTION3_NOTED = 12698
-SUPER_COMBAT_POTION2 = 12699
-SUPER_COMBAT_POTION2_NOTED = 12700
-SUPER_COMBAT_POTION1 = 12701
-SUPER_COMBAT_POTION1_NOTED = 12702
-PET_PENANCE_QUEEN = 12703
-OAK_HOUSE = 12704
-TEAK_HOUSE = 12705
-MAHOGANY_HOUSE = 12706
-CONSECRATED_HOUSE = 12707
-DESECRATED_HOUSE = 12708
-NATURE_HOUSE = 12709
-GRASSLAND_HABITAT = 12710
-FOREST_HABITAT = 12711
-DESERT_HABITAT = 12712
-POLAR_HABITAT = 12713
-VOLCANIC_HABITAT = 12714
-OAK_SCRATCHING_POST = 12715
-TEAK_SCRATCHING_POST = 12716
-MAHOGANY_SCRATCHING_POST = 12717
-SIMPLE_ARENA = 12718
-ADVANCED_ARENA = 12719
-GLORIOUS_ARENA = 12720
-PET_LIST = 12721
-OAK_FEEDER = 12722
-TEAK_FEEDER = 12723
-MAHOGANY_FEEDER = 12724
-MENAGERIE = 12725
-MENAGERIE_12726 = 12726
-GOBLIN_PAINT_CANNON = 12727
-AIR_RUNE_PACK = 12728
-AIR_RUNE_PACK_NOTED = 12729
-WATER_RUNE_PACK = 12730
-WATER_RUNE_PACK_NOTED = 12731
-EARTH_RUNE_PACK = 12732
-EARTH_RUNE_PACK_NOTED = 12733
-FIRE_RUNE_PACK = 12734
-FIRE_RUNE_PACK_NOTED = 12735
-MIND_RUNE_PACK = 12736
-MIND_RUNE_PACK_NOTED = 12737
-CHAOS_RUNE_PACK = 12738
-CHAOS_RUNE_PACK_NOTED = 12739
-BIRD_SNARE_PACK = 12740
-BIRD_SNARE_PACK_NOTED = 12741
-BOX_TRAP_PACK = 12742
-BOX_TRAP_PACK_NOTED = 12743
-MAGIC_IMP_BOX_PACK = 12744
-MAGIC_IMP_BOX_PACK_NOTED = 12745
-ARCHAIC_EMBLEM_TIER_1 = 12746
-ARCHAIC_EMBLEM_TIER_1_12747 = 12747
-ARCHAIC_EMBLEM_TIER_2 = 12748
-ARCHAIC_EMBLEM_TIER_3 = 12749
-ARCHAIC_EMBLEM_TIER_4 = 12750
-ARCHAIC_EMBLEM_TIER_5 = 12751
-ARCHAIC_EMBLEM_TIER_6 = 12752
-ARCHAIC_EMBLEM_TIER_7 = 12753
-ARCHAIC_EMBLEM_TIER_8 = 12754
-ARCHAIC_EMBLEM_TIER_9 = 12755
-ARCHAIC_EMBLEM_TIER_10 = 12756
-BLUE_DARK_BOW_PAINT = 12757
-BLUE_DARK_BOW_PAINT_NOTED = 12758
-GREEN_DARK_BOW_PAINT = 12759
-GREEN_DARK_BOW_PAINT_NOTED = 12760
-YELLOW_DARK_BOW_PAINT = 12761
-YELLOW_DARK_BOW_PAINT_NOTED = 12762
-WHITE_DARK_BOW_PAINT = 12763
-WHITE_DARK_BOW_PAINT_NOTED = 12764
-DARK_BOW_12765 = 12765
-DARK_BOW_12766 = 12766
-DARK_BOW_12767 = 12767
-DARK_BOW_12768 = 12768
-FROZEN_WHIP_MIX = 12769
-FROZEN_WHIP_MIX_NOTED = 12770
-VOLCANIC_WHIP_MIX = 12771
-VOLCANIC_WHIP_MIX_NOTED = 12772
-VOLCANIC_ABYSSAL_WHIP = 12773
-FROZEN_ABYSSAL_WHIP = 12774
-ANNAKARL_TELEPORT = 12775
-CARRALLANGAR_TELEPORT = 12776
-DAREEYAK_TELEPORT = 12777
-GHORROCK_TELEPORT = 12778
-KHARYRLL_TELEPORT = 12779
-LASSAR_TELEPORT = 12780
-PADDEWWA_TELEPORT = 12781
-SENNTISTEN_TELEPORT = 12782
-RING_OF_WEALTH_SCROLL = 12783
-RING_OF_WEALTH_SCROLL_NOTED = 12784
-RING_OF_WEALTH_I = 12785
-MAGIC_SHORTBOW_SCROLL = 12786
-MAGIC_SHORTBOW_SCROLL_NOTED = 12787
-MAGIC_SHORTBOW_I = 12788
-CLUE_BOX = 12789
-CLUE_BOX_NOTED = 12790
-RUNE_POUCH = 12791
-NEST_BOX_EMPTY = 12792
-NEST_BOX_SEEDS = 12793
-NEST_BOX_RING = 12794
-STEAM_BATTLESTAFF_12795 = 12795
-MYSTIC_STEAM_STAFF_12796 = 12796
-DRAGON_PICKAXE_12797 = 12797
-STEAM_STAFF_UPGRADE_KIT = 12798
-STEAM_STAFF_UPGRADE_KIT_NOTED = 12799
-DRAGON_PICKAXE_UPGRADE_KIT = 12800
-DRAGON_PICKAXE_UPGRADE_KIT_NOTED = 12801
-WARD_UPGRADE_KIT = 12802
-WARD_UPGRADE_KIT_NOTED = 12803
-SARADOMINS_TEAR = 12804
-SARADOMINS_TEAR_NOTED = 12805
-MALEDICTION_WARD_12806 = 12806
-ODIUM_WARD_12807 = 12807
-SARAS_BLESSED_SWORD_FULL = 12808
-SARADOMINS_BLESSED_SWORD = 12809
-IRONMAN_HELM = 12810
-IRONMAN_PLATEBODY = 12811
-IRONMAN_PLATELEGS = 12812
-ULTIMATE_IRONMAN_HELM = 12813
-ULTIMATE_IRONMAN_PLATEBODY = 12814
-ULTIMATE_IRONMAN_PLATELEGS = 12815
-PET_DARK_CORE = 12816
-ELYSIAN_SPIRIT_SHIELD = 12817
-ELYSIAN_SPIRIT_SHIELD_NOTED = 12818
-ELYSIAN_SIGIL = 12819
-ELYSIAN_SIGIL_NOTED = 12820
-SPECTRAL_SPIRIT_SHIELD = 12821
-SPECTRAL_SPIRIT_SHIELD_NOTED = 12822
-SPECTRAL_SIGIL = 12823
-SPECTRAL_SIGIL_NOTED = 12824
-ARCANE_SPIRIT_SHIELD = 12825
-ARCANE_SPIRIT_SHIELD_NOTED = 12826
-ARCANE_SIGIL = 12827
-ARCANE_SIGIL_NOTED = 12828
-SPIRIT_SHIELD = 12829
-SPIRIT_SHIELD_NOTED = 12830
-BLESSED_SPIRIT_SHIELD = 12831
-BLESSED_SPIRIT_SHIELD_NOTED = 12832
-HOLY_ELIXIR = 12833
-HOLY_ELIXIR_NOTED = 12834
-COMMUNITY_PUMPKIN = 12835
-GRIM_REAPERS_DIARY = 12836
-GRIM_ROBE = 12837
-WILL_AND_TESTAMENT = 12838
-HUMAN_BONES = 12839
-SERVANTS_SKULL = 12840
-HOURGLASS_12841 = 12841
-SCYTHE_SHARPENER = 12842
-HUMAN_EYE = 12843
-VOICE_POTION = 12844
-GRIM_REAPER_HOOD = 12845
-TARGET_TELEPORT_SCROLL = 12846
-TARGET_TELEPORT_SCROLL_NOTED = 12847
-GRANITE_MAUL_12848 = 12848
-GRANITE_CLAMP = 12849
-GRANITE_CLAMP_NOTED = 12850
-AMULET_OF_THE_DAMNED_FULL = 12851
-AMULET_OF_THE_DAMNED_FULL_NOTED = 12852
-AMULET_OF_THE_DAMNED = 12853
-FLAMTAER_BAG = 12854
-HUNTERS_HONOUR = 12855
-ROGUES_REVENGE = 12856
-OLIVE_OIL_PACK = 12857
-OLIVE_OIL_PACK_NOTED = 12858
-EYE_OF_NEWT_PACK = 12859
-EYE_OF_NEWT_PACK_NOTED = 12860
-THANKSGIVING_DINNER = 12861
-THANKSGIVING_DINNER_12862 = 12862
-DWARF_CANNON_SET = 12863
-DWARF_CANNON_SET_NOTED = 12864
-GREEN_DRAGONHIDE_SET = 12865
-GREEN_DRAGONHIDE_SET_NOTED = 12866
-BLUE_DRAGONHIDE_SET = 12867
-BLUE_DRAGONHIDE_SET_NOTED = 12868
-RED_DRAGONHIDE_SET = 12869
-RED_DRAGONHIDE_SET_NOTED = 12870
-BLACK_DRAGONHIDE_SET = 12871
-BLACK_DRAGONHIDE_SET_NOTED = 12872
-GUTHANS_ARMOUR_SET = 12873
-GUTHANS_ARMOUR_SET_NOTED = 12874
-VERACS_ARMOUR_SET = 12875
-VERACS_ARMOUR_SET_NOTED = 12876
-DHAROKS_ARMOUR_SET = 12877
-DHAROKS_ARMOUR_SET_NOTED = 12878
-TORAGS_ARMOUR_SET = 12879
-TORAGS_ARMOUR_SET_NOTED = 12880
-AHRIMS_ARMOUR_SET = 12881
-AHRIMS_ARMOUR_SET_NOTED = 12882
-KARILS_ARMOUR_SET = 12883
-KARILS_ARMOUR_SET_NOTED = 12884
-JAR_OF_SAND = 12885
-JAR_OF_SAND_NOTED = 12886
-SANTA_MASK = 12887
-SANTA_JACKET = 12888
-SANTA_PANTALOONS = 12889
-SANTA_GLOVES = 12890
-SANTA_BOOTS = 12891
-ANTISANTA_MASK = 12892
-ANTISANTA_JACKET = 12893
-ANTISANTA_PANTALOONS = 12894
-ANTISANTA_GLOVES = 12895
-ANTISANTA_BOOTS = 12896
-ANTISANTAS_COAL_BOX = 12897
-ANTISANTAS_COAL_BOX_FULL = 12898
-TRIDENT_OF_THE_SWAMP = 12899
-UNCHARGED_TOXIC_TRIDENT = 12900
-UNCHARGED_TOXIC_TRIDENT_NOTED = 12901
-TOXIC_STAFF_UNCHARGED = 12902
-TOXIC_STAFF_UNCHARGED_NOTED = 12903
-TOXIC_STAFF_OF_THE_DEAD = 12904
-ANTIVENOM4 = 12905
-ANTIVENOM4_NOTED = 12906
-ANTIVENOM3 = 12907
-ANTIVENOM3_NOTED = 12908
-ANTIVENOM2 = 12909
-ANTIVENOM2_NOTED = 12910
-ANTIVENOM1 = 12911
-ANTIVENOM1_NOTED = 12912
-ANTIVENOM4_12913 = 12913
-ANTIVENOM4_NOTED_12914 = 12914
-ANTIVENOM3_12915 = 12915
-ANTIVENOM3_NOTED_12916 = 12916
-ANTIVENOM2_12917 = 12917
-ANTIVENOM2_NOTED_12918 = 12918
-ANTIVENOM1_12919 = 12919
-ANTIVENOM1_NOTED_12920 = 12920
-PET_SNAKELING = 12921
-TANZANITE_FANG = 12922
-TANZANITE_FANG_NOTED = 12923
-TOXIC_BLOWPIPE_EMPTY = 12924
-TOXIC_BLOWPIPE_EMPTY_NOTED = 12925
-TOXIC_BLOWPIPE = 12926
-SERPENTINE_VISAGE = 12927
-SERPENTINE_VISAGE_NOTED = 12928
-SERPENTINE_HELM_UNCHARGED = 12929
-SERPENTINE_HELM_UNCHARGED_NOTED = 12930
-SERPENTINE_HELM = 12931
-MAGIC_FANG = 12932
-MAGIC_FANG_NOTED = 12933
-ZULRAHS_SCALES_12934 = 12934
-OHNS_DIARY = 12935
-JAR_OF_SWAMP = 12936
-JAR_OF_SWAMP_NOTED = 12937
-ZULANDRA_TELEPORT = 12938
-PET_SNAKELING_12939 = 12939
-PET_SNAKELING_12940 = 12940
-OAK_SAPLING_NOTED = 12941
-WILLOW_SAPLING_NOTED = 12942
-MAPLE_SAPLING_NOTED = 12943
-YEW_SAPLING_NOTED = 12944
-MAGIC_SAPLING_NOTED = 12945
-APPLE_SAPLING_NOTED = 12946
-BANANA_SAPLING_NOTED = 12947
-ORANGE_SAPLING_NOTED = 12948
-CURRY_SAPLING_NOTED = 12949
-PINEAPPLE_SAPLING_NOTED = 12950
-PAPAYA_SAPLING_NOTED = 12951
-PALM_SAPLING_NOTED = 12952
-CALQUAT_SAPLING_NOTED = 12953
-DRAGON_DEFENDER = 12954
-FREE_TO_PLAY_STARTER_PACK = 12955
-COW_TOP = 12956
-COW_TROUSERS = 12957
-COW_GLOVES = 12958
-COW_SHOES = 12959
-BRONZE_SET_LG = 12960
-BRONZE_SET_LG_NOTED = 12961
-BRONZE_SET_SK = 12962
-BRONZE_SET_SK_NOTED = 12963
-BRONZE_TRIMMED_SET_LG = 12964
-BRONZE_TRIMMED_SET_LG_NOTED = 12965
-BRONZE_TRIMMED_SET_SK = 12966
-BRONZE_TRIMMED_SET_SK_NOTED = 12967
-BRONZE_GOLDTRIMMED_SET_LG = 12968
-BRONZE_GOLDTRIMMED_SET_LG_NOTED = 12969
-BRONZE_GOLDTRIMMED_SET_SK = 12970
-BRONZE_GOLDTRIMMED_SET_SK_NOTED = 12971
-IRON_SET_LG = 12972
-IRON_SET_LG_NOTED = 12973
-IRON_SET_SK = 12974
-IRON_SET_SK_NOTED = 12975
-IRON_TRIMMED_SET_LG = 12976
-IRON_TRIMMED_SET_LG_NOTED = 12977
-IRON_TRIMMED_SET_SK = 12978
-IRON_TRIMMED_SET_SK_NOTED = 12979
-IRON_GOLDTRIMMED_SET_LG = 12980
-IRON_GOLDTRIMMED_SET_LG_NOTED = 12981
-IRON_GOLDTRIMMED_SET_SK = 12982
-IRON_GOLDTRIMMED_SET_SK_NOTED = 12983
-STEEL_SET_LG = 12984
-STEEL_SET_LG_NOTED = 12985
-STEEL_SET_SK = 12986
-STEEL_SET_SK_NOTED = 12987
-BLACK_SET_LG = 12988
-BLACK_SET_LG_NOTED = 12989
-BLACK_SET_SK = 12990
-BLACK_SET_SK_NOTED = 12991
-BLACK_TRIMMED_SET_LG = 12992
-BLACK_TRIMMED_SET_LG_NOTED = 12993
-BLACK_TRIMMED_SET_SK = 12994
-BLACK_TRIMMED_SET_SK_NOTED = 12995
-BLACK_GOLDTRIMMED_SET_LG = 12996
-BLACK_GOLDTRIMMED_SET_LG_NOTED = 12997
-BLACK_GOLDTRIMMED_SET_SK = 12998
-BLACK_GOLDTRIMMED_SET_SK_NOTED = 12999
-MITHRIL_SET_LG = 13000
-MITHRIL_SET_LG_NOTED = 13001
-MITHRIL_SET_SK = 13002
-MITHRIL_SET_SK_NOTED = 13003
-MITHRIL_TRIMMED_SET_LG = 13004
-MITHRIL_TRIMMED_SET_LG_NOTED = 13005
-MITHRIL_TRIMMED_SET_SK = 13006
-MITHRIL_TRIMMED_SET_SK_NOTED = 13007
-MITHRIL_GOLDTRIMMED_SET_LG = 13008
-MITHRIL_GOLDTRIMMED_SET_LG_NOTED = 13009
-MITHRIL_GOLDTRIMMED_SET_SK = 13010
-MITHRIL_GOLDTRIMMED_SET_SK_NOTED = 13011
-ADAMANT_SET_LG = 13012
-ADAMANT_SET_LG_NOTED = 13013
-ADAMANT_SET_SK = 13014
-ADAMANT_SET_SK_NOTED = 13015
-ADAMANT_TRIMMED_SET_LG = 13016
-ADAMANT_TRIMMED_SET_LG_NOTED = 13017
-ADAMANT_TRIMMED_SET_SK = 13018
-ADAMANT_TRIMMED_SET_SK_NOTED = 13019
-ADAMANT_GOLDTRIMMED_SET_LG = 13020
-ADAMANT_GOLDTRIMMED_SET_LG_NOTED = 13021
-ADAMANT_GOLDTRIMMED_SET_SK = 13022
-ADAMANT_GOLDTRIMMED_SET_SK_NOTED = 13023
-RUNE_ARMOUR_SET_LG = 13024
-RUNE_ARMOUR_SET_LG_NOTED = 13025
-RUNE_ARMOUR_SET_SK = 13026
-RUNE_ARMOUR_SET_SK_NOTED = 13027
-RUNE_TRIMMED_SET_LG = 13028
-RUNE_TRIMMED_SET_LG_NOTED = 13029
-RUNE_TRIMMED_SET_SK = 13030
-RUNE_TRIMMED_SET_SK_NOTED = 13031
-RUNE_GOLDTRIMMED_SET_LG = 13032
-RUNE_GOLDTRIMMED_SET_LG_NOTED = 13033
-RUNE_GOLDTRIMMED_SET_SK = 13034
-RUNE_GOLDTRIMMED_SET_SK_NOTED = 13035
-GILDED_ARMOUR_SET_LG = 13036
-GILDED_ARMOUR_SET_LG_NOTED = 13037
-GILDED_ARMOUR_SET_SK = 13038
-GILDED_ARMOUR_SET_SK_NOTED = 13039
-SARADOMIN_ARMOUR_SET_LG = 13040
-SARADOMIN_ARMOUR_SET_LG_NOTED = 13041
-SARADOMIN_ARMOUR_SET_SK = 13042
-SARADOMIN_ARMOUR_SET_SK_NOTED = 13043
-ZAMORAK_ARMOUR_SET_LG = 13044
-ZAMORAK_ARMOUR_SET_LG_NOTED = 13045
-ZAMORAK_ARMOUR_SET_SK = 13046
-ZAMORAK_ARMOUR_SET_SK_NOTED = 13047
-GUTHIX_ARMOUR_SET_LG = 13048
-GUTHIX_ARMOUR_SET_LG_NOTED = 13049
-GUTHIX_ARMOUR_SET_SK = 13050
-GUTHIX_ARMOUR_SET_SK_NOTED = 13051
-ARMADYL_RUNE_ARMOUR_SET_LG = 13052
-ARMADYL_RUNE_ARMOUR_SET_LG_NOTED = 13053
-ARMADYL_RUNE_ARMOUR_SET_SK = 13054
-ARMADYL_RUNE_ARMOUR_SET_SK_NOTED = 13055
-BANDOS_RUNE_ARMOUR_SET_LG = 13056
-BANDOS_RUNE_ARMOUR_SET_LG_NOTED = 13057
-BANDOS_RUNE_ARMOUR_SET_SK = 13058
-BANDOS_RUNE_ARMOUR_SET_SK_NOTED = 13059
-ANCIENT_RUNE_ARMOUR_SET_LG = 13060
-ANCIENT_RUNE_ARMOUR_SET_LG_NOTED = 13061
-ANCIENT_RUNE_ARMOUR_SET_SK = 13062
-ANCIENT_RUNE_ARMOUR_SET_SK_NOTED = 13063
-COMBAT_POTION_SET = 13064
-COMBAT_POTION_SET_NOTED = 13065
-SUPER_POTION_SET = 13066
-SUPER_POTION_SET_NOTED = 13067
-QUEST_POINT_CAPE_T = 13068
-ACHIEVEMENT_DIARY_CAPE_T = 13069
-ACHIEVEMENT_DIARY_HOOD = 13070
-CHOMPY_CHICK = 13071
-ELITE_VOID_TOP = 13072
-ELITE_VOID_ROBE = 13073
-PHARAOHS_SCEPTRE_13074 = 13074
-PHARAOHS_SCEPTRE_13075 = 13075
-PHARAOHS_SCEPTRE_13076 = 13076
-PHARAOHS_SCEPTRE_13077 = 13077
-PHARAOHS_SCEPTRE_13078 = 13078
-ENCHANTED_LYRE5 = 13079
-NEW_CRYSTAL_HALBERD_FULL_I = 13080
-CRYSTAL_HALBERD_FULL_I = 13081
-CRYSTAL_HALBERD_910_I = 13082
-CRYSTAL_HALBERD_810_I = 13083
-CRYSTAL_HALBERD_710_I = 13084
-CRYSTAL_HALBERD_610_I = 13085
-CRYSTAL_HALBERD_510_I = 13086
-CRYSTAL_HALBERD_410_I = 13087
-CRYSTAL_HALBERD_310_I = 13088
-CRYSTAL_HALBERD_210_I = 13089
-CRYSTAL_HALBERD_110_I = 13090
-NEW_CRYSTAL_HALBERD_FULL = 13091
-CRYSTAL_HALBERD_FULL = 13092
-CRYSTAL_HALBERD_910 = 13093
-CRYSTAL_HALBERD_810 = 13094
-CRYSTAL_HALBERD_710 = 13095
-CRYSTAL_HALBERD_610 = 13096
-CRYSTAL_HALBERD_510 = 13097
-CRYSTAL_HALBERD_410 = 13098
-CRYSTAL_HALBERD_310 = 13099
-CRYSTAL_HALBERD_210 = 13100
-CRYSTAL_HALBERD_110 = 13101
-TELEPORT_CRYSTAL_5 = 13102
-KARAMJA_GLOVES_4 = 13103
-VARROCK_ARMOUR_1 = 13104
-VARROCK_ARMOUR_2 = 13105
-VARROCK_ARMOUR_3 = 13106
-VARROCK_ARMOUR_4 = 13107
-WILDERNESS_SWORD_1 = 13108
-WILDERNESS_SWORD_2 = 13109
-WILDERNESS_SWORD_3 = 13110
-WILDERNESS_SWORD_4 = 13111
-MORYTANIA_LEGS_1 = 13112
-MORYTANIA_LEGS_2 = 13113
-MORYTANIA_LEGS_3 = 13114
-MORYTANIA_LEGS_4 = 13115
-BONECRUSHER = 13116
-FALADOR_SHIELD_1 = 13117
-FALADOR_SHIELD_2 = 13118
-FALADOR_SHIELD_3 = 13119
-FALADOR_SHIELD_4 = 13120
-ARDOUGNE_CLOAK_1 = 13121
-ARDOUGNE_CLOAK_2 = 13122
-ARDOUGNE_CLOAK_3 = 13123
-ARDOUGNE_CLOAK_4 = 13124
-EXPLORERS_RING_1 = 13125
-EXPLORERS_RING_2 = 13126
-EXPLORERS_RING_3 = 13127
-EXPLORERS_RING_4 = 13128
-FREMENNIK_SEA_BOOTS_1 = 13129
-FREMENNIK_SEA_BOOTS_2 = 13130
-FREMENNIK_SEA_BOOTS_3 = 13131
-FREMENNIK_SEA_BOOTS_4 = 13132
-DESERT_AMULET_1 = 13133
-DESERT_AMULET_2 = 13134
-DESERT_AMULET_3 = 13135
-DESERT_AMULET_4 = 13136
-KANDARIN_HEADGEAR_1 = 13137
-KANDARIN_HEADGEAR_2 = 13138
-KANDARIN_HEADGEAR_3 = 13139
-KANDARIN_HEADGEAR_4 = 13140
-WESTERN_BANNER_1 = 13141
-WESTERN_BANNER_2 = 13142
-WESTERN_BANNER_3 = 13143
-WESTERN_BANNER_4 = 13144
-ANTIQUE_LAMP_13145 = 13145
-ANTIQUE_LAMP_13146 = 13146
-ANTIQUE_LAMP_13147 = 13147
-ANTIQUE_LAMP_13148 = 13148
-HOLY_BOOK_PAGE_SET = 13149
-HOLY_BOOK_PAGE_SET_NOTED = 13150
-UNHOLY_BOOK_PAGE_SET = 13151
-UNHOLY_BOOK_PAGE_SET_NOTED = 13152
-BOOK_OF_BALANCE_PAGE_SET = 13153
-BOOK_OF_BALANCE_PAGE_SET_NOTED = 13154
-BOOK_OF_WAR_PAGE_SET = 13155
-BOOK_OF_WAR_PAGE_SET_NOTED = 13156
-BOOK_OF_LAW_PAGE_SET = 13157
-BOOK_OF_LAW_PAGE_SET_NOTED = 13158
-BOOK_OF_DARKNESS_PAGE_SET = 13159
-BOOK_OF_DARKNESS_PAGE_SET_NOTED = 13160
-ZAMORAK_DRAGONHIDE_SET = 13161
-ZAMORAK_DRAGONHIDE_SET_NOTED = 13162
-SARADOMIN_DRAGONHIDE_SET = 13163
-SARADOMIN_DRAGONHIDE_SET_NOTED = 13164
-GUTHIX_DRAGONHIDE_SET = 13165
-GUTHIX_DRAGONHIDE_SET_NOTED = 13166
-BANDOS_DRAGONHIDE_SET = 13167
-BANDOS_DRAGONHIDE_SET_NOTED = 13168
-ARMADYL_DRAGONHIDE_SET = 13169
-ARMADYL_DRAGONHIDE_SET_NOTED = 13170
-ANCIENT_DRAGONHIDE_SET = 13171
-ANCIENT_DRAGONHIDE_SET_NOTED = 13172
-PARTYHAT_SET = 13173
-PARTYHAT_SET_NOTED = 13174
-HALLOWEEN_MASK_SET = 13175
-HALLOWEEN_MASK_SET_NOTED = 13176
-VENENATIS_SPIDERLING = 13177
-CALLISTO_CUB = 13178
-VETION_JR = 13179
-VETION_JR_13180 = 13180
-SCORPIAS_OFFSPRING = 13181
-BUNNY_FEET = 13182
-EMPTY_BLASTER = 13183
-INCOMPLETE_BLASTER = 13184
-EASTER_BLASTER = 13185
-VOLATILE_MINERAL = 13186
-PACKAGE = 13187
-DIANGOS_CLAWS = 13188
-OLD_SCHOOL_BOND = 13190
-OLD_SCHOOL_BOND_13191 = 13191
-OLD_SCHOOL_BOND_UNTRADEABLE = 13192
-BONE_BOLT_PACK = 13193
-BONE_BOLT_PACK_NOTED = 13194
-ODDSKULL = 13195
-TANZANITE_HELM_UNCHARGED = 13196
-TANZANITE_HELM = 13197
-MAGMA_HELM_UNCHARGED = 13198
-MAGMA_HELM = 13199
-TANZANITE_MUTAGEN = 13200
-MAGMA_MUTAGEN = 13201
-RING_OF_THE_GODS_I = 13202
-MASK_OF_BALANCE = 13203
-PLATINUM_TOKEN_13204 = 13204
-ROTTEN_EGG = 13205
-NULL_13206 = 13206
-NULL_13211 = 13211
-TIGER_TOY = 13215
-LION_TOY = 13216
-SNOW_LEOPARD_TOY = 13217
-AMUR_LEOPARD_TOY = 13218
-NULL_13219 = 13219
-AMETHYST_JAVELIN_HEADS_13220 = 13220
-MUSIC_CAPE = 13221
-MUSIC_CAPET = 13222
-MUSIC_HOOD = 13223
-NULL_13224 = 13224
-TZREKJAD = 13225
-HERB_SACK = 13226
-ETERNAL_CRYSTAL = 13227
-ETERNAL_CRYSTAL_NOTED = 13228
-PEGASIAN_CRYSTAL = 13229
-PEGASIAN_CRYSTAL_NOTED = 13230
-PRIMORDIAL_CRYSTAL = 13231
-PRIMORDIAL_CRYSTAL_NOTED = 13232
-SMOULDERING_STONE = 13233
-SMOULDERING_STONE_NOTED = 13234
-ETERNAL_BOOTS = 13235
-ETERNAL_BOOTS_NOTED = 13236
-PEGASIAN_BOOTS = 13237
-PEGASIAN_BOOTS_NOTED = 13238
-PRIMORDIAL_BOOTS = 13239
-PRIMORDIAL_BOOTS_NOTED = 13240
-INFERNAL_AXE = 13241
-INFERNAL_AXE_UNCHARGED = 13242
-INFERNAL_PICKAXE = 13243
-INFERNAL_PICKAXE_UNCHARGED = 13244
-JAR_OF_SOULS = 13245
-JAR_OF_SOULS_NOTED = 13246
-HELLPUPPY = 13247
-KEY_MASTERS_KEY = 13248
-KEY_MASTER_TELEPORT = 13249
-PLANT_POT_PACK = 13250
-PLANT_POT_PACK_NOTED = 13251
-SACK_PACK = 13252
-SACK_PACK_NOTED = 13253
-BASKET_PACK = 13254
-BASKET_PACK_NOTED = 13255
-SARADOMINS_LIGHT = 13256
-SARADOMINS_LIGHT_NOTED = 13257
-ANGLER_HAT = 13258
-ANGLER_TOP = 13259
-ANGLER_WADERS = 13260
-ANGLER_BOOTS = 13261
-ABYSSAL_ORPHAN = 13262
-ABYSSAL_BLUDGEON = 13263
-ABYSSAL_BLUDGEON_NOTED = 13264
-ABYSSAL_DAGGER = 13265
-ABYSSAL_DAGGER_NOTED = 13266
-ABYSSAL_DAGGER_P = 13267
-ABYSSAL_DAGGER_P_NOTED = 13268
-ABYSSAL_DAGGER_P_13269 = 13269
-ABYSSAL_DAGGER_P_NOTED_13270 = 13270
-ABYSSAL_DAGGER_P_13271 = 13271
-ABYSSAL_DAGGER_P_NOTED_13272 = 13272
-UNSIRED = 13273
-BLUDGEON_SPINE = 13274
-BLUDGEON_CLAW = 13275
-BLUDGEON_AXON = 13276
-JAR_OF_MIASMA = 13277
-JAR_OF_MIASMA_NOTED = 13278
-OVERSEERS_BOOK = 13279
-MAX_CAPE = 13280
-MAX_HOOD = 13281
-NULL_13282 = 13282
-GRAVEDIGGER_MASK = 13283
-GRAVEDIGGER_TOP = 13284
-GRAVEDIGGER_LEGGINGS = 13285
-GRAVEDIGGER_BOOTS = 13286
-GRAVEDIGGER_GLOVES = 13287
-ANTIPANTIES = 13288
-NULL_13289 = 13289
-NULL_13290 = 13290
-NULL_13291 = 13291
-NULL_13292 = 13292
-NULL_13293 = 13293
-NULL_13294 = 13294
-NULL_13295 = 13295
-NULL_13296 = 13296
-NULL_13297 = 13297
-NULL_13298 = 13298
-NULL_13299 = 13299
-NULL_13300 = 13300
-NULL_13301 = 13301
-BANK_KEY = 13302
-BANK_KEY_13303 = 13303
-BANK_KEY_13304 = 13304
-BANK_KEY_13305 = 13305
-BANK_KEY_13306 = 13306
-BLOOD_MONEY = 13307
-BLOOD_MONEY_13308 = 13308
-BLOOD_MONEY_13309 = 13309
-BLOOD_MONEY_13310 = 13310
-BLOOD_MONEY_13311 = 13311
-BLOOD_MONEY_13312 = 13312
-BLOOD_MONEY_13313 = 13313
-BLOOD_MONEY_13314 = 13314
-BLOOD_MONEY_13315 = 13315
-BLOOD_MONEY_13316 = 13316
-DEADMANS_CHEST = 13317
-DEADMANS_LEGS = 13318
-DEADMANS_CAPE = 13319
-HERON = 13320
-ROCK_GOLEM = 13321
-BEAVER = 13322
-BABY_CHINCHOMPA = 13323
-BABY_CHINCHOMPA_13324 = 13324
-BABY_CHINCHOMPA_13325 = 13325
-BABY_CHINCHOMPA_13326 = 13326
-ROTTEN_ONION = 13327
-GREEN_BANNER = 13328
-FIRE_MAX_CAPE = 13329
-FIRE_MAX_HOOD = 13330
-SARADOMIN_MAX_CAPE = 13331
-SARADOMIN_MAX_HOOD = 13332
-ZAMORAK_MAX_CAPE = 13333
-ZAMORAK_MAX_HOOD = 13334
-GUTHIX_MAX_CAPE = 13335
-GUTHIX_MAX_HOOD = 13336
-ACCUMULATOR_MAX_CAPE = 13337
-ACCUMULATOR_MAX_HOOD = 13338
-SACRED_EEL = 13339
-AGILITY_CAPE_13340 = 13340
-AGILITY_CAPET_13341 = 13341
-MAX_CAPE_13342 = 13342
-BLACK_SANTA_HAT = 13343
-INVERTED_SANTA_HAT = 13344
-ANTIPRESENT = 13345
-PRESENT_13346 = 13346
-VIAL_OF_TEARS_EMPTY = 13347
-VIAL_OF_TEARS_1 = 13348
-VIAL_OF_TEARS_2 = 13349
-VIAL_OF_TEARS_3 = 13350
-VIAL_OF_TEARS_FULL = 13351
-VIAL_OF_SORROW = 13352
-GRICOLLERS_CAN = 13353
-LOVAKITE_BAR = 13354
-JUNIPER_LOGS = 13355
-LOVAKITE_ORE = 13356
-SHAYZIEN_GLOVES_1 = 13357
-SHAYZIEN_BOOTS_1 = 13358
-SHAYZIEN_HELM_1 = 13359
-SHAYZIEN_GREAVES_1 = 13360
-SHAYZIEN_PLATEBODY_1 = 13361
-SHAYZIEN_GLOVES_2 = 13362
-SHAYZIEN_BOOTS_2 = 13363
-SHAYZIEN_HELM_2 = 13364
-SHAYZIEN_GREAVES_2 = 13365
-SHAYZIEN_PLATEBODY_2 = 13366
-SHAYZIEN_GLOVES_3 = 13367
-SHAYZIEN_BOOTS_3 = 13368
-SHAYZIEN_HELM_3 = 13369
-SHAYZIEN_GREAVES_3 = 13370
-SHAYZIEN_PLATEBODY_3 = 13371
-SHAYZIEN_GLOVES_4 = 13372
-SHAYZIEN_BOOTS_4 = 13373
-SHAYZIEN_HELM_4 = 13374
-SHAYZIEN_GREAVES_4 = 13375
-SHAYZIEN_PLATEBODY_4 = 13376
-SHAYZIEN_GLOVES_5 = 13377
-SHAYZIEN_BOOTS_5 = 13378
-SHAYZIEN_HELM_5 = 13379
-SHAYZIEN_GREAVES_5 = 13380
-SHAYZIEN_BODY_5 = 13381
-SHAYZIEN_MEDPACK = 13382
-XERICIAN_FABRIC = 13383
-XERICIAN_FABRIC_NOTED = 13384
-XERICIAN_HAT = 13385
-XERICIAN_HAT_NOTED = 13386
-XERICIAN_TOP = 13387
-XERICIAN_TOP_NOTED = 13388
-XERICIAN_ROBE = 13389
-XERICIAN_ROBE_NOTED = 13390
-LIZARDMAN_FANG = 13391
-XERICS_TALISMAN_INERT = 13392
-XERICS_TALISMAN = 13393
-GANG_MEETING_INFO = 13394
-INTELLIGENCE = 13395
-TRAINING_MANUAL = 13396
-SERVERY_FLOUR = 13397
-SERVERY_PASTRY_DOUGH = 13398
-SERVERY_RAW_MEAT = 13399
-SERVERY_DISH = 13400
-SERVERY_PIE_SHELL = 13401
-SERVERY_UNCOOKED_PIE = 13402
-SERVERY_MEAT_PIE = 13403
-SERVERY_PIZZA_BASE = 13404
-SERVERY_TOMATO = 13405
-SERVERY_INCOMPLETE_PIZZA = 13406
-SERVERY_CHEESE = 13407
-SERVERY_UNCOOKED_PIZZA = 13408
-SERVERY_PLAIN_PIZZA = 13409
-SERVERY_PINEAPPLE = 13410
-SERVERY_PINEAPPLE_CHUNKS = 13411
-SERVERY_PINEAPPLE_PIZZA = 13412
-SERVERY_COOKED_MEAT = 13413
-SERVERY_POTATO = 13414
-SERVERY_INCOMPLETE_STEW = 13415
-SERVERY_INCOMPLETE_STEW_13416 = 13416
-SERVERY_UNCOOKED_STEW = 13417
-SERVERY_STEW = 13418
-SULPHUROUS_FERTILISER = 13419
-GRICOLLERS_FERTILISER = 13420
-SALTPETRE = 13421
-SALTPETRE_NOTED = 13422
-GOLOVANOVA_SEED = 13423
-BOLOGANO_SEED = 13424
-LOGAVANO_SEED = 13425
-GOLOVANOVA_FRUIT = 13426
-BOLOGANO_FRUIT = 13427
-LOGAVANO_FRUIT = 13428
-FRESH_FISH = 13429
-BUCKET_OF_SANDWORMS = 13430
-SANDWORMS = 13431
-SANDWORMS_PACK = 13432
-SANDWORMS_PACK_NOTED = 13433
-STOLEN_PENDANT = 13434
-STOLEN_GARNET_RING = 13435
-STOLEN_CIRCLET = 13436
-STOLEN_FAMILY_HEIRLOOM = 13437
-STOLEN_JEWELRY_BOX = 13438
-RAW_ANGLERFISH = 13439
-RAW_ANGLERFISH_NOTED = 13440
-ANGLERFISH = 13441
-ANGLERFISH_NOTED = 13442
-BURNT_ANGLERFISH = 13443
-BURNT_ANGLERFISH_NOTED = 13444
-DENSE_ESSENCE_BLOCK = 13445
-DARK_ESSENCE_BLOCK = 13446
-ENSOULED_GOBLIN_HEAD = 13447
-ENSOULED_GOBLIN_HEAD_13448 = 13448
-ENSOULED_GOBLIN_HEAD_NOTED = 13449
-ENSOULED_MONKEY_HEAD = 13450
-ENSOULED_MONKEY_HEAD_13451 = 13451
-ENSOULED_MONKEY_HEAD_NOTED = 13452
-ENSOULED_IMP_HEAD = 13453
-ENSOULED_IMP_HEAD_13454 = 13454
-ENSOULED_IMP_HEAD_NOTED = 13455
-ENSOULED_MINOTAUR_HEAD = 13456
-ENSOULED_MINOTAUR_HEAD_13457 = 13457
-ENSOULED_MINOTAUR_HEAD_NOTED = 13458
-ENSOULED_SCORPION_HEAD = 13459
-ENSOULED_SCORPION_HEAD_13460 = 13460
-ENSOULED_SCORPION_HEAD_NOTED = 13461
-ENSOULED_BEAR_HEAD = 13462
-ENSOULED_BEAR_HEAD_13463 = 13463
-ENSOULED_BEAR_HEAD_NOTED = 13464
-ENSOULED_UNICORN_HEAD = 13465
-ENSOULED_UNICORN_HEAD_13466 = 13466
-ENSOULED_UNICORN_HEAD_NOTED = 13467
-ENSOULED_DOG_HEAD = 13468
-ENSOULED_DOG_HEAD_13469 = 13469
-ENSOULED_DOG_HEAD_NOTED = 13470
-ENSOULED_CHAOS_DRUID_HEAD = 13471
-ENSOULED_CHAOS_DRUID_HEAD_13472 = 13472
-ENSOULED_CHAOS_DRUID_HEAD_NOTED = 13473
-ENSOULED_GIANT_HEAD = 13474
-ENSOULED_GIANT_HEAD_13475 = 13475
-ENSOULED_GIANT_HEAD_NOTED = 13476
-ENSOULED_OGRE_HEAD = 13477
-ENSOULED_OGRE_HEAD_13478 = 13478
-ENSOULED_OGRE_HEAD_NOTED = 13479
-ENSOULED_ELF_HEAD = 13480
-ENSOULED_ELF_HEAD_13481 = 13481
-ENSOULED_ELF_HEAD_NOTED = 13482
-ENSOULED_TROLL_HEAD = 13483
-ENSOULED_TROLL_HEAD_13484 = 13484
-ENSOULED_TROLL_HEAD_NOTED = 13485
-ENSOULED_HORROR_HEAD = 13486
-ENSOULED_HORROR_HEAD_13487 = 13487
-ENSOULED_HORROR_HEAD_NOTED = 13488
-ENSOULED_KALPHITE_HEAD = 13489
-ENSOULED_KALPHITE_HEAD_13490 = 13490
-ENSOULED_KALPHITE_HEAD_NOTED = 13491
-ENSOULED_DAGANNOTH_HEAD = 13492
-ENSOULED_DAGANNOTH_HEAD_13493 = 13493
-ENSOULED_DAGANNOTH_HEAD_NOTED = 13494
-ENSOULED_BLOODVELD_HEAD = 13495
-ENSOULED_BLOODVELD_HEAD_13496 = 13496
-ENSOULED_BLOODVELD_HEAD_NOTED = 13497
-ENSOULED_TZHAAR_HEAD = 13498
-ENSOULED_TZHAAR_HEAD_13499 = 13499
-ENSOULED_TZHAAR_HEAD_NOTED = 13500
-ENSOULED_DEMON_HEAD = 13501
-ENSOULED_DEMON_HEAD_13502 = 13502
-ENSOULED_DEMON_HEAD_NOTED = 13503
-ENSOULED_AVIANSIE_HEAD = 13504
-ENSOULED_AVIANSIE_HEAD_13505 = 13505
-ENSOULED_AVIANSIE_HEAD_NOTED = 13506
-ENSOULED_ABYSSAL_HEAD = 13507
-ENSOULED_ABYSSAL_HEAD_13508 = 13508
-ENSOULED_ABYSSAL_HEAD_NOTED = 13509
-ENSOULED_DRAGON_HEAD = 13510
-ENSOULED_DRAGON_HEAD_13511 = 13511
-ENSOULED_DRAGON_HEAD_NOTED = 13512
-BOOK_OF_ARCANE_KNOWLEDGE = 13513
-DARK_MANUSCRIPT = 13514
-DARK_MANUSCRIPT_13515 = 13515
-DARK_MANUSCRIPT_13516 = 13516
-DARK_MANUSCRIPT_13517 = 13517
-DARK_MANUSCRIPT_13518 = 13518
-DARK_MANUSCRIPT_13519 = 13519
-DARK_MANUSCRIPT_13520 = 13520
-DARK_MANUSCRIPT_13521 = 13521
-DARK_MANUSCRIPT_13522 = 13522
-DARK_MANUSCRIPT_13523 = 13523
-RADAS_CENSUS = 13524
-RICKTORS_DIARY_7 = 13525
-EATHRAM__RADA_EXTRACT = 13526
-KILLING_OF_A_KING = 13527
-HOSIDIUS_LETTER = 13528
-WINTERTODT_PARABLE = 13529
-TWILL_ACCORD = 13530
-BYRNES_CORONATION_SPEECH = 13531
-IDEOLOGY_OF_DARKNESS = 13532
-RADAS_JOURNEY = 13533
-TRANSVERGENCE_THEORY = 13534
-TRISTESSAS_TRAGEDY = 13535
-TREACHERY_OF_ROYALTY = 13536
-TRANSPORTATION_INCANTATIONS = 13537
-SHAYZIEN_SUPPLY_GLOVES_1 = 13538
-SHAYZIEN_SUPPLY_BOOTS_1 = 13539
-SHAYZIEN_SUPPLY_HELM_1 = 13540
-SHAYZIEN_SUPPLY_GREAVES_1 = 13541
-SHAYZIEN_SUPPLY_PLATEBODY_1 = 13542
-SHAYZIEN_SUPPLY_GLOVES_2 = 13543
-SHAYZIEN_SUPPLY_BOOTS_2 = 13544
-SHAYZIEN_SUPPLY_HELM_2 = 13545
-SHAYZIEN_SUPPLY_GREAVES_2 = 13546
-SHAYZIEN_SUPPLY_PLATEBODY_2 = 13547
-SHAYZIEN_SUPPLY_GLOVES_3 = 13548
-SHAYZIEN_SUPPLY_BOOTS_3 = 13549
-SHAYZIEN_SUPPLY_HELM_3 = 13550
-SHAYZIEN_SUPPLY_GREAVES_3 = 13551
-SHAYZIEN_SUPPLY_PLATEBODY_3 = 13552
-SHAYZIEN_SUPPLY_GLOVES_4 = 13553
-SHAYZIEN_SUPPLY_BOOTS_4 = 13554
-SHAYZIEN_SUPPLY_HELM_4 = 13555
-SHAYZIEN_SUPPLY_GREAVES_4 = 13556
-SHAYZIEN_SUPPLY_PLATEBODY_4 = 13557
-SHAYZIEN_SUPPLY_GLOVES_5 = 13558
-SHAYZIEN_SUPPLY_BOOTS_5 = 13559
-SHAYZIEN_SUPPLY_HELM_5 = 13560
-SHAYZIEN_SUPPLY_GREAVES_5 = 13561
-SHAYZIEN_SUPPLY_PLATEBODY_5 = 13562
-SHAYZIEN_SUPPLY_CRATE = 13563
-SHAYZIEN_SUPPLY_CRATE_NOTED = 13564
-SHAYZIEN_SUPPLY_SET_1 = 13565
-SHAYZIEN_SUPPLY_SET_2 = 13566
-SHAYZIEN_SUPPLY_SET_3 = 13567
-SHAYZIEN_SUPPLY_SET_4 = 13568
-SHAYZIEN_SUPPLY_SET_5 = 13569
-JUNIPER_CHARCOAL = 13570
-VOLCANIC_SULPHUR = 13571
-DYNAMITE_POT = 13572
-DYNAMITE = 13573
-DYNAMITE_NOTED = 13574
-BLASTED_ORE = 13575
-DRAGON_WARHAMMER = 13576
-DRAGON_WARHAMMER_NOTED = 13577
-GRACEFUL_HOOD_13579 = 13579
-GRACEFUL_HOOD_13580 = 13580
-GRACEFUL_CAPE_13581 = 13581
-GRACEFUL_CAPE_13582 = 13582
-GRACEFUL_TOP_13583 = 13583
-GRACEFUL_TOP_13584 = 13584
-GRACEFUL_LEGS_13585 = 13585
-GRACEFUL_LEGS_13586 = 13586
-GRACEFUL_GLOVES_13587 = 13587
-GRACEFUL_GLOVES_13588 = 13588
-GRACEFUL_BOOTS_13589 = 13589
-GRACEFUL_BOOTS_13590 = 13590
-GRACEFUL_HOOD_13591 = 13591
-GRACEFUL_HOOD_13592 = 13592
-GRACEFUL_CAPE_13593 = 13593
-GRACEFUL_CAPE_13594 = 13594
-GRACEFUL_TOP_13595 = 13595
-GRACEFUL_TOP_13596 = 13596
-GRACEFUL_LEGS_13597 = 13597
-GRACEFUL_LEGS_13598 = 13598
-GRACEFUL_GLOVES_13599 = 13599
-GRACEFUL_GLOVES_13600 = 13600
-GRACEFUL_BOOTS_13601 = 13601
-GRACEFUL_BOOTS_13602 = 13602
-GRACEFUL_HOOD_13603 = 13603
-GRACEFUL_HOOD_13604 = 13604
-GRACEFUL_CAPE_13605 = 13605
-GRACEFUL_CAPE_13606 = 13606
-GRACEFUL_TOP_13607 = 13607
-GRACEFUL_TOP_13608 = 13608
-GRACEFUL_LEGS_13609 = 13609
-GRACEFUL_LEGS_13610 = 13610
-GRACEFUL_GLOVES_13611 = 13611
-GRACEFUL_GLOVES_13612 = 13612
-GRACEFUL_BOOTS_13613 = 13613
-GRACEFUL_BOOTS_13614 = 13614
-GRACEFUL_HOOD_13615 = 13615
-GRACEFUL_HOOD_13616 = 13616
-GRACEFUL_CAPE_13617 = 13617
-GRACEFUL_CAPE_13618 = 13618
-GRACEFUL_TOP_13619 = 13619
-GRACEFUL_TOP_13620 = 13620
-GRACEFUL_LEGS_13621 = 13621
-GRACEFUL_LEGS_13622 = 13622
-GRACEFUL_GLOVES_13623 = 13623
-GRACEFUL_GLOVES_13624 = 13624
-GRACEFUL_BOOTS_13625 = 13625
-GRACEFUL_BOOTS_13626 = 13626
-GRACEFUL_HOOD_13627 = 13627
-GRACEFUL_HOOD_13628 = 13628
-GRACEFUL_CAPE_13629 = 13629
-GRACEFUL_CAPE_13630 = 13630
-GRACEFUL_TOP_13631 = 13631
-GRACEFUL_TOP_13632 = 13632
-GRACEFUL_LEGS_13633 = 13633
-GRACEFUL_LEGS_13634 = 13634
-GRACEFUL_GLOVES_13635 = 13635
-GRACEFUL_GLOVES_13636 = 13636
-GRACEFUL_BOOTS_13637 = 13637
-GRACEFUL_BOOTS_13638 = 13638
-SEED_BOX = 13639
-FARMERS_BORO_TROUSERS = 13640
-FARMERS_BORO_TROUSERS_13641 = 13641
-FARMERS_JACKET = 13642
-FARMERS_SHIRT = 13643
-FARMERS_BOOTS = 13644
-FARMERS_BOOTS_13645 = 13645
-FARMERS_STRAWHAT = 13646
-FARMERS_STRAWHAT_13647 = 13647
-CLUE_BOTTLE_EASY = 13648
-CLUE_BOTTLE_MEDIUM = 13649
-CLUE_BOTTLE_HARD = 13650
-CLUE_BOTTLE_ELITE = 13651
-DRAGON_CLAWS = 13652
-BIRD_NEST_13653 = 13653
-NEST_BOX_SEEDS_13654 = 13654
-GNOME_CHILD_HAT = 13655
-PRESENT_13656 = 13656
-GRAPE_SEED_13657 = 13657
-TELEPORT_CARD = 13658
-TELEPORT_CARD_NOTED = 13659
-CHRONICLE = 13660
-NULL_13661 = 13661
-NULL_13662 = 13662
-BUNNY_TOP = 13663
-BUNNY_LEGS = 13664
-BUNNY_PAWS = 13665
-DEADMAN_TELEPORT_TABLET = 13666
-GRACEFUL_HOOD_13667 = 13667
-GRACEFUL_HOOD_13668 = 13668
-GRACEFUL_CAPE_13669 = 13669
-GRACEFUL_CAPE_13670 = 13670
-GRACEFUL_TOP_13671 = 13671
-GRACEFUL_TOP_13672 = 13672
-GRACEFUL_LEGS_13673 = 13673
-GRACEFUL_LEGS_13674 = 13674
-GRACEFUL_GLOVES_13675 = 13675
-GRACEFUL_GLOVES_13676 = 13676
-GRACEFUL_BOOTS_13677 = 13677
-GRACEFUL_BOOTS_13678 = 13678
-CABBAGE_CAPE = 13679
-CABBAGE_RUNE = 13680
-CRUCIFEROUS_CODEX = 13681
-NULL_15297 = 15297
-NULL_15303 = 15303
-NULL_15304 = 15304
-NULL_15309 = 15309
-NULL_15344 = 15344
-NULL_15345 = 15345
-NULL_15346 = 15346
-PHARAOHS_SCEPTRE_16176 = 16176
-USELESS_KEY_16684 = 16684
-NEW_CRYSTAL_BOW_16888 = 16888
-NEW_CRYSTAL_BOW_I_16889 = 16889
-NEW_CRYSTAL_SHIELD_16890 = 16890
-NEW_CRYSTAL_SHIELD_I_16891 = 16891
-NEW_CRYSTAL_HALBERD_FULL_I_16892 = 16892
-NEW_CRYSTAL_HALBERD_FULL_16893 = 16893
-DEAD_ORB_17152 = 17152
-DWARF_REMAINS_17851 = 17851
-BAG_FULL_OF_GEMS = 19473
-ACHIEVEMENT_DIARY_CAPE = 19476
-LIGHT_BALLISTA = 19478
-LIGHT_BALLISTA_NOTED = 19479
-HEAVY_BALLISTA = 19481
-HEAVY_BALLISTA_NOTED = 19482
-DRAGON_JAVELIN = 19484
-DRAGON_JAVELINP = 19486
-DRAGON_JAVELINP_19488 = 19488
-DRAGON_JAVELINP_19490 = 19490
-ZENYTE_BRACELET = 19492
-ZENYTE = 19493
-ZENYTE_NOTED = 19494
-UNCUT_ZENYTE = 19496
-UNCUT_ZENYTE_NOTED = 19497
-GLISTENING_TEAR_19499 = 19499
-BULLET_ARROW_19500 = 19500
-ZENYTE_AMULET_U = 19501
-ZENYTE_AMULET_U_NOTED = 19502
-DRAGONSTONE_DRAGON_BOLTS_E_19504 = 19504
-MYSTERIOUS_NOTE = 19505
-MYSTERIOUS_NOTE_19507 = 19507
-MYSTERIOUS_NOTE_19509 = 19509
-SCRAWLED_NOTE_19511 = 19511
-TRANSLATED_NOTE = 19513
-BOOK_OF_SPYOLOGY = 19515
-BRUSH = 19517
-JUICECOATED_BRUSH = 19519
-HANDKERCHIEF = 19521
-KRUKS_PAW = 19523
-KRUK_MONKEY_GREEGREE = 19525
-SATCHEL = 19527
-SATCHEL_19528 = 19528
-ZENYTE_SHARD = 19529
-ZENYTE_SHARD_NOTED = 19530
-ZENYTE_BRACELET_19532 = 19532
-ZENYTE_BRACELET_NOTED = 19533
-ZENYTE_NECKLACE = 19535
-ZENYTE_NECKLACE_NOTED = 19536
-ZENYTE_RING = 19538
-ZENYTE_RING_NOTED = 19539
-ZENYTE_AMULET = 19541
-ZENYTE_AMULET_NOTED = 19542
-TORMENTED_BRACELET = 19544
-TORMENTED_BRACELET_NOTED = 19545
-NECKLACE_OF_ANGUISH = 19547
-NECKLACE_OF_ANGUISH_NOTED = 19548
-RING_OF_SUFFERING = 19550
-RING_OF_SUFFERING_NOTED = 19551
-AMULET_OF_TORTURE = 19553
-AMULET_OF_TORTURE_NOTED = 19554
-MONKEY_19556 = 19556
-NIEVE = 19558
-ELYSIAN_SPIRIT_SHIELD_19559 = 19559
-CHARGED_ONYX = 19560
-DECONSTRUCTED_ONYX = 19562
-ROYAL_SEED_POD = 19564
-BRONZE_KEY_19566 = 19566
-COMBAT_SCARRED_KEY = 19567
-COMBAT_SCRATCHED_KEY = 19568
-COMBAT_DAMAGED_KEY = 19569
-BRONZE_JAVELIN_HEADS_19570 = 19570
-IRON_JAVELIN_HEADS_19572 = 19572
-STEEL_JAVELIN_HEADS_19574 = 19574
-MITHRIL_JAVELIN_HEADS_19576 = 19576
-ADAMANT_JAVELIN_HEADS_19578 = 19578
-RUNE_JAVELIN_HEADS_19580 = 19580
-DRAGON_JAVELIN_HEADS_19582 = 19582
-JAVELIN_SHAFT_19584 = 19584
-LIGHT_FRAME = 19586
-LIGHT_FRAME_NOTED = 19587
-HEAVY_FRAME = 19589
-HEAVY_FRAME_NOTED = 19590
-BALLISTA_LIMBS = 19592
-BALLISTA_LIMBS_NOTED = 19593
-INCOMPLETE_LIGHT_BALLISTA = 19595
-INCOMPLETE_LIGHT_BALLISTA_NOTED = 19596
-INCOMPLETE_HEAVY_BALLISTA = 19598
-INCOMPLETE_HEAVY_BALLISTA_NOTED = 19599
-BALLISTA_SPRING = 19601
-BALLISTA_SPRING_NOTED = 19602
-UNSTRUNG_LIGHT_BALLISTA = 19604
-UNSTRUNG_LIGHT_BALLISTA_NOTED = 19605
-UNSTRUNG_HEAVY_BALLISTA = 19607
-UNSTRUNG_HEAVY_BALLISTA_NOTED = 19608
-MONKEY_TAIL = 19610
-MONKEY_TAIL_NOTED = 19611
-ARCEUUS_LIBRARY_TELEPORT = 19613
-DRAYNOR_MANOR_TELEPORT = 19615
-MIND_ALTAR_TELEPORT = 19617
-SALVE_GRAVEYARD_TELEPORT = 19619
-FENKENSTRAINS_CASTLE_TELEPORT = 19621
-WEST_ARDOUGNE_TELEPORT = 19623
-HARMONY_ISLAND_TELEPORT = 19625
-CEMETERY_TELEPORT = 19627
-BARROWS_TELEPORT = 19629
-APE_ATOLL_TELEPORT = 19631
-SOUL_BEARER = 19634
-DAMAGED_SOUL_BEARER = 19636
-SOUL_JOURNEY = 19637
-BLACK_SLAYER_HELMET = 19639
-BLACK_SLAYER_HELMET_I = 19641
-GREEN_SLAYER_HELMET = 19643
-GREEN_SLAYER_HELMET_I = 19645
-RED_SLAYER_HELMET = 19647
-RED_SLAYER_HELMET_I = 19649
-HOSIDIUS_TELEPORT = 19651
-GOLOVANOVA_FRUIT_TOP = 19653
-GOLOVANOVA_FRUIT_TOP_NOTED = 19654
-UNCOOKED_BOTANICAL_PIE = 19656
-UNCOOKED_BOTANICAL_PIE_NOTED = 19657
-HALF_A_BOTANICAL_PIE = 19659
-HALF_A_BOTANICAL_PIE_NOTED = 19660
-BOTANICAL_PIE = 19662
-BOTANICAL_PIE_NOTED = 19663
-DAMAGED_MONKEY_TAIL = 19665
-DAMAGED_MONKEY_TAIL_NOTED = 19666
-MINECART_CONTROL_SCROLL = 19668
-REDWOOD_LOGS = 19669
-REDWOOD_LOGS_NOTED = 19670
-REDWOOD_PYRE_LOGS = 19672
-REDWOOD_PYRE_LOGS_NOTED = 19673
-ARCLIGHT = 19675
-ANCIENT_SHARD = 19677
-DARK_TOTEM_BASE = 19679
-DARK_TOTEM_MIDDLE = 19681
-DARK_TOTEM_TOP = 19683
-DARK_TOTEM = 19685
-HELM_OF_RAEDWALD = 19687
-CLUE_HUNTER_GARB = 19689
-CLUE_HUNTER_GLOVES = 19691
-CLUE_HUNTER_TROUSERS = 19693
-CLUE_HUNTER_BOOTS = 19695
-CLUE_HUNTER_CLOAK = 19697
-HORNWOOD_HELM = 19699
-JAR_OF_DARKNESS = 19701
-JAR_OF_DARKNESS_NOTED = 19702
-COMPOST_PACK = 19704
-COMPOST_PACK_NOTED = 19705
-AMULET_OF_ETERNAL_GLORY = 19707
-AMULET_OF_ETERNAL_GLORY_NOTED = 19708
-RING_OF_SUFFERING_I = 19710
-CLUE_NEST_EASY = 19712
-CLUE_NEST_MEDIUM = 19714
-CLUE_NEST_HARD = 19716
-CLUE_NEST_ELITE = 19718
-OCCULT_NECKLACE_OR = 19720
-DRAGON_DEFENDER_T = 19722
-LEFT_EYE_PATCH = 19724
-LEFT_EYE_PATCH_NOTED = 19725
-DOUBLE_EYE_PATCH = 19727
-DOUBLE_EYE_PATCH_NOTED = 19728
-BLOODHOUND = 19730
-LUCKY_IMPLING_JAR = 19732
-CLUE_SCROLL_MEDIUM_19734 = 19734
-CHALLENGE_SCROLL_MEDIUM_19735 = 19735
-CLUE_SCROLL_MEDIUM_19736 = 19736
-CHALLENGE_SCROLL_MEDIUM_19737 = 19737
-CLUE_SCROLL_MEDIUM_19738 = 19738
-CHALLENGE_SCROLL_MEDIUM_19739 = 19739
-CLUE_SCROLL_MEDIUM_19740 = 19740
-CHALLENGE_SCROLL_MEDIUM_19741 = 19741
-CLUE_SCROLL_MEDIUM_19742 = 19742
-CHALLENGE_SCROLL_MEDIUM_19743 = 19743
-CLUE_SCROLL_MEDIUM_19744 = 19744
-CHALLENGE_SCROLL_MEDIUM_19745 = 19745
-CLUE_SCROLL_MEDIUM_19746 = 19746
-CHALLENGE_SCROLL_MEDIUM_19747 = 19747
-CLUE_SCROLL_MEDIUM_19748 = 19748
-CHALLENGE_SCROLL_MEDIUM_19749 = 19749
-CLUE_SCROLL_MEDIUM_19750 = 19750
-CHALLENGE_SCROLL_MEDIUM_19751 = 19751
-CLUE_SCROLL_MEDIUM_19752 = 19752
-CHALLENGE_SCROLL_MEDIUM_19753 = 19753
-CLUE_SCROLL_MEDIUM_19754 = 19754
-CHALLENGE_SCROLL_MEDIUM_19755 = 19755
-CLUE_SCROLL_MEDIUM_19756 = 19756
-CHALLENGE_SCROLL_MEDIUM_19757 = 19757
-CLUE_SCROLL_MEDIUM_19758 = 19758
-CHALLENGE_SCROLL_MEDIUM_19759 = 19759
-CLUE_SCROLL_MEDIUM_19760 = 19760
-KEY_MEDIUM_19761 = 19761
-CLUE_SCROLL_MEDIUM_19762 = 19762
-CHALLENGE_SCROLL_MEDIUM_19763 = 19763
-CLUE_SCROLL_MEDIUM_19764 = 19764
-CHALLENGE_SCROLL_MEDIUM_19765 = 19765
-CLUE_SCROLL_MEDIUM_19766 = 19766
-CHALLENGE_SCROLL_MEDIUM_19767 = 19767
-CLUE_SCROLL_MEDIUM_19768 = 19768
-CHALLENGE_SCROLL_MEDIUM_19769 = 19769
-CLUE_SCROLL_MEDIUM_19770 = 19770
-CHALLENGE_SCROLL_MEDIUM_19771 = 19771
-CLUE_SCROLL_MEDIUM_19772 = 19772
-CHALLENGE_SCROLL_MEDIUM_19773 = 19773
-CLUE_SCROLL_MEDIUM_19774 = 19774
-CASKET_MEDIUM_19775 = 19775
-CLUE_SCROLL_MEDIUM_19776 = 19776
-CASKET_MEDIUM_19777 = 19777
-CLUE_SCROLL_MEDIUM_19778 = 19778
-CASKET_MEDIUM_19779 = 19779
-CLUE_SCROLL_MEDIUM_19780 = 19780
-CASKET_MEDIUM_19781 = 19781
-CLUE_SCROLL_ELITE_19782 = 19782
-CLUE_SCROLL_ELITE_19783 = 19783
-CLUE_SCROLL_ELITE_19784 = 19784
-CLUE_SCROLL_ELITE_19785 = 19785
-CLUE_SCROLL_ELITE_19786 = 19786
-CLUE_SCROLL_ELITE_19787 = 19787
-CLUE_SCROLL_ELITE_19788 = 19788
-CLUE_SCROLL_ELITE_19789 = 19789
-CLUE_SCROLL_ELITE_19790 = 19790
-CLUE_SCROLL_ELITE_19791 = 19791
-CLUE_SCROLL_ELITE_19792 = 19792
-CLUE_SCROLL_ELITE_19793 = 19793
-CLUE_SCROLL_ELITE_19794 = 19794
-CLUE_SCROLL_ELITE_19795 = 19795
-CLUE_SCROLL_ELITE_19796 = 19796
-CLUE_SCROLL_ELITE_19797 = 19797
-CLUE_SCROLL_ELITE_19798 = 19798
-CLUE_SCROLL_ELITE_19799 = 19799
-CLUE_SCROLL_ELITE_19800 = 19800
-CLUE_SCROLL_ELITE_19801 = 19801
-CLUE_SCROLL_ELITE_19802 = 19802
-CLUE_SCROLL_ELITE_19803 = 19803
-CLUE_SCROLL_ELITE_19804 = 19804
-CLUE_SCROLL_ELITE_19805 = 19805
-CLUE_SCROLL_ELITE_19806 = 19806
-CLUE_SCROLL_ELITE_19807 = 19807
-CLUE_SCROLL_ELITE_19808 = 19808
-CLUE_SCROLL_ELITE_19809 = 19809
-CLUE_SCROLL_ELITE_19810 = 19810
-CLUE_SCROLL_ELITE_19811 = 19811
-KEY_ELITE = 19812
-CLUE_SCROLL_ELITE_19813 = 19813
-CLUE_SCROLL_EASY_19814 = 19814
-CASKET_EASY_19815 = 19815
-CLUE_SCROLL_EASY_19816 = 19816
-CLUE_SCROLL_EASY_19817 = 19817
-CLUE_SCROLL_EASY_19818 = 19818
-CLUE_SCROLL_EASY_19819 = 19819
-CLUE_SCROLL_EASY_19820 = 19820
-CLUE_SCROLL_EASY_19821 = 19821
-CLUE_SCROLL_EASY_19822 = 19822
-CLUE_SCROLL_EASY_19823 = 19823
-CLUE_SCROLL_EASY_19824 = 19824
-CLUE_SCROLL_EASY_19825 = 19825
-CLUE_SCROLL_EASY_19826 = 19826
-CASKET_EASY_19827 = 19827
-CLUE_SCROLL_EASY_19828 = 19828
-CLUE_SCROLL_EASY_19829 = 19829
-CLUE_SCROLL_EASY_19830 = 19830
-CLUE_SCROLL_EASY_19831 = 19831
-CASKET_EASY_19832 = 19832
-CLUE_SCROLL_EASY_19833 = 19833
-CASKET_EASY_19834 = 19834
-CLUE_SCROLL_MASTER = 19835
-REWARD_CASKET_MASTER = 19836
-TORN_CLUE_SCROLL_PART_1 = 19837
-TORN_CLUE_SCROLL_PART_2 = 19838
-TORN_CLUE_SCROLL_PART_3 = 19839
-CLUE_SCROLL_HARD_19840 = 19840
-CASKET_HARD_19841 = 19841
-CLUE_SCROLL_HARD_19842 = 19842
-CASKET_HARD_19843 = 19843
-CLUE_SCROLL_HARD_19844 = 19844
-CASKET_HARD_19845 = 19845
-CLUE_SCROLL_HARD_19846 = 19846
-CHALLENGE_SCROLL_HARD_19847 = 19847
-CLUE_SCROLL_HARD_19848 = 19848
-CASKET_HARD_19849 = 19849
-CLUE_SCROLL_HARD_19850 = 19850
-CASKET_HARD_19851 = 19851
-CLUE_SCROLL_HARD_19852 = 19852
-CLUE_SCROLL_HARD_19853 = 19853
-CLUE_SCROLL_HARD_19854 = 19854
-CHALLENGE_SCROLL_HARD_19855 = 19855
-CLUE_SCROLL_HARD_19856 = 19856
-CLUE_SCROLL_HARD_19857 = 19857
-CLUE_SCROLL_HARD_19858 = 19858
-CHALLENGE_SCROLL_HARD_19859 = 19859
-CLUE_SCROLL_HARD_19860 = 19860
-CASKET_HARD_19861 = 19861
-CLUE_SCROLL_HARD_19862 = 19862
-CASKET_HARD_19863 = 19863
-CLUE_SCROLL_HARD_19864 = 19864
-CASKET_HARD_19865 = 19865
-CLUE_SCROLL_HARD_19866 = 19866
-CASKET_HARD_19867 = 19867
-CLUE_SCROLL_HARD_19868 = 19868
-CASKET_HARD_19869 = 19869
-CLUE_SCROLL_HARD_19870 = 19870
-CASKET_HARD_19871 = 19871
-CLUE_SCROLL_HARD_19872 = 19872
-CASKET_HARD_19873 = 19873
-CLUE_SCROLL_HARD_19874 = 19874
-CASKET_HARD_19875 = 19875
-CLUE_SCROLL_HARD_19876 = 19876
-CASKET_HARD_19877 = 19877
-CLUE_SCROLL_HARD_19878 = 19878
-CASKET_HARD_19879 = 19879
-CLUE_SCROLL_HARD_19880 = 19880
-CASKET_HARD_19881 = 19881
-CLUE_SCROLL_HARD_19882 = 19882
-CHALLENGE_SCROLL_HARD_19883 = 19883
-CLUE_SCROLL_HARD_19884 = 19884
-CHALLENGE_SCROLL_HARD_19885 = 19885
-CLUE_SCROLL_HARD_19886 = 19886
-PUZZLE_BOX_HARD_19887 = 19887
-CLUE_SCROLL_HARD_19888 = 19888
-CHALLENGE_SCROLL_HARD_19889 = 19889
-CLUE_SCROLL_HARD_19890 = 19890
-PUZZLE_BOX_HARD_19891 = 19891
-CLUE_SCROLL_HARD_19892 = 19892
-CHALLENGE_SCROLL_HARD_19893 = 19893
-CLUE_SCROLL_HARD_19894 = 19894
-PUZZLE_BOX_HARD_19895 = 19895
-CLUE_SCROLL_HARD_19896 = 19896
-PUZZLE_BOX_HARD_19897 = 19897
-CLUE_SCROLL_HARD_19898 = 19898
-CHALLENGE_SCROLL_HARD_19899 = 19899
-CLUE_SCROLL_HARD_19900 = 19900
-CHALLENGE_SCROLL_HARD_19901 = 19901
-CLUE_SCROLL_HARD_19902 = 19902
-PUZZLE_BOX_HARD_19903 = 19903
-CLUE_SCROLL_HARD_19904 = 19904
-CHALLENGE_SCROLL_HARD_19905 = 19905
-CLUE_SCROLL_HARD_19906 = 19906
-CHALLENGE_SCROLL_HARD_19907 = 19907
-CLUE_SCROLL_HARD_19908 = 19908
-CHALLENGE_SCROLL_HARD_19909 = 19909
-CLUE_SCROLL_HARD_19910 = 19910
-PUZZLE_BOX_HARD_19911 = 19911
-ZOMBIE_HEAD_19912 = 19912
-ZOMBIE_HEAD_NOTED = 19913
-CYCLOPS_HEAD = 19915
-CYCLOPS_HEAD_NOTED = 19916
-NUNCHAKU = 19918
-NUNCHAKU_NOTED = 19919
-ANCIENT_DHIDE_BOOTS = 19921
-ANCIENT_DHIDE_BOOTS_NOTED = 19922
-BANDOS_DHIDE_BOOTS = 19924
-BANDOS_DHIDE_BOOTS_NOTED = 19925
-GUTHIX_DHIDE_BOOTS = 19927
-GUTHIX_DHIDE_BOOTS_NOTED = 19928
-ARMADYL_DHIDE_BOOTS = 19930
-ARMADYL_DHIDE_BOOTS_NOTED = 19931
-SARADOMIN_DHIDE_BOOTS = 19933
-SARADOMIN_DHIDE_BOOTS_NOTED = 19934
-ZAMORAK_DHIDE_BOOTS = 19936
-ZAMORAK_DHIDE_BOOTS_NOTED = 19937
-STRANGE_DEVICE = 19939
-HEAVY_CASKET = 19941
-ARCEUUS_SCARF = 19943
-ARCEUUS_SCARF_NOTED = 19944
-HOSIDIUS_SCARF = 19946
-HOSIDIUS_SCARF_NOTED = 19947
-LOVAKENGJ_SCARF = 19949
-LOVAKENGJ_SCARF_NOTED = 19950
-PISCARILIUS_SCARF = 19952
-PISCARILIUS_SCARF_NOTED = 19953
-SHAYZIEN_SCARF = 19955
-SHAYZIEN_SCARF_NOTED = 19956
-DARK_TUXEDO_JACKET = 19958
-DARK_TUXEDO_JACKET_NOTED = 19959
-DARK_TUXEDO_CUFFS = 19961
-DARK_TUXEDO_CUFFS_NOTED = 19962
-DARK_TROUSERS = 19964
-DARK_TROUSERS_NOTED = 19965
-DARK_TUXEDO_SHOES = 19967
-DARK_TUXEDO_SHOES_NOTED = 19968
-DARK_BOW_TIE = 19970
-DARK_BOW_TIE_NOTED = 19971
-LIGHT_TUXEDO_JACKET = 19973
-LIGHT_TUXEDO_JACKET_NOTED = 19974
-LIGHT_TUXEDO_CUFFS = 19976
-LIGHT_TUXEDO_CUFFS_NOTED = 19977
-LIGHT_TROUSERS = 19979
-LIGHT_TROUSERS_NOTED = 19980
-LIGHT_TUXEDO_SHOES = 19982
-LIGHT_TUXEDO_SHOES_NOTED = 19983
-LIGHT_BOW_TIE = 19985
-LIGHT_BOW_TIE_NOTED = 19986
-BLACKSMITHS_HELM = 19988
-BLACKSMITHS_HELM_NOTED = 19989
-BUCKET_HELM = 19991
-BUCKET_HELM_NOTED = 19992
-RANGER_GLOVES = 19994
-RANGER_GLOVES_NOTED = 19995
-HOLY_WRAPS = 19997
-HOLY_WRAPS_NOTED = 19998
-DRAGON_SCIMITAR_OR = 20000
-DRAGON_SCIMITAR_ORNAMENT_KIT = 20002
-DRAGON_SCIMITAR_ORNAMENT_KIT_NOTED = 20003
-RING_OF_NATURE = 20005
-RING_OF_NATURE_NOTED = 20006
-FANCY_TIARA = 20008
-FANCY_TIARA_NOTED = 20009
-_3RD_AGE_AXE = 20011
-_3RD_AGE_AXE_NOTED = 20012
-_3RD_AGE_PICKAXE = 20014
-_3RD_AGE_PICKAXE_NOTED = 20015
-RING_OF_COINS = 20017
-RING_OF_COINS_NOTED = 20018
-LESSER_DEMON_MASK = 20020
-LESSER_DEMON_MASK_NOTED = 20021
-GREATER_DEMON_MASK = 20023
-GREATER_DEMON_MASK_NOTED = 20024
-BLACK_DEMON_MASK = 20026
-BLACK_DEMON_MASK_NOTED = 20027
-OLD_DEMON_MASK = 20029
-OLD_DEMON_MASK_NOTED = 20030
-JUNGLE_DEMON_MASK = 20032
-JUNGLE_DEMON_MASK_NOTED = 20033
-SAMURAI_KASA = 20035
-SAMURAI_KASA_NOTED = 20036
-SAMURAI_SHIRT = 20038
-SAMURAI_SHIRT_NOTED = 20039
-SAMURAI_GLOVES = 20041
-SAMURAI_GLOVES_NOTED = 20042
-SAMURAI_GREAVES = 20044
-SAMURAI_GREAVES_NOTED = 20045
-SAMURAI_BOOTS = 20047
-SAMURAI_BOOTS_NOTED = 20048
-OBSIDIAN_CAPE_R = 20050
-OBSIDIAN_CAPE_R_NOTED = 20051
-HALF_MOON_SPECTACLES = 20053
-HALF_MOON_SPECTACLES_NOTED = 20054
-ALE_OF_THE_GODS = 20056
-ALE_OF_THE_GODS_NOTED = 20057
-BUCKET_HELM_G = 20059
-BUCKET_HELM_G_NOTED = 20060
-TORTURE_ORNAMENT_KIT = 20062
-TORTURE_ORNAMENT_KIT_NOTED = 20063
-OCCULT_ORNAMENT_KIT = 20065
-OCCULT_ORNAMENT_KIT_NOTED = 20066
-ARMADYL_GODSWORD_ORNAMENT_KIT = 20068
-ARMADYL_GODSWORD_ORNAMENT_KIT_NOTED = 20069
-BANDOS_GODSWORD_ORNAMENT_KIT = 20071
-BANDOS_GODSWORD_ORNAMENT_KIT_NOTED = 20072
-SARADOMIN_GODSWORD_ORNAMENT_KIT = 20074
-SARADOMIN_GODSWORD_ORNAMENT_KIT_NOTED = 20075
-ZAMORAK_GODSWORD_ORNAMENT_KIT = 20077
-ZAMORAK_GODSWORD_ORNAMENT_KIT_NOTED = 20078
-MUMMYS_HEAD = 20080
-MUMMYS_HEAD_NOTED = 20081
-MUMMYS_BODY = 20083
-MUMMYS_BODY_NOTED = 20084
-MUMMYS_HANDS = 20086
-MUMMYS_HANDS_NOTED = 20087
-MUMMYS_LEGS = 20089
-MUMMYS_LEGS_NOTED = 20090
-MUMMYS_FEET = 20092
-MUMMYS_FEET_NOTED = 20093
-ANKOU_MASK = 20095
-ANKOU_MASK_NOTED = 20096
-ANKOU_TOP = 20098
-ANKOU_TOP_NOTED = 20099
-ANKOU_GLOVES = 20101
-ANKOU_GLOVES_NOTED = 20102
-ANKOUS_LEGGINGS = 20104
-ANKOUS_LEGGINGS_NOTED = 20105
-ANKOU_SOCKS = 20107
-ANKOU_SOCKS_NOTED = 20108
-BOWL_WIG = 20110
-BOWL_WIG_NOTED = 20111
-ARCEUUS_HOOD = 20113
-ARCEUUS_HOOD_NOTED = 20114
-HOSIDIUS_HOOD = 20116
-HOSIDIUS_HOOD_NOTED = 20117
-LOVAKENGJ_HOOD = 20119
-LOVAKENGJ_HOOD_NOTED = 20120
-PISCARILIUS_HOOD = 20122
-PISCARILIUS_HOOD_NOTED = 20123
-SHAYZIEN_HOOD = 20125
-SHAYZIEN_HOOD_NOTED = 20126
-HOOD_OF_DARKNESS = 20128
-HOOD_OF_DARKNESS_NOTED = 20129
-ROBE_TOP_OF_DARKNESS = 20131
-ROBE_TOP_OF_DARKNESS_NOTED = 20132
-GLOVES_OF_DARKNESS = 20134
-GLOVES_OF_DARKNESS_NOTED = 20135
-ROBE_BOTTOM_OF_DARKNESS = 20137
-ROBE_BOTTOM_OF_DARKNESS_NOTED = 20138
-BOOTS_OF_DARKNESS = 20140
-BOOTS_OF_DARKNESS_NOTED = 20141
-DRAGON_DEFENDER_ORNAMENT_KIT = 20143
-DRAGON_DEFENDER_ORNAMENT_KIT_NOTED = 20144
-GILDED_MED_HELM = 20146
-GILDED_MED_HELM_NOTED = 20147
-GILDED_CHAINBODY = 20149
-GILDED_CHAINBODY_NOTED = 20150
-GILDED_SQ_SHIELD = 20152
-GILDED_SQ_SHIELD_NOTED = 20153
-GILDED_2H_SWORD = 20155
-GILDED_2H_SWORD_NOTED = 20156
-GILDED_SPEAR = 20158
-GILDED_SPEAR_NOTED = 20159
-GILDED_HASTA = 20161
-GILDED_HASTA_NOTED = 20162
-LARGE_SPADE = 20164
-WOODEN_SHIELD_G = 20166
-WOODEN_SHIELD_G_NOTED = 20167
-STEEL_PLATEBODY_G = 20169
-STEEL_PLATEBODY_G_NOTED = 20170
-STEEL_PLATELEGS_G = 20172
-STEEL_PLATELEGS_G_NOTED = 20173
-STEEL_PLATESKIRT_G = 20175
-STEEL_PLATESKIRT_G_NOTED = 20176
-STEEL_FULL_HELM_G = 20178
-STEEL_FULL_HELM_G_NOTED = 20179
-STEEL_KITESHIELD_G = 20181
-STEEL_KITESHIELD_G_NOTED = 20182
-STEEL_PLATEBODY_T = 20184
-STEEL_PLATEBODY_T_NOTED = 20185
-STEEL_PLATELEGS_T = 20187
-STEEL_PLATELEGS_T_NOTED = 20188
-STEEL_PLATESKIRT_T = 20190
-STEEL_PLATESKIRT_T_NOTED = 20191
-STEEL_FULL_HELM_T = 20193
-STEEL_FULL_HELM_T_NOTED = 20194
-STEEL_KITESHIELD_T = 20196
-STEEL_KITESHIELD_T_NOTED = 20197
-MONKS_ROBE_TOP_G = 20199
-MONKS_ROBE_TOP_G_NOTED = 20200
-MONKS_ROBE_G = 20202
-MONKS_ROBE_G_NOTED = 20203
-GOLDEN_CHEFS_HAT = 20205
-GOLDEN_CHEFS_HAT_NOTED = 20206
-GOLDEN_APRON = 20208
-GOLDEN_APRON_NOTED = 20209
-TEAM_CAPE_ZERO = 20211
-TEAM_CAPE_ZERO_NOTED = 20212
-TEAM_CAPE_X = 20214
-TEAM_CAPE_X_NOTED = 20215
-TEAM_CAPE_I = 20217
-TEAM_CAPE_I_NOTED = 20218
-HOLY_BLESSING = 20220
-HOLY_BLESSING_NOTED = 20221
-UNHOLY_BLESSING = 20223
-UNHOLY_BLESSING_NOTED = 20224
-PEACEFUL_BLESSING = 20226
-PEACEFUL_BLESSING_NOTED = 20227
-HONOURABLE_BLESSING = 20229
-HONOURABLE_BLESSING_NOTED = 20230
-WAR_BLESSING = 20232
-WAR_BLESSING_NOTED = 20233
-ANCIENT_BLESSING = 20235
-ANCIENT_BLESSING_NOTED = 20236
-CHARGE_DRAGONSTONE_JEWELLERY_SCROLL = 20238
-CRIER_COAT = 20240
-CRIER_COAT_NOTED = 20241
-CRIER_BELL = 20243
-CRIER_BELL_NOTED = 20244
-BLACK_LEPRECHAUN_HAT = 20246
-BLACK_LEPRECHAUN_HAT_NOTED = 20247
-CLUELESS_SCROLL = 20249
-ARCEUUS_BANNER = 20251
-ARCEUUS_BANNER_NOTED = 20252
-HOSIDIUS_BANNER = 20254
-HOSIDIUS_BANNER_NOTED = 20255
-LOVAKENGJ_BANNER = 20257
-LOVAKENGJ_BANNER_NOTED = 20258
-PISCARILIUS_BANNER = 20260
-PISCARILIUS_BANNER_NOTED = 20261
-SHAYZIEN_BANNER = 20263
-SHAYZIEN_BANNER_NOTED = 20264
-BLACK_UNICORN_MASK = 20266
-BLACK_UNICORN_MASK_NOTED = 20267
-WHITE_UNICORN_MASK = 20269
-WHITE_UNICORN_MASK_NOTED = 20270
-CABBAGE_ROUND_SHIELD = 20272
-CABBAGE_ROUND_SHIELD_NOTED = 20273
-GNOMISH_FIRELIGHTER = 20275
-GNOMISH_FIRELIGHTER_NOTED = 20276
-GNOMISH_FIRELIGHTER_20278 = 20278
-PUZZLE_BOX_MASTER = 20280
-PUZZLE_BOX_MASTER_20281 = 20281
-PUZZLE_BOX_MASTER_20282 = 20282
-LIGHT_BOX = 20355
-CLUE_GEODE_EASY = 20358
-CLUE_GEODE_MEDIUM = 20360
-CLUE_GEODE_HARD = 20362
-CLUE_GEODE_ELITE = 20364
-AMULET_OF_TORTURE_OR = 20366
-ARMADYL_GODSWORD_OR = 20368
-BANDOS_GODSWORD_OR = 20370
-SARADOMIN_GODSWORD_OR = 20372
-ZAMORAK_GODSWORD_OR = 20374
-STEEL_TRIMMED_SET_LG = 20376
-STEEL_TRIMMED_SET_LG_NOTED = 20377
-STEEL_TRIMMED_SET_SK = 20379
-STEEL_TRIMMED_SET_SK_NOTED = 20380
-STEEL_GOLDTRIMMED_SET_LG = 20382
-STEEL_GOLDTRIMMED_SET_LG_NOTED = 20383
-STEEL_GOLDTRIMMED_SET_SK = 20385
-STEEL_GOLDTRIMMED_SET_SK_NOTED = 20386
-ADAMANT_ARROW_20388 = 20388
-DRAGON_ARROW_20389 = 20389
-SHARK_20390 = 20390
-NULL_20391 = 20391
-NULL_20392 = 20392
-PRAYER_POTION4_20393 = 20393
-PRAYER_POTION3_20394 = 20394
-PRAYER_POTION2_20395 = 20395
-PRAYER_POTION1_20396 = 20396
-SPEAR = 20397
-NULL_20398 = 20398
-NULL_20399 = 20399
-NULL_20400 = 20400
-YEW_SHORTBOW_20401 = 20401
-RUNE_SCIMITAR_20402 = 20402
-MAPLE_SHORTBOW_20403 = 20403
-NULL_20404 = 20404
-ABYSSAL_WHIP_20405 = 20405
-DRAGON_SCIMITAR_20406 = 20406
-DRAGON_DAGGER_20407 = 20407
-DARK_BOW_20408 = 20408
-NULL_20409 = 20409
-NULL_20410 = 20410
-NULL_20411 = 20411
-NULL_20412 = 20412
-NULL_20413 = 20413
-NULL_20414 = 20414
-ADAMANT_PLATEBODY_20415 = 20415
-ADAMANT_PLATELEGS_20416 = 20416
-BLUE_DHIDE_BODY_20417 = 20417
-BLUE_DHIDE_CHAPS_20418 = 20418
-NULL_20419 = 20419
-NULL_20420 = 20420
-RUNE_PLATEBODY_20421 = 20421
-RUNE_PLATELEGS_20422 = 20422
-BLACK_DHIDE_BODY_20423 = 20423
-BLACK_DHIDE_CHAPS_20424 = 20424
-MYSTIC_ROBE_TOP_20425 = 20425
-MYSTIC_ROBE_BOTTOM_20426 = 20426
-NULL_20427 = 20427
-DRAGON_CHAINBODY_20428 = 20428
-DRAGON_PLATELEGS_20429 = 20429
-ANCIENT_MAGICKS_TABLET = 20430
-ANCIENT_STAFF_20431 = 20431
-EVIL_CHICKEN_FEET = 20433
-EVIL_CHICKEN_FEET_NOTED = 20434
-EVIL_CHICKEN_WINGS = 20436
-EVIL_CHICKEN_WINGS_NOTED = 20437
-EVIL_CHICKEN_HEAD = 20439
-EVIL_CHICKEN_HEAD_NOTED = 20440
-EVIL_CHICKEN_LEGS = 20442
-EVIL_CHICKEN_LEGS_NOTED = 20443
-FIRE_CAPE_BROKEN = 20445
-FIRE_MAX_CAPE_BROKEN = 20447
-BRONZE_DEFENDER_BROKEN = 20449
-IRON_DEFENDER_BROKEN = 20451
-STEEL_DEFENDER_BROKEN = 20453
-BLACK_DEFENDER_BROKEN = 20455
-MITHRIL_DEFENDER_BROKEN = 20457
-ADAMANT_DEFENDER_BROKEN = 20459
-RUNE_DEFENDER_BROKEN = 20461
-DRAGON_DEFENDER_BROKEN = 20463
-VOID_KNIGHT_TOP_BROKEN = 20465
-ELITE_VOID_TOP_BROKEN = 20467
-VOID_KNIGHT_ROBE_BROKEN = 20469
-ELITE_VOID_ROBE_BROKEN = 20471
-VOID_KNIGHT_MACE_BROKEN = 20473
-VOID_KNIGHT_GLOVES_BROKEN = 20475
-VOID_MAGE_HELM_BROKEN = 20477
-VOID_RANGER_HELM_BROKEN = 20479
-VOID_MELEE_HELM_BROKEN = 20481
-DECORATIVE_SWORD_BROKEN = 20483
-DECORATIVE_ARMOUR_BROKEN = 20485
-DECORATIVE_ARMOUR_BROKEN_20487 = 20487
-DECORATIVE_HELM_BROKEN = 20489
-DECORATIVE_SHIELD_BROKEN = 20491
-DECORATIVE_ARMOUR_BROKEN_20493 = 20493
-DECORATIVE_ARMOUR_BROKEN_20495 = 20495
-DECORATIVE_ARMOUR_BROKEN_20497 = 20497
-DECORATIVE_ARMOUR_BROKEN_20499 = 20499
-DECORATIVE_ARMOUR_BROKEN_20501 = 20501
-DECORATIVE_ARMOUR_BROKEN_20503 = 20503
-DECORATIVE_ARMOUR_BROKEN_20505 = 20505
-FIGHTER_HAT_BROKEN = 20507
-RANGER_HAT_BROKEN = 20509
-HEALER_HAT_BROKEN = 20511
-FIGHTER_TORSO_BROKEN = 20513
-PENANCE_SKIRT_BROKEN = 20515
-ELDER_CHAOS_TOP = 20517
-ELDER_CHAOS_TOP_NOTED = 20518
-ELDER_CHAOS_ROBE = 20520
-ELDER_CHAOS_ROBE_NOTED = 20521
-CATALYTIC_RUNE_PACK = 20523
-ELEMENTAL_RUNE_PACK = 20524
-ADAMANT_ARROW_PACK = 20525
-BLOODY_KEY = 20526
-SURVIVAL_TOKEN = 20527
-SURVIVAL_TOKEN_20528 = 20528
-SURVIVAL_TOKEN_20529 = 20529
-SURVIVAL_TOKEN_20530 = 20530
-SURVIVAL_TOKEN_20531 = 20531
-STASH_UNITS_EASY = 20532
-STASH_UNITS_MEDIUM = 20533
-STASH_UNITS_HARD = 20534
-STASH_UNITS_ELITE = 20535
-STASH_UNITS_MASTER = 20536
-SARADOMIN_HALO_BROKEN = 20537
-ZAMORAK_HALO_BROKEN = 20539
-GUTHIX_HALO_BROKEN = 20541
-REWARD_CASKET_ELITE = 20543
-REWARD_CASKET_HARD = 20544
-REWARD_CASKET_MEDIUM = 20545
-REWARD_CASKET_EASY = 20546
-MONKFISH_20547 = 20547
-SUPER_ENERGY4_20548 = 20548
-SUPER_ENERGY3_20549 = 20549
-SUPER_ENERGY2_20550 = 20550
-SUPER_ENERGY1_20551 = 20551
-RUNE_BATTLEAXE_20552 = 20552
-BEGINNER_WAND_20553 = 20553
-TOKTZXILAK_20554 = 20554
-RUNE_2H_SWORD_20555 = 20555
-APPRENTICE_WAND_20556 = 20556
-GRANITE_MAUL_20557 = 20557
-MAGIC_SHORTBOW_20558 = 20558
-DRAGON_2H_SWORD_20559 = 20559
-MASTER_WAND_20560 = 20560
-ADAMANT_FULL_HELM_20561 = 20561
-MYSTIC_HAT_20562 = 20562
-PROSELYTE_SALLET_20563 = 20563
-PROSELYTE_HAUBERK_20564 = 20564
-PROSELYTE_CUISSE_20565 = 20565
-RED_DHIDE_BODY_20566 = 20566
-RED_DHIDE_CHAPS_20567 = 20567
-SPLITBARK_HELM_20568 = 20568
-NULL_20569 = 20569
-NULL_20570 = 20570
-WARRIOR_HELM_20571 = 20571
-ARCHER_HELM_20572 = 20572
-FARSEER_HELM_20573 = 20573
-INFINITY_TOP_20574 = 20574
-INFINITY_BOTTOMS_20575 = 20575
-_3RD_AGE_ROBE_TOP_20576 = 20576
-_3RD_AGE_ROBE_20577 = 20577
-CLIMBING_BOOTS_20578 = 20578
-MYSTIC_BOOTS_20579 = 20579
-SNAKESKIN_BOOTS_20580 = 20580
-MITHRIL_GLOVES_20581 = 20581
-ADAMANT_GLOVES_20582 = 20582
-RUNE_GLOVES_20583 = 20583
-AMULET_OF_ACCURACY_20584 = 20584
-AMULET_OF_POWER_20585 = 20585
-AMULET_OF_GLORY_20586 = 20586
-ROPE_20587 = 20587
-ROPE_NOTED_20588 = 20588
-STALE_BAGUETTE = 20590
-STALE_BAGUETTE_NOTED = 20591
-ARMADYL_GODSWORD_20593 = 20593
-BANK_FILLER = 20594
-ELDER_CHAOS_HOOD = 20595
-ELDER_CHAOS_HOOD_NOTED = 20596
-AHRIMS_ROBETOP_20598 = 20598
-AHRIMS_ROBESKIRT_20599 = 20599
-RUNE_ARROW_20600 = 20600
-WOODEN_TABLE = 20601
-WAXWOOD_BED = 20602
-CARPET = 20603
-WOODEN_STOOL = 20604
-WOODEN_CHAIR_20605 = 20605
-RUNE_ARROW_PACK = 20607
-BLOODIER_KEY = 20608
-FAIRY_ENCHANTMENT = 20609
-ANCIENT_SIGNET = 20611
-LUNAR_SIGNET = 20613
-ARCEUUS_SIGNET = 20615
-ANCIENT_ALTAR = 20617
-LUNAR_ALTAR = 20618
-DARK_ALTAR = 20619
-OCCULT_ALTAR = 20620
-OCCULT_ALTAR_20621 = 20621
-OCCULT_ALTAR_20622 = 20622
-MAHOGANY_ADVENTURE_LOG = 20623
-GILDED_ADVENTURE_LOG = 20624
-MARBLE_ADVENTURE_LOG = 20625
-BASIC_JEWELLERY_BOX = 20626
-FANCY_JEWELLERY_BOX = 20627
-ORNATE_JEWELLERY_BOX = 20628
-BOSS_LAIR_DISPLAY = 20629
-MOUNTED_EMBLEM = 20630
-MOUNTED_COINS = 20631
-CAPE_HANGER = 20632
-QUEST_LIST = 20633
-TIP_JAR = 20634
-SPIRIT_TREE_20635 = 20635
-FAIRY_RING = 20636
-SPIRIT_TREE__FAIRY_RING = 20637
-TOPIARY_BUSH = 20638
-RESTORATION_POOL = 20639
-REVITALISATION_POOL = 20640
-REJUVENATION_POOL = 20641
-FANCY_REJUVENATION_POOL = 20642
-ORNATE_REJUVENATION_POOL = 20643
-ZEN_THEME = 20644
-OTHERWORLDLY_THEME = 20645
-VOLCANIC_THEME = 20646
-REDWOOD_FENCE = 20647
-OBSIDIAN_FENCE = 20648
-TEAK_GARDEN_BENCH = 20649
-GNOME_BENCH = 20650
-MARBLE_DECORATIVE_BENCH = 20651
-OBSIDIAN_DECORATIVE_BENCH = 20652
-SUPERIOR_GARDEN = 20653
-ACHIEVEMENT_GALLERY = 20654
-RING_OF_SUFFERING_R = 20655
-RING_OF_SUFFERING_RI = 20657
-GIANT_SQUIRREL = 20659
-TANGLEROOT = 20661
-ROCKY = 20663
-RIFT_GUARDIAN = 20665
-RIFT_GUARDIAN_20667 = 20667
-RIFT_GUARDIAN_20669 = 20669
-RIFT_GUARDIAN_20671 = 20671
-RIFT_GUARDIAN_20673 = 20673
-RIFT_GUARDIAN_20675 = 20675
-RIFT_GUARDIAN_20677 = 20677
-RIFT_GUARDIAN_20679 = 20679
-RIFT_GUARDIAN_20681 = 20681
-RIFT_GUARDIAN_20683 = 20683
-RIFT_GUARDIAN_20685 = 20685
-RIFT_GUARDIAN_20687 = 20687
-RIFT_GUARDIAN_20689 = 20689
-RIFT_GUARDIAN_20691 = 20691
-PHOENIX = 20693
-BRUMA_ROOT = 20695
-BRUMA_KINDLING = 20696
-REJUVENATION_POTION_UNF = 20697
-BRUMA_HERB = 20698
-REJUVENATION_POTION_4 = 20699
-REJUVENATION_POTION_3 = 20700
-REJUVENATION_POTION_2 = 20701
-REJUVENATION_POTION_1 = 20702
-SUPPLY_CRATE = 20703
-PYROMANCER_GARB = 20704
-PYROMANCER_ROBE = 20706
-PYROMANCER_HOOD = 20708
-PYROMANCER_BOOTS = 20710
-WARM_GLOVES = 20712
-TOME_OF_FIRE = 20714
-TOME_OF_FIRE_EMPTY = 20716
-TOME_OF_FIRE_EMPTY_NOTED = 20717
-BURNT_PAGE = 20718
-BRUMA_TORCH = 20720
-EMERALD_LANTERN_20722 = 20722
-IMBUED_HEART = 20724
-IMBUED_HEART_NOTED = 20725
-LEAFBLADED_BATTLEAXE = 20727
-LEAFBLADED_BATTLEAXE_NOTED = 20728
-MIST_BATTLESTAFF = 20730
-MIST_BATTLESTAFF_NOTED = 20731
-MYSTIC_MIST_STAFF = 20733
-MYSTIC_MIST_STAFF_NOTED = 20734
-DUST_BATTLESTAFF = 20736
-DUST_BATTLESTAFF_NOTED = 20737
-MYSTIC_DUST_STAFF = 20739
-MYSTIC_DUST_STAFF_NOTED = 20740
-EMPTY_JUG_PACK = 20742
-EMPTY_JUG_PACK_NOTED = 20743
-COMBAT_DUMMY = 20745
-UNDEAD_COMBAT_DUMMY = 20746
-BOLOGAS_BLESSING = 20747
-ZAMORAKS_GRAPES = 20749
-ZAMORAKS_GRAPES_NOTED = 20750
-ZAMORAKS_UNFERMENTED_WINE = 20752
-GIANT_KEY = 20754
-HILL_GIANT_CLUB = 20756
-HILL_GIANT_CLUB_NOTED = 20757
-ARDOUGNE_MAX_CAPE = 20760
-NULL_20762 = 20762
-NULL_20763 = 20763
-ARDOUGNE_MAX_HOOD = 20764
-MANOR_KEY = 20766
-RUBY_KEY = 20767
-EMERALD_KEY = 20768
-SAPPHIRE_KEY = 20769
-NOTES = 20770
-NOTES_20771 = 20771
-NOTES_20772 = 20772
-BANSHEE_MASK = 20773
-BANSHEE_TOP = 20775
-BANSHEE_ROBE = 20777
-HUNTING_KNIFE = 20779
-KILLERS_KNIFE = 20781
-BANDOS_GODSWORD_20782 = 20782
-BIRD_NEST_NOTED = 20783
-DRAGON_CLAWS_20784 = 20784
-DRAGON_WARHAMMER_20785 = 20785
-RING_OF_WEALTH_I5 = 20786
-RING_OF_WEALTH_I4 = 20787
-RING_OF_WEALTH_I3 = 20788
-RING_OF_WEALTH_I2 = 20789
-RING_OF_WEALTH_I1 = 20790
-EXTRA_SUPPLY_CRATE = 20791
-HARDCORE_IRONMAN_HELM = 20792
-HARDCORE_IRONMAN_PLATEBODY = 20794
-HARDCORE_IRONMAN_PLATELEGS = 20796
-SMELLY_JOURNAL = 20798
-KINDLING_20799 = 20799
-EMPTY_GOURD_VIAL = 20800
-WATERFILLED_GOURD_VIAL = 20801
-HEALER_ICON_20802 = 20802
-NULL_20803 = 20803
-NULL_20804 = 20804
-NULL_20805 = 20805
-NULL_20806 = 20806
-NULL_20807 = 20807
-NULL_20808 = 20808
-NULL_20809 = 20809
-NULL_20810 = 20810
-NULL_20811 = 20811
-NULL_20812 = 20812
-NULL_20813 = 20813
-NULL_20814 = 20814
-NULL_20815 = 20815
-NULL_20816 = 20816
-NULL_20817 = 20817
-NULL_20818 = 20818
-NULL_20819 = 20819
-NULL_20820 = 20820
-NULL_20821 = 20821
-NULL_20822 = 20822
-NULL_20823 = 20823
-NULL_20824 = 20824
-NULL_20825 = 20825
-NULL_20826 = 20826
-NULL_20827 = 20827
-NULL_20828 = 20828
-NULL_20829 = 20829
-NULL_20830 = 20830
-NULL_20831 = 20831
-SNOW_GLOBE = 20832
-SACK_OF_PRESENTS = 20834
-GIANT_PRESENT = 20836
-CORRUPTED_HELM = 20838
-CORRUPTED_PLATEBODY = 20840
-CORRUPTED_PLATELEGS = 20842
-CORRUPTED_PLATESKIRT = 20844
-CORRUPTED_KITESHIELD = 20846
-DRAGON_CLAWS_NOTED = 20848
-DRAGON_THROWNAXE = 20849
-OLMLET = 20851
-CAVE_WORMS = 20853
-BURNT_FISH_20854 = 20854
-RAW_PYSK_FISH_0 = 20855
-PYSK_FISH_0 = 20856
-RAW_SUPHI_FISH_1 = 20857
-SUPHI_FISH_1 = 20858
-RAW_LECKISH_FISH_2 = 20859
-LECKISH_FISH_2 = 20860
-RAW_BRAWK_FISH_3 = 20861
-BRAWK_FISH_3 = 20862
-RAW_MYCIL_FISH_4 = 20863
-MYCIL_FISH_4 = 20864
-RAW_ROQED_FISH_5 = 20865
-ROQED_FISH_5 = 20866
-RAW_KYREN_FISH_6 = 20867
-KYREN_FISH_6 = 20868
-BURNT_BAT = 20869
-RAW_GUANIC_BAT_0 = 20870
-GUANIC_BAT_0 = 20871
-RAW_PRAEL_BAT_1 = 20872
-PRAEL_BAT_1 = 20873
-RAW_GIRAL_BAT_2 = 20874
-GIRAL_BAT_2 = 20875
-RAW_PHLUXIA_BAT_3 = 20876
-PHLUXIA_BAT_3 = 20877
-RAW_KRYKET_BAT_4 = 20878
-KRYKET_BAT_4 = 20879
-RAW_MURNG_BAT_5 = 20880
-MURNG_BAT_5 = 20881
-RAW_PSYKK_BAT_6 = 20882
-PSYKK_BAT_6 = 20883
-KEYSTONE_CRYSTAL = 20884
-CAVERN_GRUBS = 20885
-CREATURE_KEEPERS_JOURNAL = 20886
-NISTIRIOS_MANIFESTO = 20888
-TEKTONS_JOURNAL = 20890
-MEDIVAEMIA_BLOSSOM = 20892
-TRANSDIMENSIONAL_NOTES = 20893
-VANGUARD_JUDGEMENT = 20895
-HOUNDMASTERS_DIARY = 20897
-DARK_JOURNAL = 20899
-GRIMY_NOXIFER = 20901
-NOXIFER = 20902
-NOXIFER_SEED_20903 = 20903
-GRIMY_GOLPAR = 20904
-GOLPAR = 20905
-GOLPAR_SEED_20906 = 20906
-GRIMY_BUCHU_LEAF = 20907
-BUCHU_LEAF = 20908
-BUCHU_SEED_20909 = 20909
-STINKHORN_MUSHROOM = 20910
-ENDARKENED_JUICE = 20911
-CICELY = 20912
-ELDER_1 = 20913
-ELDER_2 = 20914
-ELDER_3 = 20915
-ELDER_4 = 20916
-ELDER_POTION_1 = 20917
-ELDER_POTION_2 = 20918
-ELDER_POTION_3 = 20919
-ELDER_POTION_4 = 20920
-ELDER_1_20921 = 20921
-ELDER_2_20922 = 20922
-ELDER_3_20923 = 20923
-ELDER_4_20924 = 20924
-TWISTED_1 = 20925
-TWISTED_2 = 20926
-TWISTED_3 = 20927
-TWISTED_4 = 20928
-TWISTED_POTION_1 = 20929
-TWISTED_POTION_2 = 20930
-TWISTED_POTION_3 = 20931
-TWISTED_POTION_4 = 20932
-TWISTED_1_20933 = 20933
-TWISTED_2_20934 = 20934
-TWISTED_3_20935 = 20935
-TWISTED_4_20936 = 20936
-KODAI_1 = 20937
-KODAI_2 = 20938
-KODAI_3 = 20939
-KODAI_4 = 20940
-KODAI_POTION_1 = 20941
-KODAI_POTION_2 = 20942
-KODAI_POTION_3 = 20943
-KODAI_POTION_4 = 20944
-KODAI_1_20945 = 20945
-KODAI_2_20946 = 20946
-KODAI_3_20947 = 20947
-KODAI_4_20948 = 20948
-REVITALISATION_1 = 20949
-REVITALISATION_2 = 20950
-REVITALISATION_3 = 20951
-REVITALISATION_4 = 20952
-REVITALISATION_POTION_1 = 20953
-REVITALISATION_POTION_2 = 20954
-REVITALISATION_POTION_3 = 20955
-REVITALISATION_POTION_4 = 20956
-REVITALISATION_1_20957 = 20957
-REVITALISATION_2_20958 = 20958
-REVITALISATION_3_20959 = 20959
-REVITALISATION_4_20960 = 20960
-PRAYER_ENHANCE_1 = 20961
-PRAYER_ENHANCE_2 = 20962
-PRAYER_ENHANCE_3 = 20963
-PRAYER_ENHANCE_4 = 20964
-PRAYER_ENHANCE_1_20965 = 20965
-PRAYER_ENHANCE_2_20966 = 20966
-PRAYER_ENHANCE_3_20967 = 20967
-PRAYER_ENHANCE_4_20968 = 20968
-PRAYER_ENHANCE_1_20969 = 20969
-PRAYER_ENHANCE_2_20970 = 20970
-PRAYER_ENHANCE_3_20971 = 20971
-PRAYER_ENHANCE_4_20972 = 20972
-XERICS_AID_1 = 20973
-XERICS_AID_2 = 20974
-XERICS_AID_3 = 20975
-XERICS_AID_4 = 20976
-XERICS_AID_1_20977 = 20977
-XERICS_AID_2_20978 = 20978
-XERICS_AID_3_20979 = 20979
-XERICS_AID_4_20980 = 20980
-XERICS_AID_1_20981 = 20981
-XERICS_AID_2_20982 = 20982
-XERICS_AID_3_20983 = 20983
-XERICS_AID_4_20984 = 20984
-OVERLOAD_1_20985 = 20985
-OVERLOAD_2_20986 = 20986
-OVERLOAD_3_20987 = 20987
-OVERLOAD_4_20988 = 20988
-OVERLOAD_1_20989 = 20989
-OVERLOAD_2_20990 = 20990
-OVERLOAD_3_20991 = 20991
-OVERLOAD_4_20992 = 20992
-OVERLOAD_1_20993 = 20993
-OVERLOAD_2_20994 = 20994
-OVERLOAD_3_20995 = 20995
-OVERLOAD_4_20996 = 20996
-TWISTED_BOW = 20997
-TWISTED_BOW_NOTED = 20998
-TWISTED_BUCKLER = 21000
-TWISTED_BUCKLER_NOTED = 21001
-ELDER_MAUL = 21003
-ELDER_MAUL_NOTED = 21004
-KODAI_WAND = 21006
-KODAI_WAND_NOTED = 21007
-DRAGON_SWORD = 21009
-DRAGON_SWORD_NOTED = 21010
-DRAGON_HUNTER_CROSSBOW = 21012
-DRAGON_HUNTER_CROSSBOW_NOTED = 21013
-DINHS_BULWARK = 21015
-DINHS_BULWARK_NOTED = 21016
-ANCESTRAL_HAT = 21018
-ANCESTRAL_HAT_NOTED = 21019
-ANCESTRAL_ROBE_TOP = 21021
-ANCESTRAL_ROBE_TOP_NOTED = 21022
-ANCESTRAL_ROBE_BOTTOM = 21024
-ANCESTRAL_ROBE_BOTTOM_NOTED = 21025
-DARK_RELIC = 21027
-DRAGON_HARPOON = 21028
-DRAGON_HARPOON_NOTED = 21029
-INFERNAL_HARPOON = 21031
-INFERNAL_HARPOON_UNCHARGED = 21033
-DEXTEROUS_PRAYER_SCROLL = 21034
-DEXTEROUS_PRAYER_SCROLL_NOTED = 21035
-MALLIGNUM_ROOT_PLANK = 21036
-SMALL_STORAGE_UNIT = 21037
-MEDIUM_STORAGE_UNIT = 21038
-LARGE_STORAGE_UNIT = 21039
-MEDIUM_STORAGE_UNIT_21040 = 21040
-LARGE_STORAGE_UNIT_21041 = 21041
-LARGE_STORAGE_UNIT_21042 = 21042
-KODAI_INSIGNIA = 21043
-KODAI_INSIGNIA_NOTED = 21044
-ANCIENT_TABLET = 21046
-TORN_PRAYER_SCROLL = 21047
-TORN_PRAYER_SCROLL_NOTED = 21048
-ANCESTRAL_ROBES_SET = 21049
-ANCESTRAL_ROBES_SET_NOTED = 21050
-MANOR_KEY_21052 = 21052
-RUBY_KEY_21053 = 21053
-EMERALD_KEY_21054 = 21054
-SAPPHIRE_KEY_21055 = 21055
-NOTES_21056 = 21056
-NOTES_21057 = 21057
-NOTES_21058 = 21058
-KILLERS_KNIFE_21059 = 21059
-BANDOS_GODSWORD_21060 = 21060
-GRACEFUL_HOOD_21061 = 21061
-GRACEFUL_HOOD_21063 = 21063
-GRACEFUL_CAPE_21064 = 21064
-GRACEFUL_CAPE_21066 = 21066
-GRACEFUL_TOP_21067 = 21067
-GRACEFUL_TOP_21069 = 21069
-GRACEFUL_LEGS_21070 = 21070
-GRACEFUL_LEGS_21072 = 21072
-GRACEFUL_GLOVES_21073 = 21073
-GRACEFUL_GLOVES_21075 = 21075
-GRACEFUL_BOOTS_21076 = 21076
-GRACEFUL_BOOTS_21078 = 21078
-ARCANE_PRAYER_SCROLL = 21079
-ARCANE_PRAYER_SCROLL_NOTED = 21080
-OPAL_RING = 21081
-OPAL_RING_NOTED = 21082
-JADE_RING = 21084
-JADE_RING_NOTED = 21085
-TOPAZ_RING = 21087
-TOPAZ_RING_NOTED = 21088
-OPAL_NECKLACE = 21090
-OPAL_NECKLACE_NOTED = 21091
-JADE_NECKLACE = 21093
-JADE_NECKLACE_NOTED = 21094
-TOPAZ_NECKLACE = 21096
-TOPAZ_NECKLACE_NOTED = 21097
-OPAL_AMULET_U = 21099
-OPAL_AMULET_U_NOTED = 21100
-JADE_AMULET_U = 21102
-JADE_AMULET_U_NOTED = 21103
-TOPAZ_AMULET_U = 21105
-TOPAZ_AMULET_U_NOTED = 21106
-OPAL_AMULET = 21108
-OPAL_AMULET_NOTED = 21109
-JADE_AMULET = 21111
-JADE_AMULET_NOTED = 21112
-TOPAZ_AMULET = 21114
-TOPAZ_AMULET_NOTED = 21115
-OPAL_BRACELET = 21117
-OPAL_BRACELET_NOTED = 21118
-JADE_BRACELET = 21120
-JADE_BRACELET_NOTED = 21121
-TOPAZ_BRACELET = 21123
-TOPAZ_BRACELET_NOTED = 21124
-RING_OF_PURSUIT = 21126
-RING_OF_PURSUIT_NOTED = 21127
-RING_OF_RETURNING5 = 21129
-RING_OF_RETURNING5_NOTED = 21130
-RING_OF_RETURNING4 = 21132
-RING_OF_RETURNING4_NOTED = 21133
-RING_OF_RETURNING3 = 21134
-RING_OF_RETURNING3_NOTED = 21135
-RING_OF_RETURNING2 = 21136
-RING_OF_RETURNING2_NOTED = 21137
-RING_OF_RETURNING1 = 21138
-RING_OF_RETURNING1_NOTED = 21139
-EFARITAYS_AID = 21140
-EFARITAYS_AID_NOTED = 21141
-DODGY_NECKLACE = 21143
-DODGY_NECKLACE_NOTED = 21144
-NECKLACE_OF_PASSAGE5 = 21146
-NECKLACE_OF_PASSAGE5_NOTED = 21147
-NECKLACE_OF_PASSAGE4 = 21149
-NECKLACE_OF_PASSAGE4_NOTED = 21150
-NECKLACE_OF_PASSAGE3 = 21151
-NECKLACE_OF_PASSAGE3_NOTED = 21152
-NECKLACE_OF_PASSAGE2 = 21153
-NECKLACE_OF_PASSAGE2_NOTED = 21154
-NECKLACE_OF_PASSAGE1 = 21155
-NECKLACE_OF_PASSAGE1_NOTED = 21156
-NECKLACE_OF_FAITH = 21157
-NECKLACE_OF_FAITH_NOTED = 21158
-AMULET_OF_BOUNTY = 21160
-AMULET_OF_BOUNTY_NOTED = 21161
-AMULET_OF_CHEMISTRY = 21163
-AMULET_OF_CHEMISTRY_NOTED = 21164
-BURNING_AMULET5 = 21166
-BURNING_AMULET5_NOTED = 21167
-BURNING_AMULET4 = 21169
-BURNING_AMULET4_NOTED = 21170
-BURNING_AMULET3 = 21171
-BURNING_AMULET3_NOTED = 21172
-BURNING_AMULET2 = 21173
-BURNING_AMULET2_NOTED = 21174
-BURNING_AMULET1 = 21175
-BURNING_AMULET1_NOTED = 21176
-EXPEDITIOUS_BRACELET = 21177
-EXPEDITIOUS_BRACELET_NOTED = 21178
-FLAMTAER_BRACELET = 21180
-FLAMTAER_BRACELET_NOTED = 21181
-BRACELET_OF_SLAUGHTER = 21183
-BRACELET_OF_SLAUGHTER_NOTED = 21184
-FIRE_MAX_CAPE_21186 = 21186
-ROCK_GOLEM_21187 = 21187
-ROCK_GOLEM_21188 = 21188
-ROCK_GOLEM_21189 = 21189
-ROCK_GOLEM_21190 = 21190
-ROCK_GOLEM_21191 = 21191
-ROCK_GOLEM_21192 = 21192
-ROCK_GOLEM_21193 = 21193
-ROCK_GOLEM_21194 = 21194
-ROCK_GOLEM_21195 = 21195
-ROCK_GOLEM_21196 = 21196
-ROCK_GOLEM_21197 = 21197
-LAVA_BATTLESTAFF_21198 = 21198
-MYSTIC_LAVA_STAFF_21200 = 21200
-LAVA_STAFF_UPGRADE_KIT = 21202
-LAVA_STAFF_UPGRADE_KIT_NOTED = 21203
-ELDER_MAUL_21205 = 21205
-DRAGON_SWORD_21206 = 21206
-DRAGON_THROWNAXE_21207 = 21207
-INVITATION_LIST = 21208
-BIRTHDAY_BALLOONS = 21209
-_4TH_BIRTHDAY_HAT = 21211
-SERVANTS_MONEYBAG = 21213
-EASTER_EGG_HELM = 21214
-FRUITY_EASTER_EGG = 21216
-FRESH_EASTER_EGG = 21217
-BITTER_EASTER_EGG = 21218
-EARTHY_EASTER_EGG = 21219
-SPICY_EASTER_EGG = 21220
-MEATY_EASTER_EGG = 21221
-SALTED_EASTER_EGG = 21222
-RICH_EASTER_EGG = 21223
-FLUFFY_EASTER_EGG = 21224
-SMOKED_EASTER_EGG = 21225
-FISHY_EASTER_EGG = 21226
-CRUNCHY_EASTER_EGG = 21227
-FRUITY_CHOCOLATE_MIX = 21228
-FRESH_CHOCOLATE_MIX = 21229
-BITTER_CHOCOLATE_MIX = 21230
-EARTHY_CHOCOLATE_MIX = 21231
-SPICY_CHOCOLATE_MIX = 21232
-MEATY_CHOCOLATE_MIX = 21233
-SALTED_CHOCOLATE_MIX = 21234
-RICH_CHOCOLATE_MIX = 21235
-FLUFFY_CHOCOLATE_MIX = 21236
-SMOKED_CHOCOLATE_MIX = 21237
-FISHY_CHOCOLATE_MIX = 21238
-CRUNCHY_CHOCOLATE_MIX = 21239
-WESTER_BANANA = 21240
-WESTER_PAPAYA = 21241
-WESTER_LEMON = 21242
-BUCKET_OF_WESTER_SAND = 21243
-WESTER_SPICES = 21244
-BEEF_FILLET = 21245
-SEA_SALT = 21246
-GOLD_FRAGMENT = 21247
-FLUFFY_FEATHERS = 21248
-WESTER_FISH = 21249
-ROCK_21250 = 21250
-WESTER_CHOCOLATE = 21251
-EGG_MOULD = 21252
-FARMERS_STRAWHAT_21253 = 21253
-FARMERS_STRAWHAT_21254 = 21254
-SLAYERS_STAFF_E = 21255
-SLAYERS_ENCHANTMENT = 21257
-ENCHANTED_SCROLL = 21259
-ENCHANTED_QUILL = 21260
-MYSTERIOUS_ORB = 21261
-ANTIQUE_LAMP_21262 = 21262
-COPPERS_CRIMSON_COLLAR = 21263
-PURPLE_SLAYER_HELMET = 21264
-PURPLE_SLAYER_HELMET_I = 21266
-SLAYER_RING_ETERNAL = 21268
-ETERNAL_GEM = 21270
-ETERNAL_GEM_NOTED = 21271
-SKOTOS = 21273
-DARK_CLAW = 21275
-SKULL_SCEPTRE_I = 21276
-TZHAARHUR = 21278
-OBSIDIAN_ARMOUR_SET = 21279
-OBSIDIAN_ARMOUR_SET_NOTED = 21280
-INFERNAL_MAX_HOOD = 21282
-INFERNAL_MAX_CAPE = 21284
-INFERNAL_MAX_CAPE_21285 = 21285
-INFERNAL_CAPE_BROKEN = 21287
-INFERNAL_MAX_CAPE_BROKEN = 21289
-JALNIBREK = 21291
-INFERNAL_EEL = 21293
-INFERNAL_CAPE = 21295
-INFERNAL_CAPE_21297 = 21297
-OBSIDIAN_HELMET = 21298
-OBSIDIAN_HELMET_NOTED = 21299
-OBSIDIAN_PLATEBODY = 21301
-OBSIDIAN_PLATEBODY_NOTED = 21302
-OBSIDIAN_PLATELEGS = 21304
-OBSIDIAN_PLATELEGS_NOTED = 21305
-ROGUES_EQUIPMENT_CRATE = 21307
-RED_RAINBOW_STRAND = 21308
-ORANGE_RAINBOW_STRAND = 21309
-YELLOW_RAINBOW_STRAND = 21310
-GREEN_RAINBOW_STRAND = 21311
-BLUE_RAINBOW_STRAND = 21312
-PURPLE_RAINBOW_STRAND = 21313
-RAINBOW_SCARF = 21314
-AMETHYST_BROAD_BOLTS_21316 = 21316
-AMETHYST_JAVELIN = 21318
-AMETHYST_JAVELINP = 21320
-AMETHYST_JAVELINP_21322 = 21322
-AMETHYST_JAVELINP_21324 = 21324
-AMETHYST_ARROW_21326 = 21326
-AMETHYST_FIRE_ARROW = 21328
-AMETHYST_FIRE_ARROW_LIT = 21330
-AMETHYST_ARROWP_21332 = 21332
-AMETHYST_ARROWP_21334 = 21334
-AMETHYST_ARROWP_21336 = 21336
-AMETHYST_BOLT_TIPS_21338 = 21338
-ROCK_GOLEM_21340 = 21340
-UNIDENTIFIED_MINERALS = 21341
-MINING_GLOVES = 21343
-SUPERIOR_MINING_GLOVES = 21345
-AMETHYST = 21347
-AMETHYST_NOTED = 21348
-AMETHYST_ARROWTIPS = 21350
-AMETHYST_JAVELIN_HEADS_21352 = 21352
-HAND_FAN = 21354
-MINNOW_21356 = 21356
-ROCK_GOLEM_21358 = 21358
-ROCK_GOLEM_21359 = 21359
-ROCK_GOLEM_21360 = 21360
-MASTER_SCROLL_BOOK_EMPTY = 21387
-MASTER_SCROLL_BOOK_EMPTY_NOTED = 21388
-MASTER_SCROLL_BOOK = 21389
-BRUTAL_BLACK_DRAGON = 21391
-EXPERT_MINING_GLOVES = 21392
-KARAMBWANJI = 21394
-CLAN_WARS_CAPE_21396 = 21396
-CLAN_WARS_CAPE_21397 = 21397
-CLAN_WARS_CAPE_21398 = 21398
-CLAN_WARS_CAPE_21399 = 21399
-CLAN_WARS_CAPE_21400 = 21400
-CLAN_WARS_CAPE_21401 = 21401
-CLAN_WARS_CAPE_21402 = 21402
-CLAN_WARS_CAPE_21403 = 21403
-CLAN_WARS_CAPE_21404 = 21404
-CLAN_WARS_CAPE_21405 = 21405
-CLAN_WARS_CAPE_21406 = 21406
-CLAN_WARS_CAPE_21407 = 21407
-CLAN_WARS_CAPE_21408 = 21408
-CLAN_WARS_CAPE_21409 = 21409
-CLAN_WARS_CAPE_21410 = 21410
-CLAN_WARS_CAPE_21411 = 21411
-CLAN_WARS_CAPE_21412 = 21412
-CLAN_WARS_CAPE_21413 = 21413
-CLAN_WARS_CAPE_21414 = 21414
-CLAN_WARS_CAPE_21415 = 21415
-CLAN_WARS_CAPE_21416 = 21416
-CLAN_WARS_CAPE_21417 = 21417
-CLAN_WARS_CAPE_21418 = 21418
-CLAN_WARS_CAPE_21419 = 21419
-CLAN_WARS_CAPE_21420 = 21420
-CLAN_WARS_CAPE_21421 = 21421
-CLAN_WARS_CAPE_21422 = 21422
-CLAN_WARS_CAPE_21423 = 21423
-CLAN_WARS_CAPE_21424 = 21424
-CLAN_WARS_CAPE_21425 = 21425
-CLAN_WARS_CAPE_21426 = 21426
-CLAN_WARS_CAPE_21427 = 21427
-WILDERNESS_CAPE = 21428
-WILDERNESS_CAPE_21429 = 21429
-WILDERNESS_CAPE_21430 = 21430
-WILDERNESS_CAPE_21431 = 21431
-WILDERNESS_CAPE_21432 = 21432
-WILDERNESS_CHAMPION_AMULET = 21433
-WILDERNESS_CAPE_21434 = 21434
-WILDERNESS_CAPE_21435 = 21435
-WILDERNESS_CAPE_21436 = 21436
-WILDERNESS_CAPE_21437 = 21437
-WILDERNESS_CAPE_21438 = 21438
-CHAMPIONS_CAPE = 21439
-PHARAOHS_SCEPTRE_21445 = 21445
-PHARAOHS_SCEPTRE_21446 = 21446
-TEAK_SEEDLING = 21469
-MAHOGANY_SEEDLING = 21471
-TEAK_SEEDLING_W = 21473
-MAHOGANY_SEEDLING_W = 21475
-TEAK_SAPLING = 21477
-TEAK_SAPLING_NOTED = 21478
-MAHOGANY_SAPLING = 21480
-MAHOGANY_SAPLING_NOTED = 21481
-ULTRACOMPOST = 21483
-ULTRACOMPOST_NOTED = 21484
-TEAK_SEED = 21486
-MAHOGANY_SEED = 21488
-SEAWEED_SPORE = 21490
-TEAK_SEED_21492 = 21492
-TEAK_SEED_21493 = 21493
-TEAK_SEED_21494 = 21494
-TEAK_SEED_21495 = 21495
-MAHOGANY_SEED_21496 = 21496
-MAHOGANY_SEED_21497 = 21497
-MAHOGANY_SEED_21498 = 21498
-MAHOGANY_SEED_21499 = 21499
-SEAWEED_SPORE_21500 = 21500
-SEAWEED_SPORE_21501 = 21501
-SEAWEED_SPORE_21502 = 21502
-SEAWEED_SPORE_21503 = 21503
-GIANT_SEAWEED = 21504
-GIANT_SEAWEED_NOTED = 21505
-FOSSIL_ISLAND_WYVERN = 21507
-FOSSIL_ISLAND_WYVERN_21508 = 21508
-HERBI = 21509
-HERBIBOAR = 21511
-BIRD_HOUSE = 21512
-BIRD_HOUSE_NOTED = 21513
-OAK_BIRD_HOUSE = 21515
-OAK_BIRD_HOUSE_NOTED = 21516
-WILLOW_BIRD_HOUSE = 21518
-WILLOW_BIRD_HOUSE_NOTED = 21519
-TEAK_BIRD_HOUSE = 21521
-TEAK_BIRD_HOUSE_NOTED = 21522
-CLUE_SCROLL_ELITE_21524 = 21524
-CLUE_SCROLL_ELITE_21525 = 21525
-CLUE_SCROLL_HARD_21526 = 21526
-CLUE_SCROLL_HARD_21527 = 21527
-SAWMILL_PROPOSAL = 21528
-SAWMILL_AGREEMENT = 21529
-BONE_CHARM = 21530
-POTION_OF_SEALEGS = 21531
-IRON_ORE_FRAGMENT = 21532
-SILVER_ORE_FRAGMENT = 21533
-COAL_FRAGMENT = 21534
-GOLD_ORE_FRAGMENT = 21535
-MITHRIL_ORE_FRAGMENT = 21536
-ADAMANTITE_ORE_FRAGMENT = 21537
-RUNITE_ORE_FRAGMENT = 21538
-HEATPROOF_VESSEL = 21539
-LARGE_ROCK = 21540
-VOLCANIC_MINE_TELEPORT = 21541
-CALCITE = 21543
-PYROPHOSPHITE = 21545
-SMALL_ENRICHED_BONE = 21547
-MEDIUM_ENRICHED_BONE = 21549
-LARGE_ENRICHED_BONE = 21551
-RARE_ENRICHED_BONE = 21553
-NUMULITE = 21555
-NUMULITE_21557 = 21557
-NUMULITE_21558 = 21558
-NUMULITE_21559 = 21559
-NUMULITE_21560 = 21560
-NUMULITE_21561 = 21561
-UNIDENTIFIED_SMALL_FOSSIL = 21562
-UNIDENTIFIED_MEDIUM_FOSSIL = 21564
-UNIDENTIFIED_LARGE_FOSSIL = 21566
-UNIDENTIFIED_RARE_FOSSIL = 21568
-SMALL_FOSSILISED_LIMBS = 21570
-SMALL_FOSSILISED_SPINE = 21572
-SMALL_FOSSILISED_RIBS = 21574
-SMALL_FOSSILISED_PELVIS = 21576
-SMALL_FOSSILISED_SKULL = 21578
-MEDIUM_FOSSILISED_LIMBS = 21580
-MEDIUM_FOSSILISED_SPINE = 21582
-MEDIUM_FOSSILISED_RIBS = 21584
-MEDIUM_FOSSILISED_PELVIS = 21586
-MEDIUM_FOSSILISED_SKULL = 21588
-FOSSILISED_ROOTS = 21590
-FOSSILISED_STUMP = 21592
-FOSSILISED_BRANCH = 21594
-FOSSILISED_LEAF = 21596
-FOSSILISED_MUSHROOM = 21598
-LARGE_FOSSILISED_LIMBS = 21600
-LARGE_FOSSILISED_SPINE = 21602
-LARGE_FOSSILISED_RIBS = 21604
-LARGE_FOSSILISED_PELVIS = 21606
-LARGE_FOSSILISED_SKULL = 21608
-RARE_FOSSILISED_LIMBS = 21610
-RARE_FOSSILISED_SPINE = 21612
-RARE_FOSSILISED_RIBS = 21614
-RARE_FOSSILISED_PELVIS = 21616
-RARE_FOSSILISED_SKULL = 21618
-RARE_FOSSILISED_TUSK = 21620
-VOLCANIC_ASH = 21622
-HOOP_SNAKE = 21624
-SULLIUSCEP_CAP = 21626
-SULLIUSCEP_CAP_NOTED = 21627
-ARCHAEOLOGISTS_DIARY = 21629
-ANCIENT_DIARY = 21631
-ANCIENT_WYVERN_SHIELD = 21633
-ANCIENT_WYVERN_SHIELD_21634 = 21634
-ANCIENT_WYVERN_SHIELD_NOTED = 21635
-WYVERN_VISAGE = 21637
-WYVERN_VISAGE_NOTED = 21638
-ANTIQUE_LAMP_21640 = 21640
-ANTIQUE_LAMP_21641 = 21641
-ANTIQUE_LAMP_21642 = 21642
-GRANITE_BOOTS = 21643
-GRANITE_BOOTS_NOTED = 21644
-GRANITE_LONGSWORD = 21646
-GRANITE_LONGSWORD_NOTED = 21647
-MERFOLK_TRIDENT = 21649
-MERFOLK_TRIDENT_NOTED = 21650
-DRIFT_NET = 21652
-DRIFT_NET_NOTED = 21653
-PUFFERFISH = 21655
-MERMAIDS_TEAR = 21656
-MERMAIDS_TEAR_21658 = 21658
-MERMAIDS_TEAR_21659 = 21659
-MERMAIDS_TEAR_21660 = 21660
-MERMAIDS_TEAR_21661 = 21661
-FOSSIL_ISLAND_NOTE_BOOK = 21662
-SCRIBBLED_NOTE = 21664
-PARTIAL_NOTE = 21666
-ANCIENT_NOTE = 21668
-ANCIENT_WRITINGS = 21670
-EXPERIMENTAL_NOTE = 21672
-PARAGRAPH_OF_TEXT = 21674
-MUSTY_SMELLING_NOTE = 21676
-HASTILY_SCRAWLED_NOTE = 21678
-OLD_WRITING = 21680
-SHORT_NOTE = 21682
-UNCOOKED_MUSHROOM_PIE = 21684
-UNCOOKED_MUSHROOM_PIE_NOTED = 21685
-HALF_A_MUSHROOM_PIE = 21687
-HALF_A_MUSHROOM_PIE_NOTED = 21688
-MUSHROOM_PIE = 21690
-MUSHROOM_PIE_NOTED = 21691
-BOWL_OF_FISH = 21693
-RUNEFEST_SHIELD = 21695
-ASH_COVERED_TOME = 21697
-TZHAAR_AIR_RUNE_PACK = 21698
-TZHAAR_AIR_RUNE_PACK_NOTED = 21699
-TZHAAR_WATER_RUNE_PACK = 21701
-TZHAAR_WATER_RUNE_PACK_NOTED = 21702
-TZHAAR_EARTH_RUNE_PACK = 21704
-TZHAAR_EARTH_RUNE_PACK_NOTED = 21705
-TZHAAR_FIRE_RUNE_PACK = 21707
-TZHAAR_FIRE_RUNE_PACK_NOTED = 21708
-DEATH_NOTE = 21710
-MURKY_POTION = 21711
-SPECTRAL_POTION = 21712
-TOMBERRIES = 21713
-TATTERED_BOOK = 21714
-NOTE_21715 = 21715
-CARVED_GEM = 21716
-TIME_BUBBLE = 21717
-TRAIBORN_NOTE = 21718
-JONAS_MASK = 21719
-JONAS_MASK_21720 = 21720
-DIVING_HELMET = 21722
-DIVING_APPARATUS_21723 = 21723
-BRITTLE_KEY = 21724
-GRANITE_DUST = 21726
-GRANITE_CANNONBALL = 21728
-BLACK_TOURMALINE_CORE = 21730
-BLACK_TOURMALINE_CORE_NOTED = 21731
-GUARDIAN_BOOTS = 21733
-GUARDIAN_BOOTS_NOTED = 21734
-GRANITE_GLOVES = 21736
-GRANITE_GLOVES_NOTED = 21737
-GRANITE_RING = 21739
-GRANITE_RING_NOTED = 21740
-GRANITE_HAMMER = 21742
-GRANITE_HAMMER_NOTED = 21743
-JAR_OF_STONE = 21745
-JAR_OF_STONE_NOTED = 21746
-NOON = 21748
-MIDNIGHT = 21750
-GRANITE_RING_I = 21752
-ROCK_THROWNHAMMER = 21754
-VARLAMORE_ENVOY = 21756
-ROYAL_ACCORD_OF_TWILL = 21758
-HOSIDIUS_FAVOUR_CERTIFICATE = 21759
-KHAREDSTS_MEMOIRS = 21760
-LUNCH_BY_THE_LANCALLIUMS = 21762
-THE_FISHERS_FLUTE = 21764
-HISTORY_AND_HEARSAY = 21766
-JEWELLERY_OF_JUBILATION = 21768
-A_DARK_DISPOSITION = 21770
-SECRET_PAGE = 21772
-LETTER_21774 = 21774
-PISCARILIUS_FAVOUR_CERTIFICATE = 21775
-IMBUED_SARADOMIN_MAX_CAPE = 21776
-IMBUED_SARADOMIN_MAX_HOOD = 21778
-IMBUED_ZAMORAK_MAX_CAPE = 21780
-IMBUED_ZAMORAK_MAX_HOOD = 21782
-IMBUED_GUTHIX_MAX_CAPE = 21784
-IMBUED_GUTHIX_MAX_HOOD = 21786
-OBELISK = 21788
-IMBUED_SARADOMIN_CAPE = 21791
-IMBUED_GUTHIX_CAPE = 21793
-IMBUED_ZAMORAK_CAPE = 21795
-JUSTICIARS_HAND = 21797
-ENTS_ROOTS = 21798
-DEMONS_HEART = 21799
-ENCHANTED_SYMBOL = 21800
-REVENANT_CAVE_TELEPORT = 21802
-ANCIENT_CRYSTAL = 21804
-ANCIENT_CRYSTAL_NOTED = 21805
-ANCIENT_EMBLEM = 21807
-ANCIENT_EMBLEM_NOTED = 21808
-ANCIENT_TOTEM = 21810
-ANCIENT_TOTEM_NOTED = 21811
-ANCIENT_STATUETTE = 21813
-ANCIENT_STATUETTE_NOTED = 21814
-BRACELET_OF_ETHEREUM = 21816
-BRACELET_OF_ETHEREUM_UNCHARGED = 21817
-BRACELET_OF_ETHEREUM_UNCHARGED_NOTED = 21818
-REVENANT_ETHER = 21820
-REVENANT_ETHER_21822 = 21822
-REVENANT_ETHER_21823 = 21823
-REVENANT_ETHER_21824 = 21824
-REVENANT_ETHER_21825 = 21825
-NULL_21826 = 21826
-FIELD_ARROW = 21827
-FIELD_ARROW_21828 = 21828
-NULL_21829 = 21829
-FIELD_ARROW_21830 = 21830
-BLUNT_ARROW_21831 = 21831
-NULL_21832 = 21832
-FIELD_ARROW_21833 = 21833
-BLUNT_ARROW_21834 = 21834
-OGRE_ARTEFACT_21837 = 21837
-SHAMAN_MASK = 21838
-SHAMAN_MASK_NOTED = 21839
-SNOW_IMP_COSTUME_HEAD = 21841
-SNOW_IMP_COSTUME_BODY = 21842
-SNOW_IMP_COSTUME_LEGS = 21843
-SNOW_IMP_COSTUME_TAIL = 21844
-SNOW_IMP_COSTUME_GLOVES = 21845
-SNOW_IMP_COSTUME_FEET = 21846
-SNOW_IMP_COSTUME_HEAD_21847 = 21847
-SNOW_IMP_COSTUME_BODY_21849 = 21849
-SNOW_IMP_COSTUME_LEGS_21851 = 21851
-SNOW_IMP_COSTUME_TAIL_21853 = 21853
-SNOW_IMP_COSTUME_GLOVES_21855 = 21855
-SNOW_IMP_COSTUME_FEET_21857 = 21857
-WISE_OLD_MANS_SANTA_HAT = 21859
-ENCHANTED_CURTAINS = 21861
-ENCHANTED_SNOWY_CURTAINS = 21862
-WISE_OLD_MANS_TELEPORT_TABLET = 21863
-SNOW_SPRITE = 21864
-FINE_MESH_NET = 21865
-SANTA_SUIT = 21866
-SANTA_SUIT_WET = 21867
-SANTA_SUIT_DRY = 21868
-LOGS_AND_KINDLING = 21869
-PROMISSORY_NOTE_21870 = 21870
-SANTAS_SEAL = 21871
-VAULT_KEY = 21872
-EMPTY_SACK_21873 = 21873
-BULGING_SACK = 21874
-KRISTMAS_KEBAB = 21875
-WRATH_RUNE = 21880
-DRAGON_ARMOUR_SET_LG = 21882
-DRAGON_ARMOUR_SET_LG_NOTED = 21883
-DRAGON_ARMOUR_SET_SK = 21885
-DRAGON_ARMOUR_SET_SK_NOTED = 21886
-TURQUOISE_SLAYER_HELMET = 21888
-TURQUOISE_SLAYER_HELMET_I = 21890
-DRAGON_PLATEBODY = 21892
-DRAGON_PLATEBODY_NOTED = 21893
-DRAGON_KITESHIELD = 21895
-DRAGON_KITESHIELD_NOTED = 21896
-ASSEMBLER_MAX_CAPE = 21898
-ASSEMBLER_MAX_HOOD = 21900
-DRAGON_CROSSBOW = 21902
-DRAGON_CROSSBOW_NOTED = 21903
-DRAGON_BOLTS_21905 = 21905
-VORKATHS_HEAD_21907 = 21907
-VORKATHS_STUFFED_HEAD = 21909
-RUNE_DRAGON = 21911
-VORKATHS_HEAD_21912 = 21912
-MYTHICAL_CAPE = 21913
-AVAS_ASSEMBLER_BROKEN = 21914
-ASSEMBLER_MAX_CAPE_BROKEN = 21916
-DRAGON_LIMBS = 21918
-DRAGON_LIMBS_NOTED = 21919
-DRAGON_CROSSBOW_U = 21921
-DRAGON_CROSSBOW_U_NOTED = 21922
-DRAGON_BOLTS_P_21924 = 21924
-DRAGON_BOLTS_P_21926 = 21926
-DRAGON_BOLTS_P_21928 = 21928
-DRAGON_BOLTS_UNF_21930 = 21930
-OPAL_DRAGON_BOLTS_E_21932 = 21932
-JADE_DRAGON_BOLTS_E_21934 = 21934
-PEARL_DRAGON_BOLTS_E_21936 = 21936
-TOPAZ_DRAGON_BOLTS_E_21938 = 21938
-SAPPHIRE_DRAGON_BOLTS_E_21940 = 21940
-EMERALD_DRAGON_BOLTS_E_21942 = 21942
-RUBY_DRAGON_BOLTS_E_21944 = 21944
-DIAMOND_DRAGON_BOLTS_E_21946 = 21946
-DRAGONSTONE_DRAGON_BOLTS_E_21948 = 21948
-ONYX_DRAGON_BOLTS_E_21950 = 21950
-MAGIC_STOCK = 21952
-MAGIC_STOCK_NOTED = 21953
-OPAL_DRAGON_BOLTS_21955 = 21955
-JADE_DRAGON_BOLTS_21957 = 21957
-PEARL_DRAGON_BOLTS_21959 = 21959
-TOPAZ_DRAGON_BOLTS_21961 = 21961
-SAPPHIRE_DRAGON_BOLTS_21963 = 21963
-EMERALD_DRAGON_BOLTS_21965 = 21965
-RUBY_DRAGON_BOLTS_21967 = 21967
-DIAMOND_DRAGON_BOLTS_21969 = 21969
-DRAGONSTONE_DRAGON_BOLTS_21971 = 21971
-ONYX_DRAGON_BOLTS_21973 = 21973
-CRUSHED_SUPERIOR_DRAGON_BONES = 21975
-CRUSHED_SUPERIOR_DRAGON_BONES_NOTED = 21976
-SUPER_ANTIFIRE_POTION4 = 21978
-SUPER_ANTIFIRE_POTION4_NOTED = 21979
-SUPER_ANTIFIRE_POTION3 = 21981
-SUPER_ANTIFIRE_POTION3_NOTED = 21982
-SUPER_ANTIFIRE_POTION2 = 21984
-SUPER_ANTIFIRE_POTION2_NOTED = 21985
-SUPER_ANTIFIRE_POTION1 = 21987
-SUPER_ANTIFIRE_POTION1_NOTED = 21988
-RIFT_GUARDIAN_21990 = 21990
-VORKI = 21992
-SUPER_ANTIFIRE_MIX2 = 21994
-SUPER_ANTIFIRE_MIX2_NOTED = 21995
-SUPER_ANTIFIRE_MIX1 = 21997
-SUPER_ANTIFIRE_MIX1_NOTED = 21998
-CLUE_SCROLL_ELITE_22000 = 22000
-CLUE_SCROLL_EASY_22001 = 22001
-DRAGONFIRE_WARD = 22002
-DRAGONFIRE_WARD_22003 = 22003
-DRAGONFIRE_WARD_NOTED = 22004
-SKELETAL_VISAGE = 22006
-SKELETAL_VISAGE_NOTED = 22007
-MAP_PIECE = 22009
-MAP_PIECE_22010 = 22010
-MAP_PIECE_22011 = 22011
-MAP_PIECE_22012 = 22012
-MAP_PIECE_22013 = 22013
-MAP_PIECE_22014 = 22014
-MAP_PIECE_22015 = 22015
-MAP_PIECE_22016 = 22016
-MAP_PIECE_22017 = 22017
-MAP_PIECE_22018 = 22018
-MAP_PIECE_22019 = 22019
-MAP_PIECE_22020 = 22020
-MAP_PIECE_22021 = 22021
-MAP_PIECE_22022 = 22022
-MAP_PIECE_22023 = 22023
-MAP_PIECE_22024 = 22024
-MAP_PIECE_22025 = 22025
-MAP_PIECE_22026 = 22026
-MAP_PIECE_22027 = 22027
-MAP_PIECE_22028 = 22028
-MAP_PIECE_22029 = 22029
-MAP_PIECE_22030 = 22030
-MAP_PIECE_22031 = 22031
-MAP_PIECE_22032 = 22032
-AIVAS_DIARY = 22033
-VARROCK_CENSUS_RECORDS = 22035
-MALUMACS_JOURNAL = 22037
-ABLENKIANS_ESCAPE = 22039
-IMCANDORIAS_FALL = 22041
-IMAFORES_BETRAYAL = 22043
-LUTWIDGE_AND_THE_MOONFLY = 22045
-SERAFINA = 22047
-THE_WEEPING = 22049
-OLD_NOTES = 22051
-OLD_NOTES_22053 = 22053
-OLD_NOTES_22055 = 22055
-OLD_NOTES_22057 = 22057
-OLD_NOTES_22059 = 22059
-OLD_NOTES_22061 = 22061
-OLD_NOTES_22063 = 22063
-OLD_NOTES_22065 = 22065
-OLD_NOTES_22067 = 22067
-OLD_NOTES_22069 = 22069
-OLD_NOTES_22071 = 22071
-OLD_NOTES_22073 = 22073
-OLD_NOTES_22075 = 22075
-OLD_NOTES_22077 = 22077
-INERT_LOCATOR_ORB = 22079
-LOCATOR_ORB = 22081
-ROBERT_BUST = 22083
-CAMORRA_BUST = 22084
-TRISTAN_BUST = 22085
-AIVAS_BUST = 22086
-DRAGON_KEY = 22087
-DRAGON_KEY_PIECE = 22088
-DRAGON_KEY_PIECE_22089 = 22089
-DRAGON_KEY_PIECE_22090 = 22090
-DRAGON_KEY_PIECE_22091 = 22091
-DRAGON_KEY_22092 = 22092
-ANCIENT_KEY = 22093
-WATER_CONTAINER = 22094
-SWAMP_PASTE_22095 = 22095
-REVITALISATION_POTION = 22096
-DRAGON_METAL_SHARD = 22097
-DRAGON_METAL_SHARD_NOTED = 22098
-DRAGON_METAL_SLICE = 22100
-DRAGON_METAL_SLICE_NOTED = 22101
-DRAGON_METAL_LUMP = 22103
-DRAGON_METAL_LUMP_NOTED = 22104
-JAR_OF_DECAY = 22106
-JAR_OF_DECAY_NOTED = 22107
-AVAS_ASSEMBLER = 22109
-DRAGONBONE_NECKLACE = 22111
-DRAGONBONE_NECKLACE_NOTED = 22112
-MYTHICAL_CAPE_22114 = 22114
-SUPERIOR_DRAGON_BONEMEAL = 22116
-WRATH_TALISMAN = 22118
-WRATH_TALISMAN_NOTED = 22119
-WRATH_TIARA = 22121
-WRATH_TIARA_NOTED = 22122
-SUPERIOR_DRAGON_BONES = 22124
-SUPERIOR_DRAGON_BONES_NOTED = 22125
-ADAMANT_KITESHIELD_22127 = 22127
-ADAMANT_KITESHIELD_22129 = 22129
-ADAMANT_KITESHIELD_22131 = 22131
-ADAMANT_KITESHIELD_22133 = 22133
-ADAMANT_KITESHIELD_22135 = 22135
-ADAMANT_KITESHIELD_22137 = 22137
-ADAMANT_KITESHIELD_22139 = 22139
-ADAMANT_KITESHIELD_22141 = 22141
-ADAMANT_KITESHIELD_22143 = 22143
-ADAMANT_KITESHIELD_22145 = 22145
-ADAMANT_KITESHIELD_22147 = 22147
-ADAMANT_KITESHIELD_22149 = 22149
-ADAMANT_KITESHIELD_22151 = 22151
-ADAMANT_KITESHIELD_22153 = 22153
-ADAMANT_KITESHIELD_22155 = 22155
-ADAMANT_KITESHIELD_22157 = 22157
-ADAMANT_HERALDIC_HELM = 22159
-ADAMANT_HERALDIC_HELM_22161 = 22161
-ADAMANT_HERALDIC_HELM_22163 = 22163
-ADAMANT_HERALDIC_HELM_22165 = 22165
-ADAMANT_HERALDIC_HELM_22167 = 22167
-ADAMANT_HERALDIC_HELM_22169 = 22169
-ADAMANT_HERALDIC_HELM_22171 = 22171
-ADAMANT_HERALDIC_HELM_22173 = 22173
-ADAMANT_HERALDIC_HELM_22175 = 22175
-ADAMANT_HERALDIC_HELM_22177 = 22177
-ADAMANT_HERALDIC_HELM_22179 = 22179
-ADAMANT_HERALDIC_HELM_22181 = 22181
-ADAMANT_HERALDIC_HELM_22183 = 22183
-ADAMANT_HERALDIC_HELM_22185 = 22185
-ADAMANT_HERALDIC_HELM_22187 = 22187
-ADAMANT_HERALDIC_HELM_22189 = 22189
-USEFUL_ROCK = 22191
-MAPLE_BIRD_HOUSE = 22192
-MAPLE_BIRD_HOUSE_NOTED = 22193
-MAHOGANY_BIRD_HOUSE = 22195
-MAHOGANY_BIRD_HOUSE_NOTED = 22196
-YEW_BIRD_HOUSE = 22198
-YEW_BIRD_HOUSE_NOTED = 22199
-MAGIC_BIRD_HOUSE = 22201
-MAGIC_BIRD_HOUSE_NOTED = 22202
-REDWOOD_BIRD_HOUSE = 22204
-REDWOOD_BIRD_HOUSE_NOTED = 22205
-GLISTENING_TEAR_22207 = 22207
-WRATH_RUNE_22208 = 22208
-EXTENDED_SUPER_ANTIFIRE4 = 22209
-EXTENDED_SUPER_ANTIFIRE4_NOTED = 22210
-EXTENDED_SUPER_ANTIFIRE3 = 22212
-EXTENDED_SUPER_ANTIFIRE3_NOTED = 22213
-EXTENDED_SUPER_ANTIFIRE2 = 22215
-EXTENDED_SUPER_ANTIFIRE2_NOTED = 22216
-EXTENDED_SUPER_ANTIFIRE1 = 22218
-EXTENDED_SUPER_ANTIFIRE1_NOTED = 22219
-EXTENDED_SUPER_ANTIFIRE_MIX2 = 22221
-EXTENDED_SUPER_ANTIFIRE_MIX2_NOTED = 22222
-EXTENDED_SUPER_ANTIFIRE_MIX1 = 22224
-EXTENDED_SUPER_ANTIFIRE_MIX1_NOTED = 22225
-BULLET_ARROW_22227 = 22227
-FIELD_ARROW_22228 = 22228
-BLUNT_ARROW_22229 = 22229
-BARBED_ARROW_22230 = 22230
-DRAGON_BOOTS_ORNAMENT_KIT = 22231
-DRAGON_BOOTS_ORNAMENT_KIT_NOTED = 22232
-DRAGON_BOOTS_G = 22234
-DRAGON_PLATEBODY_ORNAMENT_KIT = 22236
-DRAGON_PLATEBODY_ORNAMENT_KIT_NOTED = 22237
-DRAGON_KITESHIELD_ORNAMENT_KIT = 22239
-DRAGON_KITESHIELD_ORNAMENT_KIT_NOTED = 22240
-DRAGON_PLATEBODY_G = 22242
-DRAGON_KITESHIELD_G = 22244
-ANGUISH_ORNAMENT_KIT = 22246
-ANGUISH_ORNAMENT_KIT_NOTED = 22247
-NECKLACE_OF_ANGUISH_OR = 22249
-OAK_SHIELD = 22251
-OAK_SHIELD_NOTED = 22252
-WILLOW_SHIELD = 22254
-WILLOW_SHIELD_NOTED = 22255
-MAPLE_SHIELD = 22257
-MAPLE_SHIELD_NOTED = 22258
-YEW_SHIELD = 22260
-YEW_SHIELD_NOTED = 22261
-MAGIC_SHIELD = 22263
-MAGIC_SHIELD_NOTED = 22264
-REDWOOD_SHIELD = 22266
-REDWOOD_SHIELD_NOTED = 22267
-HARD_LEATHER_SHIELD = 22269
-HARD_LEATHER_SHIELD_NOTED = 22270
-SNAKESKIN_SHIELD = 22272
-SNAKESKIN_SHIELD_NOTED = 22273
-GREEN_DHIDE_SHIELD = 22275
-GREEN_DHIDE_SHIELD_NOTED = 22276
-BLUE_DHIDE_SHIELD = 22278
-BLUE_DHIDE_SHIELD_NOTED = 22279
-RED_DHIDE_SHIELD = 22281
-RED_DHIDE_SHIELD_NOTED = 22282
-BLACK_DHIDE_SHIELD = 22284
-BLACK_DHIDE_SHIELD_NOTED = 22285
-LEATHER_SHIELDS_FLYER = 22287
-TRIDENT_OF_THE_SEAS_E = 22288
-UNCHARGED_TRIDENT_E = 22290
-UNCHARGED_TRIDENT_E_NOTED = 22291
-TRIDENT_OF_THE_SWAMP_E = 22292
-UNCHARGED_TOXIC_TRIDENT_E = 22294
-UNCHARGED_TOXIC_TRIDENT_E_NOTED = 22295
-STAFF_OF_LIGHT = 22296
-STAFF_OF_LIGHT_NOTED = 22297
-ANCIENT_MEDALLION = 22299
-ANCIENT_MEDALLION_NOTED = 22300
-ANCIENT_EFFIGY = 22302
-ANCIENT_EFFIGY_NOTED = 22303
-ANCIENT_RELIC = 22305
-ANCIENT_RELIC_NOTED = 22306
-HEALER_ICON_22308 = 22308
-HEALER_ICON_22309 = 22309
-HEALER_ICON_22310 = 22310
-HEALER_ICON_22311 = 22311
-COLLECTOR_ICON_22312 = 22312
-COLLECTOR_ICON_22313 = 22313
-COLLECTOR_ICON_22314 = 22314
-COLLECTOR_ICON_22315 = 22315
-PROP_SWORD = 22316
-PET_CORPOREAL_CRITTER = 22318
-TZREKZUK = 22319
-CHAMPIONS_LAMP = 22320
-ROTTEN_CABBAGE = 22321
-AVERNIC_DEFENDER = 22322
-SANGUINESTI_STAFF = 22323
-GHRAZI_RAPIER = 22324
-SCYTHE_OF_VITUR = 22325
-JUSTICIAR_FACEGUARD = 22326
-JUSTICIAR_CHESTGUARD = 22327
-JUSTICIAR_LEGGUARDS = 22328
-LARRANS_KEY = 22329
-DEADMAN_STARTER_PACK = 22330
-STARTER_SWORD = 22331
-STARTER_BOW = 22333
-STARTER_STAFF = 22335
-COLLECTOR_ICON_22337 = 22337
-COLLECTOR_ICON_22338 = 22338
-COLLECTOR_ICON_22339 = 22339
-DEFENDER_ICON_22340 = 22340
-DEFENDER_ICON_22341 = 22341
-DEFENDER_ICON_22342 = 22342
-DEFENDER_ICON_22343 = 22343
-DEFENDER_ICON_22344 = 22344
-DEFENDER_ICON_22345 = 22345
-ATTACKER_ICON_22346 = 22346
-ATTACKER_ICON_22347 = 22347
-ATTACKER_ICON_22348 = 22348
-ATTACKER_ICON_22349 = 22349
-NULL_22350 = 22350
-EGGSHELL_PLATEBODY = 22351
-EGGSHELL_PLATELEGS = 22353
-HOLY_HANDEGG = 22355
-HOLY_HANDEGG_NOTED = 22356
-PEACEFUL_HANDEGG = 22358
-PEACEFUL_HANDEGG_NOTED = 22359
-CHAOTIC_HANDEGG = 22361
-CHAOTIC_HANDEGG_NOTED = 22362
-OCULUS_ORB = 22364
-SHAYZIEN_FAVOUR_CERTIFICATE = 22365
-KOUREND_FAVOUR_CERTIFICATE = 22367
-BRYOPHYTAS_STAFF_UNCHARGED = 22368
-BRYOPHYTAS_STAFF_UNCHARGED_NOTED = 22369
-BRYOPHYTAS_STAFF = 22370
-BRYOPHYTAS_ESSENCE = 22372
-BRYOPHYTAS_ESSENCE_NOTED = 22373
-MOSSY_KEY = 22374
-PUPPADILE = 22376
-TEKTINY = 22378
-VANGUARD = 22380
-VASA_MINIRIO = 22382
-VESPINA = 22384
-METAMORPHIC_DUST = 22386
-XERICS_GUARD = 22388
-XERICS_WARRIOR = 22390
-XERICS_SENTINEL = 22392
-XERICS_GENERAL = 22394
-XERICS_CHAMPION = 22396
-IVANDIS_FLAIL = 22398
-DRAKANS_MEDALLION = 22400
-MYSTERIOUS_HERB = 22402
-MYSTERIOUS_MEAT = 22403
-MYSTERIOUS_CRUSHED_MEAT = 22404
-VIAL_OF_BLOOD = 22405
-UNFINISHED_BLOOD_POTION = 22406
-BLOOD_POTION = 22407
-UNFINISHED_POTION_22408 = 22408
-POTION_22409 = 22409
-OLD_NOTES_22410 = 22410
-OLD_DIARY = 22411
-FLAYGIANS_NOTES = 22413
-CHAIN = 22414
-TOME_OF_EXPERIENCE = 22415
-THE_TURNCLOAK = 22416
-EXPLOSIVE_DISCOVERY = 22418
-BLOODY_GRIMOIRE = 22420
-ELIXIR_OF_EVERLASTING = 22422
-BURIED_ALIVE = 22424
-DEED = 22426
-OLD_KEY = 22428
-BLOODY_BRACER = 22430
-BLOODY_BRACER_NOTED = 22431
-EMERALD_SICKLE_B = 22433
-ENCHANTED_EMERALD_SICKLE_B = 22435
-ROTTEN_CARROT = 22437
-JUSTICIAR_ARMOUR_SET = 22438
-JUSTICIAR_ARMOUR_SET_NOTED = 22439
-AVERNIC_DEFENDER_BROKEN = 22441
-CADANTINE_BLOOD_POTION_UNF = 22443
-CADANTINE_BLOOD_POTION_UNF_NOTED = 22444
-VIAL_OF_BLOOD_22446 = 22446
-VIAL_OF_BLOOD_NOTED = 22447
-BATTLEMAGE_POTION4 = 22449
-BATTLEMAGE_POTION4_NOTED = 22450
-BATTLEMAGE_POTION3 = 22452
-BATTLEMAGE_POTION3_NOTED = 22453
-BATTLEMAGE_POTION2 = 22455
-BATTLEMAGE_POTION2_NOTED = 22456
-BATTLEMAGE_POTION1 = 22458
-BATTLEMAGE_POTION1_NOTED = 22459
-BASTION_POTION4 = 22461
-BASTION_POTION4_NOTED = 22462
-BASTION_POTION3 = 22464
-BASTION_POTION3_NOTED = 22465
-BASTION_POTION2 = 22467
-BASTION_POTION2_NOTED = 22468
-BASTION_POTION1 = 22470
-BASTION_POTION1_NOTED = 22471
-LIL_ZIK = 22473
-MESSAGE_22475 = 22475
-AVERNIC_DEFENDER_HILT = 22477
-AVERNIC_DEFENDER_HILT_NOTED = 22478
-SANGUINESTI_STAFF_UNCHARGED = 22481
-SANGUINESTI_STAFF_UNCHARGED_NOTED = 22482
-GHRAZI_RAPIER_NOTED = 22483
-SCYTHE_OF_VITUR_UNCHARGED = 22486
-SCYTHE_OF_VITUR_UNCHARGED_NOTED = 22487
-JUSTICIAR_FACEGUARD_NOTED = 22488
-JUSTICIAR_CHESTGUARD_NOTED = 22490
-JUSTICIAR_LEGGUARDS_NOTED = 22492
-SINHAZA_SHROUD_TIER_1 = 22494
-SINHAZA_SHROUD_TIER_2 = 22496
-SINHAZA_SHROUD_TIER_3 = 22498
-SINHAZA_SHROUD_TIER_4 = 22500
-SINHAZA_SHROUD_TIER_5 = 22502
-SERAFINAS_DIARY = 22504
-THE_BUTCHER = 22506
-ARACHNIDS_OF_VAMPYRIUM = 22508
-THE_SHADOW_REALM = 22510
-THE_WILD_HUNT = 22512
-VERZIK_VITUR__PATIENT_RECORD = 22514
-DAWNBRINGER = 22516
-ESCAPE_CRYSTAL = 22517
-CABBAGE_22519 = 22519
-CABBAGE_22520 = 22520
-COIN_POUCH = 22521
-COIN_POUCH_22522 = 22522
-COIN_POUCH_22523 = 22523
-COIN_POUCH_22524 = 22524
-COIN_POUCH_22525 = 22525
-COIN_POUCH_22526 = 22526
-COIN_POUCH_22527 = 22527
-COIN_POUCH_22528 = 22528
-COIN_POUCH_22529 = 22529
-COIN_POUCH_22530 = 22530
-COIN_POUCH_22531 = 22531
-COIN_POUCH_22532 = 22532
-COIN_POUCH_22533 = 22533
-COIN_POUCH_22534 = 22534
-COIN_POUCH_22535 = 22535
-COIN_POUCH_22536 = 22536
-COIN_POUCH_22537 = 22537
-COIN_POUCH_22538 = 22538
-CABBAGE_22539 = 22539
-CABBAGE_22540 = 22540
-ROTTEN_STRAWBERRY = 22541
-VIGGORAS_CHAINMACE_U = 22542
-VIGGORAS_CHAINMACE_U_NOTED = 22543
-VIGGORAS_CHAINMACE = 22545
-CRAWS_BOW_U = 22547
-CRAWS_BOW_U_NOTED = 22548
-CRAWS_BOW = 22550
-THAMMARONS_SCEPTRE_U = 22552
-THAMMARONS_SCEPTRE_U_NOTED = 22553
-THAMMARONS_SCEPTRE = 22555
-AMULET_OF_AVARICE = 22557
-AMULET_OF_AVARICE_NOTED = 22558
-LOOTING_BAG_22586 = 22586
-OLD_MANS_COFFIN = 22588
-REDUCED_CADAVA_POTION = 22589
-GOAT_DUNG = 22590
-WEISS_FIRE_NOTES = 22591
-TE_SALT = 22593
-EFH_SALT = 22595
-URT_SALT = 22597
-ICY_BASALT = 22599
-STONY_BASALT = 22601
-BASALT = 22603
-BASALT_NOTED = 22604
-FIRE_OF_ETERNAL_LIGHT = 22606
-FIRE_OF_DEHUMIDIFICATION = 22607
-FIRE_OF_NOURISHMENT = 22608
-FIRE_OF_UNSEASONAL_WARMTH = 22609
-VESTAS_SPEAR = 22610
-VESTAS_SPEAR_NOTED = 22611
-VESTAS_LONGSWORD = 22613
-VESTAS_LONGSWORD_NOTED = 22614
-VESTAS_CHAINBODY = 22616
-VESTAS_CHAINBODY_NOTED = 22617
-VESTAS_PLATESKIRT = 22619
-VESTAS_PLATESKIRT_NOTED = 22620
-STATIUSS_WARHAMMER = 22622
-STATIUSS_WARHAMMER_NOTED = 22623
-STATIUSS_FULL_HELM = 22625
-STATIUSS_FULL_HELM_NOTED = 22626
-STATIUSS_PLATEBODY = 22628
-STATIUSS_PLATEBODY_NOTED = 22629
-STATIUSS_PLATELEGS = 22631
-STATIUSS_PLATELEGS_NOTED = 22632
-MORRIGANS_THROWING_AXE = 22634
-MORRIGANS_JAVELIN = 22636
-MORRIGANS_COIF = 22638
-MORRIGANS_COIF_NOTED = 22639
-MORRIGANS_LEATHER_BODY = 22641
-MORRIGANS_LEATHER_BODY_NOTED = 22642
-MORRIGANS_LEATHER_CHAPS = 22644
-MORRIGANS_LEATHER_CHAPS_NOTED = 22645
-ZURIELS_STAFF = 22647
-ZURIELS_STAFF_NOTED = 22648
-ZURIELS_HOOD = 22650
-ZURIELS_HOOD_NOTED = 22651
-ZURIELS_ROBE_TOP = 22653
-ZURIELS_ROBE_TOP_NOTED = 22654
-ZURIELS_ROBE_BOTTOM = 22656
-ZURIELS_ROBE_BOTTOM_NOTED = 22657
-EMPTY_BUCKET_PACK = 22660
-EMPTY_BUCKET_PACK_NOTED = 22661
-PET_SMOKE_DEVIL_22663 = 22663
-SCYTHE_OF_VITUR_22664 = 22664
-ARMADYL_GODSWORD_22665 = 22665
-RUBBER_CHICKEN_22666 = 22666
-KQ_HEAD_TATTERED = 22671
-STUFFED_KQ_HEAD_TATTERED = 22673
-SCROLL_SACK = 22675
-NULL_22677 = 22677
-NULL_22678 = 22678
-NULL_22679 = 22679
-NULL_22680 = 22680
-NULL_22681 = 22681
-NULL_22682 = 22682
-NULL_22683 = 22683
-EEK = 22684
-NULL_22686 = 22686
-NULL_22687 = 22687
-NULL_22688 = 22688
-CLOWN_MASK = 22689
-NULL_22691 = 22691
-CLOWN_BOW_TIE = 22692
-NULL_22694 = 22694
-CLOWN_GOWN = 22695
-NULL_22697 = 22697
-CLOWN_TROUSERS = 22698
-NULL_22700 = 22700
-CLOWN_SHOES = 22701
-PORTAL_NEXUS = 22704
-MARBLE_PORTAL_NEXUS = 22705
-GILDED_PORTAL_NEXUS = 22706
-CRYSTALLINE_PORTAL_NEXUS = 22707
-MOUNTED_XERICS_TALISMAN = 22708
-MOUNTED_DIGSITE_PENDANT = 22709
-CURATORS_MEDALLION = 22710
-COLLECTION_LOG = 22711
-STARFACE = 22713
-TREE_TOP = 22715
-TREE_SKIRT = 22717
-CANDY_CANE = 22719
-ATTACKER_ICON_22721 = 22721
-ATTACKER_ICON_22722 = 22722
-ATTACKER_ICON_22723 = 22723
-COLLECTOR_ICON_22724 = 22724
-DEFENDER_ICON_22725 = 22725
-DEFENDER_ICON_22726 = 22726
-DEFENDER_ICON_22727 = 22727
-DEFENDER_ICON_22728 = 22728
-ATTACKER_ICON_22729 = 22729
-ATTACKER_ICON_22730 = 22730
-DRAGON_HASTA = 22731
-DRAGON_HASTA_NOTED = 22732
-DRAGON_HASTAP = 22734
-DRAGON_HASTAP_NOTED = 22735
-DRAGON_HASTAP_22737 = 22737
-DRAGON_HASTAP_NOTED_22738 = 22738
-DRAGON_HASTAP_22740 = 22740
-DRAGON_HASTAP_NOTED_22741 = 22741
-DRAGON_HASTAKP = 22743
-FAKE_DRAGON_HASTAKP = 22744
-IKKLE_HYDRA = 22746
-IKKLE_HYDRA_22748 = 22748
-IKKLE_HYDRA_22750 = 22750
-IKKLE_HYDRA_22752 = 22752
-WYRM_BONEMEAL = 22754
-DRAKE_BONEMEAL = 22756
-HYDRA_BONEMEAL = 22758
-LOVAKENGJ_FAVOUR_CERTIFICATE = 22760
-DINHS_HAMMER = 22761
-GENERATOR_CRANK = 22762
-_8GALLON_JUG = 22763
-_5GALLON_JUG = 22764
-ENERGY_DISK_LEVEL_4 = 22765
-ENERGY_DISK_LEVEL_3 = 22766
-ENERGY_DISK_LEVEL_2 = 22767
-ENERGY_DISK_LEVEL_1 = 22768
-UNKNOWN_FLUID_1 = 22769
-UNKNOWN_FLUID_2 = 22770
-UNKNOWN_FLUID_3 = 22771
-UNKNOWN_FLUID_4 = 22772
-UNKNOWN_FLUID_5 = 22773
-OLD_NOTES_22774 = 22774
-ANCIENT_LETTER = 22775
-ARCEUUS_FAVOUR_CERTIFICATE = 22777
-NULL_22779 = 22779
-WYRM_BONES = 22780
-WYRM_BONES_NOTED = 22781
-DRAKE_BONES = 22783
-DRAKE_BONES_NOTED = 22784
-HYDRA_BONES = 22786
-HYDRA_BONES_NOTED = 22787
-UNCOOKED_DRAGONFRUIT_PIE = 22789
-UNCOOKED_DRAGONFRUIT_PIE_NOTED = 22790
-HALF_A_DRAGONFRUIT_PIE = 22792
-HALF_A_DRAGONFRUIT_PIE_NOTED = 22793
-DRAGONFRUIT_PIE = 22795
-DRAGONFRUIT_PIE_NOTED = 22796
-BIRD_NEST_22798 = 22798
-BIRD_NEST_22800 = 22800
-RADAS_BLESSING = 22803
-DRAGON_KNIFE = 22804
-DRAGON_KNIFEP = 22806
-DRAGON_KNIFEP_22808 = 22808
-DRAGON_KNIFEP_22810 = 22810
-DRAGON_KNIFE_22812 = 22812
-DRAGON_KNIFE_22814 = 22814
-CORMORANTS_GLOVE = 22816
-CORMORANTS_GLOVE_22817 = 22817
-FISH_CHUNKS = 22818
-MOLCH_PEARL = 22820
-MOLCH_PEARL_22822 = 22822
-MOLCH_PEARL_22823 = 22823
-MOLCH_PEARL_22824 = 22824
-MOLCH_PEARL_22825 = 22825
-BLUEGILL = 22826
-BLUEGILL_NOTED = 22827
-COMMON_TENCH = 22829
-COMMON_TENCH_NOTED = 22830
-MOTTLED_EEL = 22832
-MOTTLED_EEL_NOTED = 22833
-GREATER_SIREN = 22835
-GREATER_SIREN_NOTED = 22836
-FISH_SACK = 22838
-GOLDEN_TENCH = 22840
-PEARL_BARBARIAN_ROD = 22842
-PEARL_FLY_FISHING_ROD = 22844
-PEARL_FISHING_ROD = 22846
-CELASTRUS_SEEDLING = 22848
-REDWOOD_SEEDLING = 22850
-CELASTRUS_SEEDLING_W = 22852
-REDWOOD_SEEDLING_W = 22854
-CELASTRUS_SAPLING = 22856
-CELASTRUS_SAPLING_NOTED = 22857
-REDWOOD_SAPLING = 22859
-REDWOOD_SAPLING_NOTED = 22860
-DRAGONFRUIT_SEEDLING = 22862
-DRAGONFRUIT_SEEDLING_W = 22864
-DRAGONFRUIT_SAPLING = 22866
-DRAGONFRUIT_SAPLING_NOTED = 22867
-CELASTRUS_SEED = 22869
-REDWOOD_TREE_SEED = 22871
-POTATO_CACTUS_SEED = 22873
-HESPORI_SEED = 22875
-DRAGONFRUIT_TREE_SEED = 22877
-SNAPE_GRASS_SEED = 22879
-ATTAS_SEED = 22881
-IASOR_SEED = 22883
-KRONOS_SEED = 22885
-WHITE_LILY_SEED = 22887
-WHITE_LILY_SEED_22889 = 22889
-WHITE_LILY_SEED_22890 = 22890
-WHITE_LILY_SEED_22891 = 22891
-WHITE_LILY_SEED_22892 = 22892
-SNAPE_GRASS_SEED_22893 = 22893
-SNAPE_GRASS_SEED_22894 = 22894
-SNAPE_GRASS_SEED_22895 = 22895
-SNAPE_GRASS_SEED_22896 = 22896
-POTATO_CACTUS_SEED_22897 = 22897
-POTATO_CACTUS_SEED_22898 = 22898
-POTATO_CACTUS_SEED_22899 = 22899
-POTATO_CACTUS_SEED_22900 = 22900
-DRAGONFRUIT_TREE_SEED_22901 = 22901
-DRAGONFRUIT_TREE_SEED_22902 = 22902
-DRAGONFRUIT_TREE_SEED_22903 = 22903
-DRAGONFRUIT_TREE_SEED_22904 = 22904
-CELASTRUS_SEED_22905 = 22905
-CELASTRUS_SEED_22906 = 22906
-CELASTRUS_SEED_22907 = 22907
-CELASTRUS_SEED_22908 = 22908
-ATTAS_SEED_22909 = 22909
-ATTAS_SEED_22910 = 22910
-ATTAS_SEED_22911 = 22911
-ATTAS_SEED_22912 = 22912
-IASOR_SEED_22913 = 22913
-IASOR_SEED_22914 = 22914
-IASOR_SEED_22915 = 22915
-IASOR_SEED_22916 = 22916
-KRONOS_SEED_22917 = 22917
-KRONOS_SEED_22918 = 22918
-KRONOS_SEED_22919 = 22919
-KRONOS_SEED_22920 = 22920
-REDWOOD_TREE_SEED_22921 = 22921
-REDWOOD_TREE_SEED_22922 = 22922
-REDWOOD_TREE_SEED_22923 = 22923
-REDWOOD_TREE_SEED_22924 = 22924
-HESPORI_SEED_22925 = 22925
-HESPORI_SEED_22926 = 22926
-HESPORI_SEED_22927 = 22927
-HESPORI_SEED_22928 = 22928
-DRAGONFRUIT = 22929
-DRAGONFRUIT_NOTED = 22930
-WHITE_LILY = 22932
-WHITE_LILY_NOTED = 22933
-CELASTRUS_BARK = 22935
-CELASTRUS_BARK_NOTED = 22936
-RADAS_BLESSING_1 = 22941
-RADAS_BLESSING_2 = 22943
-RADAS_BLESSING_3 = 22945
-RADAS_BLESSING_4 = 22947
-BATTLEFRONT_TELEPORT = 22949
-BOOTS_OF_BRIMSTONE = 22951
-BOOTS_OF_BRIMSTONE_NOTED = 22952
-DEVOUT_BOOTS = 22954
-DEVOUT_BOOTS_NOTED = 22955
-DRAKES_CLAW = 22957
-DRAKES_CLAW_NOTED = 22958
-DRAKES_TOOTH = 22960
-DRAKES_TOOTH_NOTED = 22961
-BROKEN_DRAGON_HASTA = 22963
-BROKEN_DRAGON_HASTA_NOTED = 22964
-HYDRAS_CLAW = 22966
-HYDRAS_CLAW_NOTED = 22967
-HYDRAS_HEART = 22969
-HYDRAS_FANG = 22971
-HYDRAS_EYE = 22973
-BRIMSTONE_RING = 22975
-BRIMSTONE_RING_NOTED = 22976
-DRAGON_HUNTER_LANCE = 22978
-DRAGON_HUNTER_LANCE_NOTED = 22979
-FEROCIOUS_GLOVES = 22981
-HYDRA_LEATHER = 22983
-HYDRA_LEATHER_NOTED = 22984
-BONECRUSHER_NECKLACE = 22986
-HYDRA_TAIL = 22988
-HYDRA_TAIL_NOTED = 22989
-STONE_TABLET_22991 = 22991
-SEED_PACK = 22993
-BOTTOMLESS_COMPOST_BUCKET = 22994
-BOTTOMLESS_COMPOST_BUCKET_NOTED = 22995
-BOTTOMLESS_COMPOST_BUCKET_22997 = 22997
-BOTTLED_DRAGONBREATH_UNPOWERED = 22999
-BOTTLED_DRAGONBREATH_UNPOWERED_NOTED = 23000
-BOTTLED_DRAGONBREATH = 23002
-BOTTLED_DRAGONBREATH_NOTED = 23003
-TATTY_NOTE = 23007
-GIELINORS_FLORA__FLOWERS = 23009
-GIELINORS_FLORA__BUSHES = 23011
-GIELINORS_FLORA__HOPS = 23013
-GIELINORS_FLORA__ALLOTMENTS = 23015
-GIELINORS_FLORA__HERBS = 23017
-GIELINORS_FLORA__TREES = 23019
-GIELINORS_FLORA__FRUIT = 23021
-OLD_NOTES_23023 = 23023
-OLD_NOTES_23025 = 23025
-OLD_NOTES_23027 = 23027
-OLD_NOTES_23029 = 23029
-OLD_NOTES_23031 = 23031
-OLD_NOTES_23033 = 23033
-OLD_NOTES_23035 = 23035
-BOOTS_OF_STONE = 23037
-BOOTS_OF_STONE_NOTED = 23038
-WYRM = 23040
-DRAKE = 23041
-HYDRA = 23042
-SULPHUR_LIZARD = 23043
-CLUE_SCROLL_HARD_23045 = 23045
-CLUE_SCROLL_MEDIUM_23046 = 23046
-MYSTIC_HAT_DUSK = 23047
-MYSTIC_HAT_DUSK_NOTED = 23048
-MYSTIC_ROBE_TOP_DUSK = 23050
-MYSTIC_ROBE_TOP_DUSK_NOTED = 23051
-MYSTIC_ROBE_BOTTOM_DUSK = 23053
-MYSTIC_ROBE_BOTTOM_DUSK_NOTED = 23054
-MYSTIC_GLOVES_DUSK = 23056
-MYSTIC_GLOVES_DUSK_NOTED = 23057
-MYSTIC_BOOTS_DUSK = 23059
-MYSTIC_BOOTS_DUSK_NOTED = 23060
-NEST_BOX_SEEDS_23062 = 23062
-JAR_OF_CHEMICALS = 23064
-JAR_OF_CHEMICALS_NOTED = 23065
-TREASURE_SCROLL = 23067
-TREASURE_SCROLL_23068 = 23068
-MYSTERIOUS_ORB_23069 = 23069
-TREASURE_SCROLL_23070 = 23070
-ANCIENT_CASKET = 23071
-ANTIQUE_LAMP_23072 = 23072
-HYDRA_SLAYER_HELMET = 23073
-HYDRA_SLAYER_HELMET_I = 23075
-ALCHEMICAL_HYDRA_HEADS = 23077
-STUFFED_HYDRA_HEADS = 23079
-ALCHEMICAL_HYDRA_HEAD = 23081
-ANTIQUE_LAMP_23082 = 23082
-BRIMSTONE_KEY = 23083
-BRIMSTONE_KEY_23085 = 23085
-BRIMSTONE_KEY_23086 = 23086
-BRIMSTONE_KEY_23087 = 23087
-BRIMSTONE_KEY_23088 = 23088
-BRIMSTONE_KEY_23089 = 23089
-BRIMSTONE_KEY_23090 = 23090
-ORNATE_GLOVES = 23091
-ORNATE_BOOTS = 23093
-ORNATE_LEGS = 23095
-ORNATE_TOP = 23097
-ORNATE_CAPE = 23099
-ORNATE_HELM = 23101
-NULL_23103 = 23103
-NULL_23104 = 23104
-NULL_23105 = 23105
-NULL_23106 = 23106
-NULL_23107 = 23107
-BIRTHDAY_CAKE = 23108
-MYSTIC_SET_LIGHT = 23110
-MYSTIC_SET_LIGHT_NOTED = 23111
-MYSTIC_SET_BLUE = 23113
-MYSTIC_SET_BLUE_NOTED = 23114
-MYSTIC_SET_DARK = 23116
-MYSTIC_SET_DARK_NOTED = 23117
-MYSTIC_SET_DUSK = 23119
-MYSTIC_SET_DUSK_NOTED = 23120
-OILY_PEARL_FISHING_ROD = 23122
-GILDED_DRAGONHIDE_SET = 23124
-GILDED_DRAGONHIDE_SET_NOTED = 23125
-CLUE_NEST_BEGINNER = 23127
-CLUE_BOTTLE_BEGINNER = 23129
-CLUE_SCROLL_MEDIUM_23131 = 23131
-CHALLENGE_SCROLL_MEDIUM_23132 = 23132
-CLUE_SCROLL_MEDIUM_23133 = 23133
-CHALLENGE_SCROLL_MEDIUM_23134 = 23134
-CLUE_SCROLL_MEDIUM_23135 = 23135
-CLUE_SCROLL_MEDIUM_23136 = 23136
-CLUE_SCROLL_MEDIUM_23137 = 23137
-CLUE_SCROLL_MEDIUM_23138 = 23138
-CLUE_SCROLL_MEDIUM_23139 = 23139
-CLUE_SCROLL_MEDIUM_23140 = 23140
-CLUE_SCROLL_MEDIUM_23141 = 23141
-CLUE_SCROLL_MEDIUM_23142 = 23142
-CLUE_SCROLL_MEDIUM_23143 = 23143
-CLUE_SCROLL_ELITE_23144 = 23144
-CLUE_SCROLL_ELITE_23145 = 23145
-CLUE_SCROLL_ELITE_23146 = 23146
-CLUE_SCROLL_ELITE_23147 = 23147
-CLUE_SCROLL_ELITE_23148 = 23148
-CLUE_SCROLL_EASY_23149 = 23149
-CLUE_SCROLL_EASY_23150 = 23150
-CLUE_SCROLL_EASY_23151 = 23151
-CLUE_SCROLL_EASY_23152 = 23152
-CLUE_SCROLL_EASY_23153 = 23153
-CLUE_SCROLL_EASY_23154 = 23154
-CLUE_SCROLL_EASY_23155 = 23155
-CLUE_SCROLL_EASY_23156 = 23156
-CLUE_SCROLL_EASY_23157 = 23157
-CLUE_SCROLL_EASY_23158 = 23158
-CLUE_SCROLL_EASY_23159 = 23159
-CLUE_SCROLL_EASY_23160 = 23160
-CLUE_SCROLL_EASY_23161 = 23161
-CLUE_SCROLL_EASY_23162 = 23162
-CLUE_SCROLL_EASY_23163 = 23163
-CLUE_SCROLL_EASY_23164 = 23164
-CLUE_SCROLL_EASY_23165 = 23165
-CLUE_SCROLL_EASY_23166 = 23166
-CLUE_SCROLL_HARD_23167 = 23167
-CLUE_SCROLL_HARD_23168 = 23168
-CLUE_SCROLL_HARD_23169 = 23169
-CLUE_SCROLL_HARD_23170 = 23170
-PUZZLE_BOX_HARD_23171 = 23171
-CLUE_SCROLL_HARD_23172 = 23172
-PUZZLE_BOX_HARD_23173 = 23173
-CLUE_SCROLL_HARD_23174 = 23174
-CLUE_SCROLL_HARD_23175 = 23175
-CLUE_SCROLL_HARD_23176 = 23176
-CLUE_SCROLL_HARD_23177 = 23177
-CLUE_SCROLL_HARD_23178 = 23178
-CLUE_SCROLL_HARD_23179 = 23179
-CLUE_SCROLL_HARD_23180 = 23180
-CLUE_SCROLL_HARD_23181 = 23181
-CLUE_SCROLL_BEGINNER = 23182
-STRANGE_DEVICE_23183 = 23183
-MIMIC = 23184
-RING_OF_3RD_AGE = 23185
-RING_OF_3RD_AGE_NOTED = 23186
-GUTHIX_DHIDE_SHIELD = 23188
-GUTHIX_DHIDE_SHIELD_NOTED = 23189
-SARADOMIN_DHIDE_SHIELD = 23191
-SARADOMIN_DHIDE_SHIELD_NOTED = 23192
-ZAMORAK_DHIDE_SHIELD = 23194
-ZAMORAK_DHIDE_SHIELD_NOTED = 23195
-ANCIENT_DHIDE_SHIELD = 23197
-ANCIENT_DHIDE_SHIELD_NOTED = 23198
-ARMADYL_DHIDE_SHIELD = 23200
-ARMADYL_DHIDE_SHIELD_NOTED = 23201
-BANDOS_DHIDE_SHIELD = 23203
-BANDOS_DHIDE_SHIELD_NOTED = 23204
-DUAL_SAI = 23206
-DUAL_SAI_NOTED = 23207
-RUNE_PLATEBODY_H1 = 23209
-RUNE_PLATEBODY_H1_NOTED = 23210
-RUNE_PLATEBODY_H2 = 23212
-RUNE_PLATEBODY_H2_NOTED = 23213
-RUNE_PLATEBODY_H3 = 23215
-RUNE_PLATEBODY_H3_NOTED = 23216
-RUNE_PLATEBODY_H4 = 23218
-RUNE_PLATEBODY_H4_NOTED = 23219
-RUNE_PLATEBODY_H5 = 23221
-RUNE_PLATEBODY_H5_NOTED = 23222
-THIEVING_BAG = 23224
-THIEVING_BAG_NOTED = 23225
-RUNE_DEFENDER_ORNAMENT_KIT = 23227
-RUNE_DEFENDER_ORNAMENT_KIT_NOTED = 23228
-RUNE_DEFENDER_T = 23230
-TZHAARKETOM_ORNAMENT_KIT = 23232
-TZHAARKETOM_ORNAMENT_KIT_NOTED = 23233
-TZHAARKETOM_T = 23235
-BERSERKER_NECKLACE_ORNAMENT_KIT = 23237
-BERSERKER_NECKLACE_ORNAMENT_KIT_NOTED = 23238
-BERSERKER_NECKLACE_OR = 23240
-_3RD_AGE_PLATESKIRT = 23242
-_3RD_AGE_PLATESKIRT_NOTED = 23243
-REWARD_CASKET_BEGINNER = 23245
-FREMENNIK_KILT = 23246
-FREMENNIK_KILT_NOTED = 23247
-RANGERS_TIGHTS = 23249
-RANGERS_TIGHTS_NOTED = 23250
-GIANT_BOOT = 23252
-GIANT_BOOT_NOTED = 23253
-URIS_HAT = 23255
-URIS_HAT_NOTED = 23256
-GILDED_COIF = 23258
-GILDED_COIF_NOTED = 23259
-GILDED_DHIDE_VAMBRACES = 23261
-GILDED_DHIDE_VAMBRACES_NOTED = 23262
-GILDED_DHIDE_BODY = 23264
-GILDED_DHIDE_BODY_NOTED = 23265
-GILDED_DHIDE_CHAPS = 23267
-GILDED_DHIDE_CHAPS_NOTED = 23268
-ADAMANT_DRAGON_MASK = 23270
-ADAMANT_DRAGON_MASK_NOTED = 23271
-RUNE_DRAGON_MASK = 23273
-RUNE_DRAGON_MASK_NOTED = 23274
-GILDED_PICKAXE = 23276
-GILDED_PICKAXE_NOTED = 23277
-GILDED_AXE = 23279
-GILDED_AXE_NOTED = 23280
-GILDED_SPADE = 23282
-GILDED_SPADE_NOTED = 23283
-MOLE_SLIPPERS = 23285
-MOLE_SLIPPERS_NOTED = 23286
-FROG_SLIPPERS = 23288
-FROG_SLIPPERS_NOTED = 23289
-BEAR_FEET = 23291
-BEAR_FEET_NOTED = 23292
-DEMON_FEET = 23294
-DEMON_FEET_NOTED = 23295
-JESTER_CAPE = 23297
-JESTER_CAPE_NOTED = 23298
-SHOULDER_PARROT = 23300
-SHOULDER_PARROT_NOTED = 23301
-MONKS_ROBE_TOP_T = 23303
-MONKS_ROBE_TOP_T_NOTED = 23304
-MONKS_ROBE_T = 23306
-MONKS_ROBE_T_NOTED = 23307
-AMULET_OF_DEFENCE_T = 23309
-AMULET_OF_DEFENCE_T_NOTED = 23310
-SANDWICH_LADY_HAT = 23312
-SANDWICH_LADY_HAT_NOTED = 23313
-SANDWICH_LADY_TOP = 23315
-SANDWICH_LADY_TOP_NOTED = 23316
-SANDWICH_LADY_BOTTOM = 23318
-SANDWICH_LADY_BOTTOM_NOTED = 23319
-RUNE_SCIMITAR_ORNAMENT_KIT_GUTHIX = 23321
-RUNE_SCIMITAR_ORNAMENT_KIT_GUTHIX_NOTED = 23322
-RUNE_SCIMITAR_ORNAMENT_KIT_SARADOMIN = 23324
-RUNE_SCIMITAR_ORNAMENT_KIT_SARADOMIN_NOTED = 23325
-RUNE_SCIMITAR_ORNAMENT_KIT_ZAMORAK = 23327
-RUNE_SCIMITAR_ORNAMENT_KIT_ZAMORAK_NOTED = 23328
-RUNE_SCIMITAR_23330 = 23330
-RUNE_SCIMITAR_23332 = 23332
-RUNE_SCIMITAR_23334 = 23334
-_3RD_AGE_DRUIDIC_ROBE_TOP = 23336
-_3RD_AGE_DRUIDIC_ROBE_TOP_NOTED = 23337
-_3RD_AGE_DRUIDIC_ROBE_BOTTOMS = 23339
-_3RD_AGE_DRUIDIC_ROBE_BOTTOMS_NOTED = 23340
-_3RD_AGE_DRUIDIC_STAFF = 23342
-_3RD_AGE_DRUIDIC_STAFF_NOTED = 23343
-_3RD_AGE_DRUIDIC_CLOAK = 23345
-_3RD_AGE_DRUIDIC_CLOAK_NOTED = 23346
-TORMENTED_ORNAMENT_KIT = 23348
-TORMENTED_ORNAMENT_KIT_NOTED = 23349
-CAPE_OF_SKULLS = 23351
-CAPE_OF_SKULLS_NOTED = 23352
-AMULET_OF_POWER_T = 23354
-AMULET_OF_POWER_T_NOTED = 23355
-RAIN_BOW = 23357
-RAIN_BOW_NOTED = 23358
-HAM_JOINT = 23360
-HAM_JOINT_NOTED = 23361
-STAFF_OF_BOB_THE_CAT = 23363
-STAFF_OF_BOB_THE_CAT_NOTED = 23364
-BLACK_PLATEBODY_H1 = 23366
-BLACK_PLATEBODY_H1_NOTED = 23367
-BLACK_PLATEBODY_H2 = 23369
-BLACK_PLATEBODY_H2_NOTED = 23370
-BLACK_PLATEBODY_H3 = 23372
-BLACK_PLATEBODY_H3_NOTED = 23373
-BLACK_PLATEBODY_H4 = 23375
-BLACK_PLATEBODY_H4_NOTED = 23376
-BLACK_PLATEBODY_H5 = 23378
-BLACK_PLATEBODY_H5_NOTED = 23379
-LEATHER_BODY_G = 23381
-LEATHER_BODY_G_NOTED = 23382
-LEATHER_CHAPS_G = 23384
-LEATHER_CHAPS_G_NOTED = 23385
-WATSON_TELEPORT = 23387
-SPIKED_MANACLES = 23389
-SPIKED_MANACLES_NOTED = 23390
-ADAMANT_PLATEBODY_H1 = 23392
-ADAMANT_PLATEBODY_H1_NOTED = 23393
-ADAMANT_PLATEBODY_H2 = 23395
-ADAMANT_PLATEBODY_H2_NOTED = 23396
-ADAMANT_PLATEBODY_H3 = 23398
-ADAMANT_PLATEBODY_H3_NOTED = 23399
-ADAMANT_PLATEBODY_H4 = 23401
-ADAMANT_PLATEBODY_H4_NOTED = 23402
-ADAMANT_PLATEBODY_H5 = 23404
-ADAMANT_PLATEBODY_H5_NOTED = 23405
-WOLF_MASK = 23407
-WOLF_MASK_NOTED = 23408
-WOLF_CLOAK = 23410
-WOLF_CLOAK_NOTED = 23411
-CLIMBING_BOOTS_G = 23413
-CLIMBING_BOOTS_G_NOTED = 23414
-STASH_UNITS_BEGINNER = 23416
-PUZZLE_BOX_MASTER_23417 = 23417
-CLUE_GEODE_BEGINNER = 23442
-TORMENTED_BRACELET_OR = 23444
-GIANT_EASTER_EGG = 23446
-BUNNYMAN_MASK = 23448
-NULL_23450 = 23450
-NULL_23451 = 23451
-NULL_23452 = 23452
-NULL_23453 = 23453
-NULL_23454 = 23454
-NULL_23455 = 23455
-NULL_23456 = 23456
-NULL_23457 = 23457
-ENCHANTED_LYREI = 23458
-ATTACKER_ICON_23460 = 23460
-ATTACKER_ICON_23461 = 23461
-ATTACKER_ICON_23462 = 23462
-ATTACKER_ICON_23463 = 23463
-ATTACKER_ICON_23464 = 23464
-ATTACKER_ICON_23465 = 23465
-DEFENDER_ICON_23466 = 23466
-DEFENDER_ICON_23467 = 23467
-DEFENDER_ICON_23468 = 23468
-DEFENDER_ICON_23469 = 23469
-DEFENDER_ICON_23470 = 23470
-COLLECTOR_ICON_23471 = 23471
-COLLECTOR_ICON_23472 = 23472
-COLLECTOR_ICON_23473 = 23473
-COLLECTOR_ICON_23474 = 23474
-COLLECTOR_ICON_23475 = 23475
-COLLECTOR_ICON_23476 = 23476
-COLLECTOR_ICON_23477 = 23477
-HEALER_ICON_23478 = 23478
-HEALER_ICON_23479 = 23479
-HEALER_ICON_23480 = 23480
-HEALER_ICON_23481 = 23481
-HEALER_ICON_23482 = 23482
-HEALER_ICON_23483 = 23483
-HEALER_ICON_23484 = 23484
-HEALER_ICON_23485 = 23485
-HEALER_ICON_23486 = 23486
-ARCHAIC_EMBLEM_TIER_10_23487 = 23487
-WINE_OF_ZAMORAK_23489 = 23489
-LARRANS_KEY_23490 = 23490
-LARRANS_KEY_23492 = 23492
-LARRANS_KEY_23493 = 23493
-LARRANS_KEY_23494 = 23494
-SRARACHA = 23495
-TEMPLE_COIN = 23497
-GRUBBY_KEY = 23499
-GRUBBY_KEY_NOTED = 23500
-TEMPLE_KEY = 23502
-TOME_OF_THE_MOON = 23504
-TOME_OF_THE_SUN = 23506
-TOME_OF_THE_TEMPLE = 23508
-TATTERED_MOON_PAGE = 23510
-TATTERED_SUN_PAGE = 23512
-TATTERED_TEMPLE_PAGE = 23514
-LAMP_OF_KNOWLEDGE = 23516
-GIANT_EGG_SACFULL = 23517
-GIANT_EGG_SACFULL_NOTED = 23518
-GIANT_EGG_SAC = 23520
-MASK_OF_RANUL = 23522
-MASK_OF_RANUL_NOTED = 23523
-JAR_OF_EYES = 23525
-JAR_OF_EYES_NOTED = 23526
-SARACHNIS_CUDGEL = 23528
-SARACHNIS_CUDGEL_NOTED = 23529
-SHARK_NOTED_23531 = 23531
-MONKFISH_NOTED_23532 = 23532
-COOKED_KARAMBWAN_23533 = 23533
-COOKED_KARAMBWAN_NOTED_23534 = 23534
-PRAYER_POTION4_NOTED_23535 = 23535
-PRAYER_POTION3_NOTED_23536 = 23536
-PRAYER_POTION2_NOTED_23537 = 23537
-PRAYER_POTION1_NOTED_23538 = 23538
-SUPER_ENERGY4_NOTED_23539 = 23539
-SUPER_ENERGY3_NOTED_23540 = 23540
-SUPER_ENERGY2_NOTED_23541 = 23541
-SUPER_ENERGY1_NOTED_23542 = 23542
-SUPER_COMBAT_POTION4_23543 = 23543
-SUPER_COMBAT_POTION4_NOTED_23544 = 23544
-SUPER_COMBAT_POTION3_23545 = 23545
-SUPER_COMBAT_POTION3_NOTED_23546 = 23546
-SUPER_COMBAT_POTION2_23547 = 23547
-SUPER_COMBAT_POTION2_NOTED_23548 = 23548
-SUPER_COMBAT_POTION1_23549 = 23549
-SUPER_COMBAT_POTION1_NOTED_23550 = 23550
-RANGING_POTION4_23551 = 23551
-RANGING_POTION4_NOTED_23552 = 23552
-RANGING_POTION3_23553 = 23553
-RANGING_POTION3_NOTED_23554 = 23554
-RANGING_POTION2_23555 = 23555
-RANGING_POTION2_NOTED_23556 = 23556
-RANGING_POTION1_23557 = 23557
-RANGING_POTION1_NOTED_23558 = 23558
-SANFEW_SERUM4_23559 = 23559
-SANFEW_SERUM4_NOTED_23560 = 23560
-SANFEW_SERUM3_23561 = 23561
-SANFEW_SERUM3_NOTED_23562 = 23562
-SANFEW_SERUM2_23563 = 23563
-SANFEW_SERUM2_NOTED_23564 = 23564
-SANFEW_SERUM1_23565 = 23565
-SANFEW_SERUM1_NOTED_23566 = 23566
-SUPER_RESTORE4_23567 = 23567
-SUPER_RESTORE4_NOTED_23568 = 23568
-SUPER_RESTORE3_23569 = 23569
-SUPER_RESTORE3_NOTED_23570 = 23570
-SUPER_RESTORE2_23571 = 23571
-SUPER_RESTORE2_NOTED_23572 = 23572
-SUPER_RESTORE1_23573 = 23573
-SUPER_RESTORE1_NOTED_23574 = 23574
-SARADOMIN_BREW4_23575 = 23575
-SARADOMIN_BREW4_NOTED_23576 = 23576
-SARADOMIN_BREW3_23577 = 23577
-SARADOMIN_BREW3_NOTED_23578 = 23578
-SARADOMIN_BREW2_23579 = 23579
-SARADOMIN_BREW2_NOTED_23580 = 23580
-SARADOMIN_BREW1_23581 = 23581
-SARADOMIN_BREW1_NOTED_23582 = 23582
-STAMINA_POTION4_23583 = 23583
-STAMINA_POTION4_NOTED_23584 = 23584
-STAMINA_POTION3_23585 = 23585
-STAMINA_POTION3_NOTED_23586 = 23586
-STAMINA_POTION2_23587 = 23587
-STAMINA_POTION2_NOTED_23588 = 23588
-STAMINA_POTION1_23589 = 23589
-STAMINA_POTION1_NOTED_23590 = 23590
-HELM_OF_NEITIZNOT_23591 = 23591
-HELM_OF_NEITIZNOT_NOTED_23592 = 23592
-BARROWS_GLOVES_23593 = 23593
-BARROWS_GLOVES_NOTED = 23594
-BERSERKER_RING_23595 = 23595
-BERSERKER_RING_NOTED_23596 = 23596
-DRAGON_DEFENDER_23597 = 23597
-DRAGON_DEFENDER_NOTED = 23598
-SPIRIT_SHIELD_23599 = 23599
-SPIRIT_SHIELD_NOTED_23600 = 23600
-RUNE_CROSSBOW_23601 = 23601
-RUNE_CROSSBOW_NOTED_23602 = 23602
-IMBUED_GUTHIX_CAPE_23603 = 23603
-IMBUED_GUTHIX_CAPE_NOTED = 23604
-IMBUED_ZAMORAK_CAPE_23605 = 23605
-IMBUED_ZAMORAK_CAPE_NOTED = 23606
-IMBUED_SARADOMIN_CAPE_23607 = 23607
-IMBUED_SARADOMIN_CAPE_NOTED = 23608
-AVAS_ACCUMULATOR_23609 = 23609
-AVAS_ACCUMULATOR_NOTED = 23610
-ARMADYL_CROSSBOW_23611 = 23611
-ARMADYL_CROSSBOW_NOTED_23612 = 23612
-STAFF_OF_THE_DEAD_23613 = 23613
-STAFF_OF_THE_DEAD_NOTED_23614 = 23614
-VESTAS_LONGSWORD_23615 = 23615
-VESTAS_LONGSWORD_NOTED_23616 = 23616
-ZURIELS_STAFF_23617 = 23617
-ZURIELS_STAFF_NOTED_23618 = 23618
-MORRIGANS_JAVELIN_23619 = 23619
-STATIUSS_WARHAMMER_23620 = 23620
-STATIUSS_WARHAMMER_NOTED_23621 = 23621
-INFERNAL_CAPE_23622 = 23622
-INFERNAL_CAPE_NOTED = 23623
-SEERS_RING_I_23624 = 23624
-SEERS_RING_I_NOTED = 23625
-KODAI_WAND_23626 = 23626
-KODAI_WAND_NOTED_23627 = 23627
-GHRAZI_RAPIER_23628 = 23628
-GHRAZI_RAPIER_NOTED_23629 = 23629
-HEAVY_BALLISTA_23630 = 23630
-HEAVY_BALLISTA_NOTED_23631 = 23631
-KARILS_LEATHERTOP_23632 = 23632
-DHAROKS_PLATELEGS_23633 = 23633
-TORAGS_PLATELEGS_23634 = 23634
-VERACS_PLATESKIRT_23635 = 23635
-VERACS_HELM_23636 = 23636
-TORAGS_HELM_23637 = 23637
-GUTHANS_HELM_23638 = 23638
-DHAROKS_HELM_23639 = 23639
-AMULET_OF_FURY_23640 = 23640
-AMULET_OF_FURY_NOTED_23641 = 23641
-BLESSED_SPIRIT_SHIELD_23642 = 23642
-BLESSED_SPIRIT_SHIELD_NOTED_23643 = 23643
-ETERNAL_BOOTS_23644 = 23644
-ETERNAL_BOOTS_NOTED_23645 = 23645
-BANDOS_TASSETS_23646 = 23646
-BANDOS_TASSETS_NOTED_23647 = 23647
-DRAGON_JAVELIN_23648 = 23648
-DIAMOND_BOLTS_E_23649 = 23649
-RUNE_POUCH_23650 = 23650
-RUNE_POUCH_NOTED = 23651
-MAGES_BOOK_23652 = 23652
-AHRIMS_STAFF_23653 = 23653
-OCCULT_NECKLACE_23654 = 23654
-CRYSTAL_SEEDLING = 23655
-CRYSTAL_SEEDLING_W = 23657
-CRYSTAL_SAPLING = 23659
-CRYSTAL_ACORN = 23661
-CRYSTAL_ACORN_23663 = 23663
-CRYSTAL_ACORN_23664 = 23664
-CRYSTAL_ACORN_23665 = 23665
-CRYSTAL_ACORN_23666 = 23666
-DRAGONSTONE_ARMOUR_SET = 23667
-DRAGONSTONE_ARMOUR_SET_NOTED = 23668
-FLYER_23670 = 23670
-FLYER_NOTED_23671 = 23671
-CRYSTAL_AXE = 23673
-CRYSTAL_AXE_INACTIVE = 23675
-DRAGON_PICKAXE_OR = 23677
-CRYSTAL_PICKAXE = 23680
-CRYSTAL_PICKAXE_INACTIVE = 23682
-DIVINE_SUPER_COMBAT_POTION4 = 23685
-DIVINE_SUPER_COMBAT_POTION4_NOTED = 23686
-DIVINE_SUPER_COMBAT_POTION3 = 23688
-DIVINE_SUPER_COMBAT_POTION3_NOTED = 23689
-DIVINE_SUPER_COMBAT_POTION2 = 23691
-DIVINE_SUPER_COMBAT_POTION2_NOTED = 23692
-DIVINE_SUPER_COMBAT_POTION1 = 23694
-DIVINE_SUPER_COMBAT_POTION1_NOTED = 23695
-DIVINE_SUPER_ATTACK_POTION4 = 23697
-DIVINE_SUPER_ATTACK_POTION4_NOTED = 23698
-DIVINE_SUPER_ATTACK_POTION3 = 23700
-DIVINE_SUPER_ATTACK_POTION3_NOTED = 23701
-DIVINE_SUPER_ATTACK_POTION2 = 23703
-DIVINE_SUPER_ATTACK_POTION2_NOTED = 23704
-DIVINE_SUPER_ATTACK_POTION1 = 23706
-DIVINE_SUPER_ATTACK_POTION1_NOTED = 23707
-DIVINE_SUPER_STRENGTH_POTION4 = 23709
-DIVINE_SUPER_STRENGTH_POTION4_NOTED = 23710
-DIVINE_SUPER_STRENGTH_POTION3 = 23712
-DIVINE_SUPER_STRENGTH_POTION3_NOTED = 23713
-DIVINE_SUPER_STRENGTH_POTION2 = 23715
-DIVINE_SUPER_STRENGTH_POTION2_NOTED = 23716
-DIVINE_SUPER_STRENGTH_POTION1 = 23718
-DIVINE_SUPER_STRENGTH_POTION1_NOTED = 23719
-DIVINE_SUPER_DEFENCE_POTION4 = 23721
-DIVINE_SUPER_DEFENCE_POTION4_NOTED = 23722
-DIVINE_SUPER_DEFENCE_POTION3 = 23724
-DIVINE_SUPER_DEFENCE_POTION3_NOTED = 23725
-DIVINE_SUPER_DEFENCE_POTION2 = 23727
-DIVINE_SUPER_DEFENCE_POTION2_NOTED = 23728
-DIVINE_SUPER_DEFENCE_POTION1 = 23730
-DIVINE_SUPER_DEFENCE_POTION1_NOTED = 23731
-DIVINE_RANGING_POTION4 = 23733
-DIVINE_RANGING_POTION4_NOTED = 23734
-DIVINE_RANGING_POTION3 = 23736
-DIVINE_RANGING_POTION3_NOTED = 23737
-DIVINE_RANGING_POTION2 = 23739
-DIVINE_RANGING_POTION2_NOTED = 23740
-DIVINE_RANGING_POTION1 = 23742
-DIVINE_RANGING_POTION1_NOTED = 23743
-DIVINE_MAGIC_POTION4 = 23745
-DIVINE_MAGIC_POTION4_NOTED = 23746
-DIVINE_MAGIC_POTION3 = 23748
-DIVINE_MAGIC_POTION3_NOTED = 23749
-DIVINE_MAGIC_POTION2 = 23751
-DIVINE_MAGIC_POTION2_NOTED = 23752
-DIVINE_MAGIC_POTION1 = 23754
-DIVINE_MAGIC_POTION1_NOTED = 23755
-YOUNGLLEF = 23757
-CORRUPTED_YOUNGLLEF = 23759
-SMOLCANO = 23760
-CRYSTAL_HARPOON = 23762
-CRYSTAL_HARPOON_INACTIVE = 23764
-CRYSTAL_IMPLING_JAR = 23768
-CLUE_SCROLL_ELITE_23770 = 23770
-PRIFDDINAS_TELEPORT = 23771
-SCRAWLED_NOTES = 23773
-HAND_MIRROR_23775 = 23775
-RED_CRYSTAL_23776 = 23776
-YELLOW_CRYSTAL_23777 = 23777
-GREEN_CRYSTAL_23778 = 23778
-CYAN_CRYSTAL_23779 = 23779
-BLUE_CRYSTAL_23780 = 23780
-MAGENTA_CRYSTAL_23781 = 23781
-BLACK_CRYSTAL = 23782
-GREEN_CRYSTAL_23783 = 23783
-FRACTURED_CRYSTAL_23784 = 23784
-ARDOUGNE_KNIGHT_HELM = 23785
-ARDOUGNE_KNIGHT_PLATEBODY = 23787
-ARDOUGNE_KNIGHT_PLATELEGS = 23789
-ARDOUGNE_KNIGHT_TABARD = 23791
-BLUE_LIQUID = 23792
-GREEN_POWDER = 23793
-CLEAR_LIQUID = 23794
-RED_POWDER = 23795
-ODE_TO_ETERNITY = 23796
-ELDER_CADANTINE = 23798
-ELDER_CADANTINE_POTION_UNF = 23800
-CRYSTAL_23802 = 23802
-CRYSTAL_DUST = 23804
-INVERSION_POTION = 23806
-CRYSTAL_SEED = 23808
-CRYSTAL_SEED_23810 = 23810
-ORB_OF_LIGHT_23812 = 23812
-CLUE_SCROLL_23814 = 23814
-CLUE_SCROLL_23815 = 23815
-CLUE_SCROLL_23816 = 23816
-CLUE_SCROLL_23817 = 23817
-EXPLOSIVE_POTION_23818 = 23818
-CORRUPTED_SCEPTRE = 23820
-CORRUPTED_AXE = 23821
-CORRUPTED_PICKAXE = 23822
-CORRUPTED_HARPOON = 23823
-CORRUPTED_SHARDS = 23824
-CORRUPTED_SHARDS_23825 = 23825
-CORRUPTED_SHARDS_23826 = 23826
-CORRUPTED_SHARDS_23827 = 23827
-CORRUPTED_SHARDS_23828 = 23828
-CORRUPTED_SHARDS_23829 = 23829
-CORRUPTED_DUST = 23830
-CORRUPTED_SPIKE = 23831
-CORRUPTED_BOWSTRING = 23832
-CORRUPTED_ORB = 23833
-WEAPON_FRAME = 23834
-GRYM_LEAF = 23835
-LINUM_TIRINUM = 23836
-CORRUPTED_ORE = 23837
-PHREN_BARK = 23838
-VIAL_23839 = 23839
-CORRUPTED_HELM_BASIC = 23840
-CORRUPTED_HELM_ATTUNED = 23841
-CORRUPTED_HELM_PERFECTED = 23842
-CORRUPTED_BODY_BASIC = 23843
-CORRUPTED_BODY_ATTUNED = 23844
-CORRUPTED_BODY_PERFECTED = 23845
-CORRUPTED_LEGS_BASIC = 23846
-CORRUPTED_LEGS_ATTUNED = 23847
-CORRUPTED_LEGS_PERFECTED = 23848
-CORRUPTED_HALBERD_BASIC = 23849
-CORRUPTED_HALBERD_ATTUNED = 23850
-CORRUPTED_HALBERD_PERFECTED = 23851
-CORRUPTED_STAFF_BASIC = 23852
-CORRUPTED_STAFF_ATTUNED = 23853
-CORRUPTED_STAFF_PERFECTED = 23854
-CORRUPTED_BOW_BASIC = 23855
-CORRUPTED_BOW_ATTUNED = 23856
-CORRUPTED_BOW_PERFECTED = 23857
-CORRUPTED_TELEPORT_CRYSTAL = 23858
-GAUNTLET_CAPE = 23859
-CRYSTAL_SCEPTRE = 23861
-CRYSTAL_AXE_23862 = 23862
-CRYSTAL_PICKAXE_23863 = 23863
-CRYSTAL_HARPOON_23864 = 23864
-PESTLE_AND_MORTAR_23865 = 23865
-CRYSTAL_SHARDS = 23866
-CRYSTAL_DUST_23867 = 23867
-CRYSTAL_SPIKE = 23868
-CRYSTALLINE_BOWSTRING = 23869
-CRYSTAL_ORB = 23870
-WEAPON_FRAME_23871 = 23871
-RAW_PADDLEFISH = 23872
-BURNT_FISH_23873 = 23873
-PADDLEFISH = 23874
-GRYM_LEAF_23875 = 23875
-LINUM_TIRINUM_23876 = 23876
-CRYSTAL_ORE = 23877
-PHREN_BARK_23878 = 23878
-VIAL_23879 = 23879
-WATERFILLED_VIAL = 23880
-GRYM_POTION_UNF = 23881
-EGNIOL_POTION_1 = 23882
-EGNIOL_POTION_2 = 23883
-EGNIOL_POTION_3 = 23884
-EGNIOL_POTION_4 = 23885
-CRYSTAL_HELM_BASIC = 23886
-CRYSTAL_HELM_ATTUNED = 23887
-CRYSTAL_HELM_PERFECTED = 23888
-CRYSTAL_BODY_BASIC = 23889
-CRYSTAL_BODY_ATTUNED = 23890
-CRYSTAL_BODY_PERFECTED = 23891
-CRYSTAL_LEGS_BASIC = 23892
-CRYSTAL_LEGS_ATTUNED = 23893
-CRYSTAL_LEGS_PERFECTED = 23894
-CRYSTAL_HALBERD_BASIC = 23895
-CRYSTAL_HALBERD_ATTUNED = 23896
-CRYSTAL_HALBERD_PERFECTED = 23897
-CRYSTAL_STAFF_BASIC = 23898
-CRYSTAL_STAFF_ATTUNED = 23899
-CRYSTAL_STAFF_PERFECTED = 23900
-CRYSTAL_BOW_BASIC = 23901
-CRYSTAL_BOW_ATTUNED = 23902
-CRYSTAL_BOW_PERFECTED = 23903
-TELEPORT_CRYSTAL = 23904
-TEPHRA = 23905
-REFINED_TEPHRA = 23906
-IMBUED_TEPHRA = 23907
-ZALCANO_SHARD = 23908
-ZALCANO_SHARD_NOTED = 23909
-CRYSTAL_CROWN = 23911
-CRYSTAL_CROWN_23913 = 23913
-CRYSTAL_CROWN_23915 = 23915
-CRYSTAL_CROWN_23917 = 23917
-CRYSTAL_CROWN_23919 = 23919
-CRYSTAL_CROWN_23921 = 23921
-CRYSTAL_CROWN_23923 = 23923
-CRYSTAL_CROWN_23925 = 23925
-CRYSTAL_OF_ITHELL = 23927
-CRYSTAL_OF_IORWERTH = 23929
-CRYSTAL_OF_TRAHAEARN = 23931
-CRYSTAL_OF_CADARN = 23933
-CRYSTAL_OF_CRWYS = 23935
-CRYSTAL_OF_MEILYR = 23937
-CRYSTAL_OF_HEFIN = 23939
-CRYSTAL_OF_AMLODD = 23941
-ELVEN_SIGNET = 23943
-ELVEN_SIGNET_NOTED = 23944
-ETERNAL_TELEPORT_CRYSTAL = 23946
-ELVEN_DAWN = 23948
-ELVEN_DAWN_NOTED = 23949
-ENHANCED_CRYSTAL_KEY = 23951
-CRYSTAL_TOOL_SEED = 23953
-CRYSTAL_TOOL_SEED_NOTED = 23954
-CRYSTAL_ARMOUR_SEED = 23956
-CRYSTAL_ARMOUR_SEED_NOTED = 23957
-ENHANCED_CRYSTAL_TELEPORT_SEED = 23959
-ENHANCED_CRYSTAL_TELEPORT_SEED_NOTED = 23960
-CRYSTAL_SHARD = 23962
-CRYSTAL_DUST_23964 = 23964
-CRYSTAL_SHARDS_23966 = 23966
-CRYSTAL_SHARDS_23967 = 23967
-CRYSTAL_SHARDS_23968 = 23968
-CRYSTAL_SHARDS_23969 = 23969
-CRYSTAL_SHARDS_23970 = 23970
-CRYSTAL_HELM = 23971
-CRYSTAL_HELM_INACTIVE = 23973
-CRYSTAL_BODY = 23975
-CRYSTAL_BODY_INACTIVE = 23977
-CRYSTAL_LEGS = 23979
-CRYSTAL_LEGS_INACTIVE = 23981
-CRYSTAL_BOW = 23983
-CRYSTAL_BOW_INACTIVE = 23985
-CRYSTAL_HALBERD = 23987
-CRYSTAL_HALBERD_INACTIVE = 23989
-CRYSTAL_SHIELD = 23991
-CRYSTAL_SHIELD_INACTIVE = 23993
-BLADE_OF_SAELDOR = 23995
-BLADE_OF_SAELDOR_INACTIVE = 23997
-BLADE_OF_SAELDOR_INACTIVE_NOTED = 23998
-CRYSTAL_GRAIL = 24000
-CRYSTAL_GRAIL_NOTED = 24001
-ELVEN_BOOTS = 24003
-ELVEN_BOOTS_NOTED = 24004
-ELVEN_GLOVES = 24006
-ELVEN_GLOVES_NOTED = 24007
-ELVEN_TOP = 24009
-ELVEN_TOP_NOTED = 24010
-ELVEN_SKIRT = 24012
-ELVEN_SKIRT_NOTED = 24013
-ELVEN_TOP_24015 = 24015
-ELVEN_TOP_NOTED_24016 = 24016
-ELVEN_SKIRT_24018 = 24018
-ELVEN_SKIRT_NOTED_24019 = 24019
-ELVEN_TOP_24021 = 24021
-ELVEN_TOP_NOTED_24022 = 24022
-ELVEN_LEGWEAR = 24024
-ELVEN_LEGWEAR_NOTED = 24025
-ELVEN_TOP_24027 = 24027
-ELVEN_TOP_NOTED_24028 = 24028
-MEMORIAM_CRYSTAL_1 = 24030
-MEMORIAM_CRYSTAL_2 = 24031
-MEMORIAM_CRYSTAL_3 = 24032
-MEMORIAM_CRYSTAL_4 = 24033
-DRAGONSTONE_FULL_HELM = 24034
-DRAGONSTONE_FULL_HELM_NOTED = 24035
-DRAGONSTONE_PLATEBODY = 24037
-DRAGONSTONE_PLATEBODY_NOTED = 24038
-DRAGONSTONE_PLATELEGS = 24040
-DRAGONSTONE_PLATELEGS_NOTED = 24041
-DRAGONSTONE_BOOTS = 24043
-DRAGONSTONE_BOOTS_NOTED = 24044
-DRAGONSTONE_GAUNTLETS = 24046
-DRAGONSTONE_GAUNTLETS_NOTED = 24047
-CRAZED_SCRIBBLES = 24049
-A_DEAR_FRIEND = 24051
-ON_LEPRECHAUNS = 24053
-BLOODY_DIARY = 24055
-THE_EIGHT_CLANS = 24057
-GOLLWYNS_FINAL_STATEMENT = 24059
-NIFF__HARRY = 24061
-SOGGY_JOURNAL = 24063
-EBRILLS_JOURNAL = 24065
-STAINED_JOURNAL = 24067
-THE_TRUTH_BEHIND_THE_MYTH_EXCERPT = 24069
-THE_LIVING_STATUES = 24071
-THE_SPURNED_DEMON = 24073
-LEGENDS_OF_THE_MOUNTAIN = 24075
-CRYSTAL_BOW_24123 = 24123
-CRYSTAL_HALBERD_24125 = 24125
-CRYSTAL_SHIELD_24127 = 24127
-COMBAT_PATH_STARTER_KIT = 24130
-COMBAT_PATH_VOUCHER = 24131
-MARBLE_LECTERN = 24132
-INFERNAL_MAX_CAPE_L = 24133
-FIRE_MAX_CAPE_L = 24134
-ASSEMBLER_MAX_CAPE_L = 24135
-BRONZE_DEFENDER_L = 24136
-IRON_DEFENDER_L = 24137
-STEEL_DEFENDER_L = 24138
-BLACK_DEFENDER_L = 24139
-MITHRIL_DEFENDER_L = 24140
-ADAMANT_DEFENDER_L = 24141
-RUNE_DEFENDER_L = 24142
-DRAGON_DEFENDER_L = 24143
-STAFF_OF_BALANCE = 24144
-STAFF_OF_BALANCE_NOTED = 24145
-ARMADYL_HALO_BROKEN = 24147
-BANDOS_HALO_BROKEN = 24149
-SEREN_HALO_BROKEN = 24151
-ANCIENT_HALO_BROKEN = 24153
-BRASSICA_HALO_BROKEN = 24155
-DECORATIVE_SWORD_L = 24157
-DECORATIVE_ARMOUR_L = 24158
-DECORATIVE_ARMOUR_L_24159 = 24159
-DECORATIVE_HELM_L = 24160
-DECORATIVE_SHIELD_L = 24161
-DECORATIVE_ARMOUR_L_24162 = 24162
-DECORATIVE_ARMOUR_L_24163 = 24163
-DECORATIVE_ARMOUR_L_24164 = 24164
-DECORATIVE_ARMOUR_L_24165 = 24165
-DECORATIVE_ARMOUR_L_24166 = 24166
-DECORATIVE_ARMOUR_L_24167 = 24167
-DECORATIVE_ARMOUR_L_24168 = 24168
-SARADOMIN_HALO_L = 24169
-ZAMORAK_HALO_L = 24170
-GUTHIX_HALO_L = 24171
-HEALER_HAT_L = 24172
-FIGHTER_HAT_L = 24173
-RANGER_HAT_L = 24174
-FIGHTER_TORSO_L = 24175
-PENANCE_SKIRT_L = 24176
-VOID_KNIGHT_TOP_L = 24177
-ELITE_VOID_TOP_L = 24178
-VOID_KNIGHT_ROBE_L = 24179
-ELITE_VOID_ROBE_L = 24180
-VOID_KNIGHT_MACE_L = 24181
-VOID_KNIGHT_GLOVES_L = 24182
-VOID_MAGE_HELM_L = 24183
-VOID_RANGER_HELM_L = 24184
-VOID_MELEE_HELM_L = 24185
-AVERNIC_DEFENDER_L = 24186
-TROUVER_PARCHMENT = 24187
-DEADMANS_CHEST_24189 = 24189
-DEADMANS_LEGS_24190 = 24190
-DEADMANS_CAPE_24191 = 24191
-ARMADYL_HALO = 24192
-ARMADYL_HALO_L = 24194
-BANDOS_HALO = 24195
-BANDOS_HALO_L = 24197
-SEREN_HALO = 24198
-SEREN_HALO_L = 24200
-ANCIENT_HALO = 24201
-ANCIENT_HALO_L = 24203
-BRASSICA_HALO = 24204
-BRASSICA_HALO_L = 24206
-VICTORS_CAPE_1 = 24207
-VICTORS_CAPE_10 = 24209
-VICTORS_CAPE_50 = 24211
-VICTORS_CAPE_100 = 24213
-VICTORS_CAPE_500 = 24215
-GUTHIXIAN_ICON = 24217
-SWIFT_BLADE = 24219
-SWIFT_BLADE_NOTED = 24220
-AVAS_ASSEMBLER_L = 24222
-FIRE_CAPE_L = 24223
-INFERNAL_CAPE_L = 24224
-GRANITE_MAUL_24225 = 24225
-GRANITE_MAUL_24227 = 24227
-ORNATE_MAUL_HANDLE = 24229
-ORNATE_MAUL_HANDLE_NOTED = 24230
-IMBUED_SARADOMIN_MAX_CAPE_L = 24232
-IMBUED_ZAMORAK_MAX_CAPE_L = 24233
-IMBUED_GUTHIX_MAX_CAPE_L = 24234
-HOUSE_ADVERTISEMENT = 24235
-IMBUED_SARADOMIN_CAPE_BROKEN = 24236
-IMBUED_SARADOMIN_MAX_CAPE_BROKEN = 24238
-IMBUED_GUTHIX_CAPE_BROKEN = 24240
-IMBUED_GUTHIX_MAX_CAPE_BROKEN = 24242
-IMBUED_ZAMORAK_CAPE_BROKEN = 24244
-IMBUED_ZAMORAK_MAX_CAPE_BROKEN = 24246
-IMBUED_SARADOMIN_CAPE_L = 24248
-IMBUED_GUTHIX_CAPE_L = 24249
-IMBUED_ZAMORAK_CAPE_L = 24250
-WILDERNESS_CRABS_TELEPORT = 24251
-CLUE_SCROLL_ELITE_24253 = 24253
-FANG = 24254
-VENOM_GLAND = 24255
-UNSEALED_LETTER = 24256
-UNSEALED_LETTER_24257 = 24257
-V_SIGIL = 24258
-V_SIGIL_E = 24259
-MOLTEN_GLASS_I = 24260
-LUNAR_GLASS = 24261
-POLISHING_ROCK = 24262
-BALLAD_OF_THE_BASILISK = 24263
-VS_SHIELD = 24265
-VS_SHIELD_24266 = 24266
-BASILISK_JAW = 24268
-BASILISK_JAW_NOTED = 24269
-NEITIZNOT_FACEGUARD = 24271
-BASILISK_KNIGHT = 24276
-MYSTERIOUS_EMBLEM_TIER_1 = 24277
-MYSTERIOUS_EMBLEM_TIER_2 = 24279
-MYSTERIOUS_EMBLEM_TIER_3 = 24281
-MYSTERIOUS_EMBLEM_TIER_4 = 24283
-MYSTERIOUS_EMBLEM_TIER_5 = 24285
-DECORATIVE_EMBLEM = 24287
-DAGONHAI_HAT = 24288
-DAGONHAI_HAT_NOTED = 24289
-DAGONHAI_ROBE_TOP = 24291
-DAGONHAI_ROBE_TOP_NOTED = 24292
-DAGONHAI_ROBE_BOTTOM = 24294
-DAGONHAI_ROBE_BOTTOM_NOTED = 24295
-WHITE_BED_SHEETS = 24297
-SMOKE_POWDER = 24298
-SHINY_GLASS = 24299
-SPOOKY_HOOD = 24300
-SPOOKY_ROBE = 24301
-SPOOKY_SKIRT = 24302
-SPOOKY_GLOVES = 24303
-SPOOKY_BOOTS = 24304
-SPOOKY_HOOD_24305 = 24305
-SPOOKY_ROBE_24307 = 24307
-SPOOKY_SKIRT_24309 = 24309
-SPOOKY_GLOVES_24311 = 24311
-SPOOKY_BOOTS_24313 = 24313
-SPOOKIER_HOOD = 24315
-SPOOKIER_ROBE = 24317
-SPOOKIER_SKIRT = 24319
-SPOOKIER_GLOVES = 24321
-SPOOKIER_BOOTS = 24323
-PUMPKIN_LANTERN = 24325
-SKELETON_LANTERN = 24327
-BOUNTY_CRATE = 24329
-BIRTHDAY_CAKE_24331 = 24331
-BIRTHDAY_CAKE_24332 = 24332
-DAGONHAI_ROBES_SET = 24333
-DAGONHAI_ROBES_SET_NOTED = 24334
-TARGET_TELEPORT = 24336
-BOUNTY_HUNTER_HAT_TIER_1 = 24338
-BOUNTY_HUNTER_HAT_TIER_2 = 24340
-BOUNTY_HUNTER_HAT_TIER_3 = 24342
-BOUNTY_HUNTER_HAT_TIER_4 = 24344
-BOUNTY_HUNTER_HAT_TIER_5 = 24346
-BOUNTY_HUNTER_HAT_TIER_6 = 24348
-SCROLL_BOX_BEGINNER = 24361
-SCROLL_BOX_EASY = 24362
-SCROLL_BOX_MEDIUM = 24363
-SCROLL_BOX_HARD = 24364
-SCROLL_BOX_ELITE = 24365
-SCROLL_BOX_MASTER = 24366
-CABBAGE_24367 = 24367
-CABBAGE_24368 = 24368
-TWISTED_SLAYER_HELMET = 24370
-TWISTED_DRAGON_TROPHY = 24372
-TWISTED_RUNE_TROPHY = 24374
-TWISTED_ADAMANT_TROPHY = 24376
-TWISTED_MITHRIL_TROPHY = 24378
-TWISTED_STEEL_TROPHY = 24380
-TWISTED_IRON_TROPHY = 24382
-TWISTED_BRONZE_TROPHY = 24384
-TWISTED_HAT_T3 = 24387
-TWISTED_COAT_T3 = 24389
-TWISTED_TROUSERS_T3 = 24391
-TWISTED_BOOTS_T3 = 24393
-TWISTED_CANE = 24395
-TWISTED_HAT_T2 = 24397
-TWISTED_COAT_T2 = 24399
-TWISTED_TROUSERS_T2 = 24401
-TWISTED_BOOTS_T2 = 24403
-TWISTED_HAT_T1 = 24405
-TWISTED_COAT_T1 = 24407
-TWISTED_TROUSERS_T1 = 24409
-TWISTED_BOOTS_T1 = 24411
-TWISTED_BANNER = 24413
-DEATH_RUNE_24415 = 24415
-RUNE_POUCH_L = 24416
-INQUISITORS_MACE = 24417
-GRAVESTONE = 24418
-INQUISITORS_GREAT_HELM = 24419
-INQUISITORS_HAUBERK = 24420
-INQUISITORS_PLATESKIRT = 24421
-NIGHTMARE_STAFF = 24422
-HARMONISED_NIGHTMARE_STAFF = 24423
-VOLATILE_NIGHTMARE_STAFF = 24424
-ELDRITCH_NIGHTMARE_STAFF = 24425
-CABBAGE_24426 = 24426
-CABBAGE_24427 = 24427
-GREEN_GINGERBREAD_SHIELD = 24428
-RED_GINGERBREAD_SHIELD = 24430
-BLUE_GINGERBREAD_SHIELD = 24431
-FESTIVE_CINNAMON_STICK = 24432
-FESTIVE_GINGER_POWDER = 24433
-FESTIVE_EGG = 24434
-FESTIVE_POT = 24435
-FESTIVE_FLOUR = 24436
-GINGERBREAD_SHIELD = 24437
-ICED_GINGERBREAD_SHIELD = 24438
-ICED_GINGERBREAD_SHIELD_24439 = 24439
-ICED_GINGERBREAD_SHIELD_24440 = 24440
-SCAPERUNE_TELEPORT = 24441
-BAKERY_STORAGE_KEY = 24442
-GINGERBREAD_GNOME = 24443
-TWISTED_SLAYER_HELMET_I = 24444
-TWISTED_HAT_T3_NOTED = 24446
-TWISTED_COAT_T3_NOTED = 24447
-TWISTED_TROUSERS_T3_NOTED = 24448
-TWISTED_BOOTS_T3_NOTED = 24449
-TWISTED_CANE_NOTED = 24450
-TWISTED_HAT_T2_NOTED = 24451
-TWISTED_COAT_T2_NOTED = 24452
-TWISTED_TROUSERS_T2_NOTED = 24453
-TWISTED_BOOTS_T2_NOTED = 24454
-TWISTED_HAT_T1_NOTED = 24455
-TWISTED_COAT_T1_NOTED = 24456
-TWISTED_TROUSERS_T1_NOTED = 24457
-TWISTED_BOOTS_T1_NOTED = 24458
-TWISTED_BANNER_NOTED = 24459
-TWISTED_TELEPORT_SCROLL = 24460
-TWISTED_TELEPORT_SCROLL_NOTED = 24461
-TWISTED_BLUEPRINTS = 24463
-TWISTED_BLUEPRINTS_NOTED = 24464
-TWISTED_HORNS = 24466
-TWISTED_HORNS_NOTED = 24467
-TWISTED_RELIC_HUNTER_T1_ARMOUR_SET = 24469
-TWISTED_RELIC_HUNTER_T1_ARMOUR_SET_NOTED = 24470
-TWISTED_RELIC_HUNTER_T2_ARMOUR_SET = 24472
-TWISTED_RELIC_HUNTER_T2_ARMOUR_SET_NOTED = 24473
-TWISTED_RELIC_HUNTER_T3_ARMOUR_SET = 24475
-TWISTED_RELIC_HUNTER_T3_ARMOUR_SET_NOTED = 24476
-OPEN_HERB_SACK = 24478
-SPICE_RACK = 24479
-OPEN_COAL_BAG = 24480
-OPEN_GEM_BAG = 24481
-OPEN_SEED_BOX = 24482
-PHOENIX_24483 = 24483
-PHOENIX_24484 = 24484
-PHOENIX_24485 = 24485
-PHOENIX_24486 = 24486
-INQUISITORS_ARMOUR_SET = 24488
-INQUISITORS_ARMOUR_SET_NOTED = 24489
-LITTLE_NIGHTMARE = 24491
-CLUE_SCROLL_HARD_24493 = 24493
-PUZZLE_BOX_HARD_24494 = 24494
-JAR_OF_DREAMS = 24495
-JAR_OF_DREAMS_NOTED = 24496
-INQUISITORS_MACE_NOTED = 24498
-INQUISITORS_GREAT_HELM_NOTED = 24500
-INQUISITORS_HAUBERK_NOTED = 24502
-INQUISITORS_PLATESKIRT_NOTED = 24504
-NIGHTMARE_STAFF_NOTED = 24506
-HARMONISED_ORB = 24511
-HARMONISED_ORB_NOTED = 24512
-VOLATILE_ORB = 24514
-VOLATILE_ORB_NOTED = 24515
-ELDRITCH_ORB = 24517
-ELDRITCH_ORB_NOTED = 24518
-VICTORS_CAPE_1000 = 24520
-NULL_24522 = 24522
-DEATHS_COFFER = 24523
-GRAVESTONE_24524 = 24524
-CAT_EARS = 24525
-HELL_CAT_EARS = 24527
-LAMP_OF_THE_GATHERER = 24528
-HARMONY = 24529
-RUNNER_HAT_BROKEN = 24531
-RUNNER_HAT_L = 24533
-MITHRIL_SEEDS_24534 = 24534
-MAGIC_EGG_BALL = 24535
-CARROT_SWORD = 24537
-_24CARAT_SWORD = 24539
-PAINTED_FAKE_MAGIC_EGG = 24541
-UNPAINTED_FAKE_MAGIC_EGG = 24542
-CONCH_SHELL = 24543
-BROKEN_EGG = 24544
-DUMMY_PORTAL = 24545
-CARROT = 24546
-BROKEN_GOAT_HORN = 24547
-CAKE_24549 = 24549
-BLADE_OF_SAELDOR_C = 24551
-BLADE_OF_SAELDOR_C_24553 = 24553
-PYROMANCER_SET = 24554
-TANGLEROOT_24555 = 24555
-TANGLEROOT_24557 = 24557
-TANGLEROOT_24559 = 24559
-TANGLEROOT_24561 = 24561
-TANGLEROOT_24563 = 24563
-ANTIQUE_EMBLEM_TIER_1 = 24565
-ANTIQUE_EMBLEM_TIER_2 = 24567
-ANTIQUE_EMBLEM_TIER_3 = 24569
-ANTIQUE_EMBLEM_TIER_4 = 24571
-ANTIQUE_EMBLEM_TIER_5 = 24573
-ANTIQUE_EMBLEM_TIER_6 = 24575
-ANTIQUE_EMBLEM_TIER_7 = 24577
-ANTIQUE_EMBLEM_TIER_8 = 24579
-ANTIQUE_EMBLEM_TIER_9 = 24581
-ANTIQUE_EMBLEM_TIER_10 = 24583
-LOOTING_BAG_NOTE = 24585
-RUNE_POUCH_NOTE = 24587
-BLIGHTED_MANTA_RAY = 24589
-BLIGHTED_MANTA_RAY_NOTED = 24590
-BLIGHTED_ANGLERFISH = 24592
-BLIGHTED_ANGLERFISH_NOTED = 24593
-BLIGHTED_KARAMBWAN = 24595
-BLIGHTED_KARAMBWAN_NOTED = 24596
-BLIGHTED_SUPER_RESTORE4 = 24598
-BLIGHTED_SUPER_RESTORE4_NOTED = 24599
-BLIGHTED_SUPER_RESTORE3 = 24601
-BLIGHTED_SUPER_RESTORE3_NOTED = 24602
-BLIGHTED_SUPER_RESTORE2 = 24603
-BLIGHTED_SUPER_RESTORE2_NOTED = 24604
-BLIGHTED_SUPER_RESTORE1 = 24605
-BLIGHTED_SUPER_RESTORE1_NOTED = 24606
-BLIGHTED_ANCIENT_ICE_SACK = 24607
-BLIGHTED_BIND_SACK = 24609
-BLIGHTED_SNARE_SACK = 24611
-BLIGHTED_ENTANGLE_SACK = 24613
-BLIGHTED_TELEPORT_SPELL_SACK = 24615
-VESTAS_BLIGHTED_LONGSWORD = 24617
-VESTAS_LONGSWORD_INACTIVE = 24619
-BLIGHTED_VENGEANCE_SACK = 24621
-DIVINE_BATTLEMAGE_POTION4 = 24623
-DIVINE_BATTLEMAGE_POTION4_NOTED = 24624
-DIVINE_BATTLEMAGE_POTION3 = 24626
-DIVINE_BATTLEMAGE_POTION3_NOTED = 24627
-DIVINE_BATTLEMAGE_POTION2 = 24629
-DIVINE_BATTLEMAGE_POTION2_NOTED = 24630
-DIVINE_BATTLEMAGE_POTION1 = 24632
-DIVINE_BATTLEMAGE_POTION1_NOTED = 24633
-DIVINE_BASTION_POTION4 = 24635
-DIVINE_BASTION_POTION4_NOTED = 24636
-DIVINE_BASTION_POTION3 = 24638
-DIVINE_BASTION_POTION3_NOTED = 24639
-DIVINE_BASTION_POTION2 = 24641
-DIVINE_BASTION_POTION2_NOTED = 24642
-DIVINE_BASTION_POTION1 = 24644
-DIVINE_BASTION_POTION1_NOTED = 24645
-LOGS_24650 = 24650
-RAW_SHRIMPS_24652 = 24652
-RAW_SHRIMPS_NOTED_24653 = 24653
-BONES_24655 = 24655
-ENRAGED_TEKTINY = 24656
-FLYING_VESPINA = 24658
-MASSIVE_STORAGE_UNIT = 24660
-MASSIVE_STORAGE_UNIT_24661 = 24661
-MASSIVE_STORAGE_UNIT_24662 = 24662
-MASSIVE_STORAGE_UNIT_24663 = 24663
-TWISTED_ANCESTRAL_HAT = 24664
-TWISTED_ANCESTRAL_ROBE_TOP = 24666
-TWISTED_ANCESTRAL_ROBE_BOTTOM = 24668
-TWISTED_ANCESTRAL_COLOUR_KIT = 24670
-HAEMALCHEMY_VOLUME_2 = 24672
-VYRE_NOBLE_TOP_UNSCENTED = 24673
-VYRE_NOBLE_LEGS_UNSCENTED = 24674
-VYRE_NOBLE_SHOES_UNSCENTED = 24675
-VYRE_NOBLE_TOP = 24676
-VYRE_NOBLE_LEGS = 24678
-VYRE_NOBLE_SHOES = 24680
-OLD_NOTE = 24682
-TATTY_NOTE_24684 = 24684
-JOURNAL_PAGE = 24686
-ANCIENT_ARMOUR = 24688
-TOME_OF_EXPERIENCE_24690 = 24690
-BLISTERWOOD_LOGS = 24691
-RUBY_SICKLE_B = 24693
-ENCHANTED_RUBY_SICKLE_B = 24695
-BLISTERWOOD_SICKLE = 24697
-BLISTERWOOD_FLAIL = 24699
-DARK_SQUIRREL = 24701
-VYRE = 24702
-COIN_POUCH_24703 = 24703
-DAEYALT_ESSENCE = 24704
-DAEYALT_SHARD = 24706
-VAMPYRE = 24708
-HALLOWED_CRYSTAL_SHARD = 24709
-HALLOWED_MARK = 24711
-HALLOWED_MARK_24713 = 24713
-HALLOWED_MARK_24714 = 24714
-HALLOWED_MARK_24715 = 24715
-HALLOWED_MARK_24716 = 24716
-HALLOWED_MARK_24717 = 24717
-HALLOWED_TOKEN = 24719
-HALLOWED_GRAPPLE = 24721
-HALLOWED_FOCUS = 24723
-HALLOWED_SYMBOL = 24725
-HALLOWED_HAMMER = 24727
-DARK_DYE = 24729
-HALLOWED_RING = 24731
-DARK_ACORN = 24733
-RING_OF_ENDURANCE_UNCHARGED = 24735
-RING_OF_ENDURANCE = 24736
-STRANGE_OLD_LOCKPICK = 24738
-STRANGE_OLD_LOCKPICK_FULL = 24740
-STRANGE_OLD_LOCKPICK_FULL_NOTED = 24741
-GRACEFUL_HOOD_24743 = 24743
-GRACEFUL_HOOD_24745 = 24745
-GRACEFUL_CAPE_24746 = 24746
-GRACEFUL_CAPE_24748 = 24748
-GRACEFUL_TOP_24749 = 24749
-GRACEFUL_TOP_24751 = 24751
-GRACEFUL_LEGS_24752 = 24752
-GRACEFUL_LEGS_24754 = 24754
-GRACEFUL_GLOVES_24755 = 24755
-GRACEFUL_GLOVES_24757 = 24757
-GRACEFUL_BOOTS_24758 = 24758
-GRACEFUL_BOOTS_24760 = 24760
-STRANGE_HALLOWED_TOME = 24761
-MYSTERIOUS_PAGE = 24763
-MYSTERIOUS_PAGE_24765 = 24765
-MYSTERIOUS_PAGE_24767 = 24767
-MYSTERIOUS_PAGE_24769 = 24769
-MYSTERIOUS_PAGE_24771 = 24771
-CLUE_SCROLL_ELITE_24773 = 24773
-BLOOD_PINT = 24774
-BLOOD_PINT_NOTED = 24775
-BLOOD_SHARD = 24777
-BLOOD_SHARD_NOTED = 24778
-AMULET_OF_BLOOD_FURY = 24780
-RAW_MYSTERY_MEAT = 24782
-RAW_MYSTERY_MEAT_NOTED = 24783
-COOKED_MYSTERY_MEAT = 24785
-COOKED_MYSTERY_MEAT_NOTED = 24786
-PAT_OF_NOT_GARLIC_BUTTER = 24788
-LONG_ROPE = 24790
-SEVERED_LEG_24792 = 24792
-VYRE_NOBLE_BLAZER = 24794
-VYRE_NOBLE_COAT_TAILS = 24796
-VYRE_NOBLE_VEST = 24798
-VYRE_NOBLE_PANTS = 24800
-VYRE_NOBLE_CORSET = 24802
-VYRE_NOBLE_SKIRT = 24804
-VYRE_NOBLE_DRESS_TOP = 24806
-VYRE_NOBLE_DRESS_BOTTOM = 24808
-VYRE_NOBLE_BLAZER_24810 = 24810
-VYRE_NOBLE_COAT_TAILS_24812 = 24812
-VYRE_NOBLE_VEST_24814 = 24814
-VYRE_NOBLE_PANTS_24816 = 24816
-VYRE_NOBLE_CORSET_24818 = 24818
-VYRE_NOBLE_SKIRT_24820 = 24820
-VYRE_NOBLE_DRESS_TOP_24822 = 24822
-VYRE_NOBLE_DRESS_BOTTOM_24824 = 24824
-VYRE_NOBLE_BLAZER_24826 = 24826
-VYRE_NOBLE_COAT_TAILS_24828 = 24828
-VYRE_NOBLE_VEST_24830 = 24830
-VYRE_NOBLE_PANTS_24832 = 24832
-VYRE_NOBLE_CORSET_24834 = 24834
-VYRE_NOBLE_SKIRT_24836 = 24836
-VYRE_NOBLE_DRESS_TOP_24838 = 24838
-VYRE_NOBLE_DRESS_BOTTOM_24840 = 24840
-A_TASTE_OF_HOPE = 24842
-RING_OF_ENDURANCE_UNCHARGED_24844 = 24844
-RING_OF_ENDURANCE_UNCHARGED_NOTED = 24845
-RED = 24847
-ZIGGY = 24849
-SOFT_CLAY_PACK_24851 = 24851
-BAG_FULL_OF_GEMS_24853 = 24853
-MYTHICAL_MAX_CAPE = 24855
-MYTHICAL_MAX_HOOD = 24857
-WARRIOR_PATH_STARTER_KIT = 24859
-WIZARD_PATH_STARTER_KIT = 24860
-RANGER_PATH_STARTER_KIT = 24861
-KARAMJAN_MONKEY = 24862
-ZOMBIE_MONKEY = 24863
-MANIACAL_MONKEY = 24864
-SKELETON_MONKEY = 24865
-KRUK_JR = 24866
-PRINCELY_MONKEY = 24867
-GOLDEN_ARMADYL_SPECIAL_ATTACK = 24868
-GOLDEN_BANDOS_SPECIAL_ATTACK = 24869
-GOLDEN_SARADOMIN_SPECIAL_ATTACK = 24870
-GOLDEN_ZAMORAK_SPECIAL_ATTACK = 24871
-CARPENTERS_HELMET = 24872
-CARPENTERS_SHIRT = 24874
-CARPENTERS_TROUSERS = 24876
-CARPENTERS_BOOTS = 24878
-AMYS_SAW = 24880
-PLANK_SACK = 24882
-SUPPLY_CRATE_24884 = 24884
-HOSIDIUS_BLUEPRINTS = 24885
-WOODEN_TABLE_24886 = 24886
-OAK_TABLE = 24887
-TEAK_TABLE_24888 = 24888
-MAHOGANY_TABLE_24889 = 24889
-WOODEN_TABLE_24890 = 24890
-OAK_TABLE_24891 = 24891
-TEAK_TABLE_24892 = 24892
-MAHOGANY_TABLE_24893 = 24893
-WOODEN_TABLE_24894 = 24894
-OAK_TABLE_24895 = 24895
-TEAK_TABLE_24896 = 24896
-MAHOGANY_TABLE_24897 = 24897
-WOODEN_CABINET = 24898
-OAK_CABINET = 24899
-TEAK_CABINET = 24900
-MAHOGANY_CABINET = 24901
-WOODEN_BOOKCASE_24902 = 24902
-OAK_BOOKCASE_24903 = 24903
-TEAK_BOOKCASE = 24904
-MAHOGANY_BOOKCASE_24905 = 24905
-WOODEN_WARDROBE = 24906
-OAK_WARDROBE_24907 = 24907
-TEAK_WARDROBE_24908 = 24908
-MAHOGANY_WARDROBE_24909 = 24909
-WOODEN_DRESSER = 24910
-OAK_DRESSER_24911 = 24911
-TEAK_DRESSER_24912 = 24912
-MAHOGANY_DRESSER_24913 = 24913
-WOODEN_SHELVES = 24914
-OAK_SHELVES = 24915
-TEAK_SHELVES = 24916
-MAHOGANY_SHELVES = 24917
-WOODEN_BED_24918 = 24918
-OAK_BED_24919 = 24919
-TEAK_BED_24920 = 24920
-MAHOGANY_BED = 24921
-WOODEN_BED_24922 = 24922
-OAK_BED_24923 = 24923
-TEAK_BED_24924 = 24924
-MAHOGANY_BED_24925 = 24925
-WOODEN_DRAWER = 24926
-OAK_DRAWER = 24927
-TEAK_DRAWER = 24928
-MAHOGANY_DRAWER = 24929
-WOODEN_CHAIR_24930 = 24930
-OAK_CHAIR_24931 = 24931
-TEAK_CHAIR = 24932
-MAHOGANY_CHAIR = 24933
-WOODEN_CUPBOARD = 24934
-OAK_CUPBOARD = 24935
-TEAK_CUPBOARD = 24936
-MAHOGANY_CUPBOARD = 24937
-WAXWOOD_LOG = 24938
-WAXWOOD_PLANK = 24939
-MARLOS_CRATE = 24940
-BP_OBJ = 24941
-REINFORCED_GOGGLES = 24942
-SOURHOG_FOOT = 24944
-HALLOWED_SACK = 24946
-MOONCLAN_TELEPORT = 24949
-OURANIA_TELEPORT = 24951
-WATERBIRTH_TELEPORT = 24953
-BARBARIAN_TELEPORT = 24955
-KHAZARD_TELEPORT = 24957
-FISHING_GUILD_TELEPORT = 24959
-CATHERBY_TELEPORT = 24961
-ICE_PLATEAU_TELEPORT = 24963
-CABBAGE_24971 = 24971
-CABBAGE_24972 = 24972
-CABBAGE_24973 = 24973
-CABBAGE_24974 = 24974
-HEADLESS_HEAD = 24975
-MAGICAL_PUMPKIN = 24977
-PUMPKIN_24979 = 24979
-BROWN_CANDY = 24980
-BLUE_CANDY = 24981
-WHITE_CANDY = 24982
-PURPLE_CANDY = 24983
-RED_CANDY = 24984
-GREEN_CANDY = 24985
-BLACK_CANDY = 24986
-ORANGE_CANDY = 24987
-PINK_CANDY = 24988
-RICKS_BOX = 24989
-RICKS_HEAD = 24990
-WITCHS_BREW = 24991
-SPIDER_SNACK = 24992
-INCANTATION = 24993
-CABBAGE_24994 = 24994
-CABBAGE_24995 = 24995
-CABBAGE_24996 = 24996
-CABBAGE_24997 = 24997
-TRAILBLAZER_HOOD_T3 = 25001
-TRAILBLAZER_HOOD_T3_NOTED = 25002
-TRAILBLAZER_TOP_T3 = 25004
-TRAILBLAZER_TOP_T3_NOTED = 25005
-TRAILBLAZER_TROUSERS_T3 = 25007
-TRAILBLAZER_TROUSERS_T3_NOTED = 25008
-TRAILBLAZER_BOOTS_T3 = 25010
-TRAILBLAZER_BOOTS_T3_NOTED = 25011
-TRAILBLAZER_CANE = 25013
-TRAILBLAZER_CANE_NOTED = 25014
-TRAILBLAZER_HOOD_T2 = 25016
-TRAILBLAZER_HOOD_T2_NOTED = 25017
-TRAILBLAZER_TOP_T2 = 25019
-TRAILBLAZER_TOP_T2_NOTED = 25020
-TRAILBLAZER_TROUSERS_T2 = 25022
-TRAILBLAZER_TROUSERS_T2_NOTED = 25023
-TRAILBLAZER_BOOTS_T2 = 25025
-TRAILBLAZER_BOOTS_T2_NOTED = 25026
-TRAILBLAZER_HOOD_T1 = 25028
-TRAILBLAZER_HOOD_T1_NOTED = 25029
-TRAILBLAZER_TOP_T1 = 25031
-TRAILBLAZER_TOP_T1_NOTED = 25032
-TRAILBLAZER_TROUSERS_T1 = 25034
-TRAILBLAZER_TROUSERS_T1_NOTED = 25035
-TRAILBLAZER_BOOTS_T1 = 25037
-TRAILBLAZER_BOOTS_T1_NOTED = 25038
-NULL_25040 = 25040
-NULL_25041 = 25041
-TRAILBLAZER_DRAGON_TROPHY = 25042
-TRAILBLAZER_RUNE_TROPHY = 25044
-TRAILBLAZER_ADAMANT_TROPHY = 25046
-TRAILBLAZER_MITHRIL_TROPHY = 25048
-TRAILBLAZER_STEEL_TROPHY = 25050
-TRAILBLAZER_IRON_TROPHY = 25052
-TRAILBLAZER_BRONZE_TROPHY = 25054
-TRAILBLAZER_BANNER = 25056
-TRAILBLAZER_BANNER_NOTED = 25057
-INFERNAL_HARPOON_OR = 25059
-NULL_25060 = 25060
-INFERNAL_PICKAXE_OR = 25063
-NULL_25064 = 25064
-INFERNAL_AXE_OR = 25066
-NULL_25067 = 25067
-GRACEFUL_HOOD_25069 = 25069
-GRACEFUL_HOOD_25071 = 25071
-GRACEFUL_CAPE_25072 = 25072
-GRACEFUL_CAPE_25074 = 25074
-GRACEFUL_TOP_25075 = 25075
-GRACEFUL_TOP_25077 = 25077
-GRACEFUL_LEGS_25078 = 25078
-GRACEFUL_LEGS_25080 = 25080
-GRACEFUL_GLOVES_25081 = 25081
-GRACEFUL_GLOVES_25083 = 25083
-GRACEFUL_BOOTS_25084 = 25084
-GRACEFUL_BOOTS_25086 = 25086
-TRAILBLAZER_TELEPORT_SCROLL = 25087
-TRAILBLAZER_TELEPORT_SCROLL_NOTED = 25088
-TRAILBLAZER_TOOL_ORNAMENT_KIT = 25090
-TRAILBLAZER_TOOL_ORNAMENT_KIT_NOTED = 25091
-TRAILBLAZER_GLOBE = 25093
-TRAILBLAZER_GLOBE_NOTED = 25094
-TRAILBLAZER_RUG = 25096
-TRAILBLAZER_RUG_NOTED = 25097
-TRAILBLAZER_GRACEFUL_ORNAMENT_KIT = 25099
-TRAILBLAZER_GRACEFUL_ORNAMENT_KIT_NOTED = 25100
-FAIRY_MUSHROOM = 25102
-CRYSTAL_OF_MEMORIES = 25104
-EXTRADIMENSIONAL_BAG = 25106
-EXTRADIMENSIONAL_BAG_25108 = 25108
-TRAILBLAZER_AXE = 25110
-TRAILBLAZER_PICKAXE = 25112
-TRAILBLAZER_HARPOON = 25114
-LEAGUE_TOMATO = 25117
-BEEKEEPERS_HAT = 25129
-BEEKEEPERS_TOP = 25131
-BEEKEEPERS_LEGS = 25133
-BEEKEEPERS_GLOVES = 25135
-BEEKEEPERS_BOOTS = 25137
-BONE_FRAGMENTS = 25139
-BONE_FRAGMENTS_25141 = 25141
-BONE_FRAGMENTS_25142 = 25142
-BONE_FRAGMENTS_25143 = 25143
-BONE_FRAGMENTS_25144 = 25144
-CLAY_HEAD = 25145
-FUR_HEAD = 25146
-BLOODY_HEAD = 25147
-NEILANS_JOURNAL = 25152
-ORNATE_UNDEAD_COMBAT_DUMMY = 25154
-DECORATIVE_BOOTS_BROKEN = 25155
-DECORATIVE_FULL_HELM_BROKEN = 25157
-CASTLEWARS_BREW4 = 25159
-CASTLEWARS_BREW3 = 25160
-CASTLEWARS_BREW2 = 25161
-CASTLEWARS_BREW1 = 25162
-DECORATIVE_BOOTS = 25163
-DECORATIVE_FULL_HELM = 25165
-DECORATIVE_BOOTS_25167 = 25167
-DECORATIVE_FULL_HELM_25169 = 25169
-DECORATIVE_BOOTS_25171 = 25171
-DECORATIVE_BOOTS_L = 25173
-DECORATIVE_FULL_HELM_25174 = 25174
-DECORATIVE_FULL_HELM_L = 25176
-SLAYER_HELMET_I_25177 = 25177
-BLACK_SLAYER_HELMET_I_25179 = 25179
-GREEN_SLAYER_HELMET_I_25181 = 25181
-RED_SLAYER_HELMET_I_25183 = 25183
-PURPLE_SLAYER_HELMET_I_25185 = 25185
-TURQUOISE_SLAYER_HELMET_I_25187 = 25187
-HYDRA_SLAYER_HELMET_I_25189 = 25189
-TWISTED_SLAYER_HELMET_I_25191 = 25191
-GRANITE_RING_I_25193 = 25193
-BLUE_CAPE_25195 = 25195
-SOUL_FRAGMENT = 25196
-SOUL_WARS_GUIDE = 25197
-BONES_25199 = 25199
-BONES_NOTED_25200 = 25200
-SOUL_FRAGMENT_25201 = 25201
-BANDAGES_25202 = 25202
-POTION_OF_POWER4 = 25203
-POTION_OF_POWER3 = 25204
-POTION_OF_POWER2 = 25205
-POTION_OF_POWER1 = 25206
-RED_CAPE_25207 = 25207
-BLUE_CAPE_25208 = 25208
-BARRICADE_25209 = 25209
-BARRICADE_25210 = 25210
-EXPLOSIVE_POTION_25211 = 25211
-BLUE_ICON = 25212
-BLUE_ICON_25213 = 25213
-BLUE_ICON_25214 = 25214
-BLUE_ICON_25215 = 25215
-BLUE_ICON_25216 = 25216
-BLUE_ICON_25217 = 25217
-BLUE_ICON_25218 = 25218
-BLUE_ICON_25219 = 25219
-BLUE_ICON_25220 = 25220
-BLUE_ICON_25221 = 25221
-BLUE_ICON_25222 = 25222
-BLUE_ICON_25223 = 25223
-BLUE_ICON_25224 = 25224
-BLUE_ICON_25225 = 25225
-BLUE_ICON_25226 = 25226
-BLUE_ICON_25227 = 25227
-RED_ICON = 25228
-RED_ICON_25229 = 25229
-RED_ICON_25230 = 25230
-RED_ICON_25231 = 25231
-RED_ICON_25232 = 25232
-RED_ICON_25233 = 25233
-RED_ICON_25234 = 25234
-RED_ICON_25235 = 25235
-RED_ICON_25236 = 25236
-RED_ICON_25237 = 25237
-RED_ICON_25238 = 25238
-RED_ICON_25239 = 25239
-RED_ICON_25240 = 25240
-RED_ICON_25241 = 25241
-RED_ICON_25242 = 25242
-RED_ICON_25243 = 25243
-DARK_KEY = 25244
-RING_OF_SUFFERING_I_25246 = 25246
-RING_OF_SUFFERING_RI_25248 = 25248
-SALVE_AMULETI_25250 = 25250
-RING_OF_THE_GODS_I_25252 = 25252
-TYRANNICAL_RING_I_25254 = 25254
-TREASONOUS_RING_I_25256 = 25256
-SEERS_RING_I_25258 = 25258
-ARCHERS_RING_I_25260 = 25260
-WARRIOR_RING_I_25262 = 25262
-BERSERKER_RING_I_25264 = 25264
-BLACK_MASK_10_I_25266 = 25266
-BLACK_MASK_9_I_25267 = 25267
-BLACK_MASK_8_I_25268 = 25268
-BLACK_MASK_7_I_25269 = 25269
-BLACK_MASK_6_I_25270 = 25270
-BLACK_MASK_5_I_25271 = 25271
-BLACK_MASK_4_I_25272 = 25272
-BLACK_MASK_3_I_25273 = 25273
-BLACK_MASK_2_I_25274 = 25274
-BLACK_MASK_1_I_25275 = 25275
-BLACK_MASK_I_25276 = 25276
-SALVE_AMULETEI_25278 = 25278
-ESSENCE_PACK = 25280
-SLED_25282 = 25282
-RED_FIREFLIES = 25283
-GREEN_FIREFLIES = 25284
-STICK_25285 = 25285
-MOULDY_SAWDUST = 25286
-ROTTEN_MEAT = 25287
-STALE_BREAD = 25288
-GOBLIN_STEW = 25289
-GOBLIN_GIFTS = 25290
-GIANT_BOULDER = 25314
-GOBLIN_DECORATIONS = 25316
-GNOME_CHILD_ICON = 25319
-NULL_25320 = 25320
-NULL_25321 = 25321
-_20TH_ANNIVERSARY_HAT = 25322
-_20TH_ANNIVERSARY_TOP = 25324
-_20TH_ANNIVERSARY_BOTTOM = 25326
-_20TH_ANNIVERSARY_BOOTS = 25328
-_20TH_ANNIVERSARY_GLOVES = 25330
-_20TH_ANNIVERSARY_NECKLACE = 25332
-_20TH_ANNIVERSARY_CAPE = 25334
-GNOME_CHILD_MASK = 25336
-GNOME_CHILD_ICON_25338 = 25338
-ECTOPLASMATOR = 25340
-SPOILS_OF_WAR = 25342
-SOUL_CAPE = 25344
-SOUL_CAPE_25346 = 25346
-LIL_CREATOR = 25348
-LIL_DESTRUCTOR = 25350
-TROPHY_PEDESTAL = 25351
-ORNATE_TROPHY_PEDESTAL = 25352
-OAK_TROPHY_CASE = 25353
-MAHOGANY_TROPHY_CASE = 25354
-BANNER_STAND = 25355
-ORNATE_BANNER_STAND = 25356
-OAK_OUTFIT_STAND = 25357
-MAHOGANY_OUTFIT_STAND = 25358
-LEAGUE_STATUE = 25359
-ORNATE_LEAGUE_STATUE = 25360
-TRAILBLAZER_GLOBE_25361 = 25361
-RUG_25362 = 25362
-OPULENT_RUG_25363 = 25363
-TRAILBLAZER_RUG_25364 = 25364
-LEAGUE_ACCOMPLISHMENTS_SCROLL = 25365
-LEAGUE_HALL = 25366
-INFERNAL_HARPOON_UNCHARGED_25367 = 25367
-INFERNAL_PICKAXE_UNCHARGED_25369 = 25369
-INFERNAL_AXE_UNCHARGED_25371 = 25371
-DRAGON_HARPOON_OR = 25373
-DRAGON_PICKAXE_OR_25376 = 25376
-DRAGON_AXE_OR = 25378
-TRAILBLAZER_RELIC_HUNTER_T1_ARMOUR_SET = 25380
-TRAILBLAZER_RELIC_HUNTER_T1_ARMOUR_SET_NOTED = 25381
-TRAILBLAZER_RELIC_HUNTER_T2_ARMOUR_SET = 25383
-TRAILBLAZER_RELIC_HUNTER_T2_ARMOUR_SET_NOTED = 25384
-TRAILBLAZER_RELIC_HUNTER_T3_ARMOUR_SET = 25386
-TRAILBLAZER_RELIC_HUNTER_T3_ARMOUR_SET_NOTED = 25387
-SWAMPBARK_BODY = 25389
-SWAMPBARK_BODY_NOTED = 25390
-SWAMPBARK_GAUNTLETS = 25392
-SWAMPBARK_GAUNTLETS_NOTED = 25393
-SWAMPBARK_BOOTS = 25395
-SWAMPBARK_BOOTS_NOTED = 25396
-SWAMPBARK_HELM = 25398
-SWAMPBARK_HELM_NOTED = 25399
-SWAMPBARK_LEGS = 25401
-SWAMPBARK_LEGS_NOTED = 25402
-BLOODBARK_BODY = 25404
-BLOODBARK_BODY_NOTED = 25405
-BLOODBARK_GAUNTLETS = 25407
-BLOODBARK_GAUNTLETS_NOTED = 25408
-BLOODBARK_BOOTS = 25410
-BLOODBARK_BOOTS_NOTED = 25411
-BLOODBARK_HELM = 25413
-BLOODBARK_HELM_NOTED = 25414
-BLOODBARK_LEGS = 25416
-BLOODBARK_LEGS_NOTED = 25417
-URIUM_REMAINS = 25419
-URIUM_REMAINS_NOTED = 25420
-BLEACHED_BONES = 25422
-GOLD_KEY_RED = 25424
-GOLD_KEY_BROWN = 25426
-GOLD_KEY_CRIMSON = 25428
-GOLD_KEY_BLACK = 25430
-GOLD_KEY_PURPLE = 25432
-ZEALOTS_ROBE_TOP = 25434
-ZEALOTS_ROBE_BOTTOM = 25436
-ZEALOTS_HELM = 25438
-ZEALOTS_BOOTS = 25440
-BRONZE_LOCKS = 25442
-BRONZE_LOCKS_NOTED = 25443
-STEEL_LOCKS = 25445
-STEEL_LOCKS_NOTED = 25446
-BLACK_LOCKS = 25448
-BLACK_LOCKS_NOTED = 25449
-SILVER_LOCKS = 25451
-SILVER_LOCKS_NOTED = 25452
-GOLD_LOCKS = 25454
-GOLD_LOCKS_NOTED = 25455
-BROKEN_COFFIN = 25457
-BRONZE_COFFIN = 25459
-STEEL_COFFIN = 25461
-BLACK_COFFIN = 25463
-SILVER_COFFIN = 25465
-GOLD_COFFIN = 25467
-OPEN_BRONZE_COFFIN = 25469
-OPEN_STEEL_COFFIN = 25470
-OPEN_BLACK_COFFIN = 25471
-OPEN_SILVER_COFFIN = 25472
-OPEN_GOLD_COFFIN = 25473
-TREE_WIZARDS_JOURNAL = 25474
-BLOODY_NOTES = 25476
-RUNESCROLL_OF_SWAMPBARK = 25478
-RUNESCROLL_OF_SWAMPBARK_NOTED = 25479
-RUNESCROLL_OF_BLOODBARK = 25481
-RUNESCROLL_OF_BLOODBARK_NOTED = 25482
-SOULREAPER_AXE = 25484
-WEBWEAVER_BOW = 25485
-MAGUS_RING = 25486
-VENTOR_RING = 25487
-BELLATOR_RING = 25488
-BLOOD_ANCIENT_SCEPTRE = 25489
-VOIDWAKER = 25490
-SMOKE_ANCIENT_SCEPTRE = 25491
-SHADOW_ANCIENT_SCEPTRE = 25492
-BLACK_DHIDE_CHAPS_BETA = 25493
-BLACK_DHIDE_VAMBRACES_BETA = 25494
-CRYSTAL_HELM_BETA = 25495
-CRYSTAL_BODY_BETA = 25496
-CRYSTAL_LEGS_BETA = 25497
-CLUE_SCROLL_ELITE_25498 = 25498
-CLUE_SCROLL_ELITE_25499 = 25499
-CURSED_BANANA = 25500
-BANANA_CAPE = 25502
-NULL_25504 = 25504
-NULL_25505 = 25505
-NULL_25506 = 25506
-NULL_25507 = 25507
-NULL_25508 = 25508
-NULL_25509 = 25509
-NULL_25510 = 25510
-NULL_25511 = 25511
-NULL_25512 = 25512
-NULL_25513 = 25513
-NULL_25514 = 25514
-DHAROKS_PLATEBODY_25515 = 25515
-DHAROKS_GREATAXE_25516 = 25516
-VOLATILE_NIGHTMARE_STAFF_25517 = 25517
-ANCESTRAL_HAT_25518 = 25518
-JALREKJAD = 25519
-JAR_OF_SPIRITS = 25521
-JAR_OF_SPIRITS_NOTED = 25522
-JAR_OF_SMOKE = 25524
-JAR_OF_SMOKE_NOTED = 25525
-STARDUST = 25527
-STARDUST_25529 = 25529
-STARDUST_25530 = 25530
-STARDUST_25531 = 25531
-STARDUST_25532 = 25532
-SOFT_CLAY_PACK_25533 = 25533
-ESSENCE_PACK_25535 = 25535
-BAG_FULL_OF_GEMS_25537 = 25537
-CELESTIAL_RING_UNCHARGED = 25539
-CELESTIAL_RING = 25541
-CELESTIAL_SIGNET_UNCHARGED = 25543
-CELESTIAL_SIGNET = 25545
-STAR_FRAGMENT = 25547
-GOLDEN_PROSPECTOR_HELMET = 25549
-GOLDEN_PROSPECTOR_JACKET = 25551
-GOLDEN_PROSPECTOR_LEGS = 25553
-GOLDEN_PROSPECTOR_BOOTS = 25555
-DARK_FLIPPERS = 25557
-BIG_HARPOONFISH = 25559
-STUFFED_BIG_HARPOONFISH = 25561
-MOUNTED_HARPOONFISH = 25563
-RAW_HARPOONFISH = 25564
-HARPOONFISH = 25565
-CRYSTALLISED_HARPOONFISH = 25566
-THE_DESERT_TROUT__SHIPS_LOG = 25567
-SPIRIT_ANGLERS_RESEARCH_NOTES = 25569
-DAMP_EGG = 25571
-DAMP_EGG_NOTED = 25572
-TOME_OF_WATER = 25574
-TOME_OF_WATER_EMPTY = 25576
-TOME_OF_WATER_EMPTY_NOTED = 25577
-SOAKED_PAGE = 25578
-TACKLE_BOX = 25580
-FISH_BARREL = 25582
-OPEN_FISH_BARREL = 25584
-FISH_SACK_BARREL = 25585
-OPEN_FISH_SACK_BARREL = 25587
-SPIRIT_FLAKES_25588 = 25588
-CASKET_25590 = 25590
-SPIRIT_ANGLER_HEADBAND = 25592
-SPIRIT_ANGLER_TOP = 25594
-SPIRIT_ANGLER_WADERS = 25596
-SPIRIT_ANGLER_BOOTS = 25598
-GREAT_BLUE_HERON = 25600
-TINY_TEMPOR = 25602
-GREGGS_EASTDOOR = 25604
-PROPELLER_HAT = 25606
-GREGGS_IOU = 25608
-PASTEL_FLOWERS = 25609
-THICK_DYE = 25610
-STASH_CHART = 25611
-STASH_BLUEPRINT = 25612
-BABY_MOLERAT = 25613
-LARGE_WATER_CONTAINER = 25615
-TEA_FLASK_25617 = 25617
-PLAIN_SATCHEL_25618 = 25618
-GREEN_SATCHEL_25619 = 25619
-RED_SATCHEL_25620 = 25620
-BLACK_SATCHEL_25621 = 25621
-GOLD_SATCHEL_25622 = 25622
-RUNE_SATCHEL_25623 = 25623
-UNSIRED_25624 = 25624
-BARRONITE_MACE_BROKEN = 25625
-COAL_BAG_25627 = 25627
-GEM_BAG_25628 = 25628
-PLANK_SACK_25629 = 25629
-FLAMTAER_BAG_25630 = 25630
-STEAK_SANDWICH = 25631
-IMCANDO_HAMMER_BROKEN = 25633
-BARRONITE_HEAD = 25635
-BARRONITE_HANDLE = 25637
-BARRONITE_GUARD = 25639
-BARRONITE_MACE = 25641
-BARRONITE_MACE_L = 25643
-IMCANDO_HAMMER = 25644
-SIMPLE_LOCKBOX = 25646
-SIMPLE_LOCKBOX_25647 = 25647
-ELABORATE_LOCKBOX = 25648
-ELABORATE_LOCKBOX_25649 = 25649
-ORNATE_LOCKBOX = 25650
-ORNATE_LOCKBOX_25651 = 25651
-RAW_GUPPY = 25652
-GUPPY = 25654
-RUINED_GUPPY = 25656
-RAW_CAVEFISH = 25658
-CAVEFISH = 25660
-RUINED_CAVEFISH = 25662
-RAW_TETRA = 25664
-TETRA = 25666
-RUINED_TETRA = 25668
-RAW_CATFISH = 25670
-CATFISH = 25672
-RUINED_CATFISH = 25674
-BARRONITE_SHARDS = 25676
-BARRONITE_SHARDS_25678 = 25678
-BARRONITE_SHARDS_25679 = 25679
-BARRONITE_SHARDS_25680 = 25680
-BARRONITE_SHARDS_25681 = 25681
-BARRONITE_SHARDS_25682 = 25682
-BARRONITE_SHARDS_25683 = 25683
-BARRONITE_DEPOSIT = 25684
-ANCIENT_GLOBE = 25686
-ANCIENT_LEDGER = 25688
-ANCIENT_ASTROSCOPE = 25690
-ANCIENT_TREATISE = 25692
-ANCIENT_CARCANET = 25694
-MIND_CORE = 25696
-BODY_CORE = 25698
-CHAOS_CORE = 25700
-UNGAEL_LAB_NOTES = 25702
-LITHKREN_VAULT_NOTES = 25704
-DUSTY_NOTE = 25706
-BOARD_GAME_PIECE_25708 = 25708
-STOOL_25710 = 25710
-STOOL_25711 = 25711
-CLAN_CLOAK = 25712
-CLAN_CLOAK_25714 = 25714
-CLAN_CLOAK_25715 = 25715
-CLAN_CLOAK_25716 = 25716
-CLAN_CLOAK_25717 = 25717
-CLAN_CLOAK_25718 = 25718
-CLAN_CLOAK_25719 = 25719
-CLAN_CLOAK_25720 = 25720
-CLAN_VEXILLUM = 25721
-CLAN_VEXILLUM_25723 = 25723
-CLAN_VEXILLUM_25724 = 25724
-CLAN_VEXILLUM_25725 = 25725
-CLAN_VEXILLUM_25726 = 25726
-CLAN_VEXILLUM_25727 = 25727
-CLAN_VEXILLUM_25728 = 25728
-CLAN_VEXILLUM_25729 = 25729
-BANDAGES_25730 = 25730
-HOLY_SANGUINESTI_STAFF = 25731
-HOLY_SANGUINESTI_STAFF_UNCHARGED = 25733
-HOLY_GHRAZI_RAPIER = 25734
-HOLY_SCYTHE_OF_VITUR = 25736
-HOLY_SCYTHE_OF_VITUR_UNCHARGED = 25738
-SANGUINE_SCYTHE_OF_VITUR = 25739
-SANGUINE_SCYTHE_OF_VITUR_UNCHARGED = 25741
-HOLY_ORNAMENT_KIT = 25742
-SANGUINE_ORNAMENT_KIT = 25744
-SANGUINE_DUST = 25746
-LIL_MAIDEN = 25748
-LIL_BLOAT = 25749
-LIL_NYLO = 25750
-LIL_SOT = 25751
-LIL_XARP = 25752
-ANTIQUE_LAMP_25753 = 25753
-ANTIPOISON_1 = 25754
-ANTIPOISON_2 = 25755
-ANTIPOISON_3 = 25756
-ANTIPOISON_4 = 25757
-ANTIPOISON_POTION_1 = 25758
-ANTIPOISON_POTION_2 = 25759
-ANTIPOISON_POTION_3 = 25760
-ANTIPOISON_POTION_4 = 25761
-ANTIPOISON_1_25762 = 25762
-ANTIPOISON_2_25763 = 25763
-ANTIPOISON_3_25764 = 25764
-ANTIPOISON_4_25765 = 25765
-FIENDISH_ASHES = 25766
-FIENDISH_ASHES_NOTED = 25767
-VILE_ASHES = 25769
-VILE_ASHES_NOTED = 25770
-MALICIOUS_ASHES = 25772
-MALICIOUS_ASHES_NOTED = 25773
-ABYSSAL_ASHES = 25775
-ABYSSAL_ASHES_NOTED = 25776
-INFERNAL_ASHES = 25778
-INFERNAL_ASHES_NOTED = 25779
-ASH_SANCTIFIER = 25781
-CLUE_SCROLL_MEDIUM_25783 = 25783
-CLUE_SCROLL_MEDIUM_25784 = 25784
-CHALLENGE_SCROLL_MEDIUM_25785 = 25785
-CLUE_SCROLL_ELITE_25786 = 25786
-CLUE_SCROLL_ELITE_25787 = 25787
-CLUE_SCROLL_EASY_25788 = 25788
-CLUE_SCROLL_EASY_25789 = 25789
-CLUE_SCROLL_HARD_25790 = 25790
-CLUE_SCROLL_HARD_25791 = 25791
-CLUE_SCROLL_HARD_25792 = 25792
-RECEIPT_25793 = 25793
-BONE = 25794
-ROSE = 25795
-DELIVERY_CONFIRMATION = 25796
-ORDER_FORM = 25797
-DEMONIC_INCANTATIONS = 25798
-BLOODY_KNIFE = 25799
-CULTIST_ROBE = 25800
-KOUREND_MAP = 25801
-ROSES_DIARY = 25802
-BLUISH_KEY = 25803
-COLD_KEY = 25804
-ROSES_NOTE = 25805
-ROSES_NOTE_25806 = 25806
-ROSES_NOTE_25807 = 25807
-ROSES_NOTE_25808 = 25808
-LIZARDMAN_EGG = 25809
-DAMP_KEY = 25810
-BROKEN_REDIRECTOR = 25811
-SULPHUR_POTION = 25812
-SHIELDING_POTION = 25813
-DECLARATION = 25814
-DARK_NULLIFIER = 25815
-SHAYZIEN_JOURNAL = 25816
-ROYAL_ACCORD_OF_TWILL_25817 = 25817
-BOOK_OF_THE_DEAD = 25818
-ANTIQUE_LAMP_25820 = 25820
-PROTEST_BANNER = 25822
-RESEARCH_NOTES_25824 = 25824
-LIZARDKICKER = 25826
-LIZARDKICKER_NOTED = 25827
-OLD_NOTE_25829 = 25829
-SHAYZIA_MILITARY_ORDERS = 25831
-RAW_BOAR_MEAT = 25833
-RAW_BOAR_MEAT_NOTED = 25834
-LITTLE_PARASITE = 25836
-SLEPEY_TABLET = 25837
-PARASITIC_EGG = 25838
-BANANA_HAT = 25840
-SRARACHA_25842 = 25842
-SRARACHA_25843 = 25843
-ORANGE_EGG_SAC = 25844
-BLUE_EGG_SAC = 25846
-AMETHYST_DART = 25849
-AMETHYST_DARTP = 25851
-AMETHYST_DART_TIP = 25853
-AMETHYST_DARTP_25855 = 25855
-AMETHYST_DARTP_25857 = 25857
-ENHANCED_CRYSTAL_WEAPON_SEED = 25859
-ENHANCED_CRYSTAL_WEAPON_SEED_NOTED = 25860
-BOW_OF_FAERDHINEN_INACTIVE = 25862
-BOW_OF_FAERDHINEN_INACTIVE_NOTED = 25863
-BOW_OF_FAERDHINEN = 25865
-BOW_OF_FAERDHINEN_C = 25867
-BOW_OF_FAERDHINEN_C_25869 = 25869
-BLADE_OF_SAELDOR_C_25870 = 25870
-BLADE_OF_SAELDOR_C_25872 = 25872
-BLADE_OF_SAELDOR_C_25874 = 25874
-BLADE_OF_SAELDOR_C_25876 = 25876
-BLADE_OF_SAELDOR_C_25878 = 25878
-BLADE_OF_SAELDOR_C_25880 = 25880
-BLADE_OF_SAELDOR_C_25882 = 25882
-BOW_OF_FAERDHINEN_C_25884 = 25884
-BOW_OF_FAERDHINEN_C_25886 = 25886
-BOW_OF_FAERDHINEN_C_25888 = 25888
-BOW_OF_FAERDHINEN_C_25890 = 25890
-BOW_OF_FAERDHINEN_C_25892 = 25892
-BOW_OF_FAERDHINEN_C_25894 = 25894
-BOW_OF_FAERDHINEN_C_25896 = 25896
-TZTOK_SLAYER_HELMET = 25898
-TZTOK_SLAYER_HELMET_I = 25900
-TZTOK_SLAYER_HELMET_I_25902 = 25902
-VAMPYRIC_SLAYER_HELMET = 25904
-VAMPYRIC_SLAYER_HELMET_I = 25906
-VAMPYRIC_SLAYER_HELMET_I_25908 = 25908
-TZKAL_SLAYER_HELMET = 25910
-TZKAL_SLAYER_HELMET_I = 25912
-TZKAL_SLAYER_HELMET_I_25914 = 25914
-DRAGON_HUNTER_CROSSBOW_T = 25916
-DRAGON_HUNTER_CROSSBOW_B = 25918
-ANTIQUE_LAMP_25920 = 25920
-ANTIQUE_LAMP_25921 = 25921
-ANTIQUE_LAMP_25922 = 25922
-ANTIQUE_LAMP_25923 = 25923
-ANTIQUE_LAMP_25924 = 25924
-ANTIQUE_LAMP_25925 = 25925
-GHOMMALS_HILT_1 = 25926
-GHOMMALS_HILT_2 = 25928
-GHOMMALS_HILT_3 = 25930
-GHOMMALS_HILT_4 = 25932
-GHOMMALS_HILT_5 = 25934
-GHOMMALS_HILT_6 = 25936
-ANIM_OFFHAND = 25938
-NULL_25939 = 25939
-ANIM_OFFHAND_25941 = 25941
-NULL_25942 = 25942
-ANIM_OFFHAND_25944 = 25944
-NULL_25945 = 25945
-ANIM_OFFHAND_25947 = 25947
-NULL_25948 = 25948
-ANIM_OFFHAND_25950 = 25950
-NULL_25951 = 25951
-ANIM_OFFHAND_25953 = 25953
-NULL_25954 = 25954
-COMBAT_ACHIEVEMENTS = 25956
-CORRUPTED_PADDLEFISH = 25958
-CORRUPTED_ESCAPE_CRYSTAL = 25959
-CRYSTAL_PADDLEFISH = 25960
-ESCAPE_CRYSTAL_25961 = 25961
-CRYPT_KEY = 25963
-RANIS_HEAD = 25964
-STRANGE_SPIDER_EGGS = 25965
-SULPHURIC_ACID = 25966
-STICKY_NOTE = 25967
-HESPORI_BARK = 25968
-NULL_25969 = 25969
-NULL_25970 = 25970
-NULL_25971 = 25971
-NULL_25972 = 25972
-NULL_25973 = 25973
-NULL_25974 = 25974
-LIGHTBEARER = 25975
-NULL_25977 = 25977
-NULL_25978 = 25978
-KERIS_PARTISAN = 25979
-KERIS_PARTISAN_OF_BREACHING = 25981
-NULL_25983 = 25983
-NULL_25984 = 25984
-ELIDINIS_WARD = 25985
-NULL_25987 = 25987
-NULL_25988 = 25988
-NULL_25989 = 25989
-SIGIL_OF_RESILIENCE = 25990
-SIGIL_OF_RESILIENCE_25991 = 25991
-SIGIL_OF_RESILIENCE_NOTED = 25992
-SIGIL_OF_CONSISTENCY = 25993
-SIGIL_OF_CONSISTENCY_25994 = 25994
-SIGIL_OF_CONSISTENCY_NOTED = 25995
-SIGIL_OF_THE_FORMIDABLE_FIGHTER = 25996
-SIGIL_OF_THE_FORMIDABLE_FIGHTER_25997 = 25997
-SIGIL_OF_THE_FORMIDABLE_FIGHTER_NOTED = 25998
-SIGIL_OF_THE_RIGOROUS_RANGER = 25999
-SIGIL_OF_THE_RIGOROUS_RANGER_26000 = 26000
-SIGIL_OF_THE_RIGOROUS_RANGER_NOTED = 26001
-SIGIL_OF_THE_METICULOUS_MAGE = 26002
-SIGIL_OF_THE_METICULOUS_MAGE_26003 = 26003
-SIGIL_OF_THE_METICULOUS_MAGE_NOTED = 26004
-SIGIL_OF_FORTIFICATION = 26005
-SIGIL_OF_FORTIFICATION_26006 = 26006
-SIGIL_OF_FORTIFICATION_NOTED = 26007
-SIGIL_OF_BARROWS = 26008
-SIGIL_OF_BARROWS_26009 = 26009
-SIGIL_OF_BARROWS_NOTED = 26010
-SIGIL_OF_DEFT_STRIKES = 26011
-SIGIL_OF_DEFT_STRIKES_26012 = 26012
-SIGIL_OF_DEFT_STRIKES_NOTED = 26013
-SIGIL_OF_FREEDOM = 26014
-SIGIL_OF_FREEDOM_26015 = 26015
-SIGIL_OF_FREEDOM_NOTED = 26016
-SIGIL_OF_ENHANCED_HARVEST = 26017
-SIGIL_OF_ENHANCED_HARVEST_26018 = 26018
-SIGIL_OF_ENHANCED_HARVEST_NOTED = 26019
-SIGIL_OF_STORAGE = 26020
-SIGIL_OF_STORAGE_26021 = 26021
-SIGIL_OF_STORAGE_NOTED = 26022
-SIGIL_OF_THE_SMITH = 26023
-SIGIL_OF_THE_SMITH_26024 = 26024
-SIGIL_OF_THE_SMITH_NOTED = 26025
-SIGIL_OF_THE_ALCHEMIST = 26026
-SIGIL_OF_THE_ALCHEMIST_26027 = 26027
-SIGIL_OF_THE_ALCHEMIST_NOTED = 26028
-SIGIL_OF_THE_FLETCHER = 26029
-SIGIL_OF_THE_FLETCHER_26030 = 26030
-SIGIL_OF_THE_FLETCHER_NOTED = 26031
-SIGIL_OF_THE_CHEF = 26032
-SIGIL_OF_THE_CHEF_26033 = 26033
-SIGIL_OF_THE_CHEF_NOTED = 26034
-SIGIL_OF_THE_CRAFTSMAN = 26035
-SIGIL_OF_THE_CRAFTSMAN_26036 = 26036
-SIGIL_OF_THE_CRAFTSMAN_NOTED = 26037
-SIGIL_OF_THE_ABYSS = 26038
-SIGIL_OF_THE_ABYSS_26039 = 26039
-SIGIL_OF_THE_ABYSS_NOTED = 26040
-SIGIL_OF_STAMINA = 26041
-SIGIL_OF_STAMINA_26042 = 26042
-SIGIL_OF_STAMINA_NOTED = 26043
-SIGIL_OF_THE_POTION_MASTER = 26044
-SIGIL_OF_THE_POTION_MASTER_26045 = 26045
-SIGIL_OF_THE_POTION_MASTER_NOTED = 26046
-SIGIL_OF_THE_ETERNAL_JEWELLER = 26047
-SIGIL_OF_THE_ETERNAL_JEWELLER_26048 = 26048
-SIGIL_OF_THE_ETERNAL_JEWELLER_NOTED = 26049
-SIGIL_OF_THE_TREASURE_HUNTER = 26050
-SIGIL_OF_THE_TREASURE_HUNTER_26051 = 26051
-SIGIL_OF_THE_TREASURE_HUNTER_NOTED = 26052
-SIGIL_OF_MOBILITY = 26053
-SIGIL_OF_MOBILITY_26054 = 26054
-SIGIL_OF_MOBILITY_NOTED = 26055
-SIGIL_OF_EXAGGERATION = 26056
-SIGIL_OF_EXAGGERATION_26057 = 26057
-SIGIL_OF_EXAGGERATION_NOTED = 26058
-SIGIL_OF_SPECIALISED_STRIKES = 26059
-SIGIL_OF_SPECIALISED_STRIKES_26060 = 26060
-SIGIL_OF_SPECIALISED_STRIKES_NOTED = 26061
-SIGIL_OF_THE_PORCUPINE = 26062
-SIGIL_OF_THE_PORCUPINE_26063 = 26063
-SIGIL_OF_THE_PORCUPINE_NOTED = 26064
-SIGIL_OF_BINDING = 26065
-SIGIL_OF_BINDING_26066 = 26066
-SIGIL_OF_BINDING_NOTED = 26067
-SIGIL_OF_ESCAPING = 26068
-SIGIL_OF_ESCAPING_26069 = 26069
-SIGIL_OF_ESCAPING_NOTED = 26070
-SIGIL_OF_THE_RUTHLESS_RANGER = 26071
-SIGIL_OF_THE_RUTHLESS_RANGER_26072 = 26072
-SIGIL_OF_THE_RUTHLESS_RANGER_NOTED = 26073
-SIGIL_OF_THE_FERAL_FIGHTER = 26074
-SIGIL_OF_THE_FERAL_FIGHTER_26075 = 26075
-SIGIL_OF_THE_FERAL_FIGHTER_NOTED = 26076
-SIGIL_OF_THE_MENACING_MAGE = 26077
-SIGIL_OF_THE_MENACING_MAGE_26078 = 26078
-SIGIL_OF_THE_MENACING_MAGE_NOTED = 26079
-SIGIL_OF_PROSPERITY = 26080
-SIGIL_OF_PROSPERITY_26081 = 26081
-SIGIL_OF_PROSPERITY_NOTED = 26082
-SIGIL_OF_THE_DWARVES = 26083
-SIGIL_OF_THE_DWARVES_26084 = 26084
-SIGIL_OF_THE_DWARVES_NOTED = 26085
-SIGIL_OF_THE_ELVES = 26086
-SIGIL_OF_THE_ELVES_26087 = 26087
-SIGIL_OF_THE_ELVES_NOTED = 26088
-SIGIL_OF_THE_BARBARIANS = 26089
-SIGIL_OF_THE_BARBARIANS_26090 = 26090
-SIGIL_OF_THE_BARBARIANS_NOTED = 26091
-SIGIL_OF_THE_GNOMES = 26092
-SIGIL_OF_THE_GNOMES_26093 = 26093
-SIGIL_OF_THE_GNOMES_NOTED = 26094
-SIGIL_OF_NATURE = 26095
-SIGIL_OF_NATURE_26096 = 26096
-SIGIL_OF_NATURE_NOTED = 26097
-SIGIL_OF_DEVOTION = 26098
-SIGIL_OF_DEVOTION_26099 = 26099
-SIGIL_OF_DEVOTION_NOTED = 26100
-SIGIL_OF_THE_FORAGER = 26101
-SIGIL_OF_THE_FORAGER_26102 = 26102
-SIGIL_OF_THE_FORAGER_NOTED = 26103
-SIGIL_OF_GARMENTS = 26104
-SIGIL_OF_GARMENTS_26105 = 26105
-SIGIL_OF_GARMENTS_NOTED = 26106
-SIGIL_OF_SLAUGHTER = 26107
-SIGIL_OF_SLAUGHTER_26108 = 26108
-SIGIL_OF_SLAUGHTER_NOTED = 26109
-SIGIL_OF_THE_FORTUNE_FARMER = 26110
-SIGIL_OF_THE_FORTUNE_FARMER_26111 = 26111
-SIGIL_OF_THE_FORTUNE_FARMER_NOTED = 26112
-SIGIL_OF_VERSATILITY = 26113
-SIGIL_OF_VERSATILITY_26114 = 26114
-SIGIL_OF_VERSATILITY_NOTED = 26115
-SIGIL_OF_THE_SERPENT = 26116
-SIGIL_OF_THE_SERPENT_26117 = 26117
-SIGIL_OF_THE_SERPENT_NOTED = 26118
-SIGIL_OF_SUPREME_STAMINA = 26119
-SIGIL_OF_SUPREME_STAMINA_26120 = 26120
-SIGIL_OF_SUPREME_STAMINA_NOTED = 26121
-SIGIL_OF_PRESERVATION = 26122
-SIGIL_OF_PRESERVATION_26123 = 26123
-SIGIL_OF_PRESERVATION_NOTED = 26124
-SIGIL_OF_FINALITY = 26125
-SIGIL_OF_FINALITY_26126 = 26126
-SIGIL_OF_FINALITY_NOTED = 26127
-SIGIL_OF_PIOUS_PROTECTION = 26128
-SIGIL_OF_PIOUS_PROTECTION_26129 = 26129
-SIGIL_OF_PIOUS_PROTECTION_NOTED = 26130
-SIGIL_OF_AGGRESSION = 26131
-SIGIL_OF_AGGRESSION_26132 = 26132
-SIGIL_OF_AGGRESSION_NOTED = 26133
-SIGIL_OF_RAMPAGE = 26134
-SIGIL_OF_RAMPAGE_26135 = 26135
-SIGIL_OF_RAMPAGE_NOTED = 26136
-SIGIL_OF_THE_SKILLER = 26137
-SIGIL_OF_THE_SKILLER_26138 = 26138
-SIGIL_OF_THE_SKILLER_NOTED = 26139
-SIGIL_OF_REMOTE_STORAGE = 26140
-SIGIL_OF_REMOTE_STORAGE_26141 = 26141
-SIGIL_OF_REMOTE_STORAGE_NOTED = 26142
-SIGIL_OF_LAST_RECALL = 26143
-SIGIL_OF_LAST_RECALL_26144 = 26144
-SIGIL_OF_LAST_RECALL_NOTED = 26145
-SIGIL_OF_THE_GUARDIAN_ANGEL = 26146
-SIGIL_OF_THE_GUARDIAN_ANGEL_26147 = 26147
-SIGIL_OF_THE_GUARDIAN_ANGEL_NOTED = 26148
-TUNA_26149 = 26149
-COMBAT_POTION4_26150 = 26150
-COMBAT_POTION3_26151 = 26151
-COMBAT_POTION2_26152 = 26152
-COMBAT_POTION1_26153 = 26153
-MOUNT_KARUULM_DIARY = 26154
-GROUP_IRON_HELM = 26156
-GROUP_IRON_PLATEBODY = 26158
-GROUP_IRON_PLATEBODY_26160 = 26160
-GROUP_IRON_PLATEBODY_26162 = 26162
-GROUP_IRON_PLATEBODY_26164 = 26164
-GROUP_IRON_PLATELEGS = 26166
-GROUP_IRON_BRACERS = 26168
-HARDCORE_GROUP_IRON_HELM = 26170
-HARDCORE_GROUP_IRON_PLATEBODY = 26172
-HARDCORE_GROUP_IRON_PLATEBODY_26174 = 26174
-HARDCORE_GROUP_IRON_PLATEBODY_26176 = 26176
-HARDCORE_GROUP_IRON_PLATEBODY_26178 = 26178
-HARDCORE_GROUP_IRON_PLATELEGS = 26180
-HARDCORE_GROUP_IRON_BRACERS = 26182
-BLUE_ICON_26184 = 26184
-BLUE_ICON_26185 = 26185
-BLUE_ICON_26186 = 26186
-BLUE_ICON_26187 = 26187
-BLUE_ICON_26188 = 26188
-BLUE_ICON_26189 = 26189
-BLUE_ICON_26190 = 26190
-BLUE_ICON_26191 = 26191
-BLUE_ICON_26192 = 26192
-BLUE_ICON_26193 = 26193
-BLUE_ICON_26194 = 26194
-BLUE_ICON_26195 = 26195
-BLUE_ICON_26196 = 26196
-BLUE_ICON_26197 = 26197
-BLUE_ICON_26198 = 26198
-BLUE_ICON_26199 = 26199
-RED_ICON_26200 = 26200
-RED_ICON_26201 = 26201
-RED_ICON_26202 = 26202
-RED_ICON_26203 = 26203
-RED_ICON_26204 = 26204
-RED_ICON_26205 = 26205
-RED_ICON_26206 = 26206
-RED_ICON_26207 = 26207
-RED_ICON_26208 = 26208
-RED_ICON_26209 = 26209
-RED_ICON_26210 = 26210
-RED_ICON_26211 = 26211
-RED_ICON_26212 = 26212
-RED_ICON_26213 = 26213
-RED_ICON_26214 = 26214
-RED_ICON_26215 = 26215
-NULL_26216 = 26216
-NULL_26217 = 26217
-NULL_26218 = 26218
-OSMUMTENS_FANG = 26219
-ANCIENT_CEREMONIAL_TOP = 26221
-ANCIENT_CEREMONIAL_LEGS = 26223
-ANCIENT_CEREMONIAL_MASK = 26225
-ANCIENT_CEREMONIAL_GLOVES = 26227
-ANCIENT_CEREMONIAL_BOOTS = 26229
-NIHIL_SHARD = 26231
-ANCIENT_GODSWORD = 26233
-ZARYTE_VAMBRACES = 26235
-ZARYTE_BOW = 26237
-ZARYTE_BOW_26239 = 26239
-VIRTUS_MASK = 26241
-VIRTUS_ROBE_TOP = 26243
-VIRTUS_ROBE_BOTTOM = 26245
-PUMPKIN_PIE = 26247
-NULL_26248 = 26248
-JEREDS_EMPTY_WINE_BOTTLE = 26250
-AD_COUPON = 26252
-SAUCEPAN = 26254
-UGLY_HALLOWEEN_JUMPER_ORANGE = 26256
-UGLY_HALLOWEEN_JUMPER_BLACK = 26258
-HAUNTED_WINE_BOTTLE = 26260
-RUNE_SCIMITAR_26262 = 26262
-STUDDED_BODY_26264 = 26264
-CONDENSED_GOLD = 26266
-CONDENSED_GOLD_NOTED = 26267
-GOLD_SINK = 26269
-FESTIVE_CINNAMON = 26270
-FESTIVE_HOLLY = 26272
-FESTIVE_WHITE_WINE = 26274
-NOTES_26276 = 26276
-MAGICAL_CLEANING_POTION = 26278
-PINK_STAINED_PLATEBODY = 26280
-PINK_STAINED_PLATELEGS = 26282
-PINK_STAINED_FULL_HELM = 26284
-CLEAN_PLATEBODY = 26286
-CLEAN_PLATELEGS = 26288
-CLEAN_FULL_HELM = 26290
-FESTIVE_GINGERBREAD_GNOMES = 26292
-FESTIVE_MULLED_WINE = 26294
-SNOW = 26296
-SECRET_SANTA_PRESENT = 26298
-SECRET_SANTA_PRESENT_26300 = 26300
-SECRET_SANTA_PRESENT_26302 = 26302
-CHOCOLATE_CHIPS = 26304
-CHOCOLATE_CHIPS_26306 = 26306
-A_BIG_PRESENT = 26308
-FESTIVE_ELF_SLIPPERS = 26310
-FESTIVE_ELF_HAT = 26312
-SNOWMAN_RING = 26314
-SECRET_SANTA_PRESENT_RED = 26316
-SECRET_SANTA_PRESENT_BLUE = 26318
-SECRET_SANTA_PRESENT_GREEN = 26320
-SECRET_SANTA_PRESENT_BLACK = 26322
-SECRET_SANTA_PRESENT_GOLD = 26324
-LITTLE_SNOWBALL = 26326
-SMALL_SNOWBALL = 26328
-NORMAL_SNOWBALL = 26330
-BIG_SNOWBALL = 26332
-LARGE_SNOWBALL = 26334
-HUGE_SNOWBALL = 26336
-HUMONGOUS_SNOWBALL = 26338
-ANCIENT_BREW4 = 26340
-ANCIENT_BREW3 = 26342
-ANCIENT_BREW2 = 26344
-ANCIENT_BREW1 = 26346
-NEXLING = 26348
-ANCIENT_MIX2 = 26350
-ANCIENT_MIX2_NOTED = 26351
-ANCIENT_MIX1 = 26353
-ANCIENT_MIX1_NOTED = 26354
-FROZEN_KEY_26356 = 26356
-FROZEN_KEY_PIECE_ARMADYL = 26358
-FROZEN_KEY_PIECE_BANDOS = 26360
-FROZEN_KEY_PIECE_ZAMORAK = 26362
-FROZEN_KEY_PIECE_SARADOMIN = 26364
-IMPORTANT_LETTER = 26366
-NIHIL_DUST = 26368
-ANCIENT_HILT = 26370
-NIHIL_HORN = 26372
-ZARYTE_CROSSBOW = 26374
-TORVA_FULL_HELM_DAMAGED = 26376
-TORVA_PLATEBODY_DAMAGED = 26378
-TORVA_PLATELEGS_DAMAGED = 26380
-TORVA_FULL_HELM = 26382
-TORVA_PLATEBODY = 26384
-TORVA_PLATELEGS = 26386
-ECUMENICAL_KEY_SHARD = 26388
-BLOOD_ESSENCE = 26390
-BLOOD_ESSENCE_ACTIVE = 26392
-BANDOSIAN_COMPONENTS = 26394
-ANCIENT_CEREMONIAL_TOP_NOTED = 26396
-ANCIENT_CEREMONIAL_LEGS_NOTED = 26397
-ANCIENT_CEREMONIAL_MASK_NOTED = 26398
-ANCIENT_CEREMONIAL_GLOVES_NOTED = 26399
-ANCIENT_CEREMONIAL_BOOTS_NOTED = 26400
-ANCIENT_HILT_NOTED = 26401
-ANCIENT_GODSWORD_NOTED = 26402
-ZARYTE_VAMBRACES_NOTED = 26403
-NIHIL_HORN_NOTED = 26404
-ZARYTE_CROSSBOW_NOTED = 26405
-TORVA_FULL_HELM_DAMAGED_NOTED = 26406
-TORVA_PLATEBODY_DAMAGED_NOTED = 26407
-TORVA_PLATELEGS_DAMAGED_NOTED = 26408
-TORVA_FULL_HELM_NOTED = 26409
-TORVA_PLATEBODY_NOTED = 26410
-TORVA_PLATELEGS_NOTED = 26411
-BANDOSIAN_COMPONENTS_NOTED = 26412
-ANCIENT_BREW4_NOTED = 26413
-ANCIENT_BREW3_NOTED = 26414
-ANCIENT_BREW2_NOTED = 26415
-ANCIENT_BREW1_NOTED = 26416
-CABBAGE_26417 = 26417
-CABBAGE_26418 = 26418
-CABBAGE_26419 = 26419
-CABBAGE_26420 = 26420
-SHATTERED_RELICS_VARIETY_ORNAMENT_KIT = 26421
-SHATTERED_RELICS_VARIETY_ORNAMENT_KIT_NOTED = 26422
-SHATTERED_BANNER = 26424
-SHATTERED_BANNER_NOTED = 26425
-SHATTERED_HOOD_T1 = 26427
-SHATTERED_HOOD_T1_NOTED = 26428
-SHATTERED_TOP_T1 = 26430
-SHATTERED_TOP_T1_NOTED = 26431
-SHATTERED_TROUSERS_T1 = 26433
-SHATTERED_TROUSERS_T1_NOTED = 26434
-SHATTERED_BOOTS_T1 = 26436
-SHATTERED_BOOTS_T1_NOTED = 26437
-SHATTERED_HOOD_T2 = 26439
-SHATTERED_HOOD_T2_NOTED = 26440
-SHATTERED_TOP_T2 = 26442
-SHATTERED_TOP_T2_NOTED = 26443
-SHATTERED_TROUSERS_T2 = 26445
-SHATTERED_TROUSERS_T2_NOTED = 26446
-SHATTERED_BOOTS_T2 = 26448
-SHATTERED_BOOTS_T2_NOTED = 26449
-SHATTERED_HOOD_T3 = 26451
-SHATTERED_HOOD_T3_NOTED = 26452
-SHATTERED_TOP_T3 = 26454
-SHATTERED_TOP_T3_NOTED = 26455
-SHATTERED_TROUSERS_T3 = 26457
-SHATTERED_TROUSERS_T3_NOTED = 26458
-SHATTERED_BOOTS_T3 = 26460
-SHATTERED_BOOTS_T3_NOTED = 26461
-VOID_KNIGHT_TOP_OR = 26463
-VOID_KNIGHT_ROBE_OR = 26465
-VOID_KNIGHT_GLOVES_OR = 26467
-ELITE_VOID_TOP_OR = 26469
-ELITE_VOID_ROBE_OR = 26471
-VOID_MAGE_HELM_OR = 26473
-VOID_RANGER_HELM_OR = 26475
-VOID_MELEE_HELM_OR = 26477
-SHATTERED_RELICS_VOID_ORNAMENT_KIT = 26479
-SHATTERED_RELICS_VOID_ORNAMENT_KIT_NOTED = 26480
-ABYSSAL_WHIP_OR = 26482
-ABYSSAL_TENTACLE_OR = 26484
-RUNE_CROSSBOW_OR = 26486
-BOOK_OF_BALANCE_OR = 26488
-BOOK_OF_DARKNESS_OR = 26490
-BOOK_OF_LAW_OR = 26492
-BOOK_OF_WAR_OR = 26494
-HOLY_BOOK_OR = 26496
-UNHOLY_BOOK_OR = 26498
-SHATTERED_TELEPORT_SCROLL = 26500
-SHATTERED_TELEPORT_SCROLL_NOTED = 26501
-SHATTERED_RELICS_BRONZE_TROPHY = 26503
-SHATTERED_RELICS_IRON_TROPHY = 26505
-SHATTERED_RELICS_STEEL_TROPHY = 26507
-SHATTERED_RELICS_MITHRIL_TROPHY = 26509
-SHATTERED_RELICS_ADAMANT_TROPHY = 26511
-SHATTERED_RELICS_RUNE_TROPHY = 26513
-SHATTERED_RELICS_DRAGON_TROPHY = 26515
-SHATTERED_CANE = 26517
-SHATTERED_CANE_NOTED = 26518
-CANNON_BASE_OR = 26520
-CANNON_STAND_OR = 26522
-CANNON_BARRELS_OR = 26524
-CANNON_FURNACE_OR = 26526
-SHATTERED_CANNON_ORNAMENT_KIT = 26528
-SHATTERED_CANNON_ORNAMENT_KIT_NOTED = 26529
-MYSTIC_HAT_OR = 26531
-MYSTIC_ROBE_TOP_OR = 26533
-MYSTIC_ROBE_BOTTOM_OR = 26535
-MYSTIC_GLOVES_OR = 26537
-MYSTIC_BOOTS_OR = 26539
-SHATTERED_RELICS_MYSTIC_ORNAMENT_KIT = 26541
-SHATTERED_RELICS_MYSTIC_ORNAMENT_KIT_NOTED = 26542
-UNIDENTIFIED_FRAGMENT_HARVESTING = 26544
-UNIDENTIFIED_FRAGMENT_PRODUCTION = 26545
-UNIDENTIFIED_FRAGMENT_SKILLING = 26546
-UNIDENTIFIED_FRAGMENT_COMBAT = 26547
-UNIDENTIFIED_FRAGMENT_MISC = 26548
-PORTABLE_WAYSTONE = 26549
-ARCANE_GRIMOIRE = 26551
-SHATTERED_RELIC_HUNTER_T1_ARMOUR_SET = 26554
-SHATTERED_RELIC_HUNTER_T1_ARMOUR_SET_NOTED = 26555
-SHATTERED_RELIC_HUNTER_T2_ARMOUR_SET = 26557
-SHATTERED_RELIC_HUNTER_T2_ARMOUR_SET_NOTED = 26558
-SHATTERED_RELIC_HUNTER_T3_ARMOUR_SET = 26560
-SHATTERED_RELIC_HUNTER_T3_ARMOUR_SET_NOTED = 26561
-CLUE_SCROLL_HARD_26566 = 26566
-WHITE_GOBLIN_MAIL = 26567
-PHARMAKOS_BERRIES = 26569
-EKELESHUUN_KEY = 26571
-NAROGOSHUUN_KEY = 26572
-HUZAMOGAARB_KEY = 26573
-SARAGORGAK_KEY = 26574
-HOROGOTHGAR_KEY = 26575
-YURKOLGOKH_KEY = 26576
-PLAIN_OF_MUD_SPHERE = 26577
-WHITEFISH = 26579
-GOBLIN_POTION4 = 26581
-GOBLIN_POTION3 = 26583
-GOBLIN_POTION2 = 26585
-GOBLIN_POTION1 = 26587
-SNOTHEADS_BONE = 26589
-SNAILFEETS_BONE = 26590
-MOSSCHINS_BONE = 26591
-REDEYES_BONE = 26592
-STRONGBONES_BONE = 26593
-GRUBFOOT = 26594
-ZANIK_26595 = 26595
-NOTES_26596 = 26596
-DESERT_BAIT = 26598
-TINY_FISH = 26600
-OSMANS_REPORT = 26602
-OSMANS_REPORT_NOTED = 26603
-TREASURE_CLUE_ONE = 26605
-TREASURE_CLUE_TWO = 26607
-TREASURE_CLUE_THREE = 26609
-ZEKES_CHALLENGE_SCROLL = 26611
-CAPT_ARNAVS_CHEST = 26613
-BUCKET_COOKOUT = 26615
-BUCKET_OF_WATER_COOKOUT = 26617
-POT_COOKOUT = 26619
-POT_OF_FLOUR_COOKOUT = 26621
-TOMATO_COOKOUT = 26623
-CHEESE_COOKOUT = 26625
-BANANA_COOKOUT = 26627
-PIZZA_BASE_COOKOUT = 26629
-INCOMPLETE_PIZZA_COOKOUT = 26631
-UNCOOKED_PIZZA_COOKOUT = 26633
-PLAIN_PIZZA_COOKOUT = 26635
-BURNT_PIZZA_COOKOUT = 26637
-BREAD_DOUGH_COOKOUT = 26639
-BREAD_COOKOUT = 26641
-BURNT_BREAD_COOKOUT = 26643
-BANANA_PIZZA_COOKOUT = 26645
-BURNT_BANANA_PIZZA_COOKOUT = 26647
-SKIS = 26649
-LOOT_KEY = 26651
-LOOT_KEY_26652 = 26652
-LOOT_KEY_26653 = 26653
-LOOT_KEY_26654 = 26654
-LOOT_KEY_26655 = 26655
-SHOE_26656 = 26656
-SHOE_26657 = 26657
-SHOE_26658 = 26658
-SHOE_26659 = 26659
-SHOE_26660 = 26660
-SHOE_26661 = 26661
-SHOE_26662 = 26662
-SHOE_26663 = 26663
-SHOE_26664 = 26664
-SHOE_26665 = 26665
-SHOE_26666 = 26666
-SHOE_26667 = 26667
-SHOE_26668 = 26668
-SHOE_26669 = 26669
-SHOE_26670 = 26670
-SHOE_26671 = 26671
-SHOE_26672 = 26672
-SHOE_26673 = 26673
-SLAYER_HELMET_I_26674 = 26674
-BLACK_SLAYER_HELMET_I_26675 = 26675
-GREEN_SLAYER_HELMET_I_26676 = 26676
-RED_SLAYER_HELMET_I_26677 = 26677
-PURPLE_SLAYER_HELMET_I_26678 = 26678
-TURQUOISE_SLAYER_HELMET_I_26679 = 26679
-HYDRA_SLAYER_HELMET_I_26680 = 26680
-TWISTED_SLAYER_HELMET_I_26681 = 26681
-TZTOK_SLAYER_HELMET_I_26682 = 26682
-VAMPYRIC_SLAYER_HELMET_I_26683 = 26683
-TZKAL_SLAYER_HELMET_I_26684 = 26684
-GRANITE_RING_I_26685 = 26685
-MAOMAS_MED_HELM_BROKEN = 26686
-MAOMAS_FULL_HELM_BROKEN = 26687
-MAOMAS_GREAT_HELM_BROKEN = 26688
-CALAMITY_CHEST_BROKEN = 26689
-SUPERIOR_CALAMITY_CHEST_BROKEN = 26690
-ELITE_CALAMITY_CHEST_BROKEN = 26691
-CALAMITY_BREECHES_BROKEN = 26692
-SUPERIOR_CALAMITY_BREECHES_BROKEN = 26693
-ELITE_CALAMITY_BREECHES_BROKEN = 26694
-CENTURION_CUIRASS_BROKEN = 26695
-WRISTBANDS_OF_THE_ARENA_BROKEN = 26696
-HARDENED_WRISTBANDS_OF_THE_ARENA_BROKEN = 26697
-KORIFFS_HEADBAND_BROKEN = 26698
-KORIFFS_COWL_BROKEN = 26699
-KORIFFS_COIF_BROKEN = 26700
-SAIKAS_HOOD_BROKEN = 26701
-SAIKAS_VEIL_BROKEN = 26702
-SAIKAS_SHROUD_BROKEN = 26703
-BLIGHTED_WAVE_SACK = 26704
-BLIGHTED_SURGE_SACK = 26705
-SCROLL_OF_IMBUING = 26706
-DRAGON_CLAWS_ORNAMENT_KIT = 26707
-DRAGON_CLAWS_OR = 26708
-DRAGON_WARHAMMER_ORNAMENT_KIT = 26709
-DRAGON_WARHAMMER_OR = 26710
-HEAVY_BALLISTA_ORNAMENT_KIT = 26711
-HEAVY_BALLISTA_OR = 26712
-ARMADYL_ARMOUR_ORNAMENT_KIT = 26713
-ARMADYL_HELMET_OR = 26714
-ARMADYL_CHESTPLATE_OR = 26715
-ARMADYL_CHAINSKIRT_OR = 26716
-BANDOS_ARMOUR_ORNAMENT_KIT = 26717
-BANDOS_CHESTPLATE_OR = 26718
-BANDOS_TASSETS_OR = 26719
-BANDOS_BOOTS_OR = 26720
-CENTURION_CUIRASS = 26721
-CENTURION_CUIRASS_L = 26722
-WRISTBANDS_OF_THE_ARENA = 26723
-WRISTBANDS_OF_THE_ARENA_L = 26724
-WRISTBANDS_OF_THE_ARENA_C = 26725
-WRISTBANDS_OF_THE_ARENA_CL = 26726
-WRISTBANDS_OF_THE_ARENA_I = 26727
-WRISTBANDS_OF_THE_ARENA_IL = 26728
-WRISTBANDS_OF_THE_ARENA_IC = 26729
-WRISTBANDS_OF_THE_ARENA_ILC = 26730
-SAIKAS_HOOD = 26731
-SAIKAS_HOOD_L = 26732
-SAIKAS_VEIL = 26733
-SAIKAS_VEIL_L = 26734
-SAIKAS_SHROUD = 26735
-SAIKAS_SHROUD_L = 26736
-KORIFFS_HEADBAND = 26737
-KORIFFS_HEADBAND_L = 26738
-KORIFFS_COWL = 26739
-KORIFFS_COWL_L = 26740
-KORIFFS_COIF = 26741
-KORIFFS_COIF_L = 26742
-MAOMAS_MED_HELM = 26743
-MAOMAS_MED_HELM_L = 26744
-MAOMAS_FULL_HELM = 26745
-MAOMAS_FULL_HELM_L = 26746
-MAOMAS_GREAT_HELM = 26747
-MAOMAS_GREAT_HELM_L = 26748
-CALAMITY_CHEST = 26749
-CALAMITY_CHEST_L = 26750
-SUPERIOR_CALAMITY_CHEST = 26751
-SUPERIOR_CALAMITY_CHEST_L = 26752
-ELITE_CALAMITY_CHEST = 26753
-ELITE_CALAMITY_CHEST_L = 26754
-CALAMITY_BREECHES = 26755
-CALAMITY_BREECHES_L = 26756
-SUPERIOR_CALAMITY_BREECHES = 26757
-SUPERIOR_CALAMITY_BREECHES_L = 26758
-ELITE_CALAMITY_BREECHES = 26759
-ELITE_CALAMITY_BREECHES_L = 26760
-RING_OF_SUFFERING_I_26761 = 26761
-RING_OF_SUFFERING_RI_26762 = 26762
-SALVE_AMULETI_26763 = 26763
-RING_OF_THE_GODS_I_26764 = 26764
-TYRANNICAL_RING_I_26765 = 26765
-TREASONOUS_RING_I_26766 = 26766
-SEERS_RING_I_26767 = 26767
-ARCHERS_RING_I_26768 = 26768
-WARRIOR_RING_I_26769 = 26769
-BERSERKER_RING_I_26770 = 26770
-BLACK_MASK_10_I_26771 = 26771
-BLACK_MASK_9_I_26772 = 26772
-BLACK_MASK_8_I_26773 = 26773
-BLACK_MASK_7_I_26774 = 26774
-BLACK_MASK_6_I_26775 = 26775
-BLACK_MASK_5_I_26776 = 26776
-BLACK_MASK_4_I_26777 = 26777
-BLACK_MASK_3_I_26778 = 26778
-BLACK_MASK_2_I_26779 = 26779
-BLACK_MASK_1_I_26780 = 26780
-BLACK_MASK_I_26781 = 26781
-SALVE_AMULETEI_26782 = 26782
-COLOSSAL_POUCH = 26784
-COLOSSAL_POUCH_26786 = 26786
-GOLD_TIARA = 26788
-GOLD_TIARA_NOTED = 26789
-ABYSSAL_PEARLS = 26792
-ABYSSAL_PEARLS_26794 = 26794
-ABYSSAL_PEARLS_26795 = 26795
-ABYSSAL_PEARLS_26796 = 26796
-ABYSSAL_PEARLS_26797 = 26797
-CATALYTIC_TALISMAN = 26798
-CATALYTIC_TALISMAN_NOTED = 26799
-CATALYTIC_TIARA = 26801
-CATALYTIC_TIARA_NOTED = 26802
-ELEMENTAL_TIARA = 26804
-ELEMENTAL_TIARA_NOTED = 26805
-ABYSSAL_GREEN_DYE = 26807
-ABYSSAL_BLUE_DYE = 26809
-ABYSSAL_RED_DYE = 26811
-ABYSSAL_NEEDLE = 26813
-RING_OF_THE_ELEMENTS = 26815
-RING_OF_THE_ELEMENTS_NOTED = 26816
-RING_OF_THE_ELEMENTS_26818 = 26818
-GUARDIANS_EYE = 26820
-ABYSSAL_LANTERN = 26822
-ABYSSAL_LANTERN_NORMAL_LOGS = 26824
-ABYSSAL_LANTERN_BLUE_LOGS = 26826
-ABYSSAL_LANTERN_RED_LOGS = 26828
-ABYSSAL_LANTERN_WHITE_LOGS = 26830
-ABYSSAL_LANTERN_PURPLE_LOGS = 26832
-ABYSSAL_LANTERN_GREEN_LOGS = 26834
-ABYSSAL_LANTERN_OAK_LOGS = 26836
-ABYSSAL_LANTERN_WILLOW_LOGS = 26838
-ABYSSAL_LANTERN_MAPLE_LOGS = 26840
-ABYSSAL_LANTERN_YEW_LOGS = 26842
-ABYSSAL_LANTERN_BLISTERWOOD_LOGS = 26844
-ABYSSAL_LANTERN_MAGIC_LOGS = 26846
-ABYSSAL_LANTERN_REDWOOD_LOGS = 26848
-HAT_OF_THE_EYE = 26850
-ROBE_TOP_OF_THE_EYE = 26852
-ROBE_BOTTOMS_OF_THE_EYE = 26854
-BOOTS_OF_THE_EYE = 26856
-HAT_OF_THE_EYE_RED = 26858
-ROBE_TOP_OF_THE_EYE_RED = 26860
-ROBE_BOTTOMS_OF_THE_EYE_RED = 26862
-HAT_OF_THE_EYE_GREEN = 26864
-ROBE_TOP_OF_THE_EYE_GREEN = 26866
-ROBE_BOTTOMS_OF_THE_EYE_GREEN = 26868
-HAT_OF_THE_EYE_BLUE = 26870
-ROBE_TOP_OF_THE_EYE_BLUE = 26872
-ROBE_BOTTOMS_OF_THE_EYE_BLUE = 26874
-ATLAXS_DIARY = 26876
-GUARDIAN_FRAGMENTS = 26878
-GUARDIAN_ESSENCE = 26879
-CATALYTIC_GUARDIAN_STONE = 26880
-ELEMENTAL_GUARDIAN_STONE = 26881
-UNCHARGED_CELL = 26882
-WEAK_CELL = 26883
-MEDIUM_CELL = 26884
-STRONG_CELL = 26885
-OVERCHARGED_CELL = 26886
-PORTAL_TALISMAN_AIR = 26887
-PORTAL_TALISMAN_WATER = 26888
-PORTAL_TALISMAN_EARTH = 26889
-PORTAL_TALISMAN_FIRE = 26890
-PORTAL_TALISMAN_MIND = 26891
-PORTAL_TALISMAN_CHAOS = 26892
-PORTAL_TALISMAN_DEATH = 26893
-PORTAL_TALISMAN_BLOOD = 26894
-PORTAL_TALISMAN_BODY = 26895
-PORTAL_TALISMAN_COSMIC = 26896
-PORTAL_TALISMAN_NATURE = 26897
-PORTAL_TALISMAN_LAW = 26898
-GREATISH_GUARDIAN = 26899
-ABYSSAL_PROTECTOR = 26901
-EYE_AMULET = 26903
-STRONG_CUP_OF_TEA = 26904
-ABYSSAL_INCANTATION = 26905
-COLOSSAL_POUCH_26906 = 26906
-INTRICATE_POUCH = 26908
-TARNISHED_LOCKET = 26910
-LOST_BAG = 26912
-AMULET_OF_THE_EYE = 26914
-SPECIAL_HOT_SAUCE = 26916
-SPECIAL_SUPER_HOT_KEBAB = 26917
-SECRET_REPORT = 26918
-BIG_BUCKET = 26919
-BIG_BUCKET_OF_CAMEL_MILK = 26920
-BIG_BUCKET_OF_FROZEN_CAMEL_MILK = 26921
-MAGICAL_CLEANING_POTION_26924 = 26924
-COOLER = 26925
-EASTER_EGG_26926 = 26926
-MELTED_EASTER_EGG = 26927
-ICE_CREAM_EASTER_EGG = 26928
-BLUNT_SCIMITARS = 26929
-WASHING_LINE = 26930
-TANNING_WHEEL = 26931
-VAT_DIRTY = 26932
-VAT_CLEANED = 26933
-WOODEN_POLE = 26934
-CHURNING_MACHINE = 26935
-FROZEN_CHURNING_MACHINE = 26936
-EASTER_HAT = 26937
-CRATE_RING = 26939
-POLYELEMENTAL_GUARDIAN_STONE = 26941
-MESSAGE_26942 = 26942
-CLUE_SCROLL_ELITE_26943 = 26943
-CLUE_SCROLL_ELITE_26944 = 26944
-PHARAOHS_SCEPTRE_UNCHARGED = 26945
-PHARAOHS_SCEPTRE_UNCHARGED_NOTED = 26946
-PHARAOHS_SCEPTRE_26948 = 26948
-PHARAOHS_SCEPTRE_26950 = 26950
-SCARAB_MOULD = 26952
-SCARAB_EMBLEM = 26953
-STONE_TABLET_26954 = 26954
-CHEST_26955 = 26955
-SCARAB_EMBLEM_26956 = 26956
-HUMAN_EMBLEM = 26957
-BABOON_EMBLEM = 26958
-CROCODILE_EMBLEM = 26959
-RUSTY_KEY = 26960
-LILY_OF_THE_ELID = 26961
-CURE_CRATE = 26962
-ODD_SPECTACLES = 26963
-BOTTLE_OF_TONIC = 26965
-CIRCLET_OF_WATER_UNCHARGED = 26967
-CIRCLET_OF_WATER = 26969
-CABBAGE_26971 = 26971
-CABBAGE_26972 = 26972
-CABBAGE_26973 = 26973
-CABBAGE_26974 = 26974
-CABBAGE_26975 = 26975
-CABBAGE_26976 = 26976
-CABBAGE_26977 = 26977
-CABBAGE_26978 = 26978
-CABBAGE_26979 = 26979
-CABBAGE_26980 = 26980
-NULL_26981 = 26981
-NULL_26982 = 26982
-NULL_26983 = 26983
-LOST_BAG_26984 = 26984
-LOST_BAG_26986 = 26986
-LOST_BAG_26988 = 26988
-AMULET_OF_THE_EYE_26990 = 26990
-AMULET_OF_THE_EYE_26992 = 26992
-AMULET_OF_THE_EYE_26994 = 26994
-ENSOULED_HELLHOUND_HEAD = 26996
-ENSOULED_HELLHOUND_HEAD_26997 = 26997
-ENSOULED_HELLHOUND_HEAD_NOTED = 26998
-VOID_KNIGHT_TOP_LOR = 27000
-VOID_KNIGHT_ROBE_LOR = 27001
-VOID_KNIGHT_GLOVES_LOR = 27002
-ELITE_VOID_TOP_LOR = 27003
-ELITE_VOID_ROBE_LOR = 27004
-VOID_MAGE_HELM_LOR = 27005
-VOID_RANGER_HELM_LOR = 27006
-VOID_MELEE_HELM_LOR = 27007
-DRAGON_DEFENDER_LT = 27008
-RUNE_DEFENDER_LT = 27009
-PREFORM = 27010
-DOUBLE_AMMO_MOULD = 27012
-KOVACS_GROG = 27014
-KOVACS_GROG_NOTED = 27015
-SMITHING_CATALYST = 27017
-ORE_PACK = 27019
-COLOSSAL_BLADE = 27021
-SMITHS_TUNIC = 27023
-SMITHS_TROUSERS = 27025
-SMITHS_BOOTS = 27027
-SMITHS_GLOVES = 27029
-SMITHS_GLOVES_I = 27031
-NULL_27033 = 27033
-NULL_27034 = 27034
-FLOWER_CROWN = 27035
-LEGENDARY_RED_ROSE_SEED = 27037
-GORGEOUS_ORANGE_LILY_SEED = 27038
-BEAUTIFUL_YELLOW_PANSY_SEED = 27039
-TENACIOUS_INDIGO_IRIS_SEED = 27040
-QUALITY_VIOLET_TULIP_SEED = 27041
-GROUP_IRON_HELM_UNRANKED = 27042
-GROUP_IRON_PLATELEGS_UNRANKED = 27044
-GROUP_IRON_BRACERS_UNRANKED = 27046
-GROUP_IRON_PLATEBODY_UNRANKED = 27048
-GROUP_IRON_PLATEBODY_UNRANKED_27050 = 27050
-GROUP_IRON_PLATEBODY_UNRANKED_27052 = 27052
-GROUP_IRON_PLATEBODY_UNRANKED_27054 = 27054
-RUNE_POUCH_27086 = 27086
-NULL_27087 = 27087
-ELDER_MAUL_ORNAMENT_KIT = 27098
-ELDER_MAUL_OR = 27100
-MITHRIL_GLOVES_WRAPPED = 27110
-RUNE_GLOVES_WRAPPED = 27111
-BARROWS_GLOVES_WRAPPED = 27112
-ELDER_CHAOS_ROBES_ORNAMENT_KIT = 27113
-ELDER_CHAOS_TOP_OR = 27115
-ELDER_CHAOS_ROBE_OR = 27117
-ELDER_CHAOS_HOOD_OR = 27119
-DAGONHAI_ROBES_ORNAMENT_KIT = 27121
-DAGONHAI_HAT_OR = 27123
-DAGONHAI_ROBE_TOP_OR = 27125
-DAGONHAI_ROBE_BOTTOM_OR = 27127
-FLOWER_CROWN_27141 = 27141
-FLOWER_CROWN_27143 = 27143
-FLOWER_CROWN_27145 = 27145
-FLOWER_CROWN_27147 = 27147
-FLOWER_CROWN_27149 = 27149
-FLOWER_CROWN_27151 = 27151
-FLOWER_CROWN_27153 = 27153
-FLOWER_CROWN_27155 = 27155
-DRAGON_KNIFE_27157 = 27157
-MYSTIC_ROBE_TOP_DARK_27158 = 27158
-MYSTIC_ROBE_BOTTOM_DARK_27159 = 27159
-MYSTIC_ROBE_TOP_LIGHT_27160 = 27160
-MYSTIC_ROBE_BOTTOM_LIGHT_27161 = 27161
-WIZARD_BOOTS_27162 = 27162
-GUTHIX_HALO_27163 = 27163
-ZAMORAK_HALO_27164 = 27164
-SARADOMIN_HALO_27165 = 27165
-GHOSTLY_HOOD_27166 = 27166
-GHOSTLY_ROBE_27167 = 27167
-GHOSTLY_ROBE_27168 = 27168
-BERSERKER_HELM_27169 = 27169
-INFINITY_BOOTS_27170 = 27170
-TORMENTED_BRACELET_27171 = 27171
-NECKLACE_OF_ANGUISH_27172 = 27172
-AMULET_OF_TORTURE_27173 = 27173
-ELDER_CHAOS_TOP_27174 = 27174
-ELDER_CHAOS_ROBE_27175 = 27175
-ELDER_CHAOS_HOOD_27176 = 27176
-FREMENNIK_KILT_27177 = 27177
-SPIKED_MANACLES_27178 = 27178
-RANGERS_TUNIC_27179 = 27179
-GUTHIX_CHAPS_27180 = 27180
-ZAMORAK_CHAPS_27181 = 27181
-SARADOMIN_CHAPS_27182 = 27182
-_3RD_AGE_MAGE_HAT_27183 = 27183
-ANCIENT_GODSWORD_27184 = 27184
-RUNE_DEFENDER_27185 = 27185
-ZARYTE_CROSSBOW_27186 = 27186
-BOW_OF_FAERDHINEN_27187 = 27187
-LIGHT_BALLISTA_27188 = 27188
-VERACS_FLAIL_27189 = 27189
-VERACS_BRASSARD_27190 = 27190
-UNHOLY_BOOK_27191 = 27191
-OPAL_DRAGON_BOLTS_E_27192 = 27192
-ANCESTRAL_ROBE_TOP_27193 = 27193
-ANCESTRAL_ROBE_BOTTOM_27194 = 27194
-INQUISITORS_GREAT_HELM_27195 = 27195
-INQUISITORS_HAUBERK_27196 = 27196
-INQUISITORS_PLATESKIRT_27197 = 27197
-INQUISITORS_MACE_27198 = 27198
-_3RD_AGE_RANGE_TOP_27199 = 27199
-_3RD_AGE_RANGE_LEGS_27200 = 27200
-_3RD_AGE_RANGE_COIF_27201 = 27201
-MENAPHITE_REMEDY4 = 27202
-MENAPHITE_REMEDY4_NOTED = 27203
-MENAPHITE_REMEDY3 = 27205
-MENAPHITE_REMEDY3_NOTED = 27206
-MENAPHITE_REMEDY2 = 27208
-MENAPHITE_REMEDY2_NOTED = 27209
-MENAPHITE_REMEDY1 = 27211
-MENAPHITE_REMEDY1_NOTED = 27212
-SCARAB_DUNG = 27214
-FOSSILISED_DUNG = 27216
-FOSSILISED_DUNG_NOTED = 27217
-FANG_27219 = 27219
-BIG_BANANA = 27221
-ELDRITCH_ASHES = 27223
-GRAIN_27225 = 27225
-MASORI_MASK = 27226
-MASORI_MASK_NOTED = 27227
-MASORI_BODY = 27229
-MASORI_BODY_NOTED = 27230
-MASORI_CHAPS = 27232
-MASORI_CHAPS_NOTED = 27233
-MASORI_MASK_F = 27235
-MASORI_MASK_F_NOTED = 27236
-MASORI_BODY_F = 27238
-MASORI_BODY_F_NOTED = 27239
-MASORI_CHAPS_F = 27241
-MASORI_CHAPS_F_NOTED = 27242
-LIGHTBEARER_NOTED = 27244
-OSMUMTENS_FANG_NOTED = 27245
-OSMUMTENS_FANG_OR = 27246
-CURSED_PHALANX = 27248
-ELIDINIS_WARD_NOTED = 27250
-ELIDINIS_WARD_F = 27251
-ELIDINIS_WARD_OR = 27253
-MENAPHITE_ORNAMENT_KIT = 27255
-ICTHLARINS_SHROUD_TIER_1 = 27257
-ICTHLARINS_SHROUD_TIER_2 = 27259
-ICTHLARINS_SHROUD_TIER_3 = 27261
-ICTHLARINS_SHROUD_TIER_4 = 27263
-ICTHLARINS_SHROUD_TIER_5 = 27265
-ICTHLARINS_HOOD_TIER_5 = 27267
-ARMADYLEAN_PLATE = 27269
-ARMADYLEAN_PLATE_NOTED = 27270
-LILY_OF_THE_SANDS = 27272
-LILY_OF_THE_SANDS_NOTED = 27273
-TUMEKENS_SHADOW = 27275
-TUMEKENS_SHADOW_UNCHARGED = 27277
-TUMEKENS_SHADOW_UNCHARGED_NOTED = 27278
-THREAD_OF_ELIDINIS = 27279
-DIVINE_RUNE_POUCH = 27281
-BREACH_OF_THE_SCARAB = 27283
-EYE_OF_THE_CORRUPTOR = 27285
-KERIS_PARTISAN_OF_CORRUPTION = 27287
-JEWEL_OF_THE_SUN = 27289
-KERIS_PARTISAN_OF_THE_SUN = 27291
-CACHE_OF_RUNES = 27293
-WATER_CONTAINER_27295 = 27295
-MIRROR_27296 = 27296
-NEUTRALISING_POTION = 27297
-MAISAS_MESSAGE = 27298
-ANTIQUE_LAMP_27299 = 27299
-AKILAS_JOURNAL = 27300
-HETS_CAPTURE = 27302
-APMEKENS_CAPTURE = 27304
-SCABARAS_CAPTURE = 27306
-CRONDIS_CAPTURE = 27308
-THE_WARDENS = 27310
-THE_JACKALS_TORCH = 27312
-SUPPLIES = 27314
-NECTAR_4 = 27315
-NECTAR_4_NOTED = 27316
-NECTAR_3 = 27317
-NECTAR_3_NOTED = 27318
-NECTAR_2 = 27319
-NECTAR_2_NOTED = 27320
-NECTAR_1 = 27321
-NECTAR_1_NOTED = 27322
-SILK_DRESSING_2 = 27323
-SILK_DRESSING_2_NOTED = 27324
-SILK_DRESSING_1 = 27325
-SILK_DRESSING_1_NOTED = 27326
-TEARS_OF_ELIDINIS_4 = 27327
-TEARS_OF_ELIDINIS_4_NOTED = 27328
-TEARS_OF_ELIDINIS_3 = 27329
-TEARS_OF_ELIDINIS_3_NOTED = 27330
-TEARS_OF_ELIDINIS_2 = 27331
-TEARS_OF_ELIDINIS_2_NOTED = 27332
-TEARS_OF_ELIDINIS_1 = 27333
-TEARS_OF_ELIDINIS_1_NOTED = 27334
-BLESSED_CRYSTAL_SCARAB_2 = 27335
-BLESSED_CRYSTAL_SCARAB_2_NOTED = 27336
-BLESSED_CRYSTAL_SCARAB_1 = 27337
-BLESSED_CRYSTAL_SCARAB_1_NOTED = 27338
-LIQUID_ADRENALINE_2 = 27339
-LIQUID_ADRENALINE_2_NOTED = 27340
-LIQUID_ADRENALINE_1 = 27341
-LIQUID_ADRENALINE_1_NOTED = 27342
-SMELLING_SALTS_2 = 27343
-SMELLING_SALTS_2_NOTED = 27344
-SMELLING_SALTS_1 = 27345
-SMELLING_SALTS_1_NOTED = 27346
-AMBROSIA_2 = 27347
-AMBROSIA_2_NOTED = 27348
-AMBROSIA_1 = 27349
-AMBROSIA_1_NOTED = 27350
-HONEY_LOCUST = 27351
-TUMEKENS_GUARDIAN = 27352
-ELIDINIS_GUARDIAN = 27354
-MASORI_ARMOUR_SET_F = 27355
-MASORI_ARMOUR_SET_F_NOTED = 27356
-TOME_OF_FIRE_27358 = 27358
-MASORI_ASSEMBLER_BROKEN = 27359
-MASORI_ASSEMBLER_MAX_CAPE_BROKEN = 27361
-MASORI_ASSEMBLER_MAX_CAPE = 27363
-MASORI_ASSEMBLER_MAX_CAPE_L = 27365
-MASORI_ASSEMBLER_MAX_HOOD = 27366
-DAWN_SCARAB_EGG = 27368
-ANCIENT_KEY_27369 = 27369
-MASK_OF_REBIRTH = 27370
-MASORI_CRAFTING_KIT = 27372
-MASORI_ASSEMBLER = 27374
-MASORI_ASSEMBLER_L = 27376
-REMNANT_OF_AKKHA = 27377
-REMNANT_OF_BABA = 27378
-REMNANT_OF_KEPHRI = 27379
-REMNANT_OF_ZEBAK = 27380
-ANCIENT_REMNANT = 27381
-AKKHITO = 27382
-BABI = 27383
-KEPHRITI = 27384
-ZEBO = 27385
-TUMEKENS_DAMAGED_GUARDIAN = 27386
-ELIDINIS_DAMAGED_GUARDIAN = 27387
-ADVENTURERS_TOP_T1 = 27388
-ADVENTURERS_TROUSERS_T1 = 27390
-ADVENTURERS_HOOD_T1 = 27392
-ADVENTURERS_BOOTS_T1 = 27394
-ADVENTURERS_TOP_T2 = 27396
-ADVENTURERS_TROUSERS_T2 = 27398
-ADVENTURERS_HOOD_T2 = 27400
-ADVENTURERS_BOOTS_T2 = 27402
-ADVENTURERS_TOP_T3 = 27404
-ADVENTURERS_TROUSERS_T3 = 27406
-ADVENTURERS_HOOD_T3 = 27408
-ADVENTURERS_BOOTS_T3 = 27410
-ADVENTURERS_VAMBRACES = 27412
-GIANT_STOPWATCH = 27414
-SPEEDY_TELEPORT_SCROLL = 27416
-BRONZE_SPEEDRUN_TROPHY = 27418
-SILVER_SPEEDRUN_TROPHY = 27420
-GOLD_SPEEDRUN_TROPHY = 27422
-PLATINUM_SPEEDRUN_TROPHY = 27424
-DYNAMITEP = 27426
-CLUE_SCROLL_SPECIAL = 27427
-HOOD_OF_RUIN = 27428
-ROBE_TOP_OF_RUIN = 27430
-ROBE_BOTTOM_OF_RUIN = 27432
-GLOVES_OF_RUIN = 27434
-SOCKS_OF_RUIN = 27436
-CLOAK_OF_RUIN = 27438
-INFINITE_MONEY_BAG = 27440
-ADVENTURERS_CAPE = 27442
-GRACEFUL_HOOD_27444 = 27444
-GRACEFUL_HOOD_27446 = 27446
-GRACEFUL_CAPE_27447 = 27447
-GRACEFUL_CAPE_27449 = 27449
-GRACEFUL_TOP_27450 = 27450
-GRACEFUL_TOP_27452 = 27452
-GRACEFUL_LEGS_27453 = 27453
-GRACEFUL_LEGS_27455 = 27455
-GRACEFUL_GLOVES_27456 = 27456
-GRACEFUL_GLOVES_27458 = 27458
-GRACEFUL_BOOTS_27459 = 27459
-GRACEFUL_BOOTS_27461 = 27461
-FRESH_START_HELPER = 27462
-TREAT_CAULDRON = 27463
-TREAT_CAULDRON_27465 = 27465
-TREAT_CAULDRON_27467 = 27467
-TREAT_CAULDRON_27469 = 27469
-TREAT_CAULDRON_27471 = 27471
-WITCH_HAT = 27473
-WITCH_TOP = 27475
-WITCH_ROBES = 27477
-WITCH_BOOTS = 27479
-WITCH_CAPE = 27481
-TERRIFYING_CHARM = 27483
-BRUISED_BANANA = 27485
-BRUISED_BANANA_NOTED = 27486
-SMELLY_SOCK = 27488
-SMELLY_SOCK_NOTED = 27489
-SPOOKY_EGG = 27491
-SPOOKY_EGG_NOTED = 27492
-OLD_WOOL = 27494
-OLD_WOOL_NOTED = 27495
-HALLOWEEN_WIG = 27497
-HALLOWEEN_WIG_27499 = 27499
-HALLOWEEN_WIG_27501 = 27501
-HALLOWEEN_WIG_27503 = 27503
-HALLOWEEN_WIG_27505 = 27505
-HALLOWEEN_WIG_27507 = 27507
-DIVINE_RUNE_POUCH_L = 27509
-KASONDES_JOURNAL = 27511
-WORD_TRANSLATIONS = 27513
-DIRTY_NOTE = 27515
-DIRTY_NOTE_27516 = 27516
-DIRTY_NOTE_27517 = 27517
-WARNING_NOTE = 27518
-STONE_TABLET_27519 = 27519
-STONE_TABLET_27520 = 27520
-STONE_TABLET_27521 = 27521
-STONE_TABLET_27522 = 27522
-WOOD_CARVING = 27523
-WOOD_CARVING_27524 = 27524
-WOOD_CARVING_27525 = 27525
-WOOD_CARVING_27526 = 27526
-WOOD_CARVING_27527 = 27527
-WOOD_CARVING_27528 = 27528
-WOOD_CARVING_27529 = 27529
-WOOD_CARVING_27530 = 27530
-WOOD_CARVING_27531 = 27531
-COMPASS = 27532
-WOOD_CARVING_27533 = 27533
-WOOD_CARVING_27534 = 27534
-WOOD_CARVING_27535 = 27535
-WOOD_CARVING_27536 = 27536
-WOOD_CARVING_27537 = 27537
-ANTIQUE_LAMP_27543 = 27543
-GHOMMALS_LUCKY_PENNY = 27544
-ANIM_OFFHAND_27546 = 27546
-ANIM_OFFHAND_27548 = 27548
-GHOMMALS_AVERNIC_DEFENDER_5 = 27550
-GHOMMALS_AVERNIC_DEFENDER_5_L = 27551
-GHOMMALS_AVERNIC_DEFENDER_6 = 27552
-GHOMMALS_AVERNIC_DEFENDER_6_L = 27553
-PERFECT_GINGERBREAD = 27554
-BROKEN_GINGERBREAD = 27555
-VERY_BROKEN_GINGERBREAD = 27556
-SHATTERED_GINGERBREAD = 27557
-SACK_OF_COAL = 27558
-SNOWBALL_27559 = 27559
-GOLDEN_SNOWBALL = 27560
-LIGHT_BEER = 27561
-MULLED_PINE = 27562
-EGGNOG = 27563
-SANTAS_LIST = 27564
-CHRISTMAS_JUMPER = 27566
-SNOW_GOGGLES__HAT = 27568
-SACK_OF_COAL_27570 = 27570
-FESTIVE_NUTCRACKER_TOP = 27572
-FESTIVE_NUTCRACKER_TROUSERS = 27574
-FESTIVE_NUTCRACKER_HAT = 27576
-FESTIVE_NUTCRACKER_BOOTS = 27578
-FESTIVE_NUTCRACKER_STAFF = 27580
-SWEET_NUTCRACKER_TOP = 27582
-SWEET_NUTCRACKER_TROUSERS = 27583
-SWEET_NUTCRACKER_HAT = 27584
-SWEET_NUTCRACKER_BOOTS = 27585
-SWEET_NUTCRACKER_STAFF = 27586
-FESTIVE_GAMES_CROWN = 27588
-MUPHIN = 27590
-MUPHIN_27592 = 27592
-MUPHIN_27593 = 27593
-DUSTY_SCROLL_27595 = 27595
-TULLIAS_LETTER = 27596
-ANCIENT_MAP = 27597
-STRANGE_CIPHER = 27598
-STRANGE_LIST = 27599
-DUKE_NOTE = 27600
-NUMBERS_NOTE = 27601
-SETTLEMENTS_NOTE = 27602
-LEVER_HANDLE = 27603
-ICY_CHEST = 27604
-JEWEL_SHARD = 27605
-JEWEL_SHARD_27606 = 27606
-ANCIENT_JEWEL = 27607
-ICY_KEY = 27608
-VENATOR_BOW = 27610
-VENATOR_BOW_UNCHARGED = 27612
-VENATOR_BOW_UNCHARGED_NOTED = 27613
-VENATOR_SHARD = 27614
-ANCIENT_ESSENCE = 27616
-ANCIENT_ESSENCE_27618 = 27618
-ANCIENT_ESSENCE_27619 = 27619
-ANCIENT_ESSENCE_27620 = 27620
-ANCIENT_ESSENCE_27621 = 27621
-FROZEN_CACHE = 27622
-ANCIENT_SCEPTRE = 27624
-ANCIENT_SCEPTRE_L = 27626
-ANCIENT_ICON = 27627
-FORGOTTEN_BREW4 = 27629
-FORGOTTEN_BREW4_NOTED = 27630
-FORGOTTEN_BREW3 = 27632
-FORGOTTEN_BREW3_NOTED = 27633
-FORGOTTEN_BREW2 = 27635
-FORGOTTEN_BREW2_NOTED = 27636
-FORGOTTEN_BREW1 = 27638
-FORGOTTEN_BREW1_NOTED = 27639
-SATURATED_HEART = 27641
-CHARGED_ICE = 27643
-MYSTIC_CARDS = 27645
-SATURATED_HEART_NOTED = 27647
-VENENATIS_SPIDERLING_27648 = 27648
-CALLISTO_CUB_27649 = 27649
-VETION_JR_27650 = 27650
-VETION_JR_27651 = 27651
-WEBWEAVER_BOW_U = 27652
-WEBWEAVER_BOW_U_NOTED = 27653
-WEBWEAVER_BOW_27655 = 27655
-URSINE_CHAINMACE_U = 27657
-URSINE_CHAINMACE_U_NOTED = 27658
-URSINE_CHAINMACE = 27660
-ACCURSED_SCEPTRE_U = 27662
-ACCURSED_SCEPTRE_U_NOTED = 27663
-ACCURSED_SCEPTRE = 27665
-CLAWS_OF_CALLISTO = 27667
-CLAWS_OF_CALLISTO_NOTED = 27668
-FANGS_OF_VENENATIS = 27670
-FANGS_OF_VENENATIS_NOTED = 27671
-SKULL_OF_VETION = 27673
-SKULL_OF_VETION_NOTED = 27674
-ACCURSED_SCEPTRE_AU = 27676
-ACCURSED_SCEPTRE_AU_NOTED = 27677
-ACCURSED_SCEPTRE_A = 27679
-VOIDWAKER_HILT = 27681
-VOIDWAKER_HILT_NOTED = 27682
-VOIDWAKER_BLADE = 27684
-VOIDWAKER_BLADE_NOTED = 27685
-VOIDWAKER_GEM = 27687
-VOIDWAKER_GEM_NOTED = 27688
-VOIDWAKER_27690 = 27690
-VOIDWAKER_NOTED = 27691
-ORE_PACK_27693 = 27693
-DRAGON_PICKAXE_BROKEN = 27695
-CRYSTAL_BODY_27697 = 27697
-CRYSTAL_BODY_INACTIVE_27699 = 27699
-CRYSTAL_LEGS_27701 = 27701
-CRYSTAL_LEGS_INACTIVE_27703 = 27703
-CRYSTAL_HELM_27705 = 27705
-CRYSTAL_HELM_INACTIVE_27707 = 27707
-CRYSTAL_BODY_27709 = 27709
-CRYSTAL_BODY_INACTIVE_27711 = 27711
-CRYSTAL_LEGS_27713 = 27713
-CRYSTAL_LEGS_INACTIVE_27715 = 27715
-CRYSTAL_HELM_27717 = 27717
-CRYSTAL_HELM_INACTIVE_27719 = 27719
-CRYSTAL_BODY_27721 = 27721
-CRYSTAL_BODY_INACTIVE_27723 = 27723
-CRYSTAL_LEGS_27725 = 27725
-CRYSTAL_LEGS_INACTIVE_27727 = 27727
-CRYSTAL_HELM_27729 = 27729
-CRYSTAL_HELM_INACTIVE_27731 = 27731
-CRYSTAL_BODY_27733 = 27733
-CRYSTAL_BODY_INACTIVE_27735 = 27735
-CRYSTAL_LEGS_27737 = 27737
-CRYSTAL_LEGS_INACTIVE_27739 = 27739
-CRYSTAL_HELM_27741 = 27741
-CRYSTAL_HELM_INACTIVE_27743 = 27743
-CRYSTAL_BODY_27745 = 27745
-CRYSTAL_BODY_INACTIVE_27747 = 27747
-CRYSTAL_LEGS_27749 = 27749
-CRYSTAL_LEGS_INACTIVE_27751 = 27751
-CRYSTAL_HELM_27753 = 27753
-CRYSTAL_HELM_INACTIVE_27755 = 27755
-CRYSTAL_BODY_27757 = 27757
-CRYSTAL_BODY_INACTIVE_27759 = 27759
-CRYSTAL_LEGS_27761 = 27761
-CRYSTAL_LEGS_INACTIVE_27763 = 27763
-CRYSTAL_HELM_27765 = 27765
-CRYSTAL_HELM_INACTIVE_27767 = 27767
-CRYSTAL_BODY_27769 = 27769
-CRYSTAL_BODY_INACTIVE_27771 = 27771
-CRYSTAL_LEGS_27773 = 27773
-CRYSTAL_LEGS_INACTIVE_27775 = 27775
-CRYSTAL_HELM_27777 = 27777
-CRYSTAL_HELM_INACTIVE_27779 = 27779
-CABBAGE_27781 = 27781
-CABBAGE_27782 = 27782
-PLATINUM_SPEEDRUN_TROPHY_27783 = 27783
-THAMMARONS_SCEPTRE_AU = 27785
-THAMMARONS_SCEPTRE_AU_NOTED = 27786
-THAMMARONS_SCEPTRE_A = 27788
-NIGHTSHADE = 27790
-NIGHTSHADE_27792 = 27792
-NIGHTSHADE_27793 = 27793
-NULL_27794 = 27794
-NULL_27795 = 27795
-NULL_27796 = 27796
-NULL_27797 = 27797
-NULL_27798 = 27798
-NULL_27799 = 27799
-NULL_27800 = 27800
-NULL_27801 = 27801
-GNOME_CHILD_BACKPACK = 27802
-CAKE_HAT = 27804
-BOB_THE_CAT_SLIPPERS = 27806
-NULL_27807 = 27807
-JAD_SLIPPERS = 27808
-DRAGON_CANDLE_DAGGER = 27810
-_10TH_BIRTHDAY_CAPE = 27812
-JAD_PLUSH = 27814
-STRAY_DOG_PLUSH = 27816
-NULL_27817 = 27817
-GNOME_CHILD_PLUSH = 27818
-NULL_27819 = 27819
-_10TH_BIRTHDAY_BALLOONS = 27820
-OLDSCHOOL_JUMPER = 27822
-OLDSCHOOL_JUMPER_27823 = 27823
-OLDSCHOOL_JUMPER_27824 = 27824
-OLDSCHOOL_JUMPER_27825 = 27825
-OLDSCHOOL_JUMPER_27826 = 27826
-OLDSCHOOL_JUMPER_27827 = 27827
-SILVER_PARTYHAT = 27828
-VESTAS_CHAINBODY_BH = 27831
-VESTAS_PLATESKIRT_BH = 27832
-STATIUSS_FULL_HELM_BH = 27833
-STATIUSS_PLATEBODY_BH = 27834
-STATIUSS_PLATELEGS_BH = 27835
-MORRIGANS_COIF_BH = 27836
-MORRIGANS_LEATHER_BODY_BH = 27837
-MORRIGANS_LEATHER_CHAPS_BH = 27838
-ZURIELS_HOOD_BH = 27839
-ZURIELS_ROBE_TOP_BH = 27840
-ZURIELS_ROBE_BOTTOM_BH = 27841
-CORRUPTED_VESTAS_CHAINBODY_BH = 27842
-CORRUPTED_VESTAS_PLATESKIRT_BH = 27843
-CORRUPTED_STATIUSS_FULL_HELM_BH = 27844
-CORRUPTED_STATIUSS_PLATEBODY_BH = 27845
-CORRUPTED_STATIUSS_PLATELEGS_BH = 27846
-CORRUPTED_MORRIGANS_COIF_BH = 27847
-CORRUPTED_MORRIGANS_LEATHER_BODY_BH = 27848
-CORRUPTED_MORRIGANS_LEATHER_CHAPS_BH = 27849
-CORRUPTED_ZURIELS_HOOD_BH = 27850
-CORRUPTED_ZURIELS_ROBE_TOP_BH = 27851
-CORRUPTED_ZURIELS_ROBE_BOTTOM_BH = 27852
-DARK_BOW_BH = 27853
-BARRELCHEST_ANCHOR_BH = 27855
-DRAGON_MACE_BH = 27857
-DRAGON_LONGSWORD_BH = 27859
-ABYSSAL_DAGGER_BH = 27861
-ABYSSAL_DAGGER_BHP = 27863
-ABYSSAL_DAGGER_BHP_27865 = 27865
-ABYSSAL_DAGGER_BHP_27867 = 27867
-VOIDWAKER_27869 = 27869
-LIGHTBEARER_27870 = 27870
-GIANT_BRONZE_DAGGER = 27871
-EASTFLOOR_SPADE = 27873
-NEST_HAT = 27875
-NEST_HAT_27877 = 27877
-NULL_27878 = 27878
-NULL_27880 = 27880
-NULL_27882 = 27882
-NULL_27884 = 27884
-NULL_27886 = 27886
-NULL_27888 = 27888
-NULL_27890 = 27890
-NULL_27892 = 27892
-VIRTUS_ROBE_TOP_NOTED = 27894
-VIRTUS_ROBE_BOTTOM_NOTED = 27895
-VIRTUS_MASK_NOTED = 27896
-SCALY_BLUE_DRAGONHIDE = 27897
-SCALY_BLUE_DRAGONHIDE_NOTED = 27898
-VESTAS_SPEAR_BH = 27900
-VESTAS_SPEAR_BHINACTIVE = 27902
-VESTAS_LONGSWORD_BH = 27904
-VESTAS_LONGSWORD_BHINACTIVE = 27906
-STATIUSS_WARHAMMER_BH = 27908
-STATIUSS_WARHAMMER_BHINACTIVE = 27910
-MORRIGANS_THROWING_AXE_BH = 27912
-MORRIGANS_THROWING_AXE_BHINACTIVE = 27914
-MORRIGANS_JAVELIN_BH = 27916
-MORRIGANS_JAVELIN_BHINACTIVE = 27918
-ZURIELS_STAFF_BH = 27920
-ZURIELS_STAFF_BHINACTIVE = 27922
-VESTAS_CHAINBODY_BHINACTIVE = 27925
-VESTAS_PLATESKIRT_BHINACTIVE = 27928
-STATIUSS_FULL_HELM_BHINACTIVE = 27931
-STATIUSS_PLATEBODY_BHINACTIVE = 27934
-STATIUSS_PLATELEGS_BHINACTIVE = 27937
-MORRIGANS_COIF_BHINACTIVE = 27940
-MORRIGANS_LEATHER_BODY_BHINACTIVE = 27943
-MORRIGANS_LEATHER_CHAPS_BHINACTIVE = 27946
-ZURIELS_HOOD_BHINACTIVE = 27949
-ZURIELS_ROBE_TOP_BHINACTIVE = 27952
-ZURIELS_ROBE_BOTTOM_BHINACTIVE = 27955
-ATTACK_XP = 27957
-STRENGTH_XP = 27958
-DEFENCE_XP = 27959
-HITPOINTS_XP = 27960
-MAGIC_XP = 27961
-RANGED_XP = 27962
-PRAYER_XP = 27963
-CORRUPTED_VESTAS_CHAINBODY_BHINACTIVE = 27965
-CORRUPTED_VESTAS_PLATESKIRT_BHINACTIVE = 27968
-CORRUPTED_STATIUSS_FULL_HELM_BHINACTIVE = 27971
-CORRUPTED_STATIUSS_PLATEBODY_BHINACTIVE = 27974
-CORRUPTED_STATIUSS_PLATELEGS_BHINACTIVE = 27977
-CORRUPTED_MORRIGANS_COIF_BHINACTIVE = 27980
-CORRUPTED_MORRIGANS_LEATHER_BODY_BHINACTIVE = 27983
-CORRUPTED_MORRIGANS_LEATHER_CHAPS_BHINACTIVE = 27986
-CORRUPTED_ZURIELS_HOOD_BHINACTIVE = 27989
-CORRUPTED_ZURIELS_ROBE_TOP_BHINACTIVE = 27992
-CORRUPTED_ZURIELS_ROBE_BOTTOM_BHINACTIVE = 27995
-ESOTERIC_EMBLEM_TIER_1 = 27997
-ESOTERIC_EMBLEM_TIER_2 = 27999
-ESOTERIC_EMBLEM_TIER_3 = 28001
-ESOTERIC_EMBLEM_TIER_4 = 28003
-ESOTERIC_EMBLEM_TIER_5 = 28005
-ESOTERIC_EMBLEM_TIER_6 = 28007
-ESOTERIC_EMBLEM_TIER_7 = 28009
-ESOTERIC_EMBLEM_TIER_8 = 28011
-ESOTERIC_EMBLEM_TIER_9 = 28013
-ESOTERIC_EMBLEM_TIER_10 = 28015
-BOUNTY_HUNTER_ORNAMENT_KIT = 28017
-DRAGON_DAGGER_CR = 28019
-DRAGON_DAGGER_PCR = 28021
-DRAGON_DAGGER_PCR_28023 = 28023
-DRAGON_DAGGER_PCR_28025 = 28025
-DRAGON_MACE_CR = 28027
-DRAGON_SWORD_CR = 28029
-DRAGON_SCIMITAR_CR = 28031
-DRAGON_LONGSWORD_CR = 28033
-DRAGON_WARHAMMER_CR = 28035
-DRAGON_BATTLEAXE_CR = 28037
-DRAGON_CLAWS_CR = 28039
-DRAGON_SPEAR_CR = 28041
-DRAGON_SPEAR_PCR = 28043
-DRAGON_SPEAR_PCR_28045 = 28045
-DRAGON_SPEAR_PCR_28047 = 28047
-DRAGON_HALBERD_CR = 28049
-DRAGON_2H_SWORD_CR = 28051
-DRAGON_CROSSBOW_CR = 28053
-DRAGON_BOOTS_CR = 28055
-DRAGON_MED_HELM_CR = 28057
-DRAGON_SQ_SHIELD_CR = 28059
-DRAGON_PLATELEGS_CR = 28061
-DRAGON_PLATESKIRT_CR = 28063
-DRAGON_CHAINBODY_CR = 28065
-FIGHTER_TORSO_OR = 28067
-FIGHTER_TORSO_LOR = 28069
-HELM_OF_NEITIZNOT_OR = 28070
-DARK_BOW_IMBUE_SCROLL = 28072
-BARRELCHEST_ANCHOR_IMBUE_SCROLL = 28074
-DRAGON_MACE_IMBUE_SCROLL = 28076
-DRAGON_LONGSWORD_IMBUE_SCROLL = 28078
-ABYSSAL_DAGGER_IMBUE_SCROLL = 28080
-BOUNTY_CRATE_TIER_1 = 28082
-BOUNTY_CRATE_TIER_2 = 28084
-BOUNTY_CRATE_TIER_3 = 28086
-BOUNTY_CRATE_TIER_4 = 28088
-BOUNTY_CRATE_TIER_5 = 28090
-BOUNTY_CRATE_TIER_6 = 28092
-BOUNTY_CRATE_TIER_7 = 28094
-BOUNTY_CRATE_TIER_8 = 28096
-BOUNTY_CRATE_TIER_9 = 28098
-NULL_28100 = 28100
-NULL_28101 = 28101
-NULL_28102 = 28102
-NULL_28103 = 28103
-NULL_28104 = 28104
-NULL_28105 = 28105
-NULL_28106 = 28106
-NULL_28107 = 28107
-COLOURFUL_SCARF = 28108
-COLOURFUL_SCARF_28109 = 28109
-COLOURFUL_SCARF_28110 = 28110
-COLOURFUL_SCARF_28111 = 28111
-COLOURFUL_SCARF_28112 = 28112
-COLOURFUL_SCARF_28113 = 28113
-COLOURFUL_SCARF_28114 = 28114
-COLOURFUL_SCARF_28115 = 28115
-RAINBOW_JUMPER = 28116
-COLOURFUL_JUMPER = 28118
-COLOURFUL_JUMPER_28119 = 28119
-COLOURFUL_JUMPER_28120 = 28120
-COLOURFUL_JUMPER_28121 = 28121
-COLOURFUL_JUMPER_28122 = 28122
-COLOURFUL_JUMPER_28123 = 28123
-COLOURFUL_JUMPER_28124 = 28124
-COLOURFUL_JUMPER_28125 = 28125
-POETS_JACKET = 28126
-LOVE_CROSSBOW = 28128
-STRANGE_ICON = 28130
-DUSTY_LAMP = 28132
-CRYPT_MAP = 28133
-ANIMAINFUSED_BARK = 28134
-FORESTRY_KIT = 28136
-FUNKY_SHAPED_LOG = 28138
-LOG_BASKET = 28140
-OPEN_LOG_BASKET = 28142
-FORESTRY_BASKET = 28143
-OPEN_FORESTRY_BASKET = 28145
-LOG_BRACE = 28146
-LOG_BRACE_NOTED = 28147
-STURDY_HARNESS = 28149
-STURDY_HARNESS_NOTED = 28150
-NATURE_OFFERINGS = 28152
-RITUAL_MULCH = 28154
-RITUAL_MULCH_NOTED = 28155
-FORESTERS_RATION = 28157
-SECATEURS_BLADE = 28159
-SECATEURS_ATTACHMENT = 28161
-CLOTHES_POUCH = 28163
-CLOTHES_POUCH_NOTED = 28164
-CLOTHES_POUCH_BLUEPRINT = 28166
-CLOTHES_POUCH_BLUEPRINT_NOTED = 28167
-FORESTRY_TOP = 28169
-FORESTRY_LEGS = 28171
-FORESTRY_HAT = 28173
-FORESTRY_BOOTS = 28175
-AXE_HANDLE_28177 = 28177
-LEPRECHAUN_CHARM = 28179
-CLOVER_INSIGNIA = 28181
-MULCH = 28183
-BEE_ON_A_STICK = 28184
-BEE_ON_A_STICK_28186 = 28186
-BEE_ON_A_STICK_28187 = 28187
-BEE_ON_A_STICK_28188 = 28188
-BEE_ON_A_STICK_28189 = 28189
-POWDERED_POLLEN = 28190
-STRANGE_POLLEN = 28192
-UNFIRED_CUP = 28193
-UNFIRED_CUP_NOTED = 28194
-BRONZE_2H_AXE = 28196
-BRONZE_2H_AXE_NOTED = 28197
-IRON_2H_AXE = 28199
-IRON_2H_AXE_NOTED = 28200
-STEEL_2H_AXE = 28202
-STEEL_2H_AXE_NOTED = 28203
-BLACK_2H_AXE = 28205
-BLACK_2H_AXE_NOTED = 28206
-MITHRIL_2H_AXE = 28208
-MITHRIL_2H_AXE_NOTED = 28209
-ADAMANT_2H_AXE = 28211
-ADAMANT_2H_AXE_NOTED = 28212
-RUNE_2H_AXE = 28214
-RUNE_2H_AXE_NOTED = 28215
-DRAGON_2H_AXE = 28217
-DRAGON_2H_AXE_NOTED = 28218
-CRYSTAL_2H_AXE = 28220
-CRYSTAL_2H_AXE_NOTED = 28221
-CRYSTAL_2H_AXE_28223 = 28223
-CRYSTAL_2H_AXE_NOTED_28224 = 28224
-_3RD_AGE_2H_AXE = 28226
-_3RD_AGE_2H_AXE_NOTED = 28227
-BEAVER_28229 = 28229
-BEAVER_28230 = 28230
-BEAVER_28231 = 28231
-BEAVER_28232 = 28232
-BEAVER_28233 = 28233
-BEAVER_28234 = 28234
-BEAVER_28235 = 28235
-BEAVER_28236 = 28236
-BEAVER_28237 = 28237
-
-all_food = [
-    ANGLERFISH,
-    APPLE_PIE,
-    BASS,
-    BREAD,
-    COOKED_CHICKEN,
-    COOKED_MEAT,
-    CURRY,
-    DARK_CRAB,
-    HERRING,
-    JUG_OF_WINE,
-    LOBSTER,
-    MACKEREL,
-    MANTA_RAY,
-    MEAT_PIE,
-    MEAT_PIZZA,
-    MONKFISH,
-    PEACH,
-    PIKE,
-    POTATO_WITH_BUTTER,
-    POTATO_WITH_CHEESE,
-    REDBERRY_PIE,
-    SALMON,
-    SARDINE,
-    SEA_TURTLE,
-    SHARK,
-    SHRIMPS,
-    STEW,
-    SUMMER_PIE,
-    SWORDFISH,
-    TANGLED_TOADS_LEGS,
-    TROUT,
-    TUNA_POTATO,
-    TUNA,
-]
-
-axes = [
-    BRONZE_AXE,
-    IRON_AXE,
-    STEEL_AXE,
-    MITHRIL_AXE,
-    ADAMANT_AXE,
-    RUNE_AXE,
-    DRAGON_AXE,
-    CRYSTAL_AXE_23862,
-    CRYSTAL_AXE,
-]
-
-coins = [
-    COINS,
-    COINS_995,
-    COINS_6964,
-    COINS_8890,
-]
-
-coin_pouches = [
-    COIN_POUCH,
-    COIN_POUCH_22522,
-    COIN_POUCH_22523,
-    COIN_POUCH_22524,
-    COIN_POUCH_22525,
-    COIN_POUCH_22526,
-    COIN_POUCH_22527,
-    COIN_POUCH_22528,
-    COIN_POUCH_22529,
-    COIN_POUCH_22530,
-    COIN_POUCH_22531,
-    COIN_POUCH_22532,
-    COIN_POUCH_22533,
-    COIN_POUCH_22534,
-    COIN_POUCH_22535,
-    COIN_POUCH_22536,
-    COIN_POUCH_22537,
-    COIN_POUCH_22538,
-    COIN_POUCH_24703,
-]
-
-combo_food = [
-    _12_ANCHOVY_PIZZA,
-    _12_MEAT_PIZZA,
-    _12_PINEAPPLE_PIZZA,
-    _12_PLAIN_PIZZA,
-    _23_CAKE,
-    _23_CHOCOLATE_CAKE,
-    ANCHOVY_PIZZA,
-    CAKE,
-    CHOCOLATE_BOMB,
-    CHOCOLATE_CAKE,
-    COOKED_KARAMBWAN,
-    GUTHIX_REST1,
-    GUTHIX_REST2,
-    GUTHIX_REST3,
-    GUTHIX_REST4,
-    HALF_A_MEAT_PIE,
-    HALF_A_REDBERRY_PIE,
-    HALF_A_SUMMER_PIE,
-    HALF_A_WILD_PIE,
-    HALF_AN_APPLE_PIE,
-    PINEAPPLE_PIZZA,
-    PLAIN_PIZZA,
-    SARADOMIN_BREW1,
-    SARADOMIN_BREW2,
-    SARADOMIN_BREW3,
-    SARADOMIN_BREW4,
-    WILD_PIE,
-]
 
-logs = [
-    LOGS,
-    OAK_LOGS,
-    WILLOW_LOGS,
-    MAPLE_LOGS,
-    TEAK_LOGS,
-    MAHOGANY_LOGS,
-    JUNIPER_LOGS,
-    ARCTIC_PINE_LOGS,
-    YEW_LOGS,
-    MAGIC_LOGS,
-    REDWOOD_LOGS,
-]
-
-ores = [
-    CLAY,
-    COPPER_ORE,
-    TIN_ORE,
-    IRON_ORE,
-    SILVER_ORE,
-    COAL,
-    GOLD_ORE,
-    MITHRIL_ORE,
-    ADAMANTITE_ORE,
-    RUNITE_ORE,
-    AMETHYST,
-]
-
-pickaxes = [
-    BRONZE_PICKAXE,
-    IRON_PICKAXE,
-    STEEL_PICKAXE,
-    MITHRIL_PICKAXE,
-    ADAMANT_PICKAXE,
-    RUNE_PICKAXE,
-    DRAGON_PICKAXE,
-    DRAGON_PICKAXE_12797,
-    DRAGON_PICKAXE_OR,
-    DRAGON_PICKAXE_OR_25376,
-    CRYSTAL_PICKAXE,
-    CRYSTAL_PICKAXE_23863,
-]
-
-raw_fish = [
-    LEAPING_SALMON,
-    LEAPING_STURGEON,
-    LEAPING_TROUT,
-    RAW_ANCHOVIES,
-    RAW_ANGLERFISH,
-    RAW_BASS,
-    RAW_CATFISH,
-    RAW_CAVE_EEL,
-    RAW_CAVEFISH,
-    RAW_COD,
-    RAW_DARK_CRAB,
-    RAW_GUPPY,
-    RAW_HERRING,
-    RAW_KARAMBWAN,
-    RAW_KARAMBWANJI,
-    RAW_LAVA_EEL,
-    RAW_LOBSTER,
-    RAW_MACKEREL,
-    RAW_MANTA_RAY,
-    RAW_MONKFISH,
-    RAW_PIKE,
-    RAW_RAINBOW_FISH,
-    RAW_SALMON,
-    RAW_SARDINE,
-    RAW_SEA_TURTLE,
-    RAW_SHARK,
-    RAW_SHRIMPS,
-    RAW_SLIMY_EEL,
-    RAW_SWORDFISH,
-    RAW_TETRA,
-    RAW_TROUT,
-    RAW_TUNA,
-]
-
-rods = [
-    RING_OF_DUELING1,
-    RING_OF_DUELING2,
-    RING_OF_DUELING3,
-    RING_OF_DUELING4,
-    RING_OF_DUELING5,
-    RING_OF_DUELING6,
-    RING_OF_DUELING7,
-    RING_OF_DUELING8,
-]
+The item table is stored in item_ids.db and only read on first use (see item_db.py). Item IDs and item groups
+are still available as module attributes:
+    >>> import utilities.api.item_ids as ids
+    >>> ids.LOGS
+    1511
+    >>> ids.all_food  # frozenset of item IDs
+"""
+from utilities.api.item_db import default_db
+
+
+def __getattr__(name: str):
+    """
+    Resolves `ids.NAME` to an item ID and `ids.group_name` to a frozenset of item IDs. Resolved values are
+    cached as regular module attributes.
+    """
+    if name.startswith("__"):
+        raise AttributeError(name)
+    db = default_db()
+    try:
+        value = db.id(name) if name.isupper() or name.startswith("_") else db.group(name)
+    except KeyError:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}") from None
+    globals()[name] = value
+    return value
+
+
+def __dir__():
+    db = default_db()
+    return sorted(set(globals()) | set(db.item_names()) | set(db.group_names()))
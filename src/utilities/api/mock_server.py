@@ -0,0 +1,278 @@
+"""
+Local stand-in for the Morg HTTP Client and Status Socket RuneLite plugins.
+
+MockPluginServer serves the Morg endpoints ("inv", "stats", "equip", "events") and POSTs Status Socket payloads
+once per tick. The data comes from a Scenario: either a recorded trace (see record_trace()) or a scripted one
+such as SkillingScenario. Latency and failures can be injected to load-test the client layer without a live
+game client.
+
+Example:
+    >>> server = MockPluginServer(SkillingScenario(), morg_port=0, latency=0.02, failure_rate=0.01)
+    >>> server.start()
+    >>> api = MorgHTTPSocket()
+    >>> api.base_endpoint = server.base_endpoint
+    >>> ...
+    >>> print(server.request_counts)
+"""
+import threading
+import time
+from abc import ABC, abstractmethod
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Dict, List
+
+import requests
+import simplejson as JSON
+
+import utilities.random_util as rd
+from utilities.api.morg_http_client import MorgHTTPSocket
+from utilities.api.status_socket import StatusSocket
+
+MORG_ENDPOINTS = ("inv", "stats", "equip", "events")
+
+
+class Scenario(ABC):
+    """
+    Produces the plugin data for each game tick. A frame is a dict with any of the keys "inv", "stats",
+    "equip", "events" (Morg HTTP Client JSON) and "status" (Status Socket JSON).
+    """
+
+    @abstractmethod
+    def frame(self, tick: int) -> dict:
+        """
+        Returns the plugin data for the given game tick.
+        """
+        pass
+
+
+class TraceScenario(Scenario):
+    def __init__(self, frames: List[dict], loop: bool = True):
+        """
+        Replays recorded frames, one per tick.
+        Args:
+            frames: The recorded frames (see record_trace()).
+            loop: Whether to start over after the last frame. Otherwise, the last frame is repeated.
+        """
+        if not frames:
+            raise ValueError("A trace needs at least one frame.")
+        self.frames = frames
+        self.loop = loop
+
+    @classmethod
+    def load(cls, path: str, loop: bool = True) -> "TraceScenario":
+        """
+        Loads a trace saved by record_trace().
+        """
+        with open(path) as f:
+            return cls(JSON.load(f), loop)
+
+    def frame(self, tick: int) -> dict:
+        index = tick % len(self.frames) if self.loop else min(tick, len(self.frames) - 1)
+        return self.frames[index]
+
+
+class SkillingScenario(Scenario):
+    def __init__(self, skill: str = "Woodcutting", item_id: int = 1511, ticks_per_item: int = 4, xp_per_item: int = 25, animation: int = 879):
+        """
+        A player skilling in place: an item is added to the inventory (and xp gained) every few ticks until the
+        inventory is full, after which the inventory is emptied and the cycle starts over.
+        Args:
+            skill: The skill that gains xp.
+            item_id: The item that is gathered.
+            ticks_per_item: The number of ticks it takes to gather one item.
+            xp_per_item: The xp gained per item.
+            animation: The animation ID played while skilling.
+        """
+        self.skill = skill
+        self.item_id = item_id
+        self.ticks_per_item = ticks_per_item
+        self.xp_per_item = xp_per_item
+        self.animation = animation
+
+    def frame(self, tick: int) -> dict:
+        gathered = tick // self.ticks_per_item
+        count = gathered % 29
+        animating = count < 28
+        inv = [{"id": self.item_id, "quantity": 1} if i < count else {"id": -1, "quantity": 0} for i in range(28)]
+        xp = gathered * self.xp_per_item
+        return {
+            "inv": inv,
+            "stats": [{"stat": "Overall", "level": 0, "xp": xp}, {"stat": self.skill, "level": 1, "xp": xp, "xp gained": xp}],
+            "equip": [],
+            "events": {
+                "health": "10/10",
+                "run energy": 100,
+                "animation": self.animation if animating else -1,
+                "animation pose": 808,
+                "latest msg": "",
+                "npc name": "null",
+                "worldPoint": {"x": 3200, "y": 3200, "plane": 0, "regionX": 50, "regionY": 50, "regionID": 12850},
+            },
+            "status": {
+                "runEnergy": 100,
+                "attack": {"animationId": self.animation if animating else -1},
+                "inventory": [{"index": i, "id": self.item_id, "amount": 1} for i in range(count)],
+                "skills": [{"skillName": self.skill.upper(), "realLevel": 1, "boostedLevel": 1, "experience": xp}],
+                "prayers": [],
+                "equipment": [],
+            },
+        }
+
+
+def record_trace(path: str, ticks: int, morg: MorgHTTPSocket = None, status: StatusSocket = None, tick_length: float = 0.6) -> List[dict]:
+    """
+    Records live plugin data once per tick and saves it as a trace for TraceScenario.
+    Args:
+        path: The file to save the trace to.
+        ticks: The number of ticks to record.
+        morg: The MorgHTTPSocket to fetch from (optional).
+        status: The StatusSocket to read from (optional).
+        tick_length: The number of seconds between frames.
+    Returns:
+        The recorded frames.
+    """
+    frames = []
+    for _ in range(ticks):
+        started = time.time()
+        frame = dict(morg.fetch_all()) if morg is not None else {}
+        if status is not None:
+            frame["status"] = JSON.loads(JSON.dumps(status.player_data, default=dict))
+        frames.append(frame)
+        time.sleep(max(0, tick_length - (time.time() - started)))
+    with open(path, "w") as f:
+        JSON.dump(frames, f)
+    return frames
+
+
+class MockPluginServer:
+    def __init__(
+        self,
+        scenario: Scenario,
+        morg_port: int = 8081,
+        status_url: str = "http://127.0.0.1:5000/",
+        tick_length: float = 0.6,
+        latency: float = 0.0,
+        latency_jitter: float = 0.0,
+        failure_rate: float = 0.0,
+        failure_status: int = 500,
+        seed: int = None,
+    ):
+        """
+        Args:
+            scenario: The Scenario to serve.
+            morg_port: The port to serve the Morg endpoints on (0 picks a free port, see `base_endpoint`).
+            status_url: The URL to POST Status Socket payloads to, or None to disable them.
+            tick_length: The number of seconds per tick.
+            latency: Seconds added to every Morg response.
+            latency_jitter: Up to this many seconds of extra, uniformly random latency.
+            failure_rate: The probability (0-1) that a Morg request fails.
+            failure_status: The status code failed requests are answered with (0 drops the connection instead).
+            seed: Seed for latency and failure randomness.
+        """
+        self.scenario = scenario
+        self.status_url = status_url
+        self.tick_length = tick_length
+        self.latency = latency
+        self.latency_jitter = latency_jitter
+        self.failure_rate = failure_rate
+        self.failure_status = failure_status
+        self.tick = 0
+        self.request_counts: Dict[str, int] = {endpoint: 0 for endpoint in MORG_ENDPOINTS}
+        self.failures = 0
+        self.posts = 0
+        self._rng = rd.Sampler(seed)
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._httpd = ThreadingHTTPServer(("127.0.0.1", morg_port), self.__handler())
+        self._httpd.daemon_threads = True
+        self.port = self._httpd.server_address[1]
+        self.base_endpoint = f"http://localhost:{self.port}/"
+
+    def __handler(self) -> type:
+        server = self
+
+        class MorgHandler(BaseHTTPRequestHandler):
+            protocol_version = "HTTP/1.1"
+
+            def do_GET(self):
+                server.respond(self)
+
+            def log_message(self, format, *args):
+                return
+
+        return MorgHandler
+
+    def current_frame(self) -> dict:
+        """
+        Returns the scenario's frame for the current tick, with the tick number filled in.
+        """
+        frame = dict(self.scenario.frame(self.tick))
+        frame["events"] = dict(frame.get("events", {}), **{"game tick": self.tick})
+        if "status" in frame:
+            frame["status"] = dict(frame["status"], tick=self.tick)
+        return frame
+
+    def respond(self, handler: BaseHTTPRequestHandler) -> None:
+        """
+        Answers a Morg HTTP Client request, applying the configured latency and failures.
+        """
+        endpoint = handler.path.strip("/")
+        if endpoint not in MORG_ENDPOINTS:
+            handler.send_error(404)
+            return
+        with self._lock:
+            self.request_counts[endpoint] += 1
+            delay = self.latency + self._rng.uniform(0, self.latency_jitter)
+            fail = self.failure_rate > 0 and self._rng.chance(float(self.failure_rate))
+        time.sleep(delay)
+        if fail:
+            with self._lock:
+                self.failures += 1
+            if not self.failure_status:
+                handler.close_connection = True
+                return
+            handler.send_response(self.failure_status)
+            handler.send_header("Content-Length", "0")
+            handler.end_headers()
+            return
+        body = JSON.dumps(self.current_frame().get(endpoint, {})).encode()
+        handler.send_response(200)
+        handler.send_header("Content-Type", "application/json")
+        handler.send_header("Content-Length", str(len(body)))
+        handler.end_headers()
+        handler.wfile.write(body)
+
+    def start(self) -> None:
+        """
+        Starts serving requests and advancing ticks on daemon threads.
+        """
+        self._stop.clear()
+        threading.Thread(target=self._httpd.serve_forever, name="MockPluginServer", daemon=True).start()
+        threading.Thread(target=self.__run_ticks, name="MockPluginServer-ticks", daemon=True).start()
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._httpd.shutdown()
+        self._httpd.server_close()
+
+    def __run_ticks(self) -> None:
+        session = requests.Session()
+        next_tick = time.time()
+        while not self._stop.is_set():
+            if self.status_url and (status := self.current_frame().get("status")) is not None:
+                try:
+                    session.post(self.status_url, data=JSON.dumps(status), headers={"Content-Type": "application/json"}, timeout=self.tick_length)
+                    self.posts += 1
+                except requests.RequestException:
+                    pass
+            next_tick += self.tick_length
+            self._stop.wait(max(0, next_tick - time.time()))
+            self.tick += 1
+
+    def reset_counts(self) -> None:
+        """
+        Resets the request, failure and POST counters.
+        """
+        with self._lock:
+            self.request_counts = {endpoint: 0 for endpoint in MORG_ENDPOINTS}
+            self.failures = 0
+            self.posts = 0
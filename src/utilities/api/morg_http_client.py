@@ -1,13 +1,29 @@
 """
 API utility for MorgHTTPClient socket plugin.
+
+Requests are sent over a keep-alive Session, and each endpoint's JSON is cached for a short time (by default,
+one game tick). Getters called in quick succession (E.g., get_hitpoints() followed by get_animation()) therefore
+read the same snapshot instead of each making a round trip.
+
+While a GameStateService polls the socket (see game_state.py), wait_til_gained_xp() and get_is_player_idle()
+block on the service's snapshots instead of polling the plugin themselves.
 """
+import threading
 import time
-from typing import List, Tuple, Union
+from concurrent.futures import ThreadPoolExecutor
+from typing import Callable, Dict, List, Tuple, Union
 
 import requests
 from deprecated import deprecated
+from requests.adapters import HTTPAdapter
 from requests.exceptions import ConnectionError
 
+import utilities.metrics as metrics
+from utilities.api.animations import is_idle
+from utilities.api.inventory import Equipment, Inventory, ItemIds
+
+GAME_TICK = 0.6  # seconds
+
 
 class SocketError(Exception):
     def __init__(self, error_message: str, endpoint: str):
@@ -20,18 +36,42 @@ class SocketError(Exception):
 
 
 class MorgHTTPSocket:
-    def __init__(self):
+    def __init__(self, ttl: float = GAME_TICK, client=None):
+        """
+        Args:
+                ttl: The number of seconds a fetched endpoint is reused for before it is requested again
+                     (default: one game tick). Use 0 to always fetch fresh data.
+                client: An optional AsyncMorgClient. If given, requests are made by the client on the shared
+                        event loop (see utilities.api.async_client) instead of with `requests`.
+        """
         self.base_endpoint = "http://localhost:8081/"
 
         self.inv_endpoint = "inv"
         self.stats_endpoint = "stats"
         self.equip_endpoint = "equip"
         self.events_endpoint = "events"
+        self.endpoints = [self.inv_endpoint, self.stats_endpoint, self.equip_endpoint, self.events_endpoint]
 
         self.timeout = 1
+        self.ttl = ttl
+
+        self.session = requests.Session()
+        self.session.mount("http://", HTTPAdapter(pool_connections=1, pool_maxsize=len(self.endpoints)))
+        self.__snapshots: Dict[str, Tuple[float, Union[dict, list]]] = {}
+        self.__lock = threading.Lock()
+        self.__models: Dict[str, tuple] = {}
+        self.__pool: ThreadPoolExecutor = None
+
+        self.state_service = None  # the running GameStateService polling this socket, if any
+        self.client = client
+        if client is not None:
+            from utilities.api.async_client import default_loop
+
+            self.loop = default_loop()
 
     def __do_get(self, endpoint: str) -> dict:
         """
+        Returns the endpoint's snapshot if it was fetched within the last `ttl` seconds, otherwise fetches it.
         Args:
                 endpoint: One of either "inv", "stats", "equip", "events"
         Returns:
@@ -39,8 +79,34 @@ class MorgHTTPSocket:
         Raises:
                 SocketError: If the endpoint is not valid or the server is not running.
         """
+        with self.__lock:
+            snapshot = self.__snapshots.get(endpoint)
+        hit = snapshot is not None and time.monotonic() - snapshot[0] < self.ttl
+        metrics.cache_result("morg_snapshot", hit)
+        return snapshot[1] if hit else self.__fetch(endpoint)
+
+    def __fetch(self, endpoint: str) -> dict:
+        """
+        Fetches an endpoint and stores it as the endpoint's latest snapshot.
+        """
+        fetched_at = time.monotonic()
+        try:
+            data = self.__request(endpoint) if self.client is None else self.loop.run(self.client.get(endpoint, self.timeout))
+        except SocketError:
+            metrics.API_ERRORS.inc(endpoint=endpoint)
+            raise
+        finally:
+            metrics.API_SECONDS.observe(time.monotonic() - fetched_at, endpoint=endpoint)
+        with self.__lock:
+            self.__snapshots[endpoint] = (fetched_at, data)
+        return data
+
+    def __request(self, endpoint: str) -> dict:
+        """
+        Fetches an endpoint with the requests Session.
+        """
         try:
-            response = requests.get(f"{self.base_endpoint}{endpoint}", timeout=self.timeout)
+            response = self.session.get(f"{self.base_endpoint}{endpoint}", timeout=self.timeout)
         except ConnectionError as e:
             raise SocketError("Unable to reach socket", endpoint) from e
 
@@ -55,15 +121,59 @@ class MorgHTTPSocket:
 
         return response.json()
 
+    def fetch_all(self, endpoints: List[str] = None) -> Dict[str, Union[dict, list]]:
+        """
+        Fetches several endpoints concurrently and refreshes their snapshots, so that getters called
+        afterwards (within `ttl` seconds) do not make any requests.
+        Args:
+                endpoints: The endpoints to fetch (default: all of "inv", "stats", "equip" and "events").
+        Returns:
+                A dict mapping each endpoint to its JSON data.
+        Raises:
+                SocketError: If any of the endpoints could not be fetched.
+        """
+        endpoints = endpoints or self.endpoints
+        if self.client is not None:
+            fetched_at = time.monotonic()
+            try:
+                data = self.loop.run(self.client.fetch_all(endpoints, self.timeout))
+            except SocketError:
+                metrics.API_ERRORS.inc(endpoint="fetch_all")
+                raise
+            finally:
+                metrics.API_SECONDS.observe(time.monotonic() - fetched_at, endpoint="fetch_all")
+            with self.__lock:
+                self.__snapshots.update({endpoint: (fetched_at, data[endpoint]) for endpoint in endpoints})
+            return data
+        if self.__pool is None:
+            self.__pool = ThreadPoolExecutor(max_workers=len(self.endpoints), thread_name_prefix="MorgHTTPSocket")
+        labels = metrics.context_labels()
+        futures = {endpoint: self.__pool.submit(self.__fetch_labelled, endpoint, labels) for endpoint in endpoints}
+        return {endpoint: future.result() for endpoint, future in futures.items()}
+
+    def __fetch_labelled(self, endpoint: str, labels: dict) -> dict:
+        """
+        Fetches an endpoint on a pool thread, recording metrics with the labels of the thread that asked for it.
+        """
+        with metrics.bound(**labels):
+            return self.__fetch(endpoint)
+
+    def invalidate(self) -> None:
+        """
+        Discards all snapshots so that the next getter call fetches fresh data.
+        """
+        with self.__lock:
+            self.__snapshots.clear()
+
     def test_endpoints(self) -> bool:
         """
         Ensures all endpoints are working correctly to avoid errors happening when any method is called.
         Returns:
                 True if successful, False otherwise.
         """
-        for i in list(self.__dict__.values())[1:-1]:  # Look away
+        for i in self.endpoints:
             try:
-                self.__do_get(endpoint=i)
+                self.__fetch(endpoint=i)
             except SocketError as e:
                 print(e)
                 print(f"Endpoint {i} is not working.")
@@ -119,11 +229,18 @@ class MorgHTTPSocket:
         Returns:
                 True if the player is idle, False otherwise..
         """
-        start_time = time.time()
-        while time.time() - start_time < poll_seconds:
+        if self.state_service is not None:
+            # Idle unless a snapshot shows the player doing something within the poll window
+            busy = self.state_service.wait_until(lambda state: not is_idle(state.animation, state.animation_pose), poll_seconds)
+            return busy is None
+
+        stop_time = time.time() + poll_seconds
+        while (remaining := stop_time - time.time()) > 0:
             data = self.__do_get(endpoint=self.events_endpoint)
-            if data.get("animation") != -1 or data.get("animation pose") not in [808, 813]:
+            if not is_idle(data.get("animation"), data.get("animation pose", -1)):
                 return False
+            # Wait for the snapshot to expire, so that each check reads a fresh animation
+            time.sleep(min(self.ttl, remaining))
         return True
 
     def get_skill_level(self, skill: str) -> int:
@@ -184,6 +301,11 @@ class MorgHTTPSocket:
         Returns:
                 The xp gained of the skill as an int, or -1 if no XP was gained or an error occurred during the timeout.
         """
+        if self.state_service is not None and skill in self.state_service.state.skills:
+            starting_xp = self.state_service.state.skills[skill][1]
+            gained = self.state_service.wait_until(lambda state: state.skills[skill][1] > starting_xp, timeout)
+            return -1 if gained is None else gained.skills[skill][1]
+
         starting_xp = self.get_skill_xp(skill)
         if starting_xp == -1:
             print("Failed to get starting xp.")
@@ -296,34 +418,49 @@ class MorgHTTPSocket:
         data = self.__do_get(endpoint=self.events_endpoint)
         return int(data["npc health "])
 
+    def __model(self, endpoint: str, parse: Callable):
+        """
+        Returns the parsed model of an endpoint's current snapshot, parsing it only once per snapshot.
+        """
+        data = self.__do_get(endpoint=endpoint)
+        with self.__lock:
+            cached = self.__models.get(endpoint)
+        if cached is not None and cached[0] is data:
+            return cached[1]
+        model = parse(data)
+        with self.__lock:
+            self.__models[endpoint] = (data, model)
+        return model
+
+    def get_inventory(self) -> Inventory:
+        """
+        Gets the player inventory as an indexed Inventory model. Prefer this over walking the raw JSON.
+        """
+        return self.__model(self.inv_endpoint, Inventory.from_morg)
+
+    def get_equipment(self) -> Equipment:
+        """
+        Gets the player's equipment as an indexed Equipment model.
+        """
+        return self.__model(self.equip_endpoint, Equipment.from_morg)
+
     def get_inv(self):
         """
         Gets a list of dicts representing the player inventory.
         Returns:
             List of dictionaries, each containing index, ID, and quantity of an item.
         """
-        data = self.__do_get(endpoint=self.inv_endpoint)
-        inventory = []
-        for index, item in enumerate(data):
-            if item["quantity"] == 0:
-                continue
-            item_info = {"index": index, "id": item["id"], "quantity": item["quantity"]}
-            inventory.append(item_info)
-        return inventory
+        return self.get_inventory().to_list()
 
-    def get_if_item_in_inv(self, item_id: Union[List[int], int]) -> bool:
+    def get_if_item_in_inv(self, item_id: ItemIds) -> bool:
         """
         Checks if an item is in the inventory or not.
         Args:
-                item_id: the id of the item to check for (an single ID, or list of IDs).
+                item_id: the id of the item to check for (an single ID, or collection of IDs).
         Returns:
                 True if the item is in the inventory, False if not.
         """
-        data = self.__do_get(endpoint=self.inv_endpoint)
-        if isinstance(item_id, int):
-            return any(inventory_slot["id"] == item_id for inventory_slot in data)
-        elif isinstance(item_id, list):
-            return any(inventory_slot["id"] in item_id for inventory_slot in data)
+        return self.get_inventory().contains(item_id)
 
     def get_is_inv_full(self) -> bool:
         """
@@ -331,8 +468,7 @@ class MorgHTTPSocket:
         Returns:
                 True if the player's inventory is full, False otherwise.
         """
-        data = self.__do_get(endpoint=self.inv_endpoint)
-        return len([item["id"] for item in data if item["id"] != -1]) == 28
+        return self.get_inventory().is_full()
 
     def get_is_inv_empty(self) -> bool:
         """
@@ -340,77 +476,54 @@ class MorgHTTPSocket:
         Returns:
                 True if the player's inventory is empty, False otherwise.
         """
-        data = self.__do_get(endpoint=self.inv_endpoint)
-        return not [item["id"] for item in data if item["id"] != -1]
+        return self.get_inventory().is_empty()
 
-    def get_inv_item_indices(self, item_id: Union[List[int], int]) -> list:
+    def get_inv_item_indices(self, item_id: ItemIds) -> list:
         """
         For the given item ID(s), returns a list of inventory slot indexes that the item exists in.
         Useful for locating items you do not want to drop. If you want to locate an item in your
         inventory, consider using :meth:`MorgHTTPSocket.get_first_occurrence()` instead.
         Args:
-                item_id: The item ID to search for (an single ID, or list of IDs).
+                item_id: The item ID to search for (an single ID, or collection of IDs).
         Returns:
                 A list of inventory slot indexes that the item(s) exists in.
         """
-        data = self.__do_get(endpoint=self.inv_endpoint)
-        if isinstance(item_id, int):
-            return [i for i, inventory_slot in enumerate(data) if inventory_slot["id"] == item_id]
-        elif isinstance(item_id, list):
-            return [i for i, inventory_slot in enumerate(data) if inventory_slot["id"] in item_id]
+        return self.get_inventory().indices(item_id)
 
-    def get_first_occurrence(self, item_id: Union[List[int], int]) -> Union[int, List[int]]:
+    def get_first_occurrence(self, item_id: ItemIds) -> Union[int, List[int]]:
         """
         For the given item ID(s), returns the first inventory slot index that the item exists in.
         e.g. [1, 1, 2, 3, 3, 3, 4, 4, 4, 4] -> [0, 2, 3, 6]
         Args:
-            item_id: The item ID to search for (an single ID, or list of IDs).
+            item_id: The item ID to search for (an single ID, or collection of IDs).
         Returns:
             The first inventory slot index that the item exists in for each unique item ID.
             If a single item ID is provided, returns an integer (or -1).
-            If a list of item IDs is provided, returns a list of integers (or empty list).
+            If a collection of item IDs is provided, returns a list of integers (or empty list).
         """
-        data = self.__do_get(endpoint=self.inv_endpoint)
-        if isinstance(item_id, int):
-            return next((i for i, inventory_slot in enumerate(data) if inventory_slot["id"] == item_id), -1)
-        elif isinstance(item_id, list):
-            first_occurrences = {}
-            for i, inventory_slot in enumerate(data):
-                item_id_in_slot = inventory_slot["id"]
-                if item_id_in_slot not in first_occurrences and item_id_in_slot in item_id:
-                    first_occurrences[item_id_in_slot] = i
-            return list(first_occurrences.values())
+        return self.get_inventory().first_occurrence(item_id)
 
-    def get_inv_item_stack_amount(self, item_id: Union[int, List[int]]) -> int:
+    def get_inv_item_stack_amount(self, item_id: ItemIds) -> int:
         """
         For the given item ID, returns the total amount of that item in your inventory.
         This is only useful for items that stack (e.g. coins, runes, etc).
         Args:
-            id: The item ID to search for. If a list is passed, the first matching item will be used.
+            id: The item ID to search for. If a collection is passed, the first matching item will be used.
                 This is useful for items that have multiple IDs (e.g. coins, coin pouches, etc.).
         Returns:
             The total amount of that item in your inventory.
         """
-        data = self.__do_get(endpoint=self.inv_endpoint)
-        if isinstance(item_id, int):
-            item_id = [item_id]
-        if result := next((item for item in data if item["id"] in item_id), None):
-            return int(result["quantity"])
-        return 0
+        return self.get_inventory().stack_amount(item_id)
 
-    def get_is_item_equipped(self, item_id: Union[int, List[int]]) -> bool:
+    def get_is_item_equipped(self, item_id: ItemIds) -> bool:
         """
-        Checks if the player has given item(s) equipped. Given a list of IDs, returns True on first ID found.
+        Checks if the player has given item(s) equipped. Given a collection of IDs, returns True on first ID found.
         Args:
-                item_id: the id of the item to check for (a single ID, or list of IDs).
+                item_id: the id of the item to check for (a single ID, or collection of IDs).
         Returns:
                 True if an item is equipped, False if not.
         """
-        data = self.__do_get(endpoint=self.equip_endpoint)
-        equipped_ids = [item["id"] for item in data]
-        if isinstance(item_id, int):
-            return item_id in equipped_ids
-        return any(item in item_id for item in equipped_ids)
+        return self.get_equipment().is_equipped(item_id)
 
     def get_equipped_item_quantity(self, item_id: int) -> int:
         """
@@ -420,11 +533,7 @@ class MorgHTTPSocket:
         Returns:
                 The quantity of the item equipped, or 0 if not equipped.
         """
-        data = self.__do_get(endpoint=self.equip_endpoint)
-        return next(
-            (int(equip_slot["quantity"]) for equip_slot in data if equip_slot["id"] == item_id),
-            0,
-        )
+        return self.get_equipment().quantity(item_id)
 
     def convert_player_position_to_pixels(self):
         """
@@ -1,15 +1,94 @@
 """
 Requires the Status Socket plugin in RuneLite. Endpoint: "http://localhost:5000".
 """
+import threading
 import time
-from http.server import BaseHTTPRequestHandler, HTTPServer
-from threading import Thread
-from typing import List, Union
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from types import MappingProxyType
+from typing import Callable, Dict, Mapping, Tuple, Union
 
 import simplejson as JSON
 
-# Global to store the data returned from sockets plugin
-player_data = {}
+from utilities.api.inventory import Equipment, Inventory, ItemIds
+
+EMPTY = MappingProxyType({})
+
+# The latest data received for the default key. Kept for backwards compatibility; prefer StatusSocket.snapshot().
+player_data = EMPTY
+
+
+def freeze(data):
+    """
+    Recursively converts parsed JSON into read-only mappings and tuples.
+    """
+    if isinstance(data, dict):
+        return MappingProxyType({key: freeze(value) for key, value in data.items()})
+    if isinstance(data, list):
+        return tuple(freeze(value) for value in data)
+    return data
+
+
+def thaw(data):
+    """
+    Recursively converts frozen data (see freeze()) back into the dicts and lists it was parsed as. The result is a
+    copy that the caller may modify.
+    """
+    if isinstance(data, Mapping):
+        return {key: thaw(value) for key, value in data.items()}
+    if isinstance(data, tuple):
+        return [thaw(value) for value in data]
+    return data
+
+
+class StatusStore:
+    def __init__(self):
+        """
+        Holds the latest immutable snapshot received for each key, with a sequence number that increases with
+        every update. Snapshots are replaced atomically, so readers never see a partially-updated state.
+        """
+        self._snapshots: Dict[str, Tuple[int, Mapping]] = {}
+        self._cond = threading.Condition()
+
+    def publish(self, key: str, data: Mapping) -> int:
+        """
+        Stores a new snapshot for a key and wakes up all waiting readers.
+        Returns:
+            The snapshot's sequence number.
+        """
+        global player_data
+        with self._cond:
+            seq = self._snapshots.get(key, (0, EMPTY))[0] + 1
+            self._snapshots[key] = (seq, data)
+            if key == "":
+                player_data = data
+            self._cond.notify_all()
+        return seq
+
+    def get(self, key: str) -> Tuple[int, Mapping]:
+        """
+        Returns the latest (sequence number, snapshot) for a key, or (0, {}) if nothing was received yet.
+        """
+        return self._snapshots.get(key, (0, EMPTY))
+
+    def wait_for_update(self, key: str, after_seq: int = None, timeout: float = None) -> Union[Tuple[int, Mapping], None]:
+        """
+        Blocks until a snapshot newer than `after_seq` is received for a key.
+        Args:
+            key: The account/window key.
+            after_seq: The sequence number already seen (default: the current one).
+            timeout: The maximum number of seconds to wait.
+        Returns:
+            The new (sequence number, snapshot), or None if the timeout expired.
+        """
+        with self._cond:
+            if after_seq is None:
+                after_seq = self.get(key)[0]
+            if self._cond.wait_for(lambda: self.get(key)[0] > after_seq, timeout):
+                return self.get(key)
+        return None
+
+
+store = StatusStore()
 
 
 # Http request handler class to handle receiving data from the status socket
@@ -19,15 +98,14 @@ class RLSTATUS(BaseHTTPRequestHandler):
     def _set_headers(self):
         self.send_response(200)
         self.send_header("Content-type", "text/html")
+        self.send_header("Content-Length", "0")
         self.end_headers()
 
     def do_POST(self):
-        global player_data
-        self._set_headers()
         self.data_bytes = self.rfile.read(int(self.headers["Content-Length"]))
-        self.send_response(200)
-        self.end_headers()
-        player_data = JSON.loads(self.data_bytes)
+        self._set_headers()
+        # The plugin can be pointed at http://localhost:5000/<key> to share the port between accounts
+        store.publish(self.path.strip("/"), freeze(JSON.loads(self.data_bytes)))
 
     def log_message(self, format, *args):
         """
@@ -36,34 +114,117 @@ class RLSTATUS(BaseHTTPRequestHandler):
         return
 
 
+__servers: Dict[int, ThreadingHTTPServer] = {}
+__servers_lock = threading.Lock()
+
+
+def serve(port: int = 5000, required: bool = False) -> Union[ThreadingHTTPServer, None]:
+    """
+    Starts a status receiver on a port, unless this process is already serving it. One server is shared by every
+    StatusSocket in the process; each reads the data posted to its own key.
+    Args:
+        port: The port to listen on.
+        required: Whether to raise if the port is in use by another process (E.g., another bot process on the
+                  same host). Otherwise, this is printed and no data will be received.
+    Returns:
+        The server, or None if the port is in use by another process.
+    Raises:
+        OSError: If the port is in use by another process and `required` is True.
+    """
+    with __servers_lock:
+        if port not in __servers:
+            try:
+                httpd = ThreadingHTTPServer(("127.0.0.1", port), RLSTATUS)
+            except OSError as e:
+                if required:
+                    raise OSError(f"Unable to start the status socket: port {port} is in use by another process.") from e
+                print(f"Status socket already running (port {port} is in use by another process).")
+                return None
+            httpd.daemon_threads = True
+            threading.Thread(target=httpd.serve_forever, name=f"StatusSocket-{port}", daemon=True).start()
+            __servers[port] = httpd
+        return __servers[port]
+
+
 class StatusSocket:
     gameTick = 0.603
 
-    def __init__(self) -> None:
-        t_server = Thread(target=self.__RSERVER)
-        t_server.daemon = True
-        t_server.start()
-        print("thread alive:", t_server.is_alive())
+    def __init__(self, receiver=None, port: int = 5000, key: str = "", required: bool = False) -> None:
+        """
+        Args:
+            receiver: An optional AsyncStatusReceiver. If given, POSTs are received by it on the shared event loop
+                      (see utilities.api.async_client) instead of by a server thread.
+            port: The port the Status Socket plugin posts to.
+            key: The account/window key. Configure the plugin's endpoint as http://localhost:<port>/<key> to run
+                 several accounts against the same port (default: "", i.e., http://localhost:<port>).
+            required: Whether to raise if the port is in use by another process. By default, this is printed and
+                      the socket's snapshots stay empty.
+        Raises:
+            OSError: If the port is in use by another process and `required` is True.
+        """
+        self.key = key
+        self.__models: Dict[str, tuple] = {}
+        if receiver is not None:
+            self.__start_receiver(receiver)
+        else:
+            serve(port, required)
+
+    def __start_receiver(self, receiver) -> None:
+        from utilities.api.async_client import default_loop
 
-    def __RSERVER(self, port=5000):
+        receiver.add_listener(lambda data: store.publish(self.key, freeze(data)))
         try:
-            httpd = HTTPServer(("127.0.0.1", port), RLSTATUS)
-            httpd.serve_forever()
+            default_loop().run(receiver.start())
         except OSError:
             print("Status socket already running.")
 
+    @property
+    def player_data(self) -> Mapping:
+        """
+        The latest snapshot received for this socket's key.
+        """
+        return store.get(self.key)[1]
+
+    @property
+    def seq(self) -> int:
+        """
+        The sequence number of the latest snapshot (0 if nothing was received yet).
+        """
+        return store.get(self.key)[0]
+
+    def snapshot(self) -> Tuple[int, Mapping]:
+        """
+        Returns the latest (sequence number, snapshot) as one atomic read.
+        """
+        return store.get(self.key)
+
+    def wait_for_update(self, after_seq: int = None, timeout: float = None) -> Union[Tuple[int, Mapping], None]:
+        """
+        Blocks until the plugin posts data newer than `after_seq`.
+        Args:
+            after_seq: The sequence number already seen (default: the current one).
+            timeout: The maximum number of seconds to wait.
+        Returns:
+            The new (sequence number, snapshot), or None if the timeout expired.
+        Example:
+            >>> seq, data = api.snapshot()
+            >>> if update := api.wait_for_update(seq, timeout=2):
+            >>>     seq, data = update
+        """
+        return store.wait_for_update(self.key, after_seq, timeout)
+
     def get_player_data(self):
         """
-        Fetches the entire blob of player_Data
+        Fetches the entire blob of player_Data, as a dict copy (see snapshot() for the read-only data).
         """
-        print(player_data)
-        return player_data
+        print(self.player_data)
+        return thaw(self.player_data)
 
     def get_game_tick(self) -> int:
         """
         Fetches the game tick from the API.
         """
-        return player_data["tick"]
+        return self.player_data["tick"]
 
     def get_real_level(self, skill_name):
         """
@@ -74,7 +235,7 @@ class StatusSocket:
             >>> print(api_status.get_real_level("ATTACK"))
         """
         return next(
-            (skill["realLevel"] for skill in player_data["skills"] if skill["skillName"] == skill_name),
+            (skill["realLevel"] for skill in self.player_data["skills"] if skill["skillName"] == skill_name),
             None,
         )
 
@@ -87,7 +248,7 @@ class StatusSocket:
             >>> print(api_status.get_boosted_level("ATTACK"))
         """
         return next(
-            (skill["boostedLevel"] for skill in player_data["skills"] if skill["skillName"] == skill_name),
+            (skill["boostedLevel"] for skill in self.player_data["skills"] if skill["skillName"] == skill_name),
             None,
         )
 
@@ -113,7 +274,7 @@ class StatusSocket:
         Returns:
                 The player's current run energy as an int.
         """
-        return int(player_data["runEnergy"])
+        return int(self.player_data["runEnergy"])
 
     def get_is_inv_full(self) -> bool:
         """
@@ -121,7 +282,7 @@ class StatusSocket:
         Returns:
                 True if the player's inventory is full, False otherwise.
         """
-        return len(player_data["inventory"]) >= 28
+        return self.get_inventory().is_full()
 
     def get_is_inv_empty(self) -> bool:
         """
@@ -129,11 +290,35 @@ class StatusSocket:
         Returns:
                 True if the player's inventory is empty, False otherwise.
         """
-        return len(player_data["inventory"]) == 0
+        return self.get_inventory().is_empty()
+
+    def __model(self, field: str, parse: Callable):
+        """
+        Returns the parsed model of a field of the latest snapshot, parsing it only once per snapshot.
+        """
+        seq, data = self.snapshot()
+        cached = self.__models.get(field)
+        if cached is not None and cached[0] == seq:
+            return cached[1]
+        model = parse(data[field] or ())
+        self.__models[field] = (seq, model)
+        return model
+
+    def get_inventory(self) -> Inventory:
+        """
+        Gets the player inventory as an indexed Inventory model. Prefer this over walking the raw JSON.
+        """
+        return self.__model("inventory", Inventory.from_status)
+
+    def get_equipment(self) -> Equipment:
+        """
+        Gets the player's equipment as an indexed Equipment model.
+        """
+        return self.__model("equipment", Equipment.from_status)
 
     def get_inv(self) -> list:
         """
-        Gets a list of dicts representing the player inventory.
+        Gets a list of dicts representing the player inventory. The list is a copy; prefer get_inventory().
         Returns:
                 A list of dicts with the following keys:
                         - index: The position of the item in the inventory.
@@ -143,39 +328,30 @@ class StatusSocket:
                 for item in inv:
                         print(f"Slot: {item['index']}, Item ID: {item['id']}, Amount: {item['amount']}")
         """
-        return player_data["inventory"]
+        return thaw(self.player_data["inventory"])
 
-    def get_inv_item_indices(self, item_id: Union[List[int], int]) -> list:
+    def get_inv_item_indices(self, item_id: ItemIds) -> list:
         """
         For the given item ID, returns a list of inventory slot indexes that the item exists in.
         Useful for locating items you do not want to drop.
         Args:
-                item_id: The item ID to search for (an single ID, or list of IDs).
+                item_id: The item ID to search for (an single ID, or collection of IDs).
         Returns:
                 A list of inventory slot indexes that the item exists in.
         """
-        inv = player_data["inventory"]
-        if isinstance(item_id, int):
-            return [slot["index"] for slot in inv if slot["id"] == item_id]
-        elif isinstance(item_id, list):
-            return [slot["index"] for slot in inv if slot["id"] in item_id]
+        return self.get_inventory().indices(item_id)
 
-    def get_inv_item_stack_amount(self, item_id: Union[int, List[int]]) -> int:
+    def get_inv_item_stack_amount(self, item_id: ItemIds) -> int:
         """
         For the given item ID, returns the total amount of that item in your inventory.
         This is only useful for items that stack (e.g. coins, runes, etc).
         Args:
-                item_id: The item ID to search for. If a list is passed, the first matching item will be used.
+                item_id: The item ID to search for. If a collection is passed, the first matching item will be used.
                          This is useful for items that have multiple IDs (e.g. coins, coin pouches, etc.).
         Returns:
                 The total amount of that item in your inventory.
         """
-        inv = player_data["inventory"]
-        if isinstance(item_id, int):
-            item_id = [item_id]
-        if result := next((item for item in inv if item["id"] in item_id), None):
-            return int(result["amount"])
-        return 0
+        return self.get_inventory().stack_amount(item_id)
 
     def get_is_player_idle(self) -> bool:
         """
@@ -187,12 +363,15 @@ class StatusSocket:
                 If you have the option, use MorgHTTPClient's idle check function instead. This one
                 does not consider movement animations.
         """
-        # run a loop for 0.6 second
-        start_time = time.time()
-        while time.time() - start_time < 0.8:
-            if player_data["attack"]["animationId"] != -1:
+        # watch the updates received over 0.8 seconds
+        stop_time = time.time() + 0.8
+        seq, data = self.snapshot()
+        while True:
+            if data["attack"]["animationId"] != -1:
                 return False
-        return True
+            if (remaining := stop_time - time.time()) <= 0 or (update := self.wait_for_update(seq, remaining)) is None:
+                return True
+            seq, data = update
 
     def get_is_player_praying(self) -> bool:
         """
@@ -200,10 +379,10 @@ class StatusSocket:
         Returns:
                 True if the player is praying, False otherwise.
         """
-        return bool(player_data["prayers"])
+        return bool(self.player_data["prayers"])
 
     def get_player_equipment(self) -> list:
-        return player_data["equipment"] or []
+        return thaw(self.player_data["equipment"]) or []
 
     # pass; returns a list of stats like stab, slash, crush, will return all 0s if nothing is worn
     def get_equipment_stats(self) -> list:
@@ -213,28 +392,33 @@ class StatusSocket:
         Returns:
                 A list of your current equipment stats.
         """
-        return player_data["equipmentStats"]
+        return thaw(self.player_data["equipmentStats"])
 
     def get_animation_data(self) -> list:
+        attack = self.player_data["attack"]
         return (
-            player_data["attack"]["animationName"],
-            player_data["attack"]["animationId"],
-            player_data["attack"]["animationIsSpecial"],
-            player_data["attack"]["animationBaseSpellDmg"],
+            attack["animationName"],
+            attack["animationId"],
+            attack["animationIsSpecial"],
+            attack["animationBaseSpellDmg"],
         )
 
     def get_animation_id(self) -> int:
-        return player_data["attack"]["animationId"]
+        return self.player_data["attack"]["animationId"]
 
 
 # Test Code
 if __name__ == "__main__":
+    from utilities.tick_clock import TickClock
+
     print("Attempting to start server...")
     api = StatusSocket()
+    clock = TickClock(api.get_game_tick)
+    clock.start()
 
     while True:
         # api.get_PlayerData()
-        time.sleep(api.gameTick)
+        clock.sleep_until_next_tick()
         print(f"Real Strength Level: {api.get_real_level('STRENGTH')}")
         print(f"Boosted Strength Level: {api.get_boosted_level('STRENGTH')}")
         print(f"Is Strength boosted?: {api.get_is_boosted('STRENGTH')}")
@@ -0,0 +1,606 @@
+"""
+Offline benchmarks for the computer vision and OCR stack.
+
+A fixture is a client frame plus a list of cases. Each case runs one benchmarked function (see BENCHES) on a region
+of the frame and states the result it should produce. The suite replays each frame through a ReplaySource (see
+frame_bus.py), so `Rectangle.screenshot()` returns the recorded pixels and no client or display is needed. Every case
+is checked for correctness and timed over several runs, and a run can be compared against a stored baseline to
+catch slowdowns.
+
+Fixtures live in benchmarks/fixtures/<name>/ (frame.png and fixture.json). They come from two places:
+- generate_synthetic() builds deterministic frames from the UI templates, item sprites and font glyphs in the repo,
+  so their expected results are known by construction: an inventory, a bank, a game view with tagged objects,
+  mouseover text and the Mastering Mixology order HUD. These are generated automatically when missing.
+- record_fixture() saves a frame of a live client, with the current results as the expected ones. Review them
+  before relying on the fixture.
+
+Usage (from src/):
+    python -m utilities.benchmark run
+    python -m utilities.benchmark run --save-baseline
+    python -m utilities.benchmark run --threshold 0.2  # exits with 1 if a case is wrong or >20% slower than baseline
+    python -m utilities.benchmark record alice_bank --scene bank --title "RuneLite - alice"
+"""
+import argparse
+import contextlib
+import io
+import os
+import platform
+import sys
+import time
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Tuple, Union
+
+import cv2
+import numpy as np
+import simplejson as JSON
+
+import utilities.color as clr
+import utilities.geometry as geometry
+import utilities.imagesearch as imsearch
+import utilities.ocr as ocr
+import utilities.runelite_cv as rcv
+import utilities.synthetic as synthetic
+from utilities.frame_bus import ReplaySource
+from utilities.geometry import Rectangle
+from utilities.window import ReplayWindow, Window
+
+BENCHMARK_DIR = Path(__file__).parent.parent.joinpath("benchmarks")
+FIXTURE_DIR = BENCHMARK_DIR.joinpath("fixtures")
+BASELINE_PATH = BENCHMARK_DIR.joinpath("baseline.json")
+SYNTHETIC_PREFIX = "synthetic_"
+REGRESSION_THRESHOLD = 0.2  # fraction by which a case's median time may exceed the baseline
+DEFAULT_TOLERANCE = 2  # pixels
+
+Box = Tuple[int, int, int, int]
+
+
+class Bench(NamedTuple):
+    prepare: Callable[..., Callable[[], object]]
+    tolerance: int
+
+
+# --- Benchmarked functions ---
+# Each receives the case's Rectangle and arguments, does any untimed preparation, and returns the function to time.
+# That function's return value is the case's result, which must be JSON serializable.
+BENCHES: Dict[str, Bench] = {}
+
+
+def benchmark(name: str, tolerance: int = DEFAULT_TOLERANCE) -> Callable[[Callable], Callable]:
+    """
+    Registers a benchmarked function.
+    Args:
+        name: The name cases refer to it by.
+        tolerance: How far numbers in the result may be from the expected ones (E.g., pixels for coordinates).
+    """
+
+    def register(fn: Callable) -> Callable:
+        BENCHES[name] = Bench(fn, tolerance)
+        return fn
+
+    return register
+
+
+def _box(rect: Rectangle) -> Union[Box, None]:
+    return None if rect is None else [int(rect.left), int(rect.top), int(rect.width), int(rect.height)]
+
+
+def _distinct(boxes: List[Box], radius: int = 3) -> List[Box]:
+    """
+    Merges boxes whose top-left corners are within `radius` pixels, since a template matches at neighbouring offsets too.
+    """
+    kept = []
+    for box in sorted(boxes):
+        if all(abs(box[0] - k[0]) > radius or abs(box[1] - k[1]) > radius for k in kept):
+            kept.append(box)
+    return kept
+
+
+@benchmark("isolate_colors", tolerance=0)
+def _bench_isolate_colors(rect: Rectangle, colors: List[clr.Color]):
+    return lambda: int(cv2.countNonZero(clr.isolate_colors(rect.screenshot(), colors)))
+
+
+@benchmark("extract_objects")
+def _bench_extract_objects(rect: Rectangle, colors: List[clr.Color]):
+    mask = clr.isolate_colors(rect.screenshot(), colors)
+    return lambda: sorted([int(obj._center[0]) + rect.left, int(obj._center[1]) + rect.top] for obj in rcv.extract_objects(mask))
+
+
+@benchmark("search_img_in_rect")
+def _bench_search_img_in_rect(rect: Rectangle, image: str, confidence: float = 0.2):
+    template = cv2.imread(image, cv2.IMREAD_UNCHANGED)
+    return lambda: _box(imsearch.search_img_in_rect(template, rect, confidence))
+
+
+@benchmark("search_all_img_in_rect")
+def _bench_search_all_img_in_rect(rect: Rectangle, image: str, confidence: float = 0.15):
+    template = cv2.imread(image, cv2.IMREAD_UNCHANGED)
+    # Matches come back in the Rectangle's coordinates, with no Rectangle reference set
+    return lambda: _distinct(
+        [[int(obj._x_min) + rect.left, int(obj._y_min) + rect.top, int(obj._width), int(obj._height)] for obj in imsearch.search_all_img_in_rect(template, rect, confidence)]
+    )
+
+
+@benchmark("extract_text", tolerance=0)
+def _bench_extract_text(rect: Rectangle, font: dict, colors: List[clr.Color]):
+    return lambda: ocr.extract_text(rect, font, colors)
+
+
+@benchmark("find_text")
+def _bench_find_text(rect: Rectangle, text: str, font: dict, colors: List[clr.Color]):
+    return lambda: sorted(_box(found) for found in ocr.find_text(text, rect, font, colors))
+
+
+@benchmark("window_initialize")
+def _bench_window_initialize(rect: Rectangle, padding_top: int = 0, padding_left: int = 0):
+    def run():
+        win = ReplayWindow(rect, padding_top, padding_left)
+        win.initialize(use_cache=False)
+        return {name: _box(getattr(win, name)) for name in ("minimap_area", "chat", "control_panel", "game_view")}
+
+    return run
+
+
+def _resolve_args(args: dict) -> dict:
+    """
+    Turns the names stored in a fixture into objects: colors (names in utilities.color), font (a name in
+    utilities.ocr) and image (a path relative to images/bot).
+    """
+    resolved = dict(args)
+    if "colors" in resolved:
+        resolved["colors"] = [getattr(clr, name) for name in resolved["colors"]]
+    if "font" in resolved:
+        resolved["font"] = getattr(ocr, resolved["font"])
+    if "image" in resolved:
+        resolved["image"] = str(imsearch.BOT_IMAGES.joinpath(resolved["image"]))
+    return resolved
+
+
+def _matches(expected, actual, tolerance: int) -> bool:
+    if isinstance(expected, dict):
+        return isinstance(actual, dict) and expected.keys() == actual.keys() and all(_matches(expected[k], actual[k], tolerance) for k in expected)
+    if isinstance(expected, (list, tuple)):
+        return isinstance(actual, (list, tuple)) and len(expected) == len(actual) and all(_matches(e, a, tolerance) for e, a in zip(expected, actual))
+    if isinstance(expected, (int, float)) and not isinstance(expected, bool) and isinstance(actual, (int, float)):
+        return abs(expected - actual) <= tolerance
+    return expected == actual
+
+
+# --- Fixtures ---
+class Fixture(NamedTuple):
+    name: str
+    image: np.ndarray
+    client: Rectangle
+    padding: Tuple[int, int]  # (top, left)
+    cases: List[dict]
+
+
+def load_fixture(path: Union[str, Path]) -> Fixture:
+    """
+    Loads a fixture directory (frame.png and fixture.json).
+    """
+    path = Path(path)
+    with open(path.joinpath("fixture.json")) as f:
+        data = JSON.load(f)
+    image = cv2.imread(str(path.joinpath("frame.png")), cv2.IMREAD_COLOR)
+    return Fixture(path.name, image, Rectangle(*data["client"]), tuple(data.get("padding", (0, 0))), data["cases"])
+
+
+def save_fixture(fixture_dir: Union[str, Path], name: str, image: np.ndarray, client: Rectangle, padding: Tuple[int, int], cases: List[dict]) -> Path:
+    """
+    Writes a fixture directory.
+    Args:
+        fixture_dir: The directory holding all fixtures.
+        name: The fixture's name (its directory).
+        image: The client frame (BGR).
+        client: The screen region the frame was captured from.
+        padding: The client window's (top, left) padding.
+        cases: The cases: {"name", "bench", "rect" (a screen box), "args", "expected", optionally "subtract" and "tolerance"}.
+    Returns:
+        The fixture's directory.
+    """
+    path = Path(fixture_dir).joinpath(name)
+    path.mkdir(parents=True, exist_ok=True)
+    cv2.imwrite(str(path.joinpath("frame.png")), image)
+    with open(path.joinpath("fixture.json"), "w") as f:
+        JSON.dump({"client": _box(client), "padding": list(padding), "cases": cases}, f, indent=2)
+    return path
+
+
+def _case_rect(case: dict, fixture: Fixture) -> Rectangle:
+    rect = Rectangle(*case["rect"]) if case.get("rect") else Rectangle(fixture.client.left, fixture.client.top, fixture.client.width, fixture.client.height)
+    rect.subtract_list = case.get("subtract", [])
+    return rect
+
+
+@contextlib.contextmanager
+def replaying(image: np.ndarray, client: Rectangle):
+    """
+    Serves `image` as the screen contents at `client` for the duration of a with-block.
+    """
+    previous = geometry.frame_source()
+    geometry.set_frame_source(ReplaySource(image, client.left, client.top))
+    try:
+        yield
+    finally:
+        geometry.set_frame_source(previous)
+
+
+def _prepare(case: dict, fixture: Fixture) -> Callable[[], object]:
+    args = _resolve_args(case.get("args", {}))
+    if case["bench"] == "window_initialize":
+        args.setdefault("padding_top", fixture.padding[0])
+        args.setdefault("padding_left", fixture.padding[1])
+    return BENCHES[case["bench"]].prepare(_case_rect(case, fixture), **args)
+
+
+# --- Running ---
+class CaseResult(NamedTuple):
+    fixture: str
+    case: str
+    bench: str
+    correct: bool
+    expected: object
+    actual: object
+    runs: int
+    min_ms: float
+    median_ms: float
+    p95_ms: float
+
+    @property
+    def key(self) -> str:
+        return f"{self.fixture}/{self.case}"
+
+
+def run_case(case: dict, fixture: Fixture, repeat: int = 10) -> CaseResult:
+    """
+    Checks and times one case. The frame must already be replayed (see replaying()).
+    """
+    with contextlib.redirect_stdout(io.StringIO()):  # Window.initialize() and friends print progress
+        run = _prepare(case, fixture)
+        actual = JSON.loads(JSON.dumps(run()))  # normalize tuples, numpy ints, etc.
+        times = []
+        for _ in range(repeat):
+            start = time.perf_counter()
+            run()
+            times.append((time.perf_counter() - start) * 1000)
+    times.sort()
+    tolerance = case.get("tolerance", BENCHES[case["bench"]].tolerance)
+    return CaseResult(
+        fixture.name,
+        case["name"],
+        case["bench"],
+        _matches(case["expected"], actual, tolerance),
+        case["expected"],
+        actual,
+        repeat,
+        times[0],
+        times[len(times) // 2],
+        times[min(len(times) - 1, int(len(times) * 0.95))],
+    )
+
+
+def run_suite(fixture_dir: Union[str, Path] = FIXTURE_DIR, repeat: int = 10, only: List[str] = None) -> List[CaseResult]:
+    """
+    Runs every case of every fixture. The synthetic fixtures are generated first if they are missing.
+    Args:
+        fixture_dir: The directory holding the fixtures.
+        repeat: The number of timed runs per case.
+        only: Only run the fixtures with these names.
+    """
+    fixture_dir = Path(fixture_dir)
+    if not any(fixture_dir.glob(f"{SYNTHETIC_PREFIX}*/fixture.json")):
+        generate_synthetic(fixture_dir)
+    results = []
+    for path in sorted(p.parent for p in fixture_dir.glob("*/fixture.json")):
+        if only and path.name not in only:
+            continue
+        fixture = load_fixture(path)
+        with replaying(fixture.image, fixture.client):
+            results.extend(run_case(case, fixture, repeat) for case in fixture.cases)
+    return results
+
+
+# --- Baselines ---
+def save_baseline(results: List[CaseResult], path: Union[str, Path] = BASELINE_PATH) -> None:
+    """
+    Stores the timings of a run as the baseline to compare later runs against.
+    """
+    data = {
+        "machine": {"platform": platform.platform(), "python": platform.python_version(), "cpus": os.cpu_count()},
+        "cases": {r.key: {"median_ms": round(r.median_ms, 4), "p95_ms": round(r.p95_ms, 4)} for r in results},
+    }
+    Path(path).parent.mkdir(parents=True, exist_ok=True)
+    with open(path, "w") as f:
+        JSON.dump(data, f, indent=2)
+
+
+def load_baseline(path: Union[str, Path] = BASELINE_PATH) -> Dict[str, dict]:
+    """
+    Returns the baseline timings by case key ("fixture/case"), or an empty dict if there is no baseline.
+    """
+    try:
+        with open(path) as f:
+            return JSON.load(f)["cases"]
+    except FileNotFoundError:
+        return {}
+
+
+def compare(results: List[CaseResult], baseline: Dict[str, dict], threshold: float = REGRESSION_THRESHOLD) -> List[str]:
+    """
+    Compares a run against a baseline.
+    Args:
+        results: The results of the run.
+        baseline: The baseline timings (see load_baseline()).
+        threshold: The fraction by which a case's median time may exceed its baseline.
+    Returns:
+        A description of each problem: incorrect results and cases slower than allowed. Empty if the run passed.
+    """
+    problems = []
+    for r in results:
+        if not r.correct:
+            problems.append(f"{r.key}: expected {r.expected}, got {r.actual}")
+        base = baseline.get(r.key)
+        if base and r.median_ms > base["median_ms"] * (1 + threshold):
+            problems.append(f"{r.key}: {r.median_ms:.3f} ms vs. {base['median_ms']:.3f} ms baseline (+{r.median_ms / base['median_ms'] - 1:.0%})")
+    return problems
+
+
+def format_report(results: List[CaseResult], baseline: Dict[str, dict] = None) -> str:
+    """
+    Formats a run as a table, with the change from the baseline if one is given.
+    """
+    baseline = baseline or {}
+    lines = [f"{'case':<52}{'bench':<24}{'ok':<4}{'min ms':>10}{'median ms':>11}{'p95 ms':>10}{'vs base':>9}"]
+    for r in results:
+        base = baseline.get(r.key)
+        delta = f"{r.median_ms / base['median_ms'] - 1:+.0%}" if base and base["median_ms"] > 0 else "-"
+        lines.append(f"{r.key:<52}{r.bench:<24}{'yes' if r.correct else 'NO':<4}{r.min_ms:>10.3f}{r.median_ms:>11.3f}{r.p95_ms:>10.3f}{delta:>9}")
+    return "\n".join(lines)
+
+
+# --- Synthetic fixtures ---
+SYNTHETIC_CLIENT = Rectangle(100, 50, 1100, 1000)
+
+
+def _synthetic_base(seed: int) -> Tuple[np.ndarray, Dict[str, Box]]:
+    return synthetic.client_frame(SYNTHETIC_CLIENT.width, SYNTHETIC_CLIENT.height, seed)
+
+
+def _screen(box: Box) -> Box:
+    return [box[0] + SYNTHETIC_CLIENT.left, box[1] + SYNTHETIC_CLIENT.top, box[2], box[3]]
+
+
+def _window_case(anchors: Dict[str, Box]) -> dict:
+    cp = anchors["control_panel"]
+    game_view = [0, 0, cp[0] + cp[2], cp[1] + cp[3]]
+    expected = {name: _screen(box) for name, box in anchors.items()}
+    expected["game_view"] = _screen(game_view)
+    return {"name": "window_initialize", "bench": "window_initialize", "rect": None, "args": {}, "expected": expected}
+
+
+def _game_view_case(anchors: Dict[str, Box]) -> Tuple[Box, List[dict]]:
+    """
+    Returns the game view's screen box and its subtract list (the UI drawn over it), like Window.initialize().
+    """
+    cp = anchors["control_panel"]
+    subtract = [{"left": b[0], "top": b[1], "width": b[2], "height": b[3]} for b in anchors.values()]
+    return _screen([0, 0, cp[0] + cp[2], cp[1] + cp[3]]), subtract
+
+
+def generate_synthetic(fixture_dir: Union[str, Path] = FIXTURE_DIR) -> List[Path]:
+    """
+    Generates the synthetic fixtures. Their frames are deterministic, and their expected results follow from how the
+    frames were drawn rather than from running the code under test.
+    Returns:
+        The fixture directories.
+    """
+    paths = []
+    coal = synthetic.load_sprite("items/Coal.png")
+    gold_bar = synthetic.load_sprite("items/Gold_bar.png")
+
+    # Inventory: coal in four slots, a gold bar in one
+    frame, anchors = _synthetic_base(1)
+    cp = anchors["control_panel"]
+    slots = geometry.SlotGrid(40 + cp[0], 44 + cp[1], 36, 32, cols=4, rows=7, gap_x=6, gap_y=4)
+    coal_boxes = [_screen(synthetic.paste(frame, coal, slots[i].left + 2, slots[i].top + 2)) for i in (0, 1, 5, 12)]
+    gold_box = _screen(synthetic.paste(frame, gold_bar, slots[3].left + 4, slots[3].top + 5))
+    inventory = _screen([slots.left, slots.top, slots.bounding_rect().width, slots.bounding_rect().height])
+    cases = [
+        _window_case(anchors),
+        {"name": "find_coal", "bench": "search_all_img_in_rect", "rect": inventory, "args": {"image": "items/Coal.png"}, "expected": sorted(coal_boxes)},
+        {"name": "find_gold_bar", "bench": "search_img_in_rect", "rect": inventory, "args": {"image": "items/Gold_bar.png"}, "expected": gold_box},
+    ]
+    paths.append(save_fixture(fixture_dir, f"{SYNTHETIC_PREFIX}inventory", frame, SYNTHETIC_CLIENT, (0, 0), cases))
+
+    # Bank: the bank interface with coal in three slots
+    frame, anchors = _synthetic_base(2)
+    bank = synthetic.load_sprite("ui_templates/bank.png")
+    bank_box = synthetic.paste(frame, bank, 300, 20)
+    slots = geometry.SlotGrid(41 + bank_box[0], 74 + bank_box[1], 33, 32, cols=8, rows=10, gap_x=4, gap_y=3)
+    coal_boxes = [_screen(synthetic.paste(frame, coal, slots[i].left, slots[i].top + 2)) for i in (0, 9, 23)]
+    cases = [
+        _window_case(anchors),
+        {"name": "find_bank", "bench": "search_img_in_rect", "rect": None, "args": {"image": "ui_templates/bank.png"}, "expected": _screen(bank_box)},
+        {"name": "find_coal", "bench": "search_all_img_in_rect", "rect": _screen(bank_box), "args": {"image": "items/Coal.png"}, "expected": sorted(coal_boxes)},
+    ]
+    paths.append(save_fixture(fixture_dir, f"{SYNTHETIC_PREFIX}bank", frame, SYNTHETIC_CLIENT, (0, 0), cases))
+
+    # Game view: outlined (tagged) objects in cyan and purple
+    frame, anchors = _synthetic_base(3)
+    tags = {"CYAN": ((255, 255, 0), [(120, 300, 60, 90), (420, 180, 40, 40), (600, 420, 120, 70)]), "PURPLE": ((255, 0, 170), [(250, 520, 50, 80)])}
+    mask = np.zeros(frame.shape[:2], np.uint8)
+    centers = {}
+    for name, (bgr, boxes) in tags.items():
+        centers[name] = []
+        for x, y, w, h in boxes:
+            cv2.rectangle(frame, (x, y), (x + w, y + h), bgr, 2)
+            if name == "CYAN":
+                cv2.rectangle(mask, (x, y), (x + w, y + h), 255, 2)
+            centers[name].append([x + w // 2 + SYNTHETIC_CLIENT.left, y + h // 2 + SYNTHETIC_CLIENT.top])
+    game_view, subtract = _game_view_case(anchors)
+    cases = [
+        _window_case(anchors),
+        {"name": "isolate_cyan", "bench": "isolate_colors", "rect": game_view, "subtract": subtract, "args": {"colors": ["CYAN"]}, "expected": int(cv2.countNonZero(mask))},
+        {"name": "tagged_cyan", "bench": "extract_objects", "rect": game_view, "subtract": subtract, "args": {"colors": ["CYAN"]}, "expected": sorted(centers["CYAN"])},
+        {"name": "tagged_all", "bench": "extract_objects", "rect": game_view, "subtract": subtract, "args": {"colors": ["CYAN", "PURPLE"]}, "expected": sorted(centers["CYAN"] + centers["PURPLE"])},
+    ]
+    paths.append(save_fixture(fixture_dir, f"{SYNTHETIC_PREFIX}game_view_tags", frame, SYNTHETIC_CLIENT, (0, 0), cases))
+
+    # Mouseover text (top-left of the game view)
+    frame, anchors = _synthetic_base(4)
+    text = "Chop down Oak tree"
+    synthetic.draw_text(frame, "Chop down ", ocr.BOLD_12, 4, 5, (255, 255, 255))
+    oak_box = synthetic.draw_text(frame, "Oak", ocr.BOLD_12, 4 + synthetic.text_width("Chop down ", ocr.BOLD_12), 5, (255, 255, 255))
+    mouseover = _screen([0, 0, 407, 26])
+    cases = [
+        _window_case(anchors),
+        {"name": "extract_text", "bench": "extract_text", "rect": mouseover, "args": {"font": "BOLD_12", "colors": ["OFF_WHITE"]}, "expected": text.replace(" ", "")},
+        {"name": "find_oak", "bench": "find_text", "rect": mouseover, "args": {"text": "Oak", "font": "BOLD_12", "colors": ["OFF_WHITE"]}, "expected": [_screen([oak_box[0], oak_box[1] + 1, oak_box[2], oak_box[3]])]},
+    ]
+    synthetic.draw_text(frame, text[len("Chop down Oak") :], ocr.BOLD_12, oak_box[0] + oak_box[2], 5, (255, 255, 255))
+    paths.append(save_fixture(fixture_dir, f"{SYNTHETIC_PREFIX}mouseover", frame, SYNTHETIC_CLIENT, (0, 0), cases))
+
+    # Mastering Mixology order HUD (in the info panel): a white potion name and colored abbreviations per order row
+    frame, anchors = _synthetic_base(5)
+    hud_colors = {"A": (106, 255, 0), "M": (255, 192, 0), "L": (81, 41, 255)}
+    orders = [("MixALot", "MAL"), ("AzureAuraMix", "AAM"), ("LipLackLiquor", "LLL")]
+    orders_top, row_height = 26 + 22, 24
+    hud = np.zeros(frame.shape[:2], np.uint8)
+    cases = [_window_case(anchors)]
+    for row, (name, code) in enumerate(orders):
+        y = orders_top + row * row_height + 4
+        synthetic.draw_text(frame, name, ocr.PLAIN_11, 4, y, (255, 255, 255))
+        x = 200
+        for letter in code:
+            glyph = ocr.PLAIN_11[letter]
+            hud[y : y + glyph.shape[0], x : x + glyph.shape[1]][glyph > 127] = 255
+            x += synthetic.draw_text(frame, letter, ocr.PLAIN_11, x, y, hud_colors[letter])[2] + 2
+        row_rect = _screen([0, orders_top + row * row_height, 248, row_height])
+        cases.append({"name": f"order_{row}_name", "bench": "extract_text", "rect": row_rect, "args": {"font": "PLAIN_11", "colors": ["OFF_WHITE"]}, "expected": name})
+    orders_rect = _screen([0, orders_top, 400, 88])
+    cases.append(
+        {
+            "name": "order_letters",
+            "bench": "isolate_colors",
+            "rect": orders_rect,
+            "args": {"colors": ["MIXOLOGY_HUD_AGA", "MIXOLOGY_HUD_MOX", "MIXOLOGY_HUD_LYE"]},
+            "expected": int(cv2.countNonZero(hud)),
+        }
+    )
+    paths.append(save_fixture(fixture_dir, f"{SYNTHETIC_PREFIX}mixology_hud", frame, SYNTHETIC_CLIENT, (0, 0), cases))
+    return paths
+
+
+# --- Recording ---
+MOUSEOVER_COLORS = ["OFF_CYAN", "OFF_GREEN", "OFF_ORANGE", "OFF_WHITE", "OFF_YELLOW"]
+
+
+def _scene_cases(win: Window, scene: str, image: str = None, text: str = None, colors: List[str] = None) -> List[dict]:
+    """
+    Builds the cases (without expected results) to record for a scene, from an initialized window's UI regions.
+    """
+
+    def case(name: str, bench: str, rect: Rectangle, **args) -> dict:
+        return {"name": name, "bench": bench, "rect": _box(rect), "subtract": list(rect.subtract_list), "args": args}
+
+    cases = [{"name": "window_initialize", "bench": "window_initialize", "rect": None, "args": {}}]
+    if scene == "inventory":
+        inventory = win.inventory_slots.bounding_rect()
+        cases.append(case("empty_slots", "search_all_img_in_rect", inventory, image="ui_templates/empty_slot.png"))
+        if image:
+            cases.append(case("find_item", "search_all_img_in_rect", inventory, image=image))
+    elif scene == "bank":
+        cases.append(case("find_bank", "search_img_in_rect", win.rectangle(), image="ui_templates/bank.png"))
+        if image:
+            cases.append(case("find_item", "search_all_img_in_rect", win.game_view, image=image))
+    elif scene == "game_view_tags":
+        colors = colors or ["CYAN", "PURPLE"]
+        cases.append(case("isolate_tags", "isolate_colors", win.game_view, colors=colors))
+        cases.append(case("tagged_objects", "extract_objects", win.game_view, colors=colors))
+    elif scene == "mouseover":
+        cases.append(case("extract_text", "extract_text", win.mouseover, font="BOLD_12", colors=colors or MOUSEOVER_COLORS))
+        if text:
+            cases.append(case("find_text", "find_text", win.mouseover, text=text, font="BOLD_12", colors=colors or MOUSEOVER_COLORS))
+    elif scene == "mixology_hud":
+        panel = win.info_panel
+        orders = Rectangle(panel.left, panel.top + 22, panel.width, 88)  # OSRSMixology.ORDERS_TOP_OFFSET/ORDERS_HEIGHT
+        cases.append(case("order_letters", "isolate_colors", orders, colors=["MIXOLOGY_HUD_AGA", "MIXOLOGY_HUD_MOX", "MIXOLOGY_HUD_LYE"]))
+        cases.append(case("order_names", "extract_text", orders, font="PLAIN_11", colors=["OFF_WHITE"]))
+    else:
+        raise ValueError(f"Unknown scene '{scene}'. Use one of: inventory, bank, game_view_tags, mouseover, mixology_hud.")
+    return cases
+
+
+def record_fixture(name: str, win: Window, scene: str, fixture_dir: Union[str, Path] = FIXTURE_DIR, **scene_args) -> Path:
+    """
+    Records a fixture from a live client: captures the client, then runs the scene's cases on the captured frame and
+    stores their results as the expected ones.
+    Args:
+        name: The fixture's name.
+        win: An initialized client window.
+        scene: What the client is showing: "inventory", "bank", "game_view_tags", "mouseover" or "mixology_hud".
+        fixture_dir: The directory holding all fixtures.
+        scene_args: image (a path relative to images/bot to search for), text (mouseover text to find) and
+                    colors (names in utilities.color).
+    Returns:
+        The fixture's directory.
+    """
+    client = win.rectangle()
+    image = np.ascontiguousarray(client.screenshot())
+    fixture = Fixture(name, image, client, (win.padding_top, win.padding_left), _scene_cases(win, scene, **scene_args))
+    with replaying(image, client), contextlib.redirect_stdout(io.StringIO()):
+        for case in fixture.cases:
+            case["expected"] = JSON.loads(JSON.dumps(_prepare(case, fixture)()))
+    return save_fixture(fixture_dir, name, image, client, fixture.padding, fixture.cases)
+
+
+def main(argv: List[str] = None) -> int:
+    parser = argparse.ArgumentParser(prog="python -m utilities.benchmark", description="Offline CV/OCR benchmarks.")
+    sub = parser.add_subparsers(dest="command", required=True)
+    run = sub.add_parser("run", help="Run the benchmarks and compare them against the baseline.")
+    run.add_argument("--fixtures", default=str(FIXTURE_DIR))
+    run.add_argument("--only", nargs="*", help="Only run these fixtures.")
+    run.add_argument("--repeat", type=int, default=10)
+    run.add_argument("--baseline", default=str(BASELINE_PATH))
+    run.add_argument("--threshold", type=float, default=REGRESSION_THRESHOLD)
+    run.add_argument("--save-baseline", action="store_true", help="Store this run as the new baseline.")
+    gen = sub.add_parser("generate", help="(Re)generate the synthetic fixtures.")
+    gen.add_argument("--fixtures", default=str(FIXTURE_DIR))
+    rec = sub.add_parser("record", help="Record a fixture from a live RuneLite client.")
+    rec.add_argument("name")
+    rec.add_argument("--scene", required=True, choices=["inventory", "bank", "game_view_tags", "mouseover", "mixology_hud"])
+    rec.add_argument("--title", default="RuneLite")
+    rec.add_argument("--image", help="An image to search for, relative to images/bot.")
+    rec.add_argument("--text", help="Mouseover text to find.")
+    rec.add_argument("--colors", nargs="*", help="Color names in utilities.color.")
+    rec.add_argument("--fixtures", default=str(FIXTURE_DIR))
+    args = parser.parse_args(argv)
+
+    if args.command == "generate":
+        for path in generate_synthetic(args.fixtures):
+            print(f"Generated {path}")
+        return 0
+    if args.command == "record":
+        from model.runelite_bot import RuneLiteWindow
+
+        win = RuneLiteWindow(args.title)
+        win.initialize(use_cache=False)
+        path = record_fixture(args.name, win, args.scene, args.fixtures, image=args.image, text=args.text, colors=args.colors)
+        print(f"Recorded {path}. Check the expected results in its fixture.json.")
+        return 0
+
+    results = run_suite(args.fixtures, args.repeat, args.only)
+    baseline = load_baseline(args.baseline)
+    print(format_report(results, baseline))
+    if args.save_baseline:
+        save_baseline(results, args.baseline)
+        print(f"Saved the baseline to {args.baseline}.")
+    problems = compare(results, baseline, args.threshold)
+    for problem in problems:
+        print(f"FAIL {problem}")
+    return 1 if problems else 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,110 @@
+"""
+Detection of the red "X" sprite the game draws when a click performs an action (a yellow X is drawn when it
+does not).
+
+Each check captures one small region around the cursor. A cheap color-ratio test rules out most misses (E.g.,
+yellow clicks) without any template matching. Only when enough red pixels are present are the click sprites
+matched, using masks that are decoded once at import time instead of being re-read from disk on every click.
+Checks run on a worker thread so that the caller does not have to wait for them.
+"""
+from concurrent.futures import Future, ThreadPoolExecutor
+from typing import List, Tuple
+
+import cv2
+import mss
+import numpy as np
+
+import utilities.color as clr
+import utilities.imagesearch as imsearch
+from utilities.geometry import Rectangle
+
+# The click sprites are pure red with a black outline
+CLICK_RED = clr.Color([200, 0, 0], [255, 60, 60])
+
+
+def __load_sprites() -> List[Tuple[cv2.Mat, cv2.Mat, int]]:
+    """
+    Loads the red click sprites into (base, mask, red pixel count) tuples ready for template matching.
+    """
+    sprites = []
+    for name in ["red_1.png", "red_3.png", "red_2.png", "red_4.png"]:
+        template = cv2.imread(str(imsearch.BOT_IMAGES.joinpath("mouse_clicks", name)), cv2.IMREAD_UNCHANGED)
+        base = np.ascontiguousarray(template[:, :, 0:3])
+        alpha = template[:, :, 3]
+        red_pixels = int(np.count_nonzero(cv2.inRange(base, CLICK_RED.lower, CLICK_RED.upper)[alpha > 0]))
+        sprites.append((base, cv2.merge([alpha, alpha, alpha]), red_pixels))
+    return sprites
+
+
+RED_CLICK_SPRITES = __load_sprites()
+
+
+class ClickFeedbackDetector:
+    def __init__(self, confidence: float = 0.2, min_red_fraction: float = 0.5):
+        """
+        Detects whether a click was red (i.e., a successful action).
+        Args:
+            confidence: Template matching confidence (see imagesearch.search_img_in_rect()).
+            min_red_fraction: The fraction of the smallest sprite's red pixels that must be present in the capture
+                              before template matching is attempted.
+        """
+        self.confidence = confidence
+        self.min_red_pixels = min(red for _, _, red in RED_CLICK_SPRITES) * min_red_fraction
+        self._worker = ThreadPoolExecutor(max_workers=1, thread_name_prefix="ClickFeedback")
+
+    def is_red_click(self, image: cv2.Mat) -> bool:
+        """
+        Checks a BGR capture of the area around the cursor for a red click sprite.
+        Args:
+            image: The captured image.
+        Returns:
+            True if a red click sprite was found, False otherwise.
+        """
+        if np.count_nonzero(cv2.inRange(image, CLICK_RED.lower, CLICK_RED.upper)) < self.min_red_pixels:
+            return False
+        for base, mask, _ in RED_CLICK_SPRITES:
+            if image.shape[0] < base.shape[0] or image.shape[1] < base.shape[1]:
+                continue
+            correlation = cv2.matchTemplate(image, base, cv2.TM_SQDIFF_NORMED, mask=mask)
+            min_val, _, _, _ = cv2.minMaxLoc(correlation)
+            if min_val < self.confidence:
+                return True
+        return False
+
+    def detect(self, rect: Rectangle) -> bool:
+        """
+        Captures a Rectangle around the cursor and checks it for a red click sprite.
+        Args:
+            rect: The area around the cursor.
+        Returns:
+            True if the click was red, False otherwise (including when the capture fails).
+        """
+        try:
+            image = rect.screenshot()
+        except mss.ScreenShotError:
+            print("Failed to take screenshot of mouse cursor. Please report this error to the developer.")
+            return False
+        return self.is_red_click(image)
+
+    def check(self, rect: Rectangle) -> Future:
+        """
+        Checks a Rectangle around the cursor for a red click sprite on the worker thread.
+        Args:
+            rect: The area around the cursor.
+        Returns:
+            A Future resolving to True if the click was red, False otherwise.
+        """
+        return self._worker.submit(self.detect, rect)
+
+
+__default_detector: ClickFeedbackDetector = None
+
+
+def default_detector() -> ClickFeedbackDetector:
+    """
+    Returns the process-wide ClickFeedbackDetector.
+    """
+    global __default_detector
+    if __default_detector is None:
+        __default_detector = ClickFeedbackDetector()
+    return __default_detector
@@ -3,6 +3,8 @@ from typing import List, Union
 import cv2
 import numpy as np
 
+import utilities.tracing as tracing
+
 
 class Color:
     def __init__(self, lower: List[int], upper: List[int] = None):
@@ -16,6 +18,7 @@ class Color:
         self.upper = np.array(upper[::-1]) if upper else np.array(lower[::-1])
 
 
+@tracing.traced("isolate_colors")
 def isolate_colors(image: cv2.Mat, colors: Union[Color, List[Color]]) -> cv2.Mat:
     """
     Isolates ranges of colors within an image and saves a new resulting image.
@@ -0,0 +1,255 @@
+"""
+Background pre-generation of human-like mouse curves.
+
+Building a HumanCurve involves Bezier/knot math and random sampling, which used to happen on the bot thread
+right before every mouse movement. The CurvePool moves that work onto a worker thread. Curves are generated
+ahead of time as unit-space templates (start at (0, 0), end at (1, 0)). At move time, a template is only
+scaled and rotated onto the real start and end points, which is a single small matrix operation.
+
+Templates are bucketed by travel distance so that distance-dependent parameters (E.g., offset boundaries and
+distortion, which are expressed in pixels) stay close to what a freshly generated curve would produce.
+"""
+import threading
+from collections import deque
+from typing import Callable, Dict, List, NamedTuple, Tuple, Union
+
+import numpy as np
+import pytweening
+from pyclick import HumanCurve
+
+import utilities.metrics as metrics
+from utilities.random_util import Sampler, truncated_normal_sample
+
+# Ranges of curve points (HumanCurve targetPoints) for each mouse speed
+MOUSE_SPEEDS = {
+    "slowest": (85, 100),
+    "slow": (65, 80),
+    "medium": (45, 60),
+    "fast": (20, 40),
+    "fastest": (10, 15),
+}
+
+# Upper bound (in pixels) of each distance band. Templates are generated at the middle of their band.
+DISTANCE_BANDS = (60, 150, 300, 600, 1200, 2400)
+
+
+def sample_target_points(speed: str, sampler: Sampler = None) -> int:
+    """
+    Converts a text speed to a numeric speed for HumanCurve (targetPoints).
+    Args:
+        speed: One of 'slowest', 'slow', 'medium', 'fast', 'fastest'.
+        sampler: The Sampler to draw from (default: the calling thread's, see random_util.bind()).
+    Returns:
+        The number of points the curve should contain.
+    """
+    if speed not in MOUSE_SPEEDS:
+        raise ValueError("Invalid mouse speed. Try 'slowest', 'slow', 'medium', 'fast', or 'fastest'.")
+    lower, upper = MOUSE_SPEEDS[speed]
+    return round(sampler.truncated_normal(lower, upper) if sampler else truncated_normal_sample(lower, upper))
+
+
+class CurveKey(NamedTuple):
+    """
+    The set of parameters that identify interchangeable curve templates.
+    """
+
+    band: int
+    speed: str
+    knots: int
+    tween: Callable
+    offset_x: int
+    offset_y: int
+    distortion_mean: float
+    distortion_stdev: float
+    distortion_frequency: float
+
+
+def distance_band(distance: float) -> int:
+    """
+    Returns the index of the distance band a travel distance falls into.
+    """
+    for i, upper in enumerate(DISTANCE_BANDS):
+        if distance <= upper:
+            return i
+    return len(DISTANCE_BANDS) - 1
+
+
+def band_reference_distance(band: int) -> int:
+    """
+    Returns the distance (in pixels) that templates for a band are generated at.
+    """
+    lower = DISTANCE_BANDS[band - 1] if band > 0 else 0
+    return (lower + DISTANCE_BANDS[band]) // 2
+
+
+def generate_template(key: CurveKey, sampler: Sampler = None) -> np.ndarray:
+    """
+    Generates a single unit-space curve template.
+    Args:
+        key: The parameters of the curve.
+        sampler: The Sampler to draw the number of points from (see sample_target_points()).
+    Returns:
+        An (n, 2) array of points where the curve starts at (0, 0) and ends at (1, 0).
+    """
+    ref = band_reference_distance(key.band)
+    points = HumanCurve(
+        (0, 0),
+        (ref, 0),
+        offsetBoundaryX=key.offset_x,
+        offsetBoundaryY=key.offset_y,
+        knotsCount=key.knots,
+        distortionMean=key.distortion_mean,
+        distortionStdev=key.distortion_stdev,
+        distortionFrequency=key.distortion_frequency,
+        tween=key.tween,
+        targetPoints=sample_target_points(key.speed, sampler),
+    ).points
+    return np.array(points, dtype=float) / ref
+
+
+def fit_template(template: np.ndarray, start: Tuple[float, float], end: Tuple[float, float]) -> List[Tuple[float, float]]:
+    """
+    Scales and rotates a unit-space template so that it travels from `start` to `end`.
+    Args:
+        template: An (n, 2) unit-space template (see generate_template).
+        start: The x, y point the curve begins at.
+        end: The x, y point the curve ends at.
+    Returns:
+        A list of (x, y) points.
+    """
+    dx, dy = end[0] - start[0], end[1] - start[1]
+    # Multiplying by [[dx, dy], [-dy, dx]] scales by the distance and rotates by the angle in one step
+    transform = np.array([[dx, dy], [-dy, dx]])
+    points = template @ transform + np.array(start, dtype=float)
+    points[-1] = end  # guarantee the cursor lands exactly on the destination
+    return [tuple(p) for p in points.tolist()]
+
+
+class CurvePool:
+    def __init__(self, size: int = 6, max_keys: int = 64, sampler: Sampler = None, background: bool = True):
+        """
+        Keeps a stock of pre-generated curve templates for each set of curve parameters that has been requested.
+        A daemon worker thread tops up the stock in the background.
+        Args:
+            size: The number of templates to keep ready for each set of parameters.
+            max_keys: The maximum number of parameter sets to keep stocked. The least recently used sets
+                      are dropped once this is exceeded.
+            sampler: The Sampler to draw from (default: the default Sampler on the worker thread, and the calling
+                     thread's Sampler otherwise).
+            background: Whether to pre-generate curves on the worker thread. If False, each curve is generated on
+                        the calling thread when it is requested, so that a seeded pool repeats its curves exactly
+                        (HumanCurve also draws from the global `random` and `numpy.random` state).
+        """
+        self.size = size
+        self.max_keys = max_keys
+        self.sampler = sampler
+        self.background = background
+        self._stock: Dict[CurveKey, deque] = {}
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def curve(
+        self,
+        start: Tuple[float, float],
+        end: Tuple[float, float],
+        speed: str = "fast",
+        knots: int = 0,
+        tween: Callable = pytweening.easeOutQuad,
+        offset_x: int = 100,
+        offset_y: int = 100,
+        distortion_mean: float = 1,
+        distortion_stdev: float = 1,
+        distortion_frequency: float = 0.5,
+    ) -> List[Tuple[float, float]]:
+        """
+        Returns a human-like curve between two points, using a pre-generated template when one is available.
+        Args:
+            start: The x, y point the curve begins at.
+            end: The x, y point the curve ends at.
+            speed: The mouse speed ('slowest', 'slow', 'medium', 'fast', 'fastest').
+            knots: The number of knots in the curve.
+            tween: The tweening function.
+            offset_x, offset_y: HumanCurve offset boundaries (pixels).
+            distortion_mean, distortion_stdev, distortion_frequency: HumanCurve distortion parameters.
+        Returns:
+            A list of (x, y) points ending at `end`.
+        """
+        if speed not in MOUSE_SPEEDS:
+            raise ValueError("Invalid mouse speed. Try 'slowest', 'slow', 'medium', 'fast', or 'fastest'.")
+        distance = np.hypot(end[0] - start[0], end[1] - start[1])
+        if distance < 1:
+            return [tuple(end)]
+        key = CurveKey(distance_band(distance), speed, knots, tween, offset_x, offset_y, distortion_mean, distortion_stdev, distortion_frequency)
+        template = self.__take(key) if self.background else None
+        if self.background:
+            metrics.cache_result("curve_pool", template is not None)
+        if template is None:
+            template = generate_template(key, self.sampler)
+        return fit_template(template, start, end)
+
+    def __take(self, key: CurveKey) -> np.ndarray:
+        """
+        Pops a template for the key, registering the key for background generation if it is new.
+        """
+        with self._cond:
+            stock = self._stock.pop(key, None)
+            if stock is None:
+                stock = deque()
+                if len(self._stock) >= self.max_keys:
+                    del self._stock[next(iter(self._stock))]
+            self._stock[key] = stock  # re-insert to mark as most recently used
+            template = stock.popleft() if stock else None
+            self.__ensure_worker()
+            self._cond.notify()
+        return template
+
+    def __ensure_worker(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self.__work, name="CurvePool", daemon=True)
+            self._thread.start()
+
+    def __next_key(self) -> CurveKey:
+        """
+        Returns the key with the emptiest stock, or None if all are full. Must be called with the lock held.
+        """
+        key, stock = min(self._stock.items(), key=lambda item: len(item[1]), default=(None, None))
+        if stock is None or len(stock) >= self.size:
+            return None
+        return key
+
+    def __work(self) -> None:
+        while True:
+            with self._cond:
+                while (key := self.__next_key()) is None:
+                    self._cond.wait()
+            template = generate_template(key, self.sampler)
+            with self._cond:
+                if key in self._stock:
+                    self._stock[key].append(template)
+
+
+__default_pool: CurvePool = None
+
+
+def default_pool() -> CurvePool:
+    """
+    Returns the process-wide CurvePool shared by all Mouse objects.
+    """
+    global __default_pool
+    if __default_pool is None:
+        __default_pool = CurvePool()
+    return __default_pool
+
+
+def set_default_pool(pool: Union[CurvePool, None]) -> Union[CurvePool, None]:
+    """
+    Replaces the process-wide CurvePool used by Mouse objects created from now on (E.g., with a seeded pool for a
+    repeatable simulation).
+    Args:
+        pool: The new default CurvePool, or None to create a fresh one on next use.
+    Returns:
+        The previous default CurvePool (None if it was never created), so that it can be restored.
+    """
+    global __default_pool
+    previous, __default_pool = __default_pool, pool
+    return previous
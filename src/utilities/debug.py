@@ -13,7 +13,7 @@ def current_time():
     Returns:
         The current time.
     """
-    return time.strftime("%H:%M:%S", time.localtime())
+    return time.strftime("%H:%M:%S", time.localtime(time.time()))  # time.time(), so a simulation's VirtualClock applies
 
 
 def get_test_window():
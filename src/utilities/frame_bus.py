@@ -0,0 +1,349 @@
+"""
+Shares screen captures between processes through shared memory.
+
+A CaptureDaemon grabs the desktop region covering all registered clients once per frame and writes each client's
+part into its own FrameRing: a ring buffer of frames in `multiprocessing.shared_memory`, each stamped with a
+sequence number. Bot processes attach to the rings and install a FrameBusSource (see geometry.set_frame_source()),
+after which `Rectangle.screenshot()` copies its region out of the latest shared frame instead of grabbing the screen.
+This lets each bot's perception run in its own process (on its own core) while the desktop is grabbed only once.
+
+Frames read from a FrameRing are read-only views into shared memory. A ring holds `slots` frames, so a view remains
+valid for at least `slots - 1` frames after it was read (use FrameRing.valid() to check). FrameBusSource.grab() copies
+the requested region for that reason; FrameBusSource.locate() gives zero-copy access to callers that check valid().
+
+Example:
+    >>> # Capture process
+    >>> daemon = CaptureDaemon({"alice": RuneLiteWindow("RuneLite - alice").rectangle()}, fps=30)
+    >>> daemon.start()
+    >>> # Bot process
+    >>> geometry.set_frame_source(FrameBusSource.attach(["alice"]))
+    >>> self.win.game_view.screenshot()  # copied from the latest shared frame
+"""
+import threading
+import time
+from multiprocessing import resource_tracker, shared_memory
+from typing import Dict, Iterable, List, NamedTuple, Tuple, Union
+
+import numpy as np
+
+from utilities.geometry import Rectangle, screen_grabber
+
+RING_PREFIX = "osbc-frames-"
+MAGIC = 0x4F534243  # "OSBC"
+HEADER_FIELDS = 8  # magic, slots, height, width, channels, latest seq, (reserved x2)
+META_FIELDS = 4  # per slot: seq, timestamp (ns), left, top
+ALIGN = 64
+
+# Rings created by this process. The resource tracker must keep tracking these, even if they are also attached to.
+__created = set()
+
+
+def _created_here(name: str) -> bool:
+    return name in __created
+
+
+def _mark_created(name: str) -> None:
+    __created.add(name)
+
+
+class Frame(NamedTuple):
+    seq: int
+    timestamp: float
+    left: int
+    top: int
+    image: np.ndarray  # (height, width, channels) BGR view into shared memory
+
+    def contains(self, monitor: dict) -> bool:
+        """
+        Checks if a screen region ({left, top, width, height}) lies entirely within the frame.
+        """
+        height, width = self.image.shape[:2]
+        return (
+            monitor["left"] >= self.left
+            and monitor["top"] >= self.top
+            and monitor["left"] + monitor["width"] <= self.left + width
+            and monitor["top"] + monitor["height"] <= self.top + height
+        )
+
+    def crop(self, monitor: dict) -> np.ndarray:
+        """
+        Returns a view of a screen region ({left, top, width, height}) within the frame.
+        """
+        x, y = monitor["left"] - self.left, monitor["top"] - self.top
+        return self.image[y : y + monitor["height"], x : x + monitor["width"]]
+
+
+class FrameRing:
+    def __init__(self, shm: shared_memory.SharedMemory, owner: bool):
+        """
+        Use FrameRing.create() (capture side) or FrameRing.attach() (bot side) instead.
+        """
+        self.name = shm.name[len(RING_PREFIX) :] if shm.name.startswith(RING_PREFIX) else shm.name
+        self.shm = shm
+        self.owner = owner
+        self.header = np.ndarray((HEADER_FIELDS,), np.int64, buffer=shm.buf)
+        if self.header[0] != MAGIC:
+            raise ValueError(f"Shared memory segment '{shm.name}' is not a frame ring.")
+        self.slots, height, width, channels = (int(v) for v in self.header[1:5])
+        self.shape = (height, width, channels)
+        self.meta = np.ndarray((self.slots, META_FIELDS), np.int64, buffer=shm.buf, offset=HEADER_FIELDS * 8)
+        offset = FrameRing.__data_offset(self.slots)
+        self.frames = np.ndarray((self.slots, height, width, channels), np.uint8, buffer=shm.buf, offset=offset)
+
+    @staticmethod
+    def __data_offset(slots: int) -> int:
+        offset = (HEADER_FIELDS + slots * META_FIELDS) * 8
+        return (offset + ALIGN - 1) // ALIGN * ALIGN
+
+    @classmethod
+    def create(cls, name: str, width: int, height: int, channels: int = 3, slots: int = 4) -> "FrameRing":
+        """
+        Creates a ring in a new shared memory segment. The creating process owns (and should unlink) it.
+        Args:
+            name: The ring's name. The segment is named RING_PREFIX + name.
+            width: The width of each frame.
+            height: The height of each frame.
+            channels: The number of color channels of each frame.
+            slots: The number of frames in the ring.
+        """
+        size = FrameRing.__data_offset(slots) + slots * height * width * channels
+        try:
+            shm = shared_memory.SharedMemory(name=RING_PREFIX + name, create=True, size=size)
+        except FileExistsError:
+            # Left behind by a capture process that did not shut down cleanly
+            stale = shared_memory.SharedMemory(name=RING_PREFIX + name)
+            stale.close()
+            stale.unlink()
+            shm = shared_memory.SharedMemory(name=RING_PREFIX + name, create=True, size=size)
+        _mark_created(name)
+        header = np.ndarray((HEADER_FIELDS,), np.int64, buffer=shm.buf)
+        header[:] = (MAGIC, slots, height, width, channels, -1, 0, 0)
+        np.ndarray((slots, META_FIELDS), np.int64, buffer=shm.buf, offset=HEADER_FIELDS * 8)[:] = -1
+        return cls(shm, owner=True)
+
+    @classmethod
+    def attach(cls, name: str) -> "FrameRing":
+        """
+        Maps an existing ring created by another process.
+        """
+        try:
+            shm = shared_memory.SharedMemory(name=RING_PREFIX + name, track=False)
+        except TypeError:  # Python < 3.13 always tracks the segment, which would unlink it when this process exits
+            shm = shared_memory.SharedMemory(name=RING_PREFIX + name)
+            if not _created_here(name):
+                resource_tracker.unregister(shm._name, "shared_memory")
+        return cls(shm, owner=False)
+
+    @property
+    def latest_seq(self) -> int:
+        """
+        The sequence number of the newest complete frame, or -1 if none has been written.
+        """
+        return int(self.header[5])
+
+    def write(self, image: np.ndarray, left: int = 0, top: int = 0, timestamp: float = None) -> int:
+        """
+        Writes a frame into the next slot.
+        Args:
+            image: The frame. Must have the ring's shape (extra channels, such as mss' alpha, are dropped).
+            left: The screen x coordinate of the frame's top-left corner.
+            top: The screen y coordinate of the frame's top-left corner.
+            timestamp: The capture time (time.time()). Defaults to now.
+        Returns:
+            The frame's sequence number.
+        """
+        seq = self.latest_seq + 1
+        slot = seq % self.slots
+        self.meta[slot, 0] = -1  # readers treat the slot as invalid while it is being written
+        self.frames[slot] = image[:, :, : self.shape[2]]
+        self.meta[slot, 1:] = (int((time.time() if timestamp is None else timestamp) * 1e9), left, top)
+        self.meta[slot, 0] = seq
+        self.header[5] = seq
+        return seq
+
+    def get(self, seq: int) -> Union[Frame, None]:
+        """
+        Returns the frame with a given sequence number (a view, not a copy), or None if it has been overwritten.
+        """
+        slot = seq % self.slots
+        meta = self.meta[slot].copy()
+        if meta[0] != seq:
+            return None
+        image = self.frames[slot]
+        image.flags.writeable = False
+        return Frame(seq, meta[1] / 1e9, int(meta[2]), int(meta[3]), image)
+
+    def latest(self) -> Union[Frame, None]:
+        """
+        Returns the newest complete frame (a view, not a copy), or None if none has been written.
+        """
+        seq = self.latest_seq
+        return self.get(seq) if seq >= 0 else None
+
+    def valid(self, frame: Frame) -> bool:
+        """
+        Checks that a frame's slot has not been overwritten since it was read.
+        """
+        return int(self.meta[frame.seq % self.slots, 0]) == frame.seq
+
+    def wait_newer(self, seq: int, timeout: float = None, poll: float = 0.002) -> Union[Frame, None]:
+        """
+        Blocks until a frame newer than `seq` is available.
+        Returns:
+            The newest frame, or None if the timeout expired.
+        """
+        stop_time = None if timeout is None else time.time() + timeout
+        while self.latest_seq <= seq:
+            if stop_time is not None and time.time() > stop_time:
+                return None
+            time.sleep(poll)
+        return self.latest()
+
+    def close(self) -> None:
+        """
+        Unmaps the ring. The owner also destroys the shared memory segment.
+        """
+        self.header = self.meta = self.frames = None
+        self.shm.close()
+        if self.owner:
+            self.shm.unlink()
+
+
+class FrameBusSource:
+    def __init__(self, rings: List[FrameRing], max_age: float = 0.5, retries: int = 3):
+        """
+        A frame source for geometry.set_frame_source() that serves screenshots from shared frames.
+        Args:
+            rings: The rings to serve from. The first ring whose latest frame covers a requested region is used.
+            max_age: Frames older than this many seconds are ignored, in which case Rectangle.screenshot() grabs
+                     the screen directly (E.g., when the capture daemon has stopped).
+            retries: The number of times grab() copies a region from a newer frame if the slot it was copying from
+                     was overwritten during the copy, before giving up.
+        """
+        self.rings = rings
+        self.max_age = max_age
+        self.retries = retries
+
+    @classmethod
+    def attach(cls, names: Iterable[str], max_age: float = 0.5) -> "FrameBusSource":
+        """
+        Attaches to rings created by a CaptureDaemon (in this or another process).
+        """
+        return cls([FrameRing.attach(name) for name in names], max_age)
+
+    def locate(self, monitor: dict) -> Union[Tuple[FrameRing, Frame], None]:
+        """
+        Finds the ring whose latest frame covers a screen region ({left, top, width, height}). This is the zero-copy
+        way to read shared frames: `frame.crop(monitor)` is a view that is overwritten once the ring wraps around,
+        so check `ring.valid(frame)` after using it.
+        Returns:
+            A (ring, frame) tuple, or None if no fresh frame covers the region.
+        """
+        now = time.time()
+        for ring in self.rings:
+            frame = ring.latest()
+            if frame is not None and now - frame.timestamp <= self.max_age and frame.contains(monitor):
+                return ring, frame
+        return None
+
+    def grab(self, monitor: dict) -> Union[np.ndarray, None]:
+        """
+        Returns a copy of a screen region ({left, top, width, height}) from the latest shared frame, or None if no
+        fresh frame covers it or the frames kept being overwritten while they were copied.
+        """
+        for _ in range(self.retries):
+            found = self.locate(monitor)
+            if found is None:
+                return None
+            ring, frame = found
+            # Copy just the region, then make sure the slot was not overwritten during the copy
+            image = frame.crop(monitor).copy()
+            if ring.valid(frame):
+                return image
+        return None
+
+    def close(self) -> None:
+        for ring in self.rings:
+            ring.close()
+
+
+class ReplaySource:
+    def __init__(self, image: np.ndarray, left: int = 0, top: int = 0):
+        """
+        A frame source for geometry.set_frame_source() that serves a single, fixed image (E.g., a recorded client
+        frame being replayed) as if it were on screen at a given position.
+        Args:
+            image: The BGR image.
+            left: The screen x coordinate of the image's top-left corner.
+            top: The screen y coordinate of the image's top-left corner.
+        """
+        self.image = image
+        self.left = left
+        self.top = top
+
+    def grab(self, monitor: dict) -> Union[np.ndarray, None]:
+        """
+        Returns a view of a screen region ({left, top, width, height}) of the image, or None if the region is not
+        entirely within it.
+        """
+        x, y = monitor["left"] - self.left, monitor["top"] - self.top
+        height, width = self.image.shape[:2]
+        if x < 0 or y < 0 or x + monitor["width"] > width or y + monitor["height"] > height:
+            return None
+        return self.image[y : y + monitor["height"], x : x + monitor["width"]]
+
+
+class CaptureDaemon:
+    def __init__(self, clients: Dict[str, Rectangle], fps: float = 30, slots: int = 4):
+        """
+        Captures the screen regions of several clients into one FrameRing each.
+        Args:
+            clients: The screen region of each client (E.g., from Window.rectangle()), by ring name.
+            fps: The number of frames to capture per second.
+            slots: The number of frames each ring holds.
+        """
+        self.clients = clients
+        self.interval = 1 / fps
+        self.rings: Dict[str, FrameRing] = {name: FrameRing.create(name, rect.width, rect.height, slots=slots) for name, rect in clients.items()}
+        self.frames = 0
+        self._stop = threading.Event()
+        self._thread: threading.Thread = None
+
+    def capture(self) -> None:
+        """
+        Grabs the region covering all clients once and writes each client's part into its ring.
+        """
+        rects = list(self.clients.values())
+        left, top = min(r.left for r in rects), min(r.top for r in rects)
+        right, bottom = max(r.left + r.width for r in rects), max(r.top + r.height for r in rects)
+        timestamp = time.time()
+        desktop = np.asarray(screen_grabber().grab({"left": left, "top": top, "width": right - left, "height": bottom - top}))
+        for name, rect in self.clients.items():
+            x, y = rect.left - left, rect.top - top
+            self.rings[name].write(desktop[y : y + rect.height, x : x + rect.width], rect.left, rect.top, timestamp)
+        self.frames += 1
+
+    def start(self) -> None:
+        """
+        Starts capturing on a daemon thread. Run this in a dedicated process to keep capture off the bots' cores.
+        """
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.__run, name="CaptureDaemon", daemon=True)
+        self._thread.start()
+
+    def __run(self) -> None:
+        next_frame = time.time()
+        while not self._stop.is_set():
+            self.capture()
+            next_frame += self.interval
+            self._stop.wait(max(0, next_frame - time.time()))
+
+    def stop(self) -> None:
+        """
+        Stops capturing and destroys the rings.
+        """
+        self._stop.set()
+        if self._thread is not None:
+            self._thread.join()
+        for ring in self.rings.values():
+            ring.close()
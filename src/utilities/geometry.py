@@ -1,16 +1,50 @@
 import math
-from typing import List, NamedTuple
+import threading
+from typing import Iterator, List, NamedTuple, Union
 
 import cv2
 import mss
 import numpy as np
 
+import utilities.metrics as metrics
 import utilities.random_util as rd
+import utilities.tracing as tracing
 
 Point = NamedTuple("Point", x=int, y=int)
 
-# TODO: Remove this global variable. This is a temporary fix for a bug in mss.
-sct = mss.mss()
+# mss instances cannot be shared between threads (and creating one per screenshot leaks handles), so each
+# thread gets its own. Bots driving different clients from one process each capture on their own thread.
+__capture = threading.local()
+
+
+def screen_grabber() -> "mss.base.MSSBase":
+    """
+    Returns the calling thread's mss instance, creating it on first use.
+    """
+    sct = getattr(__capture, "sct", None)
+    if sct is None:
+        sct = __capture.sct = mss.mss()
+    return sct
+
+
+# An object with a `grab(monitor: dict) -> np.ndarray | None` method that Rectangle.screenshot() tries before
+# grabbing the screen itself (E.g., a FrameBusSource serving frames captured by another process).
+__frame_source = None
+
+
+def set_frame_source(source) -> None:
+    """
+    Sets (or, with None, removes) the process-wide frame source used by Rectangle.screenshot().
+    """
+    global __frame_source
+    __frame_source = source
+
+
+def frame_source():
+    """
+    Returns the process-wide frame source, or None.
+    """
+    return __frame_source
 
 
 class Rectangle:
@@ -68,16 +102,28 @@ class Rectangle:
             end_point.y - start_point.y,
         )
 
+    @tracing.traced("capture")
+    @metrics.timed(metrics.CAPTURE_SECONDS, metrics.FRAMES)
     def screenshot(self) -> cv2.Mat:
         """
         Screenshots the Rectangle.
         Returns:
-            A BGR Numpy array representing the captured image.
+            A BGR Numpy array representing the captured image. If a frame source is set (see set_frame_source()) and
+            covers the Rectangle, this is the image the source returned, which may be a view shared with other
+            callers (E.g., of a ReplaySource's image), so do not modify it.
         """
-        # with mss.mss() as sct:  # TODO: When MSS bug is fixed, reinstate this.
-        global sct  # TODO: When MSS bug is fixed, remove this.
         monitor = self.to_dict()
-        res = np.array(sct.grab(monitor))[:, :, :3]
+        source = frame_source()
+        res = None if source is None else source.grab(monitor)
+        if source is not None:
+            metrics.cache_result("frame_source", res is not None)
+        if res is not None:
+            # Frames from a source may be shared views; only copy them when areas must be blanked out
+            if not self.subtract_list:
+                return res
+            res = res.copy()
+        else:
+            res = np.array(screen_grabber().grab(monitor))[:, :, :3]
         if self.subtract_list:
             for area in self.subtract_list:
                 res[
@@ -124,6 +170,16 @@ class Rectangle:
         rect_center: Point = self.reference_rect.get_center()
         return math.dist([center.x, center.y], [rect_center.x, rect_center.y])
 
+    def contains(self, point: Point) -> bool:
+        """
+        Checks if a point lies within the rectangle.
+        Args:
+            point: The x, y point to check.
+        Returns:
+            True if the point is inside the rectangle (edges inclusive), False otherwise.
+        """
+        return self.left <= point[0] <= self.left + self.width and self.top <= point[1] <= self.top + self.height
+
     def get_top_left(self) -> Point:
         """
         Gets the top left point of the rectangle.
@@ -187,7 +243,6 @@ class Rectangle:
         screenshot_height = self.height + (2 * padding)
         
         # Take screenshot of the padded area
-        global sct
         monitor = {
             "left": screenshot_left,
             "top": screenshot_top,
@@ -195,7 +250,7 @@ class Rectangle:
             "height": screenshot_height,
         }
         # Convert to contiguous array for OpenCV compatibility
-        image = np.ascontiguousarray(np.array(sct.grab(monitor))[:, :, :3])
+        image = np.ascontiguousarray(np.array(screen_grabber().grab(monitor))[:, :, :3])
         
         # Calculate rectangle coordinates relative to the screenshot
         rect_x = self.left - screenshot_left
@@ -225,6 +280,140 @@ class Rectangle:
         cv2.destroyAllWindows()
 
 
+class SlotGrid:
+    def __init__(self, left: int, top: int, width: int, height: int, cols: int, rows: int, gap_x: int = 0, gap_y: int = 0, count: int = None):
+        """
+        A uniform grid of equally sized cells (E.g., inventory slots, bank slots, prayers, spells). All cells are
+        stored in one numpy array of (left, top, width, height), so the grid can be screenshotted, cropped and
+        hit-tested in one go. It behaves like the list of Rectangles it replaces (indexing, iteration, len()).
+        Args:
+            left: The leftmost x coordinate of the first cell.
+            top: The topmost y coordinate of the first cell.
+            width: The width of each cell.
+            height: The height of each cell.
+            cols: The number of cells per row.
+            rows: The number of rows.
+            gap_x: The horizontal gap between cells.
+            gap_y: The vertical gap between rows.
+            count: The number of cells, if the last row is not full (cells are numbered row by row).
+        """
+        self.left = left
+        self.top = top
+        self.width = width
+        self.height = height
+        self.cols = cols
+        self.rows = rows
+        self.step_x = width + gap_x
+        self.step_y = height + gap_y
+        self.count = cols * rows if count is None else count
+        i = np.arange(self.count)
+        self.cells = np.column_stack(
+            (
+                left + (i % cols if cols else i) * self.step_x,
+                top + (i // cols if cols else i) * self.step_y,
+                np.full(self.count, width),
+                np.full(self.count, height),
+            )
+        ).astype(np.int32)
+        self._rects: List[Rectangle] = None
+
+    def __len__(self) -> int:
+        return self.count
+
+    def __getitem__(self, index: Union[int, slice]) -> Union[Rectangle, List[Rectangle]]:
+        return self.rectangles()[index]
+
+    def __iter__(self) -> Iterator[Rectangle]:
+        return iter(self.rectangles())
+
+    def __repr__(self) -> str:
+        return f"SlotGrid(x={self.left}, y={self.top}, w={self.width}, h={self.height}, {self.cols}x{self.rows}, count={self.count})"
+
+    def rectangles(self) -> List[Rectangle]:
+        """
+        Returns a Rectangle for each cell. The same Rectangle objects are returned on every call.
+        """
+        if self._rects is None:
+            self._rects = [Rectangle(int(x), int(y), int(w), int(h)) for x, y, w, h in self.cells]
+        return self._rects
+
+    def bounding_rect(self) -> Rectangle:
+        """
+        Returns a Rectangle covering every cell of the grid (including the unused cells of a partial last row).
+        """
+        return Rectangle(self.left, self.top, (self.cols - 1) * self.step_x + self.width, (self.rows - 1) * self.step_y + self.height)
+
+    def translated(self, dx: int, dy: int) -> "SlotGrid":
+        """
+        Returns a copy of the grid moved by an offset.
+        """
+        return SlotGrid(self.left + dx, self.top + dy, self.width, self.height, self.cols, self.rows, self.step_x - self.width, self.step_y - self.height, self.count)
+
+    def translate(self, dx: int, dy: int) -> None:
+        """
+        Moves the grid (and its Rectangles, in place) by an offset.
+        """
+        self.left += dx
+        self.top += dy
+        self.cells[:, 0] += dx
+        self.cells[:, 1] += dy
+        for rect in self._rects or []:
+            rect.left += dx
+            rect.top += dy
+
+    def crop_all(self, frame: np.ndarray, origin: Point = None) -> np.ndarray:
+        """
+        Crops every cell out of an image without copying it.
+        Args:
+            frame: An image containing the whole grid (E.g., a screenshot of the control panel).
+            origin: The screen position of the image's top-left corner. Defaults to the grid's own top-left corner
+                    (I.e., a screenshot of bounding_rect()).
+        Returns:
+            A read-only view of shape (rows, cols, height, width, *channels), where [r, c] is the cell in row r and
+            column c. Cell i is at [i // cols, i % cols].
+        Raises:
+            ValueError: If the grid does not fit in the image.
+        """
+        ox, oy = (0, 0) if origin is None else (self.left - origin[0], self.top - origin[1])
+        bounds = self.bounding_rect()
+        if ox < 0 or oy < 0 or oy + bounds.height > frame.shape[0] or ox + bounds.width > frame.shape[1]:
+            raise ValueError(f"{self} does not fit in an image of shape {frame.shape} at offset ({ox}, {oy}).")
+        base = frame[oy:, ox:]
+        s_y, s_x = base.strides[:2]
+        return np.lib.stride_tricks.as_strided(
+            base,
+            shape=(self.rows, self.cols, self.height, self.width) + base.shape[2:],
+            strides=(self.step_y * s_y, self.step_x * s_x, s_y, s_x) + base.strides[2:],
+            writeable=False,
+        )
+
+    def crops(self, frame: np.ndarray, origin: Point = None) -> List[np.ndarray]:
+        """
+        Like crop_all(), but returns a list with one view per cell, in cell order.
+        """
+        stack = self.crop_all(frame, origin)
+        return [stack[i // self.cols, i % self.cols] for i in range(self.count)]
+
+    def screenshot(self) -> List[np.ndarray]:
+        """
+        Screenshots the whole grid with a single capture and returns one BGR image (view) per cell, in cell order.
+        """
+        return self.crops(self.bounding_rect().screenshot())
+
+    def hit_test(self, point: Point) -> int:
+        """
+        Finds the cell containing a point (edges inclusive).
+        Returns:
+            The index of the cell, or -1 if the point is not in any cell.
+        """
+        col, dx = divmod(point[0] - self.left, self.step_x)
+        row, dy = divmod(point[1] - self.top, self.step_y)
+        if 0 <= col < self.cols and 0 <= row < self.rows and dx <= self.width and dy <= self.height:
+            index = row * self.cols + col
+            return index if index < self.count else -1
+        return -1
+
+
 class RuneLiteObject:
     rect = None
 
@@ -267,6 +456,16 @@ class RuneLiteObject:
             raise ReferenceError("The RuneLiteObject is missing a reference to the Rectangle it's contained in and therefore the center cannot be determined.")
         return Point(self._center[0] + self.rect.left, self._center[1] + self.rect.top)
 
+    def bounding_rect(self) -> Rectangle:
+        """
+        Gets the bounding box of the object relative to the client window.
+        Returns:
+            A Rectangle.
+        """
+        if self.rect is None:
+            raise ReferenceError("The RuneLiteObject is missing a reference to the Rectangle it's contained in and therefore the bounds cannot be determined.")
+        return Rectangle(int(self._x_min + self.rect.left), int(self._y_min + self.rect.top), int(self._width), int(self._height))
+
     def distance_from_rect_center(self) -> float:
         """
         Gets the distance between the object and it's Rectangle parent center.
@@ -5,6 +5,8 @@ import numpy as np
 import cv2
 
 from typing import List
+import utilities.metrics as metrics
+import utilities.tracing as tracing
 from utilities.geometry import Point, Rectangle, RuneLiteObject
 
 # --- Paths to Image folders ---
@@ -34,6 +36,8 @@ def __imagesearcharea(template: Union[cv2.Mat, str, Path], im: cv2.Mat, confiden
     alpha = cv2.merge([alpha, alpha, alpha])
 
     correlation = cv2.matchTemplate(im, base, cv2.TM_SQDIFF_NORMED, mask=alpha)
+    # Blank areas (E.g., blacked out by a subtract_list) score NaN/inf with a mask, which derails minMaxLoc()
+    correlation[~np.isfinite(correlation)] = 1.0
     min_val, _, min_loc, _ = cv2.minMaxLoc(correlation)
     if min_val < confidence:
         # print('found match under conf ', min_val, confidence)
@@ -41,6 +45,8 @@ def __imagesearcharea(template: Union[cv2.Mat, str, Path], im: cv2.Mat, confiden
     return None
 
 
+@tracing.traced("template_search")
+@metrics.timed(metrics.TEMPLATE_SEARCH_SECONDS, metrics.TEMPLATE_SEARCHES)
 def search_img_in_rect(image: Union[cv2.Mat, str, Path], rect: Union[Rectangle, cv2.Mat], confidence=0.2) -> Rectangle:
     """
     Searches for an image in a rectangle. This function works with images containing transparency (sprites).
@@ -118,6 +124,8 @@ def __imagesearcharea_list(template: Union[cv2.Mat, str, Path], im: cv2.Mat, con
 
     return found_objects
 
+@tracing.traced("template_search")
+@metrics.timed(metrics.TEMPLATE_SEARCH_SECONDS, metrics.TEMPLATE_SEARCHES)
 def search_all_img_in_rect(image: Union[cv2.Mat, str, Path], rect: Union[Rectangle, cv2.Mat], confidence=0.15) -> List[RuneLiteObject]:
     if isinstance(image, str):
         image = cv2.imread(image, cv2.IMREAD_UNCHANGED)
@@ -0,0 +1,186 @@
+"""
+Serializes mouse and keyboard input from several bots that share one desktop.
+
+There is only one cursor and one focused window, so bots driving different game clients from the same process
+must take turns. Each bot sends its input through an ArbitratedBackend bound to its client window. The first
+event of a burst (E.g., a mouse movement followed by a click) acquires a lease on the InputArbiter. If another
+client had the lease, that client's window is focused first (focus handoff). The lease is released once the bot
+has sent no input for `linger` seconds. It is never released while a key or mouse button is held down, so a
+shift-drop or a drag cannot be interrupted by another client.
+
+Multi-step sequences that must not be interleaved can also hold the lease explicitly:
+    >>> with arbiter.session(self.win):
+    >>>     self.mouse.move_to(slot.random_point())
+    >>>     self.mouse.click()
+"""
+import threading
+import time
+from collections import deque
+from contextlib import contextmanager
+from typing import Callable, Set, Tuple
+
+from utilities.input_backend import InputBackend
+from utilities.window import Window
+
+
+class InputArbiter:
+    def __init__(self, linger: float = 0.15, focus_delay: float = 0.1):
+        """
+        Args:
+            linger: The number of seconds without input after which a client's lease can be taken over.
+            focus_delay: The number of seconds to wait after focusing a client window.
+        """
+        self.linger = linger
+        self.focus_delay = focus_delay
+        self.focused: Window = None  # the client window that currently has focus
+        self._owner: Window = None
+        self._holds = 0  # explicit sessions and held keys/buttons pinning the lease
+        self._last_input = 0.0
+        self._queue = deque()  # clients waiting for the lease, in arrival order
+        self._cond = threading.Condition()
+
+    def __available(self, window: Window) -> bool:
+        if self._owner is None or self._owner is window:
+            return True
+        return self._holds == 0 and time.time() - self._last_input >= self.linger
+
+    def acquire(self, window: Window, hold: bool = False) -> None:
+        """
+        Blocks until `window`'s client holds the input lease, focusing its window if another client had it.
+        Clients are served in the order they asked. While a client keeps sending input, its lease does not expire.
+        Args:
+            window: The client window that is about to receive input.
+            hold: Whether to also pin the lease (see hold()).
+        """
+        with self._cond:
+            if self._owner is not window:
+                ticket = object()
+                self._queue.append(ticket)
+                try:
+                    while self._queue[0] is not ticket or not self.__available(window):
+                        remaining = self.linger - (time.time() - self._last_input)
+                        self._cond.wait(max(remaining, 0.005) if self._holds == 0 else None)
+                finally:
+                    self._queue.remove(ticket)
+                    self._cond.notify_all()
+                self._owner = window
+                self._holds = 0
+            needs_focus = self.focused is not window
+            self.focused = window
+            # Pin the lease while focusing, so that it cannot expire during focus_delay
+            self._holds += 1
+        if needs_focus:
+            self.__focus(window)
+        with self._cond:
+            self._holds -= 0 if hold else 1
+            self._last_input = time.time()
+            self._cond.notify_all()
+
+    def __focus(self, window: Window) -> None:
+        try:
+            window.focus()
+        except Exception as e:
+            print(f"InputArbiter: Failed to focus '{window.window_title}': {e}")
+        time.sleep(self.focus_delay)
+
+    def touch(self, window: Window) -> None:
+        """
+        Marks input activity by the lease owner, postponing the lease's expiry.
+        """
+        with self._cond:
+            if self._owner is window:
+                self._last_input = time.time()
+
+    def hold(self, window: Window) -> None:
+        """
+        Pins `window`'s lease so that it does not expire until release() is called. Acquires the lease if needed.
+        """
+        self.acquire(window, hold=True)
+
+    def release(self, window: Window) -> None:
+        """
+        Undoes one hold(). The lease then expires normally after `linger` seconds without input.
+        """
+        with self._cond:
+            if self._owner is window and self._holds > 0:
+                self._holds -= 1
+                self._last_input = time.time()
+                self._cond.notify_all()
+
+    @contextmanager
+    def session(self, window: Window):
+        """
+        Holds the input lease for `window`'s client for the duration of a with-block.
+        """
+        self.hold(window)
+        try:
+            yield self
+        finally:
+            self.release(window)
+
+
+class ArbitratedBackend(InputBackend):
+    def __init__(self, backend: InputBackend, arbiter: InputArbiter, window: Window):
+        """
+        An InputBackend that acquires the arbiter's lease for its client window before passing events on.
+        Args:
+            backend: The backend that actually sends the events (usually the process-wide default backend).
+            arbiter: The InputArbiter shared by all clients.
+            window: The client window this backend's input is meant for.
+        """
+        self.backend = backend
+        self.arbiter = arbiter
+        self.window = window
+        self._held: Set[Tuple[str, str]] = set()  # ("button"|"key", name) currently pressed
+
+    def __press(self, kind: str, name: str) -> None:
+        if (kind, name) in self._held:
+            self.arbiter.touch(self.window)
+            return
+        self.arbiter.hold(self.window)
+        self._held.add((kind, name))
+
+    def __unpress(self, kind: str, name: str, send: Callable[[str], None]) -> None:
+        if (kind, name) not in self._held:
+            self.arbiter.acquire(self.window)
+            send(name)
+            return
+        send(name)
+        self._held.discard((kind, name))
+        self.arbiter.release(self.window)
+
+    def move_to(self, x: int, y: int) -> None:
+        self.arbiter.acquire(self.window)
+        self.backend.move_to(x, y)
+
+    def mouse_down(self, button: str = "left") -> None:
+        self.__press("button", button)
+        self.backend.mouse_down(button)
+
+    def mouse_up(self, button: str = "left") -> None:
+        self.__unpress("button", button, self.backend.mouse_up)
+
+    def key_down(self, key: str) -> None:
+        self.__press("key", key)
+        self.backend.key_down(key)
+
+    def key_up(self, key: str) -> None:
+        self.__unpress("key", key, self.backend.key_up)
+
+    def press(self, key: str) -> None:
+        self.arbiter.acquire(self.window)
+        self.backend.press(key)
+
+    def release_all(self) -> None:
+        """
+        Releases every key and mouse button this backend is holding down, along with their holds on the lease.
+        Call this after stopping a bot that may have been interrupted mid-action (E.g., while holding shift).
+        """
+        for kind, name in list(self._held):
+            self.__unpress(kind, name, self.backend.mouse_up if kind == "button" else self.backend.key_up)
+
+    def position(self) -> Tuple[int, int]:
+        return self.backend.position()
+
+    def screen_size(self) -> Tuple[int, int]:
+        return self.backend.screen_size()
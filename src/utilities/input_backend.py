@@ -0,0 +1,344 @@
+"""
+Input backends for sending mouse and keyboard events to the game client.
+
+The Mouse and Keyboard utilities do not talk to the operating system directly. Instead, they delegate every
+low-level action (move, button, key, position query) to an InputBackend. This makes it possible to swap the
+default pyautogui implementation for a faster native one, or for an in-memory recorder that lets bots run
+without a desktop.
+
+Available backends:
+    - PyAutoGUIBackend: The default. Cross-platform, uses pyautogui.
+    - XTestBackend: Linux only. Sends events through the X11 XTest extension (requires `python-xlib`).
+    - RecordingBackend: Does not send any events. Timestamps every event in memory for later inspection.
+"""
+import threading
+import time
+from abc import ABC, abstractmethod
+from typing import Callable, List, NamedTuple, Tuple
+
+
+class InputBackend(ABC):
+    """
+    Interface for objects capable of generating mouse and keyboard input.
+    """
+
+    @abstractmethod
+    def move_to(self, x: int, y: int) -> None:
+        """
+        Instantly moves the cursor to an absolute screen position.
+        """
+        pass
+
+    @abstractmethod
+    def mouse_down(self, button: str = "left") -> None:
+        """
+        Presses a mouse button ("left", "middle" or "right").
+        """
+        pass
+
+    @abstractmethod
+    def mouse_up(self, button: str = "left") -> None:
+        """
+        Releases a mouse button ("left", "middle" or "right").
+        """
+        pass
+
+    @abstractmethod
+    def key_down(self, key: str) -> None:
+        """
+        Presses a key. Key names follow pyautogui's naming (E.g., "shift", "esc", "space", "1").
+        """
+        pass
+
+    @abstractmethod
+    def key_up(self, key: str) -> None:
+        """
+        Releases a key. Key names follow pyautogui's naming (E.g., "shift", "esc", "space", "1").
+        """
+        pass
+
+    @abstractmethod
+    def position(self) -> Tuple[int, int]:
+        """
+        Returns the current cursor position as an (x, y) tuple.
+        """
+        pass
+
+    @abstractmethod
+    def screen_size(self) -> Tuple[int, int]:
+        """
+        Returns the size of the primary monitor as a (width, height) tuple.
+        """
+        pass
+
+    def press(self, key: str) -> None:
+        """
+        Presses and releases a key.
+        """
+        self.key_down(key)
+        self.key_up(key)
+
+
+class PyAutoGUIBackend(InputBackend):
+    """
+    Input backend using pyautogui. This preserves the behaviour OSBC has always had.
+    """
+
+    def __init__(self):
+        import pyautogui
+
+        self._pag = pyautogui
+
+    def move_to(self, x: int, y: int) -> None:
+        self._pag.moveTo((x, y))
+
+    def mouse_down(self, button: str = "left") -> None:
+        self._pag.mouseDown(button=button)
+
+    def mouse_up(self, button: str = "left") -> None:
+        self._pag.mouseUp(button=button)
+
+    def key_down(self, key: str) -> None:
+        self._pag.keyDown(key)
+
+    def key_up(self, key: str) -> None:
+        self._pag.keyUp(key)
+
+    def press(self, key: str) -> None:
+        self._pag.press(key)
+
+    def position(self) -> Tuple[int, int]:
+        x, y = self._pag.position()
+        return int(x), int(y)
+
+    def screen_size(self) -> Tuple[int, int]:
+        width, height = self._pag.size()
+        return int(width), int(height)
+
+
+class XTestBackend(InputBackend):
+    """
+    Input backend that injects events through the X11 XTest extension. Each event is a single request on an
+    already-open display connection, which avoids the per-call overhead (and implicit pauses) of pyautogui.
+    Requires `python-xlib` and an X11 (or XWayland) session.
+    """
+
+    # pyautogui key names that do not map directly to an X keysym name
+    KEY_NAMES = {
+        "alt": "Alt_L",
+        "altleft": "Alt_L",
+        "altright": "Alt_R",
+        "backspace": "BackSpace",
+        "ctrl": "Control_L",
+        "ctrlleft": "Control_L",
+        "ctrlright": "Control_R",
+        "del": "Delete",
+        "delete": "Delete",
+        "down": "Down",
+        "end": "End",
+        "enter": "Return",
+        "esc": "Escape",
+        "escape": "Escape",
+        "home": "Home",
+        "left": "Left",
+        "pagedown": "Next",
+        "pageup": "Prior",
+        "return": "Return",
+        "right": "Right",
+        "shift": "Shift_L",
+        "shiftleft": "Shift_L",
+        "shiftright": "Shift_R",
+        "space": "space",
+        " ": "space",
+        "tab": "Tab",
+        "up": "Up",
+    }
+    BUTTONS = {"left": 1, "middle": 2, "right": 3}
+
+    def __init__(self, display: str = None):
+        """
+        Opens a connection to the X server.
+        Args:
+            display: The X display to connect to (default: the DISPLAY environment variable).
+        Raises:
+            ImportError: If python-xlib is not installed.
+            RuntimeError: If the XTest extension is not available on the display.
+        """
+        try:
+            from Xlib import X, XK
+            from Xlib import display as xdisplay
+            from Xlib.ext import xtest
+        except ImportError as e:
+            raise ImportError("XTestBackend requires python-xlib. Install it with `pip install python-xlib`.") from e
+        self._X = X
+        self._XK = XK
+        self._xtest = xtest
+        self._display = xdisplay.Display(display)
+        if not self._display.has_extension("XTEST"):
+            raise RuntimeError("The X server does not support the XTEST extension.")
+        self._root = self._display.screen().root
+        self._keycodes = {}
+        self._lock = threading.Lock()
+
+    def __keycode(self, key: str) -> int:
+        if key not in self._keycodes:
+            name = self.KEY_NAMES.get(key.lower(), key)
+            keysym = self._XK.string_to_keysym(name)
+            if keysym == 0:
+                raise ValueError(f"Unsupported key: {key}")
+            self._keycodes[key] = self._display.keysym_to_keycode(keysym)
+        return self._keycodes[key]
+
+    def __button(self, button: str) -> int:
+        try:
+            return self.BUTTONS[button]
+        except KeyError as e:
+            raise ValueError(f"Invalid mouse button: {button}. Try 'left', 'middle', or 'right'.") from e
+
+    def __send(self, event_type: int, detail: int = 0, x: int = 0, y: int = 0) -> None:
+        with self._lock:
+            self._xtest.fake_input(self._display, event_type, detail, x=x, y=y)
+            self._display.flush()
+
+    def move_to(self, x: int, y: int) -> None:
+        self.__send(self._X.MotionNotify, x=int(x), y=int(y))
+
+    def mouse_down(self, button: str = "left") -> None:
+        self.__send(self._X.ButtonPress, self.__button(button))
+
+    def mouse_up(self, button: str = "left") -> None:
+        self.__send(self._X.ButtonRelease, self.__button(button))
+
+    def key_down(self, key: str) -> None:
+        self.__send(self._X.KeyPress, self.__keycode(key))
+
+    def key_up(self, key: str) -> None:
+        self.__send(self._X.KeyRelease, self.__keycode(key))
+
+    def position(self) -> Tuple[int, int]:
+        with self._lock:
+            pointer = self._root.query_pointer()
+        return pointer.root_x, pointer.root_y
+
+    def screen_size(self) -> Tuple[int, int]:
+        screen = self._display.screen()
+        return screen.width_in_pixels, screen.height_in_pixels
+
+
+class InputEvent(NamedTuple):
+    """
+    A single input event captured by the RecordingBackend.
+    """
+
+    timestamp: float
+    kind: str  # "move", "mouse_down", "mouse_up", "key_down" or "key_up"
+    x: int
+    y: int
+    detail: str = None  # button or key name
+
+
+class RecordingBackend(InputBackend):
+    """
+    Input backend that never touches the operating system. Every event is timestamped and stored in memory,
+    and the cursor position is simulated. Useful for running bots headless (E.g., against recorded frames)
+    and for measuring how many actions a script performs per hour.
+    """
+
+    def __init__(self, screen_size: Tuple[int, int] = (1920, 1080), start: Tuple[int, int] = (0, 0), clock: Callable[[], float] = time.perf_counter):
+        """
+        Args:
+            screen_size: The simulated monitor size (width, height).
+            start: The initial cursor position.
+            clock: A function returning the current time in seconds. Supply a virtual clock to
+                   timestamp events in simulated time.
+        """
+        self.events: List[InputEvent] = []
+        self.clock = clock
+        self._size = screen_size
+        self._pos = (int(start[0]), int(start[1]))
+        self._listeners: List[Callable[[InputEvent], None]] = []
+        self._lock = threading.Lock()
+
+    def add_listener(self, callback: Callable[[InputEvent], None]) -> None:
+        """
+        Registers a function that will be called with every recorded InputEvent.
+        """
+        self._listeners.append(callback)
+
+    def __record(self, kind: str, detail: str = None) -> None:
+        with self._lock:
+            event = InputEvent(self.clock(), kind, self._pos[0], self._pos[1], detail)
+            self.events.append(event)
+        for listener in self._listeners:
+            listener(event)
+
+    def move_to(self, x: int, y: int) -> None:
+        width, height = self._size
+        self._pos = (min(max(int(x), 0), width - 1), min(max(int(y), 0), height - 1))
+        self.__record("move")
+
+    def mouse_down(self, button: str = "left") -> None:
+        self.__record("mouse_down", button)
+
+    def mouse_up(self, button: str = "left") -> None:
+        self.__record("mouse_up", button)
+
+    def key_down(self, key: str) -> None:
+        self.__record("key_down", key)
+
+    def key_up(self, key: str) -> None:
+        self.__record("key_up", key)
+
+    def position(self) -> Tuple[int, int]:
+        return self._pos
+
+    def screen_size(self) -> Tuple[int, int]:
+        return self._size
+
+    def clear(self) -> None:
+        """
+        Discards all recorded events.
+        """
+        with self._lock:
+            self.events = []
+
+    def count(self, kind: str) -> int:
+        """
+        Returns the number of recorded events of a given kind (E.g., "mouse_down").
+        """
+        return sum(event.kind == kind for event in self.events)
+
+    def actions_per_hour(self) -> float:
+        """
+        Calculates the rate of actions (mouse clicks and key presses) over the recorded period.
+        Returns:
+            Actions per hour, or 0 if fewer than two events were recorded.
+        """
+        if len(self.events) < 2:
+            return 0
+        elapsed = self.events[-1].timestamp - self.events[0].timestamp
+        if elapsed <= 0:
+            return 0
+        actions = self.count("mouse_down") + self.count("key_down")
+        return actions / elapsed * 3600
+
+
+__default_backend: InputBackend = None
+
+
+def default_backend() -> InputBackend:
+    """
+    Returns the process-wide default backend, creating a PyAutoGUIBackend on first use.
+    """
+    global __default_backend
+    if __default_backend is None:
+        __default_backend = PyAutoGUIBackend()
+    return __default_backend
+
+
+def set_default_backend(backend: InputBackend) -> None:
+    """
+    Replaces the process-wide default backend. Mouse and Keyboard objects created afterwards will use it.
+    """
+    global __default_backend
+    __default_backend = backend
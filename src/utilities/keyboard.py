@@ -0,0 +1,52 @@
+import time
+
+import utilities.metrics as metrics
+from utilities.input_backend import InputBackend, default_backend
+
+
+class Keyboard:
+    def __init__(self, backend: InputBackend = None):
+        """
+        Sends key presses to the game client through an InputBackend.
+        Args:
+            backend: The InputBackend to use (default: the process-wide default backend).
+        """
+        self.backend = backend or default_backend()
+
+    def press(self, key: str) -> None:
+        """
+        Presses and releases a key.
+        Args:
+            key: The name of the key (E.g., "esc", "space", "1").
+        """
+        metrics.ACTIONS.inc(kind="key")
+        self.backend.press(key)
+
+    def key_down(self, key: str) -> None:
+        """
+        Holds a key down until key_up() is called.
+        Args:
+            key: The name of the key (E.g., "shift").
+        """
+        metrics.ACTIONS.inc(kind="key")
+        self.backend.key_down(key)
+
+    def key_up(self, key: str) -> None:
+        """
+        Releases a key.
+        Args:
+            key: The name of the key (E.g., "shift").
+        """
+        self.backend.key_up(key)
+
+    def hold(self, key: str, duration: float) -> None:
+        """
+        Holds a key for a given duration.
+        Args:
+            key: The name of the key (E.g., "left").
+            duration: The number of seconds to hold the key.
+        """
+        metrics.ACTIONS.inc(kind="key")
+        self.backend.key_down(key)
+        time.sleep(duration)
+        self.backend.key_up(key)
@@ -0,0 +1,175 @@
+"""
+Persisted cache of client window layouts.
+
+Window.initialize() normally locates the minimap, chatbox and control panel with full-client template searches.
+Once a layout has been found, its anchor rectangles are saved here, keyed by window title, client size and client
+mode (fixed/resizable). On the next start, the cached layout is checked with a handful of pixel probes instead of
+being searched for again. The probes are pixels of the UI chrome (opaque template pixels) that were recorded when
+the layout was found. If too many of them changed, the layout is stale and the full search runs again.
+
+Anchors are stored relative to the client window's top-left corner, so moving the window does not invalidate them.
+"""
+import functools
+import threading
+from pathlib import Path
+from typing import Dict, List, NamedTuple, Tuple, Union
+
+import cv2
+import numpy as np
+import simplejson as JSON
+
+from utilities.geometry import Rectangle
+
+CACHE_PATH = Path(__file__).parent.parent.joinpath("layout_cache.json")
+PROBES_PER_ANCHOR = 8
+PROBE_TOLERANCE = 12  # max per-channel color difference for a probe to match
+PROBE_MATCH_RATIO = 0.9  # fraction of probes that must match for a cached layout to be valid
+
+# (left, top, width, height) relative to the client, and a probe is (x, y, b, g, r) relative to the client
+Box = Tuple[int, int, int, int]
+Probe = Tuple[int, int, int, int, int]
+
+
+class Layout(NamedTuple):
+    client_fixed: bool
+    anchors: Dict[str, Box]  # E.g., {"minimap_area": (...), "chat": (...), "control_panel": (...)}
+    probes: List[Probe]
+
+
+def layout_key(window_title: str, client_rect: Rectangle, client_fixed: bool) -> str:
+    return f"{window_title}|{client_rect.width}x{client_rect.height}|{'fixed' if client_fixed else 'resizable'}"
+
+
+def to_box(rect: Rectangle, client_rect: Rectangle) -> Box:
+    """
+    Converts an on-screen Rectangle to a box relative to the client.
+    """
+    return (rect.left - client_rect.left, rect.top - client_rect.top, rect.width, rect.height)
+
+
+def from_box(box: Box, client_rect: Rectangle) -> Rectangle:
+    """
+    Converts a box relative to the client to an on-screen Rectangle.
+    """
+    left, top, width, height = box
+    return Rectangle(left=left + client_rect.left, top=top + client_rect.top, width=width, height=height)
+
+
+@functools.lru_cache(maxsize=None)
+def probe_points(template_path: Union[str, Path], count: int = PROBES_PER_ANCHOR) -> Tuple[Tuple[int, int], ...]:
+    """
+    Picks evenly spread points on the opaque pixels of a template image. Results are cached per template.
+    Returns:
+        (x, y) points relative to the template's top-left corner.
+    """
+    template = cv2.imread(str(template_path), cv2.IMREAD_UNCHANGED)
+    if template.ndim == 3 and template.shape[2] == 4:
+        ys, xs = np.nonzero(template[:, :, 3] == 255)
+    else:
+        ys, xs = np.indices(template.shape[:2]).reshape(2, -1)
+    if len(xs) == 0:
+        return ()
+    picks = np.linspace(0, len(xs) - 1, min(count, len(xs))).astype(int)
+    return tuple((int(xs[i]), int(ys[i])) for i in picks)
+
+
+def record_probes(screenshot: np.ndarray, points: List[Tuple[int, int]]) -> List[Probe]:
+    """
+    Records the color of each point in a client screenshot.
+    Args:
+        screenshot: A BGR screenshot of the client.
+        points: (x, y) points relative to the client.
+    """
+    return [(x, y, *(int(c) for c in screenshot[y, x, :3])) for x, y in points]
+
+
+def probes_match(screenshot: np.ndarray, probes: List[Probe], tolerance: int = PROBE_TOLERANCE, ratio: float = PROBE_MATCH_RATIO) -> bool:
+    """
+    Checks whether enough recorded probes still have (about) the same color in a client screenshot.
+    """
+    if not probes:
+        return False
+    arr = np.asarray(probes, dtype=np.int32)
+    xs, ys = arr[:, 0], arr[:, 1]
+    h, w = screenshot.shape[:2]
+    if xs.max() >= w or ys.max() >= h or xs.min() < 0 or ys.min() < 0:
+        return False
+    actual = screenshot[ys, xs, :3].astype(np.int32)
+    matches = np.all(np.abs(actual - arr[:, 2:5]) <= tolerance, axis=1)
+    return matches.mean() >= ratio
+
+
+class LayoutCache:
+    def __init__(self, path: Union[str, Path] = CACHE_PATH):
+        """
+        Args:
+            path: The JSON file that layouts are persisted to. It is read on first use.
+        """
+        self.path = Path(path)
+        self._layouts: Dict[str, Layout] = None
+        self._lock = threading.Lock()
+
+    def __load(self) -> Dict[str, Layout]:
+        if self._layouts is None:
+            try:
+                with open(self.path) as f:
+                    data = JSON.load(f)
+                self._layouts = {
+                    key: Layout(entry["client_fixed"], {name: tuple(box) for name, box in entry["anchors"].items()}, [tuple(p) for p in entry["probes"]])
+                    for key, entry in data.items()
+                }
+            except (FileNotFoundError, ValueError, KeyError, TypeError):
+                self._layouts = {}
+        return self._layouts
+
+    def __save(self) -> None:
+        data = {key: layout._asdict() for key, layout in self._layouts.items()}
+        tmp = self.path.with_suffix(".tmp")
+        with open(tmp, "w") as f:
+            JSON.dump(data, f)
+        tmp.replace(self.path)
+
+    def candidates(self, window_title: str, client_rect: Rectangle) -> List[Layout]:
+        """
+        Returns the cached layouts for a window title and client size (at most one per client mode).
+        """
+        with self._lock:
+            layouts = self.__load()
+            return [layout for fixed in (True, False) if (layout := layouts.get(layout_key(window_title, client_rect, fixed)))]
+
+    def put(self, window_title: str, client_rect: Rectangle, layout: Layout) -> None:
+        """
+        Saves a layout and writes the cache file.
+        """
+        with self._lock:
+            self.__load()[layout_key(window_title, client_rect, layout.client_fixed)] = layout
+            try:
+                self.__save()
+            except OSError as e:
+                print(f"LayoutCache.put(): Failed to write {self.path}: {e}")
+
+    def invalidate(self, window_title: str = None) -> None:
+        """
+        Removes the cached layouts of a window title, or all cached layouts.
+        """
+        with self._lock:
+            layouts = self.__load()
+            for key in [key for key in layouts if window_title is None or key.split("|")[0] == window_title]:
+                del layouts[key]
+            try:
+                self.__save()
+            except OSError as e:
+                print(f"LayoutCache.invalidate(): Failed to write {self.path}: {e}")
+
+
+__default_cache: LayoutCache = None
+
+
+def default_cache() -> LayoutCache:
+    """
+    Returns the process-wide LayoutCache.
+    """
+    global __default_cache
+    if __default_cache is None:
+        __default_cache = LayoutCache()
+    return __default_cache
@@ -0,0 +1,442 @@
+"""
+Counters, gauges and latency histograms for monitoring bots, with an optional Prometheus scrape endpoint.
+
+The framework records a standard set of metrics (see the module-level metrics below): frames captured, OCR calls,
+template searches, cache hits and misses, mouse/keyboard actions, misclicks, API round trips and main loop
+iterations, along with their latencies. Metrics are labelled with the bot they were recorded for. The `bot` label
+is taken from the calling thread (see bind()), which Bot sets on its main loop thread, so a multi-client process
+reports each client separately.
+
+Latency histograms keep HDR-style buckets (16 linear sub-buckets per power of two, so every value is recorded with at
+most ~6% relative error) and report p50/p95/p99.
+
+Example:
+    >>> metrics.serve(9464)  # http://127.0.0.1:9464/metrics, in Prometheus text format
+    >>> print(metrics.OCR_SECONDS.percentile(95, bot="alice"))
+    >>> print(metrics.hit_rate("layout"))
+"""
+import functools
+import threading
+import time
+from abc import ABC, abstractmethod
+from contextlib import contextmanager
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from typing import Callable, Dict, Iterable, List, Tuple
+
+SUB_BUCKET_BITS = 4
+SUB_BUCKETS = 1 << SUB_BUCKET_BITS
+QUANTILES = (0.5, 0.95, 0.99)
+
+# Labels of the calling thread, applied to any label a metric call does not set explicitly
+__context = threading.local()
+
+
+def context_labels() -> Dict[str, str]:
+    """
+    Returns the labels bound to the calling thread.
+    """
+    return getattr(__context, "labels", {})
+
+
+def bind(**labels) -> None:
+    """
+    Binds labels (E.g., bot="alice") to the calling thread. Metrics recorded on this thread use them by default.
+    """
+    __context.labels = {**context_labels(), **{k: str(v) for k, v in labels.items()}}
+
+
+@contextmanager
+def bound(**labels):
+    """
+    Binds labels to the calling thread for the duration of a with-block.
+    """
+    previous = context_labels()
+    bind(**labels)
+    try:
+        yield
+    finally:
+        __context.labels = previous
+
+
+class _Metric(ABC):
+    kind = "untyped"
+
+    def __init__(self, name: str, help: str, labelnames: Iterable[str] = ()):
+        """
+        Args:
+            name: The metric's name (E.g., "osbc_ocr_calls_total").
+            help: A description of the metric.
+            labelnames: The names of the metric's labels. Values not passed to a call are taken from the calling
+                        thread's bound labels (see bind()), or left empty.
+        """
+        self.name = name
+        self.help = help
+        self.labelnames = tuple(labelnames)
+        self._children: Dict[Tuple[str, ...], object] = {}
+        self._lock = threading.Lock()
+
+    def _key(self, labels: dict) -> Tuple[str, ...]:
+        if not self.labelnames:
+            return ()
+        context = context_labels()
+        return tuple(str(labels[n]) if n in labels else context.get(n, "") for n in self.labelnames)
+
+    def _matching(self, labels: dict) -> list:
+        """
+        Returns the children whose labels include all of the given labels.
+        """
+        wanted = [(i, str(labels[n])) for i, n in enumerate(self.labelnames) if n in labels]
+        with self._lock:
+            return [child for key, child in self._children.items() if all(key[i] == v for i, v in wanted)]
+
+    @abstractmethod
+    def _samples(self) -> List[Tuple[str, List[Tuple[str, str]], Tuple[str, ...], float]]:
+        """
+        Returns the samples to render, as (name suffix, extra label pairs, label values, value) tuples.
+        """
+        pass
+
+    def render(self) -> str:
+        lines = [f"# HELP {self.name} {self.help}", f"# TYPE {self.name} {self.kind}"]
+        for suffix, extra, key, value in self._samples():
+            pairs = list(zip(self.labelnames, key)) + extra
+            label_str = "{" + ",".join(f'{n}="{_escape(v)}"' for n, v in pairs) + "}" if pairs else ""
+            lines.append(f"{self.name}{suffix}{label_str} {_format_value(value)}")
+        return "\n".join(lines)
+
+
+def _escape(value: str) -> str:
+    return str(value).replace("\\", "\\\\").replace('"', '\\"').replace("\n", "\\n")
+
+
+def _format_value(value: float) -> str:
+    if value != value:
+        return "NaN"
+    if value in (float("inf"), float("-inf")):
+        return "+Inf" if value > 0 else "-Inf"
+    return repr(float(value)) if not float(value).is_integer() else str(int(value))
+
+
+class Counter(_Metric):
+    kind = "counter"
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._children[key] = self._children.get(key, 0) + amount
+
+    def value(self, **labels) -> float:
+        """
+        Returns the sum of the counter over every label combination that includes the given labels.
+        """
+        return sum(self._matching(labels))
+
+    def _samples(self):
+        with self._lock:
+            return [("", [], key, value) for key, value in self._children.items()]
+
+
+class Gauge(_Metric):
+    kind = "gauge"
+
+    def set(self, value: float, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._children[key] = value
+
+    def inc(self, amount: float = 1, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            current = self._children.get(key, 0)
+            self._children[key] = (current() if callable(current) else current) + amount
+
+    def dec(self, amount: float = 1, **labels) -> None:
+        self.inc(-amount, **labels)
+
+    def set_function(self, fn: Callable[[], float], **labels) -> None:
+        """
+        Makes the gauge report the return value of `fn` whenever it is read or scraped.
+        """
+        key = self._key(labels)
+        with self._lock:
+            self._children[key] = fn
+
+    def remove(self, **labels) -> None:
+        key = self._key(labels)
+        with self._lock:
+            self._children.pop(key, None)
+
+    def value(self, **labels) -> float:
+        key = self._key(labels)
+        with self._lock:
+            value = self._children.get(key, 0)
+        return value() if callable(value) else value
+
+    def _samples(self):
+        with self._lock:
+            children = list(self._children.items())
+        samples = []
+        for key, value in children:
+            try:
+                samples.append(("", [], key, value() if callable(value) else value))
+            except Exception as e:
+                print(f"Gauge '{self.name}': Failed to read value: {e}")
+        return samples
+
+
+class LatencyHistogram:
+    def __init__(self):
+        """
+        An HDR-style histogram of durations. Each power of two (in nanoseconds) is split into SUB_BUCKETS linear
+        buckets, so any duration is recorded with a relative error of at most 1 / SUB_BUCKETS.
+        """
+        self.counts: Dict[int, int] = {}
+        self.count = 0
+        self.sum = 0.0
+        self.min = None
+        self.max = 0.0
+
+    @staticmethod
+    def bucket_of(ns: int) -> int:
+        if ns < SUB_BUCKETS:
+            return max(ns, 0)
+        shift = ns.bit_length() - 1 - SUB_BUCKET_BITS
+        return (shift + 1) * SUB_BUCKETS + (ns >> shift) - SUB_BUCKETS
+
+    @staticmethod
+    def bucket_bounds(index: int) -> Tuple[int, int]:
+        """
+        Returns the [lower, upper) bounds of a bucket, in nanoseconds.
+        """
+        if index < SUB_BUCKETS:
+            return index, index + 1
+        shift = index // SUB_BUCKETS - 1
+        mantissa = SUB_BUCKETS + index % SUB_BUCKETS
+        return mantissa << shift, (mantissa + 1) << shift
+
+    def observe(self, seconds: float) -> None:
+        index = LatencyHistogram.bucket_of(int(seconds * 1e9))
+        self.counts[index] = self.counts.get(index, 0) + 1
+        self.count += 1
+        self.sum += seconds
+        self.min = seconds if self.min is None else min(self.min, seconds)
+        self.max = max(self.max, seconds)
+
+    def percentile(self, p: float) -> float:
+        """
+        Returns a percentile (0-100) of the observed durations, in seconds, or 0 if nothing was observed.
+        """
+        if not self.count:
+            return 0.0
+        rank = max(1, round(p / 100 * self.count))
+        seen = 0
+        for index in sorted(self.counts):
+            seen += self.counts[index]
+            if seen >= rank:
+                lower, upper = LatencyHistogram.bucket_bounds(index)
+                return min(max((lower + upper) / 2e9, self.min), self.max)
+        return self.max
+
+
+class Histogram(_Metric):
+    kind = "summary"
+
+    def observe(self, seconds: float, **labels) -> None:
+        """
+        Records a duration, in seconds.
+        """
+        key = self._key(labels)
+        with self._lock:
+            if key not in self._children:
+                self._children[key] = LatencyHistogram()
+            self._children[key].observe(seconds)
+
+    @contextmanager
+    def time(self, **labels):
+        """
+        Records the duration of a with-block.
+        """
+        start = time.perf_counter()
+        try:
+            yield
+        finally:
+            self.observe(time.perf_counter() - start, **labels)
+
+    def percentile(self, p: float, **labels) -> float:
+        """
+        Returns a percentile (0-100) of the durations recorded with exactly the given labels, in seconds.
+        """
+        key = self._key(labels)
+        with self._lock:
+            hist = self._children.get(key)
+            return hist.percentile(p) if hist is not None else 0.0
+
+    def _samples(self):
+        samples = []
+        with self._lock:
+            for key, hist in self._children.items():
+                samples.extend(("", [("quantile", str(q))], key, hist.percentile(q * 100)) for q in QUANTILES)
+                samples.append(("_sum", [], key, hist.sum))
+                samples.append(("_count", [], key, hist.count))
+        return samples
+
+
+def timed(histogram: Histogram, counter: Counter = None) -> Callable[[Callable], Callable]:
+    """
+    A decorator that records the duration of each call of a function in `histogram`, and counts calls in `counter`.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            start = time.perf_counter()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                histogram.observe(time.perf_counter() - start)
+                if counter is not None:
+                    counter.inc()
+
+        return wrapper
+
+    return decorator
+
+
+class MetricsRegistry:
+    def __init__(self):
+        """
+        A named collection of metrics that can be rendered in Prometheus text format.
+        """
+        self._metrics: Dict[str, _Metric] = {}
+        self._lock = threading.Lock()
+
+    def __get_or_create(self, cls, name: str, help: str, labelnames: Iterable[str]):
+        with self._lock:
+            metric = self._metrics.get(name)
+            if metric is None:
+                metric = self._metrics[name] = cls(name, help, labelnames)
+            elif not isinstance(metric, cls):
+                raise ValueError(f"Metric '{name}' is already registered as a {metric.kind}.")
+            return metric
+
+    def counter(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Counter:
+        """
+        Returns the counter with this name, registering it if needed.
+        """
+        return self.__get_or_create(Counter, name, help, labelnames)
+
+    def gauge(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Gauge:
+        """
+        Returns the gauge with this name, registering it if needed.
+        """
+        return self.__get_or_create(Gauge, name, help, labelnames)
+
+    def histogram(self, name: str, help: str, labelnames: Iterable[str] = ()) -> Histogram:
+        """
+        Returns the latency histogram with this name, registering it if needed.
+        """
+        return self.__get_or_create(Histogram, name, help, labelnames)
+
+    def get(self, name: str) -> _Metric:
+        return self._metrics[name]
+
+    def render(self) -> str:
+        """
+        Renders every metric in Prometheus text exposition format.
+        """
+        with self._lock:
+            metrics = list(self._metrics.values())
+        return "\n".join(metric.render() for metric in metrics) + "\n"
+
+
+__default_registry: MetricsRegistry = None
+
+
+def default_registry() -> MetricsRegistry:
+    """
+    Returns the process-wide MetricsRegistry.
+    """
+    global __default_registry
+    if __default_registry is None:
+        __default_registry = MetricsRegistry()
+    return __default_registry
+
+
+# --- Standard metrics recorded by the framework ---
+FRAMES = default_registry().counter("osbc_frames_total", "Screen regions captured by Rectangle.screenshot().", ["bot"])
+CAPTURE_SECONDS = default_registry().histogram("osbc_capture_seconds", "Latency of Rectangle.screenshot().", ["bot"])
+OCR_CALLS = default_registry().counter("osbc_ocr_calls_total", "OCR calls (extract_text and find_text).", ["bot"])
+OCR_SECONDS = default_registry().histogram("osbc_ocr_seconds", "Latency of OCR calls.", ["bot"])
+TEMPLATE_SEARCHES = default_registry().counter("osbc_template_searches_total", "Image template searches.", ["bot"])
+TEMPLATE_SEARCH_SECONDS = default_registry().histogram("osbc_template_search_seconds", "Latency of image template searches.", ["bot"])
+CACHE_REQUESTS = default_registry().counter("osbc_cache_requests_total", "Cache lookups by cache and result (hit or miss).", ["bot", "cache", "result"])
+ACTIONS = default_registry().counter("osbc_actions_total", "Mouse and keyboard actions by kind (move, click or key).", ["bot", "kind"])
+ACTIONS_PER_HOUR = default_registry().gauge("osbc_actions_per_hour", "Mouse and keyboard actions per hour since the bot started.", ["bot"])
+CLICK_CHECKS = default_registry().counter("osbc_click_checks_total", "Clicks checked for a red click sprite.", ["bot"])
+MISCLICKS = default_registry().counter("osbc_misclicks_total", "Checked clicks that were not red (missed their target).", ["bot"])
+API_SECONDS = default_registry().histogram("osbc_api_request_seconds", "Round-trip time of game API requests by endpoint.", ["bot", "endpoint"])
+API_ERRORS = default_registry().counter("osbc_api_errors_total", "Failed game API requests by endpoint.", ["bot", "endpoint"])
+ITERATIONS = default_registry().counter("osbc_iterations_total", "Main loop iterations.", ["bot"])
+ITERATION_SECONDS = default_registry().histogram("osbc_iteration_seconds", "Duration of main loop iterations.", ["bot"])
+
+
+def cache_result(cache: str, hit: bool) -> None:
+    """
+    Records a cache lookup.
+    """
+    CACHE_REQUESTS.inc(cache=cache, result="hit" if hit else "miss")
+
+
+def hit_rate(cache: str, **labels) -> float:
+    """
+    Returns the fraction of lookups of a cache that were hits, or 0 if it was never used.
+    """
+    hits = CACHE_REQUESTS.value(cache=cache, result="hit", **labels)
+    total = CACHE_REQUESTS.value(cache=cache, **labels)
+    return hits / total if total else 0.0
+
+
+class MetricsServer:
+    def __init__(self, registry: MetricsRegistry, host: str, port: int):
+        """
+        Serves a registry's metrics over HTTP on a daemon thread. Use serve() instead.
+        """
+        self.registry = registry
+
+        class Handler(BaseHTTPRequestHandler):
+            def do_GET(handler):
+                if handler.path.split("?")[0] not in ("/", "/metrics"):
+                    handler.send_error(404)
+                    return
+                body = registry.render().encode()
+                handler.send_response(200)
+                handler.send_header("Content-Type", "text/plain; version=0.0.4; charset=utf-8")
+                handler.send_header("Content-Length", str(len(body)))
+                handler.end_headers()
+                handler.wfile.write(body)
+
+            def log_message(handler, format, *args):
+                pass
+
+        self.httpd = ThreadingHTTPServer((host, port), Handler)
+        self.httpd.daemon_threads = True
+        self.port = self.httpd.server_address[1]
+        self._thread = threading.Thread(target=self.httpd.serve_forever, name="MetricsServer", daemon=True)
+        self._thread.start()
+
+    def close(self) -> None:
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+
+def serve(port: int = 9464, host: str = "127.0.0.1", registry: MetricsRegistry = None) -> MetricsServer:
+    """
+    Starts a local HTTP endpoint exposing the metrics in Prometheus text format at /metrics.
+    Args:
+        port: The port to listen on (0 picks a free port, see MetricsServer.port).
+        host: The interface to listen on. Defaults to localhost only.
+        registry: The registry to expose (default: the process-wide registry).
+    Returns:
+        The running MetricsServer. Call close() to stop it.
+    """
+    return MetricsServer(registry or default_registry(), host, port)
@@ -1,50 +1,188 @@
+import threading
 import time
+from concurrent.futures import Future
+from typing import Callable, Tuple
 
-import mss
 import numpy as np
-import pyautogui as pag
 import pytweening
 from pyclick import HumanCurve
 
 import utilities.debug as debug
-import utilities.imagesearch as imsearch
+import utilities.metrics as metrics
+import utilities.tracing as tracing
+from utilities.click_feedback import ClickFeedbackDetector, default_detector
+from utilities.curve_pool import CurvePool, default_pool, sample_target_points
 from utilities.geometry import Point, Rectangle
+from utilities.input_backend import InputBackend, default_backend
 from utilities.random_util import truncated_normal_sample
 
 
+class MoveControl:
+    DEFAULT_CHECKPOINTS = (0.35, 0.6, 0.85)
+
+    def __init__(
+        self,
+        watch_rect: Rectangle = None,
+        on_checkpoint: Callable[["MoveControl"], tuple] = None,
+        checkpoints: Tuple[float, ...] = DEFAULT_CHECKPOINTS,
+    ):
+        """
+        Lets another thread steer a Mouse.move_to() call while it is in progress.
+        Args:
+            watch_rect: If provided, the `entered` event is set as soon as the cursor enters this Rectangle.
+            on_checkpoint: If provided, called (on the moving thread) each time the movement passes one of the
+                           `checkpoints`. It may return a new x, y destination to bend the rest of the path toward,
+                           or None to carry on. Used for closed-loop aiming at moving targets.
+            checkpoints: Fractions of the path (0-1) at which `on_checkpoint` is called.
+        """
+        self.watch_rect = watch_rect
+        self.on_checkpoint = on_checkpoint
+        self.checkpoints = sorted(checkpoints) if on_checkpoint else []
+        self.entered = threading.Event()
+        self.finished = threading.Event()
+        self.position: Point = None
+        self.progress: float = 0
+        self._cancelled = threading.Event()
+        self._target = None
+        self._lock = threading.Lock()
+
+    @property
+    def cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def cancel(self) -> None:
+        """
+        Stops the movement at the next curve point. The cursor is left wherever it currently is.
+        """
+        self._cancelled.set()
+
+    def retarget(self, destination: tuple) -> None:
+        """
+        Redirects the movement to a new destination. The remaining path is rebuilt from the current cursor position.
+        Args:
+            destination: x, y tuple of the new destination point.
+        """
+        with self._lock:
+            self._target = (destination[0], destination[1])
+
+    def _pop_target(self) -> tuple:
+        with self._lock:
+            target, self._target = self._target, None
+        return target
+
+    def _update(self, position: Point, progress: float) -> None:
+        """
+        Called by the Mouse after each curve point.
+        """
+        self.position = position
+        self.progress = progress
+        if self.checkpoints and progress >= self.checkpoints[0]:
+            while self.checkpoints and progress >= self.checkpoints[0]:
+                self.checkpoints.pop(0)
+            if destination := self.on_checkpoint(self):
+                self.retarget(destination)
+        if self.watch_rect is not None and not self.entered.is_set() and self.watch_rect.contains(position):
+            self.entered.set()
+
+
 class Mouse:
     click_delay = True
+    correction_points = 5  # the number of points of the corrective move for a re-target on the last point of a path
 
-    def move_to(self, destination: tuple, **kwargs):
+    def __init__(
+        self, backend: InputBackend = None, curve_pool: CurvePool = None, feedback_detector: ClickFeedbackDetector = None, pool_curves: bool = True
+    ):
+        """
+        Moves and clicks the mouse through an InputBackend.
+        Args:
+            backend: The InputBackend to use (default: the process-wide default backend).
+            curve_pool: The CurvePool to draw pre-generated curves from (default: the process-wide pool).
+            feedback_detector: The ClickFeedbackDetector used to check for red clicks (default: the process-wide
+                               detector).
+            pool_curves: If False, no CurvePool is used and each curve is generated on the calling thread.
+        """
+        self.backend = backend or default_backend()
+        self.curve_pool = (curve_pool or default_pool()) if pool_curves else None
+        self.feedback_detector = feedback_detector or default_detector()
+
+    @tracing.traced("mouse.move")
+    def move_to(self, destination: tuple, control: "MoveControl" = None, **kwargs) -> bool:
         """
         Use Bezier curve to simulate human-like mouse movements.
         Args:
             destination: x, y tuple of the destination point
-            destination_variance: pixel variance to add to the destination point (default 0)
+            control: an optional MoveControl that lets another thread cancel or re-target the movement while
+                     it is in progress, or be notified when the cursor enters a Rectangle.
         Kwargs:
             knotsCount: number of knots to use in the curve, higher value = more erratic movements
                         (default determined by distance)
             mouseSpeed: speed of the mouse (options: 'slowest', 'slow', 'medium', 'fast', 'fastest')
                         (default 'fast')
             tween: tweening function to use (default easeOutQuad)
+        Returns:
+            True if the cursor reached its (final) destination, False if the movement was cancelled.
+        """
+        metrics.ACTIONS.inc(kind="move")
+        start = self.backend.position()
+        points = self.__curve(start, destination, **kwargs)
+        if control is None:
+            for curve_x, curve_y in points:
+                self.backend.move_to(curve_x, curve_y)
+            return True
+
+        try:
+            i = 0
+            progress_offset, progress_scale = 0, 1
+            while i < len(points):
+                if control.cancelled:
+                    return False
+                curve_x, curve_y = points[i]
+                self.backend.move_to(curve_x, curve_y)
+                i += 1
+                control._update(Point(round(curve_x), round(curve_y)), progress_offset + progress_scale * i / len(points))
+                if new_destination := control._pop_target():
+                    # Bend the rest of the path toward the new destination, keeping the remaining number of points
+                    # (and therefore the remaining duration) the same. A re-target on the last point gets a short
+                    # corrective move rather than a whole new curve.
+                    remaining = max(len(points) - i, self.correction_points)
+                    progress_offset, progress_scale = control.progress, 1 - control.progress
+                    points = self.__curve((curve_x, curve_y), new_destination, **{**kwargs, "knotsCount": 0})
+                    if remaining < len(points):
+                        points = [points[round(j)] for j in np.linspace(0, len(points) - 1, remaining)]
+                    i = 0
+            return True
+        finally:
+            control.finished.set()
+
+    def __curve(self, start: tuple, destination: tuple, **kwargs) -> list:
+        """
+        Builds the list of points for a human-like movement between two points. See move_to() for kwargs.
         """
         offsetBoundaryX = kwargs.get("offsetBoundaryX", 100)
         offsetBoundaryY = kwargs.get("offsetBoundaryY", 100)
-        knotsCount = kwargs.get("knotsCount", self.__calculate_knots(destination))
+        knotsCount = kwargs.get("knotsCount", self.__calculate_knots(start, destination))
         distortionMean = kwargs.get("distortionMean", 1)
         distortionStdev = kwargs.get("distortionStdev", 1)
         distortionFrequency = kwargs.get("distortionFrequency", 0.5)
         tween = kwargs.get("tweening", pytweening.easeOutQuad)
         mouseSpeed = kwargs.get("mouseSpeed", "fast")
-        mouseSpeed = self.__get_mouse_speed(mouseSpeed)
-
-        dest_x = destination[0]
-        dest_y = destination[1]
 
-        start_x, start_y = pag.position()
-        for curve_x, curve_y in HumanCurve(
-            (start_x, start_y),
-            (dest_x, dest_y),
+        if self.curve_pool is not None:
+            return self.curve_pool.curve(
+                start,
+                (destination[0], destination[1]),
+                speed=mouseSpeed,
+                knots=knotsCount,
+                tween=tween,
+                offset_x=offsetBoundaryX,
+                offset_y=offsetBoundaryY,
+                distortion_mean=distortionMean,
+                distortion_stdev=distortionStdev,
+                distortion_frequency=distortionFrequency,
+            )
+        return HumanCurve(
+            (round(start[0]), round(start[1])),
+            (destination[0], destination[1]),
             offsetBoundaryX=offsetBoundaryX,
             offsetBoundaryY=offsetBoundaryY,
             knotsCount=knotsCount,
@@ -52,10 +190,8 @@ class Mouse:
             distortionStdev=distortionStdev,
             distortionFrequency=distortionFrequency,
             tween=tween,
-            targetPoints=mouseSpeed,
-        ).points:
-            pag.moveTo((curve_x, curve_y))
-            start_x, start_y = curve_x, curve_y
+            targetPoints=sample_target_points(mouseSpeed),
+        ).points
 
     def move_rel(self, x: int, y: int, x_var: int = 0, y_var: int = 0, **kwargs):
         """
@@ -73,7 +209,8 @@ class Mouse:
             x += round(truncated_normal_sample(-x_var, x_var))
         if y_var != 0:
             y += round(truncated_normal_sample(-y_var, y_var))
-        self.move_to((pag.position()[0] + x, pag.position()[1] + y), **kwargs)
+        pos_x, pos_y = self.backend.position()
+        self.move_to((pos_x + x, pos_y + y), **kwargs)
 
     def click(self, button="left", force_delay=False, check_red_click=False) -> tuple:
         """
@@ -85,18 +222,59 @@ class Mouse:
         Returns:
             None, unless check_red_click is True, in which case it returns a boolean indicating
             whether the click was red (i.e., successful action) or not.
+        Note:
+            To avoid waiting for the red click check, use click_with_feedback() instead.
+        """
+        if check_red_click:
+            return self.click_with_feedback(button, force_delay).result()
+        self.__press_and_release(button, force_delay)
+
+    def click_with_feedback(self, button="left", force_delay=False) -> Future:
         """
-        mouse_pos_before = pag.position()
-        pag.mouseDown(button=button)
-        mouse_pos_after = pag.position()
+        Clicks on the current mouse position and checks whether the click was red (i.e., a successful action)
+        in the background. This returns as soon as the mouse button is released.
+        Args:
+            button: button to click (default left).
+            force_delay: whether to force a delay between mouse button presses regardless of the Mouse property.
+        Returns:
+            A Future resolving to True if the click was red, False if it was yellow.
+        Example:
+            >>> feedback = self.mouse.click_with_feedback()
+            >>> ...  # do other work
+            >>> if not feedback.result():
+            >>>     self.log_msg("Misclick!")
+        """
+        mouse_pos_before, mouse_pos_after = self.__press_and_release(button, force_delay)
+        feedback = self.feedback_detector.check(self.__click_sprite_rect(mouse_pos_before, mouse_pos_after))
+        labels = metrics.context_labels()  # the check runs on the detector's thread
+
+        def count(done: Future):
+            if not done.cancelled() and done.exception() is None:
+                metrics.CLICK_CHECKS.inc(**labels)
+                if not done.result():
+                    metrics.MISCLICKS.inc(**labels)
+
+        feedback.add_done_callback(count)
+        return feedback
+
+    @tracing.traced("mouse.click")
+    def __press_and_release(self, button: str, force_delay: bool) -> Tuple[Point, Point]:
+        """
+        Presses and releases a mouse button.
+        Returns:
+            The mouse positions before and after the button was pressed.
+        """
+        metrics.ACTIONS.inc(kind="click")
+        mouse_pos_before = self.backend.position()
+        self.backend.mouse_down(button)
+        mouse_pos_after = self.backend.position()
         if force_delay or self.click_delay:
             LOWER_BOUND_CLICK = 0.03  # Milliseconds
             UPPER_BOUND_CLICK = 0.2  # Milliseconds
             AVERAGE_CLICK = 0.06  # Milliseconds
             time.sleep(truncated_normal_sample(LOWER_BOUND_CLICK, UPPER_BOUND_CLICK, AVERAGE_CLICK))
-        pag.mouseUp(button=button)
-        if check_red_click:
-            return self.__is_red_click(mouse_pos_before, mouse_pos_after)
+        self.backend.mouse_up(button)
+        return mouse_pos_before, mouse_pos_after
 
     def right_click(self, force_delay=False):
         """
@@ -111,8 +289,7 @@ class Mouse:
         Returns a rectangle around a Point with some padding.
         """
         # Get monitor dimensions
-        max_x, max_y = pag.size()
-        max_x, max_y = int(str(max_x)), int(str(max_y))
+        max_x, max_y = self.backend.screen_size()
 
         # Get the rectangle around the mouse cursor with some padding, ensure it is within the screen.
         mouse_x, mouse_y = mouse_pos
@@ -120,14 +297,13 @@ class Mouse:
         p2 = Point(min(mouse_x + pad, max_x), min(mouse_y + pad, max_y))
         return Rectangle.from_points(p1, p2)
 
-    def __is_red_click(self, mouse_pos_from: Point, mouse_pos_to: Point) -> bool:
+    def __click_sprite_rect(self, mouse_pos_from: Point, mouse_pos_to: Point) -> Rectangle:
         """
-        Checks if a click was red, indicating a successful action.
+        Returns the smallest Rectangle that contains the click sprite for a click that started and ended at the given
+        positions.
         Args:
             mouse_pos_from: mouse position before the click.
             mouse_pos_to: mouse position after the click.
-        Returns:
-            True if the click was red, False if the click was yellow.
         """
         CLICK_SPRITE_WIDTH_HALF = 7
         rect1 = self.__rect_around_point(mouse_pos_from, CLICK_SPRITE_WIDTH_HALF)
@@ -136,46 +312,20 @@ class Mouse:
         # Combine two rects into a bigger rectangle
         top_left_pos = Point(min(rect1.get_top_left().x, rect2.get_top_left().x), min(rect1.get_top_left().y, rect2.get_top_left().y))
         bottom_right_pos = Point(max(rect1.get_bottom_right().x, rect2.get_bottom_right().x), max(rect1.get_bottom_right().y, rect2.get_bottom_right().y))
-        cursor_sct = Rectangle.from_points(top_left_pos, bottom_right_pos).screenshot()
+        return Rectangle.from_points(top_left_pos, bottom_right_pos)
 
-        for click_sprite in ["red_1.png", "red_3.png", "red_2.png", "red_4.png"]:
-            try:
-                if imsearch.search_img_in_rect(imsearch.BOT_IMAGES.joinpath("mouse_clicks", click_sprite), cursor_sct):
-                    return True
-            except mss.ScreenShotError:
-                print("Failed to take screenshot of mouse cursor. Please report this error to the developer.")
-                continue
-        return False
-
-    def __calculate_knots(self, destination: tuple):
+    def __calculate_knots(self, start: tuple, destination: tuple):
         """
         Calculate the knots to use in the Bezier curve based on distance.
         Args:
+            start: x, y tuple of the current mouse position.
             destination: x, y tuple of the destination point.
         """
         # Calculate the distance between the start and end points
-        distance = np.sqrt((destination[0] - pag.position()[0]) ** 2 + (destination[1] - pag.position()[1]) ** 2)
+        distance = np.sqrt((destination[0] - start[0]) ** 2 + (destination[1] - start[1]) ** 2)
         res = round(distance / 200)
         return min(res, 3)
 
-    def __get_mouse_speed(self, speed: str) -> int:
-        """
-        Converts a text speed to a numeric speed for HumanCurve (targetPoints).
-        """
-        if speed == "slowest":
-            min, max = 85, 100
-        elif speed == "slow":
-            min, max = 65, 80
-        elif speed == "medium":
-            min, max = 45, 60
-        elif speed == "fast":
-            min, max = 20, 40
-        elif speed == "fastest":
-            min, max = 10, 15
-        else:
-            raise ValueError("Invalid mouse speed. Try 'slowest', 'slow', 'medium', 'fast', or 'fastest'.")
-        return round(truncated_normal_sample(min, max))
-
 
 if __name__ == "__main__":
     mouse = Mouse()
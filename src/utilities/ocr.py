@@ -13,6 +13,8 @@ if __name__ == "__main__":
 
 import utilities.color as clr
 import utilities.debug as debug
+import utilities.metrics as metrics
+import utilities.tracing as tracing
 from utilities.geometry import Rectangle
 
 problematic_chars = [
@@ -99,6 +101,8 @@ QUILL = __load_font("Quill")  # Large bold quest text
 QUILL_8 = __load_font("Quill8")  # Small quest text
 
 
+@tracing.traced("ocr")
+@metrics.timed(metrics.OCR_SECONDS, metrics.OCR_CALLS)
 def extract_text(rect: Rectangle, font: dict, color: Union[clr.Color, List[clr.Color]], exclude_chars: Union[str, List[str]] = problematic_chars) -> str:
     """
     Extracts text from a Rectangle.
@@ -133,6 +137,8 @@ def extract_text(rect: Rectangle, font: dict, color: Union[clr.Color, List[clr.C
     return result.join(letter for letter, _, _ in char_list)
 
 
+@tracing.traced("ocr")
+@metrics.timed(metrics.OCR_SECONDS, metrics.OCR_CALLS)
 def find_text(
     text: Union[str, List[str]],
     rect: Rectangle,
@@ -0,0 +1,248 @@
+"""
+Runs heavy computer vision on a pool of worker processes.
+
+Tag extraction over the whole game view, full-view image searches and OCR are CPU-heavy and normally run on the
+bot thread. A PerceptionPool runs them as named tasks on worker processes instead, so that several bots on one host
+spread their perception across all cores, and a heavy frame does not stall a bot's loop (use submit() and keep going).
+
+Tasks receive a Rectangle. Inside the worker, `rect.screenshot()` returns the frame the task was submitted with:
+- If this process has a FrameBusSource installed (see frame_bus.py) that covers the Rectangle, only a reference to
+  the shared frame (ring name and sequence number) is sent. The worker maps the same frame and copies the region out
+  of it, which raises StaleFrameError if the capture daemon has already overwritten the frame.
+- Otherwise, the Rectangle is screenshotted here and the image is sent along with the task.
+
+Results are kept compact: tagged objects are sent back with their pixels as a packed bitmask, and are rebuilt into
+RuneLiteObjects referencing the caller's Rectangle.
+
+Example:
+    >>> pool = default_pool()
+    >>> npcs = pool.run("tagged_objects", self.win.game_view, colors=clr.CYAN)
+    >>> future = pool.submit("find_image", self.win.game_view, image=path, confidence=0.1)
+"""
+import os
+from concurrent.futures import Future, ProcessPoolExecutor
+from typing import Callable, Dict, Iterable, List, NamedTuple, Tuple, Union
+
+import numpy as np
+
+import utilities.geometry as geometry
+from utilities.frame_bus import FrameBusSource, FrameRing, ReplaySource
+from utilities.geometry import Rectangle, RuneLiteObject
+
+
+class StaleFrameError(Exception):
+    """
+    Raised in a worker when the shared frame a task was submitted with has already been overwritten.
+    """
+
+
+class FrameRef(NamedTuple):
+    """
+    A reference to a frame in a FrameRing, resolvable in another process.
+    """
+
+    ring: str
+    seq: int
+
+
+class CompactObject(NamedTuple):
+    """
+    A RuneLiteObject in transport form: its pixels are a packed bitmask over its bounding box.
+    """
+
+    x_min: int
+    x_max: int
+    y_min: int
+    y_max: int
+    center: Tuple[int, int]
+    mask: bytes
+    mask_shape: Tuple[int, int]
+
+    @classmethod
+    def pack(cls, obj: RuneLiteObject) -> "CompactObject":
+        x_min, y_min = int(obj._x_min), int(obj._y_min)
+        shape = (int(obj._y_max) - y_min + 1, int(obj._x_max) - x_min + 1)
+        mask = np.zeros(shape, dtype=bool)
+        mask[obj._axis[:, 1] - y_min, obj._axis[:, 0] - x_min] = True
+        return cls(x_min, int(obj._x_max), y_min, int(obj._y_max), tuple(int(v) for v in obj._center), np.packbits(mask).tobytes(), shape)
+
+    def unpack(self, rect: Rectangle = None) -> RuneLiteObject:
+        count = self.mask_shape[0] * self.mask_shape[1]
+        mask = np.unpackbits(np.frombuffer(self.mask, dtype=np.uint8), count=count).reshape(self.mask_shape)
+        ys, xs = np.nonzero(mask)
+        axis = np.column_stack((xs + self.x_min, ys + self.y_min))
+        obj = RuneLiteObject(
+            self.x_min, self.x_max, self.y_min, self.y_max, self.x_max - self.x_min, self.y_max - self.y_min, list(self.center), axis
+        )
+        if rect is not None:
+            obj.set_rectangle_reference(rect)
+        return obj
+
+
+# --- Tasks (run in the worker processes) ---
+TASKS: Dict[str, Callable] = {}
+
+
+def perception_task(name: str) -> Callable[[Callable], Callable]:
+    """
+    Registers a function as a named perception task. The function receives a Rectangle (whose screenshot() is the
+    submitted frame) followed by the task's keyword arguments, and should return something small and picklable.
+    Tasks must be registered at import time of a module the workers import (E.g., this one), or be passed to
+    submit() directly as a module-level function.
+    """
+
+    def register(fn: Callable) -> Callable:
+        TASKS[name] = fn
+        return fn
+
+    return register
+
+
+@perception_task("tagged_objects")
+def tagged_objects(rect: Rectangle, colors) -> List[CompactObject]:
+    """
+    Finds the outlined (tagged) objects of one or more colors, like RuneLiteBot.get_all_tagged_in_rect().
+    """
+    import utilities.color as clr
+    import utilities.runelite_cv as rcv
+
+    return [CompactObject.pack(obj) for obj in rcv.extract_objects(clr.isolate_colors(rect.screenshot(), colors))]
+
+
+@perception_task("find_image")
+def find_image(rect: Rectangle, image: str, confidence: float = 0.15) -> List[Tuple[int, int, int, int]]:
+    """
+    Finds all occurrences of an image, like imagesearch.search_all_img_in_rect().
+    Returns:
+        (left, top, width, height) of each match, in screen coordinates.
+    """
+    import utilities.imagesearch as imsearch
+
+    # Matches come back in the Rectangle's coordinates, with no Rectangle reference set
+    return [
+        (int(obj._x_min) + rect.left, int(obj._y_min) + rect.top, int(obj._width), int(obj._height))
+        for obj in imsearch.search_all_img_in_rect(str(image), rect, confidence)
+    ]
+
+
+@perception_task("ocr_text")
+def ocr_text(rect: Rectangle, font: str, colors, exclude_chars: Union[str, List[str]] = None) -> str:
+    """
+    Extracts text, like ocr.extract_text(). `font` is the name of a font in the ocr module (E.g., "PLAIN_12").
+    """
+    import utilities.ocr as ocr
+
+    if exclude_chars is None:
+        return ocr.extract_text(rect, getattr(ocr, font), colors)
+    return ocr.extract_text(rect, getattr(ocr, font), colors, exclude_chars)
+
+
+__worker_rings: Dict[str, FrameRing] = {}
+
+
+def _init_worker() -> None:
+    # Workers only read the frames they are given, never the screen
+    geometry.set_frame_source(None)
+
+
+def _run_task(task: Union[str, Callable], box: Tuple[int, int, int, int], subtract_list: List[dict], frame: Union[FrameRef, Tuple[np.ndarray, int, int]], kwargs: dict):
+    """
+    Runs a task in a worker process with `frame` as the only screenshot source.
+    """
+    rect = Rectangle(*box)
+    if isinstance(frame, FrameRef):
+        if frame.ring not in __worker_rings:
+            __worker_rings[frame.ring] = FrameRing.attach(frame.ring)
+        ring = __worker_rings[frame.ring]
+        shared = ring.get(frame.seq)
+        # Copy just the region out of the ring (a single memcpy), so the capture daemon can keep overwriting slots
+        # while the task runs, then make sure the slot was not overwritten during the copy
+        image = None if shared is None else shared.crop(rect.to_dict()).copy()
+        if shared is None or not ring.valid(shared):
+            raise StaleFrameError(f"Frame {frame.seq} of ring '{frame.ring}' was overwritten before the task ran.")
+        source = ReplaySource(image, rect.left, rect.top)
+    else:
+        source = ReplaySource(*frame)
+    fn = TASKS[task] if isinstance(task, str) else task
+    if subtract_list:
+        rect.subtract_list = subtract_list
+    geometry.set_frame_source(source)
+    try:
+        return fn(rect, **kwargs)
+    finally:
+        geometry.set_frame_source(None)
+
+
+class PerceptionPool:
+    def __init__(self, workers: int = None):
+        """
+        Args:
+            workers: The number of worker processes. Defaults to the number of CPUs.
+        """
+        self.workers = workers or os.cpu_count()
+        self._executor = ProcessPoolExecutor(max_workers=self.workers, initializer=_init_worker)
+
+    def __frame(self, rect: Rectangle) -> Union[FrameRef, Tuple[np.ndarray, int, int]]:
+        monitor = rect.to_dict()
+        source = geometry.frame_source()
+        if isinstance(source, FrameBusSource) and (found := source.locate(monitor)):
+            ring, frame = found
+            return FrameRef(ring.name, frame.seq)
+        # No shared frame: send this region's pixels along (subtract_list is applied in the worker)
+        return (np.ascontiguousarray(Rectangle(rect.left, rect.top, rect.width, rect.height).screenshot()), rect.left, rect.top)
+
+    def submit(self, task: Union[str, Callable], rect: Rectangle, **kwargs) -> Future:
+        """
+        Queues a perception task on a worker process.
+        Args:
+            task: The name of a registered task (see perception_task()) or a module-level function.
+            rect: The screen region to analyze. Its subtract_list is honoured.
+            kwargs: The task's arguments.
+        Returns:
+            A Future resolving to the task's result. Tagged objects are resolved to RuneLiteObjects referencing `rect`.
+        """
+        box = (rect.left, rect.top, rect.width, rect.height)
+        future = self._executor.submit(_run_task, task, box, list(rect.subtract_list), self.__frame(rect), kwargs)
+        result: Future = Future()
+
+        def resolve(done: Future):
+            if done.cancelled():
+                result.cancel()
+            elif done.exception() is not None:
+                result.set_exception(done.exception())
+            else:
+                value = done.result()
+                if isinstance(value, list) and value and isinstance(value[0], CompactObject):
+                    value = [obj.unpack(rect) for obj in value]
+                result.set_result(value)
+
+        future.add_done_callback(resolve)
+        return result
+
+    def run(self, task: Union[str, Callable], rect: Rectangle, timeout: float = None, **kwargs):
+        """
+        Runs a perception task on a worker process and waits for its result. See submit().
+        """
+        return self.submit(task, rect, **kwargs).result(timeout)
+
+    def map(self, task: Union[str, Callable], rects: Iterable[Rectangle], timeout: float = None, **kwargs) -> list:
+        """
+        Runs the same task on several Rectangles in parallel and returns the results in order.
+        """
+        return [future.result(timeout) for future in [self.submit(task, rect, **kwargs) for rect in rects]]
+
+    def close(self) -> None:
+        self._executor.shutdown(wait=False, cancel_futures=True)
+
+
+__default_pool: PerceptionPool = None
+
+
+def default_pool() -> PerceptionPool:
+    """
+    Returns the process-wide PerceptionPool, starting its workers on first use.
+    """
+    global __default_pool
+    if __default_pool is None:
+        __default_pool = PerceptionPool()
+    return __default_pool
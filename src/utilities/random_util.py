@@ -1,12 +1,314 @@
+"""
+Random sampling helpers.
+
+Sampling is backed by a `Sampler`, which draws from a numpy `Generator` in vectorized blocks and refills
+them on a background thread, so that individual samples are only a lookup. The module-level functions use the
+Sampler bound to the calling thread (see bind()), which Bot sets to its own Sampler on its main loop thread, or
+else a shared, thread-safe default Sampler.
+"""
 import math
 import random
-import secrets
+import threading
+from collections import deque
+from contextlib import contextmanager
 from datetime import datetime
-from typing import List, Union
+from functools import lru_cache
+from typing import Callable, Dict, Hashable, List, Tuple, Union
 
 import numpy as np
 
 
+class _SampleStream:
+    def __init__(self, draw: Callable[[np.random.Generator, int], np.ndarray]):
+        """
+        A queue of pre-drawn samples from one distribution.
+        Args:
+            draw: A function drawing `n` samples from a Generator.
+        """
+        self.draw = draw
+        self.block: List[float] = []
+        self.index = 0
+        self.ready: deque = deque()
+
+
+class Sampler:
+    def __init__(self, seed: int = None, block_size: int = 2048, prefetch: int = 2, background: bool = True):
+        """
+        Draws random samples in vectorized blocks from a numpy Generator. Each distribution has its own queue of
+        blocks. When a block is consumed, the next one is already waiting, and a daemon worker thread draws
+        replacements in the background. All methods are thread-safe, and no global random state is touched.
+        Args:
+            seed: The Generator seed (default: fresh OS entropy). A seeded Sampler only repeats its samples
+                  exactly if `background` is False, since a worker thread refills the distributions in whatever
+                  order they run out.
+            block_size: The number of samples drawn at once for each distribution.
+            prefetch: The number of blocks to keep ready for each distribution.
+            background: Whether to refill blocks on a worker thread. If False, blocks are drawn on demand.
+        """
+        self.block_size = block_size
+        self.prefetch = prefetch
+        self.background = background
+        self._rng = np.random.default_rng(seed)
+        self._rng_lock = threading.Lock()
+        self._streams: Dict[Hashable, _SampleStream] = {}
+        self._cond = threading.Condition()
+        self._thread = None
+
+    def __draw(self, stream: _SampleStream) -> List[float]:
+        with self._rng_lock:
+            return stream.draw(self._rng, self.block_size).tolist()
+
+    def __next(self, key: Hashable, draw: Callable[[np.random.Generator, int], np.ndarray]) -> float:
+        """
+        Returns the next pre-drawn sample of a distribution, registering the distribution if it is new.
+        """
+        with self._cond:
+            stream = self._streams.get(key)
+            if stream is None:
+                stream = self._streams[key] = _SampleStream(draw)
+            if stream.index < len(stream.block):
+                stream.index += 1
+                return stream.block[stream.index - 1]
+            block = stream.ready.popleft() if stream.ready else None
+        if block is None:
+            block = self.__draw(stream)
+        with self._cond:
+            # Another thread may have replaced the block in the meantime; the new one is equally valid
+            stream.block, stream.index = block, 1
+            if self.background:
+                self.__ensure_worker()
+                self._cond.notify()
+            elif not stream.ready:
+                stream.ready.append(self.__draw(stream))
+        return block[0]
+
+    def __ensure_worker(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self.__work, name="Sampler", daemon=True)
+            self._thread.start()
+
+    def __next_stream(self) -> _SampleStream:
+        """
+        Returns a stream that is short of ready blocks, or None. Must be called with the lock held.
+        """
+        return next((stream for stream in self._streams.values() if len(stream.ready) < self.prefetch), None)
+
+    def __work(self) -> None:
+        while True:
+            with self._cond:
+                while (stream := self.__next_stream()) is None:
+                    self._cond.wait()
+            block = self.__draw(stream)
+            with self._cond:
+                stream.ready.append(block)
+
+    def uniform(self, low: float = 0.0, high: float = 1.0) -> float:
+        """
+        Returns a random float in [low, high).
+        """
+        return low + (high - low) * self.__next("uniform", lambda rng, n: rng.random(n))
+
+    def randrange(self, start: int, stop: int) -> int:
+        """
+        Returns a random integer in [start, stop).
+        Raises:
+            ValueError: If the range is empty, like random.randrange().
+        """
+        if start >= stop:
+            raise ValueError(f"empty range for randrange() ({start}, {stop})")
+        return start + min(int(self.uniform() * (stop - start)), stop - start - 1)
+
+    @staticmethod
+    def __box_muller(rng: np.random.Generator, n: int) -> np.ndarray:
+        """
+        Vectorized form of the transform truncated_normal_sample() has always used, so that pre-drawn samples
+        follow the same distribution as before.
+        """
+        samples = np.empty(0)
+        while len(samples) < n:
+            x1, x2 = rng.standard_normal((2, int(n * 2.8) + 16))
+            z = x1**2 + x2**2
+            keep = (z > 0) & (z <= 1)
+            x1, z = x1[keep], z[keep]
+            samples = np.concatenate((samples, x1 * np.sqrt(-2 * np.log(z) / z)))
+        return samples[:n]
+
+    def normal(self) -> float:
+        """
+        Returns a sample from the unit normal-like distribution underlying truncated_normal().
+        """
+        return self.__next("normal", self.__box_muller)
+
+    def truncated_normal(self, lower_bound, upper_bound, mean=None, std=None) -> float:
+        """
+        Returns a sample from a truncated normal distribution. See truncated_normal_sample().
+        """
+        if mean is None:
+            mean = (lower_bound + upper_bound) / 2
+        if std is None:
+            std = (upper_bound - lower_bound) / 9
+        while True:
+            sample = mean + std * self.normal()
+            if lower_bound <= sample <= upper_bound:
+                return sample
+
+    def fancy_normal(self, lower_bound, upper_bound) -> float:
+        """
+        Returns a sample from a truncated normal distribution with randomly-selected means. See fancy_normal_sample().
+        """
+        # Two means, at 1/3rd and 2/3rds of the range, weighted 4:1 (see fancy_normal_sample)
+        ratio = 0.33 if self.uniform() < 0.8 else 0.66
+        return self.truncated_normal(lower_bound, upper_bound, mean=lower_bound + (upper_bound - lower_bound) * ratio)
+
+    def beta(self, a: float, b: float, lower_bound: float = 0.0, upper_bound: float = 1.0) -> float:
+        """
+        Returns a sample from a Beta(a, b) distribution scaled to [lower_bound, upper_bound].
+        """
+        return lower_bound + (upper_bound - lower_bound) * self.__next(("beta", a, b), lambda rng, n: rng.beta(a, b, n))
+
+    def chisquare(self, df: int, min: float = 0, max: float = np.inf) -> float:
+        """
+        Returns a sample from a Chisquared distribution. See chisquared_sample().
+        """
+        if max is None:
+            max = np.inf
+        while True:
+            x = self.__next(("chisquare", df), lambda rng, n: rng.chisquare(df, n))
+            if min <= x <= max:
+                return x
+
+    def chance(self, probability: float) -> bool:
+        """
+        Returns true or false based on a probability.
+        """
+        return self.uniform() < probability
+
+    def point_in(self, x_min, y_min, width, height, seeds: List[List[int]]) -> List[int]:
+        """
+        Returns a random pixel within some bounding box based on a list of seeds. See random_point_in().
+        """
+        if self.randrange(0, 101) > 75:
+            # Generate a random pixel within the full bounding box.
+            return self.__point_from(x_min, y_min, width, height)
+
+        # Calculate the dimensions and position of an inner bounding box within the full bounding box.
+        offset_percentage = self.uniform(0.150, 0.350)
+        inner_x_min = round(width * offset_percentage + x_min)
+        inner_y_min = round(height * offset_percentage + y_min)
+        inner_width = round(width * (1.000 - (offset_percentage * 2)))
+        inner_height = round(height * (1.000 - (offset_percentage * 2)))
+
+        # Select a random seed from the list of seeds.
+        random_index = self.randrange(0, len(seeds))
+        ratio_x = round(inner_width * seeds[random_index][0])
+        ratio_y = round(inner_height * seeds[random_index][1])
+
+        # Calculate the dimensions and position of a bounding box within the inner bounding box.
+        start_x, start_y = inner_x_min + ratio_x, inner_y_min + ratio_y
+        start_fix_width, end_fix_width = start_x - x_min, width - ratio_x
+        start_fix_height, end_fix_height = start_y - y_min, height - ratio_y
+
+        # Determine the dimensions of the bounding box within the inner bounding box.
+        inner_inner_width = min(start_fix_width, end_fix_width)
+        inner_inner_height = min(start_fix_height, end_fix_height)
+
+        # Generate a random pixel within the bounding box within the inner bounding box.
+        return self.__point_from(start_x, start_y, inner_inner_width, inner_inner_height, centered=False)
+
+    def __point_from(self, x_min, y_min, width, height, centered: bool = True) -> List[int]:
+        """
+        Generates a random pixel within some bounding box. The bounding box can be centered on the x_min and
+        y_min coordinates, or the bounding box can be offset from the x_min and y_min coordinates (i.e., x_min
+        and y_min are the top-left corner of the bounding box).
+        """
+        if centered:
+            # The bounding box to search is to be centered on the x_min and y_min coordinates
+            x_min = x_min + math.ceil(width / 2)
+            y_min = y_min + math.ceil(height / 2)
+        half_width, half_height = math.ceil(width / 2), math.ceil(height / 2)
+        # Truncated normal sampling with a standard deviation of a third of the region's half-dimensions
+        x = int(self.truncated_normal(x_min - half_width, x_min + half_width, x_min, (width / 2) * 0.33))
+        y = int(self.truncated_normal(y_min - half_height, y_min + half_height, y_min, (height / 2) * 0.33))
+        return [x, y]
+
+
+__default_sampler: Sampler = None
+__default_sampler_lock = threading.Lock()
+# The Sampler bound to the calling thread, used by the module-level functions instead of the default one
+__context = threading.local()
+
+
+def default_sampler() -> Sampler:
+    """
+    Returns the process-wide Sampler used by the module-level functions on threads without a bound Sampler.
+    """
+    global __default_sampler
+    if __default_sampler is None:
+        with __default_sampler_lock:
+            if __default_sampler is None:
+                __default_sampler = Sampler()
+    return __default_sampler
+
+
+def set_default_sampler(sampler: Union[Sampler, None]) -> Union[Sampler, None]:
+    """
+    Replaces the process-wide Sampler (E.g., with a seeded one for a repeatable simulation).
+    Args:
+        sampler: The new default Sampler, or None to create a fresh one on next use.
+    Returns:
+        The previous default Sampler (None if it was never created), so that it can be restored.
+    """
+    global __default_sampler
+    with __default_sampler_lock:
+        previous, __default_sampler = __default_sampler, sampler
+    return previous
+
+
+def context_sampler() -> Union[Sampler, None]:
+    """
+    Returns the Sampler bound to the calling thread, or None.
+    """
+    return getattr(__context, "sampler", None)
+
+
+def current_sampler() -> Sampler:
+    """
+    Returns the Sampler the module-level functions draw from on the calling thread.
+    """
+    return context_sampler() or default_sampler()
+
+
+def bind(sampler: Union[Sampler, None]) -> None:
+    """
+    Binds a Sampler to the calling thread (None to unbind). The module-level functions called on this thread draw
+    from it instead of the default Sampler.
+    """
+    __context.sampler = sampler
+
+
+@contextmanager
+def bound(sampler: Union[Sampler, None]):
+    """
+    Binds a Sampler to the calling thread for the duration of a with-block.
+    """
+    previous = context_sampler()
+    bind(sampler)
+    try:
+        yield sampler
+    finally:
+        bind(previous)
+
+
+@lru_cache(maxsize=1024)
+def __date_seeds(seed: int, count: int) -> Tuple[Tuple[float, float], ...]:
+    """
+    Returns the first `count` seeds for a numeric seed. Uses a private Random instance so that the global
+    `random` state is never touched.
+    """
+    rand = random.Random(seed)
+    return tuple((rand.uniform(0.000, 1.000), rand.uniform(0.000, 1.000)) for _ in range(count))
+
+
 def random_seeds(mod: int = 0, start: int = 8, stop: int = 12):
     """
     Generates a set of random seeds.
@@ -19,10 +321,10 @@ def random_seeds(mod: int = 0, start: int = 8, stop: int = 12):
     Returns:
         A list of random seeds.
     """
-    sg = secrets.SystemRandom()
     date = int(datetime.now().strftime("%Y%m%d"))
-    random.seed(date + mod)
-    return [[random.uniform(0.000, 1.000), random.uniform(0.000, 1.000)] for _ in range(sg.randrange(start, stop))]
+    # Seeds for a given date and mod are deterministic, so a shorter list is a prefix of the longest one
+    seeds = __date_seeds(date + mod, stop - 1)
+    return [list(seed) for seed in seeds[: current_sampler().randrange(start, stop)]]
 
 
 def random_point_in(x_min, y_min, width, height, seeds: List[List[int]]) -> List[int]:
@@ -37,69 +339,7 @@ def random_point_in(x_min, y_min, width, height, seeds: List[List[int]]) -> List
     Returns:
         A random [x, y] coordinate within the bounding box.
     """
-    sg = secrets.SystemRandom()
-
-    if sg.randrange(0, 101) > 75:
-        # Generate a random pixel within the full bounding box.
-        return __random_from(x_min, y_min, width, height)
-
-    # Calculate the dimensions and position of an inner bounding box within the full bounding box.
-    offset_percentage = sg.uniform(0.150, 0.350)
-    inner_x_min = round(width * offset_percentage + x_min)
-    inner_y_min = round(height * offset_percentage + y_min)
-    inner_width = round(width * (1.000 - (offset_percentage * 2)))
-    inner_height = round(height * (1.000 - (offset_percentage * 2)))
-
-    # Select a random seed from the list of seeds.
-    random_index = sg.randrange(0, len(seeds))
-    ratio_x = round(inner_width * seeds[random_index][0])
-    ratio_y = round(inner_height * seeds[random_index][1])
-
-    # Calculate the dimensions and position of a bounding box within the inner bounding box.
-    start_x, start_y = inner_x_min + ratio_x, inner_y_min + ratio_y
-    start_fix_width, end_fix_width = start_x - x_min, width - ratio_x
-    start_fix_height, end_fix_height = start_y - y_min, height - ratio_y
-
-    # Determine the dimensions of the bounding box within the inner bounding box.
-    inner_inner_width = start_fix_width if start_fix_width <= end_fix_width else end_fix_width
-    inner_inner_height = start_fix_height if start_fix_height <= end_fix_height else end_fix_height
-
-    # Generate a random pixel within the bounding box within the inner bounding box.
-    return __random_from(start_x, start_y, inner_inner_width, inner_inner_height, centered=False)
-
-
-def __random_from(x_min, y_min, width, height, centered: bool = True) -> List[int]:
-    """
-    Helper function to generate a random pixel within some bounding box. The bounding box can be
-    centered on the x_min and y_min coordinates, or the bounding box can be offset from the x_min
-    and y_min coordinates (i.e., x_min and y_min are the top-left corner of the bounding
-    box).
-    Args:
-        x_min: The left-most coordinate of the bounding box.
-        y_min: The top-most coordinate of the bounding box.
-        width: The width of the bounding box.
-        height: The height of the bounding box.
-        centered: Whether or not the bounding box is centered on the x_min and y_min coordinates.
-    """
-    if centered:
-        # The bounding box to search is to be centered on the x_min and y_min coordinates
-        x_min = x_min + math.ceil(width / 2)
-        y_min = y_min + math.ceil(height / 2)
-
-    # Calculate the minimum and maximum values for x and y within the region
-    x_min_bound = x_min - math.ceil(width / 2)
-    x_max_bound = x_min + math.ceil(width / 2)
-    y_min_bound = y_min - math.ceil(height / 2)
-    y_max_bound = y_min + math.ceil(height / 2)
-
-    # Calculate the standard deviation for x and y based on the region's dimensions
-    sigma_x = (width / 2) * 0.33
-    sigma_y = (height / 2) * 0.33
-
-    # Generate a random x and y value within the region using truncated normal sampling
-    x = int(truncated_normal_sample(x_min_bound, x_max_bound, x_min, sigma_x))
-    y = int(truncated_normal_sample(y_min_bound, y_max_bound, y_min, sigma_y))
-    return [x, y]
+    return current_sampler().point_in(x_min, y_min, width, height, seeds)
 
 
 def truncated_normal_sample(lower_bound, upper_bound, mean=None, std=None) -> float:
@@ -115,23 +355,7 @@ def truncated_normal_sample(lower_bound, upper_bound, mean=None, std=None) -> fl
     Examples:
         100,000 x `truncated_normal_sample(0, 100)` graphed: https://i.imgur.com/8W12RZX.png
     """
-    if mean is None:
-        mean = (lower_bound + upper_bound) / 2
-    if std is None:
-        std = (upper_bound - lower_bound) / 9
-    # Keep generating samples until we get one that falls within the specified bounds
-    while True:
-        # Generate two independent standard normal samples
-        x1, x2 = np.random.normal(0, 1), np.random.normal(0, 1)
-        z = x1**2 + x2**2
-        if z >= 0 and z <= 1:
-            # Use the Box-Muller transform to generate a sample from the normal distribution
-            sample = mean + std * x1 * np.sqrt(-2 * np.log(z) / z)
-            if sample < lower_bound:
-                continue
-            if sample > upper_bound:
-                continue
-            return sample
+    return current_sampler().truncated_normal(lower_bound, upper_bound, mean, std)
 
 
 def fancy_normal_sample(lower_bound, upper_bound) -> float:
@@ -147,15 +371,7 @@ def fancy_normal_sample(lower_bound, upper_bound) -> float:
     Examples:
         100,000 x `truncated_normal_sample(0, 100)` graphed: https://i.imgur.com/XP4Loff.png
     """
-    # Default will be two means, one at 1/3rd and one at 2/3 of the range
-    means = [lower_bound + (upper_bound - lower_bound) * 0.33, lower_bound + (upper_bound - lower_bound) * 0.66]
-    # Generate probabilities for each mean proportional to the index
-    p = [(i + 1) ** 2 / sum((i + 1) ** 2 for i in range(len(means))) for i in range(len(means))][::-1]
-    # Select a mean from the list with a probability proportional to the index
-    index = np.random.choice(range(len(means)), p=p)
-    mean = means[index]
-    # Retrieve a sample from the truncated normal distribution
-    return truncated_normal_sample(lower_bound, upper_bound, mean=mean)
+    return current_sampler().fancy_normal(lower_bound, upper_bound)
 
 
 def chisquared_sample(df: int, min: float = 0, max: float = np.inf) -> float:
@@ -174,12 +390,7 @@ def chisquared_sample(df: int, min: float = 0, max: float = np.inf) -> float:
         - Minimum = 3.636904524316633
         - Graphed: https://i.imgur.com/9re2ezf.png
     """
-    if max is None:
-        max = np.inf
-    while True:
-        x = np.random.chisquare(df)
-        if x >= min and x <= max:
-            return x
+    return current_sampler().chisquare(df, min, max)
 
 
 def random_chance(probability: float) -> bool:
@@ -195,7 +406,7 @@ def random_chance(probability: float) -> bool:
         raise TypeError("Probability must be a float")
     if probability < 0.000 or probability > 1.000:
         raise ValueError("Probability must be between 0 and 1")
-    return secrets.SystemRandom().random() < probability
+    return current_sampler().chance(probability)
 
 
 if __name__ == "__main__":
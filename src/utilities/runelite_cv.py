@@ -10,9 +10,11 @@ from typing import List
 import cv2
 import numpy as np
 
+import utilities.tracing as tracing
 from utilities.geometry import Point, RuneLiteObject
 
 
+@tracing.traced("extract_objects")
 def extract_objects(image: cv2.Mat) -> List[RuneLiteObject]:
     """
     Given an image of enclosed outlines, this function will extract information
@@ -0,0 +1,106 @@
+"""
+Draws synthetic client frames: the UI templates, item sprites, tag outlines and text that the computer vision and OCR
+look for, drawn exactly the way they are matched. Used by the benchmark fixtures (benchmark.py) and the simulated
+world (simulator.py), whose ground truth follows from what was drawn.
+"""
+from typing import Dict, List, Tuple, Union
+
+import cv2
+import numpy as np
+
+import utilities.color as clr
+import utilities.imagesearch as imsearch
+
+Box = List[int]  # [left, top, width, height]
+
+# Background noise stays below every tag, text and HUD color range
+NOISE_RANGE = (20, 76)
+
+
+def bgr(color: clr.Color) -> Tuple[int, int, int]:
+    """
+    Returns the pixel value to draw a color with (the lower bound of its range).
+    """
+    return tuple(int(v) for v in color.lower)
+
+
+def load_sprite(path: str) -> np.ndarray:
+    """
+    Loads an image relative to images/bot (E.g., "items/Logs.png"), keeping its alpha channel.
+    """
+    return cv2.imread(str(imsearch.BOT_IMAGES.joinpath(path)), cv2.IMREAD_UNCHANGED)
+
+
+def paste(frame: np.ndarray, sprite: np.ndarray, x: int, y: int) -> Box:
+    """
+    Draws a sprite's opaque pixels onto a frame.
+    Returns:
+        The sprite's box in frame coordinates.
+    """
+    h, w = sprite.shape[:2]
+    region = frame[y : y + h, x : x + w]
+    if sprite.ndim == 3 and sprite.shape[2] == 4:
+        opaque = sprite[:, :, 3] > 0
+        region[opaque] = sprite[:, :, :3][opaque]
+    else:
+        region[:] = sprite[:, :, :3]
+    return [x, y, w, h]
+
+
+def text_width(text: str, font: dict) -> int:
+    """
+    Returns the width of text drawn with draw_text().
+    """
+    return sum(font[char].shape[1] for char in text)
+
+
+def draw_text(frame: np.ndarray, text: str, font: dict, x: int, y: int, color: Union[clr.Color, Tuple[int, int, int]]) -> Box:
+    """
+    Draws text with a font's glyphs (as used by the OCR).
+    Args:
+        frame: The frame to draw on.
+        text: The text. Every character must be in the font.
+        font: An OCR font (E.g., ocr.BOLD_12).
+        x, y: The top-left corner of the text.
+        color: A clr.Color or a BGR tuple.
+    Returns:
+        The text's box in frame coordinates.
+    """
+    value = bgr(color) if isinstance(color, clr.Color) else color
+    left = x
+    height = 0
+    for char in text:
+        glyph = font[char]
+        h, w = glyph.shape[:2]
+        frame[y : y + h, x : x + w][glyph > 127] = value
+        x += w
+        height = max(height, h)
+    return [left, y, x - left, height]
+
+
+def draw_tag(frame: np.ndarray, box: Box, color: clr.Color, thickness: int = 2) -> None:
+    """
+    Draws a RuneLite-style outline (tag) around a box.
+    """
+    x, y, w, h = box
+    cv2.rectangle(frame, (x, y), (x + w, y + h), bgr(color), thickness)
+
+
+def client_frame(width: int, height: int, seed: int = 0) -> Tuple[np.ndarray, Dict[str, Box]]:
+    """
+    Builds a resizable-mode client frame: a noisy background with the minimap, chatbox and control panel drawn in
+    their usual corners, where Window.initialize() will find them.
+    Args:
+        width, height: The client size. At least 760x510, so the anchors do not overlap.
+        seed: Seeds the background noise.
+    Returns:
+        The frame (BGR) and the box of each anchor ("minimap_area", "chat", "control_panel"), in frame coordinates.
+    """
+    frame = np.random.default_rng(seed).integers(*NOISE_RANGE, (height, width, 3), dtype=np.uint8)
+    minimap, chat, inventory = (load_sprite(f"ui_templates/{name}.png") for name in ("minimap", "chat", "inv"))
+    anchors = {
+        "minimap_area": paste(frame, minimap, width - minimap.shape[1], 0),
+        "chat": paste(frame, chat, 0, height - chat.shape[0]),
+        "control_panel": paste(frame, inventory, width - inventory.shape[1], height - inventory.shape[0]),
+    }
+    return frame, anchors
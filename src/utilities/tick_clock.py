@@ -0,0 +1,180 @@
+"""
+A clock synchronized to the game server's ticks.
+
+The game only processes input once per tick (~0.6 seconds). An action sent just after a tick boundary waits
+almost a full tick before it takes effect, so fixed sleeps (E.g., `time.sleep(0.6)`) waste time whenever they
+are out of phase with the server. The TickClock estimates the phase of the server's ticks from observed changes
+in the tick counter reported by the RuneLite plugins, and schedules work relative to tick boundaries.
+
+Every observed change narrows down the window in which a boundary happened (between the last poll that saw
+the old tick and the first poll that saw the new one). The windows of successive ticks are intersected, so the
+estimate becomes more precise over time. If server lag makes the windows inconsistent, the estimate restarts
+from the most recent window.
+
+Example:
+    >>> clock = TickClock(MorgHTTPSocket(ttl=0).get_game_tick)
+    >>> clock.start()
+    >>> clock.at_tick_offset(50)  # act 50ms into the next tick
+    >>> self.mouse.click()
+"""
+import threading
+import time
+from typing import Callable, Tuple
+
+GAME_TICK = 0.6  # seconds
+
+
+class TickClock:
+    def __init__(self, tick_source: Callable[[], int] = None, tick_length: float = GAME_TICK, poll_interval: float = 0.02):
+        """
+        Args:
+            tick_source: A function returning the current game tick number (E.g., MorgHTTPSocket.get_game_tick
+                         with ttl=0, or StatusSocket.get_game_tick). Optional if ticks are fed with observe().
+            tick_length: The nominal length of a tick in seconds.
+            poll_interval: The number of seconds between polls of `tick_source`. Smaller values give a more
+                           precise phase estimate sooner.
+        """
+        self.tick_source = tick_source
+        self.tick_length = tick_length
+        self.poll_interval = poll_interval
+        self._lock = threading.Lock()
+        self._last: Tuple[int, float] = None  # (tick, time) of the latest observation
+        self._anchor: Tuple[int, float, float] = None  # (tick, earliest boundary, latest boundary)
+        self._stop = threading.Event()
+        self._thread = None
+
+    def start(self) -> None:
+        """
+        Starts polling `tick_source` on a daemon thread.
+        """
+        if self.tick_source is None:
+            raise ValueError("TickClock needs a tick_source to poll. Otherwise, feed ticks with observe().")
+        if self._thread is not None and self._thread.is_alive():
+            return
+        self._stop.clear()
+        self._thread = threading.Thread(target=self.__poll, name="TickClock", daemon=True)
+        self._thread.start()
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def __poll(self) -> None:
+        failing = False
+        while not self._stop.is_set():
+            try:
+                tick = self.tick_source()
+            except Exception as e:
+                if not failing:
+                    print(f"TickClock failed to read the game tick: {e}")
+                tick = -1
+            failing = tick == -1
+            if not failing:
+                self.observe(tick)
+            # Back off to once a tick while the source is unavailable (E.g., the plugin is not running)
+            self._stop.wait(self.tick_length if failing else self.poll_interval)
+
+    def observe(self, tick: int, timestamp: float = None) -> None:
+        """
+        Records the tick number seen at a point in time. Call this with every fresh reading of the tick counter
+        (E.g., from a GameStateService TickAdvanced subscription) if the clock is not polling itself.
+        Args:
+            tick: The game tick number.
+            timestamp: When the tick number was read (default: now).
+        """
+        now = time.time() if timestamp is None else timestamp
+        with self._lock:
+            last = self._last
+            self._last = (tick, now)
+            if last is None or tick <= last[0]:
+                return
+            # The boundary into `tick` happened after the previous reading, and no later than this one
+            earliest, latest = last[1], now
+            if self._anchor is not None:
+                anchor_tick, anchor_earliest, anchor_latest = self._anchor
+                shift = (tick - anchor_tick) * self.tick_length
+                earliest, latest = max(earliest, anchor_earliest + shift), min(latest, anchor_latest + shift)
+                if earliest > latest:  # inconsistent with earlier ticks (E.g., server lag); start over
+                    earliest, latest = last[1], now
+            self._anchor = (tick, earliest, latest)
+
+    @property
+    def synced(self) -> bool:
+        """
+        Whether at least one tick boundary has been observed.
+        """
+        return self._anchor is not None
+
+    def precision(self) -> float:
+        """
+        Returns the width (in seconds) of the window the current tick boundary estimate lies in, or the tick
+        length if the clock is not synced yet.
+        """
+        if self._anchor is None:
+            return self.tick_length
+        return self._anchor[2] - self._anchor[1]
+
+    def current_tick(self) -> int:
+        """
+        Returns the estimated current tick number, or -1 if the clock is not synced.
+        """
+        if self._anchor is None:
+            return -1
+        anchor_tick, earliest, latest = self._anchor
+        return anchor_tick + int((time.time() - (earliest + latest) / 2) // self.tick_length)
+
+    def next_tick_time(self, offset: float = 0) -> float:
+        """
+        Returns the time (as in time.time()) of the next estimated tick boundary, plus an offset.
+        Args:
+            offset: Seconds after the boundary.
+        Returns:
+            The timestamp. If the clock is not synced, one tick length from now, by which a boundary has surely
+            passed.
+        """
+        now = time.time()
+        if self._anchor is None:
+            return now + self.tick_length
+        _, earliest, latest = self._anchor
+        boundary = (earliest + latest) / 2
+        ticks_ahead = (now - offset - boundary) // self.tick_length + 1
+        return boundary + ticks_ahead * self.tick_length + offset
+
+    def sleep_until_next_tick(self, offset: float = 0) -> None:
+        """
+        Sleeps until the next tick boundary (plus an offset) is estimated to have passed.
+        Args:
+            offset: Seconds after the boundary to wake up at.
+        """
+        time.sleep(max(0, self.next_tick_time(offset) - time.time()))
+
+    def at_tick_offset(self, ms: float, ticks: int = 1) -> None:
+        """
+        Sleeps until a given number of milliseconds into an upcoming tick.
+        Args:
+            ms: Milliseconds after the tick boundary.
+            ticks: Which upcoming tick to wait for (1 = the next one).
+        """
+        self.sleep_until_next_tick(ms / 1000)
+        if ticks > 1:
+            time.sleep((ticks - 1) * self.tick_length)
+
+    def every_n_ticks(self, n: int, callback: Callable[[], None], offset_ms: float = 0) -> Callable[[], None]:
+        """
+        Calls a function on a daemon thread every `n` ticks, at a fixed offset into the tick.
+        Args:
+            n: The number of ticks between calls.
+            callback: The function to call.
+            offset_ms: Milliseconds after the tick boundary to call the function at.
+        Returns:
+            A function that stops the schedule.
+        """
+        stopped = threading.Event()
+
+        def run():
+            while not stopped.is_set():
+                self.at_tick_offset(offset_ms, n)
+                if not stopped.is_set():
+                    callback()
+
+        threading.Thread(target=run, name="TickClock-schedule", daemon=True).start()
+        return stopped.set
@@ -0,0 +1,279 @@
+"""
+Low-overhead tracing of where a bot's time goes.
+
+Hot paths are wrapped in named spans: screen capture, color isolation, contour extraction, OCR, template search,
+mouse movements, clicks and sleeps, plus each main loop iteration of a bot. Tracing is off by default, in which case
+a traced function only costs a flag check. Once enabled, every span is recorded with its thread, start time and
+duration, and its duration is added to a per-span histogram (the same HDR-style LatencyHistogram the metrics module uses).
+
+Recorded spans can be exported as Chrome trace JSON, which can be opened in chrome://tracing or https://ui.perfetto.dev
+to see each bot thread's timeline (E.g., whether a slow iteration was spent on CV, input or sleeping).
+
+Example:
+    >>> tracing.enable()
+    >>> ...  # run the bot for a while
+    >>> print(tracing.summary())
+    >>> tracing.export_chrome_trace("trace.json")
+
+Functions are traced with the traced() decorator, and blocks of code with span():
+    >>> @tracing.traced("find_fish")
+    >>> def find_fish(self): ...
+    >>> with tracing.span("bank", items=28):
+    >>>     ...
+"""
+import copy
+import functools
+import os
+import threading
+import time
+from collections import deque
+from pathlib import Path
+from typing import Callable, Dict, List, NamedTuple, Union
+
+import simplejson as JSON
+
+from utilities.metrics import LatencyHistogram
+
+
+class Span(NamedTuple):
+    name: str
+    thread: int
+    start_ns: int
+    duration_ns: int
+    args: dict
+
+
+class _NullSpan:
+    """
+    The span returned by span() while tracing is off.
+    """
+
+    __slots__ = ()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *exc):
+        return False
+
+
+class _ActiveSpan:
+    __slots__ = ("name", "args", "start_ns")
+
+    def __init__(self, name: str, args: dict):
+        self.name = name
+        self.args = args
+
+    def __enter__(self):
+        self.start_ns = time.perf_counter_ns()
+        return self
+
+    def __exit__(self, *exc):
+        record(self.name, self.start_ns, time.perf_counter_ns(), **self.args)
+        return False
+
+
+class _State:
+    enabled = False
+
+
+__state = _State()
+__null_span = _NullSpan()
+__lock = threading.Lock()
+__spans: deque = deque(maxlen=200_000)
+__histograms: Dict[str, LatencyHistogram] = {}
+__thread_names: Dict[int, str] = {}
+__replaced_sleep = None  # the time.sleep that enable(trace_sleep=True) replaced, if it is still replaced
+
+
+def _state() -> _State:
+    return __state
+
+
+def is_enabled() -> bool:
+    return __state.enabled
+
+
+def enable(capacity: int = 200_000, trace_sleep: bool = False) -> None:
+    """
+    Starts recording spans. Previously recorded spans and histograms are kept (see reset()).
+    Args:
+        capacity: The number of most recent spans to keep for export. Histograms count every span regardless.
+        trace_sleep: Whether to record every time.sleep() call as a "sleep" span, including the ones in bot scripts.
+                     This wraps whatever time.sleep currently is (E.g., a simulator's VirtualClock) until disable().
+    """
+    global __spans
+    with __lock:
+        if __spans.maxlen != capacity:
+            __spans = deque(__spans, maxlen=capacity)
+    if trace_sleep:
+        __trace_sleep()
+    else:
+        __untrace_sleep()
+    __state.enabled = True
+
+
+def disable() -> None:
+    """
+    Stops recording spans. Recorded spans and histograms are kept until reset().
+    """
+    __state.enabled = False
+    __untrace_sleep()
+
+
+def __trace_sleep() -> None:
+    global __replaced_sleep
+    if time.sleep is not _traced_sleep:
+        __replaced_sleep = time.sleep
+        time.sleep = _traced_sleep
+
+
+def __untrace_sleep() -> None:
+    """
+    Puts back the time.sleep that __trace_sleep() replaced. If time.sleep was replaced again since (and not restored),
+    it is left alone rather than clobbering the newer replacement.
+    """
+    global __replaced_sleep
+    if __replaced_sleep is not None and time.sleep is _traced_sleep:
+        time.sleep = __replaced_sleep
+    __replaced_sleep = None
+
+
+def reset() -> None:
+    """
+    Discards all recorded spans and histograms.
+    """
+    with __lock:
+        __spans.clear()
+        __histograms.clear()
+
+
+def now_ns() -> int:
+    """
+    Returns the clock used for span timestamps, in nanoseconds.
+    """
+    return time.perf_counter_ns()
+
+
+def record(name: str, start_ns: int, end_ns: int, **args) -> None:
+    """
+    Records a span that was timed by hand (with now_ns()). Does nothing while tracing is off.
+    """
+    if not __state.enabled:
+        return
+    thread = threading.get_ident()
+    duration = end_ns - start_ns
+    with __lock:
+        __spans.append(Span(name, thread, start_ns, duration, args))
+        if name not in __histograms:
+            __histograms[name] = LatencyHistogram()
+        __histograms[name].observe(duration / 1e9)
+        if thread not in __thread_names:
+            __thread_names[thread] = threading.current_thread().name
+
+
+def span(name: str, **args) -> Union[_ActiveSpan, _NullSpan]:
+    """
+    Times a block of code:
+        >>> with tracing.span("capture"):
+        >>>     ...
+    Args:
+        name: The span's name. Spans of the same name share a histogram.
+        args: Extra values to show with the span in the trace viewer.
+    """
+    if not __state.enabled:
+        return __null_span
+    return _ActiveSpan(name, args)
+
+
+def traced(name: str = None) -> Callable[[Callable], Callable]:
+    """
+    A decorator that records each call of a function as a span. While tracing is off, it only adds a flag check.
+    Args:
+        name: The span's name. Defaults to the function's qualified name.
+    """
+
+    def decorator(func: Callable) -> Callable:
+        span_name = name or func.__qualname__
+        state = _state()
+
+        @functools.wraps(func)
+        def wrapper(*args, **kwargs):
+            if not state.enabled:
+                return func(*args, **kwargs)
+            start = time.perf_counter_ns()
+            try:
+                return func(*args, **kwargs)
+            finally:
+                record(span_name, start, time.perf_counter_ns())
+
+        return wrapper
+
+    return decorator
+
+
+def _traced_sleep(seconds: float) -> None:
+    start = time.perf_counter_ns()
+    try:
+        (__replaced_sleep or time.sleep)(seconds)
+    finally:
+        record("sleep", start, time.perf_counter_ns())
+
+
+def sleep(seconds: float) -> None:
+    """
+    Sleeps, recording a "sleep" span even when time.sleep is not being traced.
+    """
+    _traced_sleep(seconds)
+
+
+def spans() -> List[Span]:
+    """
+    Returns the recorded spans (at most the last `capacity`), oldest first.
+    """
+    with __lock:
+        return list(__spans)
+
+
+def histograms() -> Dict[str, LatencyHistogram]:
+    """
+    Returns a snapshot of the duration histogram (in seconds) of each span name.
+    """
+    with __lock:
+        return {name: copy.deepcopy(hist) for name, hist in __histograms.items()}
+
+
+def summary() -> str:
+    """
+    Formats the histograms as a table, sorted by total time spent in each span.
+    """
+    rows = sorted(histograms().items(), key=lambda item: item[1].sum, reverse=True)
+    lines = [f"{'span':<24}{'count':>8}{'total ms':>12}{'mean ms':>10}{'p50 ms':>10}{'p95 ms':>10}{'p99 ms':>10}{'max ms':>10}"]
+    for name, hist in rows:
+        ms = [v * 1e3 for v in (hist.sum, hist.sum / hist.count, hist.percentile(50), hist.percentile(95), hist.percentile(99), hist.max)]
+        lines.append(f"{name:<24}{hist.count:>8}{ms[0]:>12.1f}{ms[1]:>10.3f}{ms[2]:>10.3f}{ms[3]:>10.3f}{ms[4]:>10.3f}{ms[5]:>10.3f}")
+    return "\n".join(lines)
+
+
+def chrome_trace() -> dict:
+    """
+    Builds a Chrome trace (Trace Event Format) of the recorded spans, with one track per thread.
+    """
+    pid = os.getpid()
+    recorded = spans()
+    with __lock:
+        names = dict(__thread_names)
+    events = [{"name": "thread_name", "ph": "M", "pid": pid, "tid": tid, "args": {"name": tname}} for tid, tname in names.items()]
+    events.extend(
+        {"name": s.name, "cat": s.name.split(".")[0], "ph": "X", "ts": s.start_ns / 1000, "dur": s.duration_ns / 1000, "pid": pid, "tid": s.thread, "args": s.args}
+        for s in recorded
+    )
+    return {"traceEvents": events, "displayTimeUnit": "ms"}
+
+
+def export_chrome_trace(path: Union[str, Path]) -> None:
+    """
+    Writes the recorded spans to a Chrome trace JSON file.
+    """
+    with open(path, "w") as f:
+        JSON.dump(chrome_trace(), f, default=str)
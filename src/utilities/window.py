@@ -7,15 +7,21 @@ matter where the game client is positioned. This class can be extended to add mo
 At the moment, it only works for 2007-style interfaces. In the future, to accomodate other interface
 styles, this class should be abstracted, then extended for each interface style.
 """
+import copy
+import threading
 import time
-from typing import List
+from typing import Callable, Dict, List
 
 import pywinctl
 from deprecated import deprecated
 
 import utilities.debug as debug
 import utilities.imagesearch as imsearch
-from utilities.geometry import Point, Rectangle
+import utilities.layout_cache as lc
+import utilities.metrics as metrics
+from utilities.geometry import Point, Rectangle, SlotGrid
+
+UI_TEMPLATES = imsearch.BOT_IMAGES.joinpath("ui_templates")
 
 
 class WindowInitializationError(Exception):
@@ -38,9 +44,9 @@ class Window:
     # CP Area
     control_panel: Rectangle = None  # https://i.imgur.com/BeMFCIe.png
     cp_tabs: List[Rectangle] = []  # https://i.imgur.com/huwNOWa.png
-    inventory_slots: List[Rectangle] = []  # https://i.imgur.com/gBwhAwE.png
-    spellbook_normal: List[Rectangle] = []  # https://i.imgur.com/vkKAfV5.png
-    prayers: List[Rectangle] = []  # https://i.imgur.com/KRmC3YB.png
+    inventory_slots: SlotGrid = SlotGrid(0, 0, 0, 0, cols=0, rows=0)  # https://i.imgur.com/gBwhAwE.png
+    spellbook_normal: SlotGrid = SlotGrid(0, 0, 0, 0, cols=0, rows=0)  # https://i.imgur.com/vkKAfV5.png
+    prayers: SlotGrid = SlotGrid(0, 0, 0, 0, cols=0, rows=0)  # https://i.imgur.com/KRmC3YB.png
 
     # Chat Area
     chat: Rectangle = None  # https://i.imgur.com/u544ouI.png
@@ -64,7 +70,7 @@ class Window:
     info_panel: Rectangle = None
     total_xp: Rectangle = None
 
-    bank_slots: List[Rectangle] = []  # List of rectangles for each bank slot
+    bank_slots: SlotGrid = SlotGrid(0, 0, 0, 0, cols=0, rows=0)  # Grid of rectangles for each bank slot
 
     def __init__(self, window_title: str, padding_top: int, padding_left: int) -> None:
         """
@@ -77,13 +83,24 @@ class Window:
         self.window_title = window_title
         self.padding_top = padding_top
         self.padding_left = padding_left
+        self.layout_cache = lc.default_cache()
+        self.layout_stale = False  # set when the client is resized after the UI regions were located
+        self._client = None
+        self._geometry: Rectangle = None
+        self._geometry_listeners: List[Callable[[Rectangle, Rectangle], None]] = []
+        self._watcher: threading.Thread = None
+        self._watcher_stop = threading.Event()
 
     def _get_window(self):
-        self._client = pywinctl.getWindowsWithTitle(self.window_title)
-        if self._client:
-            return self._client[0]
-        else:
-            raise WindowInitializationError("No client window found.")
+        # Enumerating every desktop window is slow, so the handle is kept until its window closes
+        client = self._client
+        if client is not None and getattr(client, "isAlive", True):
+            return client
+        if clients := pywinctl.getWindowsWithTitle(self.window_title):
+            self._client = clients[0]
+            return self._client
+        self._client = None
+        raise WindowInitializationError("No client window found.")
 
     window = property(
         fget=_get_window,
@@ -124,24 +141,198 @@ class Window:
         if client := self.window:
             client.size = (width, height)
 
-    def initialize(self):
+    def translate(self, dx: int, dy: int) -> None:
+        """
+        Moves every located UI region (game_view, inventory_slots, bank_slots, etc.) by an offset. Each region is
+        replaced by a moved copy rather than updated in place, so a thread reading a region while the window moves
+        sees either its old or its new position, never a mix of both. References held elsewhere (E.g., an object's
+        rectangle reference) keep the old position.
+        Args:
+            dx: The horizontal offset in pixels.
+            dy: The vertical offset in pixels.
+        """
+        moved: Dict[int, object] = {}  # keeps regions shared by several attributes shared
+
+        def move(value):
+            if id(value) not in moved:
+                if isinstance(value, SlotGrid):
+                    moved[id(value)] = value.translated(dx, dy)
+                else:
+                    rect = moved[id(value)] = copy.copy(value)
+                    rect.left, rect.top = value.left + dx, value.top + dy
+            return moved[id(value)]
+
+        for name, value in list(vars(self).items()):
+            if name.startswith("_"):
+                continue
+            if isinstance(value, (Rectangle, SlotGrid)):
+                setattr(self, name, move(value))
+            elif isinstance(value, list) and any(isinstance(rect, Rectangle) for rect in value):
+                setattr(self, name, [move(rect) if isinstance(rect, Rectangle) else rect for rect in value])
+
+    def add_geometry_listener(self, callback: Callable[[Rectangle, Rectangle], None]) -> Callable[[], None]:
+        """
+        Registers a function to call when the client window moves or is resized.
+        Args:
+            callback: Called with the old and new client Rectangles, after the UI regions have been translated.
+        Returns:
+            A function that removes the listener.
+        """
+        self._geometry_listeners.append(callback)
+        return lambda: self._geometry_listeners.remove(callback) if callback in self._geometry_listeners else None
+
+    def check_geometry(self) -> bool:
+        """
+        Compares the client window's geometry to the last known one. If the window moved, all located UI regions
+        are translated by the same offset. If it was resized, the regions can no longer be derived by an offset,
+        so `layout_stale` is set and the UI is located again (see relocate()). If that fails (E.g., the client is
+        still being resized), it is retried on every check until it succeeds.
+        Returns:
+            True if the geometry changed, False otherwise.
+        """
+        client = self.window
+        if client is None or getattr(client, "isMinimized", False):
+            return False
+        new = Rectangle(client.left, client.top, client.width, client.height)
+        old, self._geometry = self._geometry, new
+        changed = old is not None and (old.left, old.top, old.width, old.height) != (new.left, new.top, new.width, new.height)
+        if changed:
+            if (old.width, old.height) == (new.width, new.height):
+                self.translate(new.left - old.left, new.top - old.top)
+            else:
+                self.layout_stale = True
+        if self.layout_stale:
+            try:
+                self.relocate()
+                print("Window.check_geometry(): The client was resized. The UI was located again.")
+            except WindowInitializationError as e:
+                if changed:
+                    print(f"Window.check_geometry(): The client was resized, and the UI could not be located again yet: {e}")
+        if not changed:
+            return False
+        for callback in list(self._geometry_listeners):
+            callback(old, new)
+        return True
+
+    def relocate(self) -> None:
+        """
+        Locates the UI regions again without disturbing threads that are reading them. initialize() runs on a
+        shallow copy of this window, and the copy's regions are then swapped in with a single dict update, so a
+        reader sees either the old layout or the new one, never a mix of both.
+        Raises:
+            WindowInitializationError: If the UI could not be located. The current regions are kept.
+        """
+        fresh = copy.copy(self)
+        fresh.initialize()
+        vars(self).update({name: value for name, value in vars(fresh).items() if not name.startswith("_watcher")})
+
+    def watch_geometry(self, interval: float = 0.25) -> None:
+        """
+        Starts a daemon thread that calls check_geometry() periodically, so that the located UI regions follow
+        the client window when it is moved. Calling this again while the watcher is running has no effect.
+        Args:
+            interval: The number of seconds between checks.
+        """
+        if self._watcher is not None and self._watcher.is_alive():
+            return
+        self._watcher_stop.clear()
+        self._watcher = threading.Thread(target=self.__watch, args=(interval,), name=f"Window-{self.window_title}", daemon=True)
+        self._watcher.start()
+
+    def stop_watching_geometry(self) -> None:
+        """
+        Stops the thread started by watch_geometry().
+        """
+        self._watcher_stop.set()
+
+    def __watch(self, interval: float) -> None:
+        while not self._watcher_stop.wait(interval):
+            try:
+                self.check_geometry()
+            except WindowInitializationError:
+                continue  # the client closed; keep watching in case it is reopened
+
+    def initialize(self, use_cache: bool = True):
         """
         Initializes the client window by locating critical UI regions.
         This function should be called when the bot is started or resumed (done by default).
+        Args:
+            use_cache: Whether to try the cached layout of this window before searching for the UI regions. The
+                       cached layout is only used if a pixel-probe check confirms it still matches the client.
         Returns:
             True if successful, False otherwise along with an error message.
         """
         start_time = time.time()
         client_rect = self.rectangle()
+        restored = use_cache and self.__restore_layout(client_rect)
+        if use_cache:
+            metrics.cache_result("layout", restored)
+        if restored:
+            self.__reset_geometry(client_rect)
+            print(f"Window.initialize() restored the cached layout in {time.time() - start_time} seconds.")
+            return True
         a = self.__locate_minimap(client_rect)
         b = self.__locate_chat(client_rect)
         c = self.__locate_control_panel(client_rect)
         d = self.__locate_game_view(client_rect)
         if all([a, b, c, d]):  # if all templates found
+            self.__reset_geometry(client_rect)
+            if use_cache:
+                self.__cache_layout(client_rect)
             print(f"Window.initialize() took {time.time() - start_time} seconds.")
             return True
         raise WindowInitializationError()
 
+    def __reset_geometry(self, client_rect: Rectangle) -> None:
+        """
+        Records the client geometry that the UI regions were just located for.
+        """
+        self._geometry = Rectangle(client_rect.left, client_rect.top, client_rect.width, client_rect.height)
+        self.layout_stale = False
+
+    def __anchor_templates(self) -> dict:
+        """
+        Returns the template image of each layout anchor for the current client mode.
+        """
+        return {
+            "minimap_area": UI_TEMPLATES.joinpath("minimap_fixed.png" if self.client_fixed else "minimap.png"),
+            "chat": UI_TEMPLATES.joinpath("chat.png"),
+            "control_panel": UI_TEMPLATES.joinpath("inv.png"),
+        }
+
+    def __restore_layout(self, client_rect: Rectangle) -> bool:
+        """
+        Restores the UI regions from the layout cache if a cached layout for this window still matches the client.
+        Args:
+            client_rect: The client area.
+        Returns:
+            True if a cached layout was restored, False otherwise.
+        """
+        candidates = self.layout_cache.candidates(self.window_title, client_rect)
+        if not candidates:
+            return False
+        screenshot = client_rect.screenshot()
+        for layout in candidates:
+            if lc.probes_match(screenshot, layout.probes):
+                self.__set_minimap(lc.from_box(layout.anchors["minimap_area"], client_rect), layout.client_fixed)
+                self.__set_chat(lc.from_box(layout.anchors["chat"], client_rect))
+                self.__set_control_panel(lc.from_box(layout.anchors["control_panel"], client_rect))
+                return self.__locate_game_view(client_rect)
+        return False
+
+    def __cache_layout(self, client_rect: Rectangle) -> None:
+        """
+        Saves the located UI regions to the layout cache, along with pixel probes to validate them with later.
+        Args:
+            client_rect: The client area.
+        """
+        screenshot = client_rect.screenshot()
+        anchors, probes = {}, []
+        for name, template in self.__anchor_templates().items():
+            left, top, width, height = anchors[name] = lc.to_box(getattr(self, name), client_rect)
+            probes += lc.record_probes(screenshot, [(left + x, top + y) for x, y in lc.probe_points(template)])
+        self.layout_cache.put(self.window_title, client_rect, lc.Layout(self.client_fixed, anchors, probes))
+
     def __locate_chat(self, client_rect: Rectangle) -> bool:
         """
         Locates the chat area on the client.
@@ -150,18 +341,23 @@ class Window:
         Returns:
             True if successful, False otherwise.
         """
-        if chat := imsearch.search_img_in_rect(imsearch.BOT_IMAGES.joinpath("ui_templates", "chat.png"), client_rect):
-            # Locate chat tabs
-            self.chat_tabs = []
-            x, y = 5, 143
-            for _ in range(7):
-                self.chat_tabs.append(Rectangle(left=x + chat.left, top=y + chat.top, width=52, height=19))
-                x += 62  # btn width is 52px, gap between each is 10px
-            self.chat = chat
+        if chat := imsearch.search_img_in_rect(UI_TEMPLATES.joinpath("chat.png"), client_rect):
+            self.__set_chat(chat)
             return True
         print("Window.__locate_chat(): Failed to find chatbox.")
         return False
 
+    def __set_chat(self, chat: Rectangle) -> None:
+        """
+        Sets the chat area and the chat tabs relative to it.
+        """
+        self.chat_tabs = []
+        x, y = 5, 143
+        for _ in range(7):
+            self.chat_tabs.append(Rectangle(left=x + chat.left, top=y + chat.top, width=52, height=19))
+            x += 62  # btn width is 52px, gap between each is 10px
+        self.chat = chat
+
     def __locate_control_panel(self, client_rect: Rectangle) -> bool:
         """
         Locates the control panel area on the client.
@@ -170,16 +366,22 @@ class Window:
         Returns:
             True if successful, False otherwise.
         """
-        if cp := imsearch.search_img_in_rect(imsearch.BOT_IMAGES.joinpath("ui_templates", "inv.png"), client_rect):
-            self.__locate_cp_tabs(cp)
-            self.__locate_inv_slots(cp)
-            self.__locate_prayers(cp)
-            self.__locate_spells(cp)
-            self.control_panel = cp
+        if cp := imsearch.search_img_in_rect(UI_TEMPLATES.joinpath("inv.png"), client_rect):
+            self.__set_control_panel(cp)
             return True
         print("Window.__locate_control_panel(): Failed to find control panel.")
         return False
 
+    def __set_control_panel(self, cp: Rectangle) -> None:
+        """
+        Sets the control panel area and all UI regions relative to it.
+        """
+        self.__locate_cp_tabs(cp)
+        self.__locate_inv_slots(cp)
+        self.__locate_prayers(cp)
+        self.__locate_spells(cp)
+        self.control_panel = cp
+
     def __locate_cp_tabs(self, cp: Rectangle) -> None:
         """
         Creates Rectangles for each interface tab (inventory, prayer, etc.) relative to the control panel, storing it in the class property.
@@ -198,50 +400,31 @@ class Window:
 
     def __locate_inv_slots(self, cp: Rectangle) -> None:
         """
-        Creates Rectangles for each inventory slot relative to the control panel, storing it in the class property.
+        Creates a SlotGrid of the inventory slots relative to the control panel, storing it in the class property.
         """
-        self.inventory_slots = []
         slot_w, slot_h = 36, 32  # dimensions of a slot
         gap_x, gap_y = 6, 4  # pixel gap between slots
-        y = 44 + cp.top  # start y relative to cp template
-        for _ in range(7):
-            x = 40 + cp.left  # start x relative to cp template
-            for _ in range(4):
-                self.inventory_slots.append(Rectangle(left=x, top=y, width=slot_w, height=slot_h))
-                x += slot_w + gap_x
-            y += slot_h + gap_y
+        # start x/y relative to cp template, 4 slots per row, 7 rows
+        self.inventory_slots = SlotGrid(40 + cp.left, 44 + cp.top, slot_w, slot_h, cols=4, rows=7, gap_x=gap_x, gap_y=gap_y)
 
     def __locate_prayers(self, cp: Rectangle) -> None:
         """
-        Creates Rectangles for each prayer in the prayer book menu relative to the control panel, storing it in the class property.
+        Creates a SlotGrid of the prayers in the prayer book menu relative to the control panel, storing it in the class property.
         """
-        self.prayers = []
         slot_w, slot_h = 34, 34  # dimensions of the prayers
         gap_x, gap_y = 3, 3  # pixel gap between prayers
-        y = 46 + cp.top  # start y relative to cp template
-        for _ in range(6):
-            x = 30 + cp.left  # start x relative to cp template
-            for _ in range(5):
-                self.prayers.append(Rectangle(left=x, top=y, width=slot_w, height=slot_h))
-                x += slot_w + gap_x
-            y += slot_h + gap_y
-        del self.prayers[29]  # remove the last prayer (unused)
+        # start x/y relative to cp template, 5 prayers per row, 6 rows; the last cell is unused
+        self.prayers = SlotGrid(30 + cp.left, 46 + cp.top, slot_w, slot_h, cols=5, rows=6, gap_x=gap_x, gap_y=gap_y, count=29)
 
     def __locate_spells(self, cp: Rectangle) -> None:
         """
-        Creates Rectangles for each magic spell relative to the control panel, storing it in the class property.
+        Creates a SlotGrid of the magic spells relative to the control panel, storing it in the class property.
         Currently only populates the normal spellbook spells.
         """
-        self.spellbook_normal = []
         slot_w, slot_h = 22, 22  # dimensions of a spell
         gap_x, gap_y = 4, 2  # pixel gap between spells
-        y = 37 + cp.top  # start y relative to cp template
-        for _ in range(10):
-            x = 30 + cp.left  # start x relative to cp template
-            for _ in range(7):
-                self.spellbook_normal.append(Rectangle(left=x, top=y, width=slot_w, height=slot_h))
-                x += slot_w + gap_x
-            y += slot_h + gap_y
+        # start x/y relative to cp template, 7 spells per row, 10 rows
+        self.spellbook_normal = SlotGrid(30 + cp.left, 37 + cp.top, slot_w, slot_h, cols=7, rows=10, gap_x=gap_x, gap_y=gap_y)
 
     def __locate_game_view(self, client_rect: Rectangle) -> bool:
         """
@@ -293,8 +476,24 @@ class Window:
             True if successful, False otherwise.
         """
         # 'm' refers to minimap area
-        if m := imsearch.search_img_in_rect(imsearch.BOT_IMAGES.joinpath("ui_templates", "minimap.png"), client_rect):
-            self.client_fixed = False
+        if m := imsearch.search_img_in_rect(UI_TEMPLATES.joinpath("minimap.png"), client_rect):
+            self.__set_minimap(m, client_fixed=False)
+            return True
+        if m := imsearch.search_img_in_rect(UI_TEMPLATES.joinpath("minimap_fixed.png"), client_rect):
+            self.__set_minimap(m, client_fixed=True)
+            return True
+        print("Window.__locate_minimap(): Failed to find minimap.")
+        return False
+
+    def __set_minimap(self, m: Rectangle, client_fixed: bool) -> None:
+        """
+        Sets the client mode, the minimap area and all of its internal positions.
+        Args:
+            m: The minimap area.
+            client_fixed: Whether the client is in fixed mode.
+        """
+        self.client_fixed = client_fixed
+        if not client_fixed:
             self.compass_orb = Rectangle(left=40 + m.left, top=7 + m.top, width=24, height=26)
             self.hp_orb_text = Rectangle(left=4 + m.left, top=60 + m.top, width=20, height=13)
             self.minimap = Rectangle(left=52 + m.left, top=5 + m.top, width=154, height=155)
@@ -305,8 +504,7 @@ class Window:
             self.spec_orb = Rectangle(left=62 + m.left, top=144 + m.top, width=18, height=20)
             self.spec_orb_text = Rectangle(left=36 + m.left, top=151 + m.top, width=20, height=13)
             self.total_xp = Rectangle(left=m.left - 147, top=m.top + 4, width=104, height=21)
-        elif m := imsearch.search_img_in_rect(imsearch.BOT_IMAGES.joinpath("ui_templates", "minimap_fixed.png"), client_rect):
-            self.client_fixed = True
+        else:
             self.compass_orb = Rectangle(left=31 + m.left, top=7 + m.top, width=24, height=25)
             self.hp_orb_text = Rectangle(left=4 + m.left, top=55 + m.top, width=20, height=13)
             self.minimap = Rectangle(left=52 + m.left, top=4 + m.top, width=147, height=160)
@@ -317,17 +515,13 @@ class Window:
             self.spec_orb = Rectangle(left=62 + m.left, top=137 + m.top, width=19, height=20)
             self.spec_orb_text = Rectangle(left=36 + m.left, top=146 + m.top, width=20, height=13)
             self.total_xp = Rectangle(left=m.left - 104, top=m.top + 6, width=104, height=21)
-        if m:
-            # Take a bite out of the bottom-left corner of the minimap to exclude orb's green numbers
-            self.minimap.subtract_list = [{"left": 0, "top": self.minimap.height - 20, "width": 20, "height": 20}]
-            self.minimap_area = m
-            return True
-        print("Window.__locate_minimap(): Failed to find minimap.")
-        return False
+        # Take a bite out of the bottom-left corner of the minimap to exclude orb's green numbers
+        self.minimap.subtract_list = [{"left": 0, "top": self.minimap.height - 20, "width": 20, "height": 20}]
+        self.minimap_area = m
 
     def locate_bank_slots(self, client_rect: Rectangle) -> bool:
         """
-        Locates the bank area and creates Rectangles for each bank slot, storing them in the class property.
+        Locates the bank area and creates a SlotGrid of the bank slots, storing it in the class property.
         Args:
             client_rect: The client area to search in.
         Returns:
@@ -338,21 +532,46 @@ class Window:
         if not bank_rect:
             print("Window.__locate_bank_slots(): Failed to find bank area.")
             return False
-        self.bank_slots = []
         slot_w, slot_h = 33, 32  # dimensions of a bank slot
-        gap = 4  # 1px gap between slots
+        gap = 4  # 4px gap between columns, 3px between rows
         cols, rows = 8, 10
         # The top-left of the first slot (relative to the found bank area)
         start_x = 41 + bank_rect.left
         start_y = 74 + bank_rect.top
-        for row in range(rows):
-            y = start_y + row * (slot_h + gap-1)
-            for col in range(cols):
-                x = start_x + col * (slot_w + gap)
-                self.bank_slots.append(Rectangle(left=x, top=y, width=slot_w, height=slot_h))
+        self.bank_slots = SlotGrid(start_x, start_y, slot_w, slot_h, cols=cols, rows=rows, gap_x=gap, gap_y=gap - 1)
         return True
 
 
+class _ReplayClient:
+    """
+    Stands in for the window handle of a ReplayWindow.
+    """
+
+    isAlive = True
+    isMinimized = False
+
+    def __init__(self, rect: Rectangle):
+        self.left, self.top, self.width, self.height = rect.left, rect.top, rect.width, rect.height
+
+    def activate(self) -> None:
+        pass
+
+
+class ReplayWindow(Window):
+    def __init__(self, client_rect: Rectangle, padding_top: int = 0, padding_left: int = 0, window_title: str = "Replay"):
+        """
+        A Window over a client that is not on the desktop, such as a recorded frame served by a ReplaySource (see
+        frame_bus.py). Its geometry is fixed to `client_rect`, and focusing it does nothing.
+        Args:
+            client_rect: The screen region of the client.
+            padding_top: The height of the client window's header.
+            padding_left: The width of the client window's left border.
+            window_title: The title to cache the client's layout under.
+        """
+        super().__init__(window_title, padding_top, padding_left)
+        self._client = _ReplayClient(client_rect)
+
+
 class MockWindow(Window):
     def __init__(self):
         super().__init__(window_title="None", padding_left=0, padding_top=0)
@@ -365,9 +584,12 @@ class MockWindow(Window):
         doc="A Win32Window reference to the game client and its properties.",
     )
 
-    def initialize(self) -> None:
+    def initialize(self, use_cache: bool = True) -> None:
         print("MockWindow.initialize() called.")
 
+    def watch_geometry(self, interval: float = 0.25) -> None:
+        print("MockWindow.watch_geometry() called.")
+
     def focus(self) -> None:
         print("MockWindow.focus() called.")
 
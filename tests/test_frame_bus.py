@@ -0,0 +1,103 @@
+import time
+import uuid
+
+import numpy as np
+import pytest
+
+from utilities.frame_bus import FrameBusSource, FrameRing
+
+
+@pytest.fixture
+def ring():
+    ring = FrameRing.create(f"test-{uuid.uuid4().hex[:8]}", width=4, height=3, slots=2)
+    yield ring
+    ring.close()
+
+
+def frame_of(value: int) -> np.ndarray:
+    return np.full((3, 4, 3), value, np.uint8)
+
+
+def test_empty_ring(ring):
+    assert ring.latest_seq == -1
+    assert ring.latest() is None
+    assert ring.get(0) is None
+
+
+def test_frame_is_valid_until_its_slot_is_overwritten(ring):
+    first = ring.get(ring.write(frame_of(1), left=10, top=20))
+    assert (first.seq, first.left, first.top) == (0, 10, 20)
+    assert ring.valid(first)
+
+    second = ring.get(ring.write(frame_of(2)))
+    assert ring.valid(first) and ring.valid(second)
+
+    third = ring.get(ring.write(frame_of(3)))  # reuses the first frame's slot
+    assert not ring.valid(first)
+    assert ring.valid(second) and ring.valid(third)
+    assert ring.get(first.seq) is None
+    assert ring.latest().seq == third.seq
+    assert (third.image == 3).all()
+
+
+def test_frames_are_read_only_views(ring):
+    frame = ring.get(ring.write(frame_of(7)))
+    with pytest.raises(ValueError):
+        frame.image[0, 0, 0] = 0
+
+
+def test_attached_ring_sees_writes_and_overwrites(ring):
+    reader = FrameRing.attach(ring.name)
+    try:
+        frame = reader.get(ring.write(frame_of(5)))
+        assert (frame.image == 5).all()
+        ring.write(frame_of(6))
+        ring.write(frame_of(7))
+        assert not reader.valid(frame)
+        assert reader.latest().seq == 2
+    finally:
+        reader.close()
+
+
+def test_grab_copies_the_region(ring):
+    ring.write(frame_of(1), left=100, top=50)
+    source = FrameBusSource([ring])
+    image = source.grab({"left": 101, "top": 51, "width": 2, "height": 2})
+    assert image.shape == (2, 2, 3) and (image == 1).all()
+    for value in range(2, 6):  # wraps around the ring twice
+        ring.write(frame_of(value), left=100, top=50)
+    assert (image == 1).all()
+    image[:] = 0  # the copy is the caller's own
+    assert source.grab({"left": 100, "top": 50, "width": 4, "height": 3}).min() == 5
+
+
+def test_grab_retries_when_the_slot_is_overwritten_during_the_copy(ring, monkeypatch):
+    ring.write(frame_of(1))
+    source = FrameBusSource([ring], retries=2)
+    valid = ring.valid
+    checks = []
+
+    def overwritten_once(frame):
+        checks.append(frame.seq)
+        if len(checks) == 1:
+            ring.write(frame_of(2))
+            return False
+        return valid(frame)
+
+    monkeypatch.setattr(ring, "valid", overwritten_once)
+    image = source.grab({"left": 0, "top": 0, "width": 4, "height": 3})
+    assert checks == [0, 1]
+    assert (image == 2).all()
+
+    monkeypatch.setattr(ring, "valid", lambda frame: False)
+    assert source.grab({"left": 0, "top": 0, "width": 4, "height": 3}) is None
+
+
+def test_grab_skips_old_frames_and_uncovered_regions(ring):
+    source = FrameBusSource([ring], max_age=1)
+    assert source.grab({"left": 0, "top": 0, "width": 1, "height": 1}) is None
+    ring.write(frame_of(1), timestamp=time.time() - 5)
+    assert source.grab({"left": 0, "top": 0, "width": 1, "height": 1}) is None
+    ring.write(frame_of(2))
+    assert source.grab({"left": 0, "top": 0, "width": 1, "height": 1}) is not None
+    assert source.grab({"left": 3, "top": 0, "width": 2, "height": 1}) is None
@@ -0,0 +1,40 @@
+import time
+
+from utilities.api.game_state import GameStateService
+from utilities.api.morg_http_client import SocketError
+
+
+class FlakyMorg:
+    """
+    Stands in for a MorgHTTPSocket whose plugin is down until `up` is set.
+    """
+
+    events_endpoint, inv_endpoint, stats_endpoint = "events", "inv", "stats"
+
+    def __init__(self):
+        self.up = False
+        self.calls = 0
+        self.state_service = None
+
+    def fetch_all(self, endpoints):
+        self.calls += 1
+        if not self.up:
+            raise SocketError("Unable to reach socket", "fetch_all")
+        return {"events": {"health": "10/10"}, "inv": [], "stats": []}
+
+
+def test_outage_is_reported_once_and_polled_less_often(capsys):
+    morg = FlakyMorg()
+    service = GameStateService(morg, interval=0.01)
+    service.start()
+    try:
+        time.sleep(0.5)
+        failed_calls = morg.calls
+        morg.up = True
+        assert service.wait_until(lambda state: state.hitpoints == (10, 10), timeout=GameStateService.MAX_BACKOFF + 1)
+    finally:
+        service.stop()
+    assert 3 <= failed_calls <= 10  # not once per 10ms interval
+    lines = capsys.readouterr().out.splitlines()
+    assert sum("failed to poll" in line for line in lines) == 1
+    assert sum("reconnected" in line for line in lines) == 1
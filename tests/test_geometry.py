@@ -0,0 +1,48 @@
+from utilities.geometry import Point, SlotGrid
+
+
+def test_hit_test_cell_edges_are_inclusive():
+    grid = SlotGrid(100, 200, 30, 20, cols=4, rows=3, gap_x=10, gap_y=5)
+    assert grid.hit_test(Point(100, 200)) == 0
+    assert grid.hit_test(Point(130, 220)) == 0
+    assert grid.hit_test(Point(140, 200)) == 1
+    assert grid.hit_test(Point(100, 225)) == 4
+    assert grid.hit_test(Point(250, 270)) == 11
+
+
+def test_hit_test_gaps_and_outside_points():
+    grid = SlotGrid(100, 200, 30, 20, cols=4, rows=3, gap_x=10, gap_y=5)
+    assert grid.hit_test(Point(131, 210)) == -1
+    assert grid.hit_test(Point(139, 210)) == -1
+    assert grid.hit_test(Point(110, 221)) == -1
+    assert grid.hit_test(Point(99, 200)) == -1
+    assert grid.hit_test(Point(100, 199)) == -1
+    assert grid.hit_test(Point(251, 270)) == -1
+    assert grid.hit_test(Point(250, 271)) == -1
+    assert grid.hit_test(Point(280, 210)) == -1
+
+
+def test_hit_test_without_gaps_gives_shared_edges_to_the_next_cell():
+    grid = SlotGrid(0, 0, 10, 10, cols=2, rows=2)
+    assert grid.hit_test(Point(9, 9)) == 0
+    assert grid.hit_test(Point(10, 0)) == 1
+    assert grid.hit_test(Point(0, 10)) == 2
+    assert grid.hit_test(Point(20, 20)) == -1
+
+
+def test_hit_test_skips_unused_cells_of_a_partial_row():
+    grid = SlotGrid(0, 0, 10, 10, cols=4, rows=2, count=6)
+    assert grid.hit_test(Point(15, 15)) == 5
+    assert grid.hit_test(Point(25, 15)) == -1
+
+
+def test_hit_test_agrees_with_the_cell_rectangles():
+    grid = SlotGrid(50, 60, 36, 32, cols=4, rows=7, gap_x=6, gap_y=4)
+    for y in range(55, 60 + 7 * 36 + 5):
+        for x in range(45, 50 + 4 * 42 + 5):
+            index = grid.hit_test(Point(x, y))
+            containing = [i for i, rect in enumerate(grid) if rect.contains(Point(x, y))]
+            assert (index == -1) == (not containing)
+            if containing:
+                assert index in containing
+
@@ -0,0 +1,100 @@
+import threading
+import time
+
+from utilities.input_arbiter import ArbitratedBackend, InputArbiter
+from utilities.input_backend import RecordingBackend
+
+LINGER = 0.05
+
+
+class FakeWindow:
+    def __init__(self, title: str):
+        self.window_title = title
+        self.focus_count = 0
+
+    def focus(self):
+        self.focus_count += 1
+
+
+def make_clients():
+    arbiter = InputArbiter(linger=LINGER, focus_delay=0)
+    windows = FakeWindow("a"), FakeWindow("b")
+    backends = RecordingBackend(), RecordingBackend()
+    clients = [ArbitratedBackend(backend, arbiter, window) for backend, window in zip(backends, windows)]
+    return arbiter, windows, backends, clients
+
+
+def in_thread(func, *args) -> threading.Thread:
+    thread = threading.Thread(target=func, args=args, daemon=True)
+    thread.start()
+    return thread
+
+
+def test_held_key_pins_the_lease():
+    _, (_, win_b), (_, rec_b), (a, b) = make_clients()
+    a.key_down("shift")
+    waiter = in_thread(b.move_to, 10, 10)
+    time.sleep(LINGER * 4)
+    assert waiter.is_alive(), "the other client must wait while a key is held"
+    assert rec_b.events == []
+    assert win_b.focus_count == 0
+
+    a.key_up("shift")
+    waiter.join(1)
+    assert not waiter.is_alive()
+    assert [event.kind for event in rec_b.events] == ["move"]
+    assert win_b.focus_count == 1
+
+
+def test_other_client_waits_for_the_lease_to_linger_out():
+    _, _, (rec_a, rec_b), (a, b) = make_clients()
+    a.move_to(1, 1)
+    start = time.perf_counter()
+    b.move_to(2, 2)
+    assert time.perf_counter() - start >= LINGER * 0.9
+    assert rec_a.events[-1].timestamp <= rec_b.events[0].timestamp
+
+
+def test_session_pins_the_lease():
+    arbiter, (win_a, _), (rec_a, rec_b), (a, b) = make_clients()
+    with arbiter.session(win_a):
+        a.move_to(1, 1)
+        waiter = in_thread(b.press, "space")
+        time.sleep(LINGER * 4)
+        assert waiter.is_alive()
+        a.mouse_down()
+        a.mouse_up()
+    waiter.join(1)
+    assert not waiter.is_alive()
+    assert [event.kind for event in rec_a.events] == ["move", "mouse_down", "mouse_up"]
+    assert [event.kind for event in rec_b.events] == ["key_down", "key_up"]
+
+
+def test_focus_switches_once_per_handoff():
+    _, (win_a, win_b), _, (a, b) = make_clients()
+    for i in range(5):
+        a.move_to(i, i)
+    a.press("1")
+    assert (win_a.focus_count, win_b.focus_count) == (1, 0)
+
+    for i in range(5):
+        b.move_to(i, i)
+    b.press("2")
+    assert (win_a.focus_count, win_b.focus_count) == (1, 1)
+
+    a.move_to(0, 0)
+    assert (win_a.focus_count, win_b.focus_count) == (2, 1)
+
+
+def test_release_all_unpins_held_keys():
+    _, _, (rec_a, _), (a, b) = make_clients()
+    a.key_down("shift")
+    a.mouse_down()
+    waiter = in_thread(b.move_to, 5, 5)
+    time.sleep(LINGER * 4)
+    assert waiter.is_alive()
+
+    a.release_all()
+    waiter.join(1)
+    assert not waiter.is_alive()
+    assert sorted(event.kind for event in rec_a.events) == ["key_down", "key_up", "mouse_down", "mouse_up"]
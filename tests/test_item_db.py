@@ -0,0 +1,52 @@
+import pytest
+
+import utilities.api.item_ids as ids
+from utilities.api.item_db import ItemDatabase, build, parse_constants
+
+SOURCE = """
+LOGS = 1511
+OAK_LOGS = 1521
+RAW_SHRIMPS = 317
+_23_CAKE = 1893
+logs = [LOGS, OAK_LOGS, LOGS]
+raw_fish = frozenset({RAW_SHRIMPS, 321})
+"""
+
+
+@pytest.fixture
+def db(tmp_path):
+    path = tmp_path / "items.db"
+    source = tmp_path / "item_ids.py"
+    source.write_text(SOURCE)
+    build(source, path)
+    return ItemDatabase(path)
+
+
+def test_database_matches_the_constants_it_was_built_from(db):
+    items, groups = parse_constants(SOURCE)
+    assert {name: db.id(name) for name in items} == items
+    assert {name: db.group(name) for name in groups} == {name: frozenset(group) for name, group in groups.items()}
+    assert sorted(db.group_names()) == sorted(groups)
+
+
+def test_lookups(db):
+    assert db.id("logs") == db.id("LOGS") == 1511
+    assert db.name(1521) == "OAK_LOGS"
+    assert db.name(-1) is None
+    assert db.search("_2") == [("_23_CAKE", 1893)]
+    assert db.fuzzy("oak log")[0] == ("OAK_LOGS", 1521)
+    with pytest.raises(KeyError):
+        db.id("NOT_AN_ITEM")
+    with pytest.raises(KeyError):
+        db.group("not_a_group")
+
+
+def test_item_ids_module_keeps_the_old_constants():
+    assert ids.LOGS == 1511
+    assert ids.RAW_SHRIMPS == 317
+    assert ids._23_CAKE == 1893
+    assert isinstance(ids.all_food, frozenset)
+    assert ids.LOGS in ids.logs
+    assert ids.RAW_SHRIMPS in ids.raw_fish
+    with pytest.raises(AttributeError):
+        ids.NOT_AN_ITEM
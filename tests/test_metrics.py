@@ -0,0 +1,44 @@
+import random
+
+import pytest
+
+from utilities.metrics import SUB_BUCKETS, Counter, LatencyHistogram, _Metric
+
+
+def test_metric_is_abstract():
+    with pytest.raises(TypeError):
+        _Metric("osbc_test", "A metric without samples.")
+    assert Counter("osbc_test_total", "A counter.").render().startswith("# HELP osbc_test_total")
+
+
+def test_bucket_bounds_contain_the_bucketed_value():
+    values = list(range(4 * SUB_BUCKETS)) + [random.Random(0).randrange(1, 10**12) for _ in range(10000)] + [2**k + d for k in range(4, 40) for d in (-1, 0, 1)]
+    for ns in values:
+        lower, upper = LatencyHistogram.bucket_bounds(LatencyHistogram.bucket_of(ns))
+        assert lower <= ns < upper
+        assert upper - lower <= max(1, lower / SUB_BUCKETS)
+
+
+def test_buckets_round_trip_and_tile_the_range():
+    expected_lower = 0
+    for index in range(40 * SUB_BUCKETS):
+        lower, upper = LatencyHistogram.bucket_bounds(index)
+        assert lower == expected_lower
+        assert LatencyHistogram.bucket_of(lower) == index
+        assert LatencyHistogram.bucket_of(upper - 1) == index
+        expected_lower = upper
+
+
+def test_percentile_is_within_the_bucket_error():
+    rng = random.Random(1)
+    samples = [rng.lognormvariate(-4, 1.5) for _ in range(5000)]
+    hist = LatencyHistogram()
+    for seconds in samples:
+        hist.observe(seconds)
+    samples.sort()
+    for p in (1, 10, 50, 90, 95, 99, 99.9):
+        exact = samples[max(1, round(p / 100 * len(samples))) - 1]
+        assert abs(hist.percentile(p) - exact) <= exact / SUB_BUCKETS
+    assert hist.percentile(0) == pytest.approx(samples[0], rel=1 / SUB_BUCKETS)
+    assert samples[-1] * (1 - 1 / SUB_BUCKETS) <= hist.percentile(100) <= samples[-1]
+    assert LatencyHistogram().percentile(50) == 0.0
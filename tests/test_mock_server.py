@@ -0,0 +1,51 @@
+import uuid
+
+import pytest
+
+from utilities.api import status_socket
+from utilities.api.mock_server import MockPluginServer, Scenario, SkillingScenario
+from utilities.api.morg_http_client import MorgHTTPSocket
+from utilities.api.status_socket import StatusSocket
+
+
+@pytest.fixture
+def status():
+    return StatusSocket(port=0, key=f"mock-{uuid.uuid4().hex[:8]}")
+
+
+@pytest.fixture
+def server(status):
+    port = status_socket.serve(0).server_address[1]
+    server = MockPluginServer(SkillingScenario(ticks_per_item=1), morg_port=0, status_url=f"http://127.0.0.1:{port}/{status.key}", tick_length=0.05)
+    server.start()
+    yield server
+    server.stop()
+
+
+def test_scenario_is_abstract():
+    with pytest.raises(TypeError):
+        Scenario()
+
+
+def test_morg_client_reads_the_mock_endpoints(server):
+    api = MorgHTTPSocket(ttl=0)
+    api.base_endpoint = server.base_endpoint
+    assert api.test_endpoints()
+    assert api.get_hitpoints() == (10, 10)
+    assert api.get_run_energy() == 100
+    assert api.get_animation() == 879
+    assert api.get_game_tick() >= 0
+    assert all(item["id"] == 1511 for item in api.get_inv())
+    assert api.get_skill_xp("Woodcutting") % 25 == 0
+    assert all(server.request_counts[endpoint] > 0 for endpoint in ("inv", "stats", "events"))
+
+
+def test_status_socket_receives_the_mock_posts(server, status):
+    assert status.wait_for_update(timeout=2) is not None
+    seq, _ = status.snapshot()
+    assert status.wait_for_update(after_seq=seq, timeout=2) is not None
+    assert server.posts >= 1
+    assert status.get_run_energy() == 100
+    assert status.get_game_tick() >= 1
+    assert status.get_real_level("WOODCUTTING") == 1
+    assert all(item["id"] == 1511 for item in status.get_inv())
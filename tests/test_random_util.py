@@ -0,0 +1,48 @@
+import threading
+
+import pytest
+
+import utilities.random_util as rd
+
+
+def draws(sampler: rd.Sampler) -> list:
+    return [sampler.uniform(), sampler.truncated_normal(0, 100), sampler.randrange(0, 10), sampler.chisquare(5), sampler.uniform()]
+
+
+def test_seeded_sampler_repeats_its_draws():
+    assert draws(rd.Sampler(7, background=False)) == draws(rd.Sampler(7, background=False))
+    assert draws(rd.Sampler(7, background=False)) != draws(rd.Sampler(8, background=False))
+
+
+def test_randrange_rejects_an_empty_range():
+    sampler = rd.Sampler(0, background=False)
+    with pytest.raises(ValueError):
+        sampler.randrange(5, 5)
+    assert all(3 <= sampler.randrange(3, 6) < 6 for _ in range(1000))
+
+
+def test_module_functions_draw_from_the_bound_sampler():
+    expected = rd.Sampler(3, background=False).truncated_normal(0, 100)
+    with rd.bound(rd.Sampler(3, background=False)) as sampler:
+        assert rd.current_sampler() is sampler
+        assert rd.truncated_normal_sample(0, 100) == expected
+    assert rd.context_sampler() is None
+    assert rd.current_sampler() is rd.default_sampler()
+
+
+def test_bound_sampler_is_per_thread():
+    sampler = rd.Sampler(background=False)
+    seen = []
+    with rd.bound(sampler):
+        thread = threading.Thread(target=lambda: seen.append(rd.current_sampler()))
+        thread.start()
+        thread.join()
+    assert seen == [rd.default_sampler()]
+
+
+def test_set_default_sampler_returns_the_previous_one():
+    previous = rd.set_default_sampler(rd.Sampler(1, background=False))
+    try:
+        assert rd.chisquared_sample(5) == rd.Sampler(1, background=False).chisquare(5)
+    finally:
+        rd.set_default_sampler(previous)
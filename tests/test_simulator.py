@@ -0,0 +1,33 @@
+import random
+
+import numpy as np
+
+import utilities.curve_pool as curve_pool
+import utilities.random_util as rd
+from model.osrs.woodcutter import OSRSWoodcutter
+from model.simulator import Simulation, WoodcuttingWorld, seeded
+
+
+def repeatable(result):
+    """
+    Drops the fields that measure real time, which differs from run to run.
+    """
+    return result._replace(real_seconds=0, compute_seconds=0)
+
+
+def test_same_seed_gives_the_same_result():
+    first, second = (Simulation(OSRSWoodcutter, WoodcuttingWorld, seed=3, count_compute=False).run(minutes=1, timeout=120) for _ in range(2))
+    assert first.actions > 0
+    assert repeatable(first) == repeatable(second)
+
+
+def test_seeded_restores_the_defaults():
+    sampler, pool = rd.default_sampler(), curve_pool.default_pool()
+    with seeded(1) as seeded_sampler:
+        assert rd.default_sampler() is seeded_sampler
+        assert curve_pool.default_pool() is not pool
+        curves = curve_pool.default_pool().curve((0, 0), (300, 200)), random.random(), np.random.random()
+    with seeded(1):
+        assert (curve_pool.default_pool().curve((0, 0), (300, 200)), random.random(), np.random.random()) == curves
+    assert rd.default_sampler() is sampler
+    assert curve_pool.default_pool() is pool
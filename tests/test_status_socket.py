@@ -0,0 +1,51 @@
+import uuid
+from types import MappingProxyType
+
+import pytest
+
+from utilities.api.status_socket import StatusSocket, freeze, store, thaw
+
+DATA = {
+    "tick": 7,
+    "inventory": [{"index": 0, "id": 1511, "amount": 1}, {"index": 1, "id": 317, "amount": 3}],
+    "equipment": [],
+    "equipmentStats": {"aStab": 1, "dSlash": -2},
+    "attack": {"animationId": -1},
+}
+
+
+@pytest.fixture
+def api():
+    api = StatusSocket(port=0, key=f"test-{uuid.uuid4().hex[:8]}")
+    store.publish(api.key, freeze(DATA))
+    return api
+
+
+def test_freeze_and_thaw_round_trip():
+    frozen = freeze(DATA)
+    assert isinstance(frozen, MappingProxyType)
+    assert isinstance(frozen["inventory"], tuple)
+    assert thaw(frozen) == DATA
+
+
+def test_snapshot_is_read_only(api):
+    seq, data = api.snapshot()
+    assert seq == 1
+    with pytest.raises(TypeError):
+        data["tick"] = 8
+
+
+def test_getters_return_copies_in_the_old_types(api):
+    inv = api.get_inv()
+    assert type(inv) is list and type(inv[0]) is dict
+    assert inv == DATA["inventory"]
+    inv[0]["amount"] = 99
+    inv.append({})
+    assert api.get_inv() == DATA["inventory"]
+
+    assert api.get_player_equipment() == []
+    api.get_player_equipment().append({"id": 1})
+    assert api.get_player_equipment() == []
+    assert api.get_equipment_stats() == DATA["equipmentStats"]
+    assert type(api.get_player_data()) is dict
+    assert api.get_game_tick() == 7
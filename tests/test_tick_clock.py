@@ -0,0 +1,67 @@
+import time
+
+import pytest
+
+from utilities.tick_clock import TickClock
+
+
+@pytest.fixture
+def now(monkeypatch):
+    clock = {"now": 0.0}
+    monkeypatch.setattr(time, "time", lambda: clock["now"])
+    return clock
+
+
+def synced_clock() -> TickClock:
+    """
+    A clock that saw ticks 11 and 12 begin within [100.0, 100.2] and [100.7, 100.9] respectively, i.e., a boundary
+    into tick 12 between 100.7 and 100.8 once the windows are intersected.
+    """
+    clock = TickClock()
+    for tick, timestamp in ((10, 100.0), (11, 100.2), (11, 100.7), (12, 100.9)):
+        clock.observe(tick, timestamp)
+    return clock
+
+
+def test_unsynced_clock(now):
+    now["now"] = 50.0
+    clock = TickClock()
+    clock.observe(5, 49.0)
+    clock.observe(5, 49.5)
+    assert not clock.synced
+    assert clock.current_tick() == -1
+    assert clock.precision() == clock.tick_length
+    assert clock.next_tick_time() == pytest.approx(50.6)
+
+
+def test_observed_windows_are_intersected():
+    clock = TickClock()
+    clock.observe(10, 100.0)
+    clock.observe(11, 100.2)
+    assert clock.precision() == pytest.approx(0.2)
+    clock.observe(11, 100.7)
+    clock.observe(12, 100.9)
+    assert clock.precision() == pytest.approx(0.1)
+    clock.observe(12, 101.35)
+    clock.observe(13, 101.38)  # lies within the shifted anchor, so it narrows the estimate
+    assert clock.precision() == pytest.approx(0.03)
+
+
+def test_inconsistent_window_restarts_the_estimate(now):
+    clock = synced_clock()
+    clock.observe(13, 101.1)  # tick 13 should not start before 101.3; E.g., the server lagged
+    assert clock.precision() == pytest.approx(0.2)
+    now["now"] = 101.1
+    assert clock.next_tick_time() == pytest.approx(101.6)
+
+
+def test_next_tick_time(now):
+    clock = synced_clock()
+    now["now"] = 101.0
+    assert clock.current_tick() == 12
+    assert clock.next_tick_time() == pytest.approx(101.35)
+    assert clock.next_tick_time(offset=0.05) == pytest.approx(101.4)
+    now["now"] = 101.36
+    assert clock.current_tick() == 13
+    assert clock.next_tick_time() == pytest.approx(101.95)
+    assert clock.next_tick_time(offset=0.05) == pytest.approx(101.4)
@@ -0,0 +1,82 @@
+import threading
+
+from utilities.geometry import Rectangle, SlotGrid
+from utilities.window import ReplayWindow, WindowInitializationError
+
+
+class LayoutWindow(ReplayWindow):
+    """
+    A ReplayWindow whose initialize() lays out a few regions proportionally to the client size, slowly.
+    """
+
+    def __init__(self, client_rect: Rectangle):
+        super().__init__(client_rect)
+        self.fail = False
+        self.initialized = threading.Event()
+
+    def initialize(self, use_cache: bool = True) -> bool:
+        if self.fail:
+            raise WindowInitializationError("still resizing")
+        client = self.window
+        self.game_view = Rectangle(client.left, client.top, client.width // 2, client.height // 2)
+        self.initialized.wait(0.05)  # readers get a chance to see a half-updated layout
+        self.chat = Rectangle(client.left, client.top + client.height // 2, client.width // 2, client.height // 2)
+        self.inventory_slots = SlotGrid(client.left + client.width // 2, client.top, 10, 10, cols=4, rows=7)
+        self._Window__reset_geometry(Rectangle(client.left, client.top, client.width, client.height))
+        return True
+
+
+def layout_of(window: LayoutWindow) -> tuple:
+    return window.game_view.width, window.chat.width, window.inventory_slots.left
+
+
+def test_translate_swaps_in_moved_copies():
+    window = LayoutWindow(Rectangle(0, 0, 800, 600))
+    window.initialize()
+    game_view, slots = window.game_view, window.inventory_slots
+    window.inventory = window.game_view  # an alias stays an alias
+    window.translate(5, 7)
+    assert (game_view.left, game_view.top) == (0, 0)
+    assert (window.game_view.left, window.game_view.top) == (5, 7)
+    assert window.inventory is window.game_view
+    assert (slots.left, window.inventory_slots.left) == (400, 405)
+    assert window.inventory_slots[0].top == 7
+
+
+def test_resize_swaps_in_the_new_layout_at_once():
+    window = LayoutWindow(Rectangle(0, 0, 800, 600))
+    window.initialize()
+    old, new = layout_of(window), (500, 500, 500)
+    seen = set()
+    done = threading.Event()
+
+    def read():
+        while not done.is_set():
+            seen.add(layout_of(window))
+
+    reader = threading.Thread(target=read)
+    reader.start()
+    window.window.width = 1000
+    try:
+        assert window.check_geometry()
+    finally:
+        done.set()
+        reader.join()
+    assert layout_of(window) == new
+    assert seen <= {old, new}
+    assert not window.layout_stale
+
+
+def test_failed_relocation_is_retried():
+    window = LayoutWindow(Rectangle(0, 0, 800, 600))
+    window.initialize()
+    window.fail = True
+    window.window.width = 1000
+    assert window.check_geometry()
+    assert window.layout_stale
+    assert layout_of(window) == (400, 400, 400)
+
+    window.fail = False
+    assert not window.check_geometry()
+    assert not window.layout_stale
+    assert layout_of(window) == (500, 500, 500)